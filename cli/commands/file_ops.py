@@ -113,24 +113,60 @@ def _auto_export_json(shell: "MyLogicShell") -> None:
         pass
 
 
-def _cmd_read(shell: "MyLogicShell", parts: List[str]) -> None:
-    if len(parts) < 2:
-        print("[ERROR] Usage: read <file> [--loose]")
-        return
+def _read_paths(args: List[str]) -> List[str]:
+    """
+    File của lệnh ``read``: một đường dẫn (ghép các phần để hỗ trợ khoảng trắng,
+    vd: D:\KHÓA LUẬN TỐT NGHIỆP\...) hoặc nhiều file nếu đường dẫn ghép không tồn tại.
+    """
+    path = " ".join(args).strip()
+    if len(args) > 1 and not os.path.exists(path):
+        return list(args)
+    return [path]
+
 
-    # Ghép parts[1:] để hỗ trợ đường dẫn có khoảng trắng (vd: D:\KHÓA LUẬN TỐT NGHIỆP\...)
+def _cmd_read(shell: "MyLogicShell", parts: List[str]) -> None:
+    usage = "[ERROR] Usage: read <file> [<file> ...] [--top <module>] [--loose]"
     loose = False
     if "--loose" in parts:
         loose = True
         parts = [p for p in parts if p != "--loose"]
-    path = " ".join(parts[1:]).strip()
+    top = None
+    if "--top" in parts:
+        i = parts.index("--top")
+        if i + 1 >= len(parts):
+            print(usage)
+            return
+        top = parts[i + 1]
+        parts = parts[:i] + parts[i + 2:]
+    if len(parts) < 2:
+        print(usage)
+        return
+
+    paths = _read_paths(parts[1:])
+    path = paths[0]
     try:
-        # Educational default: strict parsing to catch undeclared signals/typos
-        shell.netlist = parse_verilog(path, strict=(not loose))
+        ext = os.path.splitext(path)[1].lower()
+        if len(paths) > 1 or top:
+            # Nhiều file Verilog / chọn top: module có thể nằm ở file bất kỳ
+            from frontends.verilog import parse_verilog_hierarchy
+            shell.netlist = parse_verilog_hierarchy(paths, top=top, strict=(not loose))
+        elif ext == ".blif":
+            from frontends.blif import parse_blif
+            shell.netlist = parse_blif(path)
+        elif ext == ".bench":
+            from frontends.bench import parse_bench
+            shell.netlist = parse_bench(path)
+        else:
+            # Educational default: strict parsing to catch undeclared signals/typos
+            shell.netlist = parse_verilog(path, strict=(not loose))
         shell.current_netlist = shell.netlist
         shell.filename = path
         n_nodes = len(shell.netlist.get("nodes", [])) if isinstance(shell.netlist, dict) else 0
         print(f"[OK] Loaded netlist with {n_nodes} nodes.")
+        hierarchy = shell.netlist.get("attrs", {}).get("hierarchy") if isinstance(shell.netlist, dict) else None
+        if hierarchy:
+            print(f"  Top module: {shell.netlist.get('name')} ({len(hierarchy)} submodule(s): "
+                  f"{', '.join(sorted(hierarchy))})")
 
         if shell.auto_export_json and shell.current_netlist:
             _auto_export_json(shell)
@@ -215,9 +251,192 @@ def _cmd_export(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> Non
         print(f"[ERROR] Error exporting JSON: {e}")
 
 
+def _cmd_read_aig(shell: "MyLogicShell", parts: List[str]) -> None:
+    """
+    read_aig <file.aig|file.aag|file.blif|file.bench> [--array]: nạp AIG làm current AIG.
+
+    BLIF / .bench được dựng thẳng thành AIG (không qua netlist dictionary).
+    """
+    array = "--array" in parts
+    rest = [p for p in parts[1:] if p != "--array"]
+    if not rest:
+        print("[ERROR] Usage: read_aig <file.aig|file.aag|file.blif|file.bench> [--array]")
+        return
+    path = " ".join(rest).strip()
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        aig_class = None
+        if array:
+            from core.synthesis.aig_array import ArrayAIG
+            aig_class = ArrayAIG
+        from frontends import load_aig
+        model = load_aig(path, aig_class=aig_class)
+    except Exception as e:
+        print(f"[ERROR] Failed to read {ext.lstrip('.').upper() or 'AIGER'} file: {e}")
+        return
+
+    aig = model.aig
+    source_format = ext.lstrip(".") if ext in (".blif", ".bench") else "aiger"
+    # Netlist chỉ có interface (tên PI/PO) để export / techmap / cec đặt đúng tên tín hiệu
+    shell.netlist = {
+        "name": os.path.splitext(os.path.basename(path))[0] or "aiger",
+        "inputs": list(aig.pis),
+        "outputs": list(model.output_names),
+        "nodes": {},
+        "wires": [],
+        "attrs": {"source_format": source_format},
+    }
+    shell.current_netlist = shell.netlist
+    shell.current_aig = aig
+    shell.reference_aig = aig
+    shell.aiger_model = model
+    shell.filename = path
+    header = model.header
+    print(f"[OK] Loaded {source_format.upper()}: {header.inputs} inputs, {header.latches} latches, "
+          f"{header.outputs} outputs, {header.ands} ANDs")
+    print(f"  AIG nodes: {aig.count_nodes()}")
+    if model.latches:
+        print("[INFO] Latches are modelled as PI (current state) + PO (next state, '<latch>_next')")
+
+
+def _cmd_write_aig(shell: "MyLogicShell", parts: List[str]) -> None:
+    """write_aig <file.aig|file.aag> [--ascii]: ghi current AIG ra AIGER (checkpoint)."""
+    if not shell.current_aig:
+        print("[ERROR] No AIG available. Run 'synthesis' or 'read_aig' first.")
+        return
+    ascii_format = "--ascii" in parts
+    rest = [p for p in parts[1:] if p != "--ascii"]
+    if not rest:
+        print("[ERROR] Usage: write_aig <file.aig|file.aag> [--ascii]")
+        return
+    path = " ".join(rest).strip()
+    try:
+        from cli.commands.verify_cmds import _po_names
+        from core.synthesis.aiger import write_aiger
+
+        aig = shell.current_aig
+        latches = _aig_latches(shell, aig)
+        header = write_aiger(
+            aig,
+            path,
+            binary=False if ascii_format else None,
+            output_names=_po_names(shell, aig),
+            latches=latches,
+            comments=[f"MyLogic EDA Tool: {shell.filename or 'current AIG'}"],
+        )
+        print(f"[OK] Wrote AIGER to: {path} ({os.path.getsize(path)} bytes)")
+        print(f"  {header.inputs} inputs, {header.latches} latches, {header.outputs} outputs, {header.ands} ANDs")
+    except Exception as e:
+        print(f"[ERROR] Failed to write AIGER file: {e}")
+
+
+def _aig_latches(shell: "MyLogicShell", aig) -> list:
+    """Latch của ``shell.aiger_model`` nếu vẫn khớp với current AIG."""
+    model = getattr(shell, "aiger_model", None)
+    if model is not None and all(
+        latch.name in aig.pis and latch.next_po < len(aig.pos) for latch in model.latches
+    ):
+        return list(model.latches)
+    return []
+
+
+def _cmd_write_blif(shell: "MyLogicShell", parts: List[str]) -> None:
+    """write_blif <file.blif> [--aig]: ghi netlist đã map (nếu có) hoặc current AIG ra BLIF."""
+    use_aig = "--aig" in parts
+    rest = [p for p in parts[1:] if p != "--aig"]
+    if not rest:
+        print("[ERROR] Usage: write_blif <file.blif> [--aig]")
+        return
+    path = " ".join(rest).strip()
+    mapped = getattr(shell, "mapped_netlist", None)
+    try:
+        if mapped and not use_aig:
+            from core.export.blif_writer import netlist_to_blif
+
+            stats = netlist_to_blif(mapped, path)
+            print(f"[OK] Wrote mapped netlist to: {path}")
+            print(f"  {stats['gates']} library gates (.gate), {stats['names']} .names, {stats['latches']} latches")
+            if stats["gates"]:
+                print("[INFO] Reading .gate cells back (e.g. in ABC) needs the matching genlib library")
+            return
+        if not shell.current_aig:
+            print("[ERROR] No AIG available. Run 'synthesis' or 'read_aig' first.")
+            return
+        from cli.commands.verify_cmds import _po_names
+        from core.export.blif_writer import aig_to_blif
+
+        aig = shell.current_aig
+        name = (shell.current_netlist or {}).get("name") or "top"
+        stats = aig_to_blif(aig, path, model_name=name, output_names=_po_names(shell, aig),
+                            latches=_aig_latches(shell, aig))
+        print(f"[OK] Wrote AIG to: {path}")
+        print(f"  {stats['inputs']} inputs, {stats['latches']} latches, {stats['outputs']} outputs, {stats['ands']} ANDs")
+    except Exception as e:
+        print(f"[ERROR] Failed to write BLIF file: {e}")
+
+
+def _cmd_write_bench(shell: "MyLogicShell", parts: List[str]) -> None:
+    """write_bench <file.bench>: ghi current AIG ra ISCAS .bench (AND/NOT/DFF)."""
+    if not shell.current_aig:
+        print("[ERROR] No AIG available. Run 'synthesis' or 'read_aig' first.")
+        return
+    if len(parts) < 2:
+        print("[ERROR] Usage: write_bench <file.bench>")
+        return
+    path = " ".join(parts[1:]).strip()
+    try:
+        from cli.commands.verify_cmds import _po_names
+        from core.export.bench_writer import aig_to_bench
+
+        aig = shell.current_aig
+        stats = aig_to_bench(aig, path, output_names=_po_names(shell, aig), latches=_aig_latches(shell, aig))
+        print(f"[OK] Wrote AIG to: {path}")
+        print(f"  {stats['inputs']} inputs, {stats['latches']} latches, {stats['outputs']} outputs, {stats['ands']} ANDs")
+    except Exception as e:
+        print(f"[ERROR] Failed to write .bench file: {e}")
+
+
+def _cmd_write_verilog(shell: "MyLogicShell", parts: List[str]) -> None:
+    """write_verilog <file.v> [--aig]: ghi netlist đã map (nếu có) hoặc current AIG ra Verilog."""
+    use_aig = "--aig" in parts
+    rest = [p for p in parts[1:] if p != "--aig"]
+    if not rest:
+        print("[ERROR] Usage: write_verilog <file.v> [--aig]")
+        return
+    path = " ".join(rest).strip()
+    mapped = getattr(shell, "mapped_netlist", None)
+    try:
+        if mapped and not use_aig:
+            from core.export.verilog_writer import write_verilog
+
+            stats = write_verilog(mapped, path)
+            print(f"[OK] Wrote mapped netlist to: {path}")
+            print(f"  {stats['instances']} instances, {stats['assigns']} assigns, {stats['wires']} wires")
+            return
+        if not shell.current_aig:
+            print("[ERROR] No AIG available. Run 'synthesis' or 'read_aig' first.")
+            return
+        from cli.commands.verify_cmds import _po_names
+        from core.export.verilog_writer import write_aig_verilog
+
+        aig = shell.current_aig
+        netlist = shell.current_netlist or {}
+        stats = write_aig_verilog(aig, path, module_name=netlist.get("name") or "design",
+                                  output_names=_po_names(shell, aig), original_netlist=netlist or None)
+        print(f"[OK] Wrote AIG to: {path}")
+        print(f"  {stats['assigns']} assigns, {stats['wires']} wires")
+    except Exception as e:
+        print(f"[ERROR] Failed to write Verilog file: {e}")
+
+
 def register(shell: "MyLogicShell") -> Dict[str, Callable]:
     return {
         "read": lambda parts: _cmd_read(shell, parts),
+        "read_aig": lambda parts: _cmd_read_aig(shell, parts),
+        "write_aig": lambda parts: _cmd_write_aig(shell, parts),
+        "write_blif": lambda parts: _cmd_write_blif(shell, parts),
+        "write_bench": lambda parts: _cmd_write_bench(shell, parts),
+        "write_verilog": lambda parts: _cmd_write_verilog(shell, parts),
         "export": lambda parts=None: _cmd_export(shell, parts),
         "export_json": lambda parts=None: _cmd_export(shell, parts),
     }
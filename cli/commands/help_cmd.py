@@ -10,7 +10,13 @@ def _cmd_help(shell: "MyLogicShell", parts: List[str] | None = None) -> None:
     print("=== ENHANCED MYLOGIC EDA TOOL COMMANDS ===")
     print()
     print("File Operations:")
-    print("  read <file>           - Load a .v file (auto-exports JSON to outputs/)")
+    print("  read <file>           - Load a .v, .blif or .bench file (auto-exports JSON to outputs/)")
+    print("  read <f1.v> <f2.v> ... [--top <module>] - Load a multi-file Verilog hierarchy")
+    print("  read_aig <file> [--array] - Load an AIGER .aig/.aag, BLIF or ISCAS .bench file as the current AIG")
+    print("  write_aig <file> [--ascii] - Write the current AIG as AIGER (.aig binary, .aag ASCII)")
+    print("  write_blif <file> [--aig] - Write the mapped netlist (or the current AIG) as BLIF")
+    print("  write_bench <file> - Write the current AIG as ISCAS .bench")
+    print("  write_verilog <file> [--aig] - Write the mapped netlist (or the current AIG) as Verilog")
     print("  stats                 - Enhanced circuit statistics")
     print("  vectors               - Detailed vector width analysis")
     print("  nodes                 - Detailed node information")
@@ -21,18 +27,33 @@ def _cmd_help(shell: "MyLogicShell", parts: List[str] | None = None) -> None:
     print("  dump_synth            - Dump synthesized netlist (AIG->netlist) as cells/cones")
     print()
     print("Logic Synthesis:")
-    print("  synthesis [--export|--json path] [--verilog path] - Netlist -> AIG; optional JSON/Verilog")
+    print("  synthesis [--array] [--export|--json path] [--verilog path] - Netlist -> AIG (--array: array-backed AIG); optional JSON/Verilog")
     print("  strash                - Structural hashing")
     print("  dce [level]          - Dead code elimination")
     print("  cse                  - Common subexpression elimination")
     print("  constprop            - Constant propagation")
-    print("  balance              - Logic balancing")
-    print("  optimize [--json|--verilog path] - AIG optimization; optional export (post_optimize)")
+    print("  balance [--in-place] - Logic balancing (AIG: supergate, reports depth; else netlist)")
+    print("  optimize [--in-place] [--no-fraig] [--rewrite|--rewrite-z] [--json|--verilog path] - AIG optimization; optional export (post_optimize)")
+    print("  optimize [--in-place] [--timeout SEC] --script <script> | --script-file <path> - Run a pass script")
+    print("           e.g. optimize --script strash; dce; repeat(rw; b) until gain<1%  (passes: strash dce cse constprop rewrite [-z] fraig balance)")
+    print("  fraig [-n N] [--conflicts C] [--in-place] - Functional reduction (simulation + SAT sweeping)")
+    print("  rewrite [-z] [--cuts K] [--in-place] - DAG-aware rewriting (4-input cuts, NPN library; -z: zero-cost)")
     print("  export_aig [flags]   - Export current AIG as synthesized JSON/Verilog")
-    print("  techmap [library]    - Technology mapping (area cố định); --pure-library = chỉ thư viện đã chọn")
-    print("  complete_flow [library] - Full flow (techmap area cố định)")
+    print("  techmap [library] [--cut] - Technology mapping (mặc định area); --cut = cut-based delay/area mapper;")
+    print("                         --pure-library = chỉ thư viện đã chọn")
+    print("  lutmap [-K k] [--family F] [--verilog path] - FPGA k-LUT mapping (priority cuts; LUT count / depth)")
+    print("  sta [-p period] [-k paths] - Static timing analysis sau techmap (NLDM Liberty; WNS/TNS, k đường găng)")
+    print("  libcache [list|clear [--stale]|dir] - Cache thư viện đã biên dịch cho techmap (snapshot theo file nguồn)")
+    print("  complete_flow [library] [--cec] - Full flow (techmap area cố định); --cec: check synthesis vs optimization")
     print("  aig <op>              - AIG (create/strash/convert/stats)")
     print()
+    print("Verification:")
+    print("  simulate [-n N] [--seed S] [--exhaustive] [--vectors file] [--show K] - Bit-parallel AIG simulation")
+    print("  cec [file1.v [file2.v]] [--conflicts C] - Equivalence check (default: post-synthesis vs current AIG)")
+    print()
+    print("Profiling:")
+    print("  trace start [--memory] | stop | report [min%] | export <path.json> - Nested spans (wall/CPU/peak mem) -> Chrome trace")
+    print()
     print("Utility: stats, vectors, nodes, wires, modules, export, history, clear, help, exit")
 
 
@@ -181,6 +181,38 @@ def _cmd_modules(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> No
     print(f"\nTotal: {len(module_insts)} module instantiations")
 
 
+def _cmd_trace(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
+    """trace start [--memory] | stop | report [min%] | export <path.json>"""
+    from core.utils.performance import get_tracer, start_tracing, stop_tracing
+
+    parts = parts or []
+    action = parts[1] if len(parts) > 1 else "report"
+    if action == "start":
+        memory = "--memory" in parts[2:]
+        start_tracing(trace_memory=memory)
+        print("[OK] Tracing started" + (" (tracemalloc peaks)" if memory else ""))
+        return
+    if action == "stop":
+        tracer = stop_tracing()
+        if tracer is None:
+            print("[WARNING] Tracing is not running.")
+            return
+        shell.last_tracer = tracer
+        print(f"[OK] Tracing stopped ({len(tracer.iter_spans())} spans). Use 'trace report' / 'trace export <path>'.")
+        return
+    tracer = get_tracer() or getattr(shell, "last_tracer", None)
+    if tracer is None:
+        print("[WARNING] No trace recorded. Use 'trace start' first.")
+        return
+    if action == "report":
+        min_fraction = float(parts[2]) / 100 if len(parts) > 2 else 0.0
+        print(tracer.summary(min_fraction=min_fraction))
+    elif action == "export" and len(parts) > 2:
+        print(f"[OK] Chrome trace written: {tracer.write_chrome_trace(parts[2])}")
+    else:
+        print("Usage: trace start [--memory] | stop | report [min%] | export <path.json>")
+
+
 def register(shell: "MyLogicShell") -> Dict[str, Callable]:
     return {
         "stats": lambda parts=None: _cmd_stats(shell, parts),
@@ -188,5 +220,6 @@ def register(shell: "MyLogicShell") -> Dict[str, Callable]:
         "nodes": lambda parts=None: _cmd_nodes(shell, parts),
         "wires": lambda parts=None: _cmd_wires(shell, parts),
         "modules": lambda parts=None: _cmd_modules(shell, parts),
+        "trace": lambda parts=None: _cmd_trace(shell, parts),
     }
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import re
+import time
 from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 _VERILOG_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
@@ -36,7 +37,7 @@ def _resolve_synthesized_module_name(output_path: str, netlist: Dict) -> str:
 if TYPE_CHECKING:
     from cli.mylogic_shell import MyLogicShell
 
-# Chiến lược techmap cố định area_optimal (CLI không nhận delay/balanced).
+# Techmap CLI: area_optimal mặc định, `--cut` cho cut mapper (không nhận delay/balanced).
 _DEPRECATED_TECHMAP_STRATEGY_WORDS = frozenset({"area", "delay", "balanced"})
 
 
@@ -64,6 +65,9 @@ def _parse_techmap_cli_parts(parts: List[str]) -> Tuple[Optional[str], bool]:
             merge_standard = False
             i += 1
             continue
+        if p == "--cut":
+            i += 1
+            continue
         if p in ("--json", "-j", "--verilog", "-v"):
             i += 1
             if i < len(parts) and not parts[i].startswith("-"):
@@ -123,7 +127,7 @@ def _export_synthesized_verilog(
     synthesized_netlist: Dict,
     output_path: Optional[str] = None,
 ) -> None:
-    from core.export import netlist_to_verilog
+    from core.export import write_verilog
 
     if not output_path:
         output_dir = "outputs"
@@ -147,12 +151,10 @@ def _export_synthesized_verilog(
             synthesized_netlist["attrs"]["vector_widths"].setdefault(k, v)
 
     module_name = _resolve_synthesized_module_name(output_path, synthesized_netlist)
-    verilog_text = netlist_to_verilog(synthesized_netlist, module_name=module_name)
     out_dir = os.path.dirname(output_path) if os.path.dirname(output_path) else "."
     if out_dir and out_dir != "." and not os.path.exists(out_dir):
         os.makedirs(out_dir, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(verilog_text)
+    write_verilog(synthesized_netlist, output_path, module_name=module_name)
     print(f"[OK] Exported synthesized Verilog to: {output_path} (module {module_name})")
 
 
@@ -200,7 +202,7 @@ def _export_mapped_verilog(
     mapped_netlist: Dict,
     output_path: Optional[str] = None,
 ) -> None:
-    from core.export import netlist_to_verilog
+    from core.export import write_verilog
 
     if not output_path:
         output_dir = "outputs"
@@ -228,12 +230,10 @@ def _export_mapped_verilog(
         if _is_legal_verilog_identifier(f"{stem}_mapped"):
             module_name = f"{stem}_mapped"
 
-    verilog_text = netlist_to_verilog(mapped_netlist, module_name=module_name)
     out_dir = os.path.dirname(output_path) if os.path.dirname(output_path) else "."
     if out_dir and out_dir != "." and not os.path.exists(out_dir):
         os.makedirs(out_dir, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(verilog_text)
+    write_verilog(mapped_netlist, output_path, module_name=module_name)
     print(f"[OK] Exported technology-mapped Verilog to: {output_path} (module {module_name})")
 
 
@@ -309,6 +309,10 @@ def _cmd_constprop(shell: "MyLogicShell", parts: Optional[List[str]] = None) ->
 
 
 def _cmd_balance(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
+    if shell.current_aig:
+        # Có AIG: balance theo supergate trên AIG (giảm độ sâu thật)
+        _cmd_balance_aig(shell, parts or [])
+        return
     if not shell.current_netlist:
         print("[ERROR] No netlist loaded. Use 'read <file>' first.")
         return
@@ -333,6 +337,31 @@ def _cmd_balance(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> No
         print(f"[ERROR] Logic Balancing failed: {e}")
 
 
+def _cmd_balance_aig(shell: "MyLogicShell", parts: List[str]) -> None:
+    unknown = [p for p in parts[1:] if p != "--in-place"]
+    if unknown:
+        print(f"[ERROR] Unknown option: {unknown[0]}")
+        print("Usage: balance [--in-place]")
+        return
+    in_place = "--in-place" in parts[1:]
+    try:
+        from core.optimization.balance import AIGBalanceOptimizer
+
+        print("[INFO] Running AIG Balancing (supergate)..." + (" (in-place)" if in_place else ""))
+        optimizer = AIGBalanceOptimizer()
+        shell.current_aig = optimizer.optimize(shell.current_aig, in_place=in_place)
+        stats = optimizer.stats
+        print("[OK] Logic Balancing completed!")
+        print(f"  Depth: {stats['depth_before']} -> {stats['depth_after']}")
+        print(f"  AIG nodes: {stats['nodes_before']} -> {stats['nodes_after']}")
+        print(f"  Supergates: {stats['supergates']}")
+        print(f"  Time: {stats['time']:.3f}s")
+    except Exception as e:
+        print(f"[ERROR] Logic Balancing failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+
 def _cmd_synthesis(shell: "MyLogicShell", parts: List[str]) -> None:
     if not shell.current_netlist:
         print("[ERROR] No netlist loaded. Use 'read <file>' first.")
@@ -346,7 +375,13 @@ def _cmd_synthesis(shell: "MyLogicShell", parts: List[str]) -> None:
             original_nodes = len(nodes_data)
         else:
             original_nodes = 0
-        shell.current_aig = synthesize(shell.current_netlist)
+        # synthesis --array: dùng ArrayAIG (array-backed, ít bộ nhớ) cho design lớn
+        aig_class = None
+        if "--array" in parts[1:]:
+            from core.synthesis.aig_array import ArrayAIG
+            aig_class = ArrayAIG
+        shell.current_aig = synthesize(shell.current_netlist, aig_class=aig_class)
+        shell.reference_aig = shell.current_aig
         print("[OK] Synthesis completed!")
         print(f"  Netlist nodes: {original_nodes}")
         print(f"  AIG nodes: {shell.current_aig.count_nodes()}")
@@ -395,15 +430,70 @@ def _cmd_synthesis(shell: "MyLogicShell", parts: List[str]) -> None:
         traceback.print_exc()
 
 
+def _split_script_options(parts: List[str]) -> Tuple[List[str], Optional[str], Optional[float]]:
+    """
+    Tách ``--script <...>`` (lấy hết phần còn lại của dòng), ``--script-file <path>`` và
+    ``--timeout <sec>`` khỏi ``parts``; trả về (parts còn lại, script | None, timeout | None).
+    """
+    rest: List[str] = []
+    script = None
+    pass_timeout = None
+    i = 0
+    while i < len(parts):
+        p = parts[i]
+        if p == "--script":
+            script = " ".join(parts[i + 1:])
+            break
+        if p in ("--script-file", "--timeout") and i + 1 < len(parts):
+            if p == "--script-file":
+                script = parts[i + 1]
+            else:
+                pass_timeout = float(parts[i + 1])
+            i += 2
+            continue
+        rest.append(p)
+        i += 1
+    return rest, script, pass_timeout
+
+
+def _run_optimize_script(shell: "MyLogicShell", script: str, in_place: bool,
+                         pass_timeout: Optional[float]) -> None:
+    from core.optimization.pass_manager import ScriptError, run_script
+
+    try:
+        shell.current_aig, manager = run_script(shell.current_aig, script, in_place=in_place,
+                                                pass_timeout=pass_timeout)
+    except ScriptError as e:
+        print(f"[ERROR] Optimization script: {e}")
+        return
+    print("[OK] AIG Optimization (script) completed!")
+    print(manager.format_report())
+
+
 def _cmd_optimize(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
     if not shell.current_aig:
         print("[ERROR] No AIG available. Run 'synthesis' first to convert Netlist -> AIG.")
         return
     try:
         from core.optimization.optimization_flow import optimize
-        print("[INFO] Running AIG Optimization...")
+        parts = parts or []
+        # optimize --script <script...> / --script-file <path> [--timeout SEC]: chạy pass manager
+        parts, script, pass_timeout = _split_script_options(parts)
+        if script is not None:
+            _run_optimize_script(shell, script, "--in-place" in parts[1:], pass_timeout)
+            return
+        # optimize --in-place: các pass sửa trực tiếp AIG hiện tại (ít bộ nhớ hơn)
+        in_place = "--in-place" in parts[1:]
+        # optimize --no-fraig: bỏ bước FRAIG (SAT sweeping) cho design rất lớn
+        use_fraig = "--no-fraig" not in parts[1:]
+        # optimize --rewrite / --rewrite-z: thêm bước DAG-aware rewriting (-z: zero-cost)
+        rewrite_zero_cost = "--rewrite-z" in parts[1:]
+        use_rewrite = rewrite_zero_cost or "--rewrite" in parts[1:]
+        parts = [p for p in parts if p not in ("--in-place", "--no-fraig", "--rewrite", "--rewrite-z")]
+        print("[INFO] Running AIG Optimization..." + (" (in-place)" if in_place else ""))
         original_nodes = shell.current_aig.count_nodes()
-        shell.current_aig = optimize(shell.current_aig)
+        shell.current_aig = optimize(shell.current_aig, in_place=in_place, fraig=use_fraig,
+                                     rewrite=use_rewrite, rewrite_zero_cost=rewrite_zero_cost)
         final_nodes = shell.current_aig.count_nodes()
         reduction = original_nodes - final_nodes
         print("[OK] AIG Optimization completed!")
@@ -413,7 +503,6 @@ def _cmd_optimize(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> N
             print(f"  Total reduction: {reduction} nodes ({(reduction/original_nodes)*100:.1f}%)")
 
         # Optional: optimize --verilog [output_path] / optimize --json [output_path]
-        parts = parts or []
         if any(p in ("--verilog", "-v", "--json", "-j") for p in parts[1:]):
             import os
 
@@ -445,6 +534,107 @@ def _cmd_optimize(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> N
         traceback.print_exc()
 
 
+def _cmd_fraig(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
+    if not shell.current_aig:
+        print("[ERROR] No AIG available. Run 'synthesis' first to convert Netlist -> AIG.")
+        return
+    parts = parts or []
+    kwargs = {}
+    in_place = False
+    i = 1
+    try:
+        while i < len(parts):
+            p = parts[i]
+            if p == "--conflicts" and i + 1 < len(parts):
+                kwargs["conflict_limit"] = int(parts[i + 1]); i += 2
+            elif p in ("-n", "--patterns") and i + 1 < len(parts):
+                kwargs["num_patterns"] = int(parts[i + 1]); i += 2
+            elif p == "--candidates" and i + 1 < len(parts):
+                kwargs["max_candidates"] = int(parts[i + 1]); i += 2
+            elif p == "--seed" and i + 1 < len(parts):
+                kwargs["seed"] = int(parts[i + 1]); i += 2
+            elif p == "--in-place":
+                in_place = True; i += 1
+            else:
+                print(f"[ERROR] Unknown option: {p}")
+                print("Usage: fraig [-n N] [--conflicts C] [--candidates K] [--seed S] [--in-place]")
+                return
+    except ValueError:
+        print("[ERROR] -n/--conflicts/--candidates/--seed expect an integer")
+        return
+
+    try:
+        from core.optimization.fraig import FraigOptimizer
+
+        print("[INFO] Running FRAIG (functional reduction)..." + (" (in-place)" if in_place else ""))
+        optimizer = FraigOptimizer(**kwargs)
+        start = time.perf_counter()
+        shell.current_aig = optimizer.optimize(shell.current_aig, in_place=in_place)
+        elapsed = time.perf_counter() - start
+        stats = optimizer.stats
+        before, after = stats["nodes_before"], stats["nodes_after"]
+        print("[OK] FRAIG completed!")
+        print(f"  Original AIG nodes: {before}")
+        print(f"  FRAIG AIG nodes: {after}")
+        if before > 0:
+            print(f"  Reduction: {before - after} nodes ({(before - after) / before * 100:.1f}%)")
+        print(f"  Merged: {stats['merged']} (structural={stats['merged_structural']}, SAT={stats['merged_sat']})")
+        print(f"  SAT calls: {stats['sat_calls']} (proved={stats['proved']}, disproved={stats['disproved']}, "
+              f"undecided={stats['undecided']}); refinements: {stats['refinements']}")
+        print(f"  Time: {elapsed:.3f}s")
+    except Exception as e:
+        print(f"[ERROR] FRAIG failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+def _cmd_rewrite(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
+    if not shell.current_aig:
+        print("[ERROR] No AIG available. Run 'synthesis' first to convert Netlist -> AIG.")
+        return
+    parts = parts or []
+    kwargs = {}
+    in_place = False
+    i = 1
+    try:
+        while i < len(parts):
+            p = parts[i]
+            if p == "-z":
+                kwargs["zero_cost"] = True; i += 1
+            elif p == "--cuts" and i + 1 < len(parts):
+                kwargs["max_cuts"] = int(parts[i + 1]); i += 2
+            elif p == "--in-place":
+                in_place = True; i += 1
+            else:
+                print(f"[ERROR] Unknown option: {p}")
+                print("Usage: rewrite [-z] [--cuts K] [--in-place]")
+                return
+    except ValueError:
+        print("[ERROR] --cuts expects an integer")
+        return
+
+    try:
+        from core.optimization.rewrite import RewriteOptimizer
+
+        print("[INFO] Running DAG-aware rewriting..." + (" (zero-cost)" if kwargs.get("zero_cost") else "")
+              + (" (in-place)" if in_place else ""))
+        optimizer = RewriteOptimizer(**kwargs)
+        shell.current_aig = optimizer.optimize(shell.current_aig, in_place=in_place)
+        stats = optimizer.stats
+        before, after = stats["nodes_before"], stats["nodes_after"]
+        print("[OK] Rewrite completed!")
+        print(f"  Original AIG nodes: {before}")
+        print(f"  Rewritten AIG nodes: {after}")
+        if before > 0:
+            print(f"  Reduction: {before - after} nodes ({(before - after) / before * 100:.1f}%)")
+        print(f"  Rewrites: {stats['rewrites']} ({stats['cuts_evaluated']} cuts evaluated)")
+        print(f"  Time: {stats['time']:.3f}s")
+    except Exception as e:
+        print(f"[ERROR] Rewrite failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+
 def _cmd_export_aig(
     shell: "MyLogicShell",
     parts: Optional[List[str]] = None,
@@ -540,16 +730,18 @@ def _cmd_techmap(shell: "MyLogicShell", parts: List[str]) -> None:
     parts = parts or []
     if len(parts) >= 2 and parts[1].lower() in ("-h", "--help", "help"):
         print("Usage: techmap [library_file|library_type] [options]")
-        print("  Mapping strategy is fixed: area_optimal (area).")
+        print("  Default strategy: area_optimal (one cell per AIG AND).")
+        print("  --cut: cut-based mapper (AOI/OAI/MUX cells, delay-optimal + area recovery,")
+        print("         Total Delay = critical path)")
         print("Library types: asic, sky130, sky130_ls, skywater, fpga, ...")
         print("  Corner: MYLOGIC_SKY130_CORNER (hd: tt_025C_1v80; ls: tt_100C_1v80 default)")
-        print("Options: [--pure-library|--no-standard-merge]")
+        print("Options: [--cut] [--pure-library|--no-standard-merge]")
         print("         [--json [output_path]] [--verilog [output_path]]")
         print("Example: techmap sky130 --pure-library --verilog outputs/mapped.v")
         print("Note: Requires AIG (run synthesis / optimize first).")
         return
     library_path, merge_standard_library = _parse_techmap_cli_parts(parts)
-    strategy = "area_optimal"
+    strategy = "cut" if "--cut" in parts[1:] else "area_optimal"
 
     if not shell.current_aig:
         print("[ERROR] No AIG available. Run 'synthesis' first to convert Netlist -> AIG.")
@@ -564,7 +756,7 @@ def _cmd_techmap(shell: "MyLogicShell", parts: List[str]) -> None:
         )
         import os
 
-        print("[INFO] Running technology mapping (strategy: area_optimal, fixed).")
+        print(f"[INFO] Running technology mapping (strategy: {strategy}).")
         print(f"[INFO] Input AIG: {shell.current_aig.count_nodes()} nodes, {shell.current_aig.count_and_nodes()} AND nodes")
 
         library = None
@@ -606,6 +798,8 @@ def _cmd_techmap(shell: "MyLogicShell", parts: List[str]) -> None:
                 import os as _os
                 base_name = _os.path.splitext(_os.path.basename(shell.filename))[0]
                 mapped_netlist["name"] = f"{base_name}_mapped"
+            shell.mapped_netlist = mapped_netlist
+            shell.techmap_library = mapper.library
 
         print("\n" + "=" * 60)
         print("TECHNOLOGY MAPPING REPORT")
@@ -653,19 +847,200 @@ def _cmd_techmap(shell: "MyLogicShell", parts: List[str]) -> None:
         print(f"[ERROR] Technology mapping failed: {e}")
 
 
+def _cmd_libcache(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
+    usage = "Usage: libcache [list | clear [--stale] | dir]"
+    parts = parts or []
+    action = parts[1] if len(parts) > 1 else "list"
+    try:
+        from core.technology_mapping.library_cache import (
+            cache_dir,
+            cache_enabled,
+            clear_library_cache,
+            is_stale,
+            list_cached_libraries,
+        )
+    except ImportError:
+        print("[ERROR] Library cache module not available")
+        return
+
+    if action in ("-h", "--help", "help"):
+        print(usage)
+        print("  Compiled library snapshots used by techmap / complete_flow (keyed by source path,")
+        print("  mtime and content hash). Directory: MYLOGIC_CACHE_DIR; disable with MYLOGIC_LIBRARY_CACHE=0.")
+        return
+    if action == "dir":
+        print(f"[INFO] Library cache directory: {cache_dir()} ({'enabled' if cache_enabled() else 'disabled'})")
+        return
+    if action == "clear":
+        stale_only = "--stale" in parts[2:]
+        removed = clear_library_cache(stale_only=stale_only)
+        print(f"[OK] Removed {removed} {'stale ' if stale_only else ''}library snapshot(s) from {cache_dir()}")
+        return
+    if action != "list":
+        print(f"[ERROR] Unknown libcache action: {action}")
+        print(usage)
+        return
+
+    entries = list_cached_libraries()
+    print(f"[INFO] Library cache: {cache_dir()} ({'enabled' if cache_enabled() else 'disabled'})")
+    if not entries:
+        print("  (empty)")
+        return
+    print(f"  {'Library':<32} {'Kind':<9} {'Cells':>6} {'Size':>9} {'Sources':>8}  Status")
+    for entry in entries:
+        status = "stale" if is_stale(entry) else "valid"
+        first = entry.sources[0][0] if entry.sources else "-"
+        print(f"  {entry.library_name[:32]:<32} {entry.kind:<9} {entry.cells:>6} "
+              f"{entry.size / 1024:>7.1f}KB {len(entry.sources):>8}  {status}  {first}")
+
+
+def _cmd_lutmap(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
+    usage = ("Usage: lutmap [-K k] [--family xilinx|gowin|anlogic|ice40|lattice|intel] [--cuts C] "
+             "[--depth-relax D] [--json [path]] [--verilog [path]]")
+    if not shell.current_aig:
+        print("[ERROR] No AIG available. Run 'synthesis' first to convert Netlist -> AIG.")
+        return
+    parts = parts or []
+    kwargs = {}
+    family = "xilinx"
+    k = None
+    export_json = export_verilog = False
+    out_json: Optional[str] = None
+    out_v: Optional[str] = None
+    i = 1
+    try:
+        while i < len(parts):
+            p = parts[i]
+            if p in ("-h", "--help", "help"):
+                print(usage)
+                print("  Default: K = max LUT size of the family (xilinx/anlogic 6, others 4).")
+                return
+            if p == "-K" and i + 1 < len(parts):
+                k = int(parts[i + 1]); i += 2
+            elif p == "--family" and i + 1 < len(parts):
+                family = parts[i + 1]; i += 2
+            elif p == "--cuts" and i + 1 < len(parts):
+                kwargs["max_cuts"] = int(parts[i + 1]); i += 2
+            elif p == "--depth-relax" and i + 1 < len(parts):
+                kwargs["depth_relax"] = int(parts[i + 1]); i += 2
+            elif p in ("--json", "-j", "--verilog", "-v"):
+                path = parts[i + 1] if i + 1 < len(parts) and not parts[i + 1].startswith("-") else None
+                if p in ("--json", "-j"):
+                    export_json, out_json = True, path
+                else:
+                    export_verilog, out_v = True, path
+                i += 2 if path else 1
+            else:
+                print(f"[ERROR] Unknown option: {p}")
+                print(usage)
+                return
+    except ValueError:
+        print("[ERROR] -K / --cuts / --depth-relax expect an integer")
+        return
+
+    try:
+        from core.technology_mapping.lut_mapper import LUTMapper, get_lut_family, lut_mapping_to_netlist
+
+        lut_family = get_lut_family(family)
+        k = k or lut_family.max_k
+        if not 1 <= k <= lut_family.max_k:
+            print(f"[ERROR] {lut_family.name} LUT primitives support 1 <= K <= {lut_family.max_k}")
+            return
+        print(f"[INFO] Running FPGA LUT mapping (K={k}, family: {lut_family.name})...")
+        mapper = LUTMapper(k, **kwargs)
+        mapper.map(shell.current_aig)
+        netlist = lut_mapping_to_netlist(mapper, shell.current_aig, lut_family.name, shell.current_netlist)
+        if shell.filename:
+            base_name = os.path.splitext(os.path.basename(shell.filename))[0]
+            netlist["name"] = f"{base_name}_lut"
+        stats = mapper.stats
+        print("[OK] LUT mapping completed!")
+        print(f"  AIG AND nodes: {stats['and_nodes']}")
+        print(f"  LUT count: {stats['lut_count']} (depth-optimal pass: {stats['luts_depth_mapping']}, "
+              f"area-flow: {stats['luts_after_flow']}, exact-area: {stats['luts_after_exact']})")
+        print(f"  LUT depth: {stats['lut_depth']}")
+        print(f"  Time: {stats['time']:.3f}s")
+        if export_json:
+            _export_mapped_netlist_json(shell, netlist, out_json)
+        if export_verilog:
+            _export_mapped_verilog(shell, netlist, out_v)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+    except Exception as e:
+        print(f"[ERROR] LUT mapping failed: {e}")
+
+
+def _cmd_sta(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
+    usage = ("Usage: sta [-p period] [-k paths] [--input-slew S] [--output-load C] "
+             "[--input-arrival T] [--engine auto|python|numpy]")
+    parts = parts or []
+    kwargs = {}
+    max_paths = 5
+    i = 1
+    try:
+        while i < len(parts):
+            p = parts[i]
+            if p in ("-h", "--help", "help"):
+                print(usage)
+                print("  Static timing analysis of the last 'techmap' result (NLDM tables from Liberty;")
+                print("  cells without tables use their scalar delay). -p sets the required time for WNS/TNS.")
+                return
+            if p in ("-p", "--period") and i + 1 < len(parts):
+                kwargs["clock_period"] = float(parts[i + 1]); i += 2
+            elif p == "-k" and i + 1 < len(parts):
+                max_paths = int(parts[i + 1]); i += 2
+            elif p == "--input-slew" and i + 1 < len(parts):
+                kwargs["input_slew"] = float(parts[i + 1]); i += 2
+            elif p == "--output-load" and i + 1 < len(parts):
+                kwargs["output_load"] = float(parts[i + 1]); i += 2
+            elif p == "--input-arrival" and i + 1 < len(parts):
+                kwargs["input_arrival"] = float(parts[i + 1]); i += 2
+            elif p == "--engine" and i + 1 < len(parts) and parts[i + 1] in ("auto", "python", "numpy"):
+                kwargs["use_numpy"] = {"auto": None, "python": False, "numpy": True}[parts[i + 1]]; i += 2
+            else:
+                print(f"[ERROR] Unknown option: {p}")
+                print(usage)
+                return
+    except ValueError:
+        print("[ERROR] -p / --input-slew / --output-load / --input-arrival expect a number, -k an integer")
+        return
+
+    if not shell.mapped_netlist or shell.techmap_library is None:
+        print("[ERROR] No mapped netlist available. Run 'techmap' first.")
+        return
+    try:
+        from core.timing.sta import run_sta
+
+        print("[INFO] Running static timing analysis...")
+        report = run_sta(shell.mapped_netlist, shell.techmap_library, max_paths=max_paths, **kwargs)
+        print(report.format())
+        stats = report.stats
+        print(f"[OK] STA completed ({stats['engine']} engine, {stats['time']:.3f}s)")
+    except ImportError as e:
+        print(f"[ERROR] STA engine not available: {e}")
+    except Exception as e:
+        print(f"[ERROR] STA failed: {e}")
+
+
 def _cmd_complete_flow(shell: "MyLogicShell", parts: List[str]) -> None:
     parts = parts or []
     if len(parts) >= 2 and parts[1].lower() in ("-h", "--help", "help"):
         print("Usage: complete_flow [library_path_or_type] [options]")
         print("  Techmap strategy is fixed: area_optimal.")
         print("  library: optional (asic, sky130, sky130_ls, skywater, fpga, ... or path)")
-        print("  options: --pure-library | --no-standard-merge")
+        print("  options: --pure-library | --no-standard-merge | --cec (check synthesis vs optimization)")
+        print("           --script-file <path> | --timeout <sec> | --script <script...> (must be last)")
         print("Example: complete_flow sky130 --pure-library")
         return
     if not shell.current_netlist:
         print("[ERROR] No netlist loaded. Use 'read <file>' first.")
         return
 
+    try:
+        parts, optimization_script, pass_timeout = _split_script_options(parts)
+    except ValueError:
+        print("[ERROR] --timeout expects a number of seconds")
+        return
     positional_args = [p for p in parts[1:] if not p.startswith("--") and not p.startswith("-")]
     techmap_library_path = _library_token_from_positionals(positional_args)
     techmap_merge_standard_library = (
@@ -705,7 +1080,15 @@ def _cmd_complete_flow(shell: "MyLogicShell", parts: List[str]) -> None:
             enable_optimization=True,
             enable_techmap=True,
             techmap_merge_standard_library=techmap_merge_standard_library,
+            verify_equivalence="--cec" in parts[1:],
+            optimization_script=optimization_script,
+            pass_timeout=pass_timeout,
         )
+        shell.reference_aig = results["synthesis"].get("aig")
+        if results.get("verification"):
+            cec_result = results["verification"]["cec"]
+            status = {True: "EQUIVALENT", False: "NOT EQUIVALENT", None: "UNDECIDED"}[cec_result.equivalent]
+            print(f"[INFO] CEC synthesis vs optimization: {status} ({cec_result.stats['time_total']:.2f}s)")
 
         if results["optimization"].get("enabled") and results["optimization"].get("aig"):
             shell.current_aig = results["optimization"]["aig"]
@@ -832,10 +1215,15 @@ def register(shell: "MyLogicShell") -> Dict[str, Callable]:
         "balance": lambda parts=None: _cmd_balance(shell, parts),
         "synthesis": lambda parts: _cmd_synthesis(shell, parts),
         "optimize": lambda parts=None: _cmd_optimize(shell, parts),
+        "fraig": lambda parts=None: _cmd_fraig(shell, parts),
+        "rewrite": lambda parts=None: _cmd_rewrite(shell, parts),
         "export_aig": lambda parts=None: _cmd_export_aig(shell, parts),
         "dce": lambda parts: _cmd_dce(shell, parts),
         "aig": lambda parts: _cmd_aig(shell, parts),
         "techmap": lambda parts: _cmd_techmap(shell, parts),
+        "lutmap": lambda parts=None: _cmd_lutmap(shell, parts),
+        "libcache": lambda parts=None: _cmd_libcache(shell, parts),
+        "sta": lambda parts=None: _cmd_sta(shell, parts),
         "complete_flow": lambda parts: _cmd_complete_flow(shell, parts),
         "workflow": lambda parts: _cmd_complete_flow(shell, parts),
     }
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cli.mylogic_shell import MyLogicShell
+
+
+def _po_names(shell: "MyLogicShell", aig) -> List[str]:
+    """Tên PO theo netlist hiện tại (bus được mở rộng từng bit giống aig_to_netlist)."""
+    netlist = shell.current_netlist if isinstance(shell.current_netlist, dict) else None
+    names: List[str] = []
+    if netlist:
+        attrs = netlist.get("attrs", {}) or {}
+        widths = (attrs.get("vector_widths", {}) or {}) if isinstance(attrs, dict) else {}
+        for out_name in netlist.get("outputs", []) or []:
+            w = widths.get(out_name, 1)
+            if isinstance(w, int) and w > 1:
+                names.extend(f"{out_name}[{i}]" for i in range(w))
+            else:
+                names.append(out_name)
+    if len(names) != len(aig.pos):
+        names = [f"out{i}" for i in range(len(aig.pos))]
+    return names
+
+
+def _read_vectors_file(path: str) -> List:
+    """
+    Đọc file vector: mỗi dòng một vector, dạng chuỗi bit theo thứ tự PI
+    (``0110``) hoặc các cặp ``name=value`` (``a=1 b=0``). ``#`` bắt đầu comment.
+    """
+    vectors: List = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            if "=" in line:
+                vec = {}
+                for token in line.replace(",", " ").split():
+                    name, _, value = token.partition("=")
+                    vec[name.strip()] = int(value.strip(), 0)
+                vectors.append(vec)
+            else:
+                vectors.append(line.replace(" ", ""))
+    return vectors
+
+
+def _cmd_simulate(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
+    if not shell.current_aig:
+        print("[ERROR] No AIG available. Run 'synthesis' first to convert Netlist -> AIG.")
+        return
+    parts = parts or []
+    num_patterns = None
+    seed = None
+    show = None
+    vectors_path = None
+    exhaustive = False
+    i = 1
+    try:
+        while i < len(parts):
+            p = parts[i]
+            if p in ("-n", "--patterns") and i + 1 < len(parts):
+                num_patterns = int(parts[i + 1]); i += 2
+            elif p == "--seed" and i + 1 < len(parts):
+                seed = int(parts[i + 1]); i += 2
+            elif p == "--show" and i + 1 < len(parts):
+                show = int(parts[i + 1]); i += 2
+            elif p in ("--vectors", "-f") and i + 1 < len(parts):
+                vectors_path = parts[i + 1]; i += 2
+            elif p in ("--exhaustive", "-e"):
+                exhaustive = True; i += 1
+            else:
+                print(f"[ERROR] Unknown option: {p}")
+                print("Usage: simulate [-n N] [--seed S] [--exhaustive] [--vectors <file>] [--show K]")
+                return
+    except ValueError:
+        print("[ERROR] -n/--seed/--show expect an integer")
+        return
+
+    try:
+        from core.verification.simulation import AIGSimulator, DEFAULT_NUM_PATTERNS
+
+        aig = shell.current_aig
+        sim = AIGSimulator(aig)
+        start = time.perf_counter()
+        if vectors_path:
+            vectors = _read_vectors_file(vectors_path)
+            mode = f"vectors ({vectors_path})"
+            result = sim.simulate_vectors(vectors)
+        elif exhaustive:
+            mode = "exhaustive"
+            result = sim.simulate_exhaustive()
+        else:
+            mode = "random" + (f" (seed={seed})" if seed is not None else "")
+            result = sim.simulate_random(num_patterns or DEFAULT_NUM_PATTERNS, seed)
+        elapsed = time.perf_counter() - start
+
+        print(f"[INFO] Simulating AIG: {len(aig.pis)} inputs, {len(aig.pos)} outputs, "
+              f"{sim.num_and_nodes} AND nodes")
+        print(f"[OK] Simulation completed ({mode})")
+        print(f"  Patterns: {result.num_patterns}")
+        print(f"  Time: {elapsed * 1e3:.2f} ms")
+        if elapsed > 0:
+            rate = sim.num_and_nodes * result.num_patterns / elapsed
+            print(f"  Throughput: {rate / 1e6:.1f} M node-patterns/s")
+
+        po_names = _po_names(shell, aig)
+        if result.num_patterns:
+            print("  Output signal probability (fraction of patterns = 1):")
+            for name, ones in zip(po_names, result.ones_count()):
+                print(f"    {name}: {ones / result.num_patterns:.3f} ({ones}/{result.num_patterns})")
+
+        # Bảng pattern: mặc định hiện hết khi dùng vectors, còn lại chỉ khi có --show
+        if show is None and vectors_path:
+            show = result.num_patterns
+        if show:
+            count = min(show, result.num_patterns)
+            print(f"  Patterns (first {count}): inputs [{' '.join(sim.pi_names)}] -> outputs [{' '.join(po_names)}]")
+            for k in range(count):
+                ins = "".join(str(b) for b in result.input_bits(k))
+                outs = "".join(str(b) for b in result.output_bits(k))
+                print(f"    {k:4d}: {ins} -> {outs}")
+    except FileNotFoundError:
+        print(f"[ERROR] Vectors file not found: {vectors_path}")
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+    except Exception as e:
+        print(f"[ERROR] Simulation failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+def _synthesize_file(path: str):
+    """Parse + synthesize một file Verilog thành AIG (để so sánh bằng cec)."""
+    from parsers import parse_verilog
+    from core.synthesis.synthesis_flow import synthesize
+
+    return synthesize(parse_verilog(path))
+
+
+def _cmd_cec(shell: "MyLogicShell", parts: Optional[List[str]] = None) -> None:
+    parts = parts or []
+    num_patterns = 2048
+    seed = 1
+    conflict_limit = None
+    files: List[str] = []
+    i = 1
+    try:
+        while i < len(parts):
+            p = parts[i]
+            if p in ("-n", "--patterns") and i + 1 < len(parts):
+                num_patterns = int(parts[i + 1]); i += 2
+            elif p == "--seed" and i + 1 < len(parts):
+                seed = int(parts[i + 1]); i += 2
+            elif p == "--conflicts" and i + 1 < len(parts):
+                conflict_limit = int(parts[i + 1]); i += 2
+            elif p.startswith("-"):
+                print(f"[ERROR] Unknown option: {p}")
+                print("Usage: cec [file1.v [file2.v]] [-n N] [--seed S] [--conflicts C]")
+                return
+            else:
+                files.append(p); i += 1
+    except ValueError:
+        print("[ERROR] -n/--seed/--conflicts expect an integer")
+        return
+    if len(files) > 2:
+        print("Usage: cec [file1.v [file2.v]] [-n N] [--seed S] [--conflicts C]")
+        return
+
+    try:
+        from core.verification.cec import check_equivalence
+
+        # cec              : AIG sau synthesis vs AIG hiện tại
+        # cec a.v          : AIG hiện tại vs a.v (synthesize lại)
+        # cec a.v b.v      : a.v vs b.v
+        if not files:
+            if not shell.current_aig or not shell.reference_aig:
+                print("[ERROR] No AIG available. Run 'synthesis' (and 'optimize') first.")
+                return
+            if shell.reference_aig is shell.current_aig:
+                print("[WARNING] Current AIG is the post-synthesis AIG "
+                      "(not optimized yet, or optimized with --in-place); nothing to compare.")
+                return
+            label1, aig1 = "synthesis", shell.reference_aig
+            label2, aig2 = "current", shell.current_aig
+        elif len(files) == 1:
+            if not shell.current_aig:
+                print("[ERROR] No AIG available. Run 'synthesis' first to convert Netlist -> AIG.")
+                return
+            label1, aig1 = "current", shell.current_aig
+            label2, aig2 = files[0], _synthesize_file(files[0])
+        else:
+            label1, aig1 = files[0], _synthesize_file(files[0])
+            label2, aig2 = files[1], _synthesize_file(files[1])
+
+        print(f"[INFO] CEC: {label1} ({aig1.count_and_nodes()} AND) vs {label2} ({aig2.count_and_nodes()} AND)")
+        result = check_equivalence(aig1, aig2, num_patterns=num_patterns, seed=seed,
+                                   conflict_limit=conflict_limit)
+        stats = result.stats
+        methods: Dict[str, int] = {}
+        for o in result.outputs:
+            if o.status == "equal":
+                methods[o.method] = methods.get(o.method, 0) + 1
+        if result.unmatched_inputs:
+            print(f"[WARNING] Inputs present on one side only (treated as free): "
+                  f"{', '.join(result.unmatched_inputs[:10])}"
+                  f"{' ...' if len(result.unmatched_inputs) > 10 else ''}")
+        print(f"  Outputs: {stats['outputs']}  Miter AND nodes: {stats['miter_and_nodes']}")
+        print(f"  Proved: {', '.join(f'{k}={v}' for k, v in sorted(methods.items())) or 'none'}")
+        print(f"  SAT calls: {stats['sat_calls']}  conflicts: {stats['sat_conflicts']}")
+        print(f"  Time: {stats['time_total']:.3f}s")
+        if result.equivalent is True:
+            print("[OK] Networks are EQUIVALENT")
+        elif result.equivalent is None:
+            undecided = [o.index for o in result.outputs if o.status == "undecided"]
+            print(f"[WARNING] UNDECIDED: {len(undecided)} output(s) hit the conflict limit: {undecided[:10]}")
+        else:
+            po_names = _po_names(shell, aig1)
+            failing = result.failing_outputs
+            print(f"[ERROR] Networks are NOT EQUIVALENT: {len(failing)} output(s) differ")
+            for idx in failing[:10]:
+                print(f"    {po_names[idx]} (output {idx}, found by {result.outputs[idx].method})")
+            cex = result.counterexample
+            if cex:
+                assigned = " ".join(f"{k}={v}" for k, v in cex.items())
+                print(f"  Counterexample: {assigned}")
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+    except Exception as e:
+        print(f"[ERROR] CEC failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+def register(shell: "MyLogicShell") -> Dict[str, Callable]:
+    return {
+        "simulate": lambda parts=None: _cmd_simulate(shell, parts),
+        "cec": lambda parts=None: _cmd_cec(shell, parts),
+    }
@@ -7,7 +7,7 @@ from typing import Any, Dict, Optional, Union
 # Thêm thư mục gốc project vào đường dẫn
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from cli.commands import dump_ast, dump_synth, file_ops, help_cmd, inspect, synthesis_cmds
+from cli.commands import dump_ast, dump_synth, file_ops, help_cmd, inspect, synthesis_cmds, verify_cmds
 
 
 class MyLogicShell:
@@ -18,6 +18,11 @@ class MyLogicShell:
         self.netlist: Optional[Union[Dict[str, Any], Any]] = None
         self.current_netlist: Optional[Union[Dict[str, Any], Any]] = None
         self.current_aig = None  # AIG object sau synthesis
+        self.reference_aig = None  # AIG ngay sau synthesis (tham chiếu cho 'cec')
+        self.mapped_netlist: Optional[Dict[str, Any]] = None  # Netlist sau techmap (cho 'sta')
+        self.techmap_library = None  # Thư viện đã dùng cho techmap gần nhất
+        self.aiger_model = None  # AigerModel từ 'read_aig' (tên PO, latch)
+        self.last_tracer = None  # Tracer của lần 'trace stop' gần nhất
         self.filename: Optional[str] = None
         self.history: list = []
         self.config = config or {}
@@ -40,6 +45,7 @@ class MyLogicShell:
         self.commands.update(dump_ast.register(self))
         self.commands.update(dump_synth.register(self))
         self.commands.update(synthesis_cmds.register(self))
+        self.commands.update(verify_cmds.register(self))
         self.commands.update(help_cmd.register(self))
         self._setup_readline()
 
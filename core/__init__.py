@@ -5,10 +5,12 @@ Tổ chức các thuật toán EDA theo chức năng:
 - synthesis: Logic synthesis algorithms
 - optimization: Logic optimization algorithms  
 - technology_mapping: Technology mapping algorithms
+- verification: Bit-parallel AIG simulation, SAT, equivalence checking
 """
 
 # Core modules
-# NOTE: Simulation module removed from project scope.
+# NOTE: RTL simulation module removed from project scope (dùng ModelSim);
+# core.verification (mô phỏng AIG bit-parallel, SAT, CEC) import trực tiếp khi cần.
 
 # Synthesis modules
 from .synthesis.strash import *
@@ -12,10 +12,9 @@ Luồng phù hợp phạm vi đề tài: tổng hợp luận lý, tối ưu, án
 
 import sys
 import os
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, List, Set, Any, Optional, Sequence, Union
 from pathlib import Path
 import logging
-import re
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -40,365 +39,38 @@ def _safe_log_msg(msg: str) -> str:
 def netlist_to_verilog(netlist: Dict[str, Any], module_name: str) -> str:
     """
     Convert netlist dictionary to Verilog code.
-    
-    Standalone utility function to enable Verilog output generation
-    after synthesis/optimization/techmap steps (like Yosys).
-    
-    Args:
-        netlist: Netlist dictionary with 'inputs', 'outputs', 'nodes'
-        module_name: Name for the Verilog module
-        
-    Returns:
-        Verilog code as string
+
+    Giữ cho tương thích: dùng chung writer của ``core/export/verilog_writer.py``
+    (ghi file lớn nên gọi thẳng ``write_verilog`` với file handle).
     """
-    inputs = netlist.get('inputs', [])
-    outputs = netlist.get('outputs', [])
-    nodes = netlist.get('nodes', {})
-    attrs = netlist.get('attrs', {})
-    output_mapping = attrs.get('output_mapping', {})
-    
-    # Convert nodes dict to list if needed
-    if isinstance(nodes, dict):
-        nodes_list = list(nodes.values())
-        nodes_dict = nodes
-    else:
-        nodes_list = nodes
-        nodes_dict = {node.get('id', f'node_{i}'): node for i, node in enumerate(nodes) if isinstance(node, dict)}
-    
-    lines = [f"module {module_name}("]
-    
-    # Port declarations
-    if inputs:
-        lines.append(f"  input {', '.join(inputs)},")
-    if outputs:
-        lines.append(f"  output {', '.join(outputs)}")
-    
-    lines.append(");")
-    lines.append("")
-    
-    # Wire declarations
-    # First pass: collect all signals referenced in nodes
-    internal_signals = set()
-    referenced_signals = set()  # Signals referenced in assign statements
-    
-    # Pattern to match Verilog constants (e.g., 1'b0, 2'b00, 8'hFF)
-    const_pattern = re.compile(r"^\d+'[bdh]\w+$")
-    
-    # Collect signals that are outputs of nodes
-    for node in nodes_list:
-        if isinstance(node, dict):
-            output = node.get('output', node.get('id', ''))
-            if output and output not in inputs and output not in outputs:
-                # Skip constant signals (const_True, const_False, and Verilog constants like 1'b0, 2'b00)
-                if output not in ['const_True', 'const_False'] and not const_pattern.match(str(output)):
-                    internal_signals.add(output)
-    
-    # Second pass: collect all signals referenced in input_signals
-    # This includes temporary signals like _temp_3, _temp_5 that may not have nodes
-    for node in nodes_list:
-        if not isinstance(node, dict):
-            continue
-        node_inputs = node.get('inputs', [])
-        node_fanins = node.get('fanins', [])
-        
-        # Collect from fanins
-        if node_fanins:
-            for fanin in node_fanins:
-                if isinstance(fanin, (list, tuple)) and len(fanin) >= 1:
-                    signal = str(fanin[0])
-                    if signal not in ['const_True', 'const_False'] and signal not in inputs and signal not in outputs and not const_pattern.match(signal):
-                        referenced_signals.add(signal)
-                else:
-                    signal = str(fanin)
-                    if signal not in ['const_True', 'const_False'] and signal not in inputs and signal not in outputs and not const_pattern.match(signal):
-                        referenced_signals.add(signal)
-        # Collect from inputs
-        elif node_inputs:
-            for inp in node_inputs:
-                signal = str(inp)
-                if signal not in ['const_True', 'const_False'] and signal not in inputs and signal not in outputs and not const_pattern.match(signal):
-                    referenced_signals.add(signal)
-    
-    # Also collect signals from output_mapping (temp signals)
-    # These are signals that map to nodes but don't have nodes with output field
-    output_mapping_signals = set()
-    if output_mapping:
-        for signal, node_id in output_mapping.items():
-            if signal not in inputs and signal not in outputs:
-                if signal not in ['const_True', 'const_False'] and not const_pattern.match(str(signal)):
-                    output_mapping_signals.add(signal)
-                    # Also add to referenced_signals so we create wire declarations
-                    referenced_signals.add(signal)
-    
-    # Combine internal_signals and referenced_signals
-    all_internal_signals = internal_signals.union(referenced_signals)
-    
-    if all_internal_signals:
-        lines.append("  // Internal wires")
-        for signal in sorted(all_internal_signals):
-            lines.append(f"  wire {signal};")
-        lines.append("")
-    
-    # Logic statements
-    lines.append("  // Logic implementation")
-    
-    # First, create assign statements for signals in output_mapping
-    # These are temp signals that map to nodes
-    if output_mapping and nodes_dict:
-        for signal, node_id in output_mapping.items():
-            if signal not in inputs and signal not in outputs:
-                # Find the node for this signal
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    if isinstance(node, dict):
-                        node_type = node.get('type', '')
-                        node_inputs = node.get('inputs', [])
-                        node_fanins = node.get('fanins', [])
-                        
-                        # Get input signals
-                        input_signals = []
-                        if node_fanins:
-                            for fanin in node_fanins:
-                                if isinstance(fanin, (list, tuple)) and len(fanin) >= 1:
-                                    sig = str(fanin[0])
-                                    if sig == 'const_True':
-                                        sig = "1'b1"
-                                    elif sig == 'const_False':
-                                        sig = "1'b0"
-                                    if len(fanin) > 1 and fanin[1]:
-                                        sig = f"~{sig}"
-                                    input_signals.append(sig)
-                                else:
-                                    sig = str(fanin)
-                                    if sig == 'const_True':
-                                        sig = "1'b1"
-                                    elif sig == 'const_False':
-                                        sig = "1'b0"
-                                    input_signals.append(sig)
-                        elif node_inputs:
-                            for inp in node_inputs:
-                                sig = str(inp)
-                                if sig == 'const_True':
-                                    sig = "1'b1"
-                                elif sig == 'const_False':
-                                    sig = "1'b0"
-                                input_signals.append(sig)
-                        
-                        # Generate assign statement
-                        if node_type.upper() == 'AND' and len(input_signals) >= 2:
-                            expr = " & ".join(input_signals)
-                            lines.append(f"  assign {signal} = {expr};")
-                        elif node_type.upper() == 'OR' and len(input_signals) >= 2:
-                            expr = " | ".join(input_signals)
-                            lines.append(f"  assign {signal} = {expr};")
-                        elif node_type.upper() in ['NOT', 'INV'] and len(input_signals) >= 1:
-                            lines.append(f"  assign {signal} = ~{input_signals[0]};")
-                        elif node_type.upper() == 'XOR' and len(input_signals) >= 2:
-                            expr = " ^ ".join(input_signals)
-                            lines.append(f"  assign {signal} = {expr};")
-                        elif node_type.upper() == 'NAND' and len(input_signals) >= 2:
-                            expr = " & ".join(input_signals)
-                            lines.append(f"  assign {signal} = ~({expr});")
-                        elif node_type.upper() == 'NOR' and len(input_signals) >= 2:
-                            expr = " | ".join(input_signals)
-                            lines.append(f"  assign {signal} = ~({expr});")
-                        # Fallback to AND
-                        elif len(input_signals) >= 2:
-                            expr = " & ".join(input_signals)
-                            lines.append(f"  assign {signal} = {expr};")
-    
-    # Then, create gate instances or assign statements for nodes
-    instance_counter = {}  # Track instance numbers for each cell type
-    
-    for node in nodes_list:
-        if not isinstance(node, dict):
-            continue
-        
-        node_type = node.get('type', '')
-        node_inputs = node.get('inputs', [])
-        node_fanins = node.get('fanins', [])
-        output = node.get('output', node.get('id', ''))
-        cell_name = node.get('cell_name', '')
-        mapped = node.get('mapped', False)
-        
-        if not output:
-            continue
-        
-        # Get input signals
-        if node_fanins:
-            input_signals = []
-            for fanin in node_fanins:
-                if isinstance(fanin, (list, tuple)) and len(fanin) >= 1:
-                    signal = str(fanin[0])
-                    # Replace const_True/const_False with Verilog literals
-                    if signal == 'const_True':
-                        signal = "1'b1"
-                    elif signal == 'const_False':
-                        signal = "1'b0"
-                    if len(fanin) > 1 and fanin[1]:  # Inverted
-                        signal = f"~{signal}"
-                    input_signals.append(signal)
-                else:
-                    signal = str(fanin)
-                    # Replace const_True/const_False with Verilog literals
-                    if signal == 'const_True':
-                        signal = "1'b1"
-                    elif signal == 'const_False':
-                        signal = "1'b0"
-                    input_signals.append(signal)
-        elif node_inputs:
-            input_signals = []
-            for inp in node_inputs:
-                signal = str(inp)
-                # Replace const_True/const_False with Verilog literals
-                if signal == 'const_True':
-                    signal = "1'b1"
-                elif signal == 'const_False':
-                    signal = "1'b0"
-                input_signals.append(signal)
-        else:
-            continue
-        
-        # If node is mapped to a library cell, create gate instance
-        if mapped and cell_name:
-            # Create gate instance: cell_name instance_name (.pin1(sig1), .pin2(sig2), .out(sig_out));
-            # Get cell pin names from node (if available) or use default A, B, Y
-            cell_pins = node.get('cell_pins', {})
-            
-            # Default pin names for common gates
-            if not cell_pins:
-                if len(input_signals) == 1:
-                    cell_pins = {'A': input_signals[0], 'Y': output}
-                elif len(input_signals) == 2:
-                    cell_pins = {'A': input_signals[0], 'B': input_signals[1], 'Y': output}
-                elif len(input_signals) == 3:
-                    cell_pins = {'A': input_signals[0], 'B': input_signals[1], 'C': input_signals[2], 'Y': output}
-                else:
-                    # Use positional mapping
-                    pin_names = ['A', 'B', 'C', 'D', 'E', 'F'][:len(input_signals)]
-                    cell_pins = {pin: sig for pin, sig in zip(pin_names, input_signals)}
-                    cell_pins['Y'] = output
-            
-            # Generate instance name
-            if cell_name not in instance_counter:
-                instance_counter[cell_name] = 0
-            instance_counter[cell_name] += 1
-            instance_name = f"{cell_name}_inst{instance_counter[cell_name]}"
-            
-            # Create instance statement
-            pin_connections = []
-            for pin, signal in cell_pins.items():
-                pin_connections.append(f".{pin}({signal})")
-            
-            instance_line = f"  {cell_name} {instance_name} ({', '.join(pin_connections)});"
-            lines.append(instance_line)
-            continue
-        
-        # Generate Verilog statement (for unmapped nodes)
-        node_type_upper = node_type.upper()
-        
-        # Check if it's a library cell name
-        is_library_cell = False
-        gate_function = None
-        
-        if node_type_upper.startswith('AND') and len(input_signals) >= 2:
-            gate_function = 'AND'
-            is_library_cell = True
-        elif node_type_upper.startswith('NAND') and len(input_signals) >= 2:
-            gate_function = 'NAND'
-            is_library_cell = True
-        elif node_type_upper.startswith('OR') and len(input_signals) >= 2 and not node_type_upper.startswith('NOR'):
-            gate_function = 'OR'
-            is_library_cell = True
-        elif node_type_upper.startswith('NOR') and len(input_signals) >= 2:
-            gate_function = 'NOR'
-            is_library_cell = True
-        elif node_type_upper.startswith('XOR') and len(input_signals) >= 2:
-            gate_function = 'XOR'
-            is_library_cell = True
-        elif node_type_upper in ['NOT', 'INV'] and len(input_signals) >= 1:
-            gate_function = 'NOT'
-            is_library_cell = True
-        
-        # Generate Verilog based on gate function
-        if gate_function == 'AND' or (node_type in ['AND', 'and'] and not is_library_cell):
-            if len(input_signals) >= 2:
-                expr = " & ".join(input_signals)
-                lines.append(f"  assign {output} = {expr};")
-        elif gate_function == 'OR' or (node_type in ['OR', 'or'] and not is_library_cell):
-            if len(input_signals) >= 2:
-                expr = " | ".join(input_signals)
-                lines.append(f"  assign {output} = {expr};")
-        elif gate_function == 'NOT' or node_type in ['NOT', 'not']:
-            if len(input_signals) >= 1:
-                lines.append(f"  assign {output} = ~{input_signals[0]};")
-        elif gate_function == 'XOR' or node_type in ['XOR', 'xor']:
-            if len(input_signals) >= 2:
-                expr = " ^ ".join(input_signals)
-                lines.append(f"  assign {output} = {expr};")
-        elif gate_function == 'NAND' or node_type in ['NAND', 'nand']:
-            if len(input_signals) >= 2:
-                expr = " & ".join(input_signals)
-                lines.append(f"  assign {output} = ~({expr});")
-        elif gate_function == 'NOR' or node_type in ['NOR', 'nor']:
-            if len(input_signals) >= 2:
-                expr = " | ".join(input_signals)
-                lines.append(f"  assign {output} = ~({expr});")
-        else:
-            # Try to extract function from node if available
-            function_str = node.get('function', '')
-            if function_str:
-                # Parse function string like "AND(A,B)" or "NAND(A,B)"
-                func_match = re.match(r'^(\w+)\s*\(', function_str)
-                if func_match:
-                    func_name = func_match.group(1).upper()
-                    if func_name in ['AND'] and len(input_signals) >= 2:
-                        expr = " & ".join(input_signals)
-                        lines.append(f"  assign {output} = {expr};")
-                    elif func_name in ['OR'] and len(input_signals) >= 2:
-                        expr = " | ".join(input_signals)
-                        lines.append(f"  assign {output} = {expr};")
-                    elif func_name in ['NAND'] and len(input_signals) >= 2:
-                        expr = " & ".join(input_signals)
-                        lines.append(f"  assign {output} = ~({expr});")
-                    elif func_name in ['NOR'] and len(input_signals) >= 2:
-                        expr = " | ".join(input_signals)
-                        lines.append(f"  assign {output} = ~({expr});")
-                    elif func_name in ['XOR'] and len(input_signals) >= 2:
-                        expr = " ^ ".join(input_signals)
-                        lines.append(f"  assign {output} = {expr};")
-                    elif func_name in ['NOT', 'INV'] and len(input_signals) >= 1:
-                        lines.append(f"  assign {output} = ~{input_signals[0]};")
-                    else:
-                        # Generic gate - use basic AND as fallback
-                        if len(input_signals) >= 2:
-                            expr = " & ".join(input_signals)
-                            lines.append(f"  assign {output} = {expr};")
-                else:
-                    # Generic gate - use basic AND as fallback
-                    if len(input_signals) >= 2:
-                        expr = " & ".join(input_signals)
-                        lines.append(f"  assign {output} = {expr};")
-            else:
-                # Generic gate - use basic AND as fallback
-                if len(input_signals) >= 2:
-                    expr = " & ".join(input_signals)
-                    lines.append(f"  assign {output} = {expr};")
-    
-    lines.append("")
-    lines.append("endmodule")
-    
-    return "\n".join(lines)
+    from core.export.verilog_writer import netlist_to_verilog as _netlist_to_verilog
+
+    return _netlist_to_verilog(netlist, module_name=module_name)
+
+
+def _cec_status(cec_result) -> str:
+    """Chuỗi trạng thái ngắn cho log (EQUIVALENT / NOT EQUIVALENT / UNDECIDED)."""
+    if cec_result.equivalent is True:
+        return "EQUIVALENT"
+    if cec_result.equivalent is False:
+        return f"NOT EQUIVALENT (outputs {cec_result.failing_outputs[:8]})"
+    return "UNDECIDED"
 
 
 def run_complete_flow(
-    netlist: Dict[str, Any],
+    netlist: Union[Dict[str, Any], str, Sequence[str]],
     techmap_library = None,
     enable_optimization: bool = True,
     enable_techmap: bool = True,
     output_dir: Optional[str] = None,
     write_verilog: bool = True,
     techmap_merge_standard_library: bool = True,
+    verify_equivalence: bool = False,
+    run_timing_analysis: bool = False,
+    sta_options: Optional[Dict[str, Any]] = None,
+    optimization_script: Optional[str] = None,
+    pass_timeout: Optional[float] = None,
+    top: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Chạy complete flow: Synthesis → Optimization → Technology Mapping (một chuẩn duy nhất).
@@ -409,7 +81,8 @@ def run_complete_flow(
     3. TECHMAP (optional): AIG → Technology-mapped netlist (luôn area_optimal).
 
     Args:
-        netlist: Circuit netlist dictionary từ parser
+        netlist: Circuit netlist dictionary từ parser, hoặc đường dẫn file Verilog
+            (một hay nhiều file; parse bằng ``parse_verilog_hierarchy``)
         techmap_library: Technology library object (None = auto-load standard library)
         enable_optimization: Có chạy optimization không (default: True)
         enable_techmap: Có chạy technology mapping không (default: True)
@@ -417,6 +90,17 @@ def run_complete_flow(
         write_verilog: Có xuất file .v sau mỗi bước không (default: True, giống Yosys)
         techmap_merge_standard_library: Gộp thư viện generic vào techmap (default: True).
             Đặt False để chỉ dùng thư viện đã truyền (ví dụ thuần Sky130).
+        verify_equivalence: Chạy CEC giữa AIG sau synthesis và sau optimization
+            (default: False); kết quả ở ``results['verification']``.
+        run_timing_analysis: Chạy STA (NLDM nếu thư viện có bảng Liberty) trên netlist
+            sau techmap (default: False); kết quả ở ``results['timing']``.
+        sta_options: Tham số cho ``StaticTimingAnalyzer`` (``clock_period``,
+            ``input_slew``, ``output_load``, ...) và ``max_paths``.
+        optimization_script: Script của pass manager (chuỗi hoặc đường dẫn file,
+            ví dụ ``"strash; dce; repeat(rw; b) until gain<1%"``) thay cho chuỗi
+            optimization cố định; báo cáo per-pass ở ``stats['passes']``.
+        pass_timeout: Timeout (giây) cho mỗi pass của ``optimization_script``.
+        top: Module top khi ``netlist`` là file Verilog (None = tự chọn).
         
     Returns:
         Dictionary chứa kết quả của tất cả các bước:
@@ -436,6 +120,14 @@ def run_complete_flow(
                 'results': techmap results,
                 'enabled': bool
             },
+            'verification': {
+                'cec': CECResult (if verify_equivalence=True),
+                'equivalent': True / False / None (undecided)
+            },
+            'timing': {
+                'report': STAReport (if run_timing_analysis=True),
+                'critical_delay', 'wns', 'tns': floats
+            },
             'output_files': {
                 'syn': path to *_syn.v (if write_verilog=True),
                 'opt': path to *_opt.v (if optimization enabled),
@@ -454,11 +146,18 @@ def run_complete_flow(
         >>> synthesized_aig = results['synthesis']['aig']
         >>> optimized_aig = results['optimization']['aig']
         >>> techmap_results = results['techmap']['results']
+        >>> 
+        >>> # Design nhiều file
+        >>> results = run_complete_flow(["adder.v", "top.v"], top="top")
     """
     logger.info("=" * 70)
     logger.info(_safe_log_msg("COMPLETE FLOW: Synthesis -> Optimization -> Technology Mapping"))
     logger.info("=" * 70)
     
+    if not isinstance(netlist, dict):
+        from frontends.verilog import parse_verilog_hierarchy
+        netlist = parse_verilog_hierarchy([netlist] if isinstance(netlist, str) else list(netlist), top=top)
+    
     # Get module name from netlist
     module_name = netlist.get('name', 'design')
     
@@ -517,12 +216,9 @@ def run_complete_flow(
                 # IMPORTANT:
                 # Use netlist-based Verilog export so vector widths (e.g. sel[1:0]) are preserved.
                 # AIG-only export may lose bus information and emit invalid port lists.
-                from core.export import netlist_to_verilog as export_netlist_to_verilog
-                synthesized_verilog = export_netlist_to_verilog(
-                    synthesized_netlist, module_name=f"{module_name}_syn"
-                )
+                from core.export import write_verilog as export_write_verilog
                 output_file = output_dir / f"{module_name}_syn.v"
-                output_file.write_text(synthesized_verilog, encoding='utf-8')
+                export_write_verilog(synthesized_netlist, str(output_file), module_name=f"{module_name}_syn")
                 results['output_files']['syn'] = str(output_file)
                 logger.info(_safe_log_msg(f"[FILE] Written: {output_file.name}"))
             except Exception as e:
@@ -546,8 +242,13 @@ def run_complete_flow(
             
             original_aig_nodes = aig.count_nodes()
             logger.info(f"Input AIG: {original_aig_nodes} nodes")
-            # Run optimization (một chuẩn duy nhất)
-            optimized_aig = optimize(aig)
+            # Run optimization (một chuẩn duy nhất, hoặc script của pass manager)
+            manager = None
+            if optimization_script:
+                from core.optimization.pass_manager import run_script
+                optimized_aig, manager = run_script(aig, optimization_script, pass_timeout=pass_timeout)
+            else:
+                optimized_aig = optimize(aig)
             
             optimization_stats = {
                 'nodes_before': original_aig_nodes,
@@ -555,6 +256,11 @@ def run_complete_flow(
                 'reduction': original_aig_nodes - optimized_aig.count_nodes(),
                 'reduction_percent': ((original_aig_nodes - optimized_aig.count_nodes()) / original_aig_nodes * 100) if original_aig_nodes > 0 else 0
             }
+            if manager is not None:
+                optimization_stats['script'] = manager.script
+                optimization_stats['passes'] = manager.stats['passes']
+                for line in manager.format_report().splitlines():
+                    logger.info(f"   {line}")
             
             results['optimization'] = {
                 'aig': optimized_aig,
@@ -573,12 +279,9 @@ def run_complete_flow(
             # Write Verilog file after optimization (like Yosys)
             if write_verilog:
                 try:
-                    from core.export import netlist_to_verilog as export_netlist_to_verilog
-                    optimized_verilog = export_netlist_to_verilog(
-                        optimized_netlist, module_name=f"{module_name}_opt"
-                    )
+                    from core.export import write_verilog as export_write_verilog
                     output_file = output_dir / f"{module_name}_opt.v"
-                    output_file.write_text(optimized_verilog, encoding='utf-8')
+                    export_write_verilog(optimized_netlist, str(output_file), module_name=f"{module_name}_opt")
                     results['output_files']['opt'] = str(output_file)
                     logger.info(_safe_log_msg(f"[FILE] Written: {output_file.name}"))
                 except Exception as e:
@@ -587,7 +290,15 @@ def run_complete_flow(
             # Use optimized AIG for next step
             aig = optimized_aig
             
-            # NOTE: Simulation/verification removed from project scope
+            if verify_equivalence:
+                from core.verification.cec import check_equivalence
+                cec_result = check_equivalence(results['synthesis']['aig'], optimized_aig)
+                results['verification'] = {
+                    'cec': cec_result,
+                    'equivalent': cec_result.equivalent,
+                }
+                logger.info(f"   CEC (synthesis vs optimization): {_cec_status(cec_result)} "
+                            f"({cec_result.stats['time_total']:.2f}s)")
             
         except Exception as e:
             logger.error(f"❌ Optimization failed: {e}")
@@ -649,26 +360,44 @@ def run_complete_flow(
             if 'total_delay' in techmap_results:
                 logger.info(f"   Total delay: {techmap_results['total_delay']:.2f}")
             
+            mapped_netlist = None
+            if (write_verilog or run_timing_analysis) and '_mapper' in techmap_results and '_aig' in techmap_results:
+                try:
+                    from core.technology_mapping.technology_mapping import convert_mapped_logic_network_to_netlist
+                    mapped_netlist = convert_mapped_logic_network_to_netlist(
+                        techmap_results['_mapper'], techmap_results['_aig'], netlist
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not build mapped netlist: {e}")
+
             # Write Verilog file after techmap (like Yosys)
             if write_verilog:
                 try:
-                    from core.technology_mapping.technology_mapping import convert_mapped_logic_network_to_netlist
-                    
-                    if '_mapper' in techmap_results and '_aig' in techmap_results:
-                        mapper = techmap_results['_mapper']
-                        aig_for_mapping = techmap_results['_aig']
-                        mapped_netlist = convert_mapped_logic_network_to_netlist(
-                            mapper, aig_for_mapping, netlist
-                        )
-                        mapped_verilog = netlist_to_verilog(mapped_netlist, f"{module_name}_mapped")
+                    if mapped_netlist is not None:
+                        from core.export import write_verilog as export_write_verilog
                         output_file = output_dir / f"{module_name}_mapped.v"
-                        output_file.write_text(mapped_verilog, encoding='utf-8')
+                        export_write_verilog(mapped_netlist, str(output_file), module_name=f"{module_name}_mapped")
                         results['output_files']['mapped'] = str(output_file)
                         logger.info(_safe_log_msg(f"[FILE] Written: {output_file.name}"))
                 except Exception as e:
                     logger.warning(f"Could not write mapped Verilog: {e}")
                     import traceback
                     logger.debug(traceback.format_exc())
+
+            if run_timing_analysis and mapped_netlist is not None:
+                from core.timing.sta import run_sta
+
+                options = dict(sta_options or {})
+                max_paths = options.pop('max_paths', 5)
+                report = run_sta(mapped_netlist, techmap_results['_mapper'].library, max_paths, **options)
+                results['timing'] = {
+                    'report': report,
+                    'critical_delay': report.critical_delay,
+                    'wns': report.wns,
+                    'tns': report.tns,
+                }
+                logger.info(f"   STA: critical path {report.critical_delay:.4f}, "
+                            f"WNS {report.wns:.4f}, TNS {report.tns:.4f} ({report.stats['engine']})")
             
         except Exception as e:
             logger.error(f"❌ Technology mapping failed: {e}")
@@ -703,7 +432,12 @@ def run_complete_flow(
     else:
         logger.info(_safe_log_msg(f"Technology Mapping: [SKIP] SKIPPED"))
     
-    # NOTE: Simulation/verification removed from project scope
+    if results.get('timing'):
+        logger.info(_safe_log_msg(f"Timing: critical path {results['timing']['critical_delay']:.4f}, "
+                                  f"WNS {results['timing']['wns']:.4f}"))
+
+    if results.get('verification'):
+        logger.info(_safe_log_msg(f"Verification: CEC synthesis vs optimization: {_cec_status(results['verification']['cec'])}"))
     
     logger.info("=" * 70)
     logger.info(_safe_log_msg("[OK] Complete flow finished successfully!"))
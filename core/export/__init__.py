@@ -1,4 +1,6 @@
-from .verilog_writer import netlist_to_verilog
+from .bench_writer import aig_to_bench
+from .blif_writer import aig_to_blif, netlist_to_blif
+from .verilog_writer import netlist_to_verilog, write_aig_verilog, write_verilog
 
-__all__ = ["netlist_to_verilog"]
+__all__ = ["netlist_to_verilog", "write_verilog", "write_aig_verilog", "aig_to_blif", "netlist_to_blif", "aig_to_bench"]
 
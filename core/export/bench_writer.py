@@ -0,0 +1,72 @@
+"""
+ISCAS ``.bench`` writer cho AIG: ``AND`` 2 input, ``NOT`` cho literal đảo, ``DFF`` cho latch.
+
+``.bench`` không có giá trị khởi tạo của flip-flop (quy ước ISCAS'89: 0), nên
+latch có ``init`` khác 0 bị từ chối.
+
+Example:
+    >>> aig_to_bench(aig, "design.bench", output_names=["sum0", "cout"])
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from .blif_writer import AigSignals, _open_text, _unique_outputs
+
+
+def aig_to_bench(
+    aig,
+    target,
+    output_names: Optional[Sequence[str]] = None,
+    latches: Sequence[Any] = (),
+) -> Dict[str, int]:
+    """
+    Ghi ``aig`` ra ``.bench``.
+
+    Returns:
+        thống kê ``{"inputs", "outputs", "latches", "ands"}``
+    """
+    for latch in latches:
+        if latch.init != 0:
+            raise ValueError(f"Latch {latch.name!r}: .bench flip-flops always start at 0")
+    signals = AigSignals(aig, output_names, latches)
+    name = signals.name
+    outputs = _unique_outputs(signals.outputs)
+    lines = [f"INPUT({pi})" for pi in signals.inputs]
+    lines.extend(f"OUTPUT({out})" for out, _lit in outputs)
+    extra: Dict[int, str] = {}  # literal đảo / hằng → tên gate đã khai báo
+    body: List[str] = []
+
+    def signal(lit: int) -> str:
+        if lit > 1 and not lit & 1:
+            return name(lit >> 1)
+        defined = extra.get(lit)
+        if defined is None:
+            # Hằng: <prefix>0 = gnd, <prefix>0_n = vdd; literal đảo: <prefix><var>_n = NOT(...)
+            if lit <= 1:
+                defined = f"{signals.prefix}0" + ("_n" if lit else "")
+                body.append(f"{defined} = {'vdd' if lit else 'gnd'}")
+            else:
+                defined = f"{signals.prefix}{lit >> 1}_n"
+                body.append(f"{defined} = NOT({name(lit >> 1)})")
+            extra[lit] = defined
+        return defined
+
+    for latch, _next_name, lit in signals.next_states:
+        body.append(f"{latch.name} = DFF({signal(lit)})")
+    var = signals.first_and
+    for la, lb in signals.ands:
+        body.append(f"{name(var)} = AND({signal(la)}, {signal(lb)})")
+        var += 1
+    driven = set(signals.inputs) | {latch.name for latch in signals.latches}
+    for out, lit in outputs:
+        source = signal(lit)
+        if source == out:
+            continue
+        if out in driven:
+            raise ValueError(f"Output {out!r} has the same name as a primary input")
+        body.append(f"{out} = BUF({source})")
+
+    with _open_text(target) as f:
+        f.write("\n".join(lines + body) + "\n")
+    return {"inputs": len(signals.inputs), "outputs": len(outputs),
+            "latches": len(signals.latches), "ands": len(signals.ands)}
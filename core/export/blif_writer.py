@@ -0,0 +1,305 @@
+"""
+BLIF writer: AIG (``aig_to_blif``) và netlist dictionary / netlist đã map (``netlist_to_blif``).
+
+- AIG: mỗi AND (sau khi gấp NOT / fanin hằng như AIGER) là một ``.names`` 2 input,
+  tín hiệu nội bộ ``n<var>``; latch (``AigerLatch``) → ``.latch <next> <q> <init>``.
+- Netlist đã map (``techmap`` / ``lutmap``): cell thư viện → ``.gate <cell> <pin>=<sig> ...``
+  (đọc lại cần genlib tương ứng, như ABC ``read_library``), LUT → ``.names`` với
+  minterm cover của truth table, gate chưa map (NOT/BUF/AND/OR/.../CONST) → ``.names``.
+- Netlist dictionary của parser (``fanins`` ``[[sig, inv], ...]``, DFF) cũng được hỗ trợ.
+
+Example:
+    >>> aig_to_blif(aig, "design.blif", output_names=["sum0", "cout"])
+    >>> netlist_to_blif(shell.mapped_netlist, "mapped.blif")
+"""
+
+import re
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_LUT_FUNCTION = re.compile(r"^LUT(\d+)\(0x([0-9A-Fa-f]+)\)$")
+
+
+@contextmanager
+def _open_text(target):
+    if hasattr(target, "write"):
+        yield target
+    else:
+        with open(target, "w", encoding="utf-8") as stream:
+            yield stream
+
+
+def _internal_prefix(taken: Iterable[str], prefix: str = "n") -> str:
+    """Tiền tố ``prefix<số>`` không trùng tên PI/PO nào."""
+    taken = list(taken)
+    while True:
+        pattern = re.compile(re.escape(prefix) + r"\d+")
+        if not any(pattern.match(name) for name in taken):
+            return prefix
+        prefix = "_" + prefix
+
+
+def _init_code(init: Optional[int]) -> str:
+    return str(init) if init in (0, 1) else "2"
+
+
+class AigSignals:
+    """
+    Tên tín hiệu của AIG đã gấp NOT (dùng chung cho writer BLIF và ``.bench``).
+
+    ``lit_of[node_id]`` → literal AIGER; ``name(lit >> 1)`` → tên biến (PI/latch
+    theo tên, AND ``<prefix><var>``). ``outputs`` / ``next_states`` là literal của PO.
+    """
+
+    def __init__(self, aig, output_names: Optional[Sequence[str]] = None, latches: Sequence[Any] = ()):
+        from core.synthesis.aiger import aiger_literals
+
+        for latch in latches:
+            if latch.name not in aig.pis:
+                raise ValueError(f"Latch {latch.name!r} is not a primary input of the AIG")
+            if not 0 <= latch.next_po < len(aig.pos):
+                raise ValueError(f"Latch {latch.name!r}: next-state PO {latch.next_po} out of range")
+        self.aig = aig
+        self.latches = list(latches)
+        latch_names = {latch.name for latch in latches}
+        next_pos = {latch.next_po: latch for latch in latches}
+        self.inputs = [name for name in aig.pis if name not in latch_names]
+        sources = [aig.pis[name] for name in self.inputs] + [aig.pis[latch.name] for latch in latches]
+        self.lit_of, self.ands = aiger_literals(aig, sources)
+        self._names = [""] + self.inputs + [latch.name for latch in latches]
+
+        names = list(output_names or [])
+        # (index, tên, literal) của PO thường và next-state của latch
+        self.outputs: List[Tuple[int, str, int]] = []
+        self.next_states: List[Tuple[Any, str, int]] = []
+        for index, (node, inverted) in enumerate(aig.pos):
+            lit = self.lit_of[node.node_id] ^ (1 if inverted else 0)
+            latch = next_pos.get(index)
+            if latch is not None:
+                name = names[index] if index < len(names) and names[index] else f"{latch.name}_next"
+                self.next_states.append((latch, name, lit))
+            else:
+                name = names[index] if index < len(names) and names[index] else f"out{index}"
+                self.outputs.append((index, name, lit))
+        taken = self._names[1:] + [name for _i, name, _l in self.outputs] + [n for _l, n, _x in self.next_states]
+        self.prefix = _internal_prefix(taken)
+        self.first_and = len(sources) + 1
+
+    def name(self, var: int) -> str:
+        if var < self.first_and:
+            return self._names[var]
+        return f"{self.prefix}{var}"
+
+
+def aig_to_blif(
+    aig,
+    target,
+    model_name: str = "top",
+    output_names: Optional[Sequence[str]] = None,
+    latches: Sequence[Any] = (),
+) -> Dict[str, int]:
+    """
+    Ghi ``aig`` (``AIG`` / ``ArrayAIG``) ra BLIF.
+
+    Args:
+        target: đường dẫn hoặc text stream
+        output_names: tên của mọi PO theo thứ tự ``aig.pos`` (mặc định ``out<k>``)
+        latches: ``AigerLatch`` (PI = giá trị hiện tại, PO = next-state)
+
+    Returns:
+        thống kê ``{"inputs", "outputs", "latches", "ands"}``
+    """
+    signals = AigSignals(aig, output_names, latches)
+    name = signals.name
+    lines = [f".model {model_name}"]
+    if signals.inputs:
+        lines.append(".inputs " + " ".join(signals.inputs))
+    outputs = _unique_outputs(signals.outputs)
+    if outputs:
+        lines.append(".outputs " + " ".join(out for out, _lit in outputs))
+    for latch, next_name, _lit in signals.next_states:
+        lines.append(f".latch {next_name} {latch.name} {_init_code(latch.init)}")
+
+    var = signals.first_and
+    for la, lb in signals.ands:
+        lines.append(f".names {name(la >> 1)} {name(lb >> 1)} {name(var)}")
+        lines.append(f"{'0' if la & 1 else '1'}{'0' if lb & 1 else '1'} 1")
+        var += 1
+
+    driven = set(signals.inputs) | {latch.name for latch in signals.latches}
+    for out, lit in outputs + [(n, lit) for _latch, n, lit in signals.next_states]:
+        _blif_buffer(lines, out, lit, name, driven)
+    lines.append(".end")
+    with _open_text(target) as f:
+        f.write("\n".join(lines) + "\n")
+    return {"inputs": len(signals.inputs), "outputs": len(outputs),
+            "latches": len(signals.latches), "ands": len(signals.ands)}
+
+
+def _unique_outputs(outputs: List[Tuple[int, str, int]]) -> List[Tuple[str, int]]:
+    seen: Dict[str, int] = {}
+    result = []
+    for _index, out, lit in outputs:
+        if out in seen:
+            if seen[out] != lit:
+                raise ValueError(f"Output name {out!r} is used for two different functions")
+            continue
+        seen[out] = lit
+        result.append((out, lit))
+    return result
+
+
+def _blif_buffer(lines: List[str], out: str, lit: int, name, driven: set) -> None:
+    """``out`` = literal ``lit`` (hằng, buffer hoặc inverter)."""
+    if lit <= 1:
+        lines.append(f".names {out}")
+        if lit:
+            lines.append("1")
+        return
+    source = name(lit >> 1)
+    if source == out:
+        if lit & 1:
+            raise ValueError(f"Output {out!r} is the complement of the input with the same name")
+        return
+    if out in driven:
+        raise ValueError(f"Output {out!r} has the same name as a primary input")
+    lines.append(f".names {source} {out}")
+    lines.append("0 1" if lit & 1 else "1 1")
+
+
+# ------------------------------------------------------------------ netlist
+
+def _node_list(netlist: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes = netlist.get("nodes", [])
+    if isinstance(nodes, dict):
+        nodes = nodes.values()
+    return [n for n in nodes if isinstance(n, dict)]
+
+
+def _node_fanins(node: Dict[str, Any]) -> List[Tuple[str, bool]]:
+    if node.get("fanins") is not None:
+        return [(str(f[0]), bool(f[1])) if isinstance(f, (list, tuple)) else (str(f), False)
+                for f in node["fanins"]]
+    return [(str(s), False) for s in node.get("inputs") or []]
+
+
+def _gate_cover(kind: str, fanins: List[Tuple[str, bool]]) -> Optional[List[str]]:
+    """Cover onset (``cube output``) của gate chưa map; None nếu không hỗ trợ."""
+    n = len(fanins)
+    one = "".join("0" if inv else "1" for _s, inv in fanins)
+    zero = "".join("1" if inv else "0" for _s, inv in fanins)
+
+    def single(k: int, bits: str) -> str:
+        return "-" * k + bits[k] + "-" * (n - k - 1)
+
+    if kind in ("BUF", "AND") and n:
+        return [one + " 1"]
+    if kind == "NOT" and n == 1 or kind == "NAND" and n:
+        return [one + " 0"]
+    if kind == "OR" and n:
+        return [single(k, one) + " 1" for k in range(n)]
+    if kind == "NOR" and n:
+        return [zero + " 1"]
+    if kind in ("XOR", "XNOR") and 0 < n <= 16:
+        parity = 1 if kind == "XOR" else 0
+        rows = []
+        for row in range(1 << n):
+            bits = [(row >> k) & 1 for k in range(n)]
+            if sum(bits) & 1 == parity:
+                rows.append("".join(str(b ^ inv) for b, (_s, inv) in zip(bits, fanins)) + " 1")
+        return rows
+    return None
+
+
+def netlist_to_blif(netlist: Dict[str, Any], target, model_name: Optional[str] = None) -> Dict[str, int]:
+    """
+    Ghi netlist dictionary (parser, ``techmap`` hoặc ``lutmap``) ra BLIF.
+
+    Returns:
+        thống kê ``{"gates", "names", "latches"}`` (``gates`` = số ``.gate`` cell thư viện)
+
+    Raises:
+        ValueError: node word-level (ADD, MUX, ...) chưa được synthesis
+    """
+    nodes = _node_list(netlist)
+    inputs = [str(s) for s in netlist.get("inputs", [])]
+    outputs = list(dict.fromkeys(str(s) for s in netlist.get("outputs", [])))
+    lines = [f".model {model_name or netlist.get('name') or 'top'}"]
+    if inputs:
+        lines.append(".inputs " + " ".join(inputs))
+    if outputs:
+        lines.append(".outputs " + " ".join(outputs))
+
+    stats = {"gates": 0, "names": 0, "latches": 0}
+    driven = set(inputs)
+    used = set()
+    for node in nodes:
+        out = node.get("output")
+        if not out:
+            continue
+        out = str(out)
+        kind = str(node.get("type", "")).upper()
+        fanins = _node_fanins(node)
+        driven.add(out)
+
+        if kind == "DFF":
+            data = fanins[0][0] if fanins else (node.get("attrs") or {}).get("data_input")
+            if not data or (fanins and fanins[0][1]):
+                raise ValueError(f"DFF {node.get('id')!r}: unsupported data input")
+            attrs = node.get("attrs") or {}
+            clock = fanins[1][0] if len(fanins) > 1 else attrs.get("clock")
+            edge = attrs.get("latch_type") or ("fe" if attrs.get("edge_type") in ("negedge", "falling") else "re")
+            control = f" {edge} {clock}" if clock else ""
+            lines.append(f".latch {data} {out}{control} {_init_code(attrs.get('init', 0))}")
+            used.update(s for s, _inv in fanins[:2])
+            stats["latches"] += 1
+            continue
+        if kind in ("CONST0", "CONST1"):
+            lines.append(f".names {out}")
+            if kind == "CONST1":
+                lines.append("1")
+            stats["names"] += 1
+            continue
+
+        lut = _LUT_FUNCTION.match(str(node.get("function", ""))) if node.get("mapped") else None
+        if lut:
+            n = int(lut.group(1))
+            truth = int(lut.group(2), 16)
+            sigs = [s for s, _inv in fanins[:n]]
+            lines.append(".names " + " ".join(sigs + [out]))
+            for row in range(1 << n):
+                if (truth >> row) & 1:
+                    lines.append("".join("1" if (row >> k) & 1 else "0" for k in range(n)) + " 1")
+            used.update(sigs)
+            stats["names"] += 1
+            continue
+        if node.get("mapped") and node.get("cell_name"):
+            pins = list(node.get("input_pins") or [])
+            if len(pins) < len(fanins):
+                pins += [f"I{k}" for k in range(len(pins), len(fanins))]
+            out_pin = (node.get("output_pins") or ["Y"])[0]
+            conns = [f"{pin}={sig}" for pin, (sig, _inv) in zip(pins, fanins)]
+            lines.append(f".gate {node['cell_name']} " + " ".join(conns + [f"{out_pin}={out}"]))
+            used.update(s for s, _inv in fanins)
+            stats["gates"] += 1
+            continue
+
+        cover = _gate_cover(kind, fanins)
+        if cover is None:
+            raise ValueError(f"Node {node.get('id')!r} of type {kind!r} cannot be written as BLIF "
+                             "(run synthesis / techmap first)")
+        lines.append(".names " + " ".join([s for s, _inv in fanins] + [out]))
+        lines.extend(cover)
+        used.update(s for s, _inv in fanins)
+        stats["names"] += 1
+
+    # Hằng được tham chiếu như tín hiệu (techmap dùng "CONST0"/"CONST1")
+    for const in ("CONST0", "CONST1"):
+        if const in used and const not in driven:
+            lines.append(f".names {const}")
+            if const == "CONST1":
+                lines.append("1")
+    lines.append(".end")
+    with _open_text(target) as f:
+        f.write("\n".join(lines) + "\n")
+    return stats
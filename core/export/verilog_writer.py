@@ -1,7 +1,29 @@
+"""
+Structural Verilog writer.
+
+``write_verilog`` ghi netlist dictionary (sau synthesis / techmap / lutmap) thẳng
+ra file handle: một lượt đánh chỉ mục (bus width, net nội bộ, loại câu lệnh của
+từng node) rồi stream khai báo, ``assign`` và instance — không dựng toàn bộ văn
+bản trong bộ nhớ. ``write_aig_verilog`` ghi trực tiếp từ ``AIG`` / ``ArrayAIG``
+(không qua ``aig_to_netlist``). ``netlist_to_verilog`` giữ API cũ (trả về chuỗi).
+"""
+
 from __future__ import annotations
 
+import io
 import re
-from typing import Any, Dict, List, Set, Tuple
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+_BUS_BIT = re.compile(r"^([A-Za-z_]\w*)\[(\d+)\]$")
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+_CONSTANTS = {"const_True": "1'b1", "const_False": "1'b0"}
+
+# Loại câu lệnh của node (bytearray trong lượt đánh chỉ mục)
+_SKIP, _ASSIGN, _INSTANCE = 0, 1, 2
+_ASSIGN_OPS = {"AND": " & ", "OR": " | ", "XOR": " ^ ", "NAND": " & ", "NOR": " | ", "XNOR": " ^ "}
+_PRIMITIVE_GATES = {"and", "or", "xor", "xnor", "nand", "nor", "not", "buf"}
 
 
 def _nodes_list(netlist: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -14,12 +36,30 @@ def _nodes_list(netlist: Dict[str, Any]) -> List[Dict[str, Any]]:
 
 
 def _bus_base_and_bit(sig: str) -> Tuple[str, int] | None:
-    m = re.match(r"^([A-Za-z_]\w*)\[(\d+)\]$", sig.strip())
+    if not sig.endswith("]"):
+        return None
+    m = _BUS_BIT.match(sig.strip())
     if not m:
         return None
     return m.group(1), int(m.group(2))
 
 
+def _verilog_name(sig: str) -> str:
+    """Tên tín hiệu hợp lệ trong Verilog: identifier, bit của bus, hằng; còn lại escape ``\\name ``."""
+    if _IDENTIFIER.match(sig) or "'" in sig or sig in ("0", "1") or _bus_base_and_bit(sig):
+        return sig
+    return f"\\{sig} "
+
+
+@contextmanager
+def _open_text(target):
+    if hasattr(target, "write"):
+        yield target
+    else:
+        with open(target, "w", encoding="utf-8") as stream:
+            yield stream
+
+
 def _split_function_args(args_str: str) -> List[str]:
     args: List[str] = []
     current: List[str] = []
@@ -85,11 +125,107 @@ def _function_to_verilog_expr(function: str) -> str | None:
     return None
 
 
-def netlist_to_verilog(netlist: Dict[str, Any], module_name: str | None = None) -> str:
+def _node_signals(node: Dict[str, Any]) -> Tuple[str, List[Tuple[str, bool]]]:
+    """(output, [(input, inverted), ...]) của node; ``fanins`` (parser) hoặc ``inputs`` (synth/techmap)."""
+    out = str(node.get("output", "") or "").strip()
+    fanins = node.get("fanins")
+    if fanins:
+        ins = []
+        for f in fanins:
+            if isinstance(f, (list, tuple)):
+                ins.append((str(f[0]).strip(), len(f) > 1 and bool(f[1])))
+            else:
+                ins.append((str(f).strip(), False))
+        return out, ins
+    return out, [(str(x).strip(), False) for x in (node.get("inputs") or [])]
+
+
+def _statement_kind(node: Dict[str, Any], out: str, n_inputs: int) -> int:
+    if not out:
+        return _SKIP
+    raw_type = str(node.get("type", "") or "").strip()
+    t = raw_type.upper()
+    if t in ("BUF", "NOT", "CONST0", "CONST1") or t in _ASSIGN_OPS:
+        return _ASSIGN
+    if raw_type.lower() in _PRIMITIVE_GATES:
+        return _INSTANCE
+    if raw_type and node.get("input_pins") and node.get("output_pins"):
+        return _INSTANCE
+    if node.get("function") or n_inputs == 1:
+        return _ASSIGN
+    return _SKIP
+
+
+def _operand(sig: str, inverted: bool) -> str:
+    sig = _verilog_name(_CONSTANTS.get(sig, sig))
+    return f"~{sig}" if inverted else sig
+
+
+def _assign_statement(node: Dict[str, Any], out: str, ins: List[Tuple[str, bool]]) -> Optional[str]:
+    t = str(node.get("type", "") or "").strip().upper()
+    lhs = _verilog_name(out)
+    if t == "CONST0":
+        return f"assign {lhs} = 1'b0;"
+    if t == "CONST1":
+        return f"assign {lhs} = 1'b1;"
+    operands = [_operand(s, inv) for s, inv in ins]
+    if t == "BUF" or (t not in _ASSIGN_OPS and t != "NOT" and not node.get("function")):
+        if operands and not (operands[0] == lhs and not ins[0][1]):
+            return f"assign {lhs} = {operands[0]};"
+        return None
+    if t == "NOT":
+        return f"assign {lhs} = ~{operands[0]};" if operands else None
+    op = _ASSIGN_OPS.get(t)
+    if op is not None:
+        if len(operands) < 2:
+            return None
+        expr = op.join(operands)
+        return f"assign {lhs} = ~({expr});" if t in ("NAND", "NOR", "XNOR") else f"assign {lhs} = {expr};"
+    expr = _function_to_verilog_expr(str(node.get("function", "") or "").strip())
+    return f"assign {lhs} = {expr};" if expr is not None else None
+
+
+def _instance_statement(node: Dict[str, Any], out: str, ins: List[Tuple[str, bool]], index: int) -> str:
+    raw_type = str(node.get("type", "") or "").strip()
+    node_id = str(node.get("id", "") or f"inst_{index}").strip()
+    inst_name = _verilog_name(f"u_{node_id}")
+    sigs = [_operand(s, inv) for s, inv in ins]
+    # Verilog primitive gates use positional ports: gate inst (Y, A, B, ...).
+    if raw_type.lower() in _PRIMITIVE_GATES:
+        return f"{raw_type.lower()} {inst_name} ({', '.join([_verilog_name(out)] + sigs)});"
+    # For mapped technology cells, emit named-port instances so the
+    # generated netlist does not depend on module port declaration order.
+    input_pins = [str(x).strip() for x in (node.get("input_pins") or []) if str(x).strip()]
+    output_pins = [str(x).strip() for x in (node.get("output_pins") or []) if str(x).strip()]
+    conns = [f".{pin}({sig})" for pin, sig in zip(input_pins, sigs)]
+    conns.extend(f".{pin}({_verilog_name(out)})" for pin in output_pins)
+    # Tham số instance (ví dụ INIT của LUT FPGA), giá trị đã định dạng sẵn
+    params = node.get("parameters") or {}
+    param_str = " #(" + ", ".join(f".{k}({v})" for k, v in params.items()) + ")" if params else ""
+    return f"{raw_type}{param_str} {inst_name} ({', '.join(conns)});"
+
+
+def _write_ports(f, inputs: Sequence[str], outputs: Sequence[str], width_of) -> None:
+    port_lines = []
+    for direction, names in (("input ", inputs), ("output", outputs)):
+        for name in names:
+            w = width_of(name)
+            rng = f" [{w - 1}:0]" if w > 1 else ""
+            port_lines.append(f"  {direction} wire{rng} {_verilog_name(name)}")
+    f.write(",\n".join(port_lines))
+    f.write("\n);\n")
+
+
+def write_verilog(netlist: Dict[str, Any], target, module_name: str | None = None) -> Dict[str, int]:
     """
-    Convert a synthesized netlist dictionary (AIG->netlist) into structural Verilog.
-    Supported node types: AND, NOT, BUF, CONST0, CONST1.
-    Also tolerates OR/XOR/NAND/NOR/XNOR as assign operators if present.
+    Ghi netlist dictionary ra Verilog cấu trúc (``target``: đường dẫn hoặc text stream).
+
+    Node: AND/OR/XOR/NAND/NOR/XNOR (n input, ``fanins`` có thể đảo), NOT, BUF,
+    CONST0/CONST1 → ``assign``; cell đã map (``input_pins``/``output_pins``,
+    ``parameters``) và primitive Verilog → instance; node khác có ``function`` → ``assign``.
+
+    Returns:
+        thống kê ``{"assigns", "instances", "wires"}``
     """
     module_name = module_name or netlist.get("name") or "design"
     inputs: List[str] = list(netlist.get("inputs", []) or [])
@@ -97,161 +233,195 @@ def netlist_to_verilog(netlist: Dict[str, Any], module_name: str | None = None)
     vw = (netlist.get("attrs", {}) or {}).get("vector_widths", {}) or {}
     nodes = _nodes_list(netlist)
 
-    # Infer bus widths from any indexed signal usage (ports included).
+    # Lượt đánh chỉ mục duy nhất: bus width (kể cả port), net nội bộ, loại câu lệnh
+    port_set = set(inputs) | set(outputs)
     inferred_bus: Dict[str, int] = {}
-    for n in nodes:
-        out = str(n.get("output", "") or "")
-        ins = n.get("inputs") or []
-        for s in [out, *[str(x) for x in ins]]:
-            bb = _bus_base_and_bit(str(s))
+    internal: Dict[str, int] = {}  # tên net / bus nội bộ → width (0: scalar), theo thứ tự gặp
+    kinds = bytearray(len(nodes))
+    n_inst = 0
+    for index, n in enumerate(nodes):
+        out, ins = _node_signals(n)
+        kind = _statement_kind(n, out, len(ins))
+        if kind == _ASSIGN and _assign_statement(n, out, ins) is None:
+            kind = _SKIP
+        kinds[index] = kind
+        if kind == _SKIP:
+            # Node không sinh câu lệnh (SLICE, assign rỗng, ...) → không khai báo net của nó
+            continue
+        if kind == _INSTANCE:
+            n_inst += 1
+        for s in [s for s, _inv in ins] + [out]:
+            if not s or s in port_set or s in _CONSTANTS or s in ("0", "1") or "'" in s:
+                continue
+            bb = _bus_base_and_bit(s)
             if bb:
                 base, bit = bb
-                inferred_bus[base] = max(inferred_bus.get(base, 0), bit + 1)
+                if inferred_bus.get(base, 0) <= bit:
+                    inferred_bus[base] = bit + 1
+                if base not in port_set and internal.get(base, 0) <= bit:
+                    internal[base] = bit + 1
+            elif s not in internal:
+                internal[s] = 0
 
     def width_of(sig: str) -> int:
         if sig in vw and isinstance(vw[sig], int):
             return int(vw[sig])
-        if sig in inferred_bus:
-            return inferred_bus[sig]
-        return 1
-
-    # Collect internal nets (excluding ports and their bits)
-    port_set: Set[str] = set(inputs) | set(outputs)
-    internal_scalars: Set[str] = set()
-    internal_buses: Dict[str, int] = {}
-
-    def mark_sig(s: str):
-        s = s.strip()
-        if not s:
-            return
-        # constants
-        if s in ("0", "1") or "'" in s:
-            return
-        bb = _bus_base_and_bit(s)
+        return inferred_bus.get(sig, 1)
+
+    with _open_text(target) as f:
+        f.write(f"module {module_name}(\n")
+        _write_ports(f, inputs, outputs, width_of)
+        if internal:
+            f.write("\n")
+            for name, w in internal.items():
+                rng = f"[{w - 1}:0] " if w else ""
+                f.write(f"  wire {rng}{_verilog_name(name)};\n")
+        # Hai lượt phát: mọi assign rồi mọi instance (giữ bố cục của writer cũ)
+        n_assign = 0
+        for index, n in enumerate(nodes):
+            if kinds[index] != _ASSIGN:
+                continue
+            out, ins = _node_signals(n)
+            if not n_assign:
+                f.write("\n")
+            f.write(f"  {_assign_statement(n, out, ins)}\n")
+            n_assign += 1
+        if n_inst:
+            f.write("\n")
+            for index, n in enumerate(nodes):
+                if kinds[index] == _INSTANCE:
+                    out, ins = _node_signals(n)
+                    f.write(f"  {_instance_statement(n, out, ins, index)}\n")
+        f.write("endmodule\n")
+    return {"assigns": n_assign, "instances": n_inst, "wires": len(internal)}
+
+
+def netlist_to_verilog(netlist: Dict[str, Any], module_name: str | None = None) -> str:
+    """
+    Convert a synthesized netlist dictionary (AIG->netlist) into structural Verilog.
+    Supported node types: AND, NOT, BUF, CONST0, CONST1.
+    Also tolerates OR/XOR/NAND/NOR/XNOR as assign operators if present.
+    Chuỗi kết quả của ``write_verilog``; file lớn nên ghi thẳng bằng ``write_verilog``.
+    """
+    buffer = io.StringIO()
+    write_verilog(netlist, buffer, module_name)
+    return buffer.getvalue()
+
+
+# ------------------------------------------------------------------ AIG
+
+def _group_ports(names: Iterable[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Bit (``a[0]``, ``a[1]``, ``c``) → port (``a``, ``c``) theo thứ tự gặp + width của bus."""
+    ports: Dict[str, int] = {}
+    for name in names:
+        bb = _bus_base_and_bit(name)
         if bb:
             base, bit = bb
-            if base in port_set:
-                return
-            internal_buses[base] = max(internal_buses.get(base, 0), bit + 1)
-            return
-        if s in port_set:
-            return
-        internal_scalars.add(s)
-
-    for n in nodes:
-        out = str(n.get("output", "") or "")
-        ins = n.get("inputs") or []
-        for i in ins:
-            mark_sig(str(i))
-        mark_sig(out)
-
-    primitive_gates = {"and", "or", "xor", "xnor", "nand", "nor", "not", "buf"}
-
-    # Build assigns and explicit cell instances.
-    assigns: List[str] = []
-    instances: List[str] = []
-    for n in nodes:
-        t = str(n.get("type", "") or "").upper()
-        raw_type = str(n.get("type", "") or "").strip()
-        out = str(n.get("output", "") or "").strip()
-        ins = [str(x).strip() for x in (n.get("inputs") or [])]
-        input_pins = [str(x).strip() for x in (n.get("input_pins") or []) if str(x).strip()]
-        output_pins = [str(x).strip() for x in (n.get("output_pins") or []) if str(x).strip()]
-        node_id = str(n.get("id", "") or f"inst_{len(instances)}").strip()
-        inst_name = f"u_{node_id}"
-        function_str = str(n.get("function", "") or "").strip()
-        if not out:
-            continue
-
-        if t == "BUF":
-            if len(ins) >= 1:
-                if ins[0] != out:
-                    assigns.append(f"assign {out} = {ins[0]};")
-        elif t == "NOT":
-            if len(ins) >= 1:
-                assigns.append(f"assign {out} = ~{ins[0]};")
-        elif t == "AND":
-            if len(ins) >= 2:
-                assigns.append(f"assign {out} = {ins[0]} & {ins[1]};")
-        elif t == "OR":
-            if len(ins) >= 2:
-                assigns.append(f"assign {out} = {ins[0]} | {ins[1]};")
-        elif t == "XOR":
-            if len(ins) >= 2:
-                assigns.append(f"assign {out} = {ins[0]} ^ {ins[1]};")
-        elif t == "NAND":
-            if len(ins) >= 2:
-                assigns.append(f"assign {out} = ~({ins[0]} & {ins[1]});")
-        elif t == "NOR":
-            if len(ins) >= 2:
-                assigns.append(f"assign {out} = ~({ins[0]} | {ins[1]});")
-        elif t == "XNOR":
-            if len(ins) >= 2:
-                assigns.append(f"assign {out} = ~({ins[0]} ^ {ins[1]});")
-        elif t == "CONST0":
-            assigns.append(f"assign {out} = 1'b0;")
-        elif t == "CONST1":
-            assigns.append(f"assign {out} = 1'b1;")
+            ports[base] = max(ports.get(base, 1), bit + 1)
         else:
-            # Verilog primitive gates use positional ports: gate inst (Y, A, B, ...).
-            if raw_type.lower() in primitive_gates:
-                primitive_ports = [out, *ins]
-                if primitive_ports:
-                    instances.append(f"{raw_type.lower()} {inst_name} ({', '.join(primitive_ports)});")
-            # For mapped technology cells, emit named-port instances so the
-            # generated netlist does not depend on module port declaration order.
-            elif raw_type and input_pins and output_pins:
-                port_conns: List[str] = []
-                for pin_name, sig in zip(input_pins, ins):
-                    port_conns.append(f".{pin_name}({sig})")
-                for pin_name in output_pins:
-                    port_conns.append(f".{pin_name}({out})")
-                instances.append(f"{raw_type} {inst_name} ({', '.join(port_conns)});")
-            # Fallback to assign if no pin metadata exists.
-            elif function_str:
-                expr = _function_to_verilog_expr(function_str)
-                if expr is not None:
-                    assigns.append(f"assign {out} = {expr};")
-            elif len(ins) == 1:
-                if ins[0] != out:
-                    assigns.append(f"assign {out} = {ins[0]};")
-
-    # Header ports
-    port_lines: List[str] = []
-    for i, inp in enumerate(inputs):
-        w = width_of(inp)
-        if w > 1:
-            port_lines.append(f"  input  wire [{w-1}:0] {inp}")
-        else:
-            port_lines.append(f"  input  wire {inp}")
-    for outp in outputs:
-        w = width_of(outp)
-        if w > 1:
-            port_lines.append(f"  output wire [{w-1}:0] {outp}")
-        else:
-            port_lines.append(f"  output wire {outp}")
-
-    # Internal declarations
-    decls: List[str] = []
-    for base, w in sorted(internal_buses.items()):
-        decls.append(f"  wire [{w-1}:0] {base};")
-    for s in sorted(internal_scalars):
-        decls.append(f"  wire {s};")
-
-    body: List[str] = []
-    body.append(f"module {module_name}(")
-    body.append(",\n".join(port_lines))
-    body.append(");")
-    if decls:
-        body.append("")
-        body.extend(decls)
-    if assigns:
-        body.append("")
-        body.extend([f"  {a}" for a in assigns])
-    if instances:
-        body.append("")
-        body.extend([f"  {inst}" for inst in instances])
-    body.append("endmodule")
-    body.append("")
-    return "\n".join(body)
+            ports.setdefault(name, 1)
+    return list(ports), ports
+
+
+def write_aig_verilog(
+    aig,
+    target,
+    module_name: str = "design",
+    output_names: Optional[Sequence[str]] = None,
+    original_netlist: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    """
+    Ghi ``aig`` (``AIG`` / ``ArrayAIG``) thẳng ra Verilog (không dựng ``aig_to_netlist``).
+
+    Mỗi AND (sau khi gấp NOT / fanin hằng như AIGER) là một ``assign`` 2 toán hạng
+    trên wire ``__ml_n<var>``; toán hạng đảo dùng wire NOT ``__ml_n<var>_n``.
+
+    Args:
+        output_names: tên từng PO (bit của bus dạng ``y[3]``); mặc định ``out<k>``
+        original_netlist: netlist gốc — lấy danh sách port và ``vector_widths``
+            (như ``aig_to_netlist``); không có thì port được gom từ tên PI/PO
+
+    Returns:
+        thống kê ``{"assigns", "wires"}``
+    """
+    from core.synthesis.aiger import aiger_literals
+
+    pi_names = list(aig.pis)
+    names = list(output_names or [])
+    po_names = [names[k] if k < len(names) and names[k] else f"out{k}" for k in range(len(aig.pos))]
+    lit_of, ands = aiger_literals(aig, [aig.pis[name] for name in pi_names])
+
+    if original_netlist:
+        inputs = list(original_netlist.get("inputs", []) or [])
+        outputs = list(original_netlist.get("outputs", []) or [])
+        vw = (original_netlist.get("attrs", {}) or {}).get("vector_widths", {}) or {}
+        _bits, in_widths = _group_ports(pi_names)
+        _bits, out_widths = _group_ports(po_names)
+        widths = {**in_widths, **out_widths}
+        widths.update({k: v for k, v in vw.items() if isinstance(v, int)})
+    else:
+        inputs, in_widths = _group_ports(pi_names)
+        outputs, out_widths = _group_ports(po_names)
+        widths = {**in_widths, **out_widths}
+
+    # Tên biến AIGER: 1..I là PI, sau đó là AND
+    first_and = len(pi_names) + 1
+    prefix = "__ml_n"
+    taken = set(pi_names) | set(po_names)
+    while any(name.startswith(prefix) for name in taken):
+        prefix = "_" + prefix
+
+    def name_of(var: int) -> str:
+        return _verilog_name(pi_names[var - 1]) if var < first_and else f"{prefix}{var}"
+
+    # Toán hạng đảo của AND đi qua wire NOT riêng (``<prefix><var>_n``): mỗi assign
+    # chỉ có một toán tử, như netlist của ``aig_to_netlist``
+    inverted = bytearray(first_and + len(ands))
+    for la, lb in ands:
+        inverted[la >> 1] |= la & 1
+        inverted[lb >> 1] |= lb & 1
+    n_not = sum(inverted)
+
+    def operand(lit: int) -> str:
+        return f"{prefix}{lit >> 1}_n" if lit & 1 else name_of(lit >> 1)
 
+    with _open_text(target) as f:
+        f.write(f"module {module_name}(\n")
+        _write_ports(f, inputs, outputs, lambda sig: widths.get(sig, 1))
+        if ands:
+            f.write("\n")
+            for var in range(1, first_and):
+                if inverted[var]:
+                    f.write(f"  wire {prefix}{var}_n;\n")
+            for var in range(first_and, first_and + len(ands)):
+                f.write(f"  wire {prefix}{var};\n")
+                if inverted[var]:
+                    f.write(f"  wire {prefix}{var}_n;\n")
+            f.write("\n")
+            # Thứ tự topo: NOT của PI trước, NOT của mỗi AND ngay sau nó
+            for var in range(1, first_and):
+                if inverted[var]:
+                    f.write(f"  assign {prefix}{var}_n = ~{name_of(var)};\n")
+            var = first_and
+            for la, lb in ands:
+                f.write(f"  assign {prefix}{var} = {operand(la)} & {operand(lb)};\n")
+                if inverted[var]:
+                    f.write(f"  assign {prefix}{var}_n = ~{prefix}{var};\n")
+                var += 1
+        if po_names:
+            f.write("\n")
+        seen = set()
+        for (node, po_inverted), name in zip(aig.pos, po_names):
+            if name in seen:
+                continue
+            seen.add(name)
+            lit = lit_of[node.node_id] ^ (1 if po_inverted else 0)
+            lhs = _verilog_name(name)
+            if lit <= 1:
+                f.write(f"  assign {lhs} = 1'b{lit};\n")
+            elif lit & 1:
+                f.write(f"  assign {lhs} = ~{name_of(lit >> 1)};\n")
+            elif name_of(lit >> 1) != lhs:
+                f.write(f"  assign {lhs} = {name_of(lit >> 1)};\n")
+        f.write("endmodule\n")
+    return {"assigns": len(ands) + n_not + len(seen), "wires": len(ands) + n_not}
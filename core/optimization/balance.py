@@ -4,37 +4,33 @@ Logic Balancing Algorithm Implementation
 
 Dựa trên các khái niệm VLSI CAD Part 1 cho tối ưu hóa timing.
 Logic Balancing cân bằng độ sâu logic để tối ưu critical path.
+
+- ``BalanceOptimizer``: balancing trên netlist (dict nodes/inputs/outputs).
+- ``AIGBalanceOptimizer``: balancing trên AIG bằng supergate (giảm độ sâu thật):
+  1. Gom supergate: cây AND nhiều input, dừng ở cạnh đảo, node nhiều fanout
+     và PO (chỉ node một fanout bị gộp nên không nhân bản logic).
+  2. Arrival level của từng leaf (``compute_levels``, NOT không tăng level).
+  3. Dựng lại mỗi supergate kiểu Huffman: luôn AND hai leaf có level thấp
+     nhất → level ra tối thiểu cho tập leaf đó.
+
+ABC Reference: src/aig/dar/darBalance.c (Dar_ManBalance, Dar_BalanceCone)
 """
 
 import sys
 import os
 from typing import Dict, List, Set, Any, Tuple, Optional
+import heapq
 import logging
+import time
 from collections import defaultdict, deque
 
 # Thêm thư mục gốc project vào đường dẫn
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-logger = logging.getLogger(__name__)
+from core.synthesis.aig_traversal import aig_depth, and_program, compute_levels
+from core.synthesis.netlist_db import NetlistDB, fanin_pairs, store_fanins
 
-def _nodes_to_dict(nodes_any: Any) -> Tuple[Dict[str, Any], str]:
-    if isinstance(nodes_any, dict):
-        return nodes_any, 'dict'
-    if isinstance(nodes_any, list):
-        nodes_dict: Dict[str, Any] = {}
-        for i, n in enumerate(nodes_any):
-            if isinstance(n, dict):
-                key = str(n.get('id', i))
-                if 'id' not in n:
-                    n = {**n, 'id': key}
-                nodes_dict[key] = n
-        return nodes_dict, 'list'
-    return {}, 'unknown'
-
-def _nodes_from_dict(nodes_dict: Dict[str, Any], fmt: str) -> Any:
-    if fmt == 'list':
-        return list(nodes_dict.values())
-    return nodes_dict
+logger = logging.getLogger(__name__)
 
 class BalanceOptimizer:
     """
@@ -66,18 +62,16 @@ class BalanceOptimizer:
             logger.warning("Invalid netlist format")
             return netlist
             
-        nodes_dict, original_fmt = _nodes_to_dict(netlist.get('nodes', {}))
-        netlist_local = netlist.copy()
-        netlist_local['nodes'] = nodes_dict
-        original_nodes = len(nodes_dict)
+        db = NetlistDB(netlist)
+        original_nodes = len(db.nodes)
         
         # Tính logic levels cho tất cả nodes
-        self._calculate_logic_levels(netlist_local)
+        self._calculate_logic_levels(db)
         
         # Cân bằng logic depth
-        balanced_netlist = self._balance_logic_depth(netlist_local)
+        self._balance_logic_depth(db)
         
-        final_nodes = len(balanced_netlist['nodes'])
+        final_nodes = len(db.nodes)
         
         logger.info(f"Logic Balancing completed:")
         logger.info(f"  Original nodes: {original_nodes}")
@@ -85,83 +79,57 @@ class BalanceOptimizer:
         logger.info(f"  Max logic level: {self.max_level}")
         logger.info(f"  Balanced nodes: {self.balanced_nodes}")
         
-        balanced_out = balanced_netlist.copy()
-        balanced_out['nodes'] = _nodes_from_dict(balanced_netlist['nodes'], original_fmt)
-        return balanced_out
+        return db.to_netlist()
     
-    def _calculate_logic_levels(self, netlist: Dict[str, Any]):
+    def _calculate_logic_levels(self, db: NetlistDB):
         """
-        Tính logic level cho tất cả nodes.
+        Tính logic level cho tất cả nodes (một lượt theo thứ tự topo).
         
         Args:
-            netlist: Circuit netlist
+            db: Netlist đã đánh chỉ mục
         """
         # Reset levels
         self.node_levels = {}
         self.level_distribution = defaultdict(int)
+        self.max_level = 0
         
         # Khởi tạo levels cho inputs (level 0)
-        for input_name in netlist.get('inputs', []):
+        for input_name in db.inputs:
             self.node_levels[input_name] = 0
         
-        # Tính levels cho các nodes khác
-        nodes = netlist.get('nodes', {})
-        max_iterations = len(nodes) * 2  # Prevent infinite loops
-        
-        for iteration in range(max_iterations):
-            levels_updated = False
-            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    # nodes is a list, iterate directly
-            for node in nodes:
-                if not isinstance(node, dict):
-                    continue
-                node_id = node.get('id', '')
-                node_data = node
-                if node_id not in self.node_levels:
-                    # Tính level dựa trên input levels
-                    inputs = node_data.get('inputs', [])
-                    
-                    if all(inp in self.node_levels for inp in inputs) and inputs:
-                        # Tất cả inputs đã có level
-                        max_input_level = max(self.node_levels[inp] for inp in inputs)
-                        self.node_levels[node_id] = max_input_level + 1
-                        levels_updated = True
-                        
-                        # Cập nhật distribution
-                        level = self.node_levels[node_id]
-                        self.level_distribution[level] += 1
-                        
-                        if level > self.max_level:
-                            self.max_level = level
+        # Node không có fanin (hằng) ở level 0; node khác có level khi mọi fanin đã có level
+        node_levels = self.node_levels
+        for node_id in db.topological_order():
+            fanin_levels = [node_levels.get(net) for net, _inverted in db.fanin_nets(node_id)]
+            if not fanin_levels:
+                node_levels[node_id] = 0
+                continue
+            if None in fanin_levels:
+                continue
+            level = max(fanin_levels) + 1
+            node_levels[node_id] = level
             
-            if not levels_updated:
-                break
+            # Cập nhật distribution
+            self.level_distribution[level] += 1
+            if level > self.max_level:
+                self.max_level = level
         
         logger.debug(f"Calculated levels cho {len(self.node_levels)} nodes")
         logger.debug(f"Level distribution: {dict(self.level_distribution)}")
     
-    def _balance_logic_depth(self, netlist: Dict[str, Any]) -> Dict[str, Any]:
+    def _balance_logic_depth(self, db: NetlistDB):
         """
         Cân bằng logic depth của mạch.
         
         Args:
-            netlist: Original netlist
-            
-        Returns:
-            Balanced netlist
+            db: Netlist đã đánh chỉ mục (sửa tại chỗ)
         """
-        balanced_netlist = netlist.copy()
-        balanced_netlist['nodes'] = netlist['nodes'].copy()
-        
         # Tìm các nodes cần cân bằng
         nodes_to_balance = self._find_nodes_to_balance()
         
         for node_id in nodes_to_balance:
-            if self._can_balance_node(node_id, netlist):
-                balanced_netlist = self._balance_node(node_id, balanced_netlist)
+            if self._can_balance_node(node_id, db) and self._balance_node(node_id, db):
                 self.balanced_nodes += 1
-        
-        return balanced_netlist
     
     def _find_nodes_to_balance(self) -> List[str]:
         """
@@ -179,18 +147,18 @@ class BalanceOptimizer:
         
         return nodes_to_balance
     
-    def _can_balance_node(self, node_id: str, netlist: Dict[str, Any]) -> bool:
+    def _can_balance_node(self, node_id: str, db: NetlistDB) -> bool:
         """
         Kiểm tra xem node có thể cân bằng không.
         
         Args:
             node_id: Node ID
-            netlist: Circuit netlist
+            db: Netlist đã đánh chỉ mục
             
         Returns:
             True nếu node có thể balance
         """
-        node_data = netlist['nodes'].get(node_id)
+        node_data = db.nodes.get(node_id)
         if not node_data:
             return False
         
@@ -200,70 +168,71 @@ class BalanceOptimizer:
         
         return gate_type in associative_gates
     
-    def _balance_node(self, node_id: str, netlist: Dict[str, Any]) -> Dict[str, Any]:
+    def _balance_node(self, node_id: str, db: NetlistDB) -> bool:
         """
         Cân bằng một node cụ thể.
         
         Args:
             node_id: Node ID cần balance
-            netlist: Current netlist
+            db: Netlist đã đánh chỉ mục
             
         Returns:
-            Balanced netlist
+            True nếu node được dựng lại
         """
-        node_data = netlist['nodes'][node_id]
-        inputs = node_data.get('inputs', [])
+        inputs = fanin_pairs(db.nodes[node_id])
         
         if len(inputs) <= 2:
-            return netlist  # Không cần balance
-        
-        # Tạo balanced tree structure
-        balanced_inputs = self._create_balanced_tree(inputs, netlist)
+            return False  # Không cần balance
         
-        # Cập nhật node với balanced inputs
-        updated_node = node_data.copy()
-        updated_node['inputs'] = balanced_inputs
+        # Tạo balanced tree structure, node giữ lại hai fanin cuối
+        db.set_fanins(node_id, self._create_balanced_tree(node_id, inputs, db))
         
-        netlist['nodes'][node_id] = updated_node
+        logger.debug(f"Balanced node {node_id} với {len(inputs)} inputs")
         
-        logger.debug(f"Balanced node {node_id} với {len(balanced_inputs)} inputs")
-        
-        return netlist
+        return True
     
-    def _create_balanced_tree(self, inputs: List[str], netlist: Dict[str, Any]) -> List[str]:
+    def _create_balanced_tree(self, node_id: str, inputs: List[Tuple[str, bool]],
+                              db: NetlistDB) -> List[Tuple[str, bool]]:
         """
         Tạo balanced tree structure cho inputs.
         
+        Gộp hai fanin có level thấp nhất thành node trung gian (cùng phép toán,
+        không đảo: NAND/NOR dùng AND/OR) cho tới khi còn hai — như cây Huffman
+        của ``AIGBalanceOptimizer``.
+        
         Args:
-            inputs: List of input node IDs
-            netlist: Circuit netlist
+            node_id: Node đang balance
+            inputs: Fanin ``(signal, inverted)`` của node
+            db: Netlist đã đánh chỉ mục
             
         Returns:
-            List of balanced input node IDs
+            Hai fanin còn lại của node
         """
-        if len(inputs) <= 2:
-            return inputs
-        
-        # Tạo intermediate nodes cho balanced tree
-        balanced_inputs = inputs.copy()
-        
-        while len(balanced_inputs) > 2:
-            # Tạo intermediate node cho 2 inputs đầu tiên
-            intermediate_id = f"balance_{len(netlist['nodes'])}"
-            
-            # Tạo intermediate node
-            intermediate_node = {
-                'type': 'AND',  # Default type, có thể optimize
-                'inputs': [balanced_inputs[0], balanced_inputs[1]],
-                'output': intermediate_id
-            }
-            
-            netlist['nodes'][intermediate_id] = intermediate_node
-            
-            # Cập nhật balanced inputs
-            balanced_inputs = [intermediate_id] + balanced_inputs[2:]
-        
-        return balanced_inputs
+        node_data = db.nodes[node_id]
+        gate_type = node_data.get('type', '')
+        base_type = {'NAND': 'AND', 'NOR': 'OR'}.get(gate_type, gate_type)
+        fanin_key = 'fanins' if 'fanins' in node_data else 'inputs'
+        
+        heap = []
+        for order, (signal, inverted) in enumerate(inputs):
+            heapq.heappush(heap, (self.node_levels.get(db.net(signal), 0), order, signal, inverted))
+        order = len(inputs)
+        
+        while len(heap) > 2:
+            level_a, _, sig_a, inv_a = heapq.heappop(heap)
+            level_b, _, sig_b, inv_b = heapq.heappop(heap)
+            intermediate_node = {'type': base_type, fanin_key: []}
+            store_fanins(intermediate_node, [(sig_a, inv_a), (sig_b, inv_b)])
+            intermediate_id = db.new_id('balance')
+            if 'output' in node_data:
+                intermediate_node['output'] = intermediate_id
+            db.add_node(intermediate_node, intermediate_id)
+            level = max(level_a, level_b) + 1
+            self.node_levels[intermediate_id] = level
+            heapq.heappush(heap, (level, order, intermediate_id, False))
+            order += 1
+        
+        return [(signal, inverted) for _, _, signal, inverted in sorted(heap, key=lambda item: item[1])]
     
     def get_statistics(self) -> Dict[str, Any]:
         """Lấy thống kê về optimization."""
@@ -274,6 +243,130 @@ class BalanceOptimizer:
             'optimization_type': 'logic_balancing'
         }
 
+class AIGBalanceOptimizer:
+    """
+    Balancing trên AIG (AIG hoặc ArrayAIG) bằng supergate + cây Huffman theo level.
+
+    ``stats``: nodes_before/after, depth_before/after, supergates, time.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, Any] = {}
+
+    def optimize(self, aig, in_place: bool = False):
+        """
+        Balance ``aig``; in_place=True sửa trực tiếp và trả về chính ``aig``,
+        ngược lại trả về AIG mới (cùng loại manager).
+        """
+        start = time.perf_counter()
+        nodes_before = aig.count_nodes()
+        depth_before = aig_depth(aig)
+        if in_place:
+            aig.strash_in_place()
+            work = aig
+        else:
+            work = aig.strash()
+        substitutions, supergates = self._balance(work)
+        if substitutions:
+            work.strash_in_place(substitutions)
+            if not in_place:
+                work.compact()
+        self.stats = {
+            'nodes_before': nodes_before,
+            'nodes_after': work.count_nodes(),
+            'depth_before': depth_before,
+            'depth_after': aig_depth(work),
+            'supergates': supergates,
+            'time': time.perf_counter() - start,
+        }
+        logger.info(
+            f"  Balance: depth {depth_before} -> {self.stats['depth_after']}, "
+            f"{nodes_before} -> {self.stats['nodes_after']} nodes ({supergates} supergates)"
+        )
+        return work
+
+    def _balance(self, aig) -> Tuple[Dict[int, Tuple[int, bool]], int]:
+        """Dựng lại mọi supergate trong ``aig``; trả về (substitutions, số supergate)."""
+        program = and_program(aig)
+        levels = compute_levels(aig, program)
+        fan: Dict[int, Tuple[int, int]] = {}
+        refs: Dict[int, int] = defaultdict(int)
+        complemented: Set[int] = set()
+        for out, a, b, op in program:
+            fan[out] = ((a << 1) | (op & 1), (b << 1) | (op >> 1))
+            refs[a] += 1
+            refs[b] += 1
+            if op & 1:
+                complemented.add(a)
+            if op & 2:
+                complemented.add(b)
+        roots = {po.node_id for po, _inv in aig.pos}
+        roots.update(complemented)
+        roots.update(node_id for node_id in fan if refs[node_id] != 1)
+
+        # bal: root -> literal của supergate đã dựng lại
+        bal: Dict[int, int] = {}
+        substitutions: Dict[int, Tuple[int, bool]] = {}
+        supergates = 0
+        for out, _a, _b, _op in program:
+            if out not in roots:
+                continue
+            leaves: List[int] = []
+            stack = [out]
+            while stack:
+                lit0, lit1 = fan[stack.pop()]
+                for lit in (lit1, lit0):
+                    child = lit >> 1
+                    if child in fan and child not in roots:
+                        stack.append(child)  # cạnh thường tới node một fanout: gộp vào supergate
+                    else:
+                        leaves.append(bal.get(child, child << 1) ^ (lit & 1))
+            result = self._build(aig, leaves, levels)
+            bal[out] = result
+            supergates += 1
+            if result >> 1 != out:
+                substitutions[out] = (result >> 1, bool(result & 1))
+        return substitutions, supergates
+
+    @staticmethod
+    def _build(aig, leaves: List[int], levels: Dict[int, int]) -> int:
+        """AND của ``leaves`` dạng cây Huffman theo level; trả về literal (0/2 = hằng 0/1)."""
+        seen: Set[int] = set()
+        heap: List[Tuple[int, int, int]] = []
+        for lit in leaves:
+            if lit >> 1 <= 1:
+                if lit in (0, 3):  # CONST0 hoặc !CONST1
+                    return 0
+                continue
+            if lit ^ 1 in seen:
+                return 0
+            if lit not in seen:
+                seen.add(lit)
+                heap.append((levels.get(lit >> 1, 0), len(heap), lit))
+        if not heap:
+            return 2  # CONST1
+        heapq.heapify(heap)
+        order = len(heap)
+        while len(heap) > 1:
+            level0, _o0, lit0 = heapq.heappop(heap)
+            level1, _o1, lit1 = heapq.heappop(heap)
+            if lit0 == lit1 ^ 1:
+                return 0
+            if lit0 == lit1:
+                lit = lit0
+            else:
+                lit = aig.create_and_lit(lit0, lit1)
+                levels[lit >> 1] = (level0 if level0 > level1 else level1) + 1
+            heapq.heappush(heap, (levels.get(lit >> 1, 0), order, lit))
+            order += 1
+        return heap[0][2]
+
+
+def balance_aig(aig, in_place: bool = False):
+    """Wrapper: ``AIGBalanceOptimizer().optimize(aig, in_place)``."""
+    return AIGBalanceOptimizer().optimize(aig, in_place=in_place)
+
+
 def apply_balance(netlist: Dict[str, Any]) -> Dict[str, Any]:
     """
     Convenience function để áp dụng Logic Balancing.
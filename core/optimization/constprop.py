@@ -12,7 +12,9 @@ from typing import Dict, List, Set, Any, Tuple, Optional, Union
 import logging
 
 # Thêm thư mục gốc project vào đường dẫn
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.netlist_db import NetlistDB
 
 logger = logging.getLogger(__name__)
 
@@ -46,18 +48,20 @@ class ConstPropOptimizer:
             logger.warning("Invalid netlist format")
             return netlist
             
-        original_nodes = len(netlist['nodes'])
+        db = NetlistDB(netlist)
+        original_nodes = len(db.nodes)
         
         # Khởi tạo constant values từ inputs và constants
-        self._initialize_constants(netlist)
+        self._initialize_constants(db)
         
         # Propagate constants qua mạch
-        optimized_netlist = self._propagate_constants(netlist)
+        self._propagate_constants(db)
         
         # Simplify logic với known constants
-        optimized_netlist = self._simplify_logic(optimized_netlist)
+        self._simplify_logic(db)
         
-        final_nodes = len(optimized_netlist['nodes'])
+        optimized_netlist = db.to_netlist()
+        final_nodes = len(db.nodes)
         reduction = original_nodes - final_nodes
         
         logger.info(f"Constant Propagation hoàn thành:")
@@ -69,107 +73,76 @@ class ConstPropOptimizer:
         
         return optimized_netlist
     
-    def _initialize_constants(self, netlist: Dict[str, Any]):
+    def _initialize_constants(self, db: NetlistDB):
         """
         Khởi tạo constant values từ inputs và constant nodes.
         
         Args:
-            netlist: Circuit netlist
+            db: Netlist đã đánh chỉ mục
         """
         # Tìm constant inputs (0, 1, VCC, GND)
-        # nodes is a list, iterate directly
-        for node in netlist.get('nodes', []):
-            if isinstance(node, dict):
-                node_id = node.get('id', '')
-                node_type = node.get('type', '')
-                
-                if node_type in ['CONST0', 'GND', '0']:
-                    self.constant_values[node_id] = False
-                elif node_type in ['CONST1', 'VCC', '1']:
-                    self.constant_values[node_id] = True
-                elif node_type == 'INPUT' and 'value' in node:
-                    # Input với known value
-                    self.constant_values[node_id] = bool(node['value'])
+        for node_id, node in db.nodes.items():
+            node_type = node.get('type', '')
+            
+            if node_type in ['CONST0', 'GND', '0']:
+                self.constant_values[node_id] = False
+            elif node_type in ['CONST1', 'VCC', '1']:
+                self.constant_values[node_id] = True
+            elif node_type == 'INPUT' and 'value' in node:
+                # Input với known value
+                self.constant_values[node_id] = bool(node['value'])
         
         logger.debug(f"Khởi tạo {len(self.constant_values)} constant values")
     
-    def _propagate_constants(self, netlist: Dict[str, Any]) -> Dict[str, Any]:
+    def _propagate_constants(self, db: NetlistDB):
         """
         Propagate constants qua mạch.
         
+        Một lượt theo thứ tự topo: khi tới một gate, mọi fanin đã được xét.
+        
         Args:
-            netlist: Original netlist
-            
-        Returns:
-            Netlist với propagated constants
+            db: Netlist đã đánh chỉ mục
         """
-        optimized_netlist = netlist.copy()
-        # nodes is a list, create a copy
-        optimized_netlist['nodes'] = [node.copy() if isinstance(node, dict) else node for node in netlist.get('nodes', [])]
-        
-        # Multiple passes để propagate constants
-        max_passes = 10
-        for pass_num in range(max_passes):
-            constants_found = False
-            
-            # nodes is a list, iterate directly
-            for node in optimized_netlist.get('nodes', []):
-                if not isinstance(node, dict):
-                    continue
-                node_id = node.get('id', '')
-                node_data = node
-                if self._is_gate_node(node_data):
-                    # Kiểm tra xem tất cả inputs có phải constants không
-                    # Handle both 'inputs' and 'fanins' formats
-                    inputs = node_data.get('inputs', [])
-                    fanins = node_data.get('fanins', [])
-                    
-                    # If fanins exist, extract input names from [name, is_negated] pairs
-                    if fanins and not inputs:
-                        inputs = [fanin[0] if isinstance(fanin, list) and len(fanin) > 0 else fanin for fanin in fanins]
-                    
-                    # Filter out non-string inputs (like lists)
-                    inputs = [inp for inp in inputs if isinstance(inp, str)]
+        constant_values = self.constant_values
+        for node_id in db.topological_order():
+            node_data = db.nodes[node_id]
+            if node_id in constant_values or not self._is_gate_node(node_data):
+                continue
+            input_values = []
+            for net, inverted in db.fanin_nets(node_id):
+                value = constant_values.get(net)
+                if value is None:
+                    break
+                input_values.append(bool(value) != inverted)
+            else:
+                if input_values:
+                    # Tất cả inputs là constants, tính output
+                    output_value = self._evaluate_gate(node_data, input_values)
+                    constant_values[node_id] = output_value
+                    self.propagated_constants += 1
                     
-                    if inputs and all(inp in self.constant_values for inp in inputs):
-                        # Tất cả inputs là constants, tính output
-                        output_value = self._evaluate_gate(node_data, inputs)
-                        self.constant_values[node_id] = output_value
-                        self.propagated_constants += 1
-                        constants_found = True
-                        
-                        logger.debug(f"Propagated constant {output_value} cho node {node_id}")
-            
-            if not constants_found:
-                break
+                    logger.debug(f"Propagated constant {output_value} cho node {node_id}")
         
-        logger.info(f"Propagated {self.propagated_constants} constants trong {pass_num + 1} passes")
-        return optimized_netlist
+        logger.info(f"Propagated {self.propagated_constants} constants")
     
     def _is_gate_node(self, node_data: Dict[str, Any]) -> bool:
         """Kiểm tra xem node có phải là gate không."""
         gate_types = ['AND', 'OR', 'XOR', 'NAND', 'NOR', 'XNOR', 'NOT', 'BUF']
         return node_data.get('type', '') in gate_types
     
-    def _evaluate_gate(self, node_data: Dict[str, Any], inputs: List[str]) -> bool:
+    def _evaluate_gate(self, node_data: Dict[str, Any], input_values: List[bool]) -> bool:
         """
         Đánh giá output của gate với constant inputs.
         
         Args:
             node_data: Gate node data
-            inputs: List of input node IDs
+            input_values: Giá trị từng fanin (đã áp dụng cạnh đảo)
             
         Returns:
             Boolean output value
         """
         gate_type = node_data.get('type', '').upper()
         
-        # Get input values safely
-        input_values = []
-        for inp in inputs:
-            if inp in self.constant_values:
-                input_values.append(self.constant_values[inp])
-        
         # Check if we have any input values
         if not input_values:
             return False
@@ -187,64 +160,34 @@ class ConstPropOptimizer:
         elif gate_type == 'XNOR':
             return sum(input_values) % 2 == 0
         elif gate_type == 'NOT':
-            if len(input_values) > 0:
-                return not input_values[0]
-            return False
+            return not input_values[0]
         elif gate_type == 'BUF':
-            if len(input_values) > 0:
-                return input_values[0]
-            return False
+            return input_values[0]
         else:
             return False
     
-    def _simplify_logic(self, netlist: Dict[str, Any]) -> Dict[str, Any]:
+    def _simplify_logic(self, db: NetlistDB):
         """
         Simplify logic với known constants.
         
         Args:
-            netlist: Netlist với propagated constants
-            
-        Returns:
-            Simplified netlist
+            db: Netlist với propagated constants (sửa tại chỗ)
         """
-        optimized_netlist = netlist.copy()
-        optimized_netlist['nodes'] = []
-        
-        # nodes is a list, iterate directly
-        for node in netlist.get('nodes', []):
-            if not isinstance(node, dict):
-                optimized_netlist['nodes'].append(node)
+        for node_id, constant_value in self.constant_values.items():
+            node_data = db.nodes.get(node_id)
+            if node_data is None:
                 continue
-            node_id = node.get('id', '')
-            node_data = node
-            if node_id in self.constant_values:
-                # Node có constant value, thay thế bằng constant
-                constant_value = self.constant_values[node_id]
-                
-                if constant_value:
-                    optimized_netlist['nodes'].append({
-                        'id': node_id,
-                        'type': 'CONST1',
-                        'inputs': [],
-                        'output': node_data.get('output', node_id),
-                        'value': 1
-                    })
-                else:
-                    optimized_netlist['nodes'].append({
-                        'id': node_id,
-                        'type': 'CONST0',
-                        'inputs': [],
-                        'output': node_data.get('output', node_id),
-                        'value': 0
-                    })
-                
-                self.simplified_gates += 1
-                logger.debug(f"Simplified node {node_id} thành constant {constant_value}")
-            else:
-                # Node không có constant value, giữ nguyên
-                optimized_netlist['nodes'].append(node_data)
-        
-        return optimized_netlist
+            # Node có constant value, thay thế bằng constant
+            db.replace_node(node_id, {
+                'id': node_id,
+                'type': 'CONST1' if constant_value else 'CONST0',
+                'inputs': [],
+                'output': node_data.get('output', node_id),
+                'value': 1 if constant_value else 0
+            })
+            
+            self.simplified_gates += 1
+            logger.debug(f"Simplified node {node_id} thành constant {constant_value}")
     
     def get_statistics(self) -> Dict[str, Any]:
         """Lấy thống kê về optimization."""
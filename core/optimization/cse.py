@@ -8,43 +8,26 @@ CSE tìm và loại bỏ các subexpressions trùng lặp trong mạch.
 
 import sys
 import os
-from typing import Dict, List, Set, Any, Tuple, Optional
+from typing import Dict, Set, Any, Optional
 import logging
 
 # Thêm thư mục gốc project vào đường dẫn
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-logger = logging.getLogger(__name__)
-
-def _nodes_to_dict(nodes_any: Any) -> Tuple[Dict[str, Any], str]:
-    if isinstance(nodes_any, dict):
-        return nodes_any, 'dict'
-    if isinstance(nodes_any, list):
-        nodes_dict: Dict[str, Any] = {}
-        for i, n in enumerate(nodes_any):
-            if isinstance(n, dict):
-                key = str(n.get('id', i))
-                if 'id' not in n:
-                    n = {**n, 'id': key}
-                nodes_dict[key] = n
-        return nodes_dict, 'list'
-    return {}, 'unknown'
+from core.synthesis.netlist_db import NetlistDB
 
-def _nodes_from_dict(nodes_dict: Dict[str, Any], fmt: str) -> Any:
-    if fmt == 'list':
-        return list(nodes_dict.values())
-    return nodes_dict
+logger = logging.getLogger(__name__)
 
 class CSEOptimizer:
     """
     Common Subexpression Elimination optimizer.
     
-    Tìm và loại bỏ các subexpressions trùng lặp bằng cách
-    tạo shared nodes và cập nhật connections.
+    Tìm và loại bỏ các subexpressions trùng lặp: node trùng được thay
+    bằng node đầu tiên (shared node), fanout và output_mapping nối lại.
     """
     
     def __init__(self):
-        self.subexpression_table: Dict[str, str] = {}  # expression -> node_id
+        self.subexpression_table: Dict[str, str] = {}  # expression -> shared node_id
         self.shared_nodes: Dict[str, str] = {}  # original_node -> shared_node
         self.removed_nodes = 0
         self.created_shared_nodes = 0
@@ -65,26 +48,18 @@ class CSEOptimizer:
             logger.warning("Invalid netlist format")
             return netlist
             
-        # Normalize nodes
-        nodes_dict, original_fmt = _nodes_to_dict(netlist.get('nodes', {}))
-        netlist_local = netlist.copy()
-        netlist_local['nodes'] = nodes_dict
-        original_nodes = len(nodes_dict)
+        db = NetlistDB(netlist)
+        original_nodes = len(db.nodes)
         
-        # Tìm common subexpressions
-        subexpressions = self._find_common_subexpressions(netlist_local)
+        # Tìm và chia sẻ common subexpressions (một lượt theo thứ tự topo)
+        self._share_common_subexpressions(db)
         
-        if not subexpressions:
+        if not self.removed_nodes:
             logger.info("No common subexpressions found")
             return netlist
         
-        # Tạo shared nodes
-        optimized_netlist = self._create_shared_nodes(netlist_local, subexpressions)
-        
-        # Cập nhật connections
-        optimized_netlist = self._update_connections(optimized_netlist)
-        
-        final_nodes = len(optimized_netlist['nodes'])
+        optimized_netlist = db.to_netlist()
+        final_nodes = len(db.nodes)
         reduction = original_nodes - final_nodes
         
         logger.info(f"CSE optimization hoàn thành:")
@@ -94,165 +69,68 @@ class CSEOptimizer:
         logger.info(f"  Created shared nodes: {self.created_shared_nodes}")
         logger.info(f"  Reduction: {(reduction/original_nodes)*100:.1f}%")
         
-        # Restore original format
-        optimized_netlist_out = optimized_netlist.copy()
-        optimized_netlist_out['nodes'] = _nodes_from_dict(optimized_netlist['nodes'], original_fmt)
-        return optimized_netlist_out
+        return optimized_netlist
     
-    def _find_common_subexpressions(self, netlist: Dict[str, Any]) -> Dict[str, List[str]]:
+    def _share_common_subexpressions(self, db: NetlistDB) -> None:
         """
-        Tìm các common subexpressions trong netlist.
+        Tìm các common subexpressions và nối fanout của bản trùng vào node đầu tiên.
+        
+        Duyệt theo thứ tự topo: khi một node được thay thế, fanin của các node phía
+        sau đã trỏ sang node giữ lại nên signature của chúng trùng nhau ngay trong
+        cùng lượt (không cần lặp).
         
         Args:
-            netlist: Circuit netlist
-            
-        Returns:
-            Dictionary mapping expression -> list of node IDs
+            db: Netlist đã đánh chỉ mục
         """
-        expression_count: Dict[str, List[str]] = {}
-        
-        # nodes is a list, iterate with enumerate or by index
-        for node in netlist.get('nodes', []):
-            if isinstance(node, dict) and self._is_computational_node(node):
-                node_id = node.get('id', '')
-                # Tạo expression signature
-                expression = self._create_expression_signature(node)
-                
-                if expression in expression_count:
-                    expression_count[expression].append(node_id)
-                else:
-                    expression_count[expression] = [node_id]
-        
-        # Chỉ giữ lại expressions xuất hiện nhiều hơn 1 lần
-        common_expressions = {
-            expr: nodes for expr, nodes in expression_count.items() 
-            if len(nodes) > 1
-        }
+        expression_table: Dict[str, str] = {}  # expression -> node_id giữ lại
         
-        logger.info(f"Found {len(common_expressions)} common subexpressions")
-        for expr, nodes in common_expressions.items():
-            logger.debug(f"Expression '{expr}' xuất hiện {len(nodes)} lần: {nodes}")
+        for node_id in db.topological_order():
+            node = db.nodes[node_id]
+            if not self._is_computational_node(node):
+                continue
+            # Tạo expression signature
+            expression = self._create_expression_signature(node_id, db)
+            shared = expression_table.get(expression)
+            if shared is None:
+                expression_table[expression] = node_id
+                continue
+            if db.substitute(node_id, shared):
+                self.shared_nodes[node_id] = shared
+                self.removed_nodes += 1
+                if expression not in self.subexpression_table:
+                    self.subexpression_table[expression] = shared
+                    self.created_shared_nodes += 1
+                logger.debug(f"Node {node_id} dùng chung {shared} cho expression '{expression}'")
         
-        return common_expressions
+        logger.info(f"Found {len(self.subexpression_table)} common subexpressions")
     
     def _is_computational_node(self, node_data: Dict[str, Any]) -> bool:
         """Kiểm tra xem node có phải là computational node không."""
         computational_types = ['AND', 'OR', 'XOR', 'NAND', 'NOR', 'XNOR', 'ADD', 'SUB', 'MUL']
         return node_data.get('type', '') in computational_types
     
-    def _create_expression_signature(self, node_data: Dict[str, Any]) -> str:
+    def _create_expression_signature(self, node_id: str, db: NetlistDB) -> str:
         """
         Tạo signature cho expression.
         
         Args:
-            node_data: Node data
+            node_id: Node ID
+            db: Netlist đã đánh chỉ mục (fanin được quy về net của driver)
             
         Returns:
             Expression signature string
         """
-        gate_type = node_data.get('type', '')
-        inputs = node_data.get('inputs')
-        if inputs is None:
-            # Fallback to fanins (take source names only)
-            fanins = node_data.get('fanins', [])
-            inputs = [fi[0] if isinstance(fi, (list, tuple)) and fi else fi for fi in fanins]
+        gate_type = db.nodes[node_id].get('type', '')
+        inputs = [f"~{net}" if inverted else net for net, inverted in db.fanin_nets(node_id)]
         
-        # Sort inputs để đảm bảo canonical form
-        sorted_inputs = sorted(inputs)
+        # Sort inputs để đảm bảo canonical form (SUB không giao hoán)
+        if gate_type != 'SUB':
+            inputs.sort()
         
         # Tạo signature
-        signature = f"{gate_type}({','.join(sorted_inputs)})"
+        signature = f"{gate_type}({','.join(inputs)})"
         return signature
     
-    def _create_shared_nodes(self, netlist: Dict[str, Any], subexpressions: Dict[str, List[str]]) -> Dict[str, Any]:
-        """
-        Tạo shared nodes cho common subexpressions.
-        
-        Args:
-            netlist: Original netlist
-            subexpressions: Common subexpressions mapping
-            
-        Returns:
-            Netlist với shared nodes
-        """
-        optimized_netlist = netlist.copy()
-        optimized_netlist['nodes'] = netlist['nodes'].copy()
-        
-        for expression, node_list in subexpressions.items():
-            if len(node_list) < 2:
-                continue
-            
-            # Tạo shared node ID
-            shared_node_id = f"shared_{self.created_shared_nodes}"
-            self.created_shared_nodes += 1
-            
-            # Lấy node data từ node đầu tiên
-            first_node = node_list[0]
-            shared_node_data = optimized_netlist['nodes'][first_node].copy()
-            
-            # Cập nhật output name
-            shared_node_data['output'] = f"shared_{expression.replace('(', '_').replace(')', '').replace(',', '_')}"
-            
-            # Thêm shared node vào netlist
-            optimized_netlist['nodes'][shared_node_id] = shared_node_data
-            
-            # Lưu mapping cho các nodes cần thay thế
-            for node_id in node_list:
-                self.shared_nodes[node_id] = shared_node_id
-                # Loại bỏ original node (sẽ được thay thế)
-                del optimized_netlist['nodes'][node_id]
-                self.removed_nodes += 1
-            
-            logger.debug(f"Tạo shared node {shared_node_id} cho expression '{expression}'")
-        
-        return optimized_netlist
-    
-    def _update_connections(self, netlist: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Cập nhật connections sau khi tạo shared nodes.
-        
-        Args:
-            netlist: Netlist với shared nodes
-            
-        Returns:
-            Netlist với updated connections
-        """
-        # Cập nhật wire connections
-        if 'wires' in netlist and isinstance(netlist['wires'], dict):
-            updated_wires = {}
-            for wire_id, wire_data in netlist['wires'].items():
-                updated_wire = wire_data.copy()
-                
-                # Cập nhật source
-                if 'source' in updated_wire:
-                    source = updated_wire['source']
-                    if source in self.shared_nodes:
-                        updated_wire['source'] = self.shared_nodes[source]
-                
-                # Cập nhật destination
-                if 'destination' in updated_wire:
-                    destination = updated_wire['destination']
-                    if destination in self.shared_nodes:
-                        updated_wire['destination'] = self.shared_nodes[destination]
-                
-                updated_wires[wire_id] = updated_wire
-            
-            netlist['wires'] = updated_wires
-        
-        # Cập nhật node input connections
-        # nodes is a list, iterate directly
-        for node in netlist.get('nodes', []):
-            if isinstance(node, dict) and 'inputs' in node:
-                updated_inputs = []
-                for input_node in node['inputs']:
-                    if input_node in self.shared_nodes:
-                        updated_inputs.append(self.shared_nodes[input_node])
-                    else:
-                        updated_inputs.append(input_node)
-                node['inputs'] = updated_inputs
-        
-        return netlist
-    
     def get_statistics(self) -> Dict[str, Any]:
         """Lấy thống kê về optimization."""
         return {
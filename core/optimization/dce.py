@@ -13,9 +13,18 @@ ABC Reference: src/aig/aig/aigDfs.c
 
 from typing import Dict, List, Set, Any, Tuple
 import logging
+from collections import deque
+
+from core.synthesis.netlist_db import NetlistDB, fanin_pairs
 
 logger = logging.getLogger(__name__)
 
+
+def _wire_count(netlist: Dict[str, Any]) -> int:
+    wires = netlist.get('wires')
+    return len(wires) if isinstance(wires, (list, dict)) else 0
+
+
 class DCEOptimizer:
     """
     Dead Code Elimination optimizer với hỗ trợ Don't Cares.
@@ -49,256 +58,83 @@ class DCEOptimizer:
         self.removed_nodes = 0
         self.removed_wires = 0
         
-        # Create a copy to avoid modifying original
-        optimized_netlist = netlist.copy()
+        # Index the netlist (driver / fanout lookups are O(1) from here on)
+        db = NetlistDB(netlist)
         
         # Extract Don't Care conditions
         if level in ["advanced", "aggressive"]:
-            self._extract_dont_cares(optimized_netlist)
+            self._extract_dont_cares(db)
         
         # Find reachable nodes from outputs
-        reachable_nodes = self._find_reachable_nodes(optimized_netlist)
+        reachable_nodes = self._find_reachable_nodes(db)
         
         # Advanced optimization with Don't Cares
         if level in ["advanced", "aggressive"]:
-            reachable_nodes = self._apply_dont_care_optimization(optimized_netlist, reachable_nodes)
+            reachable_nodes = self._apply_dont_care_optimization(db, reachable_nodes)
         
         # Remove unreachable nodes
-        optimized_netlist = self._remove_dead_nodes(optimized_netlist, reachable_nodes)
-        
-        # Update wire connections
-        optimized_netlist = self._update_wire_connections(optimized_netlist)
+        self._remove_dead_nodes(db, reachable_nodes)
         
         # Aggressive optimization: remove redundant nodes
         if level == "aggressive":
-            optimized_netlist = self._remove_redundant_nodes(optimized_netlist)
+            self._remove_redundant_nodes(db)
+        
+        # Wires of removed nodes are dropped when the netlist is rebuilt
+        optimized_netlist = db.to_netlist()
+        self.removed_wires = _wire_count(netlist) - _wire_count(optimized_netlist)
         
         logger.info(f"DCE completed: removed {self.removed_nodes} nodes, {self.removed_wires} wires")
         
         return optimized_netlist
     
-    def _find_reachable_nodes(self, netlist: Dict[str, Any]) -> Set[str]:
+    def _find_reachable_nodes(self, db: NetlistDB) -> Set[str]:
         """
         Find all nodes reachable from output ports using BFS.
         
         Args:
-            netlist: Circuit netlist
+            db: Indexed circuit netlist
             
         Returns:
             Set of reachable node names
         """
         reachable = set()
-        queue = []
-        
-        # Start from all output ports using output_mapping
-        output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
-        outputs = netlist.get('outputs', [])
-        nodes_data = netlist.get('nodes', {})
-        is_dict_format = isinstance(nodes_data, dict)
-        
-        for output in outputs:
-            if isinstance(output, str):
-                output_name = output
-                # Find the node that drives this output
-                # Method 1: Check output_mapping
-                if output_name in output_mapping:
-                    node_id = output_mapping[output_name]
-                    queue.append(node_id)
-                    reachable.add(node_id)
-                    logger.debug(f"Starting from output {output_name} -> node {node_id}")
-                else:
-                    # Method 2: Find node by output field
-                    if is_dict_format:
-                        for node_id, node in nodes_data.items():
-                            if isinstance(node, dict) and node.get('output') == output_name:
-                                queue.append(node_id)
-                                reachable.add(node_id)
-                                logger.debug(f"Starting from output {output_name} -> node {node_id}")
-                                break
-                    else:
-                        for node in nodes_data:
-                            if isinstance(node, dict) and node.get('output') == output_name:
-                                node_id = node.get('id', '')
-                                if node_id:
-                                    queue.append(node_id)
-                                    reachable.add(node_id)
-                                    logger.debug(f"Starting from output {output_name} -> node {node_id}")
-                                    break
-        
-        # BFS to find all reachable nodes
-        nodes_data = netlist.get('nodes', {})
-        is_dict_format = isinstance(nodes_data, dict)
-        
+        queue = deque()
+        
+        # Start from the node driving each output port (output_mapping / node output field)
+        for output_name in db.outputs:
+            node_id = db.driver_of(output_name)
+            if node_id is not None and node_id not in reachable:
+                reachable.add(node_id)
+                queue.append(node_id)
+                logger.debug(f"Starting from output {output_name} -> node {node_id}")
+        
+        # BFS through fanins ('inputs' or 'fanins' format)
+        driver_of = db.driver_of
         while queue:
-            current_node = queue.pop(0)
-            # Find node by ID - handle both dict and list formats
-            node = None
-            if is_dict_format:
-                # Dictionary format: nodes is {'n1': {...}, 'n2': {...}}
-                node = nodes_data.get(current_node)
-            else:
-                # List format: nodes is [{...}, {...}]
-                for n in nodes_data:
-                    if isinstance(n, dict) and n.get('id') == current_node:
-                        node = n
-                        break
-            
-            # Check if node is a dictionary
-            if not isinstance(node, dict):
-                continue
-                
-            # Add all input nodes of current node
-            # Handle both 'inputs' and 'fanins' formats
-            inputs = []
-            if 'inputs' in node:
-                inputs = node.get('inputs', [])
-            elif 'fanins' in node:
-                # Extract signal names from fanins format: [["signal", inverted], ...]
-                inputs = [fanin[0] if isinstance(fanin, (list, tuple)) and len(fanin) > 0 else fanin 
-                         for fanin in node.get('fanins', [])]
-            
-            for input_name in inputs:
-                # Skip if input is a primary input
-                if input_name in netlist.get('inputs', []):
-                    continue
-                    
-                # Find which node produces this input
-                # Method 1: Check output_mapping first (for signals like temp1, temp2, etc.)
-                output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
-                if input_name in output_mapping:
-                    node_id = output_mapping[input_name]
-                    if node_id not in reachable:
-                        reachable.add(node_id)
-                        queue.append(node_id)
-                    continue
-                
-                # Method 2: Check node.output field (legacy format)
-                # Handle both dict and list formats
-                nodes_data = netlist.get('nodes', {})
-                if isinstance(nodes_data, dict):
-                    # Dictionary format
-                    for other_node_name, other_node in nodes_data.items():
-                        if isinstance(other_node, dict) and other_node.get('output') == input_name:
-                            if other_node_name not in reachable:
-                                reachable.add(other_node_name)
-                                queue.append(other_node_name)
-                            break
-                else:
-                    # List format
-                    for other_node in nodes_data:
-                        if isinstance(other_node, dict):
-                            other_node_name = other_node.get('id', '')
-                            if other_node.get('output') == input_name and other_node_name not in reachable:
-                                reachable.add(other_node_name)
-                                queue.append(other_node_name)
-                                break
+            node = db.nodes[queue.popleft()]
+            for input_name, _inverted in fanin_pairs(node):
+                node_id = driver_of(input_name)
+                if node_id is not None and node_id not in reachable:
+                    reachable.add(node_id)
+                    queue.append(node_id)
         
         return reachable
     
-    def _remove_dead_nodes(self, netlist: Dict[str, Any], reachable_nodes: Set[str]) -> Dict[str, Any]:
+    def _remove_dead_nodes(self, db: NetlistDB, reachable_nodes: Set[str]) -> None:
         """
         Remove nodes that are not reachable from outputs.
         
         Args:
-            netlist: Circuit netlist
+            db: Indexed circuit netlist
             reachable_nodes: Set of reachable node names
-            
-        Returns:
-            Netlist with dead nodes removed
         """
-        nodes = netlist.get('nodes', {})
-        
-        # Handle both dict and list formats
-        if isinstance(nodes, dict):
-            # Dictionary format: remove keys not in reachable_nodes
-            dead_node_keys = [key for key in nodes.keys() if key not in reachable_nodes]
-            self.removed_nodes = len(dead_node_keys)
-            
-            for key in dead_node_keys:
-                logger.debug(f"Removed dead node: {key}")
-                del nodes[key]
-            
-            netlist['nodes'] = nodes
-        else:
-            # List format: remove items by index
-            dead_nodes = []
-            for i, node in enumerate(nodes):
-                if isinstance(node, dict) and 'id' in node:
-                    node_id = node['id']
-                    if node_id not in reachable_nodes:
-                        dead_nodes.append(i)
-            
-            # Count dead nodes before removing
-            self.removed_nodes = len(dead_nodes)
-            
-            # Remove dead nodes (in reverse order to maintain indices)
-            for i in reversed(dead_nodes):
-                logger.debug(f"Removed dead node: {nodes[i].get('id', 'unknown')}")
-                del nodes[i]
-            
-            # Update netlist
-            netlist['nodes'] = nodes
-        
-        return netlist
+        dead_nodes = [node_id for node_id in db.nodes if node_id not in reachable_nodes]
+        self.removed_nodes = len(dead_nodes)
+        for node_id in dead_nodes:
+            logger.debug(f"Removed dead node: {node_id}")
+            db.remove_node(node_id)
     
-    def _update_wire_connections(self, netlist: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Update wire connections after removing dead nodes.
-        
-        Args:
-            netlist: Circuit netlist
-            
-        Returns:
-            Netlist with updated wire connections
-        """
-        nodes = netlist.get('nodes', [])
-        wires = netlist.get('wires', [])
-        
-        # Count dead wires before removing
-        original_wire_count = len(wires)
-        
-        # Remove wires that are no longer connected
-        valid_wires = []
-        for wire in wires:
-            if isinstance(wire, dict):
-                source = wire.get('source')
-                sink = wire.get('sink')
-                
-                # Check if both source and sink exist
-                source_exists = False
-                sink_exists = False
-                
-                # Check if source is an input or output of existing node
-                if source in netlist.get('inputs', []):
-                    source_exists = True
-                else:
-                    # nodes is a list, iterate directly
-                    for node in nodes:
-                        if isinstance(node, dict) and node.get('output') == source:
-                            source_exists = True
-                            break
-                
-                # Check if sink is an input of existing node
-                for node in nodes:
-                    if isinstance(node, dict) and sink in node.get('inputs', []):
-                        sink_exists = True
-                        break
-                
-                if source_exists and sink_exists:
-                    valid_wires.append(wire)
-                else:
-                    logger.debug(f"Removed dead wire: {source} -> {sink}")
-            else:
-                # Keep simple wire references
-                valid_wires.append(wire)
-        
-        # Count removed wires
-        self.removed_wires = original_wire_count - len(valid_wires)
-        netlist['wires'] = valid_wires
-        
-        return netlist
-    
-    def _extract_dont_cares(self, netlist: Dict[str, Any]) -> None:
+    def _extract_dont_cares(self, db: NetlistDB) -> None:
         """
         Extract Don't Care conditions from netlist.
         
@@ -306,17 +142,14 @@ class DCEOptimizer:
         """
         logger.debug("Extracting Don't Care conditions...")
         
-        nodes = netlist.get('nodes', {})
-        
-        for node_name, node in nodes.items():
+        for node_name, node in db.nodes.items():
             dont_cares = set()
             
             # Satisfiability Don't Cares (SDCs)
             # Conditions where node output is not used
-            if self._is_output_unused(node, netlist):
+            if self._is_output_unused(node_name, db):
                 # All input combinations are don't cares
-                inputs = node.get('inputs', [])
-                if len(inputs) == 2:  # Binary gates
+                if len(fanin_pairs(node)) == 2:  # Binary gates
                     dont_cares.update([
                         (False, False),
                         (False, True),
@@ -326,32 +159,19 @@ class DCEOptimizer:
             
             # Observability Don't Cares (ODCs)
             # Conditions where node output doesn't affect any primary output
-            odc_conditions = self._find_observability_dont_cares(node, netlist)
+            odc_conditions = self._find_observability_dont_cares(node_name, db)
             dont_cares.update(odc_conditions)
             
             if dont_cares:
                 self.dont_cares[node_name] = dont_cares
                 logger.debug(f"Don't cares for {node_name}: {len(dont_cares)} conditions")
     
-    def _is_output_unused(self, node: Dict[str, Any], netlist: Dict[str, Any]) -> bool:
+    def _is_output_unused(self, node_id: str, db: NetlistDB) -> bool:
         """Check if node output is used by any other node."""
-        output = node.get('output')
-        if not output:
-            return True
-        
-        # Check if output is a primary output
-        if output in netlist.get('outputs', []):
-            return False
-        
-        # Check if output is used as input by other nodes
-        # nodes is a list, iterate directly
-        for other_node in netlist.get('nodes', []):
-            if isinstance(other_node, dict) and output in other_node.get('inputs', []):
-                return False
-        
-        return True
+        # Primary output or used as input by other nodes
+        return not db.drives_output(node_id) and db.fanout_count(node_id) == 0
     
-    def _find_observability_dont_cares(self, node: Dict[str, Any], netlist: Dict[str, Any]) -> Set[Tuple[bool, ...]]:
+    def _find_observability_dont_cares(self, node_id: str, db: NetlistDB) -> Set[Tuple[bool, ...]]:
         """
         Find Observability Don't Care conditions.
         
@@ -361,17 +181,7 @@ class DCEOptimizer:
         
         # Simple heuristic: if node output has multiple fanouts with different functions,
         # some input combinations might be don't cares
-        
-        output = node.get('output')
-        if not output:
-            return dont_cares
-        
-        # Find fanout nodes
-        fanout_nodes = []
-        # nodes is a list, iterate directly
-        for other_node in netlist.get('nodes', []):
-            if isinstance(other_node, dict) and output in other_node.get('inputs', []):
-                fanout_nodes.append(other_node)
+        fanout_nodes = db.fanouts(node_id)
         
         # If multiple fanouts, analyze for potential don't cares
         if len(fanout_nodes) > 1:
@@ -381,7 +191,7 @@ class DCEOptimizer:
         
         return dont_cares
     
-    def _apply_dont_care_optimization(self, netlist: Dict[str, Any], reachable_nodes: Set[str]) -> Set[str]:
+    def _apply_dont_care_optimization(self, db: NetlistDB, reachable_nodes: Set[str]) -> Set[str]:
         """
         Apply Don't Care optimization to expand reachable nodes.
         
@@ -389,10 +199,9 @@ class DCEOptimizer:
         """
         logger.debug("Applying Don't Care optimization...")
         
-        nodes = netlist.get('nodes', {})
         additional_removable = set()
         
-        for node_name, node in nodes.items():
+        for node_name, node in db.nodes.items():
             if node_name in reachable_nodes:
                 continue
             
@@ -401,65 +210,50 @@ class DCEOptimizer:
                 dont_care_conditions = self.dont_cares[node_name]
                 
                 # If all possible input combinations are don't cares, node can be removed
-                inputs = node.get('inputs', [])
-                total_combinations = 2 ** len(inputs)
+                total_combinations = 2 ** len(fanin_pairs(node))
                 
                 if len(dont_care_conditions) >= total_combinations:
                     additional_removable.add(node_name)
                     logger.debug(f"Node {node_name} removable due to don't cares")
         
         # Update reachable nodes (nodes that should NOT be removed)
-        all_nodes = set(nodes.keys())
-        removable_nodes = all_nodes - reachable_nodes - additional_removable
-        final_reachable = all_nodes - removable_nodes
-        
-        return final_reachable
+        return reachable_nodes - additional_removable
     
-    def _remove_redundant_nodes(self, netlist: Dict[str, Any]) -> Dict[str, Any]:
+    def _remove_redundant_nodes(self, db: NetlistDB) -> None:
         """
         Remove redundant nodes in aggressive optimization mode.
         
-        Identifies and removes nodes that are functionally equivalent.
+        Identifies nodes that are functionally equivalent (same type, same fanins)
+        and reroutes their fanouts to the first one, in topological order so that
+        merges propagate forward in one pass.
         """
         logger.debug("Removing redundant nodes...")
         
-        nodes = netlist.get('nodes', {})
-        redundant_pairs = []
-        
-        # Find functionally equivalent nodes
-        for node1_name, node1 in nodes.items():
-            for node2_name, node2 in nodes.items():
-                if node1_name >= node2_name:  # Avoid duplicate checks
-                    continue
-                
-                if self._are_nodes_equivalent(node1, node2, netlist):
-                    redundant_pairs.append((node1_name, node2_name))
-        
-        # Remove redundant nodes (keep the first one)
-        for node1_name, node2_name in redundant_pairs:
-            if node2_name in nodes:
-                del nodes[node2_name]
+        representatives: Dict[Tuple[Any, ...], str] = {}
+        for node_name in db.topological_order():
+            node = db.nodes[node_name]
+            if not fanin_pairs(node):
+                continue
+            key = self._equivalence_key(node_name, db)
+            kept = representatives.get(key)
+            if kept is None:
+                representatives[key] = node_name
+            elif db.substitute(node_name, kept):
                 self.removed_nodes += 1
-                logger.debug(f"Removed redundant node: {node2_name} (equivalent to {node1_name})")
-        
-        netlist['nodes'] = nodes
-        return netlist
+                logger.debug(f"Removed redundant node: {node_name} (equivalent to {kept})")
     
-    def _are_nodes_equivalent(self, node1: Dict[str, Any], node2: Dict[str, Any], netlist: Dict[str, Any]) -> bool:
+    def _equivalence_key(self, node_id: str, db: NetlistDB) -> Tuple[Any, ...]:
         """
-        Check if two nodes are functionally equivalent.
+        Key of functionally equivalent nodes: same gate type and same fanin nets
+        (order-insensitive except for SUB / DIV).
         
-        Simplified implementation - in practice, this would use more sophisticated algorithms.
+        Simplified implementation - logical equivalence (e.g. SAT) is not checked here.
         """
-        # Same gate type and inputs
-        if (node1.get('type') == node2.get('type') and 
-            node1.get('inputs') == node2.get('inputs')):
-            return True
-        
-        # Additional equivalence checks could be added here
-        # such as checking for logical equivalence using SAT solver
-        
-        return False
+        node = db.nodes[node_id]
+        fanins = list(db.fanin_nets(node_id))
+        if node.get('type') not in ('SUB', 'DIV'):
+            fanins.sort()
+        return (node.get('type'), node.get('cell_name')) + tuple(fanins)
     
     def get_stats(self) -> Dict[str, int]:
         """
@@ -512,53 +306,31 @@ def dce_analysis(netlist: Dict[str, Any]) -> Dict[str, Any]:
         Analysis results showing dead nodes and wires
     """
     optimizer = DCEOptimizer()
+    db = NetlistDB(netlist)
     
     # Find reachable nodes
-    reachable_nodes = optimizer._find_reachable_nodes(netlist)
+    reachable_nodes = optimizer._find_reachable_nodes(db)
     
     # Find dead nodes
-    # nodes is a list, extract node IDs
-    nodes = netlist.get('nodes', [])
-    node_ids = [node.get('id') for node in nodes if isinstance(node, dict) and 'id' in node]
-    dead_nodes = [node_id for node_id in node_ids if node_id not in reachable_nodes]
+    dead_nodes = [node_id for node_id in db.nodes if node_id not in reachable_nodes]
     
-    # Find dead wires
+    # Find dead wires: source not driven by a live node / input, or no live sink
     dead_wires = []
     wires = netlist.get('wires', [])
-    for wire in wires:
+    for wire in (wires.values() if isinstance(wires, dict) else wires):
         if isinstance(wire, dict):
             source = wire.get('source')
-            sink = wire.get('sink')
-            
-            # Check if wire is dead
-            source_dead = True
-            sink_dead = True
-            
-            # Check source
-            if source in netlist.get('inputs', []):
-                source_dead = False
-            else:
-                # nodes is a list, iterate directly
-                for node in nodes:
-                    if isinstance(node, dict):
-                        node_id = node.get('id')
-                        if node.get('output') == source and node_id in reachable_nodes:
-                            source_dead = False
-                            break
+            sink = wire.get('destination', wire.get('sink'))
             
-            # Check sink
-            for node in nodes:
-                if isinstance(node, dict):
-                    node_id = node.get('id')
-                    if sink in node.get('inputs', []) and node_id in reachable_nodes:
-                        sink_dead = False
-                        break
+            source_dead = not (db.is_primary_input(source) or db.driver_of(source) in reachable_nodes)
+            sink_dead = not (db.driver_of(sink) in reachable_nodes
+                             or any(node_id in reachable_nodes for node_id in db.fanouts(sink)))
             
             if source_dead or sink_dead:
                 dead_wires.append(wire)
     
     return {
-        'total_nodes': len(nodes),
+        'total_nodes': len(db.nodes),
         'reachable_nodes': len(reachable_nodes),
         'dead_nodes': dead_nodes,
         'dead_wires': dead_wires,
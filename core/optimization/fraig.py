@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Functional Reduction (FRAIG) Sweeping
+
+FRAIG gộp các node tương đương về chức năng (kể cả tương đương bù) dù cấu
+trúc khác nhau - trường hợp strash không bắt được (ví dụ MUX và adder template
+trong netlist_to_aig.py sinh ra cùng một hàm bằng các cấu trúc khác nhau).
+
+Thuật toán (duyệt node theo thứ tự topo):
+1. Mô phỏng bit-parallel ngẫu nhiên → signature cho mọi node; các node có
+   cùng signature (sau khi chuẩn hóa phase) là ứng viên tương đương.
+2. Mỗi node được biểu diễn qua fanin đã được "giải" (resolved: fanin bị gộp
+   được thay bằng representative) → fold hằng số và structural hashing trên
+   đồ thị đã rút gọn chứng minh ngay nhiều cặp.
+3. Các cặp còn lại được chứng minh bằng SAT (CNF của đồ thị đã rút gọn) với
+   conflict budget; counterexample được gom lại và mô phỏng lại để tách lớp
+   (refinement).
+4. Áp dụng: ``strash(substitutions)`` (rebuild) hoặc
+   ``strash_in_place(substitutions)`` (in-place).
+
+ABC Reference: src/proof/fraig/fraigMan.c, src/proof/fra/fraCore.c
+- Fraig_ManProveMiter(), Fra_FraigSweep(): simulation + SAT sweeping
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.verification.sat import SatSolver
+from core.verification.simulation import AIGSimulator
+
+logger = logging.getLogger(__name__)
+
+
+class FraigOptimizer:
+    """
+    FRAIG sweeping trên AIG / ArrayAIG.
+
+    Args:
+        num_patterns: số pattern ngẫu nhiên cho signature ban đầu
+        conflict_limit: conflict budget cho mỗi lần gọi SAT
+        max_candidates: số representative tối đa thử cho mỗi node
+        seed: seed mô phỏng (kết quả tái lập được)
+        refine_batch: số counterexample gom lại trước mỗi lần mô phỏng lại
+        solver_recycle_vars: tạo SatSolver mới khi số biến vượt ngưỡng này
+    """
+
+    def __init__(self, num_patterns: int = 1024, conflict_limit: int = 100,
+                 max_candidates: int = 2, seed: int = 1, refine_batch: int = 32,
+                 solver_recycle_vars: int = 500):
+        self.num_patterns = num_patterns
+        self.conflict_limit = conflict_limit
+        self.max_candidates = max_candidates
+        self.seed = seed
+        self.refine_batch = refine_batch
+        self.solver_recycle_vars = solver_recycle_vars
+        self.stats: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Equivalence detection
+    # ------------------------------------------------------------------
+
+    def find_equivalences(self, aig) -> Dict[int, Tuple[int, bool]]:
+        """
+        Tìm các node tương đương với một node đứng trước theo thứ tự topo.
+
+        Returns:
+            substitutions: node_id -> (rep_node_id, inverted)
+        """
+        start = time.perf_counter()
+        sim = AIGSimulator(aig)
+        sig = sim.simulate_random(self.num_patterns, self.seed).values
+        mask = (1 << self.num_patterns) - 1
+        total_patterns = self.num_patterns
+
+        const0 = aig.const0.node_id
+        false_lit = const0 << 1
+        # rep_lit: node_id -> literal (rep_id * 2 + inverted) của representative
+        rep_lit: Dict[int, int] = {const0: false_lit, aig.const1.node_id: false_lit | 1}
+        for pi_id in sim.pi_ids:
+            rep_lit[pi_id] = pi_id << 1
+        # fanins của các node được giữ lại, theo literal đã resolved
+        fanins: Dict[int, Tuple[int, int]] = {}
+        structural: Dict[Tuple[int, int], int] = {}
+        # buckets: signature chuẩn hóa -> [(node_id, phase)]
+        buckets: Dict[int, List[Tuple[int, int]]] = {}
+
+        def bucket_key(node_id: int) -> Tuple[int, int]:
+            s = sig[node_id]
+            return (s ^ mask, 1) if s & 1 else (s, 0)
+
+        for node_id in [const0] + sim.pi_ids:
+            key, phase = bucket_key(node_id)
+            buckets.setdefault(key, []).append((node_id, phase))
+
+        self._solver = None
+        self._var: Dict[int, int] = {}
+        self._fanins = fanins
+        self._const0 = const0
+        self._pi_ids = set(sim.pi_ids)
+        counts = {'merged_structural': 0, 'merged_sat': 0, 'sat_calls': 0,
+                  'proved': 0, 'disproved': 0, 'undecided': 0, 'refinements': 0}
+        pending_cex: List[Dict[int, int]] = []
+        substitutions: Dict[int, Tuple[int, bool]] = {}
+
+        for out, a, b, op in sim.program:
+            la = rep_lit[a] ^ (op & 1)
+            lb = rep_lit[b] ^ ((op >> 1) & 1)
+            if la > lb:
+                la, lb = lb, la
+
+            # Fold hằng số / x&x / x&!x / strash trên đồ thị đã rút gọn
+            result: Optional[int] = None
+            if la >> 1 == const0:
+                result = false_lit if la == false_lit else lb
+            elif lb >> 1 == const0:
+                result = false_lit if lb == false_lit else la
+            elif la == lb:
+                result = la
+            elif la ^ 1 == lb:
+                result = false_lit
+            else:
+                hit = structural.get((la, lb))
+                if hit is not None:
+                    result = hit << 1
+            if result is not None:
+                counts['merged_structural'] += 1
+            else:
+                fanins[out] = (la, lb)
+                key, phase = bucket_key(out)
+                for rep, rep_phase in buckets.get(key, ())[:self.max_candidates]:
+                    inv = phase ^ rep_phase
+                    counts['sat_calls'] += 1
+                    status, cex = self._prove(out, rep, inv)
+                    if status is True:
+                        counts['proved'] += 1
+                        result = (rep << 1) | inv
+                        break
+                    if status is None:
+                        counts['undecided'] += 1
+                    else:
+                        counts['disproved'] += 1
+                        pending_cex.append(cex)
+                if result is not None:
+                    counts['merged_sat'] += 1
+                    del fanins[out]
+
+            if result is not None:
+                rep_lit[out] = result
+                substitutions[out] = (result >> 1, bool(result & 1))
+            else:
+                rep_lit[out] = out << 1
+                structural[(la, lb)] = out
+                buckets.setdefault(key, []).append((out, phase))
+
+            # Refinement: mô phỏng lại các counterexample, tách bucket
+            if len(pending_cex) >= self.refine_batch:
+                sig, mask, total_patterns = self._refine(sim, sig, total_patterns, pending_cex)
+                pending_cex = []
+                counts['refinements'] += 1
+                old = buckets
+                buckets = {}
+                for members in old.values():
+                    for node_id, phase_ in members:
+                        buckets.setdefault(bucket_key(node_id)[0], []).append((node_id, phase_))
+
+        self._solver = None
+        self._var = {}
+        counts['time'] = time.perf_counter() - start
+        self.stats = counts
+        return substitutions
+
+    def _refine(self, sim: AIGSimulator, sig: List[int], total_patterns: int,
+                cexs: List[Dict[int, int]]):
+        """Thêm các counterexample vào signature (bit cao, không đổi phase)."""
+        words = []
+        for pi_id in sim.pi_ids:
+            word = 0
+            for k, cex in enumerate(cexs):
+                if cex.get(pi_id):
+                    word |= 1 << k
+            words.append(word)
+        values = sim.simulate(words, len(cexs)).values
+        sig = [old | (new << total_patterns) for old, new in zip(sig, values)]
+        total_patterns += len(cexs)
+        return sig, (1 << total_patterns) - 1, total_patterns
+
+    # ------------------------------------------------------------------
+    # SAT on the reduced graph
+    # ------------------------------------------------------------------
+
+    def _sat_lit(self, lit: int) -> int:
+        """Literal SAT của literal AIG (đã resolved); mã hóa cone nếu cần."""
+        node_id = lit >> 1
+        if node_id not in self._var:
+            self._encode(node_id)
+        return (self._var[node_id] << 1) | (lit & 1)
+
+    def _encode(self, root: int):
+        solver = self._solver
+        var = self._var
+        fanins = self._fanins
+        stack = [root]
+        while stack:
+            node_id = stack[-1]
+            if node_id in var:
+                stack.pop()
+                continue
+            fan = fanins.get(node_id)
+            if fan is not None:
+                missing = [f >> 1 for f in fan if (f >> 1) not in var]
+                if missing:
+                    stack.extend(missing)
+                    continue
+            stack.pop()
+            v = solver.new_var()
+            var[node_id] = v
+            z = v << 1
+            if node_id == self._const0:
+                solver.add_clause([z | 1])
+            elif fan is not None:
+                a = (var[fan[0] >> 1] << 1) | (fan[0] & 1)
+                b = (var[fan[1] >> 1] << 1) | (fan[1] & 1)
+                solver.add_clause([z | 1, a])
+                solver.add_clause([z | 1, b])
+                solver.add_clause([z, a ^ 1, b ^ 1])
+            # PI: biến tự do
+
+    def _prove(self, node_id: int, rep: int, inv: int):
+        """
+        Chứng minh ``node == rep ^ inv``.
+
+        Returns:
+            (True, None) tương đương; (False, cex) khác nhau; (None, None) hết budget
+        """
+        if self._solver is None or self._solver.num_vars > self.solver_recycle_vars:
+            self._solver = SatSolver()
+            self._var = {}
+        solver = self._solver
+        x = self._sat_lit(node_id << 1)
+        r = self._sat_lit((rep << 1) | inv)
+        for assumptions in ([x, r ^ 1], [x ^ 1, r]):
+            status = solver.solve(assumptions, conflict_limit=self.conflict_limit)
+            if status is None:
+                return None, None
+            if status is True:
+                model = solver.model
+                cex = {nid: int(model[v]) for nid, v in self._var.items() if nid in self._pi_ids}
+                return False, cex
+        return True, None
+
+    # ------------------------------------------------------------------
+    # Pass
+    # ------------------------------------------------------------------
+
+    def optimize(self, aig, in_place: bool = False):
+        """
+        Chạy FRAIG trên ``aig``.
+
+        in_place=True: sửa trực tiếp ``aig`` (``strash_in_place``) và trả về chính nó;
+        ngược lại trả về AIG mới (cùng loại manager).
+        """
+        nodes_before = aig.count_nodes()
+        substitutions = self.find_equivalences(aig)
+        if in_place:
+            aig.strash_in_place(substitutions)
+            result = aig
+        else:
+            result = aig.strash(substitutions)
+            if result.remove_dead_nodes():
+                result.compact()
+        self.stats['nodes_before'] = nodes_before
+        self.stats['nodes_after'] = result.count_nodes()
+        self.stats['merged'] = len(substitutions)
+        logger.info(
+            f"  FRAIG: {nodes_before} -> {result.count_nodes()} nodes "
+            f"(merged {len(substitutions)}: {self.stats['merged_structural']} structural, "
+            f"{self.stats['merged_sat']} SAT; {self.stats['sat_calls']} SAT calls, "
+            f"{self.stats['time']:.2f}s)"
+        )
+        return result
+
+
+def fraig(aig, in_place: bool = False, **kwargs):
+    """Tiện ích: ``FraigOptimizer(**kwargs).optimize(aig, in_place)``."""
+    return FraigOptimizer(**kwargs).optimize(aig, in_place)
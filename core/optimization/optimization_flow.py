@@ -9,7 +9,11 @@ Các bước optimization:
 2. Dead Code Elimination (DCE)
 3. Common Subexpression Elimination (CSE)
 4. Constant Propagation (ConstProp)
-5. Logic Balancing (Balance)
+5. DAG-aware Rewriting (Rewrite, tùy chọn): thay cone 4 input bằng AIG tối ưu
+   của lớp NPN khi giảm được số node (core/optimization/rewrite.py)
+6. Functional Reduction (FRAIG): gộp node tương đương chức năng (simulation + SAT)
+7. Logic Balancing (Balance): gom supergate AND, dựng lại theo arrival level
+   để giảm độ sâu (core/optimization/balance.py)
 
 Lưu ý: Đây là bước OPTIMIZATION riêng biệt (1 trong 3 hướng độc lập), tách khỏi SYNTHESIS và TECHMAP.
 3 hướng độc lập:
@@ -24,16 +28,35 @@ Techmap map AIG vào technology library (nhận AIG, trả về mapped netlist).
 
 import sys
 import os
-from typing import Dict, List, Set, Any, Optional
+import functools
+from typing import Dict, Set, Any, Optional
 import logging
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.synthesis.aig import AIG, AIGNode
+from core.synthesis.aig_traversal import topological_order
+from core.utils.performance import get_tracer, trace_span
 
 logger = logging.getLogger(__name__)
 
 
+def _traced_pass(name: str):
+    """Span ``optimize.<name>`` (node trước / sau) quanh một ``_run_*`` khi tracing bật."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, aig):
+            if get_tracer() is None:
+                return method(self, aig)
+            with trace_span(f"optimize.{name}", category="optimize",
+                            nodes_before=aig.count_nodes()) as span:
+                result = method(self, aig)
+                span.set(nodes_after=result.count_nodes())
+            return result
+        return wrapper
+    return decorator
+
+
 class AIGOptimizationFlow:
     """
     AIG Optimization Flow.
@@ -43,22 +66,55 @@ class AIGOptimizationFlow:
     - DCE (Dead Code Elimination)
     - CSE (Common Subexpression Elimination)
     - ConstProp (Constant Propagation)
+    - Rewrite (DAG-aware Rewriting, tùy chọn)
+    - FRAIG (Functional Reduction)
     - Balance (Logic Balancing)
     """
     
-    def __init__(self):
+    def __init__(self, in_place: bool = False, compact_threshold: float = 0.3,
+                 enable_fraig: bool = True, enable_rewrite: bool = False,
+                 rewrite_zero_cost: bool = False, enable_balance: bool = True):
+        """
+        Args:
+            in_place: Nếu True, các pass sửa trực tiếp AIG đầu vào (không rebuild
+                AIG mới cho mỗi pass); node chết được xóa theo ref_count và
+                ``compact()`` chỉ chạy khi tỉ lệ id chết vượt ``compact_threshold``.
+            compact_threshold: Ngưỡng dead fraction để compact (chế độ in-place).
+            enable_fraig: Chạy FRAIG sweeping (core/optimization/fraig.py).
+            enable_rewrite: Chạy DAG-aware rewriting (core/optimization/rewrite.py).
+            rewrite_zero_cost: Rewriting chấp nhận cả thay thế không giảm node
+                (``rewrite -z``: tái cấu trúc cho FRAIG/Balance phía sau).
+            enable_balance: Chạy balancing theo supergate (core/optimization/balance.py).
+        """
+        self.in_place = bool(in_place)
+        self.compact_threshold = compact_threshold
+        self.enable_fraig = bool(enable_fraig)
+        self.enable_rewrite = bool(enable_rewrite)
+        self.rewrite_zero_cost = bool(rewrite_zero_cost)
+        self.enable_balance = bool(enable_balance)
+        self.compactions = 0
         self.optimization_stats = {
             'strash': {'nodes_before': 0, 'nodes_after': 0, 'removed': 0},
             'dce': {'nodes_before': 0, 'nodes_after': 0, 'removed': 0},
             'cse': {'nodes_before': 0, 'nodes_after': 0, 'removed': 0},
             'constprop': {'nodes_before': 0, 'nodes_after': 0, 'removed': 0},
-            'balance': {'nodes_before': 0, 'nodes_after': 0, 'added': 0}
+            'rewrite': {'nodes_before': 0, 'nodes_after': 0, 'removed': 0},
+            'fraig': {'nodes_before': 0, 'nodes_after': 0, 'removed': 0},
+            'balance': {'nodes_before': 0, 'nodes_after': 0, 'added': 0,
+                        'depth_before': 0, 'depth_after': 0}
         }
         
     def optimize(self, aig: AIG) -> AIG:
         """
-        Chạy AIG optimization flow (một chuẩn duy nhất: Strash, DCE, CSE, ConstProp, Balance).
+        Chạy AIG optimization flow (một chuẩn duy nhất: Strash, DCE, CSE, ConstProp,
+        [Rewrite], FRAIG, Balance).
         """
+        with trace_span("optimize", category="optimize", nodes_before=aig.count_nodes()) as span:
+            result = self._optimize(aig)
+            span.set(nodes_after=result.count_nodes())
+        return result
+    
+    def _optimize(self, aig: AIG) -> AIG:
         logger.info("Starting AIG Optimization Flow...")
         
         original_nodes = aig.count_nodes()
@@ -80,9 +136,20 @@ class AIGOptimizationFlow:
         logger.info("Step 4: Constant Propagation (ConstProp)...")
         current_aig = self._run_constprop(current_aig)
         
-        # Step 5: Logic Balancing (Balance)
-        logger.info("Step 5: Logic Balancing (Balance)...")
-        current_aig = self._run_balance(current_aig)
+        # Step 5: DAG-aware Rewriting (Rewrite)
+        if self.enable_rewrite:
+            logger.info("Step 5: DAG-aware Rewriting (Rewrite)...")
+            current_aig = self._run_rewrite(current_aig)
+        
+        # Step 6: Functional Reduction (FRAIG)
+        if self.enable_fraig:
+            logger.info("Step 6: Functional Reduction (FRAIG)...")
+            current_aig = self._run_fraig(current_aig)
+        
+        # Step 7: Logic Balancing (Balance)
+        if self.enable_balance:
+            logger.info("Step 7: Logic Balancing (Balance)...")
+            current_aig = self._run_balance(current_aig)
         
         final_nodes = current_aig.count_nodes()
         total_reduction = original_nodes - final_nodes
@@ -92,6 +159,7 @@ class AIGOptimizationFlow:
         
         return current_aig
     
+    @_traced_pass("strash")
     def _run_strash(self, aig: AIG) -> AIG:
         """Chạy Structural Hashing trên AIG."""
         try:
@@ -99,7 +167,7 @@ class AIGOptimizationFlow:
             
             # AIG đã có structural hashing built-in trong create_and()
             # Strash trên AIG chủ yếu là rebuild hash table
-            optimized_aig = aig.strash()
+            optimized_aig = self._strash(aig)
             
             nodes_after = optimized_aig.count_nodes()
             
@@ -116,11 +184,17 @@ class AIGOptimizationFlow:
             logger.error(f"Strash failed: {e}")
             return aig
     
+    @_traced_pass("dce")
     def _run_dce(self, aig: AIG) -> AIG:
         """Chạy Dead Code Elimination trên AIG."""
         try:
             nodes_before = aig.count_nodes()
-            optimized_aig = self._apply_dce_on_aig(aig)
+            if self.in_place:
+                aig.remove_dead_nodes()
+                self._maybe_compact(aig)
+                optimized_aig = aig
+            else:
+                optimized_aig = self._apply_dce_on_aig(aig)
             
             nodes_after = optimized_aig.count_nodes()
             
@@ -137,6 +211,7 @@ class AIGOptimizationFlow:
             logger.error(f"DCE failed: {e}")
             return aig
     
+    @_traced_pass("cse")
     def _run_cse(self, aig: AIG) -> AIG:
         """Chạy Common Subexpression Elimination trên AIG."""
         try:
@@ -144,7 +219,7 @@ class AIGOptimizationFlow:
             
             # CSE trên AIG: AIG đã tự động share common subexpressions qua hash table
             # Nên CSE chủ yếu là rebuild để tối ưu hơn
-            optimized_aig = aig.strash()  # Rebuild hash table
+            optimized_aig = self._strash(aig)  # Rebuild hash table
             
             nodes_after = optimized_aig.count_nodes()
             
@@ -161,13 +236,18 @@ class AIGOptimizationFlow:
             logger.error(f"CSE failed: {e}")
             return aig
     
+    @_traced_pass("constprop")
     def _run_constprop(self, aig: AIG) -> AIG:
         """Chạy Constant Propagation trên AIG."""
         try:
             nodes_before = aig.count_nodes()
             
             # ConstProp trên AIG: propagate constants qua AND gates
-            optimized_aig = self._apply_constprop_on_aig(aig)
+            # (in-place: create_and đã fold hằng số, nên rehash tại chỗ là đủ)
+            if self.in_place:
+                optimized_aig = self._strash(aig)
+            else:
+                optimized_aig = self._apply_constprop_on_aig(aig)
             
             nodes_after = optimized_aig.count_nodes()
             
@@ -184,34 +264,109 @@ class AIGOptimizationFlow:
             logger.error(f"ConstProp failed: {e}")
             return aig
     
+    @_traced_pass("rewrite")
+    def _run_rewrite(self, aig: AIG) -> AIG:
+        """Chạy DAG-aware rewriting trên AIG."""
+        try:
+            from core.optimization.rewrite import RewriteOptimizer
+            
+            nodes_before = aig.count_nodes()
+            rewriter = RewriteOptimizer(zero_cost=self.rewrite_zero_cost)
+            optimized_aig = rewriter.optimize(aig, in_place=self.in_place)
+            if self.in_place:
+                self._maybe_compact(optimized_aig)
+            
+            nodes_after = optimized_aig.count_nodes()
+            
+            self.optimization_stats['rewrite'] = {
+                'nodes_before': nodes_before,
+                'nodes_after': nodes_after,
+                'removed': nodes_before - nodes_after,
+                'rewrites': rewriter.stats['rewrites'],
+                'zero_cost': self.rewrite_zero_cost,
+                'time': rewriter.stats['time'],
+            }
+            return optimized_aig
+            
+        except Exception as e:
+            logger.error(f"Rewrite failed: {e}")
+            return aig
+    
+    @_traced_pass("fraig")
+    def _run_fraig(self, aig: AIG) -> AIG:
+        """Chạy FRAIG sweeping trên AIG."""
+        try:
+            from core.optimization.fraig import FraigOptimizer
+            
+            nodes_before = aig.count_nodes()
+            fraig = FraigOptimizer()
+            optimized_aig = fraig.optimize(aig, in_place=self.in_place)
+            if self.in_place:
+                self._maybe_compact(optimized_aig)
+            
+            nodes_after = optimized_aig.count_nodes()
+            
+            self.optimization_stats['fraig'] = {
+                'nodes_before': nodes_before,
+                'nodes_after': nodes_after,
+                'removed': nodes_before - nodes_after,
+                'merged': fraig.stats['merged'],
+                'sat_calls': fraig.stats['sat_calls'],
+                'time': fraig.stats['time'],
+            }
+            return optimized_aig
+            
+        except Exception as e:
+            logger.error(f"FRAIG failed: {e}")
+            return aig
+    
+    @_traced_pass("balance")
     def _run_balance(self, aig: AIG) -> AIG:
         """Chạy Logic Balancing trên AIG."""
         try:
+            from core.optimization.balance import AIGBalanceOptimizer
+            
             nodes_before = aig.count_nodes()
             
-            # Balance trên AIG: cân bằng logic depth
-            optimized_aig = self._apply_balance_on_aig(aig)
+            # Balance trên AIG: gom supergate AND, dựng lại theo arrival level
+            balancer = AIGBalanceOptimizer()
+            optimized_aig = balancer.optimize(aig, in_place=self.in_place)
+            if self.in_place:
+                self._maybe_compact(optimized_aig)
             
             nodes_after = optimized_aig.count_nodes()
             
             self.optimization_stats['balance'] = {
                 'nodes_before': nodes_before,
                 'nodes_after': nodes_after,
-                'added': nodes_after - nodes_before
+                'added': nodes_after - nodes_before,
+                'depth_before': balancer.stats['depth_before'],
+                'depth_after': balancer.stats['depth_after'],
             }
-            
-            logger.info(f"  Balance: {nodes_before} -> {nodes_after} nodes (added {nodes_after - nodes_before})")
             return optimized_aig
             
         except Exception as e:
             logger.error(f"Balance failed: {e}")
             return aig
     
+    def _strash(self, aig: AIG) -> AIG:
+        """Strash: rebuild AIG mới, hoặc rehash tại chỗ trong chế độ in-place."""
+        if not self.in_place:
+            return aig.strash()
+        aig.strash_in_place()
+        self._maybe_compact(aig)
+        return aig
+    
+    def _maybe_compact(self, aig: AIG):
+        """Compact AIG khi dead fraction vượt ngưỡng (chế độ in-place)."""
+        if aig.maybe_compact(self.compact_threshold):
+            self.compactions += 1
+    
     def _apply_dce_on_aig(self, aig: AIG) -> AIG:
         """Apply DCE trên AIG (một chuẩn duy nhất)."""
         # Simplified DCE: rebuild AIG chỉ với reachable nodes
         # In practice, you'd do proper reachability analysis
-        new_aig = AIG()
+        new_aig = type(aig)()  # giữ cùng loại AIG manager (AIG hoặc ArrayAIG)
         
         # Recreate PIs
         pi_map = {}
@@ -219,34 +374,23 @@ class AIGOptimizationFlow:
             new_pi = new_aig.create_pi(var_name)
             pi_map[old_pi.node_id] = new_pi
         
-        # Recreate reachable nodes; node_map: old_node_id -> new_node (for shared nodes)
-        visited = set()
+        # Recreate reachable nodes (topological order); node_map: old_node_id -> new_node
         node_map: Dict[int, AIGNode] = {}
-        
-        def recreate_node(old_node: AIGNode) -> AIGNode:
-            if old_node.node_id in visited:
-                return pi_map.get(old_node.node_id) or node_map.get(old_node.node_id)
-            
-            visited.add(old_node.node_id)
-            
+        for old_node in topological_order(aig):
             if old_node.is_constant():
-                n = new_aig.create_constant(old_node.get_value())
-                node_map[old_node.node_id] = n
-                return n
+                node_map[old_node.node_id] = new_aig.create_constant(old_node.get_value())
             elif old_node.is_pi():
-                return pi_map[old_node.node_id]
+                node_map[old_node.node_id] = pi_map[old_node.node_id]
             else:
-                left = recreate_node(old_node.left)
-                right = recreate_node(old_node.right)
-                n = new_aig.create_and(left, right,
-                                        old_node.left_inverted,
-                                        old_node.right_inverted)
-                node_map[old_node.node_id] = n
-                return n
+                node_map[old_node.node_id] = new_aig.create_and(
+                    node_map[old_node.left.node_id],
+                    node_map[old_node.right.node_id],
+                    old_node.left_inverted,
+                    old_node.right_inverted)
         
         # Recreate outputs (only reachable nodes)
         for old_po, inverted in aig.pos:
-            new_po = recreate_node(old_po)
+            new_po = node_map[old_po.node_id]
             if inverted:
                 new_po = new_aig.create_not(new_po)
             new_aig.add_po(new_po)
@@ -264,7 +408,7 @@ class AIGOptimizationFlow:
         - AND(0, x) = 0
         """
         # Create new AIG for optimized result
-        new_aig = AIG()
+        new_aig = type(aig)()  # giữ cùng loại AIG manager (AIG hoặc ArrayAIG)
         
         # Map old nodes to new nodes
         node_map = {}
@@ -278,227 +422,64 @@ class AIGOptimizationFlow:
         node_map[aig.const0.node_id] = new_aig.const0
         node_map[aig.const1.node_id] = new_aig.const1
         
-        visited = set()
-        
-        def propagate_node(old_node: AIGNode) -> AIGNode:
-            """Propagate constants through nodes."""
-            if old_node.node_id in node_map:
-                return node_map[old_node.node_id]
+        for old_node in topological_order(aig):
+            if old_node.node_id in node_map or not old_node.is_and():
+                continue
             
-            if old_node.node_id in visited:
-                # Already processed, return mapped node
-                return node_map.get(old_node.node_id)
+            # Propagate constants through AND (fanins already mapped)
+            left = node_map.get(old_node.left.node_id)
+            right = node_map.get(old_node.right.node_id)
             
-            visited.add(old_node.node_id)
+            # Check for None nodes
+            if left is None or right is None:
+                # Cannot propagate if nodes are missing
+                node_map[old_node.node_id] = new_aig.create_and(
+                    left or new_aig.const0,
+                    right or new_aig.const0,
+                    old_node.left_inverted,
+                    old_node.right_inverted
+                )
+                continue
             
-            if old_node.is_constant():
-                return node_map[old_node.node_id]
-            elif old_node.is_pi():
-                return node_map[old_node.node_id]
-            elif old_node.is_and():
-                # Propagate constants through AND
-                left = propagate_node(old_node.left) if old_node.left else None
-                right = propagate_node(old_node.right) if old_node.right else None
-                
-                # Check for None nodes
-                if left is None or right is None:
-                    # Cannot propagate if nodes are missing
-                    new_node = new_aig.create_and(
-                        left or new_aig.const0,
-                        right or new_aig.const0,
-                        old_node.left_inverted,
-                        old_node.right_inverted
-                    )
-                    node_map[old_node.node_id] = new_node
-                    return new_node
-                
-                # Constant propagation rules
-                left_val = left.get_value() if left.is_constant() else None
-                right_val = right.get_value() if right.is_constant() else None
+            # Constant propagation rules
+            left_val = left.get_value() if left.is_constant() else None
+            right_val = right.get_value() if right.is_constant() else None
 
-                # Effective constant values must account for the AIG inversion flags.
-                # Semantics: output = (~left if left_inverted else left) & (~right if right_inverted else right)
-                left_eff = None if left_val is None else (not left_val if old_node.left_inverted else left_val)
-                right_eff = None if right_val is None else (not right_val if old_node.right_inverted else right_val)
+            # Effective constant values must account for the AIG inversion flags.
+            # Semantics: output = (~left if left_inverted else left) & (~right if right_inverted else right)
+            left_eff = None if left_val is None else (not left_val if old_node.left_inverted else left_val)
+            right_eff = None if right_val is None else (not right_val if old_node.right_inverted else right_val)
 
+            if (left_eff is False) or (right_eff is False):
                 # If either effective input is 0 -> result is 0
-                if (left_eff is False) or (right_eff is False):
-                    node_map[old_node.node_id] = new_aig.const0
-                    return new_aig.const0
-
+                res = new_aig.const0
+            elif (left_eff is True) and (right_eff is True):
                 # If both effective inputs are 1 -> result is 1
-                if (left_eff is True) and (right_eff is True):
-                    node_map[old_node.node_id] = new_aig.const1
-                    return new_aig.const1
-
+                res = new_aig.const1
+            elif left_eff is True:
                 # If effective left is 1 -> result is (~right if right_inverted else right)
-                if left_eff is True:
-                    res = new_aig.create_not(right) if old_node.right_inverted else right
-                    node_map[old_node.node_id] = res
-                    return res
-
+                res = new_aig.create_not(right) if old_node.right_inverted else right
+            elif right_eff is True:
                 # If effective right is 1 -> result is (~left if left_inverted else left)
-                if right_eff is True:
-                    res = new_aig.create_not(left) if old_node.left_inverted else left
-                    node_map[old_node.node_id] = res
-                    return res
-                
+                res = new_aig.create_not(left) if old_node.left_inverted else left
+            else:
                 # No constant propagation possible, create AND node
-                new_node = new_aig.create_and(
+                res = new_aig.create_and(
                     left, right,
                     old_node.left_inverted,
                     old_node.right_inverted
                 )
-                node_map[old_node.node_id] = new_node
-                return new_node
-            
-            return old_node
+            node_map[old_node.node_id] = res
         
         # Recreate outputs with constant propagation
         for old_po, inverted in aig.pos:
-            new_po = propagate_node(old_po)
+            new_po = node_map.get(old_po.node_id, old_po)
             if inverted:
                 new_po = new_aig.create_not(new_po)
             new_aig.add_po(new_po)
         
         return new_aig
     
-    def _apply_balance_on_aig(self, aig: AIG) -> AIG:
-        """
-        Apply Logic Balancing trên AIG.
-        
-        Balance logic depth by restructuring AND trees to minimize maximum depth.
-        Uses tree balancing algorithm to create more balanced structures.
-        """
-        # Create new AIG for balanced result
-        new_aig = AIG()
-        
-        # Map old nodes to new nodes
-        node_map = {}
-        
-        # Recreate PIs
-        for var_name, old_pi in aig.pis.items():
-            new_pi = new_aig.create_pi(var_name)
-            node_map[old_pi.node_id] = new_pi
-        
-        # Map constants
-        node_map[aig.const0.node_id] = new_aig.const0
-        node_map[aig.const1.node_id] = new_aig.const1
-        
-        visited = set()
-        
-        def get_node_level(node: AIGNode) -> int:
-            """Get logic level of a node."""
-            if node.is_constant() or node.is_pi():
-                return 0
-            return node.level
-        
-        def balance_and_tree(nodes: List[AIGNode], left_inverted: List[bool], right_inverted: List[bool]) -> AIGNode:
-            """
-            Balance a tree of AND operations.
-            
-            Args:
-                nodes: List of nodes to combine with AND
-                left_inverted: List of left inversion flags
-                right_inverted: List of right inversion flags
-                
-            Returns:
-                Balanced AND tree node
-            """
-            if len(nodes) == 0:
-                return new_aig.const1
-            if len(nodes) == 1:
-                return nodes[0]
-            if len(nodes) == 2:
-                return new_aig.create_and(nodes[0], nodes[1], left_inverted[0], right_inverted[0])
-            
-            # Sort nodes by level (shallow first for better balancing)
-            sorted_indices = sorted(range(len(nodes)), key=lambda i: get_node_level(nodes[i]))
-            sorted_nodes = [nodes[i] for i in sorted_indices]
-            sorted_left_inv = [left_inverted[i] for i in sorted_indices]
-            sorted_right_inv = [right_inverted[i] for i in sorted_indices]
-            
-            # Build balanced tree: combine pairs recursively
-            while len(sorted_nodes) > 1:
-                new_level = []
-                new_left_inv = []
-                new_right_inv = []
-                
-                # Combine pairs
-                for i in range(0, len(sorted_nodes), 2):
-                    if i + 1 < len(sorted_nodes):
-                        # Combine two nodes
-                        combined = new_aig.create_and(
-                            sorted_nodes[i],
-                            sorted_nodes[i + 1],
-                            sorted_left_inv[i],
-                            sorted_right_inv[i + 1]
-                        )
-                        new_level.append(combined)
-                        new_left_inv.append(False)
-                        new_right_inv.append(False)
-                    else:
-                        # Odd one out, keep as is
-                        new_level.append(sorted_nodes[i])
-                        new_left_inv.append(sorted_left_inv[i])
-                        new_right_inv.append(sorted_right_inv[i])
-                
-                sorted_nodes = new_level
-                sorted_left_inv = new_left_inv
-                sorted_right_inv = new_right_inv
-            
-            return sorted_nodes[0]
-        
-        def balance_node(old_node: AIGNode) -> Optional[AIGNode]:
-            """Balance a single node. Always add to node_map so shared nodes are preserved."""
-            if old_node is None:
-                return None
-            
-            if old_node.node_id in node_map:
-                return node_map[old_node.node_id]
-            
-            if old_node.node_id in visited:
-                return node_map.get(old_node.node_id)
-            
-            visited.add(old_node.node_id)
-            
-            if old_node.is_constant():
-                return node_map.get(old_node.node_id)
-            elif old_node.is_pi():
-                return node_map.get(old_node.node_id)
-            elif old_node.is_and():
-                # Balance left and right subtrees first
-                left = balance_node(old_node.left)
-                right = balance_node(old_node.right)
-                # Fallback to const0 if any input missing (avoid None -> lost PO)
-                if left is None:
-                    left = new_aig.const0
-                if right is None:
-                    right = new_aig.const0
-                
-                # Simple approach: just balance the current AND
-                new_node = new_aig.create_and(
-                    left, right,
-                    old_node.left_inverted,
-                    old_node.right_inverted
-                )
-                node_map[old_node.node_id] = new_node
-                return new_node
-            
-            return None
-        
-        # Recreate outputs with balancing
-        for old_po, inverted in aig.pos:
-            new_po = balance_node(old_po)
-            if new_po is None:
-                continue
-            if inverted:
-                new_po = new_aig.create_not(new_po)
-            new_aig.add_po(new_po)
-        
-        # Rebuild hash table for better structure sharing
-        return new_aig.strash()
-    
     def _print_optimization_summary(self, original_nodes: int, final_nodes: int, total_reduction: int):
         """In optimization summary."""
         logger.info("=" * 60)
@@ -515,7 +496,8 @@ class AIGOptimizationFlow:
         
         for opt_name, stats in self.optimization_stats.items():
             if opt_name == 'balance':
-                logger.info(f"  {opt_name.upper()}: {stats['nodes_before']} -> {stats['nodes_after']} (added {stats['added']})")
+                logger.info(f"  {opt_name.upper()}: {stats['nodes_before']} -> {stats['nodes_after']} (added {stats['added']}), "
+                            f"depth {stats['depth_before']} -> {stats['depth_after']}")
             else:
                 logger.info(f"  {opt_name.upper()}: {stats['nodes_before']} -> {stats['nodes_after']} (removed {stats['removed']})")
         
@@ -529,11 +511,25 @@ class AIGOptimizationFlow:
         }
 
 
-def optimize(aig: AIG) -> AIG:
+def optimize(aig: AIG, in_place: bool = False, fraig: bool = True, rewrite: bool = False,
+             rewrite_zero_cost: bool = False, script: Optional[str] = None,
+             pass_timeout: Optional[float] = None) -> AIG:
     """
-    Tối ưu AIG (một chuẩn duy nhất: Strash, DCE, CSE, ConstProp, Balance).
+    Tối ưu AIG (một chuẩn duy nhất: Strash, DCE, CSE, ConstProp, [Rewrite], FRAIG, Balance).
+    
+    in_place=True: sửa trực tiếp ``aig`` (không copy AIG cho mỗi pass) và trả về chính nó.
+    fraig=False: bỏ qua bước FRAIG.
+    rewrite=True: chạy DAG-aware rewriting trước FRAIG (rewrite_zero_cost: biến thể ``-z``).
+    script: chạy script của pass manager (chuỗi hoặc đường dẫn file, xem
+        core/optimization/pass_manager.py) thay cho chuỗi cố định; khi đó
+        fraig/rewrite bị bỏ qua. pass_timeout: timeout (giây) mỗi pass của script.
     """
-    flow = AIGOptimizationFlow()
+    if script is not None:
+        from core.optimization.pass_manager import run_script
+        optimized_aig, _manager = run_script(aig, script, in_place=in_place, pass_timeout=pass_timeout)
+        return optimized_aig
+    flow = AIGOptimizationFlow(in_place=in_place, enable_fraig=fraig, enable_rewrite=rewrite,
+                               rewrite_zero_cost=rewrite_zero_cost)
     return flow.optimize(aig)
 
 
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Optimization Pass Manager — chạy AIG optimization theo script.
+
+``AIGOptimizationFlow.optimize`` chạy một chuỗi cố định; pass manager cho phép
+chọn chuỗi pass theo từng loại design (script rẻ cho design rất lớn, lặp tới điểm
+bất động cho design nhỏ). Script là các lệnh cách nhau bởi ``;`` hoặc xuống dòng
+(``#`` đến hết dòng là comment):
+
+    strash; dce; repeat(rewrite; balance) until gain<1%
+    strash; repeat 4 (rw -z; fraig -T 30; b)
+
+- ``<pass> [options]``: pass trong ``PASS_REGISTRY`` (``strash``, ``dce``, ``cse``,
+  ``constprop``, ``rewrite [-z]``, ``fraig``, ``balance``; alias ``st``, ``rw``,
+  ``rwz``, ``fr``, ``b``). ``-T <giây>``: timeout riêng cho lần gọi đó.
+- ``repeat [N] (<script>) [until gain<P%]``: lặp thân tối đa N lần (mặc định
+  ``DEFAULT_MAX_ITERATIONS``); dừng khi một vòng không đổi gì, hoặc khi số node
+  giảm ít hơn P% so với đầu vòng.
+
+"Thay đổi" của một pass = số node hoặc depth khác trước khi chạy. Một lệnh bị bỏ
+qua (early exit) nếu lần chạy gần nhất của đúng lệnh đó không đổi gì và từ đó AIG
+chưa bị pass nào khác sửa.
+
+Timeout: ở chế độ rebuild trên main thread (có ``signal.setitimer``) pass bị ngắt
+giữa chừng và AIG đầu vào được giữ nguyên. Các trường hợp khác không ngắt được an
+toàn: pass chạy xong, kết quả bị bỏ (rebuild) hoặc giữ lại (in-place, AIG đã bị
+sửa); cả hai đều ghi ``timed_out`` trong báo cáo.
+
+Example:
+    >>> manager = PassManager("strash; dce; repeat(rw; b) until gain<1%")
+    >>> optimized = manager.run(aig)
+    >>> print(manager.format_report())
+"""
+
+import os
+import re
+import signal
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.optimization.optimization_flow import AIGOptimizationFlow
+from core.synthesis.aig_traversal import aig_depth
+from core.utils.error_handling import OptimizationError
+from core.utils.performance import trace_span
+
+logger = logging.getLogger(__name__)
+
+# Tương đương chuỗi cố định của AIGOptimizationFlow.optimize (rewrite tắt mặc định)
+DEFAULT_SCRIPT = "strash; dce; cse; constprop; fraig; balance"
+DEFAULT_MAX_ITERATIONS = 20
+
+
+class ScriptError(OptimizationError):
+    """Script optimization sai cú pháp hoặc dùng pass / option không tồn tại."""
+    pass
+
+
+class _PassTimeout(BaseException):
+    # BaseException: các _run_* của AIGOptimizationFlow bắt Exception và trả về AIG cũ
+    pass
+
+
+# ---------------------------------------------------------------------- registry
+
+class PassInfo:
+    """Một pass đăng ký: ``run(flow, aig, options) -> aig``."""
+
+    def __init__(self, name: str, run: Callable[[AIGOptimizationFlow, Any, Dict[str, Any]], Any],
+                 description: str, flags: Tuple[str, ...] = ()):
+        self.name = name
+        self.run = run
+        self.description = description
+        self.flags = flags
+
+
+PASS_REGISTRY: Dict[str, PassInfo] = {}
+PASS_ALIASES: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+
+
+def register_pass(name: str, description: str, flags: Tuple[str, ...] = ()):
+    """Decorator đăng ký pass vào ``PASS_REGISTRY`` (flags: các cờ không tham số được nhận)."""
+    def decorator(fn):
+        PASS_REGISTRY[name] = PassInfo(name, fn, description, flags)
+        return fn
+    return decorator
+
+
+def register_alias(alias: str, name: str, *flags: str) -> None:
+    """Alias ``alias`` = ``name flags...`` (ví dụ ``rwz`` = ``rewrite -z``)."""
+    PASS_ALIASES[alias] = (name, flags)
+
+
+@register_pass("strash", "Structural hashing (rebuild / rehash tại chỗ)")
+def _pass_strash(flow, aig, options):
+    return flow._run_strash(aig)
+
+
+@register_pass("dce", "Dead code elimination")
+def _pass_dce(flow, aig, options):
+    return flow._run_dce(aig)
+
+
+@register_pass("cse", "Common subexpression elimination")
+def _pass_cse(flow, aig, options):
+    return flow._run_cse(aig)
+
+
+@register_pass("constprop", "Constant propagation")
+def _pass_constprop(flow, aig, options):
+    return flow._run_constprop(aig)
+
+
+@register_pass("rewrite", "DAG-aware rewriting (-z: zero-cost)", flags=("-z",))
+def _pass_rewrite(flow, aig, options):
+    flow.rewrite_zero_cost = "-z" in options["flags"]
+    return flow._run_rewrite(aig)
+
+
+@register_pass("fraig", "Functional reduction (simulation + SAT sweeping)")
+def _pass_fraig(flow, aig, options):
+    return flow._run_fraig(aig)
+
+
+@register_pass("balance", "Supergate balancing (giảm depth)")
+def _pass_balance(flow, aig, options):
+    return flow._run_balance(aig)
+
+
+register_alias("st", "strash")
+register_alias("rw", "rewrite")
+register_alias("rwz", "rewrite", "-z")
+register_alias("fr", "fraig")
+register_alias("b", "balance")
+
+
+# ---------------------------------------------------------------------- script
+
+class PassCall:
+    """Một lệnh pass trong script."""
+
+    def __init__(self, name: str, flags: Tuple[str, ...] = (), timeout: Optional[float] = None):
+        self.name = name
+        self.flags = flags
+        self.timeout = timeout
+
+    @property
+    def label(self) -> str:
+        return " ".join((self.name,) + self.flags)
+
+    def __repr__(self) -> str:
+        return f"PassCall({self.label!r})"
+
+
+class Repeat:
+    """``repeat [N] (body) [until gain<P%]``."""
+
+    def __init__(self, body: List[Any], max_iterations: int = DEFAULT_MAX_ITERATIONS,
+                 min_gain: Optional[float] = None):
+        self.body = body
+        self.max_iterations = max_iterations
+        self.min_gain = min_gain
+
+    def __repr__(self) -> str:
+        return f"Repeat({self.body!r}, max={self.max_iterations}, min_gain={self.min_gain})"
+
+
+_TOKEN_RE = re.compile(r"[ \t\r]*(?:(#[^\n]*)|(\n)|([;()])|([^\s;()#]+))")
+_UNTIL_RE = re.compile(r"gain\s*<\s*([0-9]*\.?[0-9]+)\s*%?$")
+
+
+def _tokenize(text: str) -> List[str]:
+    tokens: List[str] = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if m is None or m.end() == pos:
+            if text[pos:].strip():
+                raise ScriptError(f"Unexpected character {text[pos]!r} at offset {pos}")
+            break
+        pos = m.end()
+        if m.group(1):
+            continue
+        tokens.append(";" if m.group(2) else (m.group(3) or m.group(4)))
+    return tokens
+
+
+class _ScriptParser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ScriptError("Unexpected end of script")
+        self.pos += 1
+        return token
+
+    def expect(self, token: str) -> None:
+        got = self.take()
+        if got != token:
+            raise ScriptError(f"Expected {token!r}, got {got!r}")
+
+    def parse(self) -> List[Any]:
+        steps = self.parse_sequence()
+        if self.peek() is not None:
+            raise ScriptError(f"Unexpected {self.peek()!r}")
+        return steps
+
+    def parse_sequence(self) -> List[Any]:
+        steps: List[Any] = []
+        while self.peek() not in (None, ")"):
+            if self.peek() == ";":
+                self.take()
+                continue
+            steps.append(self.parse_step())
+            if self.peek() not in (None, ")", ";"):
+                raise ScriptError(f"Expected ';' after step, got {self.peek()!r}")
+        return steps
+
+    def parse_step(self) -> Any:
+        word = self.take()
+        if word == "repeat":
+            return self.parse_repeat()
+        if word in ("(", ")", ";"):
+            raise ScriptError(f"Unexpected {word!r}")
+        return self.parse_call(word)
+
+    def parse_repeat(self) -> Repeat:
+        max_iterations = DEFAULT_MAX_ITERATIONS
+        if self.peek() not in (None, "("):
+            count = self.take()
+            if not count.isdigit() or int(count) < 1:
+                raise ScriptError(f"repeat count must be a positive integer, got {count!r}")
+            max_iterations = int(count)
+        self.expect("(")
+        body = self.parse_sequence()
+        self.expect(")")
+        if not body:
+            raise ScriptError("repeat body is empty")
+        min_gain = None
+        if self.peek() == "until":
+            self.take()
+            words = []
+            while self.peek() not in (None, ";", ")"):
+                words.append(self.take())
+            m = _UNTIL_RE.match("".join(words))
+            if m is None:
+                raise ScriptError(f"Expected 'until gain<P%', got {' '.join(words)!r}")
+            min_gain = float(m.group(1))
+        return Repeat(body, max_iterations, min_gain)
+
+    def parse_call(self, word: str) -> PassCall:
+        name, flags = PASS_ALIASES.get(word, (word, ()))
+        info = PASS_REGISTRY.get(name)
+        if info is None:
+            raise ScriptError(f"Unknown pass {word!r} (available: {', '.join(available_passes())})")
+        flags = list(flags)
+        timeout = None
+        while self.peek() not in (None, ";", ")", "("):
+            option = self.take()
+            if option == "-T":
+                value = self.take()
+                try:
+                    timeout = float(value)
+                except ValueError:
+                    raise ScriptError(f"-T expects seconds, got {value!r}") from None
+            elif option in info.flags:
+                if option not in flags:
+                    flags.append(option)
+            else:
+                raise ScriptError(f"Unknown option {option!r} for pass {name!r}")
+        return PassCall(name, tuple(flags), timeout)
+
+
+def parse_script(text: str) -> List[Any]:
+    """Parse script thành danh sách ``PassCall`` / ``Repeat``; lỗi cú pháp → ``ScriptError``."""
+    steps = _ScriptParser(text).parse()
+    if not steps:
+        raise ScriptError("Empty optimization script")
+    return steps
+
+
+def load_script(script: str) -> str:
+    """Nội dung script: đọc file nếu ``script`` là đường dẫn tồn tại, ngược lại trả về chính nó."""
+    if os.path.isfile(script):
+        with open(script, "r", encoding="utf-8") as f:
+            return f.read()
+    return script
+
+
+def available_passes() -> List[str]:
+    return sorted(set(PASS_REGISTRY) | set(PASS_ALIASES))
+
+
+# ---------------------------------------------------------------------- runner
+
+class PassRecord:
+    """Một lần chạy (hoặc bỏ qua) pass trong báo cáo."""
+
+    def __init__(self, label: str, iteration: Tuple[int, ...], nodes_before: int, depth_before: int):
+        self.label = label
+        self.iteration = iteration  # chỉ số vòng của các repeat bao ngoài (1-based)
+        self.nodes_before = nodes_before
+        self.nodes_after = nodes_before
+        self.depth_before = depth_before
+        self.depth_after = depth_before
+        self.time = 0.0
+        self.skipped = False
+        self.timed_out = False
+
+    @property
+    def changed(self) -> bool:
+        return self.nodes_after != self.nodes_before or self.depth_after != self.depth_before
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pass': self.label,
+            'iteration': list(self.iteration),
+            'nodes_before': self.nodes_before,
+            'nodes_after': self.nodes_after,
+            'depth_before': self.depth_before,
+            'depth_after': self.depth_after,
+            'time': self.time,
+            'changed': self.changed,
+            'skipped': self.skipped,
+            'timed_out': self.timed_out,
+        }
+
+
+class PassManager:
+    """
+    Chạy script optimization trên AIG.
+
+    Args:
+        script: Nội dung script hoặc đường dẫn file (None = ``DEFAULT_SCRIPT``)
+        in_place: Các pass sửa trực tiếp AIG đầu vào (xem ``AIGOptimizationFlow``)
+        pass_timeout: Timeout mặc định (giây) cho mỗi lần gọi pass; ``-T`` trong script thắng
+    """
+
+    def __init__(self, script: Optional[str] = None, in_place: bool = False,
+                 pass_timeout: Optional[float] = None):
+        self.script = load_script(script) if script else DEFAULT_SCRIPT
+        self.steps = parse_script(self.script)
+        self.in_place = bool(in_place)
+        self.pass_timeout = pass_timeout
+        self.records: List[PassRecord] = []
+        self.stats: Dict[str, Any] = {}
+        self._flow: Optional[AIGOptimizationFlow] = None
+        self._version = 0  # tăng mỗi khi một pass làm đổi AIG
+        self._idle: Dict[str, int] = {}  # label → version lúc lệnh đó chạy mà không đổi gì
+
+    def run(self, aig):
+        """Chạy script, trả về AIG kết quả (chính ``aig`` nếu in_place)."""
+        start = time.perf_counter()
+        self.records = []
+        self._version = 0
+        self._idle = {}
+        self._flow = AIGOptimizationFlow(in_place=self.in_place)
+        nodes_before, depth_before = aig.count_nodes(), aig_depth(aig)
+        logger.info(f"Running optimization script: {' '.join(self.script.split())}")
+
+        with trace_span("optimize", category="optimize", script=" ".join(self.script.split()),
+                        nodes_before=nodes_before) as span:
+            aig = self._run_steps(self.steps, aig, ())
+            span.set(nodes_after=aig.count_nodes())
+
+        nodes_after, depth_after = aig.count_nodes(), aig_depth(aig)
+        self.stats = {
+            'script': self.script,
+            'nodes_before': nodes_before,
+            'nodes_after': nodes_after,
+            'depth_before': depth_before,
+            'depth_after': depth_after,
+            'passes_run': sum(1 for r in self.records if not r.skipped),
+            'passes_skipped': sum(1 for r in self.records if r.skipped),
+            'timeouts': sum(1 for r in self.records if r.timed_out),
+            'time': time.perf_counter() - start,
+            'passes': [r.to_dict() for r in self.records],
+        }
+        return aig
+
+    def _run_steps(self, steps: List[Any], aig, iteration: Tuple[int, ...]):
+        for step in steps:
+            if isinstance(step, Repeat):
+                aig = self._run_repeat(step, aig, iteration)
+            else:
+                aig = self._run_pass(step, aig, iteration)
+        return aig
+
+    def _run_repeat(self, repeat: Repeat, aig, iteration: Tuple[int, ...]):
+        for i in range(1, repeat.max_iterations + 1):
+            version = self._version
+            nodes_before = aig.count_nodes()
+            aig = self._run_steps(repeat.body, aig, iteration + (i,))
+            if self._version == version:
+                logger.info(f"  repeat: no change in iteration {i}, stopping")
+                break
+            if repeat.min_gain is not None:
+                nodes_after = aig.count_nodes()
+                gain = (nodes_before - nodes_after) / nodes_before * 100 if nodes_before else 0.0
+                if gain < repeat.min_gain:
+                    logger.info(f"  repeat: gain {gain:.2f}% < {repeat.min_gain}% in iteration {i}, stopping")
+                    break
+        return aig
+
+    def _run_pass(self, call: PassCall, aig, iteration: Tuple[int, ...]):
+        label = call.label
+        record = PassRecord(label, iteration, aig.count_nodes(), aig_depth(aig))
+        self.records.append(record)
+        if self._idle.get(label) == self._version:
+            record.skipped = True
+            logger.info(f"  {label}: skipped (no change since last run)")
+            return aig
+
+        timeout = call.timeout if call.timeout is not None else self.pass_timeout
+        info = PASS_REGISTRY[call.name]
+        options = {'flags': call.flags}
+        start = time.perf_counter()
+        result = aig
+        try:
+            if timeout and self._can_interrupt():
+                with _alarm(timeout):
+                    result = info.run(self._flow, aig, options)
+            else:
+                result = info.run(self._flow, aig, options)
+        except _PassTimeout:
+            record.timed_out = True
+            result = aig
+        record.time = time.perf_counter() - start
+        if timeout and record.time > timeout and not record.timed_out:
+            record.timed_out = True
+            if not self.in_place:
+                result = aig  # rebuild: AIG đầu vào còn nguyên, bỏ kết quả quá hạn
+        if record.timed_out:
+            logger.warning(f"  {label}: timed out after {record.time:.2f}s (limit {timeout}s)")
+
+        record.nodes_after, record.depth_after = result.count_nodes(), aig_depth(result)
+        if record.changed:
+            self._version += 1
+        else:
+            self._idle[label] = self._version
+        logger.info(f"  {label}: {record.nodes_before} -> {record.nodes_after} nodes, "
+                    f"depth {record.depth_before} -> {record.depth_after} ({record.time:.3f}s)")
+        return result
+
+    def _can_interrupt(self) -> bool:
+        return (not self.in_place and hasattr(signal, "setitimer")
+                and threading.current_thread() is threading.main_thread())
+
+    def format_report(self) -> str:
+        """Bảng per-pass (node / depth / thời gian) của lần ``run`` gần nhất."""
+        lines = [f"{'pass':<16} {'iter':>6} {'nodes':>17} {'depth':>11} {'time[s]':>9}"]
+        for r in self.records:
+            iteration = ".".join(map(str, r.iteration)) or "-"
+            if r.skipped:
+                lines.append(f"{r.label:<16} {iteration:>6} {'(skipped: no change)':>39}")
+                continue
+            note = "  TIMEOUT" if r.timed_out else ""
+            lines.append(f"{r.label:<16} {iteration:>6} {r.nodes_before:>8} -> {r.nodes_after:<5} "
+                         f"{r.depth_before:>4} -> {r.depth_after:<3} {r.time:>9.3f}{note}")
+        if self.stats:
+            s = self.stats
+            lines.append(f"total: {s['nodes_before']} -> {s['nodes_after']} nodes, depth "
+                         f"{s['depth_before']} -> {s['depth_after']}, {s['passes_run']} passes run, "
+                         f"{s['passes_skipped']} skipped, {s['time']:.3f}s")
+        return "\n".join(lines)
+
+
+class _alarm:
+    """Context manager: ném ``_PassTimeout`` sau ``seconds`` giây (SIGALRM, main thread)."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def _handler(self, signum, frame):
+        raise _PassTimeout()
+
+    def __enter__(self):
+        self._previous = signal.signal(signal.SIGALRM, self._handler)
+        signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._previous)
+        return False
+
+
+def run_script(aig, script: Optional[str] = None, in_place: bool = False,
+               pass_timeout: Optional[float] = None) -> Tuple[Any, PassManager]:
+    """Chạy script (chuỗi hoặc file) trên AIG; trả về (AIG kết quả, PassManager chứa báo cáo)."""
+    manager = PassManager(script, in_place=in_place, pass_timeout=pass_timeout)
+    return manager.run(aig), manager
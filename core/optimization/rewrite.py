@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+DAG-aware AIG Rewriting
+
+Với mỗi node (theo thứ tự topo) và mỗi cut 4 input của nó:
+1. Truth table của cut → lớp NPN (core/synthesis/npn.py) → AIG nhỏ đã tính
+   sẵn cho đại diện của lớp (core/optimization/rewrite_library.py).
+2. Saving = MFFC của node giới hạn bởi cut (các node chỉ phục vụ node này,
+   sẽ chết khi node bị thay).
+3. Cost = số node mới cần tạo khi dựng cấu trúc trên leaves của cut; node đã
+   có trong AIG (bảng strash) và còn sống ngoài MFFC không tính (DAG-aware).
+4. Thay node bằng cấu trúc có gain = saving - cost lớn nhất nếu gain > 0
+   (zero-cost: gain >= 0, chỉ tái cấu trúc để các pass sau có cơ hội mới).
+
+Các thay thế được ghi lại dạng substitutions và áp dụng một lần bằng
+``strash_in_place(substitutions)``. Reference count và fanin (qua bảng thay
+thế) được cập nhật ngay sau mỗi thay thế, nên MFFC của các node sau được tính
+trên AIG hiện tại; truth table của cut vẫn đúng vì thay thế giữ nguyên hàm.
+
+ABC Reference: src/opt/rwr/rwrEva.c, src/opt/dar/darLib.c
+- Rwr_NodeRewrite(): đánh giá cut / lớp NPN / gain
+- Dar_LibEval(): đếm node mới có tính chia sẻ với AIG hiện tại
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.synthesis.aig_cuts import CutEnumerator
+from core.synthesis.aig_traversal import and_program
+from core.synthesis.npn import npn_canonical
+from core.optimization.rewrite_library import REWRITE_LIBRARY
+
+logger = logging.getLogger(__name__)
+
+
+def _fold(a: int, b: int) -> Optional[int]:
+    """AND(a, b) nếu rút gọn được (hằng số / a == b / a == !b); literal 0/1 là CONST0/CONST1."""
+    if a == 0 or b == 0 or a == b ^ 1:
+        return 0
+    if a == 1 or a == b:
+        return b
+    if b == 1:
+        return a
+    return None
+
+
+class RewriteOptimizer:
+    """
+    DAG-aware rewriting với thư viện cấu trúc 4 input theo lớp NPN.
+
+    Args:
+        zero_cost: chấp nhận thay thế có gain = 0 (``rewrite -z`` trong ABC)
+        max_cuts: số cut 4 input giữ lại mỗi node
+    """
+
+    def __init__(self, zero_cost: bool = False, max_cuts: int = 8):
+        self.zero_cost = bool(zero_cost)
+        self.max_cuts = max_cuts
+        self.stats: Dict[str, Any] = {}
+
+    def optimize(self, aig, in_place: bool = False):
+        """
+        Chạy rewriting trên ``aig`` (AIG hoặc ArrayAIG).
+
+        in_place=True: sửa trực tiếp ``aig`` và trả về chính nó; ngược lại trả
+        về AIG mới (cùng loại manager), ``aig`` không đổi.
+        """
+        start = time.perf_counter()
+        nodes_before = aig.count_nodes()
+        if in_place:
+            aig.strash_in_place()
+            work = aig
+        else:
+            work = aig.strash()
+        substitutions = self._rewrite(work)
+        if substitutions:
+            work.strash_in_place(substitutions)
+            if not in_place:
+                work.compact()
+        self.stats['nodes_before'] = nodes_before
+        self.stats['nodes_after'] = work.count_nodes()
+        self.stats['time'] = time.perf_counter() - start
+        logger.info(
+            f"  Rewrite{' -z' if self.zero_cost else ''}: {nodes_before} -> {self.stats['nodes_after']} nodes "
+            f"({self.stats['rewrites']} rewrites, {self.stats['time']:.2f}s)"
+        )
+        return work
+
+    # ------------------------------------------------------------------
+
+    def _rewrite(self, aig) -> Dict[int, Tuple[int, bool]]:
+        """Chọn các thay thế; trả về substitutions cho ``strash_in_place``."""
+        program = and_program(aig)
+        cuts = CutEnumerator(k=4, max_cuts=self.max_cuts).enumerate(aig)
+
+        # fan: node -> literal fanin (gồm cả node tạo mới); refs: số fanout sống
+        fan: Dict[int, Tuple[int, int]] = {}
+        refs: Dict[int, int] = {}
+        for out, a, b, op in program:
+            fan[out] = ((a << 1) | (op & 1), (b << 1) | (op >> 1))
+            refs[a] = refs.get(a, 0) + 1
+            refs[b] = refs.get(b, 0) + 1
+        for po, _inv in aig.pos:
+            refs[po.node_id] = refs.get(po.node_id, 0) + 1
+
+        self._aig = aig
+        self._fan = fan
+        self._refs = refs
+        self._rep: Dict[int, int] = {}
+        rewrites = 0
+        total_gain = 0
+        evaluated = 0
+
+        for out, _a, _b, _op in program:
+            if refs.get(out, 0) == 0:
+                continue
+            best = None
+            best_gain = 0 if self.zero_cost else 1
+            for c in cuts.cut_indices(out)[1:]:
+                leaves = cuts.leaves(c)
+                rep_truth, (perm, neg, out_neg) = npn_canonical(cuts.truth(c))
+                structure, struct_out = REWRITE_LIBRARY[rep_truth]
+                leaf_lits = [self._resolve(leaf << 1) for leaf in leaves]
+                inputs: List[Optional[int]] = [0]
+                for i in range(4):
+                    j = perm[i]
+                    inputs.append(leaf_lits[j] ^ ((neg >> i) & 1) if j < len(leaves) else None)
+                struct_out ^= out_neg
+
+                leaf_ids = {lit >> 1 for lit in leaf_lits}
+                if any(refs.get(leaf, 0) == 0 and leaf in fan for leaf in leaf_ids):
+                    continue  # leaf đã chết (cone hiện tại không đi qua nó)
+                freed = self._deref_mffc(out, leaf_ids)
+                cost = self._cost(out, structure, struct_out, inputs, freed)
+                self._ref_mffc(freed, leaf_ids)
+                evaluated += 1
+                if cost is None:
+                    continue
+                gain = len(freed) - cost
+                if gain >= best_gain and (best is None or gain > best[0]):
+                    best = (gain, structure, struct_out, inputs)
+
+            if best is not None:
+                self._replace(out, *best[1:])
+                rewrites += 1
+                total_gain += best[0]
+
+        substitutions: Dict[int, Tuple[int, bool]] = {}
+        for node_id in self._rep:
+            lit = self._resolve(node_id << 1)
+            substitutions[node_id] = (lit >> 1, bool(lit & 1))
+        self.stats = {'rewrites': rewrites, 'estimated_gain': total_gain, 'cuts_evaluated': evaluated}
+        self._aig = self._fan = self._refs = self._rep = None
+        return substitutions
+
+    def _resolve(self, lit: int) -> int:
+        rep = self._rep
+        while (lit >> 1) in rep:
+            lit = rep[lit >> 1] ^ (lit & 1)
+        return lit
+
+    def _deref_mffc(self, out: int, leaf_ids: Set[int]) -> Set[int]:
+        """
+        Giảm ref trong cone hiện tại của ``out`` (fanin đã qua thay thế, dừng ở
+        leaves); trả về MFFC của ``out`` (kể cả ``out``).
+        """
+        fan = self._fan
+        refs = self._refs
+        resolve = self._resolve
+        freed = {out}
+        stack = [out]
+        while stack:
+            for lit in fan[stack.pop()]:
+                child = resolve(lit) >> 1
+                if child <= 1 or child in leaf_ids:
+                    continue
+                refs[child] -= 1
+                if refs[child] == 0 and child in fan:
+                    freed.add(child)
+                    stack.append(child)
+        return freed
+
+    def _ref_mffc(self, freed: Set[int], leaf_ids: Set[int]):
+        """Hoàn tác ``_deref_mffc``."""
+        fan = self._fan
+        refs = self._refs
+        for node_id in freed:
+            for lit in fan[node_id]:
+                child = self._resolve(lit) >> 1
+                if child > 1 and child not in leaf_ids:
+                    refs[child] += 1
+
+    def _cost(self, out: int, structure, struct_out: int, inputs, freed: Set[int]) -> Optional[int]:
+        """
+        Số node mới để dựng ``structure`` trên ``inputs``; node đã có, còn sống
+        và không thuộc MFFC được dùng lại miễn phí. None nếu không dùng được.
+        """
+        lookup = self._aig.lookup_and_lit
+        refs = self._refs
+        values = list(inputs)
+        cost = 0
+        placeholder = -1
+        for a, b in structure:
+            la = values[a >> 1]
+            lb = values[b >> 1]
+            if la is None or lb is None:
+                return None
+            la ^= a & 1
+            lb ^= b & 1
+            lit = _fold(la, lb)
+            if lit is None:
+                node_id = lookup(la, lb) if la >= 0 and lb >= 0 else None
+                if node_id == out:
+                    return None
+                if node_id is None:
+                    lit = placeholder << 1
+                    placeholder -= 1
+                    cost += 1
+                else:
+                    lit = node_id << 1
+                    if node_id in freed or refs.get(node_id, 0) == 0:
+                        cost += 1
+            values.append(lit)
+        root = values[struct_out >> 1]
+        if root is None:
+            return None
+        root ^= struct_out & 1
+        if root >> 1 == out:
+            return None
+        if root > 1 and root & 1:
+            # Thay bằng literal đảo cần node NOT tường minh (xem AIG.strash)
+            not_id = self._aig.lookup_not(root >> 1) if root >= 0 else None
+            if not_id is None or not_id in freed or refs.get(not_id, 0) == 0:
+                cost += 1
+        return cost
+
+    def _replace(self, out: int, structure, struct_out: int, inputs):
+        """Dựng cấu trúc trong AIG, chuyển fanout của ``out`` sang root mới."""
+        aig = self._aig
+        fan = self._fan
+        refs = self._refs
+        values = list(inputs)
+        for a, b in structure:
+            la = values[a >> 1] ^ (a & 1)
+            lb = values[b >> 1] ^ (b & 1)
+            lit = _fold(la, lb)
+            if lit is None:
+                lit = aig.create_and_lit(la, lb)
+                if (lit >> 1) not in fan:
+                    fan[lit >> 1] = (la, lb)
+            values.append(lit)
+        root = values[struct_out >> 1] ^ (struct_out & 1)
+
+        count = refs[out]
+        self._ref(root, count)
+        refs[out] = 0
+        stack = [out]
+        while stack:
+            for lit in fan[stack.pop()]:
+                child = self._resolve(lit) >> 1
+                if child <= 1:
+                    continue
+                refs[child] -= 1
+                if refs[child] == 0 and child in fan:
+                    stack.append(child)
+        self._rep[out] = root
+
+    def _ref(self, lit: int, count: int):
+        """Tăng ref của node ``lit`` thêm ``count``; node vừa sống lại ref tiếp fanin."""
+        fan = self._fan
+        refs = self._refs
+        stack = [(lit >> 1, count)]
+        while stack:
+            node_id, n = stack.pop()
+            if node_id <= 1:
+                continue
+            before = refs.get(node_id, 0)
+            refs[node_id] = before + n
+            if before == 0 and node_id in fan:
+                for child_lit in fan[node_id]:
+                    stack.append((self._resolve(child_lit) >> 1, 1))
+
+
+def rewrite(aig, zero_cost: bool = False, in_place: bool = False, **kwargs):
+    """Wrapper: ``RewriteOptimizer(zero_cost, **kwargs).optimize(aig, in_place)``."""
+    return RewriteOptimizer(zero_cost=zero_cost, **kwargs).optimize(aig, in_place=in_place)
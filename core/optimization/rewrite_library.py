@@ -0,0 +1,233 @@
+"""
+Thư viện rewriting: một AIG nhỏ cho đại diện của mỗi lớp NPN 4 input.
+
+File được sinh bởi tools/gen_rewrite_library.py - không sửa tay.
+
+REWRITE_LIBRARY[rep] = (nodes, out_lit); literal = 2 * index + complement,
+index 0 = CONST0, 1..4 = input x0..x3, 5 + i = AND node ``nodes[i]``.
+"""
+
+REWRITE_LIBRARY = {
+    0x0000: ((), 0),
+    0x0001: (((3, 5), (7, 10), (9, 12)), 14),
+    0x0003: (((5, 7), (9, 10)), 12),
+    0x0006: (((2, 4), (3, 5), (11, 13), (7, 14), (9, 16)), 18),
+    0x0007: (((2, 4), (7, 11), (9, 12)), 14),
+    0x000F: (((7, 9),), 10),
+    0x0016: (((5, 7), (2, 11), (3, 5), (7, 14), (13, 17), (4, 6), (18, 21), (9, 22)), 24),
+    0x0017: (((4, 6), (3, 11), (5, 7), (13, 15), (9, 17)), 18),
+    0x0018: (((3, 5), (2, 7), (11, 13), (5, 7), (15, 17), (9, 18)), 20),
+    0x0019: (((2, 4), (7, 10), (3, 5), (13, 15), (9, 17)), 18),
+    0x001B: (((3, 5), (2, 7), (11, 13), (9, 15)), 16),
+    0x001E: (((3, 5), (6, 11), (7, 10), (13, 15), (9, 16)), 18),
+    0x001F: (((3, 5), (6, 11), (9, 13)), 14),
+    0x003C: (((4, 6), (5, 7), (11, 13), (9, 14)), 16),
+    0x003D: (((2, 7), (5, 11), (4, 7), (13, 15), (9, 17)), 18),
+    0x003F: (((4, 6), (9, 11)), 12),
+    0x0069: (((2, 4), (3, 5), (11, 13), (6, 15), (7, 14), (17, 19), (9, 20)), 22),
+    0x006B: (((2, 4), (6, 10), (4, 6), (3, 15), (13, 17), (5, 7), (19, 21), (9, 23)), 24),
+    0x006F: (((2, 4), (3, 5), (11, 13), (6, 15), (9, 17)), 18),
+    0x007E: (((2, 4), (5, 7), (11, 13), (2, 7), (15, 17), (9, 19)), 20),
+    0x007F: (((2, 4), (6, 10), (9, 13)), 14),
+    0x00FF: ((), 9),
+    0x0116: (((3, 5), (7, 9), (11, 13), (7, 10), (9, 16), (15, 19), (2, 4), (20, 23), (6, 8), (24, 27)), 28),
+    0x0117: (((2, 4), (7, 11), (9, 12), (3, 5), (15, 17), (6, 8), (19, 21)), 22),
+    0x0118: (((7, 9), (4, 11), (3, 7), (9, 14), (13, 17), (2, 5), (18, 21), (6, 8), (22, 25)), 26),
+    0x0119: (((2, 4), (7, 10), (9, 12), (3, 5), (15, 17), (6, 8), (19, 21)), 22),
+    0x011A: (((3, 5), (7, 9), (11, 13), (3, 7), (9, 16), (15, 19), (6, 8), (20, 23)), 24),
+    0x011B: (((2, 7), (9, 10), (3, 5), (13, 15), (6, 8), (17, 19)), 20),
+    0x011E: (((3, 5), (7, 9), (11, 13), (7, 10), (9, 16), (15, 19), (6, 8), (20, 23)), 24),
+    0x011F: (((6, 8), (3, 11), (5, 12), (7, 9), (15, 17)), 19),
+    0x012C: (((2, 5), (6, 11), (3, 5), (8, 15), (13, 17), (5, 7), (9, 20), (18, 23)), 24),
+    0x012D: (((5, 7), (9, 11), (3, 5), (13, 15), (2, 5), (6, 19), (17, 21)), 22),
+    0x012F: (((2, 5), (6, 11), (3, 5), (8, 15), (13, 17)), 18),
+    0x013C: (((3, 8), (7, 11), (5, 13), (4, 7), (9, 16), (15, 19), (6, 8), (21, 23)), 24),
+    0x013D: (((2, 7), (5, 11), (4, 7), (9, 14), (13, 17), (6, 8), (19, 21)), 22),
+    0x013E: (((3, 8), (7, 11), (5, 13), (3, 5), (7, 17), (9, 18), (15, 21), (6, 8), (23, 25)), 26),
+    0x013F: (((3, 7), (8, 11), (5, 13), (7, 9), (15, 17)), 19),
+    0x0168: (((4, 6), (5, 7), (11, 13), (2, 15), (3, 11), (9, 18), (17, 21), (8, 13), (22, 25)), 26),
+    0x0169: (((2, 4), (7, 11), (9, 13), (3, 5), (15, 17), (11, 17), (6, 21), (19, 23)), 24),
+    0x016A: (((4, 7), (5, 9), (11, 13), (3, 14), (4, 6), (2, 19), (9, 20), (17, 23), (6, 8), (25, 27)), 28),
+    0x016B: (((2, 4), (6, 10), (4, 6), (3, 15), (13, 17), (9, 18), (3, 5), (7, 22), (21, 25)), 27),
+    0x016E: (((7, 8), (5, 11), (3, 13), (4, 6), (2, 17), (9, 18), (15, 21), (4, 8), (23, 25)), 26),
+    0x016F: (((2, 4), (3, 5), (11, 13), (6, 15), (8, 13), (17, 19)), 20),
+    0x017E: (((3, 4), (2, 7), (11, 13), (9, 15), (3, 8), (7, 19), (5, 21), (17, 23), (6, 8), (25, 27)), 28),
+    0x017F: (((5, 7), (8, 11), (3, 13), (4, 6), (9, 17), (15, 19)), 21),
+    0x0180: (((5, 7), (2, 9), (11, 13), (2, 5), (15, 17), (7, 9), (18, 21)), 22),
+    0x0181: (((2, 4), (9, 10), (5, 7), (13, 15), (2, 7), (17, 19)), 20),
+    0x0182: (((2, 4), (6, 11), (2, 8), (13, 15), (4, 7), (16, 19), (3, 9), (20, 23)), 24),
+    0x0183: (((2, 4), (6, 11), (2, 8), (13, 15), (4, 7), (16, 19)), 20),
+    0x0186: (((5, 9), (3, 11), (7, 12), (4, 7), (2, 17), (9, 18), (15, 21), (4, 8), (23, 25), (5, 6), (26, 29)), 30),
+    0x0187: (((4, 7), (9, 11), (2, 13), (2, 4), (6, 17), (15, 19), (4, 8), (20, 23)), 24),
+    0x0189: (((5, 7), (2, 9), (11, 13), (2, 5), (15, 17)), 18),
+    0x018B: (((3, 5), (2, 9), (11, 13), (5, 6), (15, 17)), 18),
+    0x018F: (((2, 4), (6, 11), (3, 5), (8, 15), (13, 17)), 18),
+    0x0196: (((2, 4), (6, 11), (9, 13), (3, 5), (15, 17), (11, 17), (7, 21), (9, 22), (19, 25), (6, 8), (26, 29)), 30),
+    0x0197: (((2, 4), (6, 10), (7, 11), (13, 15), (9, 17), (3, 5), (19, 21), (6, 8), (23, 25)), 26),
+    0x0198: (((7, 9), (5, 11), (2, 9), (13, 15), (2, 5), (17, 19), (6, 8), (20, 23)), 24),
+    0x0199: (((2, 4), (9, 10), (3, 5), (13, 15), (6, 8), (17, 19)), 20),
+    0x019A: (((7, 9), (3, 11), (5, 12), (5, 6), (2, 17), (9, 18), (15, 21), (6, 8), (23, 25)), 26),
+    0x019B: (((5, 6), (2, 11), (9, 12), (3, 5), (15, 17), (6, 8), (19, 21)), 22),
+    0x019E: (((2, 4), (6, 11), (9, 13), (3, 5), (15, 17), (7, 16), (9, 20), (19, 23), (6, 8), (24, 27)), 28),
+    0x019F: (((2, 4), (6, 11), (9, 13), (3, 5), (15, 17), (6, 8), (19, 21)), 22),
+    0x01A8: (((3, 5), (7, 10), (5, 7), (9, 15), (13, 17), (3, 9), (19, 21)), 22),
+    0x01A9: (((5, 7), (2, 11), (9, 12), (3, 5), (7, 16), (15, 19)), 21),
+    0x01AA: (((3, 5), (7, 10), (8, 13), (3, 9), (15, 17)), 18),
+    0x01AB: (((3, 5), (7, 10), (2, 9), (13, 15)), 17),
+    0x01AC: (((3, 5), (8, 11), (5, 7), (9, 14), (13, 17), (3, 6), (18, 21)), 22),
+    0x01AD: (((5, 7), (9, 11), (3, 5), (13, 15), (3, 6), (17, 19)), 20),
+    0x01AE: (((5, 9), (7, 11), (3, 13), (3, 5), (8, 17), (15, 19)), 20),
+    0x01AF: (((3, 5), (8, 11), (3, 6), (13, 15)), 16),
+    0x01BC: (((3, 6), (9, 11), (3, 5), (13, 15), (5, 7), (9, 18), (17, 21), (6, 8), (22, 25)), 26),
+    0x01BD: (((3, 6), (5, 7), (11, 13), (9, 14), (3, 5), (17, 19), (6, 8), (21, 23)), 24),
+    0x01BE: (((7, 9), (3, 11), (5, 12), (4, 7), (3, 17), (9, 19), (15, 21), (6, 8), (23, 25)), 26),
+    0x01BF: (((3, 7), (8, 11), (3, 4), (13, 15), (7, 9), (17, 19)), 21),
+    0x01E8: (((4, 6), (3, 11), (9, 13), (3, 5), (7, 16), (15, 19), (5, 7), (9, 22), (21, 25)), 26),
+    0x01E9: (((4, 6), (3, 11), (5, 7), (13, 15), (9, 16), (3, 5), (7, 20), (19, 23)), 25),
+    0x01EA: (((4, 7), (5, 9), (11, 13), (3, 15), (3, 7), (8, 19), (17, 21)), 22),
+    0x01EB: (((4, 6), (3, 11), (9, 13), (3, 5), (7, 16), (15, 19)), 21),
+    0x01EE: (((3, 5), (7, 10), (8, 13), (9, 10), (15, 17)), 18),
+    0x01EF: (((3, 5), (7, 10), (9, 11), (13, 15)), 17),
+    0x01FE: (((3, 5), (7, 10), (8, 13), (9, 12), (15, 17)), 18),
+    0x033C: (((7, 9), (4, 11), (5, 7), (9, 14), (13, 17), (6, 8), (18, 21)), 22),
+    0x033D: (((2, 7), (9, 10), (5, 13), (4, 7), (9, 16), (15, 19), (6, 8), (21, 23)), 24),
+    0x033F: (((6, 8), (5, 11), (7, 9), (13, 15)), 17),
+    0x0356: (((5, 7), (3, 9), (11, 13), (3, 5), (7, 16), (9, 18), (15, 21)), 22),
+    0x0357: (((5, 7), (3, 9), (11, 13)), 15),
+    0x0358: (((2, 4), (9, 11), (7, 13), (3, 6), (9, 16), (15, 19), (4, 8), (21, 23)), 24),
+    0x0359: (((3, 7), (9, 11), (5, 7), (13, 15), (4, 7), (2, 19), (9, 20), (17, 23)), 24),
+    0x035A: (((3, 9), (6, 11), (3, 7), (9, 14), (13, 17), (4, 8), (18, 21)), 22),
+    0x035B: (((2, 6), (3, 7), (11, 13), (9, 14), (5, 7), (17, 19)), 21),
+    0x035E: (((3, 5), (9, 10), (7, 13), (3, 6), (9, 16), (15, 19), (4, 8), (21, 23)), 24),
+    0x035F: (((4, 8), (7, 11), (3, 9), (13, 15)), 17),
+    0x0368: (((2, 6), (3, 7), (11, 13), (9, 14), (4, 17), (5, 11), (9, 20), (19, 23), (6, 8), (24, 27)), 28),
+    0x0369: (((4, 6), (3, 11), (9, 13), (5, 7), (15, 17), (11, 17), (2, 21), (9, 22), (19, 25)), 26),
+    0x036A: (((2, 6), (9, 11), (4, 13), (4, 6), (3, 17), (9, 18), (15, 21), (6, 8), (22, 25)), 26),
+    0x036B: (((2, 4), (6, 10), (4, 6), (3, 15), (13, 17), (9, 18), (5, 7), (21, 23)), 25),
+    0x036C: (((2, 6), (9, 11), (4, 13), (5, 11), (9, 16), (15, 19), (6, 8), (20, 23)), 24),
+    0x036D: (((2, 9), (5, 11), (7, 12), (2, 6), (5, 17), (9, 19), (15, 21), (2, 4), (6, 24), (23, 27)), 28),
+    0x036E: (((2, 6), (9, 11), (4, 13), (3, 5), (9, 16), (15, 19), (6, 8), (20, 23)), 24),
+    0x036F: (((2, 4), (6, 10), (3, 5), (13, 15), (9, 16), (5, 7), (19, 21)), 23),
+    0x037C: (((2, 6), (9, 11), (4, 13), (5, 7), (9, 16), (15, 19), (6, 8), (20, 23)), 24),
+    0x037D: (((4, 7), (2, 11), (9, 13), (7, 9), (5, 17), (15, 19), (6, 8), (21, 23)), 24),
+    0x037E: (((2, 6), (5, 7), (11, 13), (9, 14), (3, 9), (5, 19), (17, 21), (6, 8), (23, 25)), 26),
+    0x03C0: (((5, 7), (4, 9), (11, 13), (7, 9), (15, 17)), 18),
+    0x03C1: (((2, 9), (7, 11), (4, 9), (13, 15), (4, 7), (17, 19)), 20),
+    0x03C3: (((4, 6), (9, 10), (5, 7), (13, 15)), 17),
+    0x03C5: (((2, 7), (9, 11), (5, 8), (13, 15), (5, 6), (17, 19)), 20),
+    0x03C6: (((3, 9), (5, 11), (7, 12), (2, 7), (4, 17), (9, 18), (15, 21)), 23),
+    0x03C7: (((2, 7), (4, 11), (9, 12), (5, 7), (15, 17)), 19),
+    0x03CF: (((5, 7), (4, 9), (11, 13)), 15),
+    0x03D4: (((4, 6), (2, 11), (9, 13), (5, 7), (15, 17), (9, 16), (19, 21)), 22),
+    0x03D5: (((4, 6), (2, 11), (9, 13), (5, 7), (8, 16), (15, 19)), 21),
+    0x03D6: (((4, 6), (2, 11), (9, 13), (5, 7), (15, 17), (3, 5), (7, 20), (9, 22), (19, 25)), 26),
+    0x03D7: (((4, 6), (2, 11), (9, 13), (5, 7), (15, 17)), 19),
+    0x03D8: (((2, 5), (3, 7), (11, 13), (9, 14), (5, 7), (8, 18), (17, 21)), 23),
+    0x03D9: (((3, 7), (9, 11), (5, 7), (13, 15), (2, 5), (9, 18), (17, 21)), 22),
+    0x03DB: (((2, 5), (3, 7), (11, 13), (9, 14), (5, 7), (17, 19)), 21),
+    0x03DC: (((3, 6), (5, 11), (9, 13), (5, 7), (8, 16), (15, 19)), 21),
+    0x03DD: (((5, 7), (8, 11), (2, 5), (9, 14), (13, 17)), 18),
+    0x03DE: (((3, 9), (5, 11), (7, 12), (3, 6), (5, 17), (9, 19), (15, 21)), 23),
+    0x03FC: (((5, 7), (8, 11), (9, 10), (13, 15)), 16),
+    0x0660: (((2, 4), (3, 5), (11, 13), (6, 8), (14, 17), (7, 9), (18, 21)), 22),
+    0x0661: (((3, 5), (7, 9), (11, 13), (7, 10), (9, 16), (15, 19), (2, 4), (21, 23), (6, 8), (24, 27)), 28),
+    0x0662: (((7, 9), (3, 11), (4, 13), (3, 5), (15, 17), (6, 8), (18, 21)), 22),
+    0x0663: (((7, 9), (3, 11), (4, 13), (5, 12), (15, 17), (6, 8), (18, 21)), 22),
+    0x0666: (((2, 4), (3, 5), (11, 13), (6, 8), (14, 17)), 18),
+    0x0667: (((7, 9), (5, 11), (3, 13), (2, 5), (15, 17), (6, 8), (19, 21)), 22),
+    0x0669: (((2, 4), (3, 5), (11, 13), (7, 9), (15, 17), (7, 14), (9, 20), (19, 23), (6, 8), (24, 27)), 28),
+    0x066B: (((3, 4), (7, 9), (11, 13), (7, 10), (9, 16), (15, 19), (2, 5), (21, 23), (6, 8), (25, 27)), 28),
+    0x066F: (((2, 4), (3, 5), (11, 13), (6, 8), (14, 17), (7, 9), (19, 21)), 23),
+    0x0672: (((4, 8), (7, 11), (3, 13), (2, 5), (15, 17), (6, 8), (19, 21)), 22),
+    0x0673: (((7, 9), (3, 11), (4, 13), (3, 5), (7, 17), (8, 19), (15, 21)), 22),
+    0x0676: (((5, 7), (3, 11), (2, 5), (13, 15), (6, 8), (17, 19)), 20),
+    0x0678: (((3, 5), (8, 11), (7, 13), (2, 4), (15, 17), (7, 16), (9, 20), (19, 23), (6, 8), (25, 27)), 28),
+    0x0679: (((2, 4), (3, 5), (11, 13), (7, 9), (14, 17), (7, 10), (13, 21), (9, 23), (19, 25), (6, 8), (27, 29)), 30),
+    0x067A: (((7, 9), (2, 11), (4, 12), (4, 8), (3, 17), (7, 18), (15, 21), (6, 8), (22, 25)), 26),
+    0x067B: (((7, 9), (3, 11), (4, 13), (3, 5), (7, 17), (8, 19), (15, 21), (2, 7), (9, 24), (23, 27)), 29),
+    0x067E: (((7, 9), (2, 11), (5, 7), (13, 15), (2, 5), (17, 19), (6, 8), (21, 23)), 24),
+    0x0690: (((2, 4), (3, 5), (11, 13), (7, 14), (9, 15), (17, 19), (7, 9), (21, 23)), 24),
+    0x0691: (((4, 8), (5, 9), (11, 13), (3, 14), (4, 7), (13, 19), (2, 21), (17, 23), (6, 8), (24, 27)), 28),
+    0x0693: (((3, 5), (7, 11), (2, 5), (9, 15), (13, 17), (2, 7), (3, 9), (21, 23), (4, 25), (19, 27)), 28),
+    0x0696: (((2, 4), (3, 5), (11, 13), (6, 15), (9, 16), (7, 14), (19, 21)), 23),
+    0x0697: (((3, 4), (9, 11), (4, 7), (13, 15), (4, 6), (2, 19), (17, 21), (2, 5), (7, 24), (23, 27)), 29),
+    0x069F: (((2, 4), (3, 5), (11, 13), (7, 14), (9, 15), (17, 19)), 21),
+    0x06B0: (((2, 4), (3, 5), (11, 13), (7, 14), (3, 4), (9, 19), (17, 21), (7, 9), (23, 25)), 26),
+    0x06B1: (((4, 8), (5, 9), (11, 13), (3, 14), (5, 8), (2, 19), (7, 20), (17, 23), (6, 8), (24, 27)), 28),
+    0x06B2: (((3, 4), (7, 11), (9, 10), (13, 15), (2, 5), (17, 19), (6, 8), (21, 23)), 24),
+    0x06B3: (((2, 7), (3, 9), (11, 13), (4, 15), (3, 5), (7, 19), (8, 21), (17, 23)), 24),
+    0x06B4: (((5, 8), (2, 11), (3, 5), (13, 15), (7, 16), (3, 4), (6, 21), (9, 22), (19, 25)), 27),
+    0x06B5: (((3, 5), (7, 11), (3, 4), (9, 15), (13, 17), (5, 8), (2, 21), (7, 22), (19, 25)), 26),
+    0x06B6: (((2, 4), (3, 5), (11, 13), (7, 14), (3, 4), (6, 19), (9, 20), (17, 23)), 25),
+    0x06B7: (((2, 6), (4, 11), (2, 7), (8, 15), (13, 17), (3, 4), (7, 20), (19, 23)), 25),
+    0x06B9: (((5, 8), (2, 11), (7, 13), (5, 7), (9, 17), (15, 19), (4, 8), (5, 9), (23, 25), (3, 26), (21, 29)), 30),
+    0x06BD: (((2, 4), (7, 11), (2, 9), (13, 15), (2, 8), (5, 19), (7, 20), (17, 23), (3, 5), (9, 26), (25, 29)), 31),
+    0x06F0: (((2, 4), (3, 5), (11, 13), (7, 14), (8, 17), (7, 9), (19, 21)), 22),
+    0x06F1: (((2, 4), (3, 5), (11, 13), (7, 14), (8, 17), (7, 13), (9, 20), (19, 23)), 24),
+    0x06F2: (((3, 8), (4, 11), (3, 5), (13, 15), (7, 16), (6, 9), (19, 21)), 23),
+    0x06F6: (((2, 4), (3, 5), (11, 13), (7, 14), (6, 9), (17, 19)), 21),
+    0x06F9: (((2, 4), (3, 5), (11, 13), (7, 14), (8, 17), (9, 16), (19, 21)), 22),
+    0x0776: (((5, 7), (9, 10), (3, 13), (2, 5), (15, 17), (6, 8), (19, 21)), 22),
+    0x0778: (((7, 9), (2, 11), (4, 12), (2, 4), (7, 17), (9, 18), (15, 21), (6, 8), (22, 25)), 26),
+    0x0779: (((7, 9), (2, 11), (4, 12), (2, 4), (7, 17), (9, 18), (15, 21), (3, 5), (23, 25), (6, 8), (27, 29)), 30),
+    0x077A: (((7, 9), (2, 11), (4, 12), (3, 7), (9, 16), (15, 19), (6, 8), (20, 23)), 24),
+    0x077E: (((7, 9), (2, 11), (5, 7), (9, 14), (13, 17), (2, 5), (19, 21), (6, 8), (23, 25)), 26),
+    0x07B0: (((2, 4), (7, 11), (3, 4), (9, 15), (13, 17), (7, 9), (19, 21)), 22),
+    0x07B1: (((2, 4), (8, 11), (2, 6), (13, 15), (3, 5), (16, 19), (6, 8), (21, 23)), 24),
+    0x07B4: (((2, 4), (5, 9), (11, 13), (7, 14), (3, 4), (6, 19), (9, 20), (17, 23)), 25),
+    0x07B5: (((5, 8), (2, 11), (7, 13), (3, 4), (6, 17), (9, 18), (15, 21)), 23),
+    0x07B6: (((5, 6), (3, 11), (9, 13), (5, 9), (7, 17), (15, 19), (2, 4), (7, 22), (21, 25)), 26),
+    0x07BC: (((2, 4), (7, 11), (3, 4), (9, 15), (13, 17), (5, 7), (9, 20), (19, 23)), 24),
+    0x07E0: (((2, 4), (7, 11), (3, 5), (9, 15), (13, 17), (7, 9), (19, 21)), 22),
+    0x07E1: (((2, 4), (7, 11), (3, 5), (9, 15), (13, 17), (7, 15), (9, 20), (19, 23)), 24),
+    0x07E2: (((3, 8), (4, 6), (11, 13), (2, 5), (14, 17), (6, 8), (19, 21)), 22),
+    0x07E3: (((3, 8), (4, 11), (7, 13), (3, 5), (6, 17), (9, 18), (15, 21)), 23),
+    0x07E6: (((2, 7), (5, 9), (11, 13), (2, 5), (15, 17), (6, 8), (19, 21)), 22),
+    0x07E9: (((3, 8), (4, 11), (7, 13), (4, 6), (3, 17), (9, 19), (15, 21), (2, 5), (7, 24), (9, 26), (23, 29)), 30),
+    0x07F0: (((2, 4), (7, 11), (8, 13), (7, 9), (15, 17)), 18),
+    0x07F1: (((3, 8), (4, 11), (2, 9), (13, 15), (7, 16), (6, 9), (19, 21)), 23),
+    0x07F2: (((2, 4), (3, 9), (11, 13), (7, 14), (6, 9), (17, 19)), 21),
+    0x07F8: (((2, 4), (7, 11), (8, 13), (9, 12), (15, 17)), 18),
+    0x0FF0: (((6, 8), (7, 9), (11, 13)), 14),
+    0x1668: (((2, 4), (6, 8), (11, 13), (3, 5), (15, 17), (7, 9), (18, 21), (3, 13), (5, 24), (23, 27), (7, 11), (9, 30), (28, 33)), 34),
+    0x1669: (((2, 4), (9, 11), (7, 13), (3, 5), (15, 17), (6, 9), (18, 21), (11, 17), (6, 8), (25, 27), (7, 9), (28, 31), (23, 33)), 34),
+    0x166A: (((5, 7), (2, 11), (8, 12), (8, 11), (3, 17), (15, 19), (4, 6), (20, 23), (3, 4), (6, 26), (9, 28), (25, 31)), 33),
+    0x166B: (((2, 8), (4, 6), (11, 13), (5, 7), (14, 17), (3, 9), (18, 21), (3, 4), (6, 25), (3, 8), (27, 29), (4, 7), (30, 33), (23, 35)), 37),
+    0x166E: (((2, 4), (6, 8), (11, 13), (3, 5), (15, 17), (7, 9), (18, 21), (3, 13), (5, 24), (23, 27)), 28),
+    0x167E: (((2, 4), (6, 8), (11, 13), (3, 5), (15, 17), (7, 9), (18, 21), (7, 16), (23, 25)), 26),
+    0x1681: (((4, 6), (3, 11), (4, 9), (13, 15), (3, 9), (17, 19), (5, 7), (21, 23), (3, 5), (8, 27), (19, 29), (7, 30), (25, 33)), 34),
+    0x1683: (((4, 6), (2, 11), (3, 9), (13, 15), (5, 7), (17, 19), (3, 7), (5, 23), (4, 7), (25, 27), (8, 28), (21, 31)), 32),
+    0x1686: (((4, 6), (3, 11), (2, 6), (9, 14), (13, 17), (6, 8), (5, 21), (19, 23), (2, 5), (7, 26), (25, 29)), 31),
+    0x1687: (((6, 9), (4, 11), (6, 8), (3, 15), (13, 17), (5, 8), (3, 21), (7, 22), (19, 25), (2, 5), (6, 28), (27, 31)), 32),
+    0x1689: (((4, 6), (3, 11), (8, 12), (5, 7), (15, 17), (2, 9), (18, 21), (3, 7), (8, 25), (3, 9), (27, 29), (5, 30), (23, 33)), 34),
+    0x168B: (((3, 8), (5, 7), (11, 13), (3, 5), (7, 16), (8, 18), (15, 21), (4, 6), (22, 25), (2, 4), (9, 28), (27, 31)), 33),
+    0x168E: (((3, 4), (6, 10), (6, 8), (5, 15), (13, 17), (2, 8), (18, 21), (2, 5), (7, 24), (23, 27)), 29),
+    0x1696: (((2, 4), (9, 10), (3, 5), (13, 15), (6, 17), (11, 15), (7, 20), (19, 23)), 25),
+    0x1697: (((7, 8), (5, 11), (4, 7), (13, 15), (3, 17), (4, 6), (9, 20), (5, 7), (23, 25), (2, 27), (19, 29)), 31),
+    0x1698: (((3, 5), (8, 11), (7, 13), (5, 7), (2, 17), (15, 19), (4, 6), (20, 23), (2, 4), (9, 26), (25, 29)), 31),
+    0x1699: (((5, 7), (3, 11), (2, 5), (13, 15), (8, 16), (2, 4), (3, 5), (21, 23), (7, 8), (24, 27), (19, 29)), 30),
+    0x169A: (((2, 4), (7, 11), (4, 9), (13, 15), (4, 8), (3, 19), (17, 21), (3, 5), (6, 24), (23, 27)), 29),
+    0x169B: (((2, 4), (7, 11), (4, 9), (13, 15), (4, 8), (3, 19), (17, 21), (7, 8), (3, 25), (5, 26), (23, 29)), 31),
+    0x169E: (((4, 6), (5, 7), (11, 13), (3, 14), (4, 9), (13, 19), (2, 21), (17, 23)), 25),
+    0x16A9: (((4, 6), (3, 11), (8, 12), (5, 7), (15, 17), (2, 9), (18, 21), (2, 8), (3, 9), (25, 27), (5, 28), (7, 30), (23, 33)), 34),
+    0x16AC: (((2, 6), (5, 11), (8, 12), (3, 7), (15, 17), (2, 9), (18, 21), (2, 8), (5, 25), (7, 26), (23, 29)), 30),
+    0x16AD: (((5, 8), (3, 7), (11, 13), (3, 5), (7, 16), (8, 18), (15, 21), (2, 6), (22, 25), (5, 7), (2, 29), (9, 30), (27, 33)), 35),
+    0x16BC: (((5, 7), (2, 11), (8, 12), (2, 8), (5, 17), (7, 18), (15, 21), (3, 4), (6, 24), (22, 27)), 28),
+    0x16E9: (((4, 6), (3, 11), (8, 13), (9, 12), (15, 17), (5, 7), (19, 21), (2, 8), (3, 9), (25, 27), (5, 28), (7, 30), (23, 33)), 34),
+    0x177E: (((3, 5), (6, 11), (5, 9), (13, 15), (6, 9), (17, 19), (2, 4), (21, 23), (2, 7), (9, 26), (25, 29)), 31),
+    0x178E: (((4, 6), (3, 11), (2, 9), (13, 15), (5, 9), (17, 19), (2, 5), (7, 22), (21, 25)), 27),
+    0x1796: (((2, 4), (9, 10), (3, 5), (13, 15), (7, 9), (17, 19), (11, 15), (7, 22), (21, 25)), 27),
+    0x1798: (((4, 6), (3, 11), (5, 7), (13, 15), (7, 9), (17, 19), (2, 4), (9, 22), (21, 25)), 27),
+    0x179A: (((2, 4), (7, 11), (4, 9), (13, 15), (3, 9), (17, 19), (3, 5), (6, 22), (21, 25)), 27),
+    0x17AC: (((3, 7), (2, 9), (11, 13), (5, 7), (15, 17), (2, 6), (5, 21), (8, 22), (19, 25)), 27),
+    0x17E8: (((4, 6), (3, 11), (5, 7), (13, 15), (8, 16), (9, 17), (19, 21)), 22),
+    0x18E7: (((2, 9), (4, 11), (3, 9), (6, 15), (13, 17), (3, 5), (2, 7), (21, 23), (8, 24), (19, 27), (5, 7), (9, 30), (29, 33)), 35),
+    0x19E1: (((2, 4), (7, 10), (8, 12), (3, 5), (15, 17), (6, 9), (18, 21), (6, 16), (9, 24), (23, 27)), 28),
+    0x19E3: (((5, 8), (7, 11), (3, 8), (13, 15), (2, 8), (4, 19), (17, 21), (3, 5), (6, 25), (9, 26), (23, 29)), 31),
+    0x19E6: (((2, 7), (8, 11), (9, 10), (13, 15), (4, 16), (2, 8), (3, 9), (21, 23), (5, 24), (19, 27)), 29),
+    0x1BD8: (((4, 6), (9, 10), (3, 5), (13, 15), (2, 7), (16, 19), (5, 7), (9, 22), (21, 25)), 26),
+    0x1BE4: (((3, 5), (2, 7), (11, 13), (8, 14), (9, 15), (17, 19)), 20),
+    0x1EE1: (((3, 5), (7, 8), (11, 13), (6, 9), (14, 17), (6, 8), (7, 9), (21, 23), (3, 24), (5, 26), (19, 29)), 30),
+    0x3CC3: (((4, 6), (5, 7), (11, 13), (8, 15), (9, 14), (17, 19)), 20),
+    0x6996: (((2, 4), (3, 5), (11, 13), (7, 8), (15, 17), (6, 9), (18, 21), (6, 8), (14, 25), (7, 9), (26, 29), (23, 31)), 32),
+}
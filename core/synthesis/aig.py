@@ -13,9 +13,11 @@ ABC Reference: src/aig/aig/aig.h
 - Structural hashing với AIG
 """
 
-from typing import Dict, List, Set, Any, Optional, Tuple
+from typing import Dict, List, Set, Any, Optional, Sequence, Tuple
 import logging
 
+from core.synthesis.aig_traversal import dfs_postorder, topological_order, run_recursive
+
 logger = logging.getLogger(__name__)
 
 class AIGNode:
@@ -129,6 +131,9 @@ class AIG:
         
         # Level information
         self.max_level = 0
+        
+        # Tăng mỗi khi AIG bị sửa tại chỗ (invalidate cache thứ tự topo)
+        self._version = 0
     
     def _create_node(self, node_type: str, **kwargs) -> AIGNode:
         """Create a new AIG node."""
@@ -138,6 +143,12 @@ class AIG:
         node = AIGNode(node_id, node_type, **kwargs)
         self.nodes[node_id] = node
         
+        # Reference counts are maintained incrementally (fanout count + PO references)
+        if node.left is not None:
+            node.left.ref_count += 1
+        if node.right is not None:
+            node.right.ref_count += 1
+        
         return node
     
     def create_constant(self, value: bool) -> AIGNode:
@@ -162,6 +173,55 @@ class AIG:
         Đây là hàm quan trọng nhất trong AIG - sử dụng structural hashing
         để tránh duplicate nodes.
         """
+        return self._and_impl(left, right, left_inverted, right_inverted, None)
+    
+    def create_and_lit(self, lit0: int, lit1: int) -> int:
+        """``create_and`` trên literal (node_id * 2 + inverted); trả về literal của node kết quả."""
+        nodes = self.nodes
+        return self.create_and(nodes[lit0 >> 1], nodes[lit1 >> 1], bool(lit0 & 1), bool(lit1 & 1)).node_id << 1
+
+    def create_and_program(self, lits: List[int], ops: Sequence[Tuple[int, int]]) -> List[int]:
+        """Mỗi op ``(ref0, ref1)`` (``index * 2 + inverted`` trong ``lits``) → append ``create_and_lit``; trả về ``lits``."""
+        create_and_lit = self.create_and_lit
+        append = lits.append
+        for ref0, ref1 in ops:
+            append(create_and_lit(lits[ref0 >> 1] ^ (ref0 & 1), lits[ref1 >> 1] ^ (ref1 & 1)))
+        return lits
+
+    def lookup_and_lit(self, lit0: int, lit1: int) -> Optional[int]:
+        """Node id của AND(lit0, lit1) nếu đã có trong bảng strash (không tạo node)."""
+        if (lit0 >> 1) > (lit1 >> 1):
+            lit0, lit1 = lit1, lit0
+        return self.hash_table.get((lit0 >> 1, lit1 >> 1, bool(lit0 & 1), bool(lit1 & 1)))
+    
+    def lookup_not(self, node_id: int) -> Optional[int]:
+        """Node id của NOT(node_id) (= AND(!x, CONST1)) nếu đã có trong bảng strash."""
+        return self.hash_table.get((node_id, self.const1.node_id, True, False))
+    
+    def _new_and(self, left: AIGNode, right: AIGNode, left_inverted: bool,
+                 right_inverted: bool, reuse: Optional[AIGNode]) -> AIGNode:
+        """Create an AND node, or rewire ``reuse`` in place (used by in-place passes)."""
+        if reuse is None:
+            return self._create_node('AND',
+                                     left=left, right=right,
+                                     left_inverted=left_inverted,
+                                     right_inverted=right_inverted)
+        reuse.left.ref_count -= 1
+        reuse.right.ref_count -= 1
+        reuse.left = left
+        reuse.right = right
+        reuse.left_inverted = left_inverted
+        reuse.right_inverted = right_inverted
+        left.ref_count += 1
+        right.ref_count += 1
+        return reuse
+    
+    def _and_impl(self, left: AIGNode, right: AIGNode, left_inverted: bool,
+                  right_inverted: bool, reuse: Optional[AIGNode]) -> AIGNode:
+        """
+        Core of ``create_and``. Nếu ``reuse`` khác None và cần tạo node mới, node
+        ``reuse`` được nối lại (rewire) thay vì cấp phát node mới.
+        """
         # Normalize: ensure left_id <= right_id for canonical form
         left_id = left.node_id
         right_id = right.node_id
@@ -184,7 +244,7 @@ class AIG:
             if left_val is not None:
                 # Left is constant
                 if left_val ^ left_inverted:  # Left is True
-                    return right if not right_inverted else self._create_not(right)
+                    return right if not right_inverted else self._create_not(right, reuse)
                 else:  # Left is False
                     return self.const0
 
@@ -199,13 +259,7 @@ class AIG:
                             key_not = (left.node_id, right.node_id, True, False)
                             if self.enable_strash and key_not in self.hash_table:
                                 return self.nodes[self.hash_table[key_not]]
-                            node = self._create_node(
-                                'AND',
-                                left=left,
-                                right=right,
-                                left_inverted=True,
-                                right_inverted=False,
-                            )
+                            node = self._new_and(left, right, True, False, reuse)
                             node.level = left.level
                             if self.enable_strash:
                                 self.hash_table[key_not] = node.node_id
@@ -213,7 +267,7 @@ class AIG:
                         else:
                             return left
                     else:
-                        return left if not left_inverted else self._create_not(left)
+                        return left if not left_inverted else self._create_not(left, reuse)
                 else:  # Right is False
                     return self.const0
 
@@ -222,10 +276,7 @@ class AIG:
                 return self.const0
         
         # Create new AND node
-        node = self._create_node('AND', 
-                                left=left, right=right,
-                                left_inverted=left_inverted,
-                                right_inverted=right_inverted)
+        node = self._new_and(left, right, left_inverted, right_inverted, reuse)
         
         # Update level
         node.level = max(left.level, right.level) + 1
@@ -237,12 +288,13 @@ class AIG:
         
         return node
     
-    def _create_not(self, node: AIGNode) -> AIGNode:
+    def _create_not(self, node: AIGNode, reuse: Optional[AIGNode] = None) -> AIGNode:
         """
         Create NOT by inverting.
         
         Trong AIG, NOT được biểu diễn bằng cách invert input của AND.
         NOT(x) = x AND 1 với left_inverted=True
+        (``reuse``: xem ``_and_impl``)
         """
         if node.is_constant():
             return self.create_constant(not node.get_value())
@@ -256,10 +308,7 @@ class AIG:
         # Create AND node with const1 and left_inverted=True
         # This represents NOT(x) = !x AND 1
         # We create it directly to avoid recursion
-        not_node = self._create_node('AND',
-                                    left=node, right=self.const1,
-                                    left_inverted=True,
-                                    right_inverted=False)
+        not_node = self._new_and(node, self.const1, True, False, reuse)
         not_node.level = node.level
         if self.enable_strash:
             self.hash_table[key] = not_node.node_id
@@ -286,13 +335,19 @@ class AIG:
     
     def add_po(self, node: AIGNode, inverted: bool = False):
         """Add primary output."""
+        node.ref_count += 1
         self.pos.append((node, inverted))
     
-    def strash(self) -> 'AIG':
+    def strash(self, substitutions: Optional[Dict[int, Tuple[int, bool]]] = None) -> 'AIG':
         """
         Structural hashing - loại bỏ duplicate nodes.
         
         Đây là thuật toán tương tự như Strash trong ABC.
+        
+        substitutions: node_id -> (rep_node_id, inverted); node được thay bằng
+          rep (hoặc NOT(rep)). rep không được phụ thuộc vào node; có thể là node
+          tạo sau node (thứ tự duyệt đi qua rep thay vì fanin của node bị thay).
+          Dùng bởi FRAIG và rewriting.
         """
         # AIG already uses structural hashing in create_and
         # This method can be used to rebuild hash table after modifications
@@ -305,39 +360,151 @@ class AIG:
             pi_map[old_pi.node_id] = new_pi
         
         # Recreate nodes in topological order; node_map: old_node_id -> new_node (for shared nodes)
-        visited = set()
         node_map: Dict[int, AIGNode] = {}
-        
-        def recreate_node(old_node: AIGNode) -> AIGNode:
-            if old_node.node_id in visited:
-                return pi_map.get(old_node.node_id) or node_map.get(old_node.node_id)
-            
-            visited.add(old_node.node_id)
-            
-            if old_node.is_constant():
-                n = new_aig.create_constant(old_node.get_value())
-                node_map[old_node.node_id] = n
-                return n
+        if substitutions:
+            node_map[self.const0.node_id] = new_aig.const0
+            node_map[self.const1.node_id] = new_aig.const1
+            node_map.update(pi_map)
+        order = dfs_postorder(self, substitutions=substitutions) if substitutions else topological_order(self)
+        for old_node in order:
+            sub = substitutions.get(old_node.node_id) if substitutions else None
+            if sub is not None:
+                rep = node_map[sub[0]]
+                node_map[old_node.node_id] = new_aig.create_not(rep) if sub[1] else rep
+            elif old_node.is_constant():
+                node_map[old_node.node_id] = new_aig.create_constant(old_node.get_value())
             elif old_node.is_pi():
-                return pi_map[old_node.node_id]
+                node_map[old_node.node_id] = pi_map[old_node.node_id]
             else:
-                left = recreate_node(old_node.left)
-                right = recreate_node(old_node.right)
-                n = new_aig.create_and(left, right,
-                                      old_node.left_inverted,
-                                      old_node.right_inverted)
-                node_map[old_node.node_id] = n
-                return n
+                node_map[old_node.node_id] = new_aig.create_and(
+                    node_map[old_node.left.node_id],
+                    node_map[old_node.right.node_id],
+                    old_node.left_inverted,
+                    old_node.right_inverted)
         
         # Recreate outputs
         for old_po, inverted in self.pos:
-            new_po = recreate_node(old_po)
+            new_po = node_map[old_po.node_id]
             if inverted:
                 new_po = new_aig.create_not(new_po)
             new_aig.add_po(new_po)
         
         return new_aig
     
+    def strash_in_place(self, substitutions: Optional[Dict[int, Tuple[int, bool]]] = None) -> int:
+        """
+        Structural hashing tại chỗ (không tạo AIG mới).
+        
+        Cùng quy tắc với ``strash()`` (strash + fold hằng số), nhưng các node được
+        giữ lại được nối lại (rewire) ngay trên AIG này; node bị merge/unreachable
+        được xóa bằng ``remove_dead_nodes()``. Node id không được đánh lại (xem
+        ``compact()``). ``substitutions``: xem ``strash()``.
+        
+        Returns:
+            Số node bị xóa
+        """
+        self.enable_strash = True
+        self.enable_const_simplify = True
+        order = dfs_postorder(self, substitutions=substitutions) if substitutions else topological_order(self)
+        self.hash_table = {}
+        self.max_level = 0
+        self._version += 1
+        
+        # repl: node_id -> node thay thế (khi node bị merge hoặc fold)
+        repl: Dict[int, AIGNode] = {}
+        for node in order:
+            if not node.is_and():
+                continue
+            sub = substitutions.get(node.node_id) if substitutions else None
+            if sub is not None:
+                rep = self.nodes[sub[0]]
+                rep = repl.get(rep.node_id, rep)
+                result = self._create_not(rep, node) if sub[1] else rep
+            else:
+                left = repl.get(node.left.node_id, node.left)
+                right = repl.get(node.right.node_id, node.right)
+                result = self._and_impl(left, right, node.left_inverted, node.right_inverted, node)
+            if result is not node:
+                repl[node.node_id] = result
+        
+        # Outputs: same convention as strash() (inverted PO -> explicit NOT node)
+        old_pos = self.pos
+        self.pos = []
+        for po, inverted in old_pos:
+            new_po = repl.get(po.node_id, po)
+            if inverted:
+                new_po = self.create_not(new_po)
+            self.add_po(new_po)
+            po.ref_count -= 1
+        
+        return self.remove_dead_nodes()
+    
+    def remove_dead_nodes(self) -> int:
+        """
+        Dead code elimination tại chỗ dựa trên reference count.
+        
+        Xóa các AND node có ``ref_count == 0`` (không fanout, không là PO) và
+        lan truyền sang fanin. Trả về số node bị xóa.
+        """
+        stack = [node for node in self.nodes.values() if node.is_and() and node.ref_count == 0]
+        removed = 0
+        while stack:
+            node = stack.pop()
+            del self.nodes[node.node_id]
+            key = (node.left.node_id, node.right.node_id, node.left_inverted, node.right_inverted)
+            if self.hash_table.get(key) == node.node_id:
+                del self.hash_table[key]
+            for fanin in (node.left, node.right):
+                fanin.ref_count -= 1
+                if fanin.ref_count == 0 and fanin.is_and():
+                    stack.append(fanin)
+            removed += 1
+        if removed:
+            self._version += 1
+        return removed
+    
+    def dead_fraction(self) -> float:
+        """Tỉ lệ node id đã bị xóa (lỗ trong không gian id) so với tổng số id đã cấp."""
+        if self.next_node_id == 0:
+            return 0.0
+        return 1.0 - len(self.nodes) / self.next_node_id
+    
+    def compact(self) -> int:
+        """
+        Đánh lại node id liên tục (constants, PIs, rồi AND theo thứ tự topo).
+        
+        Node object được giữ nguyên (chỉ đổi ``node_id``), hash table được build lại.
+        Mọi map ngoài theo node_id cũ đều không còn hợp lệ.
+        
+        Returns:
+            Số id được thu hồi
+        """
+        old_next = self.next_node_id
+        head = [self.const0, self.const1] + [pi for pi in self.pis.values()]
+        visited = {node.node_id for node in head}
+        roots = [po for po, _inv in self.pos] + [self.nodes[i] for i in sorted(self.nodes)]
+        order = head + dfs_postorder(self, roots, visited)
+        
+        self.nodes = {}
+        self.hash_table = {}
+        for new_id, node in enumerate(order):
+            node.node_id = new_id
+            self.nodes[new_id] = node
+        for node in order:
+            if node.is_and():
+                key = (node.left.node_id, node.right.node_id, node.left_inverted, node.right_inverted)
+                self.hash_table.setdefault(key, node.node_id)
+        self.next_node_id = len(order)
+        self._version += 1
+        return old_next - self.next_node_id
+    
+    def maybe_compact(self, threshold: float = 0.3) -> bool:
+        """Chạy ``compact()`` chỉ khi ``dead_fraction()`` vượt ``threshold``."""
+        if self.dead_fraction() > threshold:
+            self.compact()
+            return True
+        return False
+    
     def count_nodes(self) -> int:
         """Count total number of nodes."""
         return len(self.nodes)
@@ -438,8 +605,6 @@ def aig_to_netlist(
     Returns:
         Netlist dictionary with nodes converted from AIG
     """
-    from typing import Dict, List, Any
-    
     # Get inputs and outputs from original netlist or AIG.
     # NOTE: AIG primary outputs (POs) are single-bit. If the original netlist has
     # vector outputs (e.g., diff[3:0]), synthesis may have added one PO per bit.
@@ -515,8 +680,13 @@ def aig_to_netlist(
         signal_to_node[signal_name] = node_id
         return node_id
     
-    def convert_aig_node_to_netlist(aig_node: AIGNode, output_signal: str) -> Optional[Dict[str, Any]]:
-        """Convert an AIG node to netlist node format. Every PO gets a node (alias if already visited)."""
+    def convert_aig_node_to_netlist(aig_node: AIGNode, output_signal: str):
+        """
+        Convert an AIG node to netlist node format. Every PO gets a node (alias if already visited).
+
+        Generator: ``yield (child, signal)`` là lời gọi đệ quy, chạy qua ``run_recursive``
+        (không giới hạn độ sâu AIG).
+        """
         if aig_node is None:
             return None
         
@@ -587,7 +757,7 @@ def aig_to_netlist(
                 if aig_node.left_inverted and aig_node.left is not None:
                     inner_signal = _internal(f"w{aig_node.left.node_id}")
                     if not aig_node.left.is_pi() and not aig_node.left.is_constant():
-                        convert_aig_node_to_netlist(aig_node.left, inner_signal)
+                        yield (aig_node.left, inner_signal)
                     elif aig_node.left.is_pi():
                         inner_signal = aig_node.left.var_name
                     elif aig_node.left.is_constant():
@@ -606,7 +776,7 @@ def aig_to_netlist(
                 if simplify_and_with_const1 and (not aig_node.left_inverted) and aig_node.left is not None:
                     inner_signal = _internal(f"w{aig_node.left.node_id}")
                     if not aig_node.left.is_pi() and not aig_node.left.is_constant():
-                        convert_aig_node_to_netlist(aig_node.left, inner_signal)
+                        yield (aig_node.left, inner_signal)
                     elif aig_node.left.is_pi():
                         inner_signal = aig_node.left.var_name
                     elif aig_node.left.is_constant():
@@ -626,7 +796,7 @@ def aig_to_netlist(
                 if aig_node.right_inverted and aig_node.right is not None:
                     inner_signal = _internal(f"w{aig_node.right.node_id}")
                     if not aig_node.right.is_pi() and not aig_node.right.is_constant():
-                        convert_aig_node_to_netlist(aig_node.right, inner_signal)
+                        yield (aig_node.right, inner_signal)
                     elif aig_node.right.is_pi():
                         inner_signal = aig_node.right.var_name
                     elif aig_node.right.is_constant():
@@ -645,7 +815,7 @@ def aig_to_netlist(
                 if simplify_and_with_const1 and (not aig_node.right_inverted) and aig_node.right is not None:
                     inner_signal = _internal(f"w{aig_node.right.node_id}")
                     if not aig_node.right.is_pi() and not aig_node.right.is_constant():
-                        convert_aig_node_to_netlist(aig_node.right, inner_signal)
+                        yield (aig_node.right, inner_signal)
                     elif aig_node.right.is_pi():
                         inner_signal = aig_node.right.var_name
                     elif aig_node.right.is_constant():
@@ -674,7 +844,7 @@ def aig_to_netlist(
                 # AND(left, 1) hoặc AND(!left, 1)
                 inner_signal = _internal(f"w{aig_node.left.node_id}")
                 if not aig_node.left.is_pi() and not aig_node.left.is_constant():
-                    convert_aig_node_to_netlist(aig_node.left, inner_signal)
+                    yield (aig_node.left, inner_signal)
                 elif aig_node.left.is_pi():
                     inner_signal = aig_node.left.var_name
                 elif aig_node.left.is_constant():
@@ -696,7 +866,7 @@ def aig_to_netlist(
             if left_const1 and not aig_node.left_inverted:
                 inner_signal = _internal(f"w{aig_node.right.node_id}")
                 if not aig_node.right.is_pi() and not aig_node.right.is_constant():
-                    convert_aig_node_to_netlist(aig_node.right, inner_signal)
+                    yield (aig_node.right, inner_signal)
                 elif aig_node.right.is_pi():
                     inner_signal = aig_node.right.var_name
                 elif aig_node.right.is_constant():
@@ -726,7 +896,7 @@ def aig_to_netlist(
                 left_signal = _const_lit(bool(aig_node.left.get_value()))
             else:
                 left_signal = _internal(f"w{aig_node.left.node_id}")
-                convert_aig_node_to_netlist(aig_node.left, left_signal)
+                yield (aig_node.left, left_signal)
 
             if aig_node.right.is_pi():
                 right_signal = aig_node.right.var_name
@@ -734,7 +904,7 @@ def aig_to_netlist(
                 right_signal = _const_lit(bool(aig_node.right.get_value()))
             else:
                 right_signal = _internal(f"w{aig_node.right.node_id}")
-                convert_aig_node_to_netlist(aig_node.right, right_signal)
+                yield (aig_node.right, right_signal)
 
             # Handle inversions
             if aig_node.left_inverted and left_signal:
@@ -782,7 +952,7 @@ def aig_to_netlist(
         if inverted:
             # Need NOT node
             temp_signal = _internal(f"temp_out{i}")
-            convert_aig_node_to_netlist(po_node, temp_signal)
+            run_recursive(convert_aig_node_to_netlist, po_node, temp_signal)
             
             not_node_id = get_or_create_node_for_signal(output_name)
             nodes[not_node_id] = {
@@ -793,7 +963,7 @@ def aig_to_netlist(
                 'name': not_node_id
             }
         else:
-            convert_aig_node_to_netlist(po_node, output_name)
+            run_recursive(convert_aig_node_to_netlist, po_node, output_name)
 
     # Resolve wire aliases so all node inputs point to canonical signals (fewer wires in Verilog).
     def resolve_signal(sig: str) -> str:
@@ -0,0 +1,957 @@
+#!/usr/bin/env python3
+"""
+Array-backed AIG Implementation (literal-based)
+
+Biến thể bộ nhớ thấp của ``AIG`` (core/synthesis/aig.py): thay vì một object
+``AIGNode`` cho mỗi node, các node được lưu trong các cột song song (``array``):
+
+- ``_kind``   : loại node (CONST0 / CONST1 / PI / AND), 1 byte/node
+- ``_fanin0`` : literal fanin trái  (``node_id * 2 + complement``)
+- ``_fanin1`` : literal fanin phải
+- ``_level``  : logic level
+- ``_ref``    : reference count
+
+Bảng structural hashing là bảng open addressing trên ``array`` (chỉ lưu node_id,
+key được so sánh với cột fanin) thay vì dict key tuple. ``ArrayAIGNode`` chỉ là handle nhẹ ``(aig, node_id)`` được tạo khi
+cần, có cùng thuộc tính với ``AIGNode`` (node_type, left, right, left_inverted,
+right_inverted, var_name, level, ref_count), nên ``NetlistToAIGConverter``,
+``AIGOptimizationFlow`` và ``techmap`` chạy được trên ``ArrayAIG`` như trên ``AIG``.
+
+Ngữ nghĩa giữ nguyên như ``AIG``: NOT(x) vẫn là node AND(!x, CONST1), và node id
+luôn theo thứ tự topo (fanin được tạo trước node).
+
+ABC Reference: src/aig/gia/gia.h
+- Gia_Man_t: AIG manager lưu node trong mảng
+- Gia_Obj_t: fanin biểu diễn bằng literal (id*2 + complement)
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
+import logging
+
+from core.synthesis.aig_traversal import dfs_postorder_ids
+
+logger = logging.getLogger(__name__)
+
+# Node kinds stored in ArrayAIG._kind
+KIND_CONST0 = 0
+KIND_CONST1 = 1
+KIND_PI = 2
+KIND_AND = 3
+KIND_DEAD = 4  # node đã bị xóa bởi pass in-place, chờ compact()
+
+_NODE_TYPES = ('CONST0', 'CONST1', 'PI', 'AND', 'DEAD')
+
+# Fanin literal used for nodes without fanins (constants, PIs)
+NO_FANIN = -1
+
+# Literal of CONST1 (node 1, not complemented)
+_CONST1_LIT = 2
+
+# Initial size of the structural hashing table (power of two)
+_HTABLE_MIN_SIZE = 1024
+
+
+class ArrayAIGNode:
+    """
+    Lightweight handle to a node stored in an ``ArrayAIG``.
+
+    Handle không giữ dữ liệu của node, chỉ giữ (aig, node_id); mọi thuộc tính
+    được đọc trực tiếp từ các cột của AIG. Hai handle bằng nhau khi trỏ cùng node.
+    """
+
+    __slots__ = ('_aig', 'node_id')
+
+    def __init__(self, aig: 'ArrayAIG', node_id: int):
+        self._aig = aig
+        self.node_id = node_id
+
+    @property
+    def node_type(self) -> str:
+        return _NODE_TYPES[self._aig._kind[self.node_id]]
+
+    @property
+    def left(self) -> Optional['ArrayAIGNode']:
+        lit = self._aig._fanin0[self.node_id]
+        return ArrayAIGNode(self._aig, lit >> 1) if lit >= 0 else None
+
+    @property
+    def right(self) -> Optional['ArrayAIGNode']:
+        lit = self._aig._fanin1[self.node_id]
+        return ArrayAIGNode(self._aig, lit >> 1) if lit >= 0 else None
+
+    @property
+    def left_inverted(self) -> bool:
+        lit = self._aig._fanin0[self.node_id]
+        return lit >= 0 and bool(lit & 1)
+
+    @property
+    def right_inverted(self) -> bool:
+        lit = self._aig._fanin1[self.node_id]
+        return lit >= 0 and bool(lit & 1)
+
+    @property
+    def var_name(self) -> Optional[str]:
+        return self._aig._pi_names.get(self.node_id)
+
+    @property
+    def level(self) -> int:
+        return self._aig._level[self.node_id]
+
+    @level.setter
+    def level(self, value: int):
+        self._aig._level[self.node_id] = value
+
+    @property
+    def ref_count(self) -> int:
+        return self._aig._ref[self.node_id]
+
+    @ref_count.setter
+    def ref_count(self, value: int):
+        self._aig._ref[self.node_id] = value
+
+    def is_constant(self) -> bool:
+        """Check if this is a constant node."""
+        return self._aig._kind[self.node_id] <= KIND_CONST1
+
+    def is_pi(self) -> bool:
+        """Check if this is a primary input."""
+        return self._aig._kind[self.node_id] == KIND_PI
+
+    def is_and(self) -> bool:
+        """Check if this is an AND node."""
+        return self._aig._kind[self.node_id] == KIND_AND
+
+    def get_value(self) -> Optional[bool]:
+        """Get constant value if this is a constant."""
+        kind = self._aig._kind[self.node_id]
+        if kind == KIND_CONST0:
+            return False
+        elif kind == KIND_CONST1:
+            return True
+        return None
+
+    def __eq__(self, other):
+        if not isinstance(other, ArrayAIGNode):
+            return NotImplemented
+        return self.node_id == other.node_id and self._aig is other._aig
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(self.node_id)
+
+    def __repr__(self):
+        if self.is_constant():
+            return f"AIG_{self.node_type}(id={self.node_id})"
+        elif self.is_pi():
+            return f"AIG_PI({self.var_name}, id={self.node_id})"
+        else:
+            f0 = self._aig._fanin0[self.node_id]
+            f1 = self._aig._fanin1[self.node_id]
+            left_str = f"{'!' if f0 & 1 else ''}L{f0 >> 1}"
+            right_str = f"{'!' if f1 & 1 else ''}R{f1 >> 1}"
+            return f"AIG_AND(id={self.node_id}, {left_str}, {right_str})"
+
+
+class _ArrayNodeView(Mapping):
+    """Read-only ``node_id -> ArrayAIGNode`` view (thay cho ``AIG.nodes``)."""
+
+    __slots__ = ('_aig',)
+
+    def __init__(self, aig: 'ArrayAIG'):
+        self._aig = aig
+
+    def __getitem__(self, node_id: int) -> ArrayAIGNode:
+        kind = self._aig._kind
+        if (not isinstance(node_id, int) or node_id < 0 or node_id >= len(kind)
+                or kind[node_id] == KIND_DEAD):
+            raise KeyError(node_id)
+        return ArrayAIGNode(self._aig, node_id)
+
+    def __iter__(self) -> Iterator[int]:
+        kind = self._aig._kind
+        if not self._aig._num_dead:
+            return iter(range(len(kind)))
+        return (i for i in range(len(kind)) if kind[i] != KIND_DEAD)
+
+    def __len__(self) -> int:
+        return self._aig.count_nodes()
+
+
+class ArrayAIG:
+    """
+    And-Inverter Graph Manager lưu node trong mảng (array-backed).
+
+    Drop-in thay thế cho ``AIG``: cùng các hàm create_pi/create_and/create_or/
+    create_xor/create_not/add_po/strash/count_nodes/get_statistics/to_verilog.
+    Ngoài ra có API mức literal (``lit``, ``create_and_lit``, ``create_and_program``,
+    ``fanins``) cho các thuật toán cần chạy vòng lặp chặt trên số nguyên.
+    """
+
+    def __init__(self, enable_strash: bool = True, enable_const_simplify: bool = True):
+        """Initialize AIG manager (xem ``AIG.__init__`` cho ý nghĩa các cờ)."""
+        # Node storage (parallel columns, indexed by node_id)
+        self._kind = bytearray()
+        self._fanin0 = array('q')
+        self._fanin1 = array('q')
+        self._level = array('i')
+        self._ref = array('i')
+        self._pi_names: Dict[int, str] = {}
+        self._num_dead = 0
+
+        # Constant nodes (ids 0 and 1)
+        self._new_node(KIND_CONST0, NO_FANIN, NO_FANIN, 0)
+        self._new_node(KIND_CONST1, NO_FANIN, NO_FANIN, 0)
+        self.const0 = ArrayAIGNode(self, 0)
+        self.const1 = ArrayAIGNode(self, 1)
+
+        # Primary inputs / outputs
+        self.pis: Dict[str, ArrayAIGNode] = {}
+        self.pos: List[Tuple[ArrayAIGNode, bool]] = []  # (node, inverted)
+
+        self.enable_strash = bool(enable_strash)
+        self.enable_const_simplify = bool(enable_const_simplify)
+
+        # Structural hashing table: open addressing trên array, mỗi slot chứa
+        # node_id (0 = trống; node 0 là CONST0 nên không bao giờ được hash).
+        # Key (lit0, lit1) được so sánh trực tiếp với cột fanin của node.
+        self._htable = array('i', bytes(4 * _HTABLE_MIN_SIZE))
+        self._hcount = 0
+
+        # Level information
+        self.max_level = 0
+
+        # Tăng mỗi khi AIG bị sửa tại chỗ (invalidate cache thứ tự topo)
+        self._version = 0
+
+    # ------------------------------------------------------------------
+    # Storage helpers
+    # ------------------------------------------------------------------
+
+    def _new_node(self, kind: int, fanin0: int, fanin1: int, level: int) -> int:
+        node_id = len(self._kind)
+        self._kind.append(kind)
+        self._fanin0.append(fanin0)
+        self._fanin1.append(fanin1)
+        self._level.append(level)
+        self._ref.append(0)
+        if fanin0 >= 0:
+            self._ref[fanin0 >> 1] += 1
+        if fanin1 >= 0:
+            self._ref[fanin1 >> 1] += 1
+        return node_id
+
+    @property
+    def next_node_id(self) -> int:
+        return len(self._kind)
+
+    @property
+    def nodes(self) -> _ArrayNodeView:
+        """Mapping node_id -> ArrayAIGNode (handles are created on access)."""
+        return _ArrayNodeView(self)
+
+    def node(self, node_id: int) -> ArrayAIGNode:
+        """Return a handle for ``node_id``."""
+        return ArrayAIGNode(self, node_id)
+
+    # ------------------------------------------------------------------
+    # Literal-level API
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def lit(node: ArrayAIGNode, inverted: bool = False) -> int:
+        """Literal of ``node`` (``node_id * 2 + inverted``)."""
+        return (node.node_id << 1) | (1 if inverted else 0)
+
+    def fanins(self, node_id: int) -> Tuple[int, int]:
+        """Fanin literals of an AND node (``NO_FANIN`` for constants/PIs)."""
+        return self._fanin0[node_id], self._fanin1[node_id]
+
+    def kind(self, node_id: int) -> int:
+        """Node kind (KIND_CONST0 / KIND_CONST1 / KIND_PI / KIND_AND)."""
+        return self._kind[node_id]
+
+    def create_and_lit(self, lit0: int, lit1: int) -> int:
+        """``create_and`` on literals; returns the (non-complemented) literal of the result."""
+        id0 = lit0 >> 1
+        id1 = lit1 >> 1
+        if id0 > id1:
+            lit0, lit1 = lit1, lit0
+            id0, id1 = id1, id0
+        # Fast path cho trường hợp phổ biến (hai fanin khác nhau, không phải hằng):
+        # lookup + tạo node inline, không qua _and_node/_hash_insert. Fanin hằng
+        # không bao giờ có trong bảng strash nên kiểm tra hằng trước khi probe là tương đương.
+        if id0 <= 1 or id0 == id1 or not (self.enable_strash and self.enable_const_simplify):
+            return self._and_node(lit0, lit1) << 1
+        table = self._htable
+        fanin0 = self._fanin0
+        fanin1 = self._fanin1
+        mask = len(table) - 1
+        slot = (lit0 * 12582917 + lit1 * 4256249) & mask
+        hit = table[slot]
+        while hit:
+            if fanin0[hit] == lit0 and fanin1[hit] == lit1:
+                return hit << 1
+            slot = (slot + 1) & mask
+            hit = table[slot]
+
+        level_col = self._level
+        ref = self._ref
+        level = level_col[id0]
+        level1 = level_col[id1]
+        if level1 > level:
+            level = level1
+        level += 1
+        kind = self._kind
+        node_id = len(kind)
+        kind.append(KIND_AND)
+        fanin0.append(lit0)
+        fanin1.append(lit1)
+        level_col.append(level)
+        ref.append(0)
+        ref[id0] += 1
+        ref[id1] += 1
+        if level > self.max_level:
+            self.max_level = level
+        table[slot] = node_id
+        self._hcount += 1
+        if self._hcount * 2 > mask + 1:
+            self._rehash((mask + 1) * 2)
+        return node_id << 1
+
+    def create_and_program(self, lits: List[int], ops: Sequence[Tuple[int, int]]) -> List[int]:
+        """
+        Chạy một chương trình AND trên literal: mỗi op ``(ref0, ref1)`` tham chiếu
+        phần tử của ``lits`` (``index * 2 + inverted``), kết quả ``create_and_lit``
+        được append vào ``lits`` nên op sau dùng được kết quả op trước. Trả về ``lits``.
+
+        Cùng kết quả như vòng ``create_and_lit``, nhưng khi bật strash + const
+        simplify thì cả vòng chạy inline: bảng strash được nới một lần theo
+        ``len(ops)``, các cột được cấp trước rồi cắt bớt ở cuối.
+        """
+        n = len(ops)
+        append = lits.append
+        if not (self.enable_strash and self.enable_const_simplify):
+            create_and_lit = self.create_and_lit
+            for ref0, ref1 in ops:
+                append(create_and_lit(lits[ref0 >> 1] ^ (ref0 & 1), lits[ref1 >> 1] ^ (ref1 & 1)))
+            return lits
+
+        # Mỗi op tạo tối đa một node (AND hoặc NOT) → đủ chỗ cho n node ở load <= 50%
+        size = len(self._htable)
+        while (self._hcount + n) * 2 > size:
+            size *= 2
+        if size != len(self._htable):
+            self._rehash(size)
+        table = self._htable
+        mask = size - 1
+        kind = self._kind
+        fanin0 = self._fanin0
+        fanin1 = self._fanin1
+        level_col = self._level
+        ref = self._ref
+        start = node_id = len(kind)
+        kind.extend(bytes([KIND_AND]) * n)
+        fanin0.extend(array('q', bytes(8 * n)))
+        fanin1.extend(array('q', bytes(8 * n)))
+        level_col.extend(array('i', bytes(4 * n)))
+        ref.extend(array('i', bytes(4 * n)))
+        max_level = self.max_level
+        try:
+            for ref0, ref1 in ops:
+                lit0 = lits[ref0 >> 1] ^ (ref0 & 1)
+                lit1 = lits[ref1 >> 1] ^ (ref1 & 1)
+                id0 = lit0 >> 1
+                id1 = lit1 >> 1
+                if id0 > id1:
+                    lit0, lit1 = lit1, lit0
+                    id0, id1 = id1, id0
+                step = 1
+                if id0 <= 1:
+                    # Hằng (như _and_node): 0 AND x = 0, 1 AND x = x, 1 AND !x = NOT(x)
+                    if not id0 ^ (lit0 & 1):
+                        append(0)
+                        continue
+                    if not lit1 & 1:
+                        append(lit1)
+                        continue
+                    if id1 <= 1:
+                        append((id1 ^ 1) << 1)
+                        continue
+                    lit0, lit1 = lit1, _CONST1_LIT
+                    id0, id1 = id1, 1
+                    step = 0
+                elif id0 == id1 and (lit0 ^ lit1) & 1:
+                    append(0)
+                    continue
+                slot = (lit0 * 12582917 + lit1 * 4256249) & mask
+                hit = table[slot]
+                while hit:
+                    if fanin0[hit] == lit0 and fanin1[hit] == lit1:
+                        break
+                    slot = (slot + 1) & mask
+                    hit = table[slot]
+                if hit:
+                    append(hit << 1)
+                    continue
+                level = level_col[id0]
+                level1 = level_col[id1]
+                if level1 > level:
+                    level = level1
+                level += step
+                fanin0[node_id] = lit0
+                fanin1[node_id] = lit1
+                level_col[node_id] = level
+                ref[id0] += 1
+                ref[id1] += 1
+                if level > max_level:
+                    max_level = level
+                table[slot] = node_id
+                append(node_id << 1)
+                node_id += 1
+        finally:
+            del kind[node_id:]
+            del fanin0[node_id:]
+            del fanin1[node_id:]
+            del level_col[node_id:]
+            del ref[node_id:]
+            self._hcount += node_id - start
+            self.max_level = max_level
+        return lits
+
+    def lookup_and_lit(self, lit0: int, lit1: int) -> Optional[int]:
+        """Node id của AND(lit0, lit1) nếu đã có trong bảng strash (không tạo node)."""
+        if (lit0 >> 1) > (lit1 >> 1):
+            lit0, lit1 = lit1, lit0
+        node_id = self._htable[self._hash_slot(lit0, lit1)]
+        return node_id if node_id else None
+
+    def lookup_not(self, node_id: int) -> Optional[int]:
+        """Node id của NOT(node_id) (= AND(!x, CONST1)) nếu đã có trong bảng strash."""
+        not_id = self._htable[self._hash_slot((node_id << 1) | 1, _CONST1_LIT)]
+        return not_id if not_id else None
+
+    def _hash_slot(self, lit0: int, lit1: int) -> int:
+        """Slot of key (lit0, lit1): slot chứa node trùng key hoặc slot trống đầu tiên."""
+        table = self._htable
+        mask = len(table) - 1
+        fanin0 = self._fanin0
+        fanin1 = self._fanin1
+        slot = (lit0 * 12582917 + lit1 * 4256249) & mask
+        while True:
+            node_id = table[slot]
+            if node_id == 0 or (fanin0[node_id] == lit0 and fanin1[node_id] == lit1):
+                return slot
+            slot = (slot + 1) & mask
+
+    def _hash_insert(self, slot: int, node_id: int):
+        """Store ``node_id`` at ``slot`` (from ``_hash_slot``); grow at 50% load."""
+        self._htable[slot] = node_id
+        self._hcount += 1
+        if self._hcount * 2 > len(self._htable):
+            self._rehash(len(self._htable) * 2)
+
+    def _rehash(self, size: int):
+        # Key trong bảng cũ là duy nhất → chỉ cần tìm slot trống (inline, không gọi _hash_slot)
+        old_table = self._htable
+        table = self._htable = array('i', bytes(4 * size))
+        mask = size - 1
+        fanin0 = self._fanin0
+        fanin1 = self._fanin1
+        for node_id in old_table:
+            if node_id:
+                slot = (fanin0[node_id] * 12582917 + fanin1[node_id] * 4256249) & mask
+                while table[slot]:
+                    slot = (slot + 1) & mask
+                table[slot] = node_id
+
+    @property
+    def hash_table(self) -> Dict[int, int]:
+        """Snapshot ``(lit0 << 32) | lit1 -> node_id`` của bảng strash (để debug)."""
+        return {(self._fanin0[n] << 32) | self._fanin1[n]: n for n in self._htable if n}
+
+    def _and_node(self, lit0: int, lit1: int, reuse: int = -1) -> int:
+        """
+        Core of ``create_and``: same rules as ``AIG.create_and``, on literals.
+
+        Nếu ``reuse >= 0`` và cần tạo node mới, node ``reuse`` được nối lại
+        (rewire) thay vì thêm node (dùng bởi các pass in-place).
+        """
+        # Normalize: ensure left_id <= right_id for canonical form
+        if (lit0 >> 1) > (lit1 >> 1):
+            lit0, lit1 = lit1, lit0
+
+        fanin0 = self._fanin0
+        fanin1 = self._fanin1
+        slot = -1
+        if self.enable_strash:
+            # Inlined _hash_slot (hot path)
+            table = self._htable
+            mask = len(table) - 1
+            slot = (lit0 * 12582917 + lit1 * 4256249) & mask
+            while True:
+                hit = table[slot]
+                if hit == 0:
+                    break
+                if fanin0[hit] == lit0 and fanin1[hit] == lit1:
+                    return hit
+                slot = (slot + 1) & mask
+
+        id0 = lit0 >> 1
+        id1 = lit1 >> 1
+        if self.enable_const_simplify:
+            if id0 <= 1:
+                # Left is constant (node 0 = CONST0, node 1 = CONST1)
+                if id0 ^ (lit0 & 1):
+                    return self._not_node(id1, reuse) if lit1 & 1 else id1
+                return 0
+            if id1 <= 1:
+                # Right is constant
+                if id1 ^ (lit1 & 1):
+                    return self._not_node(id0, reuse) if lit0 & 1 else id0
+                return 0
+            # Tautology: x AND !x = 0
+            if id0 == id1 and (lit0 ^ lit1) & 1:
+                return 0
+
+        # Inlined _new_node
+        level_col = self._level
+        ref = self._ref
+        level = level_col[id0]
+        if level_col[id1] > level:
+            level = level_col[id1]
+        level += 1
+        if reuse >= 0:
+            node_id = reuse
+            ref[fanin0[reuse] >> 1] -= 1
+            ref[fanin1[reuse] >> 1] -= 1
+            fanin0[reuse] = lit0
+            fanin1[reuse] = lit1
+            level_col[reuse] = level
+        else:
+            node_id = len(self._kind)
+            self._kind.append(KIND_AND)
+            fanin0.append(lit0)
+            fanin1.append(lit1)
+            level_col.append(level)
+            ref.append(0)
+        ref[id0] += 1
+        ref[id1] += 1
+        if level > self.max_level:
+            self.max_level = level
+        if slot >= 0:
+            self._hash_insert(slot, node_id)
+        return node_id
+
+    def _not_node(self, node_id: int, reuse: int = -1) -> int:
+        """NOT(x) = AND(!x, CONST1), same encoding as ``AIG._create_not`` (``reuse``: xem ``_and_node``)."""
+        if node_id <= 1:
+            return node_id ^ 1
+
+        lit0 = (node_id << 1) | 1
+        slot = -1
+        if self.enable_strash:
+            slot = self._hash_slot(lit0, _CONST1_LIT)
+            hit = self._htable[slot]
+            if hit:
+                return hit
+
+        if reuse >= 0:
+            not_id = reuse
+            ref = self._ref
+            ref[self._fanin0[reuse] >> 1] -= 1
+            ref[self._fanin1[reuse] >> 1] -= 1
+            self._fanin0[reuse] = lit0
+            self._fanin1[reuse] = _CONST1_LIT
+            self._level[reuse] = self._level[node_id]
+            ref[node_id] += 1
+            ref[1] += 1
+        else:
+            not_id = self._new_node(KIND_AND, lit0, _CONST1_LIT, self._level[node_id])
+        if slot >= 0:
+            self._hash_insert(slot, not_id)
+        return not_id
+
+    # ------------------------------------------------------------------
+    # Node-level API (same as AIG)
+    # ------------------------------------------------------------------
+
+    def create_constant(self, value: bool) -> ArrayAIGNode:
+        """Create or return constant node."""
+        return self.const1 if value else self.const0
+
+    def create_pi(self, var_name: str) -> ArrayAIGNode:
+        """Create primary input node."""
+        if var_name in self.pis:
+            return self.pis[var_name]
+
+        node_id = self._new_node(KIND_PI, NO_FANIN, NO_FANIN, 0)
+        self._pi_names[node_id] = var_name
+        node = ArrayAIGNode(self, node_id)
+        self.pis[var_name] = node
+        return node
+
+    def create_and(self, left: ArrayAIGNode, right: ArrayAIGNode,
+                   left_inverted: bool = False,
+                   right_inverted: bool = False) -> ArrayAIGNode:
+        """Create AND node with structural hashing."""
+        lit = self.create_and_lit(
+            (left.node_id << 1) | (1 if left_inverted else 0),
+            (right.node_id << 1) | (1 if right_inverted else 0),
+        )
+        return ArrayAIGNode(self, lit >> 1)
+
+    def _create_not(self, node: ArrayAIGNode) -> ArrayAIGNode:
+        """Create NOT by inverting (AND(!x, 1))."""
+        return ArrayAIGNode(self, self._not_node(node.node_id))
+
+    def create_not(self, node: ArrayAIGNode) -> ArrayAIGNode:
+        """Create NOT node (wrapper for _create_not)."""
+        return self._create_not(node)
+
+    def create_or(self, left: ArrayAIGNode, right: ArrayAIGNode) -> ArrayAIGNode:
+        """Create OR using De Morgan's law: a OR b = !(!a AND !b)."""
+        not_left = self._not_node(left.node_id)
+        not_right = self._not_node(right.node_id)
+        and_id = self._and_node(not_left << 1, not_right << 1)
+        return ArrayAIGNode(self, self._not_node(and_id))
+
+    def create_xor(self, left: ArrayAIGNode, right: ArrayAIGNode) -> ArrayAIGNode:
+        """Create XOR: a XOR b = (!a AND b) OR (a AND !b)."""
+        l_id = left.node_id
+        r_id = right.node_id
+        not_left = self._not_node(l_id)
+        not_right = self._not_node(r_id)
+        term1 = self._and_node(not_left << 1, r_id << 1)
+        term2 = self._and_node(l_id << 1, not_right << 1)
+        and_id = self._and_node(self._not_node(term1) << 1, self._not_node(term2) << 1)
+        return ArrayAIGNode(self, self._not_node(and_id))
+
+    def add_po(self, node: ArrayAIGNode, inverted: bool = False):
+        """Add primary output."""
+        self._ref[node.node_id] += 1
+        self.pos.append((node, inverted))
+
+    def strash(self, substitutions: Optional[Dict[int, Tuple[int, bool]]] = None) -> 'ArrayAIG':
+        """
+        Structural hashing - loại bỏ duplicate nodes.
+
+        Không đệ quy: duyệt cone của các PO theo post-order (explicit stack).
+        ``substitutions``: xem ``AIG.strash``.
+        """
+        new_aig = ArrayAIG()
+        kind = self._kind
+        fanin0 = self._fanin0
+        fanin1 = self._fanin1
+
+        # Recreate PIs
+        node_map: Dict[int, int] = {0: 0, 1: 1}
+        for var_name, old_pi in self.pis.items():
+            node_map[old_pi.node_id] = new_aig.create_pi(var_name).node_id
+
+        # Recreate AND nodes reachable from outputs, fanins first
+        order = dfs_postorder_ids(self, [po.node_id for po, _inv in self.pos], set(node_map), substitutions)
+        for node_id in order:
+            if kind[node_id] != KIND_AND:
+                continue
+            sub = substitutions.get(node_id) if substitutions else None
+            if sub is not None:
+                rep = node_map[sub[0]]
+                node_map[node_id] = new_aig._not_node(rep) if sub[1] else rep
+                continue
+            f0 = fanin0[node_id]
+            f1 = fanin1[node_id]
+            node_map[node_id] = new_aig._and_node(
+                (node_map[f0 >> 1] << 1) | (f0 & 1),
+                (node_map[f1 >> 1] << 1) | (f1 & 1),
+            )
+
+        # Recreate outputs
+        for old_po, inverted in self.pos:
+            new_id = node_map.get(old_po.node_id, old_po.node_id)
+            if inverted:
+                new_id = new_aig._not_node(new_id)
+            new_aig.add_po(ArrayAIGNode(new_aig, new_id))
+
+        return new_aig
+
+    # ------------------------------------------------------------------
+    # In-place passes (xem AIG.strash_in_place / remove_dead_nodes / compact)
+    # ------------------------------------------------------------------
+
+    def strash_in_place(self, substitutions: Optional[Dict[int, Tuple[int, bool]]] = None) -> int:
+        """
+        Structural hashing tại chỗ: cùng quy tắc với ``strash()`` nhưng node được
+        giữ lại được nối lại ngay trong các cột; node bị merge/unreachable được
+        đánh dấu DEAD bởi ``remove_dead_nodes()``. Trả về số node bị xóa.
+        ``substitutions``: xem ``AIG.strash``.
+        """
+        self.enable_strash = True
+        self.enable_const_simplify = True
+        kind = self._kind
+        fanin0 = self._fanin0
+        fanin1 = self._fanin1
+        order = dfs_postorder_ids(self, [po.node_id for po, _inv in self.pos], set(), substitutions)
+        self._reset_hash_table(len(order))
+        self.max_level = 0
+        self._version += 1
+
+        # repl: node_id -> node_id thay thế (khi node bị merge hoặc fold)
+        repl: Dict[int, int] = {}
+        and_node = self._and_node
+        for node_id in order:
+            if kind[node_id] != KIND_AND:
+                continue
+            sub = substitutions.get(node_id) if substitutions else None
+            if sub is not None:
+                rep = repl.get(sub[0], sub[0])
+                result = self._not_node(rep, node_id) if sub[1] else rep
+                if result != node_id:
+                    repl[node_id] = result
+                continue
+            f0 = fanin0[node_id]
+            f1 = fanin1[node_id]
+            r = repl.get(f0 >> 1)
+            if r is not None:
+                f0 = (r << 1) | (f0 & 1)
+            r = repl.get(f1 >> 1)
+            if r is not None:
+                f1 = (r << 1) | (f1 & 1)
+            result = and_node(f0, f1, node_id)
+            if result != node_id:
+                repl[node_id] = result
+
+        # Outputs: same convention as strash() (inverted PO -> explicit NOT node)
+        old_pos = self.pos
+        self.pos = []
+        for po, inverted in old_pos:
+            new_id = repl.get(po.node_id, po.node_id)
+            if inverted:
+                new_id = self._not_node(new_id)
+            self.add_po(ArrayAIGNode(self, new_id))
+            self._ref[po.node_id] -= 1
+
+        return self.remove_dead_nodes()
+
+    def remove_dead_nodes(self) -> int:
+        """
+        Dead code elimination tại chỗ dựa trên reference count: AND node có
+        ``ref_count == 0`` được đánh dấu DEAD và lan truyền sang fanin.
+        """
+        kind = self._kind
+        ref = self._ref
+        fanin0 = self._fanin0
+        fanin1 = self._fanin1
+        stack = [i for i in range(len(kind)) if ref[i] == 0 and kind[i] == KIND_AND]
+        removed = 0
+        while stack:
+            node_id = stack.pop()
+            kind[node_id] = KIND_DEAD
+            for lit in (fanin0[node_id], fanin1[node_id]):
+                child = lit >> 1
+                ref[child] -= 1
+                if ref[child] == 0 and kind[child] == KIND_AND:
+                    stack.append(child)
+            fanin0[node_id] = NO_FANIN
+            fanin1[node_id] = NO_FANIN
+            removed += 1
+        if removed:
+            self._num_dead += removed
+            self._rebuild_hash_table()
+            self._version += 1
+        return removed
+
+    def _reset_hash_table(self, expected: int):
+        size = _HTABLE_MIN_SIZE
+        while size < 2 * expected:
+            size <<= 1
+        self._htable = array('i', bytes(4 * size))
+        self._hcount = 0
+
+    def _rebuild_hash_table(self):
+        kind = self._kind
+        self._reset_hash_table(len(kind) - self._num_dead)
+        if not self.enable_strash:
+            return
+        for node_id in range(len(kind)):
+            if kind[node_id] == KIND_AND:
+                slot = self._hash_slot(self._fanin0[node_id], self._fanin1[node_id])
+                if not self._htable[slot]:
+                    self._hash_insert(slot, node_id)
+
+    def dead_fraction(self) -> float:
+        """Tỉ lệ node DEAD trong các cột."""
+        return self._num_dead / len(self._kind)
+
+    def compact(self) -> int:
+        """
+        Xóa node DEAD khỏi các cột và đánh lại id liên tục (constants, PIs, rồi
+        AND theo thứ tự topo). Handle/map theo node_id cũ không còn hợp lệ.
+
+        Returns:
+            Số id được thu hồi
+        """
+        kind = self._kind
+        fanin0 = self._fanin0
+        fanin1 = self._fanin1
+        old_len = len(kind)
+
+        order = [0, 1] + [pi.node_id for pi in self.pis.values()]
+        roots = [po.node_id for po, _inv in self.pos]
+        roots += [i for i in range(old_len) if kind[i] == KIND_AND]
+        order += dfs_postorder_ids(self, roots, set(order))
+
+        new_id = array('q', [-1]) * old_len
+        for i, old in enumerate(order):
+            new_id[old] = i
+
+        def remap(lit: int) -> int:
+            return (new_id[lit >> 1] << 1) | (lit & 1) if lit >= 0 else NO_FANIN
+
+        self._kind = bytearray(kind[old] for old in order)
+        self._fanin0 = array('q', (remap(fanin0[old]) for old in order))
+        self._fanin1 = array('q', (remap(fanin1[old]) for old in order))
+        self._level = array('i', (self._level[old] for old in order))
+        self._ref = array('i', (self._ref[old] for old in order))
+        self._pi_names = {new_id[old]: name for old, name in self._pi_names.items()}
+        self.pis = {name: ArrayAIGNode(self, new_id[pi.node_id]) for name, pi in self.pis.items()}
+        self.pos = [(ArrayAIGNode(self, new_id[po.node_id]), inv) for po, inv in self.pos]
+        self._num_dead = 0
+        self._rebuild_hash_table()
+        self._version += 1
+        return old_len - len(order)
+
+    def maybe_compact(self, threshold: float = 0.3) -> bool:
+        """Chạy ``compact()`` chỉ khi ``dead_fraction()`` vượt ``threshold``."""
+        if self.dead_fraction() > threshold:
+            self.compact()
+            return True
+        return False
+
+    def count_nodes(self) -> int:
+        """Count total number of nodes."""
+        return len(self._kind) - self._num_dead
+
+    def count_and_nodes(self) -> int:
+        """Count number of AND nodes."""
+        return self._kind.count(KIND_AND)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get AIG statistics."""
+        return {
+            'total_nodes': self.count_nodes(),
+            'and_nodes': self.count_and_nodes(),
+            'pi_count': len(self.pis),
+            'po_count': len(self.pos),
+            'max_level': self.max_level,
+            'hash_table_size': self._hcount
+        }
+
+    def to_verilog(self, module_name: str = "aig_module") -> str:
+        """Convert AIG to Verilog code."""
+        lines = [f"module {module_name}("]
+
+        pi_names = list(self.pis.keys())
+        if pi_names:
+            lines.append(f"  input {', '.join(pi_names)},")
+
+        po_names = [f"out{i}" for i in range(len(self.pos))]
+        if po_names:
+            lines.append(f"  output {', '.join(po_names)}")
+
+        lines.append(");")
+        lines.append("")
+
+        and_ids = [i for i, k in enumerate(self._kind) if k == KIND_AND]
+        if and_ids:
+            lines.append("  // Internal wires")
+            for node_id in and_ids:
+                lines.append(f"  wire w{node_id};")
+            lines.append("")
+
+        for node_id in and_ids:
+            left_expr = self._lit_to_expr(self._fanin0[node_id])
+            right_expr = self._lit_to_expr(self._fanin1[node_id])
+            lines.append(f"  assign w{node_id} = {left_expr} & {right_expr};")
+
+        lines.append("")
+        lines.append("  // Outputs")
+        for i, (po_node, inverted) in enumerate(self.pos):
+            po_expr = self._lit_to_expr((po_node.node_id << 1) | (1 if inverted else 0))
+            lines.append(f"  assign {po_names[i]} = {po_expr};")
+
+        lines.append("")
+        lines.append("endmodule")
+
+        return "\n".join(lines)
+
+    def _lit_to_expr(self, lit: int) -> str:
+        """Convert literal to Verilog expression."""
+        node_id = lit >> 1
+        kind = self._kind[node_id]
+        if kind <= KIND_CONST1:
+            expr = "1'b1" if kind == KIND_CONST1 else "1'b0"
+        elif kind == KIND_PI:
+            expr = self._pi_names[node_id]
+        else:
+            expr = f"w{node_id}"
+        return f"~{expr}" if lit & 1 else expr
+
+
+def array_aig_from_aig(aig) -> ArrayAIG:
+    """
+    Convert an object-based ``AIG`` (hoặc ``ArrayAIG``) sang ``ArrayAIG``.
+
+    Giữ nguyên số node và cấu trúc (không strash, không fold hằng số), chỉ đổi
+    cách lưu trữ.
+    """
+    new_aig = ArrayAIG(enable_strash=aig.enable_strash,
+                       enable_const_simplify=aig.enable_const_simplify)
+    node_map: Dict[int, int] = {aig.const0.node_id: 0, aig.const1.node_id: 1}
+
+    for node_id in sorted(aig.nodes):
+        if node_id in node_map:
+            continue
+        node = aig.nodes[node_id]
+        if node.is_pi():
+            node_map[node_id] = new_aig.create_pi(node.var_name).node_id
+        elif node.is_and():
+            lit0 = (node_map[node.left.node_id] << 1) | (1 if node.left_inverted else 0)
+            lit1 = (node_map[node.right.node_id] << 1) | (1 if node.right_inverted else 0)
+            new_id = new_aig._new_node(KIND_AND, lit0, lit1, node.level)
+            if new_aig.enable_strash:
+                slot = new_aig._hash_slot(lit0, lit1)
+                if not new_aig._htable[slot]:
+                    new_aig._hash_insert(slot, new_id)
+            node_map[node_id] = new_id
+    new_aig.max_level = aig.max_level
+
+    # PIs that never appeared in aig.nodes order (defensive)
+    for var_name in aig.pis:
+        new_aig.create_pi(var_name)
+
+    for po, inverted in aig.pos:
+        new_aig.add_po(ArrayAIGNode(new_aig, node_map[po.node_id]), inverted)
+
+    return new_aig
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    aig = ArrayAIG()
+    a = aig.create_pi("a")
+    b = aig.create_pi("b")
+    c = aig.create_pi("c")
+    ab = aig.create_and(a, b)
+    f = aig.create_or(ab, c)
+    aig.add_po(f)
+
+    print("ArrayAIG Example:")
+    for key, value in aig.get_statistics().items():
+        print(f"  {key}: {value}")
+    print()
+    print(aig.to_verilog("example_array_aig"))
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+k-feasible Cut Enumeration
+
+Cut của node n là tập leaves L sao cho mọi đường từ PI tới n đều đi qua L;
+cut k-feasible có |L| <= k. Engine này liệt kê priority cuts (tối đa
+``max_cuts`` cut mỗi node, k <= 6) kèm truth table 64-bit của node theo leaves,
+dùng chung cho rewriting, LUT mapping và cell mapping.
+
+- Cut của AND node = merge từng cặp cut của hai fanin (|L| <= k), lọc cut bị
+  dominate (cut khác có leaves là tập con), sắp theo ưu tiên (ít leaves trước,
+  rồi leaf level lớn nhất nhỏ hơn) và giữ ``max_cuts`` cut đầu.
+- Truth table: leaf thứ i (theo thứ tự node id tăng dần) là biến i, hàm được
+  lặp lại cho đủ 64 bit (``TT_VARS[i]`` là truth table của biến i). NOT node
+  (AND(!x, CONST1)) trong suốt: cut của nó là cut của x với truth đảo.
+- Lưu trữ kết quả dạng mảng phẳng (``array``) trong ``CutStore``; trong lúc
+  liệt kê chỉ giữ cut của các node còn fanout chưa xử lý.
+
+ABC Reference: src/opt/cut/cutMan.c, src/opt/cut/cutNode.c, src/misc/util/utilTruth.h
+- Cut_NodeComputeCuts(): merge cut của fanin, Cut_CutFilter(): dominance
+- Abc_TtExpand(): đổi chỗ biến khi mở rộng truth table sang leaves mới
+"""
+
+import logging
+import time
+from array import array
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from core.synthesis.aig_traversal import and_program
+
+logger = logging.getLogger(__name__)
+
+MAX_CUT_SIZE = 6
+# int.bit_count() chỉ có từ Python 3.10
+_popcount = getattr(int, 'bit_count', None) or (lambda x: bin(x).count('1'))
+TT_FULL = (1 << 64) - 1
+# Truth table của biến i (6 biến, 64 bit)
+TT_VARS = (
+    0xAAAAAAAAAAAAAAAA,
+    0xCCCCCCCCCCCCCCCC,
+    0xF0F0F0F0F0F0F0F0,
+    0xFF00FF00FF00FF00,
+    0xFFFF0000FFFF0000,
+    0xFFFFFFFF00000000,
+)
+
+
+def _swap_masks():
+    table = {}
+    for i in range(MAX_CUT_SIZE):
+        for j in range(i + 1, MAX_CUT_SIZE):
+            vi, vj = TT_VARS[i], TT_VARS[j]
+            up = vi & ~vj & TT_FULL      # x_i=1, x_j=0 → x_i=0, x_j=1
+            down = vj & ~vi & TT_FULL
+            table[(i, j)] = (TT_FULL ^ up ^ down, up, down, (1 << j) - (1 << i))
+    return table
+
+
+_SWAP = _swap_masks()
+
+
+def tt_swap(truth: int, i: int, j: int) -> int:
+    """Đổi chỗ biến i và j trong truth table 64-bit."""
+    if i == j:
+        return truth
+    if i > j:
+        i, j = j, i
+    keep, up, down, shift = _SWAP[(i, j)]
+    return (truth & keep) | ((truth & up) << shift) | ((truth & down) >> shift)
+
+
+def tt_expand(truth: int, leaves: Sequence[int], new_leaves: Sequence[int]) -> int:
+    """
+    Mở rộng truth table theo ``leaves`` sang ``new_leaves`` (superset, cùng
+    thứ tự tăng dần): biến i được chuyển tới vị trí của ``leaves[i]``.
+    """
+    if len(leaves) == len(new_leaves):
+        return truth
+    j = len(new_leaves) - 1
+    for i in range(len(leaves) - 1, -1, -1):
+        leaf = leaves[i]
+        while new_leaves[j] != leaf:
+            j -= 1
+        if i != j:
+            truth = tt_swap(truth, i, j)
+        j -= 1
+    return truth
+
+
+def tt_mask(num_vars: int) -> int:
+    """Mask 2^num_vars bit thấp (truth table thu gọn của hàm num_vars biến)."""
+    return (1 << (1 << num_vars)) - 1
+
+
+class Cut(NamedTuple):
+    leaves: Tuple[int, ...]
+    truth: int
+
+
+class CutStore:
+    """
+    Kết quả cut enumeration, lưu dạng mảng phẳng.
+
+    Cut thứ c có ``size(c)`` leaves tại ``_leaves[c*k : c*k+size]`` và truth
+    table ``truth(c)``. Các cut của một node nằm liên tiếp; cut đầu tiên là
+    trivial cut ``{node}`` (trừ hằng số: chỉ có cut rỗng).
+    """
+
+    def __init__(self, k: int, max_cuts: int, size: int):
+        self.k = k
+        self.max_cuts = max_cuts
+        self._begin = array('l', [0]) * size
+        self._count = array('B', [0]) * size
+        self._leaves = array('i')
+        self._size = array('B')
+        self._truth = array('Q')
+
+    def _add_node(self, node_id: int, cuts: Sequence[Tuple[Tuple[int, ...], int, int]]):
+        k = self.k
+        pad = (-1,) * k
+        self._begin[node_id] = len(self._size)
+        self._count[node_id] = len(cuts)
+        for leaves, _sign, truth in cuts:
+            self._leaves.extend(leaves + pad[len(leaves):])
+            self._size.append(len(leaves))
+            self._truth.append(truth)
+
+    @property
+    def num_cuts(self) -> int:
+        return len(self._size)
+
+    def num_node_cuts(self, node_id: int) -> int:
+        return self._count[node_id] if node_id < len(self._count) else 0
+
+    def cut_indices(self, node_id: int) -> range:
+        """Chỉ số các cut của node (dùng với ``leaves``/``truth``/``size``)."""
+        if node_id >= len(self._count):
+            return range(0)
+        begin = self._begin[node_id]
+        return range(begin, begin + self._count[node_id])
+
+    def size(self, cut: int) -> int:
+        return self._size[cut]
+
+    def leaves(self, cut: int) -> Tuple[int, ...]:
+        start = cut * self.k
+        return tuple(self._leaves[start:start + self._size[cut]])
+
+    def truth(self, cut: int) -> int:
+        return self._truth[cut]
+
+    def cuts(self, node_id: int) -> List[Cut]:
+        """Danh sách cut của node (trivial cut đứng đầu)."""
+        return [Cut(self.leaves(c), self._truth[c]) for c in self.cut_indices(node_id)]
+
+    def memory_bytes(self) -> int:
+        """Bộ nhớ của các mảng lưu cut (không tính overhead object)."""
+        arrays = (self._begin, self._count, self._leaves, self._size, self._truth)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+class CutEnumerator:
+    """
+    Liệt kê priority k-feasible cuts cho mọi node trong cone của các PO.
+
+    Args:
+        k: số leaves tối đa mỗi cut (1..6)
+        max_cuts: số cut (không tính trivial cut) giữ lại mỗi node
+        all_nodes: True → cả các AND node không reachable từ PO
+    """
+
+    def __init__(self, k: int = 4, max_cuts: int = 8, all_nodes: bool = False):
+        if not 1 <= k <= MAX_CUT_SIZE:
+            raise ValueError(f"Cut size k must be in 1..{MAX_CUT_SIZE}, got {k}")
+        if max_cuts < 1:
+            raise ValueError(f"max_cuts must be >= 1, got {max_cuts}")
+        self.k = k
+        self.max_cuts = max_cuts
+        self.all_nodes = all_nodes
+        self.stats: Dict[str, float] = {}
+
+    def enumerate(self, aig) -> CutStore:
+        """Chạy cut enumeration trên AIG / ArrayAIG."""
+        start = time.perf_counter()
+        k = self.k
+        max_cuts = self.max_cuts
+        program = and_program(aig, self.all_nodes)
+        store = CutStore(k, max_cuts, aig.next_node_id)
+
+        # Số fanout còn chưa xử lý: giải phóng cut của node khi về 0
+        refs: Dict[int, int] = {}
+        for out, a, b, _op in program:
+            refs[a] = refs.get(a, 0) + 1
+            refs[b] = refs.get(b, 0) + 1
+
+        # Working set: node_id -> [(leaves, sign, truth)]
+        work: Dict[int, List[Tuple[Tuple[int, ...], int, int]]] = {}
+        level: Dict[int, int] = {}
+        var0 = TT_VARS[0]
+        const0 = aig.const0.node_id
+        const1 = aig.const1.node_id
+        for node_id, truth in ((const0, 0), (const1, TT_FULL)):
+            work[node_id] = [((), 0, truth)]
+            level[node_id] = 0
+            store._add_node(node_id, work[node_id])
+        for pi in aig.pis.values():
+            pid = pi.node_id
+            work[pid] = [((pid,), 1 << (pid & 63), var0)]
+            level[pid] = 0
+            store._add_node(pid, work[pid])
+
+        pairs = 0
+        for out, a, b, op in program:
+            cuts_a = work[a]
+            cuts_b = work[b]
+            level[out] = max(level[a], level[b]) + 1
+
+            # Merge từng cặp cut; dict giữ cặp đầu tiên cho mỗi tập leaves
+            merged: Dict[Tuple[int, ...], Tuple[int, Tuple[int, ...], int, Tuple[int, ...], int]] = {}
+            for la, sa, ta in cuts_a:
+                for lb, sb, tb in cuts_b:
+                    sign = sa | sb
+                    if _popcount(sign) > k:
+                        continue
+                    if la == lb or not lb:
+                        leaves = la
+                    elif not la:
+                        leaves = lb
+                    else:
+                        leaves = tuple(sorted(set(la).union(lb)))
+                        if len(leaves) > k:
+                            continue
+                    if leaves not in merged:
+                        merged[leaves] = (sign, la, ta, lb, tb)
+            pairs += len(cuts_a) * len(cuts_b)
+
+            # Ưu tiên: ít leaves, rồi leaf level lớn nhất nhỏ; bỏ cut bị dominate
+            order = sorted(merged, key=lambda ls: (len(ls), max((level[x] for x in ls), default=0)))
+            kept: List[Tuple[Tuple[int, ...], int]] = []
+            for leaves in order:
+                sign = merged[leaves][0]
+                dominated = False
+                for kl, ks in kept:
+                    if ks & ~sign == 0 and len(kl) < len(leaves) and set(kl).issubset(leaves):
+                        dominated = True
+                        break
+                if not dominated:
+                    kept.append((leaves, sign))
+                    if len(kept) == max_cuts:
+                        break
+
+            cuts = [((out,), 1 << (out & 63), var0)]
+            compl_a = TT_FULL if op & 1 else 0
+            compl_b = TT_FULL if op & 2 else 0
+            for leaves, sign in kept:
+                _sign, la, ta, lb, tb = merged[leaves]
+                truth = (tt_expand(ta, la, leaves) ^ compl_a) & (tt_expand(tb, lb, leaves) ^ compl_b)
+                cuts.append((leaves, sign, truth))
+            work[out] = cuts
+            store._add_node(out, cuts)
+
+            for fanin in (a, b):
+                r = refs[fanin] - 1
+                refs[fanin] = r
+                if r == 0:
+                    del work[fanin]
+
+        self.stats = {
+            'nodes': len(program),
+            'cuts': store.num_cuts,
+            'pairs': pairs,
+            'memory_bytes': store.memory_bytes(),
+            'time': time.perf_counter() - start,
+        }
+        logger.info(
+            f"  Cuts: {store.num_cuts} cuts for {len(program)} AND nodes "
+            f"(k={k}, max_cuts={max_cuts}, {self.stats['time']:.2f}s)"
+        )
+        return store
+
+
+def enumerate_cuts(aig, k: int = 4, max_cuts: int = 8, all_nodes: bool = False) -> CutStore:
+    """Tiện ích: ``CutEnumerator(k, max_cuts, all_nodes).enumerate(aig)``."""
+    return CutEnumerator(k, max_cuts, all_nodes).enumerate(aig)
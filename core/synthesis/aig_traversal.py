@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+AIG Traversal (non-recursive)
+
+Dịch vụ duyệt AIG dùng chung cho các pass (strash, DCE, ConstProp, Balance) và
+techmap front end (aig_to_logic_nodes), không dùng đệ quy Python:
+
+- ``dfs_postorder``: DFS bằng explicit stack, thứ tự post-order (fanin trước,
+  trái trước phải) giống hệt các closure đệ quy cũ → node id sau rebuild giữ nguyên.
+- ``topological_order``: post-order từ tất cả PO, được cache trên AIG và tự
+  invalidate khi AIG thay đổi (thêm node / PO).
+- ``and_program``: danh sách phẳng ``(out, a, b, op)`` của các AND node theo
+  thứ tự topo (simulation, FRAIG, cut enumeration).
+- ``compute_levels`` / ``aig_depth``: arrival level tính lại từ cấu trúc (balance).
+- ``run_recursive``: chạy một hàm "đệ quy" viết dạng generator (mỗi ``yield args``
+  là một lời gọi đệ quy) bằng explicit stack; dùng cho các hàm có side effect
+  phụ thuộc thứ tự gọi (ví dụ ``aig_to_netlist``).
+
+Độ sâu AIG không còn bị giới hạn bởi ``sys.getrecursionlimit()``.
+
+Hoạt động với cả ``AIG`` (core/synthesis/aig.py) và ``ArrayAIG``
+(core/synthesis/aig_array.py).
+"""
+
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Set, Tuple
+
+
+def _topo_key(aig) -> Tuple:
+    """Key thay đổi mỗi khi AIG được sửa (node mới, PO mới, hoặc đổi version)."""
+    return (
+        getattr(aig, '_version', 0),
+        aig.next_node_id,
+        tuple((po.node_id, inv) for po, inv in aig.pos),
+    )
+
+
+def dfs_postorder_ids(aig, root_ids: Iterable[int], visited: Set[int],
+                      substitutions: Optional[Dict[int, Tuple[int, bool]]] = None) -> List[int]:
+    """
+    Post-order DFS trên cột fanin của ArrayAIG (chỉ làm việc với node id).
+
+    ``substitutions`` (node_id -> (rep_id, inverted)): node bị thay có một con
+    duy nhất là rep thay vì hai fanin (rep luôn đứng trước node trong kết quả).
+    """
+    kind = aig._kind
+    fanin0 = aig._fanin0
+    fanin1 = aig._fanin1
+    and_kind = 3  # KIND_AND
+    order: List[int] = []
+    for root in root_ids:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [root]
+        state = [0]
+        while stack:
+            node_id = stack[-1]
+            st = state[-1]
+            if substitutions and st == 0 and node_id in substitutions:
+                # Con duy nhất: rep; state 2 → lần sau pop
+                state[-1] = 2
+                child = substitutions[node_id][0]
+                if child not in visited:
+                    visited.add(child)
+                    stack.append(child)
+                    state.append(0)
+                continue
+            if kind[node_id] == and_kind and st < 2:
+                state[-1] = st + 1
+                child = (fanin0[node_id] if st == 0 else fanin1[node_id]) >> 1
+                if child not in visited:
+                    visited.add(child)
+                    stack.append(child)
+                    state.append(0)
+                continue
+            stack.pop()
+            state.pop()
+            order.append(node_id)
+    return order
+
+
+def dfs_postorder(aig, roots: Optional[Iterable[Any]] = None,
+                  visited: Optional[Set[int]] = None,
+                  substitutions: Optional[Dict[int, Tuple[int, bool]]] = None) -> List[Any]:
+    """
+    DFS post-order (non-recursive) từ ``roots``.
+
+    Args:
+        aig: AIG hoặc ArrayAIG
+        roots: danh sách node gốc (mặc định: các PO theo thứ tự)
+        visited: set node_id đã duyệt; truyền cùng một set qua nhiều lần gọi để
+            chia sẻ trạng thái (mỗi node chỉ xuất hiện một lần trên toàn bộ các lần gọi)
+        substitutions: node_id -> (rep_id, inverted); node bị thay chỉ có con
+            là rep (dùng bởi ``strash(substitutions)``: rep có thể là node tạo
+            sau node bị thay, ví dụ cấu trúc mới của rewriting)
+
+    Returns:
+        List node (constant, PI, AND) với fanin luôn đứng trước node.
+    """
+    if roots is None:
+        roots = [po for po, _inv in aig.pos]
+    if visited is None:
+        visited = set()
+
+    if hasattr(aig, '_fanin0'):
+        make = aig.node
+        ids = dfs_postorder_ids(aig, [r.node_id for r in roots], visited, substitutions)
+        return [make(i) for i in ids]
+
+    order: List[Any] = []
+    for root in roots:
+        if root is None or root.node_id in visited:
+            continue
+        visited.add(root.node_id)
+        # stack entries: [node, next_child_index]
+        stack: List[List[Any]] = [[root, 0]]
+        while stack:
+            entry = stack[-1]
+            node = entry[0]
+            st = entry[1]
+            if substitutions and st == 0 and node.node_id in substitutions:
+                entry[1] = 2
+                child = aig.nodes[substitutions[node.node_id][0]]
+                if child.node_id not in visited:
+                    visited.add(child.node_id)
+                    stack.append([child, 0])
+                continue
+            if st < 2 and node.is_and():
+                entry[1] = st + 1
+                child = node.left if st == 0 else node.right
+                if child is not None and child.node_id not in visited:
+                    visited.add(child.node_id)
+                    stack.append([child, 0])
+                continue
+            stack.pop()
+            order.append(node)
+    return order
+
+
+def topological_order(aig) -> List[Any]:
+    """
+    Thứ tự topo (post-order từ các PO) của các node reachable, có cache.
+
+    Cache lưu trên chính AIG (``aig._topo_cache``) và được tính lại khi AIG thay
+    đổi. Không sửa list trả về.
+    """
+    key = _topo_key(aig)
+    cache = getattr(aig, '_topo_cache', None)
+    if cache is not None and cache[0] == key:
+        return cache[1]
+    order = dfs_postorder(aig)
+    aig._topo_cache = (key, order)
+    return order
+
+
+def invalidate_topological_order(aig):
+    """Xóa cache thứ tự topo (gọi sau khi sửa AIG tại chỗ)."""
+    aig._topo_cache = None
+
+
+def and_program(aig, all_nodes: bool = False) -> List[Tuple[int, int, int, int]]:
+    """
+    Chương trình phẳng ``(out, a, b, op)`` của các AND node theo thứ tự topo.
+
+    ``a``/``b`` là node id của fanin trái/phải; ``op`` bit 0 = fanin trái đảo,
+    bit 1 = fanin phải đảo. Dùng chung cho simulation, FRAIG và cut enumeration.
+
+    Args:
+        aig: AIG hoặc ArrayAIG
+        all_nodes: True → mọi AND node (kể cả node không reachable từ PO);
+            False → chỉ cone của các PO
+    """
+    program: List[Tuple[int, int, int, int]] = []
+    if hasattr(aig, '_fanin0'):
+        kind = aig._kind
+        fanin0 = aig._fanin0
+        fanin1 = aig._fanin1
+        roots = [po.node_id for po, _inv in aig.pos]
+        if all_nodes:
+            roots.extend(i for i in range(len(kind)) if kind[i] == 3)
+        for node_id in dfs_postorder_ids(aig, roots, set()):
+            if kind[node_id] == 3:  # KIND_AND
+                l0 = fanin0[node_id]
+                l1 = fanin1[node_id]
+                program.append((node_id, l0 >> 1, l1 >> 1, (l0 & 1) | ((l1 & 1) << 1)))
+        return program
+
+    roots = [po for po, _inv in aig.pos]
+    if all_nodes:
+        roots.extend(node for node in aig.nodes.values() if node.is_and())
+    for node in dfs_postorder(aig, roots, set()):
+        if node.is_and():
+            op = (1 if node.left_inverted else 0) | (2 if node.right_inverted else 0)
+            program.append((node.node_id, node.left.node_id, node.right.node_id, op))
+    return program
+
+
+def compute_levels(aig, program: Optional[List[Tuple[int, int, int, int]]] = None) -> Dict[int, int]:
+    """
+    Arrival level (độ sâu logic) của mọi AND node trong cone các PO.
+
+    PI/hằng số có level 0; AND có level max(fanin) + 1, trừ AND với fanin hằng
+    (NOT(x) = AND(!x, CONST1)) lấy level của fanin còn lại - cùng quy ước với
+    ``level`` do ``create_and`` ghi. Tính lại từ cấu trúc (không dựa vào level
+    đã lưu, có thể cũ sau các pass in-place).
+    """
+    if program is None:
+        program = and_program(aig)
+    levels: Dict[int, int] = {}
+    for out, a, b, _op in program:
+        la = levels.get(a, 0)
+        lb = levels.get(b, 0)
+        if a <= 1:
+            levels[out] = lb
+        elif b <= 1:
+            levels[out] = la
+        else:
+            levels[out] = (la if la > lb else lb) + 1
+    return levels
+
+
+def aig_depth(aig, levels: Optional[Dict[int, int]] = None) -> int:
+    """Độ sâu AIG: level lớn nhất trên các PO (xem ``compute_levels``)."""
+    if levels is None:
+        levels = compute_levels(aig)
+    return max((levels.get(po.node_id, 0) for po, _inv in aig.pos), default=0)
+
+
+def run_recursive(gen_fn: Callable[..., Generator], *args) -> Any:
+    """
+    Chạy hàm đệ quy viết dạng generator bằng explicit stack.
+
+    Trong ``gen_fn``, thay lời gọi đệ quy ``f(x, y)`` bằng ``yield (x, y)``;
+    giá trị ``return`` của lời gọi con được gửi lại qua ``yield``. Thứ tự thực
+    thi (và mọi side effect) giống hệt phiên bản đệ quy.
+    """
+    stack = [gen_fn(*args)]
+    result = None
+    while stack:
+        try:
+            call_args = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+            continue
+        stack.append(gen_fn(*call_args))
+        result = None
+    return result
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Đọc/ghi AIG theo định dạng AIGER (ASCII ``.aag`` và binary ``.aig``).
+
+AIGER là định dạng chuẩn của ABC/HWMCC cho AIG: mỗi biến là một số nguyên,
+literal = ``2 * var + complement``, literal 0/1 là hằng false/true. Binary AIGER
+đánh số lại AND theo thứ tự topo và chỉ lưu hiệu ``lhs - rhs0``, ``rhs0 - rhs1``
+mã hóa 7 bit/byte, nên nhỏ hơn nhiều lần so với JSON/Verilog export.
+
+Ánh xạ sang ``AIG`` / ``ArrayAIG``:
+    - input  → PI (tên lấy từ bảng symbol ``i<k>``, mặc định ``i<k>``);
+    - latch  → PI cho giá trị hiện tại (tên ``l<k>``) + PO cho hàm next-state,
+      đặt sau các output thường; ``AigerModel.latches`` giữ liên kết PI ↔ PO;
+    - output → PO (tên ``o<k>``); bad state / invariant constraint (AIGER 1.9,
+      phần ``B``/``C`` của header) được đọc như các output thêm ``bad<k>`` /
+      ``constraint<k>``. Justice / fairness không được hỗ trợ.
+    - NOT(x) của ``AIG`` (node AND(!x, CONST1)) và AND có fanin hằng không tạo
+      biến AND khi ghi, chỉ đảo / gấp literal.
+
+Reference: Armin Biere, "The AIGER And-Inverter Graph (AIG) Format Version 20071012"
+và "AIGER 1.9 and Beyond" (FMV Reports 07/1, 11/2).
+
+Example:
+    >>> write_aiger(aig, "design.aig", output_names=["sum0", "cout"])
+    >>> model = read_aiger("design.aig")
+    >>> model.aig.count_and_nodes(), model.output_names
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from core.synthesis.aig import AIG
+from core.synthesis.aig_traversal import and_program
+
+
+class AigerHeader(NamedTuple):
+    """Header ``M I L O A`` của file AIGER."""
+    max_var: int
+    inputs: int
+    latches: int
+    outputs: int
+    ands: int
+
+
+class AigerLatch(NamedTuple):
+    """Latch: PI ``name`` là giá trị hiện tại, PO ``next_po`` là hàm next-state."""
+    name: str
+    next_po: int
+    init: Optional[int] = 0  # 0, 1 hoặc None (không khởi tạo)
+
+
+class AigerModel(NamedTuple):
+    """Kết quả ``read_aiger``: AIG + tên PO (mọi PO, kể cả next-state của latch) + latch."""
+    aig: Any
+    output_names: List[str]
+    latches: List[AigerLatch]
+    comments: List[str]
+    header: AigerHeader
+
+
+@contextmanager
+def _open_binary(target, mode: str):
+    if hasattr(target, "read") or hasattr(target, "write"):
+        yield target
+    else:
+        with open(target, mode) as stream:
+            yield stream
+
+
+def _is_binary_path(path: Any) -> bool:
+    return not str(getattr(path, "name", path)).lower().endswith(".aag")
+
+
+def aiger_literals(aig, sources: Sequence[Any]) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Đánh số AIGER cho ``aig``: ``sources[k]`` (PI/latch) là biến ``k + 1``, AND theo
+    thứ tự topo là các biến tiếp theo (nên ``lhs > rhs0 >= rhs1``).
+
+    NOT và AND có fanin hằng / trùng literal không tạo biến, chỉ gấp literal.
+    Cũng được dùng bởi các writer khác (BLIF, .bench) để bỏ node NOT của ``AIG``.
+
+    Returns:
+        ``(lit_of, ands)``: literal theo node id (-1: node không được gán)
+        và danh sách ``(rhs0, rhs1)`` của các biến AND
+    """
+    lit_of = [-1] * aig.next_node_id
+    lit_of[aig.const0.node_id] = 0
+    lit_of[aig.const1.node_id] = 1
+    var = 0
+    for node in sources:
+        var += 1
+        lit_of[node.node_id] = var << 1
+
+    ands: List[Tuple[int, int]] = []
+    for out, a, b, op in and_program(aig):
+        la = lit_of[a] ^ (op & 1)
+        lb = lit_of[b] ^ (op >> 1)
+        if la < lb:
+            la, lb = lb, la
+        if lb <= 1:
+            # Fanin hằng: AND(x, 1) = x, AND(x, 0) = 0 (NOT của AIG rơi vào đây)
+            lit_of[out] = la if lb else 0
+        elif la == lb:
+            lit_of[out] = la
+        elif la == lb ^ 1:
+            lit_of[out] = 0
+        else:
+            var += 1
+            lit_of[out] = var << 1
+            ands.append((la, lb))
+    return lit_of, ands
+
+
+# ------------------------------------------------------------------ writer
+
+def write_aiger(
+    aig,
+    target,
+    binary: Optional[bool] = None,
+    output_names: Optional[Sequence[str]] = None,
+    latches: Sequence[AigerLatch] = (),
+    comments: Sequence[str] = (),
+    symbols: bool = True,
+) -> AigerHeader:
+    """
+    Ghi ``aig`` (``AIG`` hoặc ``ArrayAIG``) ra file AIGER.
+
+    Args:
+        target: đường dẫn hoặc file object mở ở chế độ binary
+        binary: True = ``aig``, False = ``aag``; None = theo phần mở rộng (``.aag`` → ASCII)
+        output_names: tên của mọi PO (theo thứ tự ``aig.pos``) cho bảng symbol
+        latches: PI/PO nào là latch (xem ``AigerLatch``)
+        comments: các dòng comment (phần ``c`` cuối file)
+        symbols: ghi bảng symbol (tên PI, latch, output)
+
+    Returns:
+        ``AigerHeader`` của file đã ghi
+    """
+    if binary is None:
+        binary = _is_binary_path(target)
+    latch_names = {latch.name for latch in latches}
+    next_pos = {latch.next_po for latch in latches}
+    for latch in latches:
+        if latch.name not in aig.pis:
+            raise ValueError(f"Latch {latch.name!r} is not a primary input of the AIG")
+        if not 0 <= latch.next_po < len(aig.pos):
+            raise ValueError(f"Latch {latch.name!r}: next-state PO {latch.next_po} out of range")
+    inputs = [(name, node) for name, node in aig.pis.items() if name not in latch_names]
+
+    sources = [node for _name, node in inputs] + [aig.pis[latch.name] for latch in latches]
+    lit_of, ands = aiger_literals(aig, sources)
+    num_inputs, num_latches = len(inputs), len(latches)
+    var = len(sources) + len(ands)
+
+    outputs = []
+    latch_next = {}
+    for index, (node, inverted) in enumerate(aig.pos):
+        lit = lit_of[node.node_id] ^ (1 if inverted else 0)
+        if index in next_pos:
+            latch_next[index] = lit
+        else:
+            outputs.append((index, lit))
+    header = AigerHeader(var, num_inputs, num_latches, len(outputs), len(ands))
+
+    lines = [f"{'aig' if binary else 'aag'} {var} {num_inputs} {num_latches} {len(outputs)} {len(ands)}"]
+    if not binary:
+        lines.extend(str((k + 1) << 1) for k in range(num_inputs))
+    for k, latch in enumerate(latches):
+        cur = (num_inputs + k + 1) << 1
+        fields = [] if binary else [str(cur)]
+        fields.append(str(latch_next[latch.next_po]))
+        if latch.init == 1:
+            fields.append("1")
+        elif latch.init is None:
+            fields.append(str(cur))
+        lines.append(" ".join(fields))
+    lines.extend(str(lit) for _index, lit in outputs)
+
+    first_and = num_inputs + num_latches + 1
+    with _open_binary(target, "wb") as f:
+        if binary:
+            f.write(("\n".join(lines) + "\n").encode("ascii"))
+            f.write(_encode_ands(ands, first_and))
+            lines = []
+        else:
+            lines.extend(f"{(first_and + k) << 1} {la} {lb}" for k, (la, lb) in enumerate(ands))
+        if symbols:
+            # Tên trùng tên mặc định khi đọc (i<k>, l<k>, o<k>) không cần ghi
+            lines.extend(f"i{k} {name}" for k, (name, _node) in enumerate(inputs) if name != f"i{k}")
+            lines.extend(f"l{k} {latch.name}" for k, latch in enumerate(latches) if latch.name != f"l{k}")
+            if output_names is not None:
+                lines.extend(f"o{k} {output_names[index]}" for k, (index, _lit) in enumerate(outputs)
+                             if index < len(output_names) and output_names[index] not in ("", f"o{k}"))
+        if comments:
+            lines.append("c")
+            lines.extend(comments)
+        if lines:
+            f.write(("\n".join(lines) + "\n").encode("utf-8"))
+    return header
+
+
+def _encode_ands(ands: List[Tuple[int, int]], first_and: int) -> bytes:
+    """Phần AND của binary AIGER: hai delta mỗi AND, varint 7 bit/byte (little-endian)."""
+    out = bytearray()
+    append = out.append
+    lhs = first_and << 1
+    for la, lb in ands:
+        for delta in (lhs - la, la - lb):
+            while delta >= 0x80:
+                append((delta & 0x7F) | 0x80)
+                delta >>= 7
+            append(delta)
+        lhs += 2
+    return bytes(out)
+
+
+# ------------------------------------------------------------------ reader
+
+class _Reader:
+    """Con trỏ trên nội dung file (bytes) — đọc dòng / varint."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def line(self) -> Optional[str]:
+        data = self.data
+        if self.pos >= len(data):
+            return None
+        end = data.find(b"\n", self.pos)
+        if end < 0:
+            end = len(data)
+        text = data[self.pos:end].decode("utf-8", errors="replace").rstrip("\r")
+        self.pos = end + 1
+        return text
+
+    def numbers(self, count: int, what: str) -> List[int]:
+        text = self.line()
+        try:
+            values = [int(x) for x in (text or "").split()]
+        except ValueError:
+            values = []
+        if not values or len(values) > count:
+            raise ValueError(f"Invalid AIGER {what} line: {text!r}")
+        return values
+
+
+def _decode_ands(data: bytes, pos: int, count: int, first_and: int) -> Tuple[List[Tuple[int, int, int]], int]:
+    """Giải mã ``count`` AND binary bắt đầu tại ``pos``; trả về ``[(lhs, rhs0, rhs1)]`` và vị trí kết thúc."""
+    ands = []
+    append = ands.append
+    lhs = first_and << 1
+    try:
+        for _ in range(count):
+            byte = data[pos]
+            pos += 1
+            d0 = byte
+            if byte & 0x80:
+                d0 &= 0x7F
+                shift = 7
+                while True:
+                    byte = data[pos]
+                    pos += 1
+                    d0 |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        break
+                    shift += 7
+            byte = data[pos]
+            pos += 1
+            d1 = byte
+            if byte & 0x80:
+                d1 &= 0x7F
+                shift = 7
+                while True:
+                    byte = data[pos]
+                    pos += 1
+                    d1 |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        break
+                    shift += 7
+            rhs0 = lhs - d0
+            append((lhs, rhs0, rhs0 - d1))
+            lhs += 2
+    except IndexError:
+        raise ValueError("Truncated AIGER file: AND section ended early") from None
+    return ands, pos
+
+
+def _topological_ands(ands: List[Tuple[int, int, int]], defined: int) -> List[Tuple[int, int, int]]:
+    """
+    AND của file ASCII theo thứ tự phụ thuộc (file ``aag`` không bắt buộc thứ tự
+    topo). ``defined``: biến ≤ ``defined`` là input/latch.
+    """
+    if all(max(r0, r1) < lhs for lhs, r0, r1 in ands) and \
+            all(ands[k][0] < ands[k + 1][0] for k in range(len(ands) - 1)):
+        return ands
+    by_var = {}
+    for entry in ands:
+        if entry[0] & 1 or (entry[0] >> 1) in by_var:
+            raise ValueError(f"Invalid AIGER AND definition: {entry}")
+        by_var[entry[0] >> 1] = entry
+    order: List[Tuple[int, int, int]] = []
+    done = set()
+    for root in by_var:
+        if root in done:
+            continue
+        stack = [(root, False)]
+        active = set()
+        while stack:
+            var, expanded = stack.pop()
+            if var in done:
+                continue
+            if expanded:
+                active.discard(var)
+                done.add(var)
+                order.append(by_var[var])
+                continue
+            if var in active:
+                raise ValueError(f"Combinational cycle in AIGER file through variable {var}")
+            active.add(var)
+            stack.append((var, True))
+            for lit in by_var[var][1:]:
+                child = lit >> 1
+                if child > defined and child not in done:
+                    if child not in by_var:
+                        raise ValueError(f"AIGER literal {lit} is never defined")
+                    stack.append((child, False))
+    return order
+
+
+def read_aiger(source, aig_class: Optional[type] = None) -> AigerModel:
+    """
+    Đọc file AIGER (``aag``/``aig``, nhận dạng theo header) thành ``AigerModel``.
+
+    Args:
+        source: đường dẫn, file object binary, hoặc nội dung ``bytes``
+        aig_class: lớp AIG cần dựng (``AIG`` mặc định, hoặc ``ArrayAIG``)
+    """
+    if isinstance(source, (bytes, bytearray)):
+        data = bytes(source)
+    else:
+        with _open_binary(source, "rb") as f:
+            data = f.read()
+    reader = _Reader(data)
+    fields = (reader.line() or "").split()
+    if not fields or fields[0] not in ("aag", "aig") or not 6 <= len(fields) <= 10:
+        raise ValueError(f"Not an AIGER file (header {' '.join(fields)!r})")
+    binary = fields[0] == "aig"
+    try:
+        numbers = [int(x) for x in fields[1:]] + [0] * (10 - len(fields))
+    except ValueError:
+        raise ValueError(f"Invalid AIGER header: {' '.join(fields)!r}") from None
+    max_var, num_in, num_latch, num_out, num_and, num_bad, num_cons, num_just, num_fair = numbers
+    if num_just or num_fair:
+        raise ValueError("AIGER justice/fairness properties are not supported")
+    if binary and max_var != num_in + num_latch + num_and:
+        raise ValueError(f"Invalid binary AIGER header: M={max_var} != I+L+A")
+
+    input_lits = [2 * (k + 1) for k in range(num_in)]
+    if not binary:
+        input_lits = [reader.numbers(1, "input")[0] for _ in range(num_in)]
+    latch_rows = []  # (cur, next, init literal)
+    for k in range(num_latch):
+        if binary:
+            values = [2 * (num_in + k + 1)] + reader.numbers(2, "latch")
+        else:
+            values = reader.numbers(3, "latch")
+            if len(values) < 2:
+                raise ValueError(f"Invalid AIGER latch line: {values}")
+        latch_rows.append((values[0], values[1], values[2] if len(values) > 2 else 0))
+    output_lits = [reader.numbers(1, "output")[0] for _ in range(num_out + num_bad + num_cons)]
+
+    first_and = num_in + num_latch + 1
+    if binary:
+        ands, reader.pos = _decode_ands(data, reader.pos, num_and, first_and)
+    else:
+        ands = []
+        for _ in range(num_and):
+            values = reader.numbers(3, "AND")
+            if len(values) != 3:
+                raise ValueError(f"Invalid AIGER AND line: {values}")
+            ands.append(tuple(values))
+        ands = _topological_ands(ands, num_in + num_latch)
+
+    # Bảng symbol + comment
+    symbols: Dict[str, Dict[int, str]] = {"i": {}, "l": {}, "o": {}, "b": {}, "c": {}}
+    comments: List[str] = []
+    while True:
+        text = reader.line()
+        if text is None:
+            break
+        if text == "c":
+            rest = reader.data[reader.pos:].decode("utf-8", errors="replace")
+            comments = rest.splitlines()
+            break
+        kind, _sep, rest = text.partition(" ")
+        if kind[:1] in symbols and kind[1:].isdigit() and rest:
+            symbols[kind[:1]][int(kind[1:])] = rest
+        elif text.strip():
+            raise ValueError(f"Invalid AIGER symbol line: {text!r}")
+
+    aig = (aig_class or AIG)()
+    nodes = aig.nodes
+    # Biến AIGER → literal AIG; biến 0 = CONST0 (node 0)
+    lit_map = [-1] * (max_var + 1)
+    lit_map[0] = aig.const0.node_id << 1
+    used = set()
+
+    def fresh(name: Optional[str], default: str) -> str:
+        name = name or default
+        if name in used or name in aig.pis:
+            base, n = name, 1
+            while name in used or name in aig.pis:
+                name = f"{base}_{n}"
+                n += 1
+        used.add(name)
+        return name
+
+    def literal(lit: int) -> int:
+        mapped = lit_map[lit >> 1] if (lit >> 1) <= max_var else -1
+        if mapped < 0:
+            raise ValueError(f"AIGER literal {lit} is never defined")
+        return mapped ^ (lit & 1)
+
+    for k, lit in enumerate(input_lits):
+        if lit & 1 or lit < 2 or (lit >> 1) > max_var or lit_map[lit >> 1] >= 0:
+            raise ValueError(f"Invalid AIGER input literal {lit}")
+        lit_map[lit >> 1] = aig.create_pi(fresh(symbols["i"].get(k), f"i{k}")).node_id << 1
+    latch_names = []
+    for k, (cur, _nxt, _init) in enumerate(latch_rows):
+        if cur & 1 or cur < 2 or (cur >> 1) > max_var or lit_map[cur >> 1] >= 0:
+            raise ValueError(f"Invalid AIGER latch literal {cur}")
+        name = fresh(symbols["l"].get(k), f"l{k}")
+        latch_names.append(name)
+        lit_map[cur >> 1] = aig.create_pi(name).node_id << 1
+
+    create_and_lit = aig.create_and_lit
+    for lhs, rhs0, rhs1 in ands:
+        var = lhs >> 1
+        if lhs & 1 or var > max_var or lit_map[var] >= 0:
+            raise ValueError(f"Invalid AIGER AND literal {lhs}")
+        lit_map[var] = create_and_lit(literal(rhs0), literal(rhs1))
+
+    output_names = []
+    for k, lit in enumerate(output_lits):
+        mapped = literal(lit)
+        aig.add_po(nodes[mapped >> 1], bool(mapped & 1))
+        if k < num_out:
+            output_names.append(symbols["o"].get(k) or f"o{k}")
+        elif k < num_out + num_bad:
+            output_names.append(symbols["b"].get(k - num_out) or f"bad{k - num_out}")
+        else:
+            output_names.append(symbols["c"].get(k - num_out - num_bad) or f"constraint{k - num_out - num_bad}")
+
+    latches = []
+    for (cur, nxt, init), name in zip(latch_rows, latch_names):
+        mapped = literal(nxt)
+        aig.add_po(nodes[mapped >> 1], bool(mapped & 1))
+        latches.append(AigerLatch(name, len(aig.pos) - 1, init if init in (0, 1) else None))
+        output_names.append(f"{name}_next")
+
+    header = AigerHeader(max_var, num_in, num_latch, num_out, num_and)
+    return AigerModel(aig, output_names, latches, comments, header)
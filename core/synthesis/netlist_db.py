@@ -0,0 +1,332 @@
+"""
+NetlistDB — lớp chỉ mục trên netlist dictionary (output của parser / ``to_netlist``).
+
+Các pass trên netlist (dce, cse, constprop, balance, strash) từng tìm driver bằng
+cách quét toàn bộ ``nodes`` cho từng fanin (O(n²) trên netlist 10k node).
+``NetlistDB`` đánh chỉ mục một lần:
+
+- ``nodes``: id → node (bản sao nông của từng node, giữ thứ tự gốc);
+- net của tín hiệu: tên tín hiệu → id node lái (chính id node, ``output`` của
+  node, ``attrs.output_mapping``); PI và tín hiệu không có driver là net của chính nó;
+- fanout: net → {id node dùng: số chân}.
+
+Tên tín hiệu được ``sys.intern``. Mọi thao tác sửa (``add_node``, ``remove_node``,
+``set_fanins``, ``replace_node``, ``substitute``) cập nhật chỉ mục tại chỗ, nên
+một pass duyệt ``topological_order()`` một lần là tuyến tính. ``to_netlist()`` trả
+về netlist dictionary cùng định dạng (``nodes`` list hoặc dict, ``wires`` đã lọc
+và nối lại, ``output_mapping`` đã cập nhật).
+
+Example:
+    >>> db = NetlistDB(netlist)
+    >>> db.driver_of("t"), db.fanouts("t")
+    ('xor_1', ['xor_2', 'and_4'])
+    >>> db.substitute("and_4", "and_3")
+    True
+    >>> optimized = db.to_netlist()
+"""
+
+import sys
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+_intern = sys.intern
+
+FaninPairs = List[Tuple[str, bool]]
+
+
+def fanin_pairs(node: Dict[str, Any]) -> FaninPairs:
+    """Fanin của node dạng ``[(signal, inverted), ...]`` (từ ``fanins`` hoặc ``inputs``)."""
+    raw = node.get("fanins") or node.get("inputs") or []
+    pairs: FaninPairs = []
+    for fanin in raw:
+        if isinstance(fanin, (list, tuple)):
+            if fanin:
+                pairs.append((str(fanin[0]), bool(fanin[1]) if len(fanin) > 1 else False))
+        else:
+            pairs.append((str(fanin), False))
+    return pairs
+
+
+def store_fanins(node: Dict[str, Any], pairs: Sequence[Tuple[str, bool]]) -> None:
+    """Ghi ``pairs`` vào node theo định dạng sẵn có; cạnh đảo buộc dùng ``fanins``."""
+    if "fanins" in node or any(inv for _sig, inv in pairs):
+        node["fanins"] = [[sig, inv] for sig, inv in pairs]
+    if "inputs" in node or "fanins" not in node:
+        node["inputs"] = [sig for sig, _inv in pairs]
+
+
+class NetlistDB:
+    """Netlist dictionary có chỉ mục driver / fanout, sửa tại chỗ."""
+
+    def __init__(self, netlist: Dict[str, Any]):
+        self.netlist = netlist
+        nodes_any = netlist.get("nodes", {})
+        self.dict_format = isinstance(nodes_any, dict)
+        items = nodes_any.items() if self.dict_format else enumerate(nodes_any or [])
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        for key, node in items:
+            if not isinstance(node, dict):
+                continue
+            node_id = _intern(str(key if self.dict_format else node.get("id", key)))
+            node = dict(node)
+            if not self.dict_format and "id" not in node:
+                node["id"] = node_id
+            self.nodes[node_id] = node
+
+        self.inputs: List[str] = [_intern(s) for s in netlist.get("inputs", []) or [] if isinstance(s, str)]
+        self.outputs: List[str] = [_intern(s) for s in netlist.get("outputs", []) or [] if isinstance(s, str)]
+        self._input_set: Set[str] = set(self.inputs)
+        self._output_set: Set[str] = set(self.outputs)
+        attrs = netlist.get("attrs", {}) or {}
+        self.output_mapping: Dict[str, Any] = dict(attrs.get("output_mapping", {}) or {})
+
+        self._net: Dict[str, str] = {}  # tên tín hiệu (khác id node) → net
+        self._aliases: Dict[str, List[str]] = {}  # id node → các tên trỏ tới nó
+        self._fanouts: Dict[str, Dict[str, int]] = {}  # net → {id node dùng: số chân}
+        self._dead: Set[str] = set()  # id node đã xóa / thay thế (lọc wires)
+        self._counter = 0
+
+        for node_id, node in self.nodes.items():
+            out = node.get("output")
+            if isinstance(out, str) and out and out != node_id:
+                self._alias(_intern(out), node_id)
+        # output_mapping thắng ``output`` của node (parser ghi assign sau cùng vào đây)
+        for sig, node_id in self.output_mapping.items():
+            if isinstance(node_id, str) and node_id in self.nodes and sig != node_id:
+                self._alias(_intern(sig), node_id)
+
+        for node_id, node in self.nodes.items():
+            pairs = fanin_pairs(node)
+            if not pairs:
+                continue
+            pairs = [(_intern(sig), inv) for sig, inv in pairs]
+            if node.get("fanins"):
+                node["fanins"] = [[sig, inv] for sig, inv in pairs]
+            elif all(isinstance(f, str) for f in node["inputs"]):
+                node["inputs"] = [sig for sig, _inv in pairs]
+            for sig, _inv in pairs:
+                self._link(self.net(sig), node_id)
+
+    # -------------------------------------------------------------- tra cứu
+
+    def net(self, signal: str) -> str:
+        """Net của tín hiệu: id node lái, hoặc chính tên (PI / không có driver)."""
+        if signal in self._input_set:
+            return signal
+        return self._net.get(signal, signal)
+
+    def driver_of(self, signal: str) -> Optional[str]:
+        """Id node lái ``signal``; None với PI, hằng và tín hiệu không có driver."""
+        net = self.net(signal)
+        return net if net in self.nodes else None
+
+    def fanouts(self, signal: str) -> List[str]:
+        """Các node (không trùng, theo thứ tự nối) dùng ``signal`` làm fanin."""
+        return list(self._fanouts.get(self.net(signal), ()))
+
+    def fanout_count(self, signal: str) -> int:
+        """Số chân fanin nối vào net của ``signal``."""
+        return sum(self._fanouts.get(self.net(signal), {}).values())
+
+    def is_primary_input(self, signal: str) -> bool:
+        return signal in self._input_set
+
+    def is_primary_output(self, signal: str) -> bool:
+        return signal in self._output_set
+
+    def aliases(self, node_id: str) -> List[str]:
+        """Các tên tín hiệu (ngoài id) trỏ tới node."""
+        return list(self._aliases.get(node_id, ()))
+
+    def drives_output(self, node_id: str) -> bool:
+        return node_id in self._output_set or any(a in self._output_set for a in self._aliases.get(node_id, ()))
+
+    def fanin_nets(self, node_id: str) -> Iterator[Tuple[str, bool]]:
+        net = self.net
+        for sig, inv in fanin_pairs(self.nodes[node_id]):
+            yield net(sig), inv
+
+    def topological_order(self) -> List[str]:
+        """Id node theo thứ tự topo (Kahn, fanin trước); node trong vòng nối thêm ở cuối."""
+        nodes = self.nodes
+        indegree: Dict[str, int] = {}
+        for node_id in nodes:
+            count = 0
+            for net, _inv in self.fanin_nets(node_id):
+                if net in nodes and net != node_id:
+                    count += 1
+            indegree[node_id] = count
+        ready = deque(node_id for node_id, count in indegree.items() if count == 0)
+        order: List[str] = []
+        while ready:
+            node_id = ready.popleft()
+            order.append(node_id)
+            for consumer, pins in self._fanouts.get(node_id, {}).items():
+                if consumer == node_id:
+                    continue
+                left = indegree[consumer] - pins
+                indegree[consumer] = left
+                if left == 0:
+                    ready.append(consumer)
+        if len(order) < len(nodes):
+            placed = set(order)
+            order.extend(node_id for node_id in nodes if node_id not in placed)
+        return order
+
+    # ----------------------------------------------------------------- sửa
+
+    def new_id(self, prefix: str) -> str:
+        """Id node mới chưa dùng dạng ``<prefix>_<k>``."""
+        while True:
+            candidate = f"{prefix}_{self._counter}"
+            self._counter += 1
+            if candidate not in self.nodes and candidate not in self._net and candidate not in self._input_set:
+                return _intern(candidate)
+
+    def add_node(self, node: Dict[str, Any], node_id: Optional[str] = None) -> str:
+        node_id = _intern(node_id or node.get("id") or self.new_id(str(node.get("type", "node")).lower()))
+        if node_id in self.nodes:
+            raise ValueError(f"Node {node_id!r} already exists")
+        if not self.dict_format:
+            node["id"] = node_id
+        self.nodes[node_id] = node
+        self._dead.discard(node_id)
+        out = node.get("output")
+        if isinstance(out, str) and out and out != node_id:
+            self._alias(_intern(out), node_id)
+        for sig, _inv in fanin_pairs(node):
+            self._link(self.net(sig), node_id)
+        return node_id
+
+    def remove_node(self, node_id: str) -> None:
+        """Xóa node; tên trỏ tới nó không còn driver (node dùng nó do caller xử lý)."""
+        node = self.nodes.pop(node_id)
+        for sig, _inv in fanin_pairs(node):
+            self._unlink(self.net(sig), node_id)
+        for alias in self._aliases.pop(node_id, ()):
+            self._net.pop(alias, None)
+            if self.output_mapping.get(alias) == node_id:
+                del self.output_mapping[alias]
+        self._dead.add(node_id)
+
+    def set_fanins(self, node_id: str, pairs: Sequence[Tuple[str, bool]]) -> None:
+        node = self.nodes[node_id]
+        for sig, _inv in fanin_pairs(node):
+            self._unlink(self.net(sig), node_id)
+        store_fanins(node, [(_intern(sig), inv) for sig, inv in pairs])
+        for sig, _inv in pairs:
+            self._link(self.net(sig), node_id)
+
+    def replace_node(self, node_id: str, node: Dict[str, Any]) -> None:
+        """Thay nội dung node (giữ id và các tên trỏ tới nó)."""
+        old = self.nodes[node_id]
+        for sig, _inv in fanin_pairs(old):
+            self._unlink(self.net(sig), node_id)
+        if not self.dict_format:
+            node["id"] = node_id
+        self.nodes[node_id] = node
+        for sig, _inv in fanin_pairs(node):
+            self._link(self.net(sig), node_id)
+
+    def substitute(self, node_id: str, signal: str, inverted: bool = False) -> bool:
+        """
+        Thay mọi chỗ dùng ``node_id`` bằng ``signal`` (đảo nếu ``inverted``) rồi xóa node.
+
+        Fanin của node dùng được viết lại, ``output_mapping`` của các tên trỏ tới
+        node chuyển sang net của ``signal``. Trả về False (không sửa gì) nếu
+        ``signal`` là chính node, hoặc cần đảo mà node lái PO (``output_mapping``
+        không biểu diễn được cạnh đảo). Caller bảo đảm ``signal`` không nằm trong
+        fanout cone của node (ví dụ duyệt theo ``topological_order()``).
+        """
+        target = self.net(signal)
+        if target == node_id or node_id not in self.nodes:
+            return False
+        if inverted and self.drives_output(node_id):
+            return False
+        signal = _intern(signal)
+        consumers = self._fanouts.pop(node_id, {})
+        net = self.net
+        for consumer, pins in consumers.items():
+            node = self.nodes[consumer]
+            store_fanins(node, [(signal, inv != inverted) if net(sig) == node_id else (sig, inv)
+                                for sig, inv in fanin_pairs(node)])
+            fanouts = self._fanouts.setdefault(target, {})
+            fanouts[consumer] = fanouts.get(consumer, 0) + pins
+
+        names = self._aliases.pop(node_id, [])
+        names.append(node_id)
+        target_aliases = self._aliases.setdefault(target, []) if target in self.nodes else None
+        for name in names:
+            self._net[name] = target
+            if target_aliases is not None:
+                target_aliases.append(name)
+            if self.output_mapping.get(name) == node_id:
+                self.output_mapping[name] = target
+        for sig, _inv in fanin_pairs(self.nodes.pop(node_id)):
+            self._unlink(net(sig), node_id)
+        self._dead.add(node_id)
+        return True
+
+    # ------------------------------------------------------------- xuất ra
+
+    def to_netlist(self) -> Dict[str, Any]:
+        """Netlist dictionary mới (bản sao nông của netlist gốc với nodes / wires / attrs đã cập nhật)."""
+        out = dict(self.netlist)
+        out["nodes"] = dict(self.nodes) if self.dict_format else list(self.nodes.values())
+        attrs = dict(out.get("attrs", {}) or {})
+        attrs["output_mapping"] = self.output_mapping
+        out["attrs"] = attrs
+        wires = self.netlist.get("wires")
+        if isinstance(wires, dict):
+            out["wires"] = {k: w for k, w in ((k, self._wire(w)) for k, w in wires.items()) if w is not None}
+        elif isinstance(wires, list):
+            out["wires"] = [w for w in map(self._wire, wires) if w is not None]
+        return out
+
+    def _wire(self, wire: Any) -> Any:
+        """Wire sau khi sửa: None nếu đích đã bị xóa, nguồn thay thế thì nối lại."""
+        if not isinstance(wire, dict):
+            return wire
+        dead = self._dead
+        dst_key = "destination" if "destination" in wire else "sink"
+        dst = wire.get(dst_key)
+        if dst in dead:
+            return None
+        src = wire.get("source")
+        if src in dead:
+            replacement = self._net.get(src)
+            if replacement is None:
+                return None
+            wire = dict(wire)
+            wire["source"] = replacement
+        return wire
+
+    # ------------------------------------------------------------ nội bộ
+
+    def _alias(self, name: str, node_id: str) -> None:
+        previous = self._net.get(name)
+        if previous == node_id:
+            return
+        if previous is not None and previous in self._aliases:
+            self._aliases[previous].remove(name)
+        self._net[name] = node_id
+        self._aliases.setdefault(node_id, []).append(name)
+
+    def _link(self, net: str, node_id: str) -> None:
+        fanouts = self._fanouts.get(net)
+        if fanouts is None:
+            self._fanouts[net] = {node_id: 1}
+        else:
+            fanouts[node_id] = fanouts.get(node_id, 0) + 1
+
+    def _unlink(self, net: str, node_id: str) -> None:
+        fanouts = self._fanouts.get(net)
+        if not fanouts or node_id not in fanouts:
+            return
+        left = fanouts[node_id] - 1
+        if left:
+            fanouts[node_id] = left
+        else:
+            del fanouts[node_id]
+            if not fanouts:
+                del self._fanouts[net]
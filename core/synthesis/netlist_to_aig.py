@@ -11,16 +11,99 @@ Synthesis chỉ làm việc chuyển đổi representation, không tối ưu hó
 import sys
 import os
 import re
-from typing import Dict, List, Set, Any, Optional
+import time
+from typing import Dict, List, Set, Any, Optional, Tuple
 import logging
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.synthesis.aig import AIG, AIGNode
 from core.synthesis.aig_multibit import MultiBitAIGNode, create_constant_multibit, parse_constant_string
+from core.utils.performance import get_tracer, trace_span
 
 logger = logging.getLogger(__name__)
 
+_BIT_REF_PATTERN = re.compile(r"^([A-Za-z_]\w*)\[(\d+)\]$")
+
+
+class _ModuleTemplate:
+    """
+    AIG của một ``module_key`` (module con, một bộ tham số) đã synthesize một
+    lần, lưu dạng chương trình literal trên các slot: chép cho mỗi instance là
+    một lần ``create_and_program``, không convert lại netlist con.
+
+    Slot 0/1 là hằng, tiếp theo các PI dùng tới (bit của input port hoặc net
+    thả nổi), sau đó mỗi AND node trong cone của PO theo thứ tự topo.
+    """
+
+    def __init__(self, converter: 'NetlistToAIGConverter', netlist: Dict[str, Any]):
+        aig = converter.aig
+        nodes = aig.nodes
+        widths = (netlist.get('attrs', {}) or {}).get('vector_widths', {}) or {}
+
+        # PI của port: "p" (1 bit) hoặc "p[i]"; PI "p" của vector dùng như bit 0
+        port_bits: Dict[str, Tuple[str, int]] = {}
+        for port in netlist.get('inputs', []):
+            width = widths.get(port, 1) or 1
+            port_bits[port] = (port, 0)
+            if width > 1:
+                for i in range(width):
+                    port_bits[f"{port}[{i}]"] = (port, i)
+
+        # Cone của các PO (node id tăng theo thứ tự tạo = thứ tự topo ở chế độ RAW)
+        reachable: Set[int] = set()
+        stack = [po.node_id for po, _inv in aig.pos]
+        while stack:
+            node_id = stack.pop()
+            if node_id in reachable:
+                continue
+            reachable.add(node_id)
+            node = nodes[node_id]
+            if node.is_and():
+                stack.append(node.left.node_id)
+                stack.append(node.right.node_id)
+
+        slots: Dict[int, int] = {aig.const0.node_id: 0, aig.const1.node_id: 1}
+        self.inputs: List[Tuple[str, int, int]] = []      # (port, bit, slot)
+        self.free_inputs: List[Tuple[int, str]] = []     # (slot, tên PI) - net không phải port
+        for name, pi in aig.pis.items():
+            if pi.node_id in reachable:
+                slot = slots[pi.node_id] = len(slots)
+                if name in port_bits:
+                    self.inputs.append(port_bits[name] + (slot,))
+                else:
+                    self.free_inputs.append((slot, name))
+        self.first_op = len(slots)
+        self.ops: List[Tuple[int, int]] = []
+        for node_id in sorted(reachable):
+            node = nodes[node_id]
+            if node.is_and():
+                self.ops.append(((slots[node.left.node_id] << 1) | int(bool(node.left_inverted)),
+                                 (slots[node.right.node_id] << 1) | int(bool(node.right_inverted))))
+                slots[node_id] = len(slots)
+        self.outputs: Dict[str, List[int]] = {
+            port: [(slots[po.node_id] << 1) | int(bool(inv)) for po, inv in aig.pos[start:end]]
+            for port, (start, end) in converter.output_ranges.items()
+        }
+
+    def instantiate(self, aig: Any, inputs: Dict[str, List[AIGNode]], prefix: str) -> Dict[str, List[int]]:
+        """
+        Chép AIG vào ``aig`` với bit input của instance; trả về literal (node_id * 2
+        + inverted, trong ``aig``) của từng bit output port. Bit input không nối
+        thành PI ``<prefix>.<port>[i]``, net thả nổi thành PI ``<prefix>.<tên>``.
+        """
+        lits = [0] * self.first_op
+        lits[0] = aig.const0.node_id << 1
+        lits[1] = aig.const1.node_id << 1
+        for port, bit, slot in self.inputs:
+            bits = inputs.get(port)
+            node = bits[bit] if bits and bit < len(bits) else aig.create_pi(f"{prefix}.{port}[{bit}]")
+            lits[slot] = node.node_id << 1
+        for slot, name in self.free_inputs:
+            lits[slot] = aig.create_pi(f"{prefix}.{name}").node_id << 1
+        aig.create_and_program(lits, self.ops)
+        return {port: [lits[lit >> 1] ^ (lit & 1) for lit in out] for port, out in self.outputs.items()}
+
 
 class NetlistToAIGConverter:
     """
@@ -29,7 +112,9 @@ class NetlistToAIGConverter:
     Đây là bước SYNTHESIS: chuyển đổi representation từ netlist sang AIG.
     """
     
-    def __init__(self):
+    def __init__(self, aig_class: Optional[type] = None):
+        # aig_class: AIG (mặc định) hoặc ArrayAIG (core/synthesis/aig_array.py)
+        self.aig_class = aig_class or AIG
         self.aig = None
         self.netlist = None
         self.node_mapping: Dict[str, AIGNode] = {}  # netlist_node_id -> AIGNode
@@ -37,6 +122,10 @@ class NetlistToAIGConverter:
         self.multibit_signal_mapping: Dict[str, MultiBitAIGNode] = {}  # signal_name -> MultiBitAIGNode
         self._strict_synthesis: bool = False
         self._rev_output_mapping: Dict[str, str] = {}
+        # Module con (attrs['hierarchy'] của top): synthesize mỗi module_key một lần
+        self._hierarchy: Dict[str, Dict[str, Any]] = {}
+        self._templates: Dict[str, _ModuleTemplate] = {}
+        self.output_ranges: Dict[str, Tuple[int, int]] = {}  # output port -> slice của aig.pos
         
     def convert(self, netlist: Dict[str, Any]) -> AIG:
         """
@@ -57,30 +146,38 @@ class NetlistToAIGConverter:
         # - Không structural hashing/merge node trong bước synthesis
         # - Không fold hằng số trong create_and
         # Mục tiêu: chỉ chuyển representation, để optimize mới thực sự rút gọn.
-        self.aig = AIG(enable_strash=False, enable_const_simplify=False)
+        self.aig = self.aig_class(enable_strash=False, enable_const_simplify=False)
         self.netlist = netlist
         self._strict_synthesis = bool((netlist.get("attrs", {}) or {}).get("strict_synthesis", False))
         self.node_mapping = {}
         self.signal_mapping = {}
         self.multibit_signal_mapping = {}
         self._rev_output_mapping = {}
+        self.output_ranges = {}
+        hierarchy = (netlist.get("attrs", {}) or {}).get("hierarchy")
+        if hierarchy:
+            self._hierarchy = hierarchy
         outmap = (netlist.get("attrs", {}) or {}).get("output_mapping", {}) or {}
         if isinstance(outmap, dict):
             for sig, nid in outmap.items():
                 if isinstance(nid, str) and nid:
                     self._rev_output_mapping[nid] = str(sig)
         
-        # Bước 1: Tạo Primary Inputs
-        self._create_primary_inputs(netlist)
-        
-        # Bước 2: Tạo Constant nodes
-        self._create_constants(netlist)
-        
-        # Bước 3: Convert nodes theo topological order
-        self._convert_nodes(netlist)
-        
-        # Bước 4: Tạo Primary Outputs
-        self._create_primary_outputs(netlist)
+        with trace_span("synthesis", category="synthesis",
+                        netlist_nodes=len(netlist.get('nodes') or [])) as span:
+            # Bước 1: Tạo Primary Inputs
+            self._create_primary_inputs(netlist)
+            
+            # Bước 2: Tạo Constant nodes
+            self._create_constants(netlist)
+            
+            # Bước 3: Convert nodes theo topological order (span gộp theo loại node)
+            with trace_span("synthesis.nodes", category="synthesis"):
+                self._convert_nodes(netlist)
+            
+            # Bước 4: Tạo Primary Outputs
+            self._create_primary_outputs(netlist)
+            span.set(aig_nodes=self.aig.count_nodes())
         
         logger.info(f"Synthesis completed: {self.aig.count_nodes()} AIG nodes created")
         
@@ -128,6 +225,12 @@ class NetlistToAIGConverter:
         """Sắp xếp nodes theo thứ tự topo (dependency trước)."""
         node_ids = {n.get('id', ''): n for n in nodes_list if isinstance(n, dict)}
         node_ids_set = set(node_ids)
+        # Vector lái theo bit (output của các instance khác nhau): đọc cả vector phụ thuộc mọi driver
+        bit_drivers: Dict[str, Set[str]] = {}
+        for sig, driver in output_mapping.items():
+            m = _BIT_REF_PATTERN.match(sig)
+            if m and m.group(1) not in output_mapping:
+                bit_drivers.setdefault(m.group(1), set()).add(driver)
         # deps[node_id] = set of node_ids that must be converted before this node
         deps = {}
         for n in nodes_list:
@@ -147,6 +250,8 @@ class NetlistToAIGConverter:
                     deps[nid].add(s)
                 elif s in output_mapping and output_mapping[s] != nid:
                     deps[nid].add(output_mapping[s])
+                elif s in bit_drivers:
+                    deps[nid].update(bit_drivers[s] - {nid})
         result = []
         remaining = set(deps)
         while remaining:
@@ -173,126 +278,220 @@ class NetlistToAIGConverter:
         output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
         nodes_list = self._topological_order(nodes_list, output_mapping)
         
+        tracer = get_tracer()
         for node_data in nodes_list:
-            if not isinstance(node_data, dict):
-                continue
-            
-            node_id = node_data.get('id', '')
-            node_type = node_data.get('type', '')
-            
-            # Skip constants (already handled)
-            if node_type in ['CONST0', 'CONST1', 'GND', 'VCC', '0', '1', 'INPUT', 'OUTPUT']:
+            if tracer is None:
+                self._convert_node(netlist, node_data)
                 continue
-            
-            # Convert based on node type (BUF handled below for multibit pass-through)
-            if node_type in ['AND', 'OR', 'XOR', 'NAND', 'NOR', 'XNOR', 'NOT']:
-                aig_node = self._convert_gate_node(node_data)
-                if aig_node:
-                    self.node_mapping[node_id] = aig_node
-                    
-                    # Get output signal from node data or output_mapping
-                    output = node_data.get('output', None)
-                    if not output:
-                        # Check output_mapping to find output signal for this node
-                        output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
-                        # Find signal that maps to this node_id
-                        for signal, mapped_node_id in output_mapping.items():
-                            if mapped_node_id == node_id:
-                                output = signal
-                                break
-                    
-                    # Fallback to node_id if still no output found
-                    if not output:
-                        output = node_id
-                    
-                    if output:
-                        self.signal_mapping[output] = aig_node
-            
-            # Arithmetic operations (multi-bit)
-            elif node_type == 'ADD':
-                multi_bit_node = self._convert_add_node(node_data)
-                if multi_bit_node:
-                    output = node_data.get('output', None)
-                    if not output:
-                        output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
-                        for sig, mapped_id in output_mapping.items():
-                            if mapped_id == node_id:
-                                output = sig
-                                break
-                    if not output:
-                        output = node_id
-                    if output:
-                        self.multibit_signal_mapping[output] = multi_bit_node
-                        # Also store individual bits in signal_mapping for compatibility
-                        for i, bit_node in enumerate(multi_bit_node.bits):
-                            bit_name = f"{output}[{i}]" if multi_bit_node.width > 1 else output
-                            self.signal_mapping[bit_name] = bit_node
-                        # Store reference to first bit for node_mapping
-                        if multi_bit_node.width > 0:
-                            self.node_mapping[node_id] = multi_bit_node.bits[0]
-            
-            elif node_type == 'SUB':
-                multi_bit_node = self._convert_sub_node(node_data)
+            # Tracing: thời gian convert gộp theo loại node (span con ``synthesis.<TYPE>``)
+            start = time.perf_counter()
+            self._convert_node(netlist, node_data)
+            node_type = node_data.get('type', '') if isinstance(node_data, dict) else ''
+            tracer.accumulate(f"synthesis.{node_type or '?'}", time.perf_counter() - start)
+    
+    def _convert_node(self, netlist: Dict[str, Any], node_data: Any):
+        """Convert một node của netlist sang AIG (theo loại node)."""
+        if not isinstance(node_data, dict):
+            return
+        
+        node_id = node_data.get('id', '')
+        node_type = node_data.get('type', '')
+        
+        # Skip constants (already handled)
+        if node_type in ['CONST0', 'CONST1', 'GND', 'VCC', '0', '1', 'INPUT', 'OUTPUT']:
+            return
+        
+        # Convert based on node type (BUF handled below for multibit pass-through)
+        if node_type in ['AND', 'OR', 'XOR', 'NAND', 'NOR', 'XNOR', 'NOT']:
+            # Get output signal from node data or output_mapping
+            output = node_data.get('output', None)
+            if not output:
+                # Check output_mapping to find output signal for this node
+                output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
+                # Find signal that maps to this node_id
+                for signal, mapped_node_id in output_mapping.items():
+                    if mapped_node_id == node_id:
+                        output = signal
+                        break
+
+            # Output là vector (assign y = ~a; với y [3:0]): gate theo từng bit
+            width = self._get_signal_width(output, 1) if output else 1
+            if width > 1:
+                multi_bit_node = self._convert_gate_vector(node_data, width)
                 if multi_bit_node:
-                    output = node_data.get('output', None)
-                    if not output:
-                        output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
-                        for sig, mapped_id in output_mapping.items():
-                            if mapped_id == node_id:
-                                output = sig
-                                break
-                    if not output:
-                        output = node_id
-                    if output:
-                        self.multibit_signal_mapping[output] = multi_bit_node
-                        for i, bit_node in enumerate(multi_bit_node.bits):
-                            bit_name = f"{output}[{i}]" if multi_bit_node.width > 1 else output
-                            self.signal_mapping[bit_name] = bit_node
-                        if multi_bit_node.width > 0:
-                            self.node_mapping[node_id] = multi_bit_node.bits[0]
-            
-            # Comparison operations (single-bit output)
-            elif node_type == 'EQ':
-                aig_node = self._convert_eq_node(node_data)
-                if aig_node:
-                    self.node_mapping[node_id] = aig_node
-                    output = node_data.get('output', None)
-                    if not output:
-                        output_mapping = netlist.get('attrs', {}).get('output_mapping', {}) or {}
-                        for sig, mapped_id in output_mapping.items():
-                            if mapped_id == node_id:
-                                output = sig
-                                break
-                    if not output:
-                        output = node_id
-                    if output:
-                        self.signal_mapping[output] = aig_node
+                    self.multibit_signal_mapping[output] = multi_bit_node
+                    for i, bit_node in enumerate(multi_bit_node.bits):
+                        self.signal_mapping[f"{output}[{i}]"] = bit_node
+                    self.node_mapping[node_id] = multi_bit_node.bits[0]
+                return
 
-            elif node_type == 'NE':
-                aig_node = self._convert_ne_node(node_data)
-                if aig_node:
-                    self.node_mapping[node_id] = aig_node
-                    output = self._rev_output_mapping.get(node_id) or node_data.get('output') or node_id
+            aig_node = self._convert_gate_node(node_data)
+            if aig_node:
+                self.node_mapping[node_id] = aig_node
+                # Fallback to node_id if no output found
+                self.signal_mapping[output or node_id] = aig_node
+        
+        # Arithmetic operations (multi-bit)
+        elif node_type == 'ADD':
+            multi_bit_node = self._convert_add_node(node_data)
+            if multi_bit_node:
+                output = node_data.get('output', None)
+                if not output:
+                    output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
+                    for sig, mapped_id in output_mapping.items():
+                        if mapped_id == node_id:
+                            output = sig
+                            break
+                if not output:
+                    output = node_id
+                if output:
+                    self.multibit_signal_mapping[output] = multi_bit_node
+                    # Also store individual bits in signal_mapping for compatibility
+                    for i, bit_node in enumerate(multi_bit_node.bits):
+                        bit_name = f"{output}[{i}]" if multi_bit_node.width > 1 else output
+                        self.signal_mapping[bit_name] = bit_node
+                    # Store reference to first bit for node_mapping
+                    if multi_bit_node.width > 0:
+                        self.node_mapping[node_id] = multi_bit_node.bits[0]
+        
+        elif node_type == 'SUB':
+            multi_bit_node = self._convert_sub_node(node_data)
+            if multi_bit_node:
+                output = node_data.get('output', None)
+                if not output:
+                    output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
+                    for sig, mapped_id in output_mapping.items():
+                        if mapped_id == node_id:
+                            output = sig
+                            break
+                if not output:
+                    output = node_id
+                if output:
+                    self.multibit_signal_mapping[output] = multi_bit_node
+                    for i, bit_node in enumerate(multi_bit_node.bits):
+                        bit_name = f"{output}[{i}]" if multi_bit_node.width > 1 else output
+                        self.signal_mapping[bit_name] = bit_node
+                    if multi_bit_node.width > 0:
+                        self.node_mapping[node_id] = multi_bit_node.bits[0]
+        
+        # Comparison operations (single-bit output)
+        elif node_type == 'EQ':
+            aig_node = self._convert_eq_node(node_data)
+            if aig_node:
+                self.node_mapping[node_id] = aig_node
+                output = node_data.get('output', None)
+                if not output:
+                    output_mapping = netlist.get('attrs', {}).get('output_mapping', {}) or {}
+                    for sig, mapped_id in output_mapping.items():
+                        if mapped_id == node_id:
+                            output = sig
+                            break
+                if not output:
+                    output = node_id
+                if output:
                     self.signal_mapping[output] = aig_node
 
-            elif node_type in ('LT', 'LE', 'GT', 'GE'):
-                aig_node = self._convert_rel_node(node_type, node_data)
-                if aig_node:
-                    self.node_mapping[node_id] = aig_node
-                    output = self._rev_output_mapping.get(node_id) or node_data.get('output') or node_id
-                    self.signal_mapping[output] = aig_node
+        elif node_type == 'NE':
+            aig_node = self._convert_ne_node(node_data)
+            if aig_node:
+                self.node_mapping[node_id] = aig_node
+                output = self._rev_output_mapping.get(node_id) or node_data.get('output') or node_id
+                self.signal_mapping[output] = aig_node
 
-            elif node_type in ('LAND', 'LOR'):
-                aig_node = self._convert_logical_node(node_type, node_data)
-                if aig_node:
-                    self.node_mapping[node_id] = aig_node
-                    output = self._rev_output_mapping.get(node_id) or node_data.get('output') or node_id
-                    self.signal_mapping[output] = aig_node
-            
-            # Multiplexer (multi-bit support)
-            elif node_type == 'MUX':
-                multi_bit_node = self._convert_mux_node(node_data)
-                if multi_bit_node:
+        elif node_type in ('LT', 'LE', 'GT', 'GE'):
+            aig_node = self._convert_rel_node(node_type, node_data)
+            if aig_node:
+                self.node_mapping[node_id] = aig_node
+                output = self._rev_output_mapping.get(node_id) or node_data.get('output') or node_id
+                self.signal_mapping[output] = aig_node
+
+        elif node_type in ('LAND', 'LOR'):
+            aig_node = self._convert_logical_node(node_type, node_data)
+            if aig_node:
+                self.node_mapping[node_id] = aig_node
+                output = self._rev_output_mapping.get(node_id) or node_data.get('output') or node_id
+                self.signal_mapping[output] = aig_node
+        
+        # Multiplexer (multi-bit support)
+        elif node_type == 'MUX':
+            multi_bit_node = self._convert_mux_node(node_data)
+            if multi_bit_node:
+                output = node_data.get('output', None)
+                if not output:
+                    output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
+                    for sig, mapped_id in output_mapping.items():
+                        if mapped_id == node_id:
+                            output = sig
+                            break
+                if not output:
+                    output = node_id
+                if output:
+                    self.multibit_signal_mapping[output] = multi_bit_node
+                    for i, bit_node in enumerate(multi_bit_node.bits):
+                        bit_name = f"{output}[{i}]" if multi_bit_node.width > 1 else output
+                        self.signal_mapping[bit_name] = bit_node
+                    if multi_bit_node.width > 0:
+                        self.node_mapping[node_id] = multi_bit_node.bits[0]
+
+        # Concatenation: {a, b, ...} -> multi-bit, first operand is MSB
+        elif node_type == 'CONCAT':
+            multi_bit_node = self._convert_concat_node(node_data)
+            if multi_bit_node:
+                output = node_data.get('output', node_id)
+                if not output:
+                    output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
+                    for sig, mapped_id in output_mapping.items():
+                        if mapped_id == node_id:
+                            output = sig
+                            break
+                if not output:
+                    output = node_id
+                if output:
+                    self.multibit_signal_mapping[output] = multi_bit_node
+                    for i, bit_node in enumerate(multi_bit_node.bits):
+                        bit_name = f"{output}[{i}]" if multi_bit_node.width > 1 else output
+                        self.signal_mapping[bit_name] = bit_node
+                    if multi_bit_node.width > 0:
+                        self.node_mapping[node_id] = multi_bit_node.bits[0]
+
+        # Slice/index: signal[msb:lsb] or signal[idx]
+        elif node_type == 'SLICE':
+            fanins = node_data.get('fanins', [])
+            ops = []
+            for f in fanins:
+                if isinstance(f, (list, tuple)) and len(f) >= 1:
+                    ops.append(str(f[0]))
+                else:
+                    ops.append(str(f))
+            if len(ops) >= 3:
+                sig_name, msb_s, lsb_s = ops[0], ops[1], ops[2]
+                try:
+                    def _eval_idx(s: str) -> int:
+                        ss = s.strip()
+                        try:
+                            return int(ss)
+                        except Exception:
+                            params = (self.netlist or {}).get("attrs", {}).get("parameters", {}) or {}
+                            if ss in params and isinstance(params[ss], int):
+                                return int(params[ss])
+                            # Minimal WIDTH-1 style evaluator
+                            m = re.match(r"^\s*([A-Za-z_]\w*)\s*([-+])\s*(\d+)\s*$", ss)
+                            if m:
+                                base = m.group(1)
+                                op = m.group(2)
+                                k = int(m.group(3))
+                                if base in params and isinstance(params[base], int):
+                                    return int(params[base]) - k if op == "-" else int(params[base]) + k
+                            raise
+
+                    msb_v = _eval_idx(msb_s)
+                    lsb_v = _eval_idx(lsb_s)
+                    l = min(msb_v, lsb_v)
+                    h = max(msb_v, lsb_v)
+                    width = h - l + 1
+                    base_bits = self._get_multi_bit_signal(sig_name, self._get_signal_width(sig_name, h + 1))
+                    slice_bits = base_bits[l:h + 1]
+                    mb = MultiBitAIGNode(width, slice_bits)
                     output = node_data.get('output', None)
                     if not output:
                         output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
@@ -302,196 +501,229 @@ class NetlistToAIGConverter:
                                 break
                     if not output:
                         output = node_id
-                    if output:
-                        self.multibit_signal_mapping[output] = multi_bit_node
-                        for i, bit_node in enumerate(multi_bit_node.bits):
-                            bit_name = f"{output}[{i}]" if multi_bit_node.width > 1 else output
-                            self.signal_mapping[bit_name] = bit_node
-                        if multi_bit_node.width > 0:
-                            self.node_mapping[node_id] = multi_bit_node.bits[0]
+                    self.multibit_signal_mapping[output] = mb
+                    for i, bit_node in enumerate(mb.bits):
+                        bit_name = f"{output}[{i}]" if mb.width > 1 else output
+                        self.signal_mapping[bit_name] = bit_node
+                    if mb.width > 0:
+                        self.node_mapping[node_id] = mb.bits[0]
+                except Exception:
+                    logger.debug("SLICE with non-int indices not supported yet")
+                    return
 
-            # Concatenation: {a, b, ...} -> multi-bit, first operand is MSB
-            elif node_type == 'CONCAT':
-                multi_bit_node = self._convert_concat_node(node_data)
-                if multi_bit_node:
-                    output = node_data.get('output', node_id)
+        # BUF with multi-bit input (pass-through): input is node_id from CONCAT
+        elif node_type == 'BUF':
+            fanins = node_data.get('fanins', [])
+            inputs = node_data.get('inputs', [])
+            input_list = []
+            if fanins:
+                input_list = [str(f[0]) if isinstance(f, (list, tuple)) and f else str(f) for f in fanins]
+            elif inputs:
+                input_list = [str(inp) for inp in inputs]
+            if len(input_list) == 1:
+                inp_sig = input_list[0]
+                if inp_sig in self.multibit_signal_mapping:
+                    # Prefer output_mapping (signal name) over node_id so temp2 is keyed by name
+                    output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
+                    output = None
+                    for sig, mapped_id in output_mapping.items():
+                        if mapped_id == node_id:
+                            output = sig
+                            break
                     if not output:
-                        output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
-                        for sig, mapped_id in output_mapping.items():
-                            if mapped_id == node_id:
-                                output = sig
-                                break
+                        output = node_data.get('output', node_id)
                     if not output:
                         output = node_id
                     if output:
-                        self.multibit_signal_mapping[output] = multi_bit_node
-                        for i, bit_node in enumerate(multi_bit_node.bits):
-                            bit_name = f"{output}[{i}]" if multi_bit_node.width > 1 else output
-                            self.signal_mapping[bit_name] = bit_node
-                        if multi_bit_node.width > 0:
-                            self.node_mapping[node_id] = multi_bit_node.bits[0]
-
-            # Slice/index: signal[msb:lsb] or signal[idx]
-            elif node_type == 'SLICE':
-                fanins = node_data.get('fanins', [])
-                ops = []
-                for f in fanins:
-                    if isinstance(f, (list, tuple)) and len(f) >= 1:
-                        ops.append(str(f[0]))
-                    else:
-                        ops.append(str(f))
-                if len(ops) >= 3:
-                    sig_name, msb_s, lsb_s = ops[0], ops[1], ops[2]
-                    try:
-                        def _eval_idx(s: str) -> int:
-                            ss = s.strip()
-                            try:
-                                return int(ss)
-                            except Exception:
-                                params = (self.netlist or {}).get("attrs", {}).get("parameters", {}) or {}
-                                if ss in params and isinstance(params[ss], int):
-                                    return int(params[ss])
-                                # Minimal WIDTH-1 style evaluator
-                                m = re.match(r"^\s*([A-Za-z_]\w*)\s*([-+])\s*(\d+)\s*$", ss)
-                                if m:
-                                    base = m.group(1)
-                                    op = m.group(2)
-                                    k = int(m.group(3))
-                                    if base in params and isinstance(params[base], int):
-                                        return int(params[base]) - k if op == "-" else int(params[base]) + k
-                                raise
-
-                        msb_v = _eval_idx(msb_s)
-                        lsb_v = _eval_idx(lsb_s)
-                        l = min(msb_v, lsb_v)
-                        h = max(msb_v, lsb_v)
-                        width = h - l + 1
-                        base_bits = self._get_multi_bit_signal(sig_name, self._get_signal_width(sig_name, h + 1))
-                        slice_bits = base_bits[l:h + 1]
-                        mb = MultiBitAIGNode(width, slice_bits)
-                        output = node_data.get('output', None)
-                        if not output:
-                            output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
-                            for sig, mapped_id in output_mapping.items():
-                                if mapped_id == node_id:
-                                    output = sig
-                                    break
-                        if not output:
-                            output = node_id
+                        mb = self.multibit_signal_mapping[inp_sig]
                         self.multibit_signal_mapping[output] = mb
                         for i, bit_node in enumerate(mb.bits):
                             bit_name = f"{output}[{i}]" if mb.width > 1 else output
                             self.signal_mapping[bit_name] = bit_node
-                        if mb.width > 0:
-                            self.node_mapping[node_id] = mb.bits[0]
-                    except Exception:
-                        logger.debug("SLICE with non-int indices not supported yet")
-                        continue
-
-            # BUF with multi-bit input (pass-through): input is node_id from CONCAT
-            elif node_type == 'BUF':
-                fanins = node_data.get('fanins', [])
-                inputs = node_data.get('inputs', [])
-                input_list = []
-                if fanins:
-                    input_list = [str(f[0]) if isinstance(f, (list, tuple)) and f else str(f) for f in fanins]
-                elif inputs:
-                    input_list = [str(inp) for inp in inputs]
-                if len(input_list) == 1:
-                    inp_sig = input_list[0]
-                    if inp_sig in self.multibit_signal_mapping:
-                        # Prefer output_mapping (signal name) over node_id so temp2 is keyed by name
-                        output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
-                        output = None
-                        for sig, mapped_id in output_mapping.items():
-                            if mapped_id == node_id:
-                                output = sig
-                                break
-                        if not output:
-                            output = node_data.get('output', node_id)
-                        if not output:
-                            output = node_id
-                        if output:
-                            mb = self.multibit_signal_mapping[inp_sig]
-                            self.multibit_signal_mapping[output] = mb
-                            for i, bit_node in enumerate(mb.bits):
-                                bit_name = f"{output}[{i}]" if mb.width > 1 else output
-                                self.signal_mapping[bit_name] = bit_node
-                            self.node_mapping[node_id] = mb.bits[0]
-                            continue
-                aig_node = self._convert_gate_node(node_data)
-                if aig_node:
-                    self.node_mapping[node_id] = aig_node
-                    output = node_data.get('output', None)
-                    if not output:
-                        output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
-                        for signal, mapped_node_id in output_mapping.items():
-                            if mapped_node_id == node_id:
-                                output = signal
-                                break
-                    if not output:
-                        output = node_id
-                    if output:
-                        self.signal_mapping[output] = aig_node
-            
-            # Skip sequential/memory for now
-            elif node_type in ['DFF', 'ARRAY_INDEX', 'SLICE']:
-                logger.debug(f"Node type '{node_type}' not fully supported yet, skipping")
-                continue
-    
-    def _convert_gate_node(self, node_data: Dict[str, Any]) -> Optional[AIGNode]:
-        """Convert một gate node sang AIG."""
-        node_type = node_data.get('type', '')
+                        self.node_mapping[node_id] = mb.bits[0]
+                        return
+            aig_node = self._convert_gate_node(node_data)
+            if aig_node:
+                self.node_mapping[node_id] = aig_node
+                output = node_data.get('output', None)
+                if not output:
+                    output_mapping = netlist.get('attrs', {}).get('output_mapping', {})
+                    for signal, mapped_node_id in output_mapping.items():
+                        if mapped_node_id == node_id:
+                            output = signal
+                            break
+                if not output:
+                    output = node_id
+                if output:
+                    self.signal_mapping[output] = aig_node
         
-        # Get inputs
-        inputs = node_data.get('inputs', [])
-        fanins = node_data.get('fanins', [])
+        # Instance của module con đã elaborate: chép AIG đã synthesize của module_key
+        elif node_type == 'MODULE':
+            self._convert_module_instance(node_data)
         
-        # Extract input signals from fanins format: [["signal", inverted], ...]
+        # Skip sequential/memory for now
+        elif node_type in ['DFF', 'ARRAY_INDEX', 'SLICE']:
+            logger.debug(f"Node type '{node_type}' not fully supported yet, skipping")
+            return
+    
+    def _module_template(self, key: str) -> _ModuleTemplate:
+        """Template AIG của ``module_key`` (synthesize netlist con lần đầu, sau đó dùng cache)."""
+        template = self._templates.get(key)
+        if template is None:
+            child = NetlistToAIGConverter(self.aig_class)
+            child._hierarchy = self._hierarchy
+            child._templates = self._templates
+            netlist = self._hierarchy[key]
+            with trace_span("synthesis.module", category="synthesis", module=key):
+                child.convert(netlist)
+            template = self._templates[key] = _ModuleTemplate(child, netlist)
+        return template
+
+    def _convert_module_instance(self, node_data: Dict[str, Any]):
+        """
+        Ghép một instance: bit input từ tín hiệu của module cha, chép template
+        AIG của module con, gán bit output vào ``signal_mapping`` (và
+        ``multibit_signal_mapping`` khi vector đủ bit).
+        """
+        key = node_data.get('module_key')
+        if not key or key not in self._hierarchy:
+            logger.debug(f"Module instance '{node_data.get('id')}' ({node_data.get('module_type')}) "
+                         f"has no elaborated definition, skipping")
+            return
+        template = self._module_template(key)
+        child = self._hierarchy[key]
+        widths = (child.get('attrs', {}) or {}).get('vector_widths', {}) or {}
+        inputs = {}
+        for port, refs in (node_data.get('input_bits') or {}).items():
+            inputs[port] = self._instance_input_bits(refs, widths.get(port, 1) or 1)
+        if self._strict_synthesis:
+            unconnected = sorted({port for port, _bit, _slot in template.inputs if port not in inputs})
+            if unconnected:
+                raise ValueError(f"Synthesis error: input port(s) {', '.join(unconnected)} of instance "
+                                 f"'{node_data.get('id')}' not connected")
+        outputs = template.instantiate(self.aig, inputs, str(node_data.get('id')))
+
+        nodes = self.aig.nodes
+        vectors = set()
+        for port, refs in (node_data.get('output_bits') or {}).items():
+            if len(outputs.get(port, ())) < len(refs):
+                # Module con không synthesize đủ bit cho port (biểu thức chưa hỗ trợ)
+                message = (f"output port '{port}' of instance '{node_data.get('id')}' ({key}) has "
+                           f"{len(outputs.get(port, ()))} synthesized bit(s), {len(refs)} connected")
+                if self._strict_synthesis:
+                    raise ValueError(f"Synthesis error: {message}")
+                logger.warning(message)
+            for ref, lit in zip(refs, outputs.get(port, ())):
+                bit = nodes[lit >> 1]
+                self.signal_mapping[ref] = self.aig.create_not(bit) if lit & 1 else bit
+                m = _BIT_REF_PATTERN.match(ref)
+                if m:
+                    vectors.add(m.group(1))
+        for name in vectors:
+            width = self._get_signal_width(name, 1)
+            bits = [self.signal_mapping.get(f"{name}[{i}]") for i in range(width)]
+            if width > 1 and all(bit is not None for bit in bits):
+                self.multibit_signal_mapping[name] = MultiBitAIGNode(width, bits)
+
+    def _instance_input_bits(self, refs: List[str], width: int) -> List[AIGNode]:
+        """Bit (LSB trước, đúng ``width``) của các tín hiệu nối vào một input port."""
+        bits: List[AIGNode] = []
+        for ref in refs:
+            m = _BIT_REF_PATTERN.match(ref)
+            if m and (m.group(1) in self.aig.pis or m.group(1) in self.multibit_signal_mapping):
+                base_bits = self._get_multi_bit_signal(m.group(1), self._get_signal_width(m.group(1), 1))
+                index = int(m.group(2))
+                bits.append(base_bits[index] if index < len(base_bits) else self.aig.const0)
+                continue
+            if "'" in ref:
+                ref_width = parse_constant_string(ref, 1)[1]
+            elif ref[:1].isdigit():
+                ref_width = max(width - len(bits), 1)  # hằng không kích thước
+            else:
+                ref_width = self._get_signal_width(ref, 1)
+            bits.extend(self._get_multi_bit_signal(ref, ref_width))
+        bits = bits[:width]
+        bits.extend([self.aig.const0] * (width - len(bits)))
+        return bits
+
+    def _gate_operands(self, node_data: Dict[str, Any]) -> List[Tuple[str, bool]]:
+        """(tín hiệu, đảo) của các input của một gate node (``fanins`` hoặc ``inputs``)."""
+        fanins = node_data.get('fanins', [])
         if fanins:
-            input_signals = []
-            input_inverted = []
+            operands = []
             for fanin in fanins:
                 if isinstance(fanin, (list, tuple)) and len(fanin) >= 1:
-                    input_signals.append(str(fanin[0]))
-                    input_inverted.append(fanin[1] if len(fanin) > 1 else False)
+                    operands.append((str(fanin[0]), fanin[1] if len(fanin) > 1 else False))
                 else:
-                    input_signals.append(str(fanin))
-                    input_inverted.append(False)
-        elif inputs:
-            input_signals = [str(inp) for inp in inputs]
-            input_inverted = [False] * len(input_signals)
-        else:
+                    operands.append((str(fanin), False))
+            return operands
+        return [(str(inp), False) for inp in node_data.get('inputs', []) or []]
+
+    def _gate_input(self, sig: str) -> AIGNode:
+        """AIG node (1 bit) của một input của gate."""
+        # Constants like 1'b0, 4'hF, 8'd10
+        if "'" in sig:
+            value, _w = parse_constant_string(sig, 1)
+            return self.aig.const1 if (value & 1) else self.aig.const0
+        if sig in self.signal_mapping:
+            return self.signal_mapping[sig]
+        if sig in self.aig.pis:
+            return self.aig.pis[sig]
+        if sig in self.node_mapping:
+            # Some netlists reference internal node ids directly as fanins
+            return self.node_mapping[sig]
+        # Input not found in mapping: either floating net (loose) or error (strict).
+        if self._strict_synthesis:
+            raise ValueError(f"Synthesis error: input signal '{sig}' not found (undeclared or undriven)")
+        logger.warning(f"Input signal '{sig}' not found, creating new primary input")
+        aig_input = self.aig.create_pi(sig)
+        self.signal_mapping[sig] = aig_input
+        return aig_input
+
+    def _convert_gate_node(self, node_data: Dict[str, Any]) -> Optional[AIGNode]:
+        """Convert một gate node sang AIG."""
+        operands = self._gate_operands(node_data)
+        if not operands:
             return None
-        
-        # Get AIG nodes for inputs
         aig_inputs = []
-        for sig, inv in zip(input_signals, input_inverted):
-            # Constants like 1'b0, 4'hF, 8'd10
-            if "'" in sig:
-                value, _w = parse_constant_string(sig, 1)
-                const_bit = self.aig.const1 if (value & 1) else self.aig.const0
-                aig_input = const_bit
-            elif sig in self.signal_mapping:
-                aig_input = self.signal_mapping[sig]
-            elif sig in self.aig.pis:
-                aig_input = self.aig.pis[sig]
-            elif sig in self.node_mapping:
-                # Some netlists reference internal node ids directly as fanins
-                aig_input = self.node_mapping[sig]
-            else:
-                # Input not found in mapping: either floating net (loose) or error (strict).
-                if self._strict_synthesis:
-                    raise ValueError(f"Synthesis error: input signal '{sig}' not found (undeclared or undriven)")
-                logger.warning(f"Input signal '{sig}' not found, creating new primary input")
-                aig_input = self.aig.create_pi(sig)
-                self.signal_mapping[sig] = aig_input
-
+        for sig, inv in operands:
+            aig_input = self._gate_input(sig)
             # Handle inversion
             if inv:
                 aig_input = self.aig.create_not(aig_input)
             aig_inputs.append(aig_input)
-        
+        return self._gate_result(node_data.get('type', ''), aig_inputs)
+
+    def _convert_gate_vector(self, node_data: Dict[str, Any], width: int) -> Optional[MultiBitAIGNode]:
+        """
+        Gate bitwise trên vector (``assign y = ~a;``, ``a & b`` với ``y`` rộng ``width``
+        bit): áp dụng gate cho từng bit; toán hạng hẹp hơn được mở rộng bằng 0.
+        """
+        operands = self._gate_operands(node_data)
+        if not operands:
+            return None
+        columns = []
+        for sig, inv in operands:
+            if "'" in sig or sig[:1].isdigit():
+                bits = self._get_multi_bit_signal(sig, width)
+            else:
+                sig_width = min(width, self._get_signal_width(sig, 1))
+                bits = self._get_multi_bit_signal(sig, sig_width) if sig_width > 1 else [self._gate_input(sig)]
+                bits = bits + [self.aig.const0] * (width - len(bits))
+            if inv:
+                bits = [self.aig.create_not(bit) for bit in bits]
+            columns.append(bits)
+        node_type = node_data.get('type', '')
+        result = []
+        for i in range(width):
+            bit = self._gate_result(node_type, [bits[i] for bits in columns])
+            if bit is None:
+                return None
+            result.append(bit)
+        return MultiBitAIGNode(width, result)
+
+    def _gate_result(self, node_type: str, aig_inputs: List[AIGNode]) -> Optional[AIGNode]:
+        """Ghép các input (1 bit) theo loại gate."""
         # Convert gate type to AIG
         if node_type == 'AND':
             if len(aig_inputs) >= 2:
@@ -561,7 +793,9 @@ class NetlistToAIGConverter:
                 carry = self.aig.create_or(and_ab, and_carry_sum)
             return carry
 
+        po_starts = []
         for output_name in outputs:
+            po_starts.append(len(self.aig.pos))
             # Check if this is a multi-bit signal
             if output_name in self.multibit_signal_mapping:
                 # Multi-bit output - add all bits as POs (for now, or could combine)
@@ -595,6 +829,9 @@ class NetlistToAIGConverter:
                             aig_node = _synthesize_add_carry("a", "b", w)
                             self.signal_mapping[output_name] = aig_node
                         self.aig.add_po(aig_node, inverted=False)
+                    elif output_name in self.signal_mapping:
+                        # Output lái bởi instance module con (node MODULE không có trong node_mapping)
+                        self.aig.add_po(self.signal_mapping[output_name], inverted=False)
                     else:
                         logger.warning(f"Output '{output_name}' node '{node_id}' not found")
                 elif output_name in self.signal_mapping:
@@ -626,6 +863,11 @@ class NetlistToAIGConverter:
                             except Exception:
                                 pass
                         logger.warning(f"Output '{output_name}' signal not found")
+        
+        # Slice PO của từng output (dùng khi netlist này là module con được ghép vào module cha)
+        po_starts.append(len(self.aig.pos))
+        for i, output_name in enumerate(outputs):
+            self.output_ranges[output_name] = (po_starts[i], po_starts[i + 1])
     
     def _get_signal_width(self, signal_name: str, default_width: int = 1) -> int:
         """Get bit width of a signal from netlist metadata."""
@@ -1094,7 +1336,7 @@ class NetlistToAIGConverter:
         return MultiBitAIGNode(width, result_bits)
 
 
-def synthesize_netlist_to_aig(netlist: Dict[str, Any]) -> AIG:
+def synthesize_netlist_to_aig(netlist: Dict[str, Any], aig_class: Optional[type] = None) -> AIG:
     """
     Synthesis function: Convert Netlist → AIG.
     
@@ -1103,11 +1345,12 @@ def synthesize_netlist_to_aig(netlist: Dict[str, Any]) -> AIG:
     
     Args:
         netlist: Netlist dictionary từ parser
+        aig_class: AIG manager class (mặc định AIG; ArrayAIG cho design lớn)
         
     Returns:
         AIG object
     """
-    converter = NetlistToAIGConverter()
+    converter = NetlistToAIGConverter(aig_class=aig_class)
     return converter.convert(netlist)
 
 
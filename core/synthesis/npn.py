@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+NPN Canonical Form (hàm 4 input)
+
+Hai hàm thuộc cùng lớp NPN nếu biến đổi được sang nhau bằng cách hoán vị
+input (P), đảo input (N) và đảo output (N). 65536 hàm 4 input chia thành 222
+lớp NPN; mỗi lớp có một đại diện (canonical) = truth table nhỏ nhất của lớp.
+
+Bảng tra 65536 phần tử được tính một lần (lazily) bằng BFS trên orbit của
+từng lớp với các phép sinh: đổi chỗ hai biến kề nhau, đảo một biến, đảo output.
+
+Quy ước biến đổi: ``f(x) = out ^ r(y)`` với ``r`` là đại diện và
+``y[i] = x[perm[i]] ^ ((neg >> i) & 1)``.
+
+Truth table 16-bit: bit k là f(x) với x[i] = (k >> i) & 1 (giống phần thấp của
+truth table 64-bit trong core/synthesis/aig_cuts.py).
+"""
+
+from array import array
+from itertools import permutations
+from typing import List, NamedTuple, Optional, Tuple
+
+from core.utils.performance import traced
+
+TT4_FULL = 0xFFFF
+TT4_VARS = (0xAAAA, 0xCCCC, 0xF0F0, 0xFF00)
+PERMS4: Tuple[Tuple[int, ...], ...] = tuple(permutations(range(4)))
+_PERM_INDEX = {p: i for i, p in enumerate(PERMS4)}
+
+
+class NPNTransform(NamedTuple):
+    perm: Tuple[int, ...]
+    neg: int
+    out: int
+
+
+def tt4_swap(truth: int, i: int, j: int) -> int:
+    """Đổi chỗ biến i và j trong truth table 16-bit."""
+    if i == j:
+        return truth
+    if i > j:
+        i, j = j, i
+    vi, vj = TT4_VARS[i], TT4_VARS[j]
+    up = vi & ~vj & TT4_FULL
+    down = vj & ~vi & TT4_FULL
+    shift = (1 << j) - (1 << i)
+    return (truth & (TT4_FULL ^ up ^ down)) | ((truth & up) << shift) | ((truth & down) >> shift)
+
+
+def tt4_flip(truth: int, i: int) -> int:
+    """g(x) = f(x với x[i] đảo)."""
+    v = TT4_VARS[i]
+    s = 1 << i
+    return ((truth & v) >> s) | ((truth & ~v & TT4_FULL) << s)
+
+
+_CANON: Optional[array] = None
+_XFORM: Optional[array] = None
+_CLASSES: List[int] = []
+
+
+@traced("npn.build_tables", category="npn")
+def _build_tables():
+    global _CANON, _XFORM
+    canon = array('i', [-1]) * 65536
+    xform = array('H', [0]) * 65536
+    classes: List[int] = []
+    identity = _PERM_INDEX[(0, 1, 2, 3)]
+    for rep in range(65536):
+        if canon[rep] >= 0:
+            continue
+        classes.append(rep)
+        canon[rep] = rep
+        xform[rep] = identity << 5
+        queue = [rep]
+        for f in queue:
+            code = xform[f]
+            perm = PERMS4[code >> 5]
+            neg = (code >> 1) & 15
+            out = code & 1
+            # Các phép sinh: (truth mới, perm mới, neg mới, out mới)
+            moves = [(f ^ TT4_FULL, perm, neg, out ^ 1)]
+            for a in range(3):
+                b = a + 1
+                sigma = tuple(b if p == a else a if p == b else p for p in perm)
+                moves.append((tt4_swap(f, a, b), sigma, neg, out))
+            for a in range(4):
+                flip = 0
+                for i in range(4):
+                    if perm[i] == a:
+                        flip |= 1 << i
+                moves.append((tt4_flip(f, a), perm, neg ^ flip, out))
+            for g, p, n, o in moves:
+                if canon[g] < 0:
+                    canon[g] = rep
+                    xform[g] = (_PERM_INDEX[p] << 5) | (n << 1) | o
+                    queue.append(g)
+    _CANON, _XFORM = canon, xform
+    _CLASSES[:] = classes
+
+
+def npn_canonical(truth: int) -> Tuple[int, NPNTransform]:
+    """
+    Đại diện NPN của hàm 4 input ``truth`` (16-bit) và phép biến đổi
+    ``(perm, neg, out)`` sao cho ``truth(x) = out ^ rep(y)``,
+    ``y[i] = x[perm[i]] ^ neg_i``.
+    """
+    if _CANON is None:
+        _build_tables()
+    truth &= TT4_FULL
+    code = _XFORM[truth]
+    return _CANON[truth], NPNTransform(PERMS4[code >> 5], (code >> 1) & 15, code & 1)
+
+
+def npn_tables() -> Tuple[bytes, bytes]:
+    """Bảng tra (đại diện, phép biến đổi) dạng bytes — để lưu cache (``install_npn_tables``)."""
+    if _CANON is None:
+        _build_tables()
+    return _CANON.tobytes(), _XFORM.tobytes()
+
+
+def install_npn_tables(canon: bytes, xform: bytes) -> bool:
+    """Nạp bảng đã tính sẵn (từ ``npn_tables``) nếu chưa có; ``False`` nếu dữ liệu sai kích thước."""
+    global _CANON, _XFORM
+    if _CANON is not None:
+        return True
+    canon_arr, xform_arr = array('i'), array('H')
+    canon_arr.frombytes(canon)
+    xform_arr.frombytes(xform)
+    if len(canon_arr) != 65536 or len(xform_arr) != 65536:
+        return False
+    _CANON, _XFORM = canon_arr, xform_arr
+    _CLASSES[:] = sorted(set(canon_arr))
+    return True
+
+
+def npn_classes() -> List[int]:
+    """Danh sách 222 đại diện NPN (tăng dần)."""
+    if _CANON is None:
+        _build_tables()
+    return list(_CLASSES)
+
+
+def npn_apply(rep: int, transform: NPNTransform) -> int:
+    """Truth table ``out ^ rep(y)`` (nghịch đảo của ``npn_canonical``)."""
+    perm, neg, out = transform
+    result = 0
+    for k in range(16):
+        y = 0
+        for i in range(4):
+            if ((k >> perm[i]) & 1) ^ ((neg >> i) & 1):
+                y |= 1 << i
+        if ((rep >> y) & 1) ^ out:
+            result |= 1 << k
+    return result
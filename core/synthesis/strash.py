@@ -17,7 +17,9 @@ from typing import Dict, List, Set, Any, Tuple, Optional
 import logging
 
 # Thêm thư mục gốc project vào đường dẫn
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.netlist_db import NetlistDB, fanin_pairs
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +33,7 @@ class StrashOptimizer:
     
     def __init__(self):
         # ABC-inspired hash table structure
-        self.hash_table: Dict[Tuple[str, str, str], str] = {}  # (gate_type, input1, input2) -> node_id
+        self.hash_table: Dict[Tuple[Any, ...], str] = {}  # (gate_type, (input, inverted), ...) -> node_id
         self.node_count = 0
         self.removed_nodes = 0
         self.computed_table: Dict[Tuple[str, str], str] = {}  # ABC-style computed table
@@ -53,146 +55,57 @@ class StrashOptimizer:
             print("WARNING: Invalid netlist format")
             return netlist
         
-        # Convert nodes list to dict if needed
-        nodes_data = netlist['nodes']
-        if isinstance(nodes_data, list):
-            # Convert list to dict with node ID as key (not index)
-            nodes_dict = {}
-            for i, node in enumerate(nodes_data):
-                # Use node's 'id' field if available, otherwise use index
-                node_id = node.get('id', i)
-                nodes_dict[node_id] = node
-        else:
-            nodes_dict = nodes_data
-            
-        original_nodes = len(nodes_dict)
+        db = NetlistDB(netlist)
+        original_nodes = len(db.nodes)
         
         # Create hash table for nodes
         self.hash_table = {}
-        optimized_nodes = {}
-        # Track replacements to update output_mapping later
-        replacement_map: Dict[str, str] = {}
         removed_details = []  # Store details of removed nodes
         
         print(f"Original nodes: {original_nodes}")
         print("Analyzing nodes...")
         
-        # Process each node
-        for node_id, node_data in nodes_dict.items():
-            if self._is_gate_node(node_data):
-                # Create hash key for node
-                hash_key = self._create_hash_key(node_data, optimized_nodes)
-                
-                if hash_key in self.hash_table:
-                    # Node exists, skip it (duplicate detected)
-                    existing_node = self.hash_table[hash_key]
-                    self.removed_nodes += 1
-                    
-                    # Record replacement for output_mapping update
-                    replacement_map[str(node_id)] = str(existing_node)
-                    
-                    # Store removal details
-                    node_type = node_data.get('type', 'UNKNOWN')
-                    fanins = node_data.get('fanins', [])
-                    fanin_str = ', '.join([f'{f[0]}' for f in fanins]) if fanins else 'none'
-                    removed_details.append({
-                        'id': node_id,
-                        'type': node_type,
-                        'fanins': fanin_str,
-                        'replaced_by': existing_node
-                    })
-                    
-                    print(f"REMOVED: {node_id} ({node_type}) - inputs: [{fanin_str}] -> replaced by {existing_node}")
-                else:
-                    # Check for redundant BUF nodes
-                    if node_data.get('type') == 'BUF' and self._is_redundant_buffer(node_data, nodes_dict):
-                        # Remove redundant buffer
-                        self.removed_nodes += 1
-                        
-                        node_type = node_data.get('type', 'UNKNOWN')
-                        fanins = node_data.get('fanins', [])
-                        fanin_str = ', '.join([f'{f[0]}' for f in fanins]) if fanins else 'none'
-                        removed_details.append({
-                            'id': node_id,
-                            'type': node_type,
-                            'fanins': fanin_str,
-                            'replaced_by': fanins[0][0] if fanins else 'direct_connection'
-                        })
-                        # Record replacement for mapping update
-                        if fanins:
-                            replacement_map[str(node_id)] = str(fanins[0][0])
-                        
-                        print(f"REMOVED: {node_id} ({node_type}) - inputs: [{fanin_str}] -> replaced by direct connection")
-                    else:
-                        # New node, add to hash table and optimized_nodes
-                        self.hash_table[hash_key] = node_id
-                        optimized_nodes[node_id] = node_data
-            else:
+        # Process each node in topological order: once a duplicate is replaced, its
+        # fanouts already point at the kept node when their own keys are computed
+        for node_id in db.topological_order():
+            node_data = db.nodes[node_id]
+            if not self._is_gate_node(node_data):
                 # Non-gate node (input, output, constant)
-                optimized_nodes[node_id] = node_data
-        
-        # Update netlist
-        optimized_netlist = netlist.copy()
-        # Convert back to list format if original was list
-        if isinstance(nodes_data, list):
-            optimized_netlist['nodes'] = list(optimized_nodes.values())
-        else:
-            optimized_netlist['nodes'] = optimized_nodes
-        
-        # Update wire connections
-        optimized_netlist = self._update_wire_connections(optimized_netlist)
-
-        # Update output_mapping to point to replacements (if any)
-        try:
-            attrs = optimized_netlist.setdefault('attrs', {})
-            out_map = attrs.setdefault('output_mapping', {})
+                continue
+            # Create hash key for node
+            hash_key = self._create_hash_key(node_id, db)
+            node_type = node_data.get('type', 'UNKNOWN')
+            fanins = fanin_pairs(node_data)
+            fanin_str = ', '.join(sig for sig, _inv in fanins) if fanins else 'none'
             
-            # First, update mappings where the value itself was a replaced node
-            for out_name, node_ref in list(out_map.items()):
-                node_ref_str = str(node_ref)
-                
-                # Check if this reference points to a replaced node
-                if node_ref_str in replacement_map:
-                    old_ref = node_ref_str
-                    new_ref = replacement_map[node_ref_str]
-                    out_map[out_name] = new_ref
-                    logger.debug(f"Updated output_mapping[{out_name}]: {old_ref} -> {new_ref}")
-            
-            # Second pass: Update mappings where signal name points to a replaced node
-            # (e.g., out_map['chain1'] = 'and_6', but and_6 was replaced by and_0)
-            for signal_name, node_id in list(out_map.items()):
-                node_id_str = str(node_id)
-                if node_id_str in replacement_map:
-                    # This signal points to a replaced node, update it
-                    old_id = node_id_str
-                    new_id = replacement_map[node_id_str]
-                    out_map[signal_name] = new_id
-                    logger.debug(f"Updated output_mapping[{signal_name}]: {old_id} -> {new_id} (signal mapping)")
-            
-            # Third pass: Update output mappings that reference signal names which themselves were replaced
-            # (e.g., 'out3' -> 'chain1', but 'chain1' was mapped to 'and_6' which was replaced by 'and_0')
-            # First, create reverse mapping: signal_name -> final_node_id
-            signal_to_final_node = {}
-            for signal_name, node_id in out_map.items():
-                node_id_str = str(node_id)
-                # Follow replacement chain to get final node
-                final_node_id = node_id_str
-                while final_node_id in replacement_map:
-                    final_node_id = replacement_map[final_node_id]
-                signal_to_final_node[signal_name] = final_node_id
-            
-            # Now update any mappings that reference these signals
-            for out_name, node_ref in list(out_map.items()):
-                node_ref_str = str(node_ref)
-                # If this reference is a signal name (not a direct node ID), resolve it
-                if node_ref_str in signal_to_final_node:
-                    final_ref = signal_to_final_node[node_ref_str]
-                    if final_ref != node_ref_str:
-                        out_map[out_name] = final_ref
-                        logger.debug(f"Updated output_mapping[{out_name}]: {node_ref_str} -> {final_ref} (signal resolution)")
-        except Exception as e:
-            logger.warning(f"Failed to update output_mapping: {e}")
-            pass
+            existing_node = self.hash_table.get(hash_key)
+            if existing_node is not None and db.substitute(node_id, existing_node):
+                # Duplicate detected: fanouts and output_mapping now use existing node
+                self.removed_nodes += 1
+                removed_details.append({
+                    'id': node_id,
+                    'type': node_type,
+                    'fanins': fanin_str,
+                    'replaced_by': existing_node
+                })
+                print(f"REMOVED: {node_id} ({node_type}) - inputs: [{fanin_str}] -> replaced by {existing_node}")
+            elif (node_type == 'BUF' and len(fanins) == 1 and self._is_redundant_buffer(node_id, db)
+                  and db.substitute(node_id, fanins[0][0], fanins[0][1])):
+                # Remove redundant buffer: fanouts connect directly to its input
+                self.removed_nodes += 1
+                removed_details.append({
+                    'id': node_id,
+                    'type': node_type,
+                    'fanins': fanin_str,
+                    'replaced_by': fanins[0][0]
+                })
+                print(f"REMOVED: {node_id} ({node_type}) - inputs: [{fanin_str}] -> replaced by direct connection")
+            elif existing_node is None:
+                # New node, add to hash table
+                self.hash_table[hash_key] = node_id
+        
+        # Wires and output_mapping follow the replacements
+        optimized_netlist = db.to_netlist()
         
         final_nodes = len(optimized_netlist['nodes'])
         reduction = original_nodes - final_nodes
@@ -223,7 +136,7 @@ class StrashOptimizer:
         gate_types = ['AND', 'OR', 'XOR', 'NAND', 'NOR', 'XNOR', 'NOT', 'BUF', 'ADD', 'SUB', 'MUL', 'DIV']
         return node_data.get('type', '') in gate_types
     
-    def _is_redundant_buffer(self, node_data: Dict[str, Any], nodes_dict: Dict[str, Any]) -> bool:
+    def _is_redundant_buffer(self, node_id: str, db: NetlistDB) -> bool:
         """
         Enhanced check if a BUF node is redundant (can be removed).
         
@@ -233,136 +146,54 @@ class StrashOptimizer:
         3. Or it's just a simple pass-through buffer
         4. Or it's not driving any critical outputs
         """
+        node_data = db.nodes[node_id]
         if node_data.get('type') != 'BUF':
             return False
             
-        fanins = node_data.get('fanins', [])
+        fanins = fanin_pairs(node_data)
         if not fanins:
             return False
             
         input_node = fanins[0][0]
         
-        # Count how many times this input is used
-        usage_count = 0
-        for other_node_id, other_node_data in nodes_dict.items():
-            other_fanins = other_node_data.get('fanins', [])
-            for fanin in other_fanins:
-                if fanin[0] == input_node:
-                    usage_count += 1
+        # Count how many times this input is used (fanout index)
+        usage_count = db.fanout_count(input_node)
         
         # Enhanced logic: Remove BUF if:
         # 1. Input is used by exactly 1 node (this BUF)
         # 2. OR input is a simple signal (not complex logic)
         # 3. OR BUF is not driving critical outputs
-        return usage_count == 1 or self._is_simple_signal(input_node, nodes_dict)
+        return usage_count == 1 or self._is_simple_signal(input_node, db)
     
-    def _is_simple_signal(self, signal_name: str, nodes_dict: Dict[str, Any]) -> bool:
+    def _is_simple_signal(self, signal_name: str, db: NetlistDB) -> bool:
         """Check if signal is simple (input or constant)."""
         # Check if it's a primary input or constant
         if signal_name in ['0', '1', 'x', 'z']:
             return True
         
         # Check if it's a primary input (not generated by logic)
-        for node_id, node_data in nodes_dict.items():
-            if node_data.get('type') in ['INPUT', 'CONSTANT']:
-                if signal_name in node_data.get('outputs', []):
-                    return True
-        
-        return False
+        driver = db.driver_of(signal_name)
+        return driver is not None and db.nodes[driver].get('type') in ['INPUT', 'CONSTANT']
     
-    def _create_hash_key(self, node_data: Dict[str, Any], optimized_nodes: Dict[str, Any]) -> Tuple[str, str, str]:
+    def _create_hash_key(self, node_id: str, db: NetlistDB) -> Tuple[Any, ...]:
         """
         Create hash key for node based on gate type and inputs.
         
         Args:
-            node_data: Node data
-            optimized_nodes: Dictionary of optimized nodes
-            
-        Returns:
-            Hash key tuple (gate_type, input1, input2)
-        """
-        gate_type = node_data.get('type', '')
-        fanins = node_data.get('fanins', [])
-        
-        # Extract input names from fanins
-        inputs = [f[0] for f in fanins] if fanins else []
-        
-        # Sort inputs to ensure canonical form
-        sorted_inputs = sorted(inputs)
-        
-        if len(sorted_inputs) == 1:
-            # Unary gate (NOT, BUF)
-            return (gate_type, sorted_inputs[0], '')
-        elif len(sorted_inputs) == 2:
-            # Binary gate (AND, OR, XOR, etc.)
-            return (gate_type, sorted_inputs[0], sorted_inputs[1])
-        else:
-            # Multi-input gate - không support trong implementation này
-            return (gate_type, str(sorted_inputs), '')
-    
-    def _update_wire_connections(self, netlist: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Update wire connections after removing duplicate nodes.
-        
-        Args:
-            netlist: Netlist with optimized nodes
+            node_id: Node ID
+            db: Indexed netlist (fanins resolved to their driving net)
             
         Returns:
-            Netlist with updated wire connections
+            Hash key tuple (gate_type, (input, inverted), ...)
         """
-        # Create mapping from old node IDs to new node IDs
-        node_mapping = {}
+        gate_type = db.nodes[node_id].get('type', '')
+        inputs = list(db.fanin_nets(node_id))
         
-        # Handle both dict and list format for nodes
-        nodes_data = netlist['nodes']
-        if isinstance(nodes_data, dict):
-            for node_id, node_data in nodes_data.items():
-                if isinstance(node_data, str):
-                    # Node has been replaced
-                    node_mapping[node_id] = node_data
-        
-        # Update wire connections - handle both list and dict format
-        if 'wires' in netlist and netlist['wires']:
-            wires_data = netlist['wires']
-            
-            if isinstance(wires_data, list):
-                # Wires is a list - update in place
-                updated_wires = []
-                for wire_data in wires_data:
-                    if isinstance(wire_data, dict):
-                        updated_wire = wire_data.copy()
-                        
-                        # Update source and destination
-                        if 'source' in updated_wire and updated_wire['source'] in node_mapping:
-                            updated_wire['source'] = node_mapping[updated_wire['source']]
-                        
-                        if 'destination' in updated_wire and updated_wire['destination'] in node_mapping:
-                            updated_wire['destination'] = node_mapping[updated_wire['destination']]
-                        
-                        updated_wires.append(updated_wire)
-                    else:
-                        updated_wires.append(wire_data)
-                
-                netlist['wires'] = updated_wires
-            
-            elif isinstance(wires_data, dict):
-                # Wires is a dict
-                updated_wires = {}
-                for wire_id, wire_data in wires_data.items():
-                    updated_wire = wire_data.copy()
-                    
-                    # Update source and destination
-                    if 'source' in updated_wire and updated_wire['source'] in node_mapping:
-                        updated_wire['source'] = node_mapping[updated_wire['source']]
-                    
-                    if 'destination' in updated_wire and updated_wire['destination'] in node_mapping:
-                        updated_wire['destination'] = node_mapping[updated_wire['destination']]
-                    
-                    updated_wires[wire_id] = updated_wire
-                
-                netlist['wires'] = updated_wires
+        # Sort inputs to ensure canonical form (SUB / DIV are not commutative)
+        if gate_type not in ('SUB', 'DIV'):
+            inputs.sort()
         
-        return netlist
+        return (gate_type,) + tuple(inputs)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Lấy thống kê về optimization."""
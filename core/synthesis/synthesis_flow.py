@@ -39,8 +39,9 @@ class SynthesisFlow:
     Lưu ý: Đây KHÔNG phải là optimization. Optimization được thực hiện riêng trên AIG.
     """
     
-    def __init__(self):
+    def __init__(self, aig_class: Optional[type] = None):
         self.aig = None
+        self.aig_class = aig_class  # None -> AIG; ArrayAIG cho design lớn
         self.conversion_stats = {
             'netlist_nodes': 0,
             'aig_nodes': 0,
@@ -90,7 +91,7 @@ class SynthesisFlow:
         
         # Convert Netlist → AIG
         from core.synthesis.netlist_to_aig import synthesize_netlist_to_aig
-        self.aig = synthesize_netlist_to_aig(netlist)
+        self.aig = synthesize_netlist_to_aig(netlist, aig_class=self.aig_class)
         
         # Update stats
         self.conversion_stats['aig_nodes'] = self.aig.count_nodes()
@@ -129,7 +130,7 @@ class SynthesisFlow:
         """Run complete synthesis flow (một chuẩn duy nhất)."""
         return run_complete_synthesis(netlist)
 
-def synthesize(netlist: Dict[str, Any]) -> 'AIG':
+def synthesize(netlist: Dict[str, Any], aig_class: Optional[type] = None) -> 'AIG':
     """
     Synthesis function: Convert Netlist → AIG.
     
@@ -138,11 +139,12 @@ def synthesize(netlist: Dict[str, Any]) -> 'AIG':
     
     Args:
         netlist: Circuit netlist dictionary từ parser
+        aig_class: AIG manager class (mặc định AIG; ArrayAIG cho design lớn)
         
     Returns:
         AIG object
     """
-    flow = SynthesisFlow()
+    flow = SynthesisFlow(aig_class=aig_class)
     return flow.synthesize(netlist)
 
 def run_complete_synthesis(netlist: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Cell function parser — biểu thức Boolean của cell thư viện.
+
+Hỗ trợ cả hai cú pháp đang có trong repo:
+    - dạng prefix của ``create_standard_library``/JSON: ``NOT(OR(AND(A,B),C))``,
+      ``NAND(A,B)``, ``BUF(A)``, ``CONST0()``
+    - dạng infix Liberty: ``(A1&A2) | B1``, ``!(A&B)``, ``A'``, ``A*B+C``,
+      ``A B`` (AND ngầm định)
+
+Thứ tự ưu tiên Liberty: đảo (``!``, ``'``) > XOR (``^``) > AND (``&``, ``*``,
+khoảng trắng) > OR (``|``, ``+``).
+
+Cây biểu thức là tuple: ``('var', name)``, ``('const', 0|1)``, ``('not', t)``,
+``('and'|'or'|'xor', [t, ...])``.
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from core.synthesis.npn import TT4_FULL, TT4_VARS
+
+_TOKEN_RE = re.compile(r"\s*(?:([A-Za-z_][A-Za-z0-9_\[\]\.]*)|(.))")
+
+_PREFIX_OPS = {
+    "AND": ("and", False),
+    "OR": ("or", False),
+    "XOR": ("xor", False),
+    "NAND": ("and", True),
+    "NOR": ("or", True),
+    "XNOR": ("xor", True),
+}
+
+
+class CellFunctionError(ValueError):
+    """Biểu thức hàm cell không parse được."""
+
+
+def _tokenize(expr: str) -> List[str]:
+    tokens: List[str] = []
+    pos = 0
+    while pos < len(expr):
+        match = _TOKEN_RE.match(expr, pos)
+        if match is None or match.end() == pos:
+            break
+        pos = match.end()
+        if match.group(1) is not None:
+            tokens.append(match.group(1))
+        elif match.group(2) is not None and not match.group(2).isspace():
+            tokens.append(match.group(2))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, expr: str):
+        self.tokens = _tokenize(expr)
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected: Optional[str] = None) -> str:
+        token = self.peek()
+        if token is None or (expected is not None and token != expected):
+            raise CellFunctionError(f"expected {expected or 'token'}, got {token}")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        tree = self.parse_or()
+        if self.peek() is not None:
+            raise CellFunctionError(f"unexpected token {self.peek()}")
+        return tree
+
+    def parse_or(self):
+        items = [self.parse_and()]
+        while self.peek() in ("|", "+"):
+            self.take()
+            items.append(self.parse_and())
+        return items[0] if len(items) == 1 else ("or", items)
+
+    def parse_and(self):
+        items = [self.parse_xor()]
+        while True:
+            token = self.peek()
+            if token in ("&", "*"):
+                self.take()
+            elif token is None or token in ("|", "+", ")", ","):
+                break
+            # Liberty: hai toán hạng đứng cạnh nhau = AND
+            items.append(self.parse_xor())
+        return items[0] if len(items) == 1 else ("and", items)
+
+    def parse_xor(self):
+        items = [self.parse_unary()]
+        while self.peek() == "^":
+            self.take()
+            items.append(self.parse_unary())
+        return items[0] if len(items) == 1 else ("xor", items)
+
+    def parse_unary(self):
+        if self.peek() == "!":
+            self.take()
+            return ("not", self.parse_unary())
+        tree = self.parse_primary()
+        while self.peek() == "'":
+            self.take()
+            tree = ("not", tree)
+        return tree
+
+    def parse_primary(self):
+        token = self.take()
+        if token == "(":
+            tree = self.parse_or()
+            self.take(")")
+            return tree
+        if token in ("0", "1"):
+            return ("const", int(token))
+        if not (token[0].isalpha() or token[0] == "_"):
+            raise CellFunctionError(f"unexpected token {token}")
+        name = token.upper()
+        if self.peek() == "(" and (name in _PREFIX_OPS or name in ("NOT", "INV", "BUF", "CONST0", "CONST1")):
+            self.take("(")
+            args = []
+            if self.peek() != ")":
+                args.append(self.parse_or())
+                while self.peek() == ",":
+                    self.take()
+                    args.append(self.parse_or())
+            self.take(")")
+            if name in ("CONST0", "CONST1"):
+                return ("const", 1 if name == "CONST1" else 0)
+            if name in ("NOT", "INV", "BUF"):
+                if len(args) != 1:
+                    raise CellFunctionError(f"{name} takes one argument")
+                return ("not", args[0]) if name != "BUF" else args[0]
+            if not args:
+                raise CellFunctionError(f"{name} needs arguments")
+            op, inverted = _PREFIX_OPS[name]
+            tree = args[0] if len(args) == 1 else (op, args)
+            return ("not", tree) if inverted else tree
+        if name in ("CONST0", "CONST1"):
+            return ("const", 1 if name == "CONST1" else 0)
+        return ("var", token)
+
+
+def parse_cell_function(expr: str):
+    """Parse biểu thức hàm cell thành cây; lỗi → ``CellFunctionError``."""
+    if not expr or not expr.strip():
+        raise CellFunctionError("empty function")
+    return _Parser(expr.strip()).parse()
+
+
+def function_variables(tree) -> List[str]:
+    """Tên biến theo thứ tự xuất hiện đầu tiên."""
+    names: List[str] = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        kind = node[0]
+        if kind == "var":
+            if node[1] not in names:
+                names.append(node[1])
+        elif kind == "not":
+            stack.append(node[1])
+        elif kind != "const":
+            stack.extend(reversed(node[1]))
+    return names
+
+
+def function_to_prefix(tree) -> str:
+    """Cây → chuỗi dạng prefix (``NOT(OR(AND(A,B),C))``)."""
+    kind = tree[0]
+    if kind == "var":
+        return tree[1]
+    if kind == "const":
+        return "CONST1()" if tree[1] else "CONST0()"
+    if kind == "not":
+        return f"NOT({function_to_prefix(tree[1])})"
+    return f"{kind.upper()}({','.join(function_to_prefix(t) for t in tree[1])})"
+
+
+def function_truth_table(tree, pins: Sequence[str]) -> int:
+    """
+    Truth table 16-bit của cây theo biến ``pins`` (pin i = biến i, tối đa 4).
+    Biến không có trong ``pins`` → ``CellFunctionError``.
+    """
+    if len(pins) > len(TT4_VARS):
+        raise CellFunctionError(f"too many pins ({len(pins)}) for a 4-input truth table")
+    index = {pin: TT4_VARS[i] for i, pin in enumerate(pins)}
+    index.update({pin.upper(): v for pin, v in list(index.items())})
+
+    def evaluate(node) -> int:
+        kind = node[0]
+        if kind == "var":
+            value = index.get(node[1], index.get(node[1].upper()))
+            if value is None:
+                raise CellFunctionError(f"unknown pin {node[1]}")
+            return value
+        if kind == "const":
+            return TT4_FULL if node[1] else 0
+        if kind == "not":
+            return evaluate(node[1]) ^ TT4_FULL
+        values = [evaluate(t) for t in node[1]]
+        result = values[0]
+        for v in values[1:]:
+            if kind == "and":
+                result &= v
+            elif kind == "or":
+                result |= v
+            else:
+                result ^= v
+        return result
+
+    return evaluate(tree)
+
+
+def cell_truth_table(cell) -> Optional[Tuple[int, int]]:
+    """
+    ``(truth16, num_inputs)`` của một ``LibraryCell`` tổ hợp một output, theo thứ
+    tự ``cell.input_pins``; ``None`` nếu hàm không parse được hoặc cell có hơn
+    4 input.
+
+    ``create_standard_library`` ghi INV/BUF là ``"NOT"``/``"BUF"`` không có đối
+    số: khi đó hàm áp lên input pin duy nhất.
+    """
+    pins = list(cell.input_pins or [])
+    if len(pins) > len(TT4_VARS) or len(cell.output_pins or []) != 1:
+        return None
+    function = (cell.function or "").strip()
+    if function.upper() in ("NOT", "INV", "BUF") and len(pins) == 1:
+        function = f"{function}({pins[0]})"
+    try:
+        tree = parse_cell_function(function)
+        return function_truth_table(tree, pins), len(pins)
+    except (CellFunctionError, RecursionError):
+        return None
@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""
+Cut-based Technology Mapping (standard cell)
+
+Khác với ``TechnologyMapper`` (mỗi AND 2-input → một cell tra theo chuỗi hàm),
+mapper này phủ AIG bằng cell thư viện qua cut:
+
+    1. Liệt kê 4-feasible cuts (``core/synthesis/aig_cuts.py``); mỗi cut có
+       truth table → lớp NPN (``core/synthesis/npn.py``).
+    2. Thư viện được index theo lớp NPN: mọi cell tổ hợp ≤ 4 input (kể cả
+       AOI/OAI/MUX/XOR của Sky130) khớp được mọi cut cùng lớp, với hoán vị
+       pin và pha input/output suy ra từ hai phép biến đổi NPN.
+    3. Mỗi node có hai tín hiệu (pha dương ``node_<id>`` và pha âm
+       ``node_<id>_n``); input cần pha ngược lấy từ pha kia của leaf, pha
+       thiếu được tạo bằng inverter.
+    4. Delay-optimal DP theo arrival time (delay mỗi cell = ``cell.delay``,
+       critical path là max, không phải tổng), rồi tính required time từ
+       delay tối ưu.
+    5. Area recovery dưới ràng buộc required time: area-flow rồi exact-area
+       (ref/deref trên mapping hiện tại).
+
+Kết quả ghi vào ``logic_network`` như ``TechnologyMapper`` nên dùng lại được
+``convert_mapped_logic_network_to_netlist`` và báo cáo; ``po_signals`` cho biết
+tín hiệu nào lái từng PO (pha đã xử lý, không cần NOT chưa map).
+
+Giới hạn: chỉ cell một output, ≤ 4 input, có hàm tổ hợp parse được
+(``cell_function.py``); cell dùng pin không ảnh hưởng hàm bị bỏ qua.
+"""
+
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.synthesis.aig_cuts import CutEnumerator
+from core.synthesis.aig_traversal import and_program
+from core.synthesis.npn import TT4_FULL, TT4_VARS, npn_canonical, tt4_flip
+from core.utils.performance import trace_span
+
+from .technology_mapping import LibraryCell, LogicNode, TechnologyLibrary, TechnologyMapper
+
+logger = logging.getLogger(__name__)
+
+_INF = float('inf')
+_EPS = 1e-9
+
+# Match: (cell | None, leaf signals theo thứ tự input pin). cell None = dây nối
+# tới leaf duy nhất (alias) hoặc hằng số (leaf là tín hiệu của node hằng).
+Match = Tuple[Optional[LibraryCell], Tuple[int, ...]]
+
+
+def _support(truth: int) -> List[int]:
+    """Các biến (0..3) mà hàm 16-bit phụ thuộc."""
+    return [i for i in range(4) if tt4_flip(truth, i) != truth]
+
+
+def _pareto(cells: List[LibraryCell]) -> List[LibraryCell]:
+    """Giữ các cell không bị cell khác tốt hơn cả area lẫn delay."""
+    kept: List[LibraryCell] = []
+    for cell in sorted(cells, key=lambda c: (c.area, c.delay, c.name)):
+        if not kept or cell.delay < kept[-1].delay - _EPS:
+            kept.append(cell)
+    return kept
+
+
+class CellLibraryIndex:
+    """
+    Index thư viện theo lớp NPN.
+
+    ``classes[rep]`` là danh sách ``(cell, perm, neg, out, vars)``: cell có hàm
+    ``g(z) = out ^ rep(w)``, ``w[i] = z[perm[i]] ^ neg_i``; ``vars`` là các biến
+    mà ``rep`` phụ thuộc.
+    """
+
+    def __init__(self, library: TechnologyLibrary):
+        # Dựa trên index NPN của thư viện (truth table mỗi cell chỉ tính một lần)
+        by_function: Dict[Tuple[int, int], List[LibraryCell]] = {}
+        self.skipped: List[str] = library.unindexed_cells
+        for entries in library.npn_index.values():
+            for cell, truth, num_inputs in entries:
+                if num_inputs == 0:
+                    self.skipped.append(cell.name)
+                    continue
+                by_function.setdefault((truth, num_inputs), []).append(cell)
+
+        self.classes: Dict[int, List[Tuple[LibraryCell, Tuple[int, ...], int, int, Tuple[int, ...]]]] = {}
+        self.inverter: Optional[LibraryCell] = None
+        self.num_cells = 0
+        for (truth, num_inputs), cells in by_function.items():
+            rep, (perm, neg, out) = npn_canonical(truth)
+            rep_vars = tuple(_support(rep))
+            for cell in _pareto(cells):
+                self.classes.setdefault(rep, []).append((cell, perm, neg, out, rep_vars))
+                self.num_cells += 1
+            if num_inputs == 1 and truth == TT4_VARS[0] ^ TT4_FULL:
+                best = min(cells, key=lambda c: (c.area, c.delay, c.name))
+                if self.inverter is None or (best.area, best.delay) < (self.inverter.area, self.inverter.delay):
+                    self.inverter = best
+
+    def has_and2(self) -> bool:
+        rep, _xform = npn_canonical(TT4_VARS[0] & TT4_VARS[1])
+        return rep in self.classes
+
+
+class CutMapper(TechnologyMapper):
+    """
+    Standard-cell mapper dựa trên cut + NPN matching, delay-optimal rồi
+    area recovery (area-flow + exact-area) dưới required time.
+
+    Args:
+        library: thư viện đã nạp (cần ít nhất một inverter và một cell lớp AND2)
+        cut_size: số leaves tối đa mỗi cut (≤ 4)
+        max_cuts: số cut giữ lại mỗi node
+        area_flow_rounds / exact_area_rounds: số vòng area recovery
+        delay_relax: nới delay mục tiêu (0.1 = cho phép chậm hơn 10% so với
+            delay tối ưu để đổi lấy area)
+    """
+
+    def __init__(self, library: TechnologyLibrary, cut_size: int = 4, max_cuts: int = 8,
+                 area_flow_rounds: int = 1, exact_area_rounds: int = 2, delay_relax: float = 0.0):
+        super().__init__(library)
+        if not 2 <= cut_size <= 4:
+            raise ValueError(f"cut_size must be in 2..4, got {cut_size}")
+        self.cut_size = cut_size
+        self.max_cuts = max_cuts
+        self.area_flow_rounds = area_flow_rounds
+        self.exact_area_rounds = exact_area_rounds
+        self.delay_relax = delay_relax
+        self.index = CellLibraryIndex(library)
+        self.po_signals: List[str] = []
+        self.stats: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------ API
+
+    def map(self, aig) -> Dict[str, Any]:
+        """Map ``aig``; điền ``logic_network``/``po_signals`` và trả về kết quả."""
+        start = time.perf_counter()
+        index = self.index
+        if index.inverter is None or not index.has_and2():
+            raise ValueError(
+                f"Library '{self.library.name}' needs an inverter and an AND2-class cell for cut mapping"
+            )
+        self._inv = index.inverter
+        with trace_span("techmap.match", category="techmap"):
+            self._setup(aig)
+            self._enumerate_matches(aig)
+        t_match = time.perf_counter()
+
+        with trace_span("techmap.select", category="techmap"):
+            self._select_all("delay")
+            self._compute_refs()
+            area_delay = self._mapped_area()
+            delay_opt = self._max_po_arrival()
+            self._target = delay_opt * (1.0 + self.delay_relax)
+            self._compute_required()
+
+            area_flow = area_delay
+            for _ in range(self.area_flow_rounds):
+                self._update_estimates()
+                self._select_all("flow")
+                self._compute_refs()
+                self._compute_required()
+                area_flow = self._mapped_area()
+
+            area_exact = area_flow
+            for _ in range(self.exact_area_rounds):
+                self._select_all("exact")
+                self._compute_refs()
+                self._compute_required()
+                area_exact = self._mapped_area()
+
+        with trace_span("techmap.convert", category="techmap"):
+            self._build_network(aig)
+        delay = self._max_po_arrival()
+        cells = sum(1 for node in self.logic_network.values() if node.mapped_cell)
+        elapsed = time.perf_counter() - start
+        self.stats = {
+            'and_nodes': len(self._program),
+            'cuts': self._num_cuts,
+            'matches': self._num_matches,
+            'area_delay_mapping': area_delay,
+            'area_after_flow': area_flow,
+            'area_after_exact': area_exact,
+            'delay_optimal': delay_opt,
+            'match_time': t_match - start,
+            'time': elapsed,
+        }
+        logger.info(
+            f"  Cut mapping: {cells} cells, area {area_exact:.2f} "
+            f"(delay-opt {area_delay:.2f}), delay {delay:.3f}, {elapsed:.2f}s"
+        )
+        results = {
+            'strategy': 'cut',
+            'total_area': area_exact,
+            'total_delay': delay,
+            'critical_path_delay': delay,
+            'mapped_nodes': cells,
+            'total_nodes': len(self.logic_network),
+            'mapping_success_rate': cells / len(self.logic_network) if self.logic_network else 0,
+        }
+        results.update({f'cut_{k}': v for k, v in self.stats.items()})
+        self.mapping_results = results
+        return results
+
+    # ------------------------------------------------------------ matching
+
+    def _setup(self, aig):
+        self._program = and_program(aig)
+        size = 2 * aig.next_node_id
+        self._size = size
+        self._const0 = aig.const0.node_id
+        self._const1 = aig.const1.node_id
+        self._pi_names = {node.node_id: name for name, node in aig.pis.items()}
+        self._arrival = [0.0] * size
+        self._flow = [0.0] * size
+        self._required = [_INF] * size
+        self._refs = [0] * size
+        self._est = [1.0] * size
+        self._match: List[Optional[Match]] = [None] * size
+        self._cands: Dict[int, List[Match]] = {}
+
+        inv = self.index.inverter
+        for pid in self._pi_names:
+            self._match[2 * pid + 1] = (inv, (2 * pid,))
+            self._arrival[2 * pid + 1] = inv.delay
+            self._flow[2 * pid + 1] = inv.area
+        for cid in (self._const0, self._const1):
+            # Pha âm của hằng = hằng kia (không cần cell)
+            other = self._const1 if cid == self._const0 else self._const0
+            self._match[2 * cid + 1] = (None, (2 * other,))
+
+        fanout = [0] * aig.next_node_id
+        for _out, a, b, _op in self._program:
+            fanout[a] += 1
+            fanout[b] += 1
+        self._po_sigs: List[int] = []
+        for po, inv_flag in aig.pos:
+            fanout[po.node_id] += 1
+            self._po_sigs.append(2 * po.node_id + (1 if inv_flag else 0))
+        for node_id, count in enumerate(fanout):
+            self._est[2 * node_id] = self._est[2 * node_id + 1] = max(1.0, float(count))
+
+    def _enumerate_matches(self, aig):
+        store = CutEnumerator(self.cut_size, self.max_cuts).enumerate(aig)
+        const_value = {self._const0: 0, self._const1: TT4_FULL}
+        num_cuts = 0
+        num_matches = 0
+        for out, a, b, op in self._program:
+            seen = set()
+            cands: List[Match] = []
+            cuts = [(store.leaves(c), store.truth(c) & TT4_FULL) for c in store.cut_indices(out)[1:]]
+            # Cut fanin luôn có mặt: bảo đảm node nào cũng khớp được (lớp AND2)
+            fanin_leaves = tuple(sorted({x for x in (a, b) if x not in const_value}))
+            values = []
+            for x, inv in ((a, op & 1), (b, op & 2)):
+                v = const_value[x] if x in const_value else TT4_VARS[fanin_leaves.index(x)]
+                values.append(v ^ (TT4_FULL if inv else 0))
+            cuts.append((fanin_leaves, values[0] & values[1]))
+            for leaves, truth in cuts:
+                if leaves in seen:
+                    continue
+                seen.add(leaves)
+                num_cuts += 1
+                num_matches += self._match_cut(out, leaves, truth, cands)
+            self._cands[out] = cands
+
+        self._num_cuts = num_cuts
+        self._num_matches = num_matches
+
+    def _match_cut(self, out: int, leaves: Sequence[int], truth: int, cands: List[Match]) -> int:
+        support = _support(truth)
+        if not support:
+            # Hàm hằng: alias tới node hằng
+            value_sig = 2 * self._const1 if truth else 2 * self._const0
+            cands.append((None, (2 * out, value_sig)))
+            cands.append((None, (2 * out + 1, value_sig ^ 1)))
+            return 2
+        if len(support) == 1:
+            i = support[0]
+            phase = 0 if truth == TT4_VARS[i] else 1
+            leaf = 2 * leaves[i]
+            cands.append((None, (2 * out, leaf | phase)))
+            cands.append((None, (2 * out + 1, leaf | (phase ^ 1))))
+            return 2
+        if len(support) != len(leaves):
+            return 0  # cut dư leaf: cut nhỏ hơn đã có trong danh sách
+
+        rep, (perm_f, neg_f, out_f) = npn_canonical(truth)
+        count = 0
+        for cell, perm_g, neg_g, out_g, rep_vars in self.index.classes.get(rep, ()):
+            pins = [0] * len(rep_vars)
+            neg = neg_f ^ neg_g
+            for i in rep_vars:
+                pins[perm_g[i]] = 2 * leaves[perm_f[i]] + ((neg >> i) & 1)
+            sig = 2 * out + (out_f ^ out_g)
+            cands.append((cell, (sig,) + tuple(pins)))
+            count += 1
+        return count
+
+    # ----------------------------------------------------------- selection
+
+    def _match_arrival(self, cell: Optional[LibraryCell], leaves: Sequence[int]) -> float:
+        arrival = self._arrival
+        worst = 0.0
+        for leaf in leaves:
+            if arrival[leaf] > worst:
+                worst = arrival[leaf]
+        return worst + (cell.delay if cell is not None else 0.0)
+
+    def _match_flow(self, cell: Optional[LibraryCell], leaves: Sequence[int]) -> float:
+        flow = self._flow
+        return (cell.area if cell is not None else 0.0) + sum(flow[leaf] for leaf in leaves)
+
+    def _select_all(self, mode: str):
+        for out, _a, _b, _op in self._program:
+            self._select_node(out, mode)
+
+    def _select_node(self, node: int, mode: str):
+        inv = self._inv
+        refs = self._refs
+        required = self._required
+        exact = mode == "exact"
+        sigs = (2 * node, 2 * node + 1)
+        if exact:
+            for s in sigs:
+                if refs[s] and self._match[s] is not None:
+                    self._deref(self._match[s])
+            used = [refs[sigs[0]] > 0, refs[sigs[1]] > 0]
+
+        # Match trực tiếp tốt nhất cho từng pha (không qua inverter)
+        best: List[Optional[Match]] = [None, None]
+        best_key: List[Tuple[float, float]] = [(_INF, _INF), (_INF, _INF)]
+        fallback: List[Optional[Match]] = [None, None]
+        fallback_arr = [_INF, _INF]
+        for cand in self._cands[node]:
+            cell, pins = cand
+            s = pins[0]
+            leaves = pins[1:]
+            p = s & 1
+            arrival = self._match_arrival(cell, leaves)
+            if arrival < fallback_arr[p] - _EPS:
+                fallback[p], fallback_arr[p] = cand, arrival
+            if mode != "delay" and arrival > required[s] + _EPS:
+                continue
+            if mode == "delay":
+                key = (arrival, self._match_flow(cell, leaves))
+            elif mode == "flow":
+                key = (self._match_flow(cell, leaves), arrival)
+            else:
+                key = (self._exact_area(cell, leaves), arrival)
+            if key < best_key[p]:
+                best[p], best_key[p] = cand, key
+        for p in (0, 1):
+            if best[p] is None:
+                best[p] = fallback[p]
+                if best[p] is not None:
+                    cell, pins = best[p]
+                    best_key[p] = self._key(mode, cell, pins[1:])
+
+        # Pha còn lại qua inverter (tối đa một pha dùng inverter)
+        chosen: List[Optional[Match]] = list(best)
+        for p in (0, 1):
+            other = best[1 - p]
+            if other is None or chosen[1 - p] is not other:
+                continue
+            arrival = self._match_arrival(other[0], other[1][1:]) + inv.delay
+            if mode != "delay" and arrival > required[sigs[p]] + _EPS:
+                continue
+            if mode == "delay":
+                key = (arrival, best_key[1 - p][1] / self._est[sigs[1 - p]] + inv.area)
+            elif mode == "flow":
+                key = (best_key[1 - p][0] / self._est[sigs[1 - p]] + inv.area, arrival)
+            else:
+                shared = 0.0 if refs[sigs[1 - p]] else best_key[1 - p][0]
+                key = (inv.area + shared, arrival)
+            if best[p] is None or key < best_key[p]:
+                chosen[p] = (inv, (sigs[p], sigs[1 - p]))
+
+        # Pha trực tiếp trước: pha inverter tham chiếu tới nó
+        for p in sorted((0, 1), key=lambda q: chosen[q] is not None and chosen[q][0] is inv
+                        and chosen[q][1][1:] == (sigs[1 - q],)):
+            s = sigs[p]
+            cell, pins = chosen[p]
+            leaves = pins[1:]
+            self._match[s] = (cell, leaves)
+            self._arrival[s] = self._match_arrival(cell, leaves)
+            area = self._match_flow(cell, leaves)
+            self._flow[s] = area / self._est[s] if cell is not None else area
+
+        if exact:
+            # ``used`` chụp sau deref: chỉ tham chiếu từ ngoài node
+            for s in [s for s in sigs if used[s & 1]]:
+                self._ref(self._match[s])
+
+    def _key(self, mode: str, cell: Optional[LibraryCell], leaves: Sequence[int]) -> Tuple[float, float]:
+        arrival = self._match_arrival(cell, leaves)
+        if mode == "delay":
+            return (arrival, self._match_flow(cell, leaves))
+        if mode == "flow":
+            return (self._match_flow(cell, leaves), arrival)
+        return (self._exact_area(cell, leaves), arrival)
+
+    # ------------------------------------------------------ ref / deref
+
+    def _ref(self, match: Match) -> float:
+        """Tham chiếu các leaf của match; trả về area các cell mới được dùng."""
+        cell, leaves = match
+        area = cell.area if cell is not None else 0.0
+        refs = self._refs
+        matches = self._match
+        stack = list(leaves)
+        while stack:
+            s = stack.pop()
+            refs[s] += 1
+            if refs[s] == 1 and matches[s] is not None:
+                leaf_cell, leaf_leaves = matches[s]
+                if leaf_cell is not None:
+                    area += leaf_cell.area
+                stack.extend(leaf_leaves)
+        return area
+
+    def _deref(self, match: Match) -> float:
+        """Ngược của ``_ref``; trả về area được giải phóng."""
+        cell, leaves = match
+        area = cell.area if cell is not None else 0.0
+        refs = self._refs
+        matches = self._match
+        stack = list(leaves)
+        while stack:
+            s = stack.pop()
+            refs[s] -= 1
+            if refs[s] == 0 and matches[s] is not None:
+                leaf_cell, leaf_leaves = matches[s]
+                if leaf_cell is not None:
+                    area += leaf_cell.area
+                stack.extend(leaf_leaves)
+        return area
+
+    def _exact_area(self, cell: Optional[LibraryCell], leaves: Sequence[int]) -> float:
+        match = (cell, tuple(leaves))
+        area = self._ref(match)
+        self._deref(match)
+        return area
+
+    def _compute_refs(self):
+        self._refs = [0] * self._size
+        for s in self._po_sigs:
+            self._ref((None, (s,)))
+
+    def _mapped_area(self) -> float:
+        refs = self._refs
+        return sum(
+            m[0].area for s, m in enumerate(self._match)
+            if m is not None and m[0] is not None and refs[s]
+        )
+
+    def _max_po_arrival(self) -> float:
+        return max((self._arrival[s] for s in self._po_sigs), default=0.0)
+
+    def _update_estimates(self):
+        est = self._est
+        refs = self._refs
+        for s in range(self._size):
+            est[s] = max(1.0, (est[s] + 2.0 * refs[s]) / 3.0)
+
+    def _compute_required(self):
+        required = [_INF] * self._size
+        for s in self._po_sigs:
+            required[s] = self._target
+        refs = self._refs
+        matches = self._match
+        for node in [out for out, _a, _b, _op in reversed(self._program)] + list(self._pi_names):
+            # Pha dùng inverter từ pha kia xử lý trước
+            first = 2 * node + 1 if matches[2 * node + 1] is not None and matches[2 * node + 1][1] == (2 * node,) else 2 * node
+            for s in (first, first ^ 1):
+                if not refs[s] or matches[s] is None:
+                    continue
+                cell, leaves = matches[s]
+                req = required[s] - (cell.delay if cell is not None else 0.0)
+                for leaf in leaves:
+                    if req < required[leaf]:
+                        required[leaf] = req
+        self._required = required
+
+    # ------------------------------------------------------------ output
+
+    def _signal_name(self, s: int) -> str:
+        node, phase = s >> 1, s & 1
+        if node in (self._const0, self._const1):
+            value = (node == self._const1) ^ bool(phase)
+            return "CONST1" if value else "CONST0"
+        if node in self._pi_names:
+            name = self._pi_names[node]
+            return f"{re.sub(r'[^A-Za-z0-9_]', '_', name)}_n" if phase else name
+        return f"node_{node}_n" if phase else f"node_{node}"
+
+    def _resolve(self, s: int) -> int:
+        """Bỏ qua alias (dây nối) tới tín hiệu thật lái ``s``."""
+        matches = self._match
+        while matches[s] is not None and matches[s][0] is None and (s >> 1) not in (self._const0, self._const1):
+            s = matches[s][1][0]
+        return s
+
+    def _build_network(self, aig):
+        self.logic_network = {}
+        refs = self._refs
+        for s in range(self._size):
+            match = self._match[s]
+            if not refs[s] or match is None or match[0] is None:
+                continue
+            cell, leaves = match
+            name = self._signal_name(s)
+            inputs = [self._signal_name(self._resolve(leaf)) for leaf in leaves]
+            node = LogicNode(name, cell.function, inputs, name)
+            node.mapped_cell = cell
+            node.mapping_cost = cell.area
+            self.logic_network[name] = node
+        self.po_signals = [self._signal_name(self._resolve(s)) for s in self._po_sigs]
+
+
+def critical_path_delay(mapper: TechnologyMapper) -> float:
+    """
+    Delay đường găng (max arrival) của ``logic_network`` đã map, với delay mỗi
+    cell = ``cell.delay`` (node chưa map: 0). Dùng để so sánh công bằng với các
+    strategy cũ, vốn báo ``total_delay`` là tổng delay.
+    """
+    drivers = {node.mapped_output or node.output: node for node in mapper.logic_network.values()}
+
+    def fanins(node: LogicNode) -> List[str]:
+        return node.mapped_inputs if node.mapped_inputs is not None else node.inputs
+
+    arrival: Dict[str, float] = {}
+    for signal in drivers:
+        if signal in arrival:
+            continue
+        stack = [(signal, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if current in arrival:
+                continue
+            node = drivers[current]
+            if not expanded:
+                stack.append((current, True))
+                stack.extend((i, False) for i in fanins(node) if i in drivers and i not in arrival)
+                continue
+            worst = max((arrival.get(i, 0.0) for i in fanins(node)), default=0.0)
+            delay = node.mapped_cell.delay if node.mapped_cell else 0.0
+            arrival[current] = worst + delay
+    return max(arrival.values(), default=0.0)
+
+
+def cut_map(aig, library: TechnologyLibrary, **kwargs) -> Tuple[CutMapper, Dict[str, Any]]:
+    """Tiện ích: ``CutMapper(library, **kwargs)`` + ``map(aig)``."""
+    mapper = CutMapper(library, **kwargs)
+    results = mapper.map(aig)
+    return mapper, results
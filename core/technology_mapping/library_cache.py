@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Cache thư viện đã biên dịch (compiled library snapshot) cho technology mapping.
+
+Nạp thư viện từ ``.lib`` / ``.json`` / SkyWater ``*.lib.json`` rồi chuẩn hóa hàm,
+xây index NPN và gộp với standard library tốn thời gian ở mỗi lần ``techmap``.
+Snapshot lưu sẵn toàn bộ (pickle, có version) dưới thư mục cache:
+
+    - ``TechnologyLibrary`` (cell + bảng NLDM, ``function_map`` đã chuẩn hóa,
+      truth table của từng hàm cell, index NPN) và bản gộp standard library
+      (``merged_with_standard_library``);
+    - bảng tra NPN 4 input (``npn_tables``) — không phải tính lại mỗi process.
+
+Khóa snapshot: loại nguồn + đường dẫn tuyệt đối các file nguồn + tùy chọn nạp.
+Snapshot chỉ hợp lệ khi mọi file nguồn còn cùng ``mtime``/kích thước, hoặc nếu
+``mtime`` đổi thì nội dung (SHA-256) vẫn như cũ; ngược lại thư viện được nạp lại
+từ nguồn và snapshot được ghi đè.
+
+File snapshot gồm hai pickle liên tiếp: header nhỏ (``CacheEntry`` đọc được mà
+không cần nạp thư viện, cho ``list_cached_libraries``) và payload.
+
+Biến môi trường:
+    - ``MYLOGIC_CACHE_DIR``: thư mục cache (mặc định ``~/.cache/mylogic/libraries``)
+    - ``MYLOGIC_LIBRARY_CACHE=0``: tắt cache
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from core.synthesis.npn import install_npn_tables, npn_tables
+
+from .technology_mapping import TechnologyLibrary, merged_with_standard_library
+
+logger = logging.getLogger(__name__)
+
+# Tăng khi cấu trúc TechnologyLibrary / LibraryCell / CellTiming thay đổi
+CACHE_VERSION = 1
+SNAPSHOT_SUFFIX = ".mlib"
+_MAGIC = b"MYLOGIC-LIBCACHE\n"
+
+# (đường dẫn tuyệt đối, mtime_ns, kích thước, sha256)
+SourceStamp = Tuple[str, int, int, str]
+
+
+class CacheEntry(NamedTuple):
+    """Header của một snapshot trong thư mục cache."""
+    path: str
+    kind: str
+    library_name: str
+    cells: int
+    sources: List[SourceStamp]
+    created: float
+    size: int
+
+
+def cache_dir() -> str:
+    """Thư mục cache hiện tại (``MYLOGIC_CACHE_DIR`` hoặc ``~/.cache/mylogic/libraries``)."""
+    return os.environ.get("MYLOGIC_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "mylogic", "libraries"
+    )
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("MYLOGIC_LIBRARY_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_stamps(paths: Sequence[str]) -> List[SourceStamp]:
+    """Dấu (path, mtime, size, sha256) của các file nguồn."""
+    stamps = []
+    for path in paths:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamps.append((path, st.st_mtime_ns, st.st_size, _file_digest(path)))
+    return stamps
+
+
+def _stamps_valid(stamps: Sequence[SourceStamp]) -> bool:
+    for path, mtime_ns, size, digest in stamps:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != size:
+            return False
+        if st.st_mtime_ns != mtime_ns and _file_digest(path) != digest:
+            return False
+    return True
+
+
+def snapshot_path(kind: str, paths: Sequence[str], options: Any = None,
+                  directory: Optional[str] = None) -> str:
+    """Đường dẫn snapshot cho (loại nguồn, file nguồn, tùy chọn nạp)."""
+    key = json.dumps([CACHE_VERSION, kind, sorted(os.path.abspath(p) for p in paths), options],
+                     sort_keys=True, default=str)
+    name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(directory or cache_dir(), f"{kind}-{name}{SNAPSHOT_SUFFIX}")
+
+
+def compile_library(library: TechnologyLibrary) -> TechnologyLibrary:
+    """Tính sẵn truth table của hàm cell, index NPN và bản gộp standard library."""
+    for lib in (library, merged_with_standard_library(library)):
+        for function in {cell.function for cell in lib.cells.values()}:
+            lib.function_truth(function)
+        lib.npn_index
+    return library
+
+
+def _read_header(path: str, f) -> Optional[CacheEntry]:
+    if f.read(len(_MAGIC)) != _MAGIC:
+        return None
+    header = pickle.load(f)
+    if not isinstance(header, dict) or header.get("version") != CACHE_VERSION:
+        return None
+    return CacheEntry(path, header["kind"], header["library_name"], header["cells"],
+                      header["sources"], header["created"], os.path.getsize(path))
+
+
+def read_snapshot(path: str) -> Optional[TechnologyLibrary]:
+    """Thư viện trong snapshot ``path`` nếu snapshot hợp lệ (version + file nguồn), ngược lại ``None``."""
+    try:
+        with open(path, "rb") as f:
+            entry = _read_header(path, f)
+            if entry is None or not _stamps_valid(entry.sources):
+                return None
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # snapshot hỏng / không unpickle được: coi như miss
+        logger.warning("Ignoring unreadable library snapshot %s: %s", path, e)
+        return None
+    install_npn_tables(*payload["npn_tables"])
+    return payload["library"]
+
+
+def write_snapshot(path: str, kind: str, library: TechnologyLibrary, stamps: Sequence[SourceStamp]) -> None:
+    """Ghi snapshot (ghi file tạm rồi ``os.replace`` để không để lại file dở)."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    header = {
+        "version": CACHE_VERSION,
+        "kind": kind,
+        "library_name": library.name,
+        "cells": len(library.cells),
+        "sources": list(stamps),
+        "created": time.time(),
+    }
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_MAGIC)
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump({"library": library, "npn_tables": npn_tables()}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def cached_library(kind: str, paths: Sequence[str], build: Callable[[], TechnologyLibrary],
+                   options: Any = None, directory: Optional[str] = None) -> TechnologyLibrary:
+    """
+    Thư viện từ snapshot nếu còn hợp lệ; không thì ``build()``, biên dịch
+    (``compile_library``) rồi ghi snapshot. Cache tắt → chỉ ``build()``.
+    """
+    if not cache_enabled():
+        return build()
+    path = snapshot_path(kind, paths, options, directory)
+    start = time.perf_counter()
+    library = read_snapshot(path)
+    if library is not None:
+        logger.info("Library cache hit: %s (%d cells, %.1f ms)", library.name, len(library.cells),
+                    (time.perf_counter() - start) * 1000)
+        return library
+    # Dấu nguồn lấy trước khi nạp: file sửa trong lúc nạp sẽ làm snapshot mất hiệu lực
+    stamps = source_stamps(paths)
+    library = compile_library(build())
+    try:
+        write_snapshot(path, kind, library, stamps)
+        logger.info("Library cache miss: %s compiled to %s", library.name, path)
+    except (OSError, pickle.PicklingError) as e:
+        logger.warning("Could not write library snapshot %s: %s", path, e)
+    return library
+
+
+def list_cached_libraries(directory: Optional[str] = None) -> List[CacheEntry]:
+    """Các snapshot hợp lệ version trong thư mục cache (chỉ đọc header)."""
+    directory = directory or cache_dir()
+    entries = []
+    if not os.path.isdir(directory):
+        return entries
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(SNAPSHOT_SUFFIX):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path, "rb") as f:
+                entry = _read_header(path, f)
+        except Exception:
+            entry = None
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+def is_stale(entry: CacheEntry) -> bool:
+    """Snapshot không còn khớp file nguồn (file đã sửa / bị xóa)."""
+    return not _stamps_valid(entry.sources)
+
+
+def clear_library_cache(directory: Optional[str] = None, stale_only: bool = False) -> int:
+    """Xóa snapshot trong thư mục cache (``stale_only``: chỉ snapshot hết hạn / khác version); trả về số file đã xóa."""
+    directory = directory or cache_dir()
+    if not os.path.isdir(directory):
+        return 0
+    valid = {e.path for e in list_cached_libraries(directory) if not (stale_only and is_stale(e))}
+    removed = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if not name.endswith(SNAPSHOT_SUFFIX):
+            continue
+        if stale_only and path in valid:
+            continue
+        os.unlink(path)
+        removed += 1
+    return removed
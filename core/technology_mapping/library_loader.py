@@ -9,8 +9,9 @@ Nhiệm vụ: đọc mô tả cell từ file → xây ``TechnologyLibrary`` / ``
 Định dạng:
     - Liberty (.lib)
     - JSON schema nội bộ MyLogic (.json)
-    - SkyWater PDK: ``load_skywater_sc_library()`` quét ``*.lib.json`` theo góc PVT;
-      chỉ cell tổ hợp (bỏ qua sequential ``IQ`` trong Liberty JSON).
+    - SkyWater PDK: ``load_skywater_sc_library()`` quét ``*.lib.json`` theo góc PVT
+      (parse song song bằng process pool); chỉ cell tổ hợp (bỏ qua sequential
+      ``IQ`` trong Liberty JSON). ``load_skywater_sc_corners()`` nạp nhiều góc một lần.
     - Verilog (.v) — hỗ trợ cơ bản
 
 Author: MyLogic EDA Tool Team
@@ -21,9 +22,19 @@ import json
 import re
 import glob
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-
-from .technology_mapping import TechnologyLibrary, LibraryCell
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+from .technology_mapping import MultiCornerLibrary, TechnologyLibrary, LibraryCell
+from .cell_function import CellFunctionError, function_to_prefix, parse_cell_function
+from core.timing.liberty_parser import iter_liberty_groups
+from core.timing.liberty_timing import (
+    LIBERTY_TIMING_GROUPS,
+    cell_timing_from_liberty_group,
+    cell_timing_from_skywater_dict,
+    lu_table_template,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -99,7 +110,10 @@ def load_liberty_library(file_path: str) -> TechnologyLibrary:
     """
     Load technology library from Liberty format file.
     
-    Liberty format là industry standard cho ASIC cell libraries.
+    Liberty format là industry standard cho ASIC cell libraries. File được parse
+    dạng streaming (``core.timing.liberty_parser``): chỉ dựng cây cho
+    ``lu_table_template`` / ``cell`` / ``pin`` / ``timing`` và bảng delay, mỗi cell
+    được chuyển thành ``LibraryCell`` ngay khi đọc xong rồi bỏ đi.
     
     Args:
         file_path: Path to .lib file
@@ -109,118 +123,98 @@ def load_liberty_library(file_path: str) -> TechnologyLibrary:
     """
     logger.info(f"Parsing Liberty library: {file_path}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Extract library name
-    lib_name_match = re.search(r'library\s*\(([^)]+)\)', content)
-    library_name = lib_name_match.group(1) if lib_name_match else "loaded_library"
-    
-    library = TechnologyLibrary(library_name)
-    
-    # Parse cells: cell (NAME) { ... }
-    # Liberty format có nested braces, cần parse cẩn thận bằng cách đếm braces
+    library = TechnologyLibrary("loaded_library")
+    # Template NLDM (lu_table_template) luôn khai báo trước các cell dùng nó
+    templates: Dict[str, Dict[str, Any]] = {}
     cells_parsed = 0
     
-    # Find all cell declarations
-    cell_start_pattern = r'cell\s*\((\w+)\)\s*\{'
-    cell_starts = list(re.finditer(cell_start_pattern, content))
+    groups = iter_liberty_groups(
+        file_path,
+        emit=("library", "lu_table_template", "cell"),
+        keep=LIBERTY_TIMING_GROUPS,
+    )
+    for group in groups:
+        if group.name == "cell":
+            cell = _library_cell_from_liberty_group(group, templates)
+            if cell:
+                library.add_cell(cell)
+                cells_parsed += 1
+        elif group.name == "lu_table_template":
+            if group.args:
+                templates[group.args[0]] = lu_table_template(group)
+        elif group.args:
+            library.name = group.args[0]
     
-    for i, cell_start_match in enumerate(cell_starts):
-        cell_name = cell_start_match.group(1)
-        start_pos = cell_start_match.end()  # Position after opening brace
-        
-        # Find matching closing brace by counting braces
-        brace_count = 1
-        pos = start_pos
-        end_pos = len(content)
-        
-        while pos < len(content) and brace_count > 0:
-            if content[pos] == '{':
-                brace_count += 1
-            elif content[pos] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end_pos = pos
-                    break
-            pos += 1
+    logger.info(f"Loaded {cells_parsed} cells from Liberty library")
+    return library
+
+
+def _library_cell_from_liberty_group(group, templates: Dict[str, Dict[str, Any]]) -> Optional[LibraryCell]:
+    """``LibraryCell`` từ group ``cell`` đã parse (``None`` nếu không xác định được hàm)."""
+    cell_name = group.args[0] if group.args else "unnamed_cell"
+    try:
+        area = float(group.attributes.get("area", 1.0))
+        logger.debug(f"Parsing cell: {cell_name}, area: {area}")
         
-        # Extract cell body (without the closing brace)
-        cell_body = content[start_pos:end_pos]
+        pins = [pin for pin in group.find("pin") if pin.args]
         
-        try:
-            # Extract area
-            area_match = re.search(r'area\s*:\s*([\d.]+)', cell_body)
-            area = float(area_match.group(1)) if area_match else 1.0
-            
-            logger.debug(f"Parsing cell: {cell_name}, area: {area}")
+        # Extract function from the first pin that declares one
+        function = None
+        func_pin = next((pin for pin in pins if pin.attributes.get("function")), None)
+        if func_pin is not None:
+            function = func_pin.attributes["function"]
             
-            # Extract function from output pin
-            # Look for pin(Y) { function : "..." }
-            function = None
-            func_match = re.search(r'pin\s*\((\w+)\)\s*\{[^}]*function\s*:\s*"([^"]+)"', cell_body, re.DOTALL)
-            if func_match:
-                output_pin = func_match.group(1)
-                function = func_match.group(2)
-                
-                # Special handling for DFF cells: function is "IQ" (internal state)
-                # Use cell name to create proper function signature
-                if cell_name.upper().startswith('DFF_') or cell_name.lower().startswith('df'):
-                    # For DFF cells, infer function from cell name instead of "IQ"
+            # Special handling for DFF cells: function is "IQ" (internal state)
+            # Use cell name to create proper function signature
+            if cell_name.upper().startswith('DFF_') or cell_name.lower().startswith('df'):
+                # For DFF cells, infer function from cell name instead of "IQ"
+                function = _infer_function_from_name(cell_name)
+            else:
+                # Check if function is just a cell name (like "and2", "nand2")
+                # If it matches the cell name, infer from name instead
+                if function.lower() == cell_name.lower() or function == cell_name:
                     function = _infer_function_from_name(cell_name)
                 else:
-                    # Check if function is just a cell name (like "and2", "nand2")
-                    # If it matches the cell name, infer from name instead
-                    if function.lower() == cell_name.lower() or function == cell_name:
-                        function = _infer_function_from_name(cell_name)
-                    else:
-                        # Convert Liberty function to standard format
-                        # "!A" -> "NOT(A)", "A&B" -> "AND(A,B)", etc.
-                        function = _convert_liberty_function(function)
+                    # Convert Liberty function to standard format
+                    # "!A" -> "NOT(A)", "A&B" -> "AND(A,B)", etc.
+                    function = _convert_liberty_function(function)
+        else:
+            # Try to infer from cell name
+            function = _infer_function_from_name(cell_name)
+        
+        # Extract pins
+        input_pins = []
+        output_pins = []
+        for pin in pins:
+            direction = pin.attributes.get("direction", "input").lower()
+            if direction == "output":
+                output_pins.append(pin.args[0])
             else:
-                # Try to infer from cell name
-                function = _infer_function_from_name(cell_name)
-            
-            # Extract pins
-            input_pins = []
-            output_pins = []
-            
-            pin_pattern = r'pin\s*\((\w+)\)\s*\{([^}]+)\}'
-            for pin_match in re.finditer(pin_pattern, cell_body, re.DOTALL):
-                pin_name = pin_match.group(1)
-                pin_body = pin_match.group(2)
-                
-                direction_match = re.search(r'direction\s*:\s*(\w+)', pin_body)
-                direction = direction_match.group(1).lower() if direction_match else "input"
-                
-                if direction == "output":
-                    output_pins.append(pin_name)
-                else:
-                    input_pins.append(pin_name)
-            
-            # Extract delay (simplified - use average of timing values if available)
-            delay = _extract_delay_from_liberty(cell_body)
-            
-            # Create cell
-            if function:
-                cell = LibraryCell(
-                    name=cell_name,
-                    function=function,
-                    area=area,
-                    delay=delay,
-                    input_pins=input_pins,
-                    output_pins=output_pins
-                )
-                library.add_cell(cell)
-                cells_parsed += 1
-                logger.debug(f"Parsed cell: {cell_name} - {function}")
+                input_pins.append(pin.args[0])
         
-        except Exception as e:
-            logger.warning(f"Failed to parse cell {cell_name}: {e}")
-            continue
-    
-    logger.info(f"Loaded {cells_parsed} cells from Liberty library")
-    return library
+        # Extract delay (simplified - use average of timing values if available)
+        delay = _extract_delay_from_liberty(group)
+        
+        # Bảng NLDM + điện dung pin cho STA
+        timing = cell_timing_from_liberty_group(group, templates)
+        
+        if not function:
+            return None
+        cell = LibraryCell(
+            name=cell_name,
+            function=function,
+            area=area,
+            delay=delay,
+            input_pins=input_pins,
+            output_pins=output_pins,
+            input_load=_mean_pin_capacitance(timing, input_pins),
+            timing=timing if timing.arcs else None,
+        )
+        logger.debug(f"Parsed cell: {cell_name} - {function}")
+        return cell
+    except Exception as e:
+        logger.warning(f"Failed to parse cell {cell_name}: {e}")
+        return None
 
 
 def _strip_outer_parentheses(func_str: str) -> str:
@@ -243,6 +237,14 @@ def _strip_outer_parentheses(func_str: str) -> str:
     return s
 
 
+_LIBERTY_IDENT = r"\s*[A-Za-z_][A-Za-z0-9_]*\s*"
+# Dạng phẳng một toán tử mà nhánh chuyển đổi đơn giản bên dưới xử lý đúng
+_SIMPLE_LIBERTY_RE = re.compile(
+    rf"!?{_LIBERTY_IDENT}|!\(({_LIBERTY_IDENT}(&{_LIBERTY_IDENT})+|{_LIBERTY_IDENT}(\|{_LIBERTY_IDENT})+)\)"
+    rf"|{_LIBERTY_IDENT}((&{_LIBERTY_IDENT})+|(\|{_LIBERTY_IDENT})+|(\^{_LIBERTY_IDENT})+)"
+)
+
+
 def _convert_liberty_function(func_str: str) -> str:
     """
     Convert Liberty function format to standard format.
@@ -254,12 +256,20 @@ def _convert_liberty_function(func_str: str) -> str:
         "A^B" -> "XOR(A,B)"
         "!(A&B)" -> "NAND(A,B)"
         "!(A|B)" -> "NOR(A,B)"
+        "(A1&A2) | B1" -> "OR(AND(A1,A2),B1)"
     """
     func_str = _strip_outer_parentheses(func_str.strip())
 
     if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", func_str):
         return f"BUF({func_str})"
 
+    if not _SIMPLE_LIBERTY_RE.fullmatch(func_str):
+        # Biểu thức lồng / trộn toán tử (AOI, OAI, MUX, ...): parse đầy đủ
+        try:
+            return function_to_prefix(parse_cell_function(func_str))
+        except (CellFunctionError, RecursionError):
+            pass
+
     # Handle NOT
     if func_str.startswith('!'):
         inner = func_str[1:].strip()
@@ -368,23 +378,23 @@ def _extract_number_from_name(name: str, prefix: str) -> int:
     return 2  # Default to 2 inputs
 
 
-def _extract_delay_from_liberty(cell_body: str) -> float:
-    """Extract average delay from Liberty timing tables."""
-    # Look for timing tables
-    timing_pattern = r'timing\s*\(\)\s*\{[^}]*cell_rise[^}]*values\s*\([^)]+\)[^}]*cell_fall[^}]*values\s*\([^)]+\)'
-    
+def _extract_delay_from_liberty(cell_group) -> float:
+    """Extract average delay from the first cell_rise / cell_fall tables of a cell group."""
     delays = []
+    pending = [cell_group]
+    found = {}
+    while pending and len(found) < 2:
+        group = pending.pop(0)
+        for child in group.groups:
+            if child.name in ("cell_rise", "cell_fall"):
+                found.setdefault(child.name, child)
+            else:
+                pending.append(child)
     
-    # Try to find cell_rise and cell_fall values
-    rise_match = re.search(r'cell_rise[^{]*values\s*\([^)]+\)', cell_body, re.DOTALL)
-    fall_match = re.search(r'cell_fall[^{]*values\s*\([^)]+\)', cell_body, re.DOTALL)
-    
-    for match in [rise_match, fall_match]:
-        if match:
-            values_str = match.group(0)
-            # Extract numbers from values("0.1, 0.15, 0.2")
-            num_matches = re.findall(r'[\d.]+', values_str)
-            for num_str in num_matches:
+    for table in found.values():
+        # values("0.1, 0.15, 0.2", ...)
+        for row in table.complex_attributes.get("values", []):
+            for num_str in row.replace("\\", " ").split(","):
                 try:
                     delays.append(float(num_str))
                 except ValueError:
@@ -397,6 +407,12 @@ def _extract_delay_from_liberty(cell_body: str) -> float:
     return 0.1
 
 
+def _mean_pin_capacitance(timing, input_pins: List[str], default: float = 1.0) -> float:
+    """Điện dung trung bình của input pin (``input_load``); ``default`` nếu không có."""
+    caps = [timing.pin_capacitance[p] for p in input_pins if p in timing.pin_capacitance]
+    return sum(caps) / len(caps) if caps else default
+
+
 def _looks_like_skywater_cell_json(data: dict) -> bool:
     if not isinstance(data, dict):
         return False
@@ -486,6 +502,7 @@ def _library_cell_from_skywater_dict(data: dict, cell_name: str) -> Optional[Lib
     if not output_pins:
         return None
 
+    timing = cell_timing_from_skywater_dict(data)
     return LibraryCell(
         name=cell_name,
         function=function,
@@ -493,13 +510,131 @@ def _library_cell_from_skywater_dict(data: dict, cell_name: str) -> Optional[Lib
         delay=delay,
         input_pins=input_pins,
         output_pins=output_pins,
+        input_load=_mean_pin_capacitance(timing, input_pins),
+        timing=timing if timing.arcs else None,
     )
 
 
+def skywater_lib_json_paths(
+    libraries_root: str,
+    sc_library: str = "sky130_fd_sc_hd",
+    corner: str = "tt_025C_1v80",
+) -> List[str]:
+    """Các file ``*__<corner>.lib.json`` của ``sc_library`` (bỏ ccsnoise / pwrlkg), đã sắp xếp."""
+    cells_root = os.path.join(libraries_root, sc_library, "latest", "cells")
+    if not os.path.isdir(cells_root):
+        raise FileNotFoundError(f"SkyWater cells directory not found: {cells_root}")
+    pattern = os.path.join(cells_root, "*", f"*__{corner}.lib.json")
+    return [
+        path for path in sorted(glob.glob(pattern))
+        if "ccsnoise" not in path.lower() and "pwrlkg" not in path.lower()
+    ]
+
+
+def _load_skywater_cell_file(path: str) -> Tuple[Optional[LibraryCell], Optional[str]]:
+    """
+    Worker: đọc một file ``.lib.json`` → ``(cell, None)``; ``(None, lý do)`` nếu file
+    không đọc được, ``(None, None)`` nếu cell bị bỏ qua (sequential, không có hàm).
+    Hàm mức module để process pool pickle được.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return None, str(e)
+    if not isinstance(data, dict):
+        return None, None
+    return _library_cell_from_skywater_dict(data, _skywater_cell_name_from_lib_filename(path)), None
+
+
+def _load_skywater_cell_batch(paths: List[str]) -> List[Tuple[Optional[LibraryCell], Optional[str]]]:
+    return [_load_skywater_cell_file(path) for path in paths]
+
+
+def _default_workers() -> int:
+    return max(1, min(32, os.cpu_count() or 1))
+
+
+def _map_skywater_cell_files(
+    paths: List[str],
+    workers: Optional[int] = None,
+    executor: str = "process",
+) -> List[Tuple[Optional[LibraryCell], Optional[str]]]:
+    """
+    ``_load_skywater_cell_file`` cho mọi ``paths``, kết quả theo đúng thứ tự
+    ``paths`` (không phụ thuộc thứ tự worker xong việc).
+
+    ``executor``: ``"process"`` (mặc định; lùi về thread pool nếu không tạo được
+    process pool, ví dụ môi trường không có ``fork``/semaphore), ``"thread"`` hoặc
+    ``"serial"``. File được chia thành batch (~4 batch mỗi worker) để giảm chi phí
+    gửi/nhận giữa các process.
+    """
+    if executor not in ("process", "thread", "serial"):
+        raise ValueError(f"Unknown executor: {executor!r} (expected process, thread or serial)")
+    workers = _default_workers() if workers is None else max(1, workers)
+    if executor == "serial" or workers == 1 or len(paths) < 2 * workers:
+        return _load_skywater_cell_batch(paths)
+
+    batch = max(1, -(-len(paths) // (workers * 4)))
+    batches = [paths[i:i + batch] for i in range(0, len(paths), batch)]
+    if executor == "process":
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return [r for results in pool.map(_load_skywater_cell_batch, batches) for r in results]
+        except (OSError, NotImplementedError, ImportError, BrokenProcessPool) as e:
+            logger.warning("Process pool unavailable (%s); loading SkyWater cells with threads", e)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [r for results in pool.map(_load_skywater_cell_batch, batches) for r in results]
+
+
+def _build_skywater_libraries(
+    sc_library: str,
+    corner_paths: Dict[str, List[str]],
+    workers: Optional[int] = None,
+    executor: str = "process",
+) -> Dict[str, TechnologyLibrary]:
+    """
+    Nạp song song mọi file của các góc trong ``corner_paths`` (một pool chung) rồi
+    gộp thành một ``TechnologyLibrary`` mỗi góc; cell được thêm theo thứ tự file đã
+    sắp xếp nên thư viện giống hệt bản nạp tuần tự.
+    """
+    all_paths = [path for paths in corner_paths.values() for path in paths]
+    results = iter(_map_skywater_cell_files(all_paths, workers, executor))
+    libraries = {}
+    for corner, paths in corner_paths.items():
+        library = TechnologyLibrary(f"{sc_library}__{corner}")
+        skipped = 0
+        for path in paths:
+            cell, error = next(results)
+            if error is not None:
+                logger.warning("Skip unreadable SkyWater lib json %s: %s", path, error)
+            if cell is None:
+                skipped += 1
+                continue
+            library.add_cell(cell)
+        logger.info(
+            "Loaded %s SkyWater combinational cells from %s, corner %s (%s skipped)",
+            len(library.cells),
+            sc_library,
+            corner,
+            skipped,
+        )
+        if not library.cells:
+            raise ValueError(
+                f"No cells loaded for {sc_library} corner {corner!r}. "
+                "Check sc_library name and that timing .lib.json files exist."
+            )
+        libraries[corner] = library
+    return libraries
+
+
 def load_skywater_sc_library(
     libraries_root: str,
     sc_library: str = "sky130_fd_sc_hd",
     corner: str = "tt_025C_1v80",
+    use_cache: bool = True,
+    workers: Optional[int] = None,
+    executor: str = "process",
 ) -> TechnologyLibrary:
     """
     Load combinational (and const/tie) cells from an extracted SkyWater open PDK tree.
@@ -510,50 +645,61 @@ def load_skywater_sc_library(
     For each standard-cell, every variant file ``*__<corner>.lib.json`` under
     ``libraries/<sc_library>/latest/cells/*`` is loaded (ccsnoise / pwrlkg files skipped).
     Sequential cells (function IQ) are skipped — use a full flow (Yosys/OpenLane) for those.
+
+    Các file được parse song song (``workers`` process, mặc định số CPU; xem
+    ``_map_skywater_cell_files`` cho ``executor``).
+
+    ``use_cache``: dùng snapshot đã biên dịch (``library_cache.py``) khi mọi file
+    ``.lib.json`` của góc PVT không đổi.
     """
-    cells_root = os.path.join(libraries_root, sc_library, "latest", "cells")
-    if not os.path.isdir(cells_root):
-        raise FileNotFoundError(f"SkyWater cells directory not found: {cells_root}")
+    return load_skywater_sc_corners(
+        libraries_root, sc_library, [corner], use_cache=use_cache, workers=workers, executor=executor
+    )[corner]
 
-    library = TechnologyLibrary(f"{sc_library}__{corner}")
-    cells_parsed = 0
-    skipped = 0
-    pattern = os.path.join(cells_root, "*", f"*__{corner}.lib.json")
 
-    for path in sorted(glob.glob(pattern)):
-        low = path.lower()
-        if "ccsnoise" in low or "pwrlkg" in low:
-            continue
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except (OSError, json.JSONDecodeError) as e:
-            logger.warning("Skip unreadable SkyWater lib json %s: %s", path, e)
-            skipped += 1
-            continue
-        if not isinstance(data, dict):
-            skipped += 1
-            continue
-        cname = _skywater_cell_name_from_lib_filename(path)
-        cell = _library_cell_from_skywater_dict(data, cname)
-        if cell is None:
-            skipped += 1
-            continue
-        library.add_cell(cell)
-        cells_parsed += 1
-
-    logger.info(
-        "Loaded %s SkyWater combinational cells from %s (%s skipped)",
-        cells_parsed,
-        sc_library,
-        skipped,
-    )
-    if cells_parsed == 0:
-        raise ValueError(
-            f"No cells loaded from {cells_root} for corner {corner!r}. "
-            "Check sc_library name and that timing .lib.json files exist."
-        )
-    return library
+def load_skywater_sc_corners(
+    libraries_root: str,
+    sc_library: str = "sky130_fd_sc_hd",
+    corners: Sequence[str] = ("tt_025C_1v80",),
+    use_cache: bool = True,
+    workers: Optional[int] = None,
+    executor: str = "process",
+) -> MultiCornerLibrary:
+    """
+    Nạp nhiều góc PVT của ``sc_library`` cùng lúc → ``MultiCornerLibrary`` (góc đầu
+    tiên là mặc định). Góc có snapshot hợp lệ lấy từ cache; file của mọi góc còn
+    lại được parse trong một pool chung rồi mới ghi snapshot từng góc.
+    """
+    corners = list(dict.fromkeys(corners))
+    if not corners:
+        raise ValueError("No corners requested")
+    corner_paths = {corner: skywater_lib_json_paths(libraries_root, sc_library, corner) for corner in corners}
+
+    libraries: Dict[str, TechnologyLibrary] = {}
+    if use_cache:
+        from .library_cache import cache_enabled, cached_library, read_snapshot, snapshot_path
+        use_cache = cache_enabled()
+    if use_cache:
+        for corner in corners:
+            library = read_snapshot(snapshot_path("skywater", corner_paths[corner], [sc_library, corner]))
+            if library is not None:
+                logger.info("Library cache hit: %s", library.name)
+                libraries[corner] = library
+
+    missing = {corner: corner_paths[corner] for corner in corners if corner not in libraries}
+    if missing:
+        built = _build_skywater_libraries(sc_library, missing, workers, executor)
+        for corner in missing:
+            if use_cache:
+                built[corner] = cached_library(
+                    "skywater",
+                    corner_paths[corner],
+                    lambda corner=corner: built[corner],
+                    options=[sc_library, corner],
+                )
+            libraries[corner] = built[corner]
+
+    return MultiCornerLibrary(sc_library, {corner: libraries[corner] for corner in corners})
 
 
 def load_json_library(file_path: str) -> TechnologyLibrary:
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+FPGA k-LUT Mapping (priority cuts)
+
+Phủ AIG bằng LUT k input; mỗi LUT là một cut (root, leaves) và INIT là truth
+table của root theo leaves (leaf i = input I<i>, bit j của INIT = output khi
+các input mang giá trị nhị phân j).
+
+Thuật toán (theo ABC ``if``: Mishchenko et al., "Combinational and Sequential
+Mapping with Priority Cuts", ICCAD 2007):
+    1. Depth-optimal: duyệt topo, mỗi node giữ ``max_cuts`` priority cuts
+       (merge cut của hai fanin, sắp theo depth → số leaves → area flow);
+       depth(node) = depth của cut tốt nhất.
+    2. Required time từ depth tối ưu (mục tiêu không tăng depth).
+    3. Area-flow recovery: liệt kê lại priority cuts theo area flow, chỉ nhận
+       cut thỏa required time.
+    4. Exact-area recovery: deref cut hiện tại của node đang dùng, chọn cut có
+       số LUT trong MFFC nhỏ nhất (ref/deref), ref lại.
+
+Truth table chỉ tính cho cut được chọn (mô phỏng cone 2^k bit) nên liệt kê cut
+không mang truth table. Export theo primitive LUT của từng họ FPGA trong
+``techlibs/fpga/*`` (``FPGA_LUT_FAMILIES``).
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.synthesis.aig_cuts import _popcount
+from core.synthesis.aig_traversal import and_program
+
+logger = logging.getLogger(__name__)
+
+MAX_LUT_SIZE = 8
+_INF = float('inf')
+
+
+class LUTFamily:
+    """
+    Primitive LUT của một họ FPGA (theo ``techlibs/fpga/<vendor>/*_map.v``).
+
+    ``cell`` là tên primitive (``{n}`` = số input khi họ có LUT1..LUTk); họ chỉ
+    có LUT cố định ``max_k`` input (iCE40 SB_LUT4, ECP5 LUT4, Cyclone IV
+    lcell_comb) nối input thừa với hằng và lặp INIT theo biến không dùng.
+    """
+
+    def __init__(self, name: str, cell: str, input_pins: Sequence[str], output_pin: str,
+                 init_param: str, max_k: int, fixed_width: bool = False,
+                 unused_input: str = "1'b0", extra_params: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.cell = cell
+        self.input_pins = list(input_pins)
+        self.output_pin = output_pin
+        self.init_param = init_param
+        self.max_k = max_k
+        self.fixed_width = fixed_width
+        self.unused_input = unused_input
+        self.extra_params = dict(extra_params or {})
+
+    def __repr__(self):
+        return f"LUTFamily({self.name}, {self.cell}, k<={self.max_k})"
+
+
+FPGA_LUT_FAMILIES: Dict[str, LUTFamily] = {
+    # techlibs/fpga/xilinx/lut_map.v
+    "xilinx": LUTFamily("xilinx", "LUT{n}", ["I0", "I1", "I2", "I3", "I4", "I5"], "O", "INIT", 6),
+    # techlibs/fpga/gowin/cells_map.v (LUT5+ cần MUX2_LUT5/6: không hỗ trợ ở đây)
+    "gowin": LUTFamily("gowin", "LUT{n}", ["I0", "I1", "I2", "I3"], "F", "INIT", 4),
+    # techlibs/fpga/anlogic/cells_map.v
+    "anlogic": LUTFamily("anlogic", "AL_MAP_LUT{n}", ["a", "b", "c", "d", "e", "f"], "o", "INIT", 6,
+                         extra_params={"EQN": '""'}),
+    # techlibs/fpga/ice40/cells_map.v
+    "ice40": LUTFamily("ice40", "SB_LUT4", ["I0", "I1", "I2", "I3"], "O", "LUT_INIT", 4, fixed_width=True),
+    # techlibs/fpga/lattice/cells_map_trellis.v (ECP5)
+    "lattice": LUTFamily("lattice", "LUT4", ["A", "B", "C", "D"], "Z", "INIT", 4, fixed_width=True),
+    # techlibs/fpga/intel/cycloneive/cells_map.v
+    "intel": LUTFamily("intel", "cycloneive_lcell_comb", ["dataa", "datab", "datac", "datad"], "combout",
+                       "lut_mask", 4, fixed_width=True, unused_input="1'b1",
+                       extra_params={"sum_lutc_input": '"datac"'}),
+}
+
+
+def get_lut_family(name: str) -> LUTFamily:
+    """Tra họ FPGA theo tên (không phân biệt hoa thường); lỗi → ValueError."""
+    family = FPGA_LUT_FAMILIES.get((name or "").lower())
+    if family is None:
+        raise ValueError(f"Unknown FPGA family '{name}' (available: {', '.join(sorted(FPGA_LUT_FAMILIES))})")
+    return family
+
+
+def _var_pattern(i: int, n: int) -> int:
+    """Truth table 2^n bit của biến i."""
+    block = 1 << i
+    unit = ((1 << block) - 1) << block  # block số 0 rồi block số 1
+    pattern = 0
+    for shift in range(0, 1 << n, 2 * block):
+        pattern |= unit << shift
+    return pattern
+
+
+def _expand_init(truth: int, n: int, width: int) -> int:
+    """Lặp truth table n biến thành ``width`` biến (biến thêm không ảnh hưởng)."""
+    size = 1 << n
+    for _ in range(width - n):
+        truth |= truth << size
+        size <<= 1
+    return truth
+
+
+class LUTMapper:
+    """
+    Priority-cut k-LUT mapper.
+
+    Args:
+        k: số input mỗi LUT (2..8)
+        max_cuts: số priority cut giữ lại mỗi node
+        area_flow_rounds / exact_area_rounds: số vòng area recovery
+        depth_relax: số level LUT được phép vượt depth tối ưu khi recovery
+    """
+
+    def __init__(self, k: int = 6, max_cuts: int = 8, area_flow_rounds: int = 1,
+                 exact_area_rounds: int = 2, depth_relax: int = 0):
+        if not 2 <= k <= MAX_LUT_SIZE:
+            raise ValueError(f"LUT size k must be in 2..{MAX_LUT_SIZE}, got {k}")
+        if max_cuts < 1:
+            raise ValueError(f"max_cuts must be >= 1, got {max_cuts}")
+        self.k = k
+        self.max_cuts = max_cuts
+        self.area_flow_rounds = area_flow_rounds
+        self.exact_area_rounds = exact_area_rounds
+        self.depth_relax = depth_relax
+        self.luts: List[Tuple[int, Tuple[int, ...], int]] = []
+        self.stats: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------ API
+
+    def map(self, aig) -> List[Tuple[int, Tuple[int, ...], int]]:
+        """
+        Map ``aig``; trả về (và lưu ``self.luts``) danh sách ``(root, leaves,
+        truth)`` theo thứ tự topo. ``self.stats``: luts, depth, area sau mỗi pass.
+        """
+        start = time.perf_counter()
+        self._setup(aig)
+
+        self._enumerate("depth")
+        self._compute_refs()
+        luts_depth = self._num_luts()
+        depth_opt = self._po_depth()
+        self._target = depth_opt + self.depth_relax
+        self._compute_required()
+        t_depth = time.perf_counter()
+
+        luts_flow = luts_depth
+        for _ in range(self.area_flow_rounds):
+            self._update_estimates()
+            self._enumerate("flow")
+            self._compute_refs()
+            self._compute_required()
+            luts_flow = self._num_luts()
+        t_flow = time.perf_counter()
+
+        luts_exact = luts_flow
+        for _ in range(self.exact_area_rounds):
+            self._exact_area()
+            self._compute_refs()
+            self._compute_required()
+            luts_exact = self._num_luts()
+        t_exact = time.perf_counter()
+
+        self.luts = self._collect_luts()
+        self.stats = {
+            'and_nodes': len(self._program),
+            'luts': len(self.luts),
+            'depth': self._po_depth(),
+            'luts_depth_mapping': luts_depth,
+            'luts_after_flow': luts_flow,
+            'luts_after_exact': luts_exact,
+            'depth_optimal': depth_opt,
+            'time_depth': t_depth - start,
+            'time_flow': t_flow - t_depth,
+            'time_exact': t_exact - t_flow,
+            'time': time.perf_counter() - start,
+        }
+        logger.info(
+            f"  LUT mapping (k={self.k}): {len(self.luts)} LUTs, depth {self.stats['depth']} "
+            f"(depth-opt {luts_depth} LUTs), {self.stats['time']:.2f}s"
+        )
+        return self.luts
+
+    # -------------------------------------------------------------- setup
+
+    def _setup(self, aig):
+        self._aig = aig
+        self._program = and_program(aig)
+        size = aig.next_node_id
+        self._fanins: Dict[int, Tuple[int, int, int]] = {out: (a, b, op) for out, a, b, op in self._program}
+        self._consts = (aig.const0.node_id, aig.const1.node_id)
+        self._depth = [0] * size
+        self._flow = [0.0] * size
+        self._required = [_INF] * size
+        self._refs = [0] * size
+        self._est = [1.0] * size
+        self._best: List[Optional[Tuple[int, ...]]] = [None] * size
+        self._cuts: Dict[int, List[Tuple[Tuple[int, ...], int]]] = {}
+
+        fanout = [0] * size
+        for _out, a, b, _op in self._program:
+            fanout[a] += 1
+            fanout[b] += 1
+        self._po_nodes = [po.node_id for po, _inv in aig.pos]
+        for node_id in self._po_nodes:
+            fanout[node_id] += 1
+        for node_id, count in enumerate(fanout):
+            self._est[node_id] = max(1.0, float(count))
+
+    # -------------------------------------------------------- cut passes
+
+    def _enumerate(self, mode: str):
+        """Liệt kê priority cuts; ``mode`` = ``depth`` hoặc ``flow`` (dưới required)."""
+        k = self.k
+        max_cuts = self.max_cuts
+        depth = self._depth
+        flow = self._flow
+        required = self._required
+        best = self._best
+        est = self._est
+
+        # Cut của PI/hằng: trivial cut / cut rỗng
+        sets: Dict[int, List[Tuple[Tuple[int, ...], int]]] = {}
+        for node_id in self._consts:
+            sets[node_id] = [((), 0)]
+        for pi in self._aig.pis.values():
+            pid = pi.node_id
+            sets[pid] = [((pid,), 1 << (pid & 63))]
+
+        by_depth = mode == "depth"
+        for out, a, b, _op in self._program:
+            merged: Dict[Tuple[int, ...], int] = {}
+            for la, sa in sets[a]:
+                for lb, sb in sets[b]:
+                    sign = sa | sb
+                    if _popcount(sign) > k:
+                        continue
+                    if la == lb or not lb:
+                        leaves = la
+                    elif not la:
+                        leaves = lb
+                    else:
+                        leaves = tuple(sorted(set(la).union(lb)))
+                        if len(leaves) > k:
+                            continue
+                    if leaves not in merged:
+                        merged[leaves] = sign
+            prev = best[out]
+            if not by_depth and prev is not None and prev not in merged:
+                # Cut của pass trước luôn thỏa required: giữ làm ứng viên
+                sign = 0
+                for leaf in prev:
+                    sign |= 1 << (leaf & 63)
+                merged[prev] = sign
+
+            req = required[out]
+            ranked = []
+            for leaves, sign in merged.items():
+                d = 0
+                f = 1.0 if leaves else 0.0
+                for leaf in leaves:
+                    if depth[leaf] > d:
+                        d = depth[leaf]
+                    f += flow[leaf]
+                if leaves:
+                    d += 1
+                if by_depth:
+                    ranked.append((d, len(leaves), f, leaves, sign))
+                elif d <= req:
+                    ranked.append((f, d, len(leaves), leaves, sign))
+            ranked.sort()
+            if not ranked:
+                # Node mới được dùng nhưng không cut nào thỏa required: lấy cut nông nhất
+                ranked = sorted(
+                    (max((depth[x] for x in leaves), default=-1) + 1, len(leaves), 0.0, leaves, sign)
+                    for leaves, sign in merged.items()
+                )
+            kept = ranked[:max_cuts]
+            chosen = kept[0]
+            leaves = chosen[3]
+            best[out] = leaves
+            d = 0
+            f = 1.0 if leaves else 0.0
+            for leaf in leaves:
+                if depth[leaf] > d:
+                    d = depth[leaf]
+                f += flow[leaf]
+            depth[out] = d + 1 if leaves else 0
+            flow[out] = f / est[out]
+
+            cuts = [(item[3], item[4]) for item in kept]
+            self._cuts[out] = cuts
+            if leaves:
+                sets[out] = [((out,), 1 << (out & 63))] + cuts
+            else:
+                sets[out] = cuts
+
+    def _exact_area(self):
+        depth = self._depth
+        required = self._required
+        refs = self._refs
+        best = self._best
+        for out, _a, _b, _op in self._program:
+            if not refs[out]:
+                # Node không dùng: giữ cut, cập nhật depth theo leaves hiện tại
+                leaves = best[out]
+                depth[out] = max((depth[leaf] for leaf in leaves), default=-1) + 1 if leaves else 0
+                continue
+            self._deref(best[out])
+            choice = None
+            choice_key = None
+            for leaves, _sign in self._cuts[out]:
+                d = max((depth[leaf] for leaf in leaves), default=-1) + 1
+                if d > required[out]:
+                    continue
+                area = self._ref(leaves)
+                self._deref(leaves)
+                key = (area, d, len(leaves))
+                if choice_key is None or key < choice_key:
+                    choice, choice_key = leaves, key
+            if choice is not None:
+                best[out] = choice
+                depth[out] = choice_key[1]
+            self._ref(best[out])
+
+    # ------------------------------------------------------ ref / deref
+
+    def _ref(self, leaves: Sequence[int]) -> int:
+        """Tham chiếu cut; trả về số LUT mới được dùng (kể cả LUT của cut)."""
+        refs = self._refs
+        best = self._best
+        area = 1 if leaves else 0
+        stack = list(leaves)
+        while stack:
+            node = stack.pop()
+            refs[node] += 1
+            if refs[node] == 1 and best[node]:
+                area += 1
+                stack.extend(best[node])
+        return area
+
+    def _deref(self, leaves: Sequence[int]) -> int:
+        refs = self._refs
+        best = self._best
+        area = 1 if leaves else 0
+        stack = list(leaves)
+        while stack:
+            node = stack.pop()
+            refs[node] -= 1
+            if refs[node] == 0 and best[node]:
+                area += 1
+                stack.extend(best[node])
+        return area
+
+    def _compute_refs(self):
+        self._refs = [0] * len(self._refs)
+        refs = self._refs
+        for node_id in self._po_nodes:
+            refs[node_id] += 1
+            if refs[node_id] == 1 and self._best[node_id]:
+                self._ref(self._best[node_id])
+
+    def _num_luts(self) -> int:
+        refs = self._refs
+        return sum(1 for out, _a, _b, _op in self._program if refs[out] and self._best[out])
+
+    def _po_depth(self) -> int:
+        return max((self._depth[n] for n in self._po_nodes), default=0)
+
+    def _update_estimates(self):
+        est = self._est
+        refs = self._refs
+        for node_id in range(len(est)):
+            est[node_id] = max(1.0, (est[node_id] + 2.0 * refs[node_id]) / 3.0)
+
+    def _compute_required(self):
+        required = [_INF] * len(self._required)
+        for node_id in self._po_nodes:
+            required[node_id] = self._target
+        refs = self._refs
+        for out, _a, _b, _op in reversed(self._program):
+            if not refs[out] or not self._best[out]:
+                continue
+            req = required[out] - 1
+            for leaf in self._best[out]:
+                if req < required[leaf]:
+                    required[leaf] = req
+        self._required = required
+
+    # ------------------------------------------------------------ output
+
+    def _collect_luts(self) -> List[Tuple[int, Tuple[int, ...], int]]:
+        refs = self._refs
+        luts = []
+        for out, _a, _b, _op in self._program:
+            if refs[out] and self._best[out] is not None:
+                leaves = self._best[out]
+                luts.append((out, leaves, self._cut_truth(out, leaves)))
+        return luts
+
+    def _cut_truth(self, root: int, leaves: Sequence[int]) -> int:
+        """Truth table 2^|leaves| bit của ``root`` theo ``leaves`` (mô phỏng cone)."""
+        n = len(leaves)
+        full = (1 << (1 << n)) - 1
+        values: Dict[int, int] = {leaf: _var_pattern(i, n) for i, leaf in enumerate(leaves)}
+        values[self._consts[0]] = 0
+        values[self._consts[1]] = full
+        fanins = self._fanins
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if node in values:
+                stack.pop()
+                continue
+            a, b, op = fanins[node]
+            if a not in values:
+                stack.append(a)
+                continue
+            if b not in values:
+                stack.append(b)
+                continue
+            stack.pop()
+            va = values[a] ^ (full if op & 1 else 0)
+            vb = values[b] ^ (full if op & 2 else 0)
+            values[node] = va & vb
+        return values[root]
+
+
+def lut_map(aig, k: int = 6, **kwargs) -> LUTMapper:
+    """Tiện ích: ``LUTMapper(k, **kwargs)`` + ``map(aig)``; trả về mapper."""
+    mapper = LUTMapper(k, **kwargs)
+    mapper.map(aig)
+    return mapper
+
+
+def lut_mapping_to_netlist(mapper: LUTMapper, aig, family: str = "xilinx",
+                           original_netlist: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    LUT mapping → netlist dict (cùng định dạng ``convert_mapped_logic_network_to_netlist``)
+    với primitive LUT của ``family``; INIT nằm trong ``parameters`` của mỗi node.
+
+    PO đảo: nếu LUT chỉ lái các PO đảo thì đảo INIT tại chỗ, ngược lại thêm
+    LUT1 đảo (``node_<id>_n``). ``mapper.stats`` được bổ sung ``lut_count``/
+    ``lut_depth`` của netlist cuối (kể cả LUT đảo).
+
+    Port bus của ``original_netlist`` (``attrs.vector_widths``) được mở rộng
+    thành từng bit ``name[i]`` theo thứ tự PO; số bit khác ``len(aig.pos)`` →
+    ``ValueError``.
+    """
+    lib = get_lut_family(family)
+    if mapper.k > lib.max_k:
+        raise ValueError(f"{lib.name} LUT primitives support k <= {lib.max_k}, mapped with k={mapper.k}")
+    original_netlist = original_netlist or {}
+    pi_names = {node.node_id: name for name, node in aig.pis.items()}
+    const0, const1 = aig.const0.node_id, aig.const1.node_id
+    inputs = list(original_netlist.get('inputs') or aig.pis.keys())
+    outputs = list(original_netlist.get('outputs') or [f"out{i}" for i in range(len(aig.pos))])
+    attrs = original_netlist.get('attrs', {}) or {}
+    widths = (attrs.get('vector_widths', {}) or {}) if isinstance(attrs, dict) else {}
+    port_widths = {name: widths[name] for name in inputs + outputs
+                   if isinstance(widths.get(name), int) and widths[name] > 1}
+    po_names: List[str] = []
+    for name in outputs:
+        w = port_widths.get(name, 1)
+        if w > 1:
+            po_names.extend(f"{name}[{i}]" for i in range(w))
+        else:
+            po_names.append(name)
+    if len(po_names) != len(aig.pos):
+        raise ValueError(f"netlist has {len(po_names)} output bits but the AIG has {len(aig.pos)} POs")
+
+    luts = {root: (leaves, truth) for root, leaves, truth in mapper.luts}
+    used_positive = set()
+    for leaves, _truth in luts.values():
+        used_positive.update(leaves)
+    for po, inv in aig.pos:
+        if not inv:
+            used_positive.add(po.node_id)
+    complemented = {po.node_id for po, inv in aig.pos
+                    if inv and po.node_id in luts and po.node_id not in used_positive}
+
+    def signal(node_id: int, inverted: bool = False) -> str:
+        if node_id in (const0, const1):
+            return "CONST1" if (node_id == const1) ^ inverted else "CONST0"
+        if node_id in pi_names:
+            return f"{pi_names[node_id]}_n" if inverted else pi_names[node_id]
+        return f"node_{node_id}_n" if inverted else f"node_{node_id}"
+
+    nodes: List[Dict[str, Any]] = []
+    depth: Dict[str, int] = {}
+
+    def add_lut(node_id: str, output: str, in_sigs: List[str], truth: int):
+        n = len(in_sigs)
+        width = lib.max_k if lib.fixed_width else n
+        init = _expand_init(truth, n, width)
+        bits = 1 << width
+        cell = lib.cell.format(n=n)
+        pins = lib.input_pins[:width]
+        conns = list(in_sigs) + [lib.unused_input] * (width - n)
+        params = dict(lib.extra_params)
+        params[lib.init_param] = f"{bits}'h{init:0{max(1, bits // 4)}X}"
+        nodes.append({
+            'id': node_id,
+            'type': cell,
+            'cell_name': cell,
+            'inputs': conns,
+            'output': output,
+            'input_pins': pins,
+            'output_pins': [lib.output_pin],
+            'parameters': params,
+            'function': f"LUT{n}(0x{truth:X})",
+            'init': init,
+            'mapped': True,
+        })
+        depth[output] = 1 + max((depth.get(s, 0) for s in in_sigs), default=0)
+
+    for root, leaves, truth in mapper.luts:
+        inverted = root in complemented
+        if inverted:
+            truth ^= (1 << (1 << len(leaves))) - 1
+        if not leaves:
+            nodes.append({'id': f"const_{root}", 'type': "CONST1" if truth & 1 else "CONST0",
+                          'output': signal(root, inverted), 'inputs': [], 'mapped': False})
+            continue
+        add_lut(f"lut_{root}", signal(root, inverted), [signal(leaf) for leaf in leaves], truth)
+
+    inverters = set()
+    for idx, (po, inv) in enumerate(aig.pos):
+        node_id = po.node_id
+        if node_id in (const0, const1):
+            source = signal(node_id, bool(inv))
+            nodes.append({'id': f"po_const_{idx}", 'type': source, 'output': po_names[idx],
+                          'inputs': [], 'mapped': False})
+            continue
+        source = signal(node_id, bool(inv))
+        if inv and node_id not in complemented and node_id not in inverters:
+            inverters.add(node_id)
+            add_lut(f"inv_{node_id}", source, [signal(node_id)], 0b01)
+        if source != po_names[idx]:
+            nodes.append({'id': f"po_buf_{idx}", 'type': "BUF", 'output': po_names[idx],
+                          'inputs': [source], 'function': f"BUF({source})", 'mapped': False})
+
+    lut_count = sum(1 for n in nodes if n.get('mapped'))
+    mapper.stats['lut_count'] = lut_count
+    mapper.stats['lut_depth'] = max(
+        (depth.get(signal(po.node_id, bool(inv)), 0) for po, inv in aig.pos), default=0
+    )
+    return {
+        'name': original_netlist.get('name', 'design'),
+        'inputs': inputs,
+        'outputs': outputs,
+        'nodes': nodes,
+        'attrs': {'fpga_family': lib.name, 'lut_size': mapper.k, 'vector_widths': port_widths},
+    }
@@ -3,17 +3,33 @@
 Technology mapping — mạch tổ hợp (combinational), mức cơ bản / minh họa đề tài.
 
 Phạm vi đề tài:
-    - Không triển khai techmap công nghiệp (cut enumeration, mapper ABC, …).
-    - Luồng: AIG → LogicNode (chuỗi hàm Boolean) → tra ``function_map`` sau
-      ``normalize_function`` → chọn cell; shell/complete_flow cố định ``area_optimal``.
+    - Luồng cơ bản: AIG → LogicNode (hàm Boolean + truth table) → tra index NPN
+      của thư viện (``TechnologyLibrary.match_truth``) → chọn cell; input/output
+      cần đảo được bù bằng inverter của thư viện; complete_flow cố định ``area_optimal``.
+    - Strategy ``cut`` (``cut_mapper.py``): cut enumeration + NPN matching, dùng được
+      cell phức (AOI/OAI/MUX), delay-optimal theo đường găng rồi area recovery.
     - Mạch tuần tự: không map DFF/latch sang thư viện tại đây.
 
 Nạp thư viện (SkyWater PDK, Liberty, JSON, …): ``library_loader.py``.
 """
 
-from typing import Dict, List, Set, Any, Tuple, Optional
+from itertools import permutations
+from typing import Dict, List, NamedTuple, Set, Any, Tuple, Optional
 import logging
 import re
+import time
+
+from core.synthesis.aig_traversal import dfs_postorder
+from core.synthesis.npn import TT4_FULL, TT4_VARS, npn_canonical, tt4_flip
+from core.utils.performance import get_tracer, trace_span
+
+from .cell_function import (
+    CellFunctionError,
+    cell_truth_table,
+    function_truth_table,
+    function_variables,
+    parse_cell_function,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -160,11 +176,18 @@ def _split_args(args_str: str) -> List[str]:
     return args
 
 class LibraryCell:
-    """Đại diện cho một cell trong thư viện công nghệ."""
+    """
+    Đại diện cho một cell trong thư viện công nghệ.
+
+    ``delay`` là delay scalar dùng cho mapping; ``timing`` (``CellTiming`` trong
+    ``core/timing/liberty_timing.py``, có khi nạp từ Liberty/SkyWater) giữ bảng
+    NLDM và điện dung pin cho STA.
+    """
     
     def __init__(self, name: str, function: str, area: float, delay: float, 
                  input_pins: List[str], output_pins: List[str], 
-                 input_load: float = 1.0, output_drive: float = 1.0):
+                 input_load: float = 1.0, output_drive: float = 1.0,
+                 timing: Optional[Any] = None):
         self.name = name
         self.function = function  # Hàm Boolean
         self.area = area
@@ -173,17 +196,67 @@ class LibraryCell:
         self.output_pins = output_pins
         self.input_load = input_load
         self.output_drive = output_drive
+        self.timing = timing
         
     def __repr__(self):
         return f"LibraryCell({self.name}, {self.function}, area={self.area}, delay={self.delay})"
 
+class CellMatch(NamedTuple):
+    """
+    Cách dùng ``cell`` cho một hàm ≤ 4 input: pin i của cell nối tới input
+    ``sources[i]`` của hàm, đảo nếu bit i của ``input_phase`` bật; ``output_phase``
+    = 1 nghĩa là output của cell là phủ định của hàm.
+    """
+    cell: LibraryCell
+    sources: Tuple[int, ...]
+    input_phase: int
+    output_phase: int
+
+    @property
+    def exact(self) -> bool:
+        """Cell hiện thực đúng hàm chỉ bằng hoán vị pin (không cần inverter)."""
+        return not self.input_phase and not self.output_phase
+
+    @property
+    def inverters(self) -> int:
+        return bin(self.input_phase).count("1") + self.output_phase
+
+
+def _bound_truth(truth: int, sources: Tuple[int, ...]) -> int:
+    """Truth table 16-bit của cell ``truth`` khi pin j đọc biến ``sources[j]``."""
+    result = 0
+    for row in range(16):
+        pin_row = 0
+        for j, src in enumerate(sources):
+            pin_row |= ((row >> src) & 1) << j
+        if (truth >> pin_row) & 1:
+            result |= 1 << row
+    return result
+
+
 class TechnologyLibrary:
-    """Danh mục cell: ``cells`` + ``function_map`` (hàm đã chuẩn hóa → tên cell)."""
+    """
+    Danh mục cell: ``cells`` + ``function_map`` (chuỗi hàm đã chuẩn hóa → tên cell)
+    + index NPN (``npn_index``: đại diện NPN của truth table → cell).
+
+    Tra cứu hàm đi qua index NPN: hàm được đổi sang truth table 16-bit (một lần
+    cho mỗi chuỗi), mọi cách viết tương đương (thứ tự đối số, De Morgan, dạng
+    Liberty) cho cùng truth table nên cùng khớp; kết quả theo truth table được
+    cache. ``function_map`` chỉ còn là fallback cho hàm > 4 input / không parse được.
+    """
     
     def __init__(self, name: str):
         self.name = name
         self.cells: Dict[str, LibraryCell] = {}
         self.function_map: Dict[str, List[str]] = {}  # function -> list of cell names
+        self._npn_index: Optional[Dict[int, List[Tuple[LibraryCell, int, int]]]] = None
+        self._unindexed: List[str] = []
+        self._variants: Dict[str, Dict[int, Tuple[Tuple[int, ...], int, int]]] = {}
+        self._match_cache: Dict[int, List[CellMatch]] = {}
+        self._function_cache: Dict[str, Optional[Tuple[int, Tuple[str, ...]]]] = {}
+        # Tăng mỗi lần thêm cell (invalidate thư viện gộp với standard library)
+        self._revision = 0
+        self._merged_standard: Optional[Tuple[int, "TechnologyLibrary"]] = None
         
     def add_cell(self, cell: LibraryCell):
         """Add a cell to the library."""
@@ -196,15 +269,120 @@ class TechnologyLibrary:
         if normalized_func not in self.function_map:
             self.function_map[normalized_func] = []
         self.function_map[normalized_func].append(cell.name)
+
+        # Index NPN được xây lại (lazily) ở lần tra cứu kế tiếp
+        self._npn_index = None
+        self._variants.pop(cell.name, None)
+        self._match_cache.clear()
+        self._revision += 1
+
+    @property
+    def npn_index(self) -> Dict[int, List[Tuple[LibraryCell, int, int]]]:
+        """
+        ``{đại diện NPN: [(cell, truth16, số input), ...]}`` cho mọi cell một output,
+        ≤ 4 input, hàm parse được và phụ thuộc đủ mọi input pin.
+        """
+        if self._npn_index is None:
+            index: Dict[int, List[Tuple[LibraryCell, int, int]]] = {}
+            unindexed: List[str] = []
+            for cell in self.cells.values():
+                info = cell_truth_table(cell)
+                if info is None:
+                    unindexed.append(cell.name)
+                    continue
+                truth, num_inputs = info
+                support = sum(1 for i in range(4) if tt4_flip(truth, i) != truth)
+                if support != num_inputs:
+                    unindexed.append(cell.name)
+                    continue
+                rep, _xform = npn_canonical(truth)
+                index.setdefault(rep, []).append((cell, truth, num_inputs))
+            self._npn_index = index
+            self._unindexed = unindexed
+        return self._npn_index
+
+    @property
+    def unindexed_cells(self) -> List[str]:
+        """Tên cell không vào được index NPN (nhiều output, > 4 input, hàm lạ)."""
+        self.npn_index
+        return list(self._unindexed)
+
+    def _cell_variants(self, cell: LibraryCell, truth: int, num_inputs: int):
+        """``{truth hàm: (sources, input_phase, output_phase)}`` — ít inverter nhất."""
+        variants = self._variants.get(cell.name)
+        if variants is None:
+            variants = {}
+            costs: Dict[int, int] = {}
+            for sources in permutations(range(4), num_inputs):
+                base = _bound_truth(truth, sources)
+                for neg in range(1 << num_inputs):
+                    bound = base
+                    for j in range(num_inputs):
+                        if (neg >> j) & 1:
+                            bound = tt4_flip(bound, sources[j])
+                    flips = bin(neg).count("1")
+                    for out, value in ((0, bound), (1, bound ^ TT4_FULL)):
+                        if costs.get(value, 99) > flips + out:
+                            costs[value] = flips + out
+                            variants[value] = (sources, neg, out)
+            self._variants[cell.name] = variants
+        return variants
+
+    def match_truth(self, truth: int) -> List[CellMatch]:
+        """
+        Mọi cell khớp hàm có truth table 16-bit ``truth`` (biến i = input i của
+        hàm) theo NPN: một hash probe theo đại diện NPN, kết quả được cache.
+        """
+        truth &= TT4_FULL
+        matches = self._match_cache.get(truth)
+        if matches is None:
+            rep, _xform = npn_canonical(truth)
+            matches = []
+            for cell, cell_truth, num_inputs in self.npn_index.get(rep, ()):
+                binding = self._cell_variants(cell, cell_truth, num_inputs).get(truth)
+                if binding is not None:
+                    matches.append(CellMatch(cell, *binding))
+            self._match_cache[truth] = matches
+        return matches
+
+    def function_truth(self, function: str) -> Optional[Tuple[int, Tuple[str, ...]]]:
+        """
+        ``(truth16, biến)`` của chuỗi hàm (prefix hoặc Liberty), biến theo thứ tự
+        xuất hiện; ``None`` nếu không parse được hoặc > 4 biến.
+        """
+        if function in self._function_cache:
+            return self._function_cache[function]
+        result = None
+        try:
+            tree = parse_cell_function(function)
+            names = tuple(function_variables(tree))
+            if len(names) <= len(TT4_VARS):
+                result = function_truth_table(tree, names), names
+        except (CellFunctionError, RecursionError):
+            pass
+        self._function_cache[function] = result
+        return result
+
+    def match_function(self, function: str) -> List[CellMatch]:
+        """NPN matches cho chuỗi hàm; ``sources`` chỉ vào ``function_truth(...)[1]``."""
+        info = self.function_truth(function)
+        return self.match_truth(info[0]) if info is not None else []
     
     def get_cells_for_function(self, function: str) -> List[LibraryCell]:
-        """Get all cells that implement a given function."""
-        # Normalize the function to match library entries
+        """Get all cells that implement a given function (up to a pin permutation)."""
+        if self.function_truth(function) is not None:
+            return [m.cell for m in self.match_function(function) if m.exact]
+
+        # Hàm > 4 input / không parse được: so chuỗi đã chuẩn hóa như trước
         normalized_func = normalize_function(function)
-        
         if normalized_func in self.function_map:
             return [self.cells[name] for name in self.function_map[normalized_func]]
         return []
+
+    def get_inverter(self) -> Optional[LibraryCell]:
+        """Inverter nhỏ nhất của thư viện (``None`` nếu không có)."""
+        inverters = [m.cell for m in self.match_truth(TT4_VARS[0] ^ TT4_FULL) if m.exact]
+        return min(inverters, key=lambda c: (c.area, c.delay, c.name)) if inverters else None
     
     def get_best_cell_for_function(self, function: str, optimization_target: str = "area") -> Optional[LibraryCell]:
         """Get the best cell for a function based on optimization target."""
@@ -222,16 +400,79 @@ class TechnologyLibrary:
         
         return cells[0]
 
+
+class MultiCornerLibrary:
+    """
+    Cùng một thư viện cell ở nhiều góc PVT (``tt_025C_1v80``, ``ss_100C_1v60``, ...):
+    mỗi góc là một ``TechnologyLibrary`` riêng (delay/NLDM khác nhau). Góc mặc định
+    (góc đầu tiên nếu không chỉ định) dùng cho ``techmap``; các góc khác dùng cho STA.
+    """
+
+    def __init__(self, name: str, libraries: Dict[str, TechnologyLibrary],
+                 default_corner: Optional[str] = None):
+        if not libraries:
+            raise ValueError("MultiCornerLibrary needs at least one corner")
+        self.name = name
+        self.libraries: Dict[str, TechnologyLibrary] = dict(libraries)
+        self.default_corner = default_corner or next(iter(self.libraries))
+        if self.default_corner not in self.libraries:
+            raise KeyError(f"Unknown default corner: {self.default_corner}")
+
+    @property
+    def corners(self) -> List[str]:
+        return list(self.libraries)
+
+    @property
+    def default(self) -> TechnologyLibrary:
+        return self.libraries[self.default_corner]
+
+    def __getitem__(self, corner: str) -> TechnologyLibrary:
+        return self.libraries[corner]
+
+    def __contains__(self, corner: str) -> bool:
+        return corner in self.libraries
+
+    def __iter__(self):
+        return iter(self.libraries)
+
+    def __len__(self) -> int:
+        return len(self.libraries)
+
+    def items(self):
+        return self.libraries.items()
+
+    def common_cells(self) -> List[str]:
+        """Tên cell có mặt ở mọi góc."""
+        names = set(self.default.cells)
+        for library in self.libraries.values():
+            names &= set(library.cells)
+        return sorted(names)
+
+    def __repr__(self):
+        return f"MultiCornerLibrary({self.name}, corners={self.corners})"
+
+
 class LogicNode:
-    """Represents a node in the logic network."""
+    """
+    Represents a node in the logic network.
+
+    ``truth`` (tùy chọn) là truth table 16-bit theo ``inputs`` (input i = biến i);
+    khi có, mapper tra thẳng index NPN thay vì parse ``function``.
+    """
     
-    def __init__(self, name: str, function: str, inputs: List[str], output: str):
+    def __init__(self, name: str, function: str, inputs: List[str], output: str,
+                 truth: Optional[int] = None):
         self.name = name
         self.function = function
         self.inputs = inputs
         self.output = output
+        self.truth = truth
         self.mapped_cell: Optional[LibraryCell] = None
         self.mapping_cost = float('inf')
+        # Tín hiệu nối vào từng input pin của cell / tín hiệu cell lái (có thể là
+        # pha đảo ``<output>_n`` khi match cần đảo output)
+        self.mapped_inputs: Optional[List[str]] = None
+        self.mapped_output: Optional[str] = None
         
     def __repr__(self):
         mapped_info = f" -> {self.mapped_cell.name}" if self.mapped_cell else " (unmapped)"
@@ -240,12 +481,18 @@ class LogicNode:
 class TechnologyMapper:
     """
     Technology mapping engine (ánh xạ thiết kế sang thư viện standard cells).
+
+    Mỗi LogicNode được map độc lập sang cell khớp hàm theo NPN; input cần đảo
+    lấy qua inverter dùng chung (``<signal>_n``), output cần đảo thì cell lái
+    ``<output>_n`` và một inverter lái ``output``. Inverter thêm vào là LogicNode
+    đã map trong ``logic_network``.
     """
     
     def __init__(self, library: TechnologyLibrary):
         self.library = library
         self.logic_network: Dict[str, LogicNode] = {}
         self.mapping_results = {}
+        self._inverter_nodes: List[str] = []
         
     def add_logic_node(self, node: LogicNode):
         """Add a logic node to the network."""
@@ -268,93 +515,157 @@ class TechnologyMapper:
             return self._balanced_mapping()
         else:
             return self._area_optimal_mapping()
+
+    def _node_signals(self, node: LogicNode) -> Optional[Tuple[int, List[str]]]:
+        """``(truth16, tín hiệu của biến i)`` của node; ``None`` nếu không tra được."""
+        if node.truth is not None:
+            return node.truth, list(node.inputs)
+        info = self.library.function_truth(node.function)
+        if info is None:
+            return None
+        truth, names = info
+        if all(name in node.inputs for name in names):
+            return truth, list(names)
+        if len(names) == len(node.inputs):
+            # Hàm viết theo tên hình thức (``AND(A,B)``) → nối theo vị trí
+            return truth, list(node.inputs)
+        return None
+
+    def _best_match(self, truth: int, target: str, inverter: Optional[LibraryCell]) -> Optional[CellMatch]:
+        matches = [m for m in self.library.match_truth(truth) if m.exact or inverter is not None]
+        if not matches:
+            return None
+        inv_area = inverter.area if inverter else 0.0
+        inv_delay = inverter.delay if inverter else 0.0
+
+        def cost(m: CellMatch):
+            area = m.cell.area + inv_area * m.inverters
+            delay = m.cell.delay + inv_delay * (bool(m.input_phase) + m.output_phase)
+            if target == "delay":
+                return (delay, area, m.inverters)
+            if target == "balanced":
+                return (area + delay * 10, m.inverters)
+            return (area, delay, m.inverters)
+
+        return min(matches, key=cost)
+
+    def _map_nodes(self, target: str) -> List[LogicNode]:
+        """
+        Map mọi node theo ``target`` (``area``/``delay``/``balanced``); trả về các
+        node đã map, kể cả inverter thêm vào.
+        """
+        for name in self._inverter_nodes:
+            self.logic_network.pop(name, None)
+        self._inverter_nodes = []
+        inverter = self.library.get_inverter()
+        taken: Set[str] = set()
+        for node in self.logic_network.values():
+            taken.add(node.output)
+            taken.update(node.inputs)
+        complements: Dict[str, str] = {}
+        mapped: List[LogicNode] = []
+        best: Dict[int, Optional[CellMatch]] = {}
+
+        def fresh(base: str) -> str:
+            name, i = base, 0
+            while name in taken:
+                i += 1
+                name = f"{base}{i}"
+            taken.add(name)
+            return name
+
+        def add_inverter(source: str, output: str) -> None:
+            inv = LogicNode(fresh(f"inv_{source}"), f"NOT({source})", [source], output,
+                            TT4_VARS[0] ^ TT4_FULL)
+            inv.mapped_cell = inverter
+            inv.mapping_cost = inverter.area if target == "area" else inverter.delay
+            inv.mapped_inputs, inv.mapped_output = [source], output
+            self.logic_network[inv.name] = inv
+            self._inverter_nodes.append(inv.name)
+            mapped.append(inv)
+
+        def complement(signal: str) -> str:
+            if signal not in complements:
+                inverted = fresh(f"{signal}_n")
+                add_inverter(signal, inverted)
+                complements[signal] = inverted
+            return complements[signal]
+
+        # Tracing: tra thư viện (match) gộp thành mục ``techmap.match`` trong span ``techmap.select``
+        tracer = get_tracer()
+        with trace_span("techmap.select", category="techmap", target=target):
+            for node_name, node in list(self.logic_network.items()):
+                node.mapped_cell = None
+                node.mapping_cost = float('inf')
+                node.mapped_inputs = node.mapped_output = None
+                info = self._node_signals(node)
+                match = None
+                if info is not None:
+                    truth, signals = info
+                    if truth not in best:
+                        t0 = time.perf_counter()
+                        best[truth] = self._best_match(truth, target, inverter)
+                        if tracer is not None:
+                            tracer.accumulate("techmap.match", time.perf_counter() - t0)
+                    match = best[truth]
+                if match is None:
+                    logger.warning(f"No suitable cell found for {node_name} with function {node.function}")
+                    continue
+                pins = []
+                for j, src in enumerate(match.sources):
+                    signal = signals[src]
+                    pins.append(complement(signal) if (match.input_phase >> j) & 1 else signal)
+                output = node.output
+                if match.output_phase:
+                    output = fresh(f"{node.output}_n")
+                    complements[node.output] = output
+                    add_inverter(output, node.output)
+                cell = match.cell
+                node.mapped_cell = cell
+                node.mapped_inputs, node.mapped_output = pins, output
+                if target == "area":
+                    node.mapping_cost = cell.area
+                elif target == "delay":
+                    node.mapping_cost = cell.delay
+                else:
+                    node.mapping_cost = cell.area + cell.delay * 10
+                mapped.append(node)
+                logger.debug(f"Mapped {node_name} -> {cell.name} (area: {cell.area}, delay: {cell.delay})")
+        return mapped
+
+    def _mapping_summary(self, strategy: str, mapped: List[LogicNode]) -> Dict[str, Any]:
+        return {
+            'strategy': strategy,
+            'mapped_nodes': len(mapped),
+            'total_nodes': len(self.logic_network),
+            'mapping_success_rate': len(mapped) / len(self.logic_network) if self.logic_network else 0,
+            'inverters_added': len(self._inverter_nodes),
+        }
     
     def _area_optimal_mapping(self) -> Dict[str, Any]:
         """Perform area-optimal technology mapping."""
         logger.debug("Performing area-optimal mapping...")
-        
-        total_area = 0.0
-        mapped_nodes = 0
-        
-        for node_name, node in self.logic_network.items():
-            # Find best cell for this function
-            best_cell = self.library.get_best_cell_for_function(node.function, "area")
-            
-            if best_cell:
-                node.mapped_cell = best_cell
-                node.mapping_cost = best_cell.area
-                total_area += best_cell.area
-                mapped_nodes += 1
-                logger.debug(f"Mapped {node_name} -> {best_cell.name} (area: {best_cell.area})")
-            else:
-                logger.warning(f"No suitable cell found for {node_name} with function {node.function}")
-        
-        return {
-            'strategy': 'area_optimal',
-            'total_area': total_area,
-            'mapped_nodes': mapped_nodes,
-            'total_nodes': len(self.logic_network),
-            'mapping_success_rate': mapped_nodes / len(self.logic_network) if self.logic_network else 0
-        }
+        mapped = self._map_nodes("area")
+        results = self._mapping_summary('area_optimal', mapped)
+        results['total_area'] = sum(node.mapped_cell.area for node in mapped)
+        return results
     
     def _delay_optimal_mapping(self) -> Dict[str, Any]:
         """Perform delay-optimal technology mapping."""
         logger.debug("Performing delay-optimal mapping...")
-        
-        total_delay = 0.0
-        mapped_nodes = 0
-        
-        for node_name, node in self.logic_network.items():
-            # Find best cell for this function
-            best_cell = self.library.get_best_cell_for_function(node.function, "delay")
-            
-            if best_cell:
-                node.mapped_cell = best_cell
-                node.mapping_cost = best_cell.delay
-                total_delay += best_cell.delay
-                mapped_nodes += 1
-                logger.debug(f"Mapped {node_name} -> {best_cell.name} (delay: {best_cell.delay})")
-            else:
-                logger.warning(f"No suitable cell found for {node_name} with function {node.function}")
-        
-        return {
-            'strategy': 'delay_optimal',
-            'total_delay': total_delay,
-            'mapped_nodes': mapped_nodes,
-            'total_nodes': len(self.logic_network),
-            'mapping_success_rate': mapped_nodes / len(self.logic_network) if self.logic_network else 0
-        }
+        mapped = self._map_nodes("delay")
+        results = self._mapping_summary('delay_optimal', mapped)
+        results['total_delay'] = sum(node.mapped_cell.delay for node in mapped)
+        return results
     
     def _balanced_mapping(self) -> Dict[str, Any]:
         """Perform balanced technology mapping."""
         logger.debug("Performing balanced mapping...")
-        
-        total_area = 0.0
-        total_delay = 0.0
-        mapped_nodes = 0
-        
-        for node_name, node in self.logic_network.items():
-            # Find best cell for this function
-            best_cell = self.library.get_best_cell_for_function(node.function, "balanced")
-            
-            if best_cell:
-                node.mapped_cell = best_cell
-                node.mapping_cost = best_cell.area + best_cell.delay * 10  # Weighted cost
-                total_area += best_cell.area
-                total_delay += best_cell.delay
-                mapped_nodes += 1
-                logger.debug(f"Mapped {node_name} -> {best_cell.name} (area: {best_cell.area}, delay: {best_cell.delay})")
-            else:
-                logger.warning(f"No suitable cell found for {node_name} with function {node.function}")
-        
-        return {
-            'strategy': 'balanced',
-            'total_area': total_area,
-            'total_delay': total_delay,
-            'mapped_nodes': mapped_nodes,
-            'total_nodes': len(self.logic_network),
-            'mapping_success_rate': mapped_nodes / len(self.logic_network) if self.logic_network else 0
-        }
+        mapped = self._map_nodes("balanced")
+        results = self._mapping_summary('balanced', mapped)
+        results['total_area'] = sum(node.mapped_cell.area for node in mapped)
+        results['total_delay'] = sum(node.mapped_cell.delay for node in mapped)
+        return results
     
     def get_mapping_statistics(self) -> Dict[str, Any]:
         """Get technology mapping statistics."""
@@ -401,6 +712,7 @@ class TechnologyMapper:
         print(f"\nLibrary Information:")
         print(f"  Total cells in library: {total_library_cells}")
         print(f"  Unique functions: {unique_functions}")
+        print(f"  NPN classes: {len(self.library.npn_index)}")
         print(f"  Cells used: {stats['unique_cells_used']} out of {total_library_cells} available")
         
         print(f"\nCell Usage ({stats['unique_cells_used']} types, {stats['mapped_nodes']} instances):")
@@ -485,6 +797,19 @@ def _merge_libraries(primary: TechnologyLibrary, fallback: TechnologyLibrary) ->
     return merged
 
 
+def merged_with_standard_library(library: TechnologyLibrary) -> TechnologyLibrary:
+    """
+    ``_merge_libraries(library, create_standard_library())``, giữ lại trên chính
+    ``library`` (và trong snapshot cache) cho tới khi ``library`` được thêm cell.
+    """
+    cached = library._merged_standard
+    if cached is not None and cached[0] == library._revision:
+        return cached[1]
+    merged = _merge_libraries(library, create_standard_library())
+    library._merged_standard = (library._revision, merged)
+    return merged
+
+
 def aig_to_logic_nodes(aig) -> List[LogicNode]:
     """
     Convert AIG to LogicNodes for technology mapping.
@@ -521,16 +846,8 @@ def aig_to_logic_nodes(aig) -> List[LogicNode]:
         else:
             return f"node_{node.node_id}"
     
-    # Process nodes in topological order (visit children first)
-    visited = set()
-    
     def process_node(node) -> str:
-        """Process AIG node and return its name."""
-        if node.node_id in visited:
-            return get_node_name(node)
-        
-        visited.add(node.node_id)
-        
+        """Process AIG node (fanins already processed) and return its name."""
         # Handle constants
         if node.is_constant():
             const_value = node.get_value()
@@ -544,10 +861,6 @@ def aig_to_logic_nodes(aig) -> List[LogicNode]:
             node_name_map[node.node_id] = pi_name
             return pi_name
         
-        # Handle AND nodes - process children first
-        left_name = process_node(node.left) if node.left else None
-        right_name = process_node(node.right) if node.right else None
-        
         # Determine function based on inversions
         # AIG represents: (left^left_inv) & (right^right_inv)
         # Convert to standard gate functions
@@ -577,21 +890,38 @@ def aig_to_logic_nodes(aig) -> List[LogicNode]:
         if right_input:
             inputs_list.append(right_input)
         
-        logic_node = LogicNode(node_name, function, inputs_list, node_name)
+        # Truth table theo inputs_list (input i = biến i); input hằng thay bằng giá trị
+        operands = []
+        for child, inverted in ((node.left, node.left_inverted), (node.right, node.right_inverted)):
+            if not child:
+                continue
+            if child.is_constant():
+                value = TT4_FULL if child.get_value() else 0
+            else:
+                value = TT4_VARS[len(operands)]
+            operands.append(value ^ (TT4_FULL if inverted else 0))
+        truth = operands[0] & operands[1] if len(operands) == 2 else None
+
+        logic_node = LogicNode(node_name, function, inputs_list, node_name, truth)
         logic_nodes.append(logic_node)
         node_name_map[node.node_id] = node_name
         
         return node_name
     
-    # Process all nodes reachable from outputs
+    # Process all nodes reachable from outputs, in topological order (children first).
+    # Non-recursive DFS per PO with a shared visited set keeps the original node order.
+    visited = set()
     for po_node, po_inverted in aig.pos:
-        output_name = process_node(po_node)
+        for node in dfs_postorder(aig, [po_node], visited):
+            process_node(node)
+        output_name = get_node_name(po_node)
         
         # If output is inverted, create a NOT LogicNode for it
         if po_inverted:
             not_node_name = f"output_not_{po_node.node_id}"
             function = f"NOT({output_name})"
-            logic_node = LogicNode(not_node_name, function, [output_name], not_node_name)
+            logic_node = LogicNode(not_node_name, function, [output_name], not_node_name,
+                                   None if po_node.is_constant() else TT4_VARS[0] ^ TT4_FULL)
             logic_nodes.append(logic_node)
     
     # If no logic nodes were created (e.g., outputs are just primary inputs),
@@ -619,6 +949,7 @@ def techmap(
     strategy: str = "area_optimal",
     *,
     merge_standard_library: bool = True,
+    cut_options: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Technology mapping: AIG → Technology-mapped netlist (combinational, function-match).
@@ -626,44 +957,70 @@ def techmap(
     Args:
         aig: AIG object (từ synthesis hoặc optimize)
         library: Technology library (đã nạp, ví dụ SkyWater qua ``library_loader``)
-        strategy: ``area_optimal``, ``delay_optimal``, ``balanced``
+        strategy: ``area_optimal``, ``delay_optimal``, ``balanced`` (mỗi AND → một
+            cell), hoặc ``cut`` (cut-based mapper trong ``cut_mapper.py``: delay-optimal
+            theo đường găng rồi area recovery; ``total_delay`` là critical path)
         merge_standard_library: Nếu True (mặc định), gộp thêm ``create_standard_library()``
             để có gate generic khi thư viện ngoài thiếu khớp hàm. Nếu False, chỉ dùng
             đúng ``library`` đã truyền (ví dụ chỉ cell Sky130 — phù hợp báo cáo đề tài).
+        cut_options: tham số thêm cho ``CutMapper`` khi ``strategy == "cut"``
+            (``max_cuts``, ``delay_relax``, ``exact_area_rounds``, ...)
 
     Returns:
         Dictionary chứa mapping results và statistics (kèm ``merge_standard_library``).
     """
+    with trace_span("techmap", category="techmap", strategy=strategy,
+                    aig_nodes=aig.count_nodes()) as span:
+        results = _techmap(aig, library, strategy, merge_standard_library, cut_options)
+        span.set(mapped_nodes=results.get('mapped_nodes', 0))
+    return results
+
+
+def _techmap(aig, library: TechnologyLibrary, strategy: str, merge_standard_library: bool,
+             cut_options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Thân của ``techmap`` (span con: library / convert / match / select)."""
     logger.info(f"Starting technology mapping: AIG -> Technology-mapped netlist")
     logger.info(f"  Strategy: {strategy}")
     logger.info(f"  Library: {library.name} ({len(library.cells)} cells)")
 
     if merge_standard_library:
         # Bổ sung gate generic khi thư viện PDK không có đủ biểu thức khớp normalize().
-        library = _merge_libraries(library, create_standard_library())
+        with trace_span("techmap.library", category="techmap"):
+            library = merged_with_standard_library(library)
         logger.info(f"  Effective library (merged): {library.name} ({len(library.cells)} cells)")
     else:
         logger.info(f"  Effective library (no merge): {library.name} ({len(library.cells)} cells)")
     
-    # Convert AIG → LogicNodes
-    logger.info("Converting AIG -> LogicNodes...")
-    logic_nodes = aig_to_logic_nodes(aig)
-    logger.info(f"  Converted {len(logic_nodes)} LogicNodes from AIG")
-    
-    # Create TechnologyMapper
-    mapper = TechnologyMapper(library)
-    
-    # Add LogicNodes to mapper
-    for logic_node in logic_nodes:
-        mapper.add_logic_node(logic_node)
-    
-    # Perform technology mapping
-    results = mapper.perform_technology_mapping(strategy)
+    if strategy == "cut":
+        # Cut-based mapper: phủ AIG bằng cell (AOI/OAI/MUX, ...), delay đường găng
+        from .cut_mapper import CutMapper
+
+        mapper = CutMapper(library, **(cut_options or {}))
+        results = mapper.map(aig)
+        converted_nodes = len(mapper.logic_network)
+    else:
+        # Convert AIG → LogicNodes
+        logger.info("Converting AIG -> LogicNodes...")
+        with trace_span("techmap.convert", category="techmap") as convert_span:
+            logic_nodes = aig_to_logic_nodes(aig)
+
+            # Create TechnologyMapper
+            mapper = TechnologyMapper(library)
+
+            # Add LogicNodes to mapper
+            for logic_node in logic_nodes:
+                mapper.add_logic_node(logic_node)
+            convert_span.set(logic_nodes=len(logic_nodes))
+        logger.info(f"  Converted {len(logic_nodes)} LogicNodes from AIG")
+
+        # Perform technology mapping
+        results = mapper.perform_technology_mapping(strategy)
+        converted_nodes = len(logic_nodes)
     
     # Add additional statistics
     results['input_aig_nodes'] = aig.count_nodes()
     results['input_aig_and_nodes'] = aig.count_and_nodes()
-    results['converted_logic_nodes'] = len(logic_nodes)
+    results['converted_logic_nodes'] = converted_nodes
     results['library_name'] = library.name
     results['merge_standard_library'] = merge_standard_library
 
@@ -748,8 +1105,8 @@ def convert_mapped_logic_network_to_netlist(
     for node_name, logic_node in mapper.logic_network.items():
         node_dict = {
             'id': logic_node.name,
-            'output': logic_node.output,
-            'inputs': logic_node.inputs,
+            'output': logic_node.mapped_output or logic_node.output,
+            'inputs': logic_node.mapped_inputs if logic_node.mapped_inputs is not None else logic_node.inputs,
         }
         
         if logic_node.mapped_cell:
@@ -776,6 +1133,9 @@ def convert_mapped_logic_network_to_netlist(
         
         mapped_netlist['nodes'].append(node_dict)
 
+    # Cut mapper đã map cả pha của PO: ``po_signals`` là tín hiệu lái từng output
+    po_signals = getattr(mapper, 'po_signals', None) or []
+
     # Preserve primary outputs by adding explicit BUF/NOT/CONST drivers from AIG outputs.
     if hasattr(aig, 'pos') and aig.pos:
         for idx, (po_node, po_inverted) in enumerate(aig.pos):
@@ -784,6 +1144,18 @@ def convert_mapped_logic_network_to_netlist(
 
             output_name = outputs[idx]
             source_signal = _signal_name_from_aig_node(po_node)
+            if idx < len(po_signals):
+                source_signal = po_signals[idx]
+                po_inverted = False
+                if source_signal in ("CONST0", "CONST1"):
+                    mapped_netlist['nodes'].append({
+                        'id': f"po_const_{idx}",
+                        'type': source_signal,
+                        'output': output_name,
+                        'inputs': [],
+                        'mapped': False,
+                    })
+                    continue
 
             if po_node.is_constant():
                 mapped_netlist['nodes'].append({
@@ -819,7 +1191,8 @@ def convert_mapped_logic_network_to_netlist(
     return mapped_netlist
 
 
-def load_library_from_file(file_path: str, library_type: Optional[str] = None) -> TechnologyLibrary:
+def load_library_from_file(file_path: str, library_type: Optional[str] = None,
+                           use_cache: bool = True) -> TechnologyLibrary:
     """
     Load technology library from file.
     
@@ -828,6 +1201,8 @@ def load_library_from_file(file_path: str, library_type: Optional[str] = None) -
     Args:
         file_path: Path to library file (.lib, .json, or .v)
         library_type: Optional type hint ("liberty", "json", "verilog")
+        use_cache: Dùng snapshot đã biên dịch (``library_cache.py``) nếu file nguồn
+            không đổi; lần đầu nạp từ file rồi ghi snapshot
         
     Returns:
         TechnologyLibrary object
@@ -838,7 +1213,11 @@ def load_library_from_file(file_path: str, library_type: Optional[str] = None) -
     """
     try:
         from .library_loader import load_library
-        return load_library(file_path, library_type)
+        if not use_cache:
+            return load_library(file_path, library_type)
+        from .library_cache import cached_library
+        return cached_library("file", [file_path], lambda: load_library(file_path, library_type),
+                              options=library_type)
     except ImportError:
         logger.warning("library_loader not available, using standard library")
         return create_standard_library()
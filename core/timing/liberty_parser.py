@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Liberty (.lib) parser dạng streaming.
+
+File được đọc theo từng khối ``chunk_size`` ký tự và tách token bằng một regex
+duy nhất (chuỗi, comment, dấu nối dòng ``\\``, dấu câu, từ); token cắt ngang biên
+khối được đọc tiếp khối sau rồi tách lại. Parser dựng cây ``LibertyGroup``
+(attribute đơn ``name : value ;``, attribute phức ``name (args) ;`` và group
+``name (args) { ... }``) nhưng chỉ cho các group có tên trong ``keep``; group khác
+(``internal_power``, ``leakage_power``, ``ff``, ...) được bỏ qua bằng cách đếm
+ngoặc trên một regex nhẹ, không tạo token hay object nào.
+
+``iter_liberty_groups`` trả về từng group có tên trong ``emit`` ngay khi group
+đóng và không gắn nó vào group cha, nên bộ nhớ chỉ giữ một cell tại một thời
+điểm — kích thước file không ảnh hưởng bộ nhớ.
+
+Example:
+    >>> for group in iter_liberty_groups("sky130.lib", emit=("cell",), keep=("cell", "pin")):
+    ...     print(group.args[0], [p.args[0] for p in group.find("pin")])
+"""
+
+import io
+import re
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+
+# Kích thước khối đọc mặc định (ký tự)
+CHUNK_SIZE = 1 << 20
+
+_TOKEN_RE = re.compile(
+    r'[ \t\r\n]+|\\\r?\n|/\*.*?\*/|//[^\n]*'
+    r'|"((?:[^"\\]|\\.)*)"'                              # 1: chuỗi
+    r'|([{}();:,])'                                      # 2: dấu câu
+    r'|((?:[^\s{}();:,"/\\]|/(?=[^*/])|\\(?=[^\r\n]|\r[^\n]))+)'  # 3: từ
+    r'|(/\*|"|\\\r?|/)',                                 # 4: token chưa đủ (cuối khối) / ký tự lẻ
+    re.S,
+)
+# Bỏ qua group: chỉ quan tâm ngoặc nhọn ngoài chuỗi/comment
+_SKIP_RE = re.compile(r'[^{}"/\\]+|"(?:[^"\\]|\\.)*"|/\*.*?\*/|//[^\n]*\n|\\.|/(?=[^*/])|([{}])|(["/\\])', re.S)
+
+
+class LibertyGroup:
+    """Group Liberty ``name (args) { ... }``: attribute đơn, attribute phức và group con."""
+
+    __slots__ = ("name", "args", "attributes", "complex_attributes", "groups")
+
+    def __init__(self, name: str, args: List[str]):
+        self.name = name
+        self.args = args
+        self.attributes = {}
+        self.complex_attributes = {}
+        self.groups: List["LibertyGroup"] = []
+
+    def find(self, name: str) -> List["LibertyGroup"]:
+        return [g for g in self.groups if g.name == name]
+
+    def __repr__(self):
+        return f"LibertyGroup({self.name}({', '.join(self.args)}))"
+
+
+class _Lexer:
+    """Tách token trên buffer trượt; ``skip_group`` nhảy qua thân group không cần."""
+
+    def __init__(self, stream, chunk_size: int):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        data = self._stream.read(self._chunk_size)
+        if not data:
+            self._eof = True
+            return
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+
+    def token(self):
+        """Token kế tiếp ``(kind, value)`` (kind: ``str``, ``word`` hoặc dấu câu); ``None`` khi hết file."""
+        match = _TOKEN_RE.match
+        while True:
+            buf, pos = self._buf, self._pos
+            if pos >= len(buf):
+                if self._eof:
+                    return None
+                self._fill()
+                continue
+            m = match(buf, pos)
+            index = m.lastindex
+            # Token chạm cuối buffer có thể bị cắt (lookahead cần thêm tối đa 2 ký tự)
+            if (index == 4 or m.end() + 2 >= len(buf)) and not self._eof:
+                self._fill()
+                continue
+            self._pos = m.end()
+            if index == 2:
+                value = m.group(2)
+                return (value, value)
+            if index == 3:
+                return ("word", m.group(3))
+            if index == 1:
+                return ("str", m.group(1))
+            # Khoảng trắng / comment / nối dòng / ký tự lẻ cuối file
+
+    def skip_group(self) -> None:
+        """Bỏ qua tới ``}`` khớp với ``{`` vừa đọc."""
+        match = _SKIP_RE.match
+        depth = 1
+        while depth:
+            buf, pos = self._buf, self._pos
+            if pos >= len(buf):
+                if self._eof:
+                    return
+                self._fill()
+                continue
+            m = match(buf, pos)
+            if m.lastindex == 2 and not self._eof:
+                self._fill()
+                continue
+            self._pos = m.end()
+            if m.lastindex == 1:
+                depth += 1 if m.group(1) == "{" else -1
+
+
+@contextmanager
+def _open_source(source):
+    if hasattr(source, "read"):
+        yield source
+    else:
+        with open(source, "r", encoding="utf-8", errors="replace") as stream:
+            yield stream
+
+
+def _parse(source, root: LibertyGroup, emit: frozenset, keep: Optional[frozenset],
+           chunk_size: int) -> Iterator[LibertyGroup]:
+    with _open_source(source) as stream:
+        lexer = _Lexer(stream, chunk_size)
+        token = lexer.token
+        stack = [root]
+        tok = token()
+        while tok is not None:
+            kind, name = tok
+            if kind == "}":
+                if len(stack) > 1:
+                    group = stack.pop()
+                    if group.name in emit:
+                        yield group
+                tok = token()
+                continue
+            if kind != "word" and kind != "str":
+                if kind == "{":
+                    lexer.skip_group()
+                tok = token()
+                continue
+            tok = token()
+            if tok is None:
+                break
+            if tok[0] == ":":
+                # name : value ;
+                parts = []
+                tok = token()
+                while tok is not None and tok[0] != ";" and tok[0] != "}":
+                    if tok[0] == "word" or tok[0] == "str":
+                        parts.append(tok[1])
+                    tok = token()
+                stack[-1].attributes[name] = " ".join(parts)
+                if tok is not None and tok[0] == ";":
+                    tok = token()
+                continue
+            if tok[0] != "(":
+                # Token lẻ (cú pháp không hỗ trợ): bỏ qua
+                continue
+            args: List[str] = []
+            depth = 1
+            tok = token()
+            while tok is not None:
+                k = tok[0]
+                if k == "(":
+                    depth += 1
+                elif k == ")":
+                    depth -= 1
+                    if not depth:
+                        break
+                elif k == "word" or k == "str":
+                    args.append(tok[1])
+                tok = token()
+            tok = token()
+            if tok is not None and tok[0] == "{":
+                # Group mức ngoài cùng (library) luôn được dựng
+                if keep is None or name in keep or len(stack) == 1:
+                    group = LibertyGroup(name, args)
+                    if name not in emit:
+                        stack[-1].groups.append(group)
+                    stack.append(group)
+                else:
+                    lexer.skip_group()
+                tok = token()
+            else:
+                stack[-1].complex_attributes[name] = args
+                if tok is not None and tok[0] == ";":
+                    tok = token()
+
+
+def iter_liberty_groups(source, emit: Iterable[str] = ("cell",), keep: Optional[Iterable[str]] = None,
+                        chunk_size: int = CHUNK_SIZE) -> Iterator[LibertyGroup]:
+    """
+    Duyệt file Liberty (đường dẫn hoặc file object), trả về từng group có tên
+    trong ``emit`` khi group đó đóng. ``keep``: tên các group được dựng cây (group
+    trong ``emit`` luôn được dựng; ``None`` = tất cả); group khác bị bỏ qua.
+    """
+    emit = frozenset(emit)
+    keep = None if keep is None else frozenset(keep) | emit
+    return _parse(source, LibertyGroup("", []), emit, keep, chunk_size)
+
+
+def parse_liberty(source, keep: Optional[Iterable[str]] = None, chunk_size: int = CHUNK_SIZE) -> LibertyGroup:
+    """Parse cả file thành cây; trả về group gốc tên ``""`` (con: group ``library``)."""
+    root = LibertyGroup("", [])
+    for _group in _parse(source, root, frozenset(), None if keep is None else frozenset(keep), chunk_size):
+        pass
+    return root
+
+
+def parse_liberty_statements(text: str) -> LibertyGroup:
+    """
+    Parse một đoạn Liberty (thân cell, header library, ...) thành group gốc
+    tên ``""`` chứa các attribute/group ở mức ngoài cùng.
+    """
+    return parse_liberty(io.StringIO(text))
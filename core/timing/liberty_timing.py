@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Liberty NLDM timing model — bảng tra delay/slew của cell cho STA.
+
+Mỗi cell có ``CellTiming``: điện dung input pin và danh sách ``TimingArc``
+(related pin → output pin, ``timing_sense``) với 4 bảng NLDM ``cell_rise``,
+``cell_fall``, ``rise_transition``, ``fall_transition``. Bảng được chuẩn hóa về
+trục (input slew, output load) bất kể ``variable_1``/``variable_2`` của
+``lu_table_template``; tra bảng bằng nội suy song tuyến (ngoại suy tuyến tính
+ngoài biên, như các công cụ STA thương mại).
+
+Nguồn dữ liệu:
+    - Liberty text: cây ``LibertyGroup`` từ ``liberty_parser`` (streaming),
+      ``lu_table_template`` và ``cell_timing_from_liberty_group``.
+    - SkyWater ``*.lib.json``: ``cell_timing_from_skywater_dict``.
+"""
+
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.timing.liberty_parser import LibertyGroup, parse_liberty_statements
+
+SLEW_VARIABLES = ("input_net_transition", "input_transition_time")
+LOAD_VARIABLES = ("total_output_net_capacitance", "output_net_capacitance")
+TABLE_KINDS = ("cell_rise", "cell_fall", "rise_transition", "fall_transition")
+# timing_type không phải cung tổ hợp (setup/hold/clock, ...) bị bỏ qua
+COMBINATIONAL_TYPES = ("combinational", "combinational_rise", "combinational_fall")
+# Group Liberty cần dựng cây để lấy hàm/pin/timing của cell (còn lại bỏ qua khi parse)
+LIBERTY_TIMING_GROUPS = ("lu_table_template", "cell", "pin", "timing") + TABLE_KINDS
+
+class NLDMTable:
+    """
+    Bảng NLDM 2 chiều theo (input slew, output load); bảng 1 chiều / scalar
+    có trục còn lại một điểm.
+    """
+
+    __slots__ = ("slew_axis", "load_axis", "values")
+
+    def __init__(self, slew_axis: Sequence[float], load_axis: Sequence[float],
+                 values: Sequence[Sequence[float]]):
+        self.slew_axis = [float(v) for v in slew_axis] or [0.0]
+        self.load_axis = [float(v) for v in load_axis] or [0.0]
+        self.values = [[float(v) for v in row] for row in values]
+        if len(self.values) != len(self.slew_axis) or any(len(r) != len(self.load_axis) for r in self.values):
+            raise ValueError(
+                f"NLDM table shape {len(self.values)}x{len(self.values[0]) if self.values else 0} "
+                f"does not match index sizes {len(self.slew_axis)}x{len(self.load_axis)}"
+            )
+
+    @classmethod
+    def from_liberty(cls, index_1: Sequence[float], index_2: Sequence[float],
+                     values: Sequence[Sequence[float]],
+                     variables: Tuple[Optional[str], Optional[str]] = (None, None)) -> "NLDMTable":
+        """
+        Bảng theo quy ước Liberty (``values[i][j]`` ứng ``index_1[i]``, ``index_2[j]``);
+        nếu ``variable_1`` là load thì hoán vị về (slew, load).
+        """
+        rows = [list(r) for r in values]
+        if not index_2:
+            # Bảng 1 chiều: values là một hàng theo index_1
+            flat = [v for r in rows for v in r]
+            rows = [[v] for v in flat]
+        var_1, var_2 = variables
+        if var_1 in LOAD_VARIABLES or (var_2 in SLEW_VARIABLES and var_1 not in SLEW_VARIABLES):
+            if not index_2:
+                return cls([0.0], index_1, [[r[0] for r in rows]])
+            transposed = [[rows[i][j] for i in range(len(rows))] for j in range(len(rows[0]))]
+            return cls(index_2, index_1, transposed)
+        return cls(index_1, index_2 or [0.0], rows)
+
+    @classmethod
+    def scalar(cls, value: float) -> "NLDMTable":
+        return cls([0.0], [0.0], [[value]])
+
+    def lookup(self, slew: float, load: float) -> float:
+        """Nội suy song tuyến tại (``slew``, ``load``)."""
+        xs, ys, v = self.slew_axis, self.load_axis, self.values
+        if len(xs) > 1:
+            i = min(max(bisect_right(xs, slew) - 1, 0), len(xs) - 2)
+            tx = (slew - xs[i]) / (xs[i + 1] - xs[i])
+        else:
+            i, tx = 0, 0.0
+        if len(ys) > 1:
+            j = min(max(bisect_right(ys, load) - 1, 0), len(ys) - 2)
+            ty = (load - ys[j]) / (ys[j + 1] - ys[j])
+            row0 = v[i][j] + (v[i][j + 1] - v[i][j]) * ty
+            if len(xs) == 1:
+                return row0
+            row1 = v[i + 1][j] + (v[i + 1][j + 1] - v[i + 1][j]) * ty
+        else:
+            row0 = v[i][0]
+            if len(xs) == 1:
+                return row0
+            row1 = v[i + 1][0]
+        return row0 + (row1 - row0) * tx
+
+    def nominal(self) -> float:
+        """Giá trị ở giữa bảng (dùng làm delay scalar đại diện)."""
+        return self.values[len(self.slew_axis) // 2][len(self.load_axis) // 2]
+
+    def __repr__(self):
+        return f"NLDMTable({len(self.slew_axis)}x{len(self.load_axis)})"
+
+
+class TimingArc:
+    """
+    Cung timing ``related_pin`` → ``output_pin``. ``sense``: ``positive_unate``,
+    ``negative_unate`` hoặc ``non_unate``. Bảng thiếu → ``None``.
+    """
+
+    __slots__ = ("related_pin", "output_pin", "sense", "cell_rise", "cell_fall",
+                 "rise_transition", "fall_transition")
+
+    def __init__(self, related_pin: str, output_pin: str, sense: str = "non_unate",
+                 cell_rise: Optional[NLDMTable] = None, cell_fall: Optional[NLDMTable] = None,
+                 rise_transition: Optional[NLDMTable] = None,
+                 fall_transition: Optional[NLDMTable] = None):
+        self.related_pin = related_pin
+        self.output_pin = output_pin
+        self.sense = sense
+        self.cell_rise = cell_rise
+        self.cell_fall = cell_fall
+        self.rise_transition = rise_transition
+        self.fall_transition = fall_transition
+
+    def __repr__(self):
+        return f"TimingArc({self.related_pin}->{self.output_pin}, {self.sense})"
+
+
+class CellTiming:
+    """Timing của một cell: điện dung input pin + các ``TimingArc``."""
+
+    def __init__(self, pin_capacitance: Optional[Dict[str, float]] = None,
+                 arcs: Optional[List[TimingArc]] = None):
+        self.pin_capacitance: Dict[str, float] = dict(pin_capacitance or {})
+        self.arcs: List[TimingArc] = list(arcs or [])
+
+    def nominal_delay(self) -> Optional[float]:
+        """Delay lớn nhất (trung bình rise/fall) tại điểm giữa các bảng; ``None`` nếu không có bảng."""
+        best = None
+        for arc in self.arcs:
+            delays = [t.nominal() for t in (arc.cell_rise, arc.cell_fall) if t is not None]
+            if delays:
+                value = sum(delays) / len(delays)
+                best = value if best is None else max(best, value)
+        return best
+
+    def __repr__(self):
+        return f"CellTiming(pins={len(self.pin_capacitance)}, arcs={len(self.arcs)})"
+
+
+# ---------------------------------------------------------------- Liberty text
+
+def _floats(args: Sequence[str]) -> List[float]:
+    values: List[float] = []
+    for arg in args:
+        for piece in arg.replace("\\", " ").split(","):
+            piece = piece.strip()
+            if piece:
+                values.append(float(piece))
+    return values
+
+
+def _rows(args: Sequence[str]) -> List[List[float]]:
+    return [_floats([arg]) for arg in args if arg.strip()]
+
+
+def lu_table_template(group: LibertyGroup) -> Dict[str, Any]:
+    """``{"variables": (var_1, var_2), "index_1": [...], "index_2": [...]}`` của group ``lu_table_template``."""
+    return {
+        "variables": (group.attributes.get("variable_1"), group.attributes.get("variable_2")),
+        "index_1": _floats(group.complex_attributes.get("index_1", [])),
+        "index_2": _floats(group.complex_attributes.get("index_2", [])),
+    }
+
+
+def parse_lu_table_templates(text: str) -> Dict[str, Dict[str, Any]]:
+    """``{tên template: lu_table_template(...)}`` cho mọi group ``lu_table_template`` trong ``text``."""
+    templates: Dict[str, Dict[str, Any]] = {}
+    pending = [parse_liberty_statements(text)]
+    while pending:
+        group = pending.pop()
+        for child in group.groups:
+            if child.name == "lu_table_template" and child.args:
+                templates[child.args[0]] = lu_table_template(child)
+            else:
+                pending.append(child)
+    return templates
+
+
+def _table_from_group(group: LibertyGroup, templates: Dict[str, Dict[str, Any]]) -> Optional[NLDMTable]:
+    template = templates.get(group.args[0]) if group.args else None
+    values = _rows(group.complex_attributes.get("values", []))
+    if not values:
+        return None
+    if group.args and group.args[0] == "scalar":
+        return NLDMTable.scalar(values[0][0])
+    index_1 = _floats(group.complex_attributes["index_1"]) if "index_1" in group.complex_attributes \
+        else list((template or {}).get("index_1", []))
+    index_2 = _floats(group.complex_attributes["index_2"]) if "index_2" in group.complex_attributes \
+        else list((template or {}).get("index_2", []))
+    variables = (template or {}).get("variables", (None, None))
+    if not index_1:
+        return NLDMTable.scalar(values[0][0])
+    return NLDMTable.from_liberty(index_1, index_2, values, variables)
+
+
+def _pin_capacitance(attributes: Dict[str, Any]) -> Optional[float]:
+    caps = []
+    for key in ("capacitance", "rise_capacitance", "fall_capacitance"):
+        value = attributes.get(key)
+        if value is None or value == "":
+            continue
+        try:
+            caps.append(float(value))
+        except (TypeError, ValueError):
+            continue
+    return max(caps) if caps else None
+
+
+def cell_timing_from_liberty_group(cell: LibertyGroup,
+                                   templates: Optional[Dict[str, Dict[str, Any]]] = None) -> CellTiming:
+    """``CellTiming`` từ group ``cell`` (hoặc group gốc của thân cell) đã parse."""
+    templates = templates or {}
+    timing = CellTiming()
+    for pin in cell.find("pin"):
+        if not pin.args:
+            continue
+        pin_name = pin.args[0]
+        direction = pin.attributes.get("direction", "input").lower()
+        if direction == "input":
+            cap = _pin_capacitance(pin.attributes)
+            if cap is not None:
+                timing.pin_capacitance[pin_name] = cap
+            continue
+        for arc_group in pin.find("timing"):
+            timing_type = arc_group.attributes.get("timing_type", "combinational")
+            if timing_type not in COMBINATIONAL_TYPES:
+                continue
+            tables = {}
+            for kind in TABLE_KINDS:
+                groups = arc_group.find(kind)
+                tables[kind] = _table_from_group(groups[0], templates) if groups else None
+            sense = arc_group.attributes.get("timing_sense", "non_unate")
+            for related in arc_group.attributes.get("related_pin", "").split():
+                timing.arcs.append(TimingArc(related, pin_name, sense, **tables))
+    return timing
+
+
+# ------------------------------------------------------------ SkyWater JSON
+
+def _table_from_json(table: Any) -> Optional[NLDMTable]:
+    if not isinstance(table, dict):
+        return None
+    values = table.get("values")
+    if not isinstance(values, list) or not values:
+        return None
+    rows = [list(r) if isinstance(r, list) else [r] for r in values]
+    index_1 = table.get("index_1") or []
+    index_2 = table.get("index_2") or []
+    if not index_1:
+        return NLDMTable.scalar(float(rows[0][0]))
+    # Template Sky130 (del_1_7_7, ...): variable_1 = slew, variable_2 = load
+    return NLDMTable.from_liberty(index_1, index_2, rows, (SLEW_VARIABLES[0], LOAD_VARIABLES[0]))
+
+
+def cell_timing_from_skywater_dict(data: Dict[str, Any]) -> CellTiming:
+    """``CellTiming`` từ một file SkyWater ``*.lib.json`` (khóa ``pin,<tên>``)."""
+    timing = CellTiming()
+    for key, pin in data.items():
+        if not (isinstance(key, str) and key.startswith("pin,") and isinstance(pin, dict)):
+            continue
+        pin_name = key.split(",", 1)[1]
+        direction = str(pin.get("direction", "")).lower()
+        if direction == "input":
+            cap = _pin_capacitance(pin)
+            if cap is not None:
+                timing.pin_capacitance[pin_name] = cap
+            continue
+        if direction != "output":
+            continue
+        arcs = pin.get("timing")
+        for block in arcs if isinstance(arcs, list) else []:
+            if not isinstance(block, dict):
+                continue
+            if str(block.get("timing_type", "combinational")) not in COMBINATIONAL_TYPES:
+                continue
+            tables: Dict[str, Optional[NLDMTable]] = {kind: None for kind in TABLE_KINDS}
+            for table_key, table in block.items():
+                kind = table_key.split(",", 1)[0] if isinstance(table_key, str) else None
+                if kind in tables and tables[kind] is None:
+                    tables[kind] = _table_from_json(table)
+            sense = str(block.get("timing_sense", "non_unate"))
+            for related in str(block.get("related_pin", "")).split():
+                timing.arcs.append(TimingArc(related, pin_name, sense, **tables))
+    return timing
@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Static Timing Analysis (STA) trên netlist đã technology mapping.
+
+Mô hình:
+    - Mỗi net có arrival time và slew riêng cho cạnh lên (rise) và xuống (fall).
+    - Cell có bảng NLDM (``LibraryCell.timing``, xem ``liberty_timing.py``):
+      delay/slew output tra theo (slew input, tải output) bằng nội suy song tuyến;
+      ``timing_sense`` quyết định cạnh input nào gây ra cạnh output nào.
+      Cell không có bảng: delay scalar ``cell.delay`` cho mọi cung.
+    - Tải của net = tổng điện dung input pin của fanout (+ ``output_load`` nếu là PO).
+    - Node chưa map (BUF/NOT/AND generic, LUT, ...) là cổng lý tưởng delay 0;
+      BUF/``po_buf`` là dây nối (tải đi xuyên qua).
+
+Lan truyền arrival theo thứ tự topo; khi có NumPy và netlist đủ lớn, các instance
+cùng level và cùng cell được xử lý thành một khối vector (tra bảng vector hóa).
+
+Kết quả (``STAReport``): arrival/slack từng PO, WNS/TNS so với ``clock_period``
+(không có ràng buộc: required = arrival lớn nhất) và k đường găng nhất
+(mỗi endpoint một đường, truy ngược theo fanin quyết định arrival).
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+RISE, FALL = 0, 1
+_TRANSITIONS = ("rise", "fall")
+_NEG_INF = float("-inf")
+_CONST_SIGNALS = ("CONST0", "CONST1", "1'b0", "1'b1")
+# Instance (pha vào, pha ra) theo timing_sense
+_SENSE_PAIRS = {
+    "positive_unate": ((RISE, RISE), (FALL, FALL)),
+    "negative_unate": ((FALL, RISE), (RISE, FALL)),
+}
+_NON_UNATE = ((RISE, RISE), (FALL, FALL), (FALL, RISE), (RISE, FALL))
+# Kích thước netlist (instance) tối thiểu để dùng đường NumPy
+NUMPY_MIN_INSTANCES = 2000
+
+_KIND_CELL, _KIND_SCALAR, _KIND_WIRE, _KIND_IDEAL = range(4)
+
+
+class TimingPoint(NamedTuple):
+    """Một điểm trên đường timing: net ``signal`` đạt ``arrival`` qua ``instance``."""
+    signal: str
+    instance: Optional[str]
+    cell: Optional[str]
+    transition: str
+    delay: float
+    arrival: float
+    slew: float
+
+
+class TimingPath(NamedTuple):
+    endpoint: str
+    arrival: float
+    required: float
+    slack: float
+    points: List[TimingPoint]
+
+
+class STAReport:
+    """Kết quả STA: endpoint (PO), đường găng và thống kê."""
+
+    def __init__(self, endpoints: Dict[str, Tuple[float, float]], paths: List[TimingPath],
+                 required: float, constrained: bool, stats: Dict[str, Any]):
+        self.endpoints = endpoints  # PO -> (arrival, slack)
+        self.paths = paths
+        self.required = required
+        self.constrained = constrained
+        self.stats = stats
+
+    @property
+    def critical_delay(self) -> float:
+        return max((a for a, _s in self.endpoints.values()), default=0.0)
+
+    @property
+    def worst_slack(self) -> float:
+        return min((s for _a, s in self.endpoints.values()), default=0.0)
+
+    @property
+    def wns(self) -> float:
+        """Worst negative slack (0 nếu mọi endpoint đạt)."""
+        return min(0.0, self.worst_slack)
+
+    @property
+    def tns(self) -> float:
+        """Total negative slack: tổng slack âm của các endpoint."""
+        return sum(s for _a, s in self.endpoints.values() if s < 0)
+
+    @property
+    def violations(self) -> int:
+        return sum(1 for _a, s in self.endpoints.values() if s < 0)
+
+    def format(self, max_paths: Optional[int] = None) -> str:
+        """Báo cáo dạng text (tóm tắt + từng đường găng)."""
+        lines = [
+            "STATIC TIMING REPORT",
+            f"  Instances: {self.stats.get('instances', 0)} "
+            f"(NLDM {self.stats.get('nldm_instances', 0)}, scalar {self.stats.get('scalar_instances', 0)}, "
+            f"ideal {self.stats.get('ideal_instances', 0)})",
+            f"  Endpoints: {len(self.endpoints)}",
+            f"  Critical path delay: {self.critical_delay:.4f}",
+        ]
+        if self.constrained:
+            lines.append(f"  Required time (clock period): {self.required:.4f}")
+            lines.append(f"  WNS: {self.wns:.4f}  TNS: {self.tns:.4f}  Violating endpoints: {self.violations}")
+        else:
+            lines.append("  Unconstrained (required = critical path delay)")
+        for rank, path in enumerate(self.paths[:max_paths] if max_paths else self.paths, start=1):
+            lines.append("")
+            lines.append(f"Path {rank}: endpoint {path.endpoint}  arrival {path.arrival:.4f}  "
+                         f"required {path.required:.4f}  slack {path.slack:.4f}")
+            lines.append(f"  {'Point':<28} {'Cell':<22} {'Edge':<5} {'Incr':>9} {'Arrival':>9} {'Slew':>9}")
+            for p in path.points:
+                cell = p.cell or ("(input)" if p.instance is None else "(wire)")
+                lines.append(f"  {p.signal[:28]:<28} {cell[:22]:<22} {p.transition:<5} "
+                             f"{p.delay:>9.4f} {p.arrival:>9.4f} {p.slew:>9.4f}")
+        return "\n".join(lines)
+
+
+class _Graph:
+    """Netlist đã đánh số: net id, instance theo thứ tự topo, tải từng net."""
+
+    def __init__(self):
+        self.net_ids: Dict[str, int] = {}
+        self.net_names: List[str] = []
+        self.names: List[str] = []
+        self.kinds: List[int] = []
+        self.cells: List[Any] = []
+        self.arcs: List[Sequence[Tuple[int, Any]]] = []
+        self.fanins: List[List[int]] = []
+        self.outputs: List[int] = []
+        self.driver: Dict[int, int] = {}
+        self.order: List[int] = []
+        self.load: List[float] = []
+        self.starts: List[int] = []
+        self.constants: List[int] = []
+
+    def net(self, name: str) -> int:
+        nid = self.net_ids.get(name)
+        if nid is None:
+            nid = self.net_ids[name] = len(self.net_names)
+            self.net_names.append(name)
+        return nid
+
+
+class StaticTimingAnalyzer:
+    """
+    STA cho netlist dict (định dạng ``convert_mapped_logic_network_to_netlist``).
+
+    Args:
+        library: ``TechnologyLibrary`` đã dùng để map (cell có ``timing`` dùng NLDM)
+        input_slew: slew tại PI (None: điểm nhỏ nhất của trục slew trong thư viện)
+        input_arrival: arrival tại PI
+        output_load: tải gắn vào mỗi PO (None: điện dung input pin trung bình)
+        clock_period: required time tại PO (None: không ràng buộc)
+        use_numpy: True/False ép chọn đường lan truyền; None = tự chọn
+    """
+
+    def __init__(self, library, input_slew: Optional[float] = None, input_arrival: float = 0.0,
+                 output_load: Optional[float] = None, clock_period: Optional[float] = None,
+                 use_numpy: Optional[bool] = None):
+        self.library = library
+        self.input_arrival = input_arrival
+        self.clock_period = clock_period
+        self.use_numpy = use_numpy
+        self._cell_arcs: Dict[Tuple[str, str], List[Tuple[int, Any]]] = {}
+        caps: List[float] = []
+        slews: List[float] = []
+        for cell in library.cells.values():
+            timing = getattr(cell, "timing", None)
+            if timing is None:
+                continue
+            caps.extend(timing.pin_capacitance.values())
+            for arc in timing.arcs:
+                for table in (arc.cell_rise, arc.cell_fall):
+                    # Bảng scalar/1-D theo load có trục slew giả [0.0]
+                    if table is not None and len(table.slew_axis) > 1:
+                        slews.append(table.slew_axis[0])
+        self.input_slew = input_slew if input_slew is not None else (min(slews) if slews else 0.0)
+        self.output_load = output_load if output_load is not None else (sum(caps) / len(caps) if caps else 0.0)
+
+    # ------------------------------------------------------------ graph
+
+    def _arcs_for(self, cell, output_pin: str) -> List[Tuple[int, Any]]:
+        key = (cell.name, output_pin)
+        arcs = self._cell_arcs.get(key)
+        if arcs is None:
+            pins = list(cell.input_pins or [])
+            arcs = [(pins.index(arc.related_pin), arc) for arc in cell.timing.arcs
+                    if arc.output_pin == output_pin and arc.related_pin in pins]
+            self._cell_arcs[key] = arcs
+        return arcs
+
+    def _build(self, netlist: Dict[str, Any]) -> _Graph:
+        g = _Graph()
+        cells = self.library.cells
+        nodes = netlist.get("nodes", [])
+        if isinstance(nodes, dict):
+            nodes = list(nodes.values())
+        for name in netlist.get("inputs", []):
+            g.starts.append(g.net(name))
+
+        pin_caps: List[List[float]] = []
+        for index, node in enumerate(nodes):
+            output = node.get("output")
+            if not output:
+                continue
+            kind_name = node.get("type", "")
+            cell = cells.get(kind_name) if node.get("mapped", kind_name in cells) else None
+            inputs = [g.net(s) for s in node.get("inputs", [])]
+            out = g.net(output)
+            inst = len(g.names)
+            caps: List[float] = []
+            arcs: Sequence[Tuple[int, Any]] = ()
+            if cell is not None:
+                pins = node.get("input_pins") or list(cell.input_pins or [])
+                timing = getattr(cell, "timing", None)
+                if timing is not None:
+                    output_pin = (node.get("output_pins") or cell.output_pins or ["Y"])[0]
+                    arcs = self._arcs_for(cell, output_pin)
+                    caps = [timing.pin_capacitance.get(p, cell.input_load) for p in pins[:len(inputs)]]
+                    kind = _KIND_CELL if arcs else _KIND_SCALAR
+                else:
+                    caps = [cell.input_load] * len(inputs)
+                    kind = _KIND_SCALAR
+            elif kind_name in _CONST_SIGNALS:
+                g.constants.append(out)
+                continue
+            elif kind_name == "BUF" and len(inputs) == 1:
+                kind = _KIND_WIRE
+            else:
+                kind = _KIND_IDEAL
+            if out in g.driver:
+                raise ValueError(f"Net '{output}' has multiple drivers")
+            g.driver[out] = inst
+            g.names.append(str(node.get("id", f"inst{index}")))
+            g.kinds.append(kind)
+            g.cells.append(cell)
+            g.arcs.append(arcs)
+            g.fanins.append(inputs)
+            g.outputs.append(out)
+            pin_caps.append(caps)
+        for name in _CONST_SIGNALS:
+            if name in g.net_ids:
+                g.constants.append(g.net_ids[name])
+
+        # Thứ tự topo (Kahn) theo driver của các input
+        n_inst = len(g.names)
+        indegree = [0] * n_inst
+        fanouts: List[List[int]] = [[] for _ in range(n_inst)]
+        for inst, fanin in enumerate(g.fanins):
+            for net in fanin:
+                src = g.driver.get(net)
+                if src is not None:
+                    indegree[inst] += 1
+                    fanouts[src].append(inst)
+        ready = [i for i in range(n_inst) if indegree[i] == 0]
+        order = g.order
+        while ready:
+            inst = ready.pop()
+            order.append(inst)
+            for dst in fanouts[inst]:
+                indegree[dst] -= 1
+                if indegree[dst] == 0:
+                    ready.append(dst)
+        if len(order) != n_inst:
+            raise ValueError("Combinational loop in netlist: STA needs an acyclic netlist")
+
+        # Tải: điện dung pin fanout + tải PO; dây nối (BUF) chuyển tải về net input
+        load = [0.0] * len(g.net_names)
+        for name in netlist.get("outputs", []):
+            if name in g.net_ids:
+                load[g.net_ids[name]] += self.output_load
+        for inst in reversed(order):
+            fanin = g.fanins[inst]
+            if g.kinds[inst] == _KIND_WIRE:
+                load[fanin[0]] += load[g.outputs[inst]]
+            else:
+                for net, cap in zip(fanin, pin_caps[inst]):
+                    load[net] += cap
+        g.load = load
+        return g
+
+    # ------------------------------------------------------ propagation
+
+    def _propagate_python(self, g: _Graph):
+        n = len(g.net_names)
+        arr = [[_NEG_INF] * n, [_NEG_INF] * n]
+        slew = [[0.0] * n, [0.0] * n]
+        for net in g.starts:
+            arr[RISE][net] = arr[FALL][net] = self.input_arrival
+            slew[RISE][net] = slew[FALL][net] = self.input_slew
+        # Net không có driver (không phải PI/hằng) coi như PI
+        driven = set(g.driver)
+        skip = set(g.starts) | set(g.constants)
+        for net in range(n):
+            if net not in driven and net not in skip:
+                arr[RISE][net] = arr[FALL][net] = self.input_arrival
+                slew[RISE][net] = slew[FALL][net] = self.input_slew
+        arr_r, arr_f = arr
+        slew_r, slew_f = slew
+        default_slew = self.input_slew
+        load = g.load
+
+        for inst in g.order:
+            kind = g.kinds[inst]
+            fanin = g.fanins[inst]
+            out = g.outputs[inst]
+            if kind == _KIND_CELL:
+                cap = load[out]
+                best = [_NEG_INF, _NEG_INF]
+                best_slew = [0.0, 0.0]
+                for pin, arc in g.arcs[inst]:
+                    src = fanin[pin]
+                    for in_tr, out_tr in _SENSE_PAIRS.get(arc.sense, _NON_UNATE):
+                        a = arr[in_tr][src]
+                        if a == _NEG_INF:
+                            continue
+                        s = slew[in_tr][src]
+                        d, t = _arc_delay_slew(arc, out_tr, s, cap, g.cells[inst].delay, default_slew)
+                        if a + d > best[out_tr]:
+                            best[out_tr] = a + d
+                        if t > best_slew[out_tr]:
+                            best_slew[out_tr] = t
+                arr_r[out], arr_f[out] = best
+                slew_r[out], slew_f[out] = best_slew
+            elif kind == _KIND_WIRE:
+                src = fanin[0]
+                arr_r[out], arr_f[out] = arr_r[src], arr_f[src]
+                slew_r[out], slew_f[out] = slew_r[src], slew_f[src]
+            else:
+                worst = max((max(arr_r[s], arr_f[s]) for s in fanin), default=_NEG_INF)
+                if kind == _KIND_SCALAR:
+                    worst += g.cells[inst].delay
+                    out_slew = default_slew
+                else:
+                    out_slew = max((max(slew_r[s], slew_f[s]) for s in fanin), default=0.0)
+                arr_r[out] = arr_f[out] = worst
+                slew_r[out] = slew_f[out] = out_slew
+        return arr, slew
+
+    def _propagate_numpy(self, g: _Graph, np):
+        n = len(g.net_names)
+        arr = np.full((2, n), -np.inf)
+        slew = np.zeros((2, n))
+        driven = np.zeros(n, dtype=bool)
+        if g.driver:
+            driven[np.fromiter(g.driver.keys(), dtype=np.int64, count=len(g.driver))] = True
+        if g.constants:
+            driven[np.asarray(g.constants, dtype=np.int64)] = True
+        starts = ~driven
+        arr[:, starts] = self.input_arrival
+        slew[:, starts] = self.input_slew
+        load = np.asarray(g.load, dtype=float)
+        tables: Dict[int, Tuple[Any, Any, Any]] = {}
+
+        for kind, cell, arcs, insts in _level_groups(g):
+            outs = np.asarray([g.outputs[i] for i in insts], dtype=np.int64)
+            # Cùng nhóm ⇒ cùng số input: ma trận (instance × input)
+            fanin = np.asarray([g.fanins[i] for i in insts], dtype=np.int64)
+            if kind == _KIND_CELL:
+                cap = load[outs]
+                best = np.full((2, len(insts)), -np.inf)
+                best_slew = np.zeros((2, len(insts)))
+                for pin, arc in arcs:
+                    src = fanin[:, pin]
+                    for in_tr, out_tr in _SENSE_PAIRS.get(arc.sense, _NON_UNATE):
+                        s = slew[in_tr, src]
+                        d, t = _arc_delay_slew_np(np, tables, arc, out_tr, s, cap, cell.delay, self.input_slew)
+                        a = arr[in_tr, src] + d
+                        best[out_tr] = np.maximum(best[out_tr], a)
+                        # Cung từ net hằng (arrival -inf) không góp slew
+                        t = np.where(np.isneginf(arr[in_tr, src]), 0.0, t)
+                        best_slew[out_tr] = np.maximum(best_slew[out_tr], t)
+                arr[:, outs] = best
+                slew[:, outs] = best_slew
+            elif kind == _KIND_WIRE:
+                src = fanin[:, 0]
+                arr[:, outs] = arr[:, src]
+                slew[:, outs] = slew[:, src]
+            else:
+                if fanin.shape[1]:
+                    worst = arr[:, fanin].max(axis=(0, 2))
+                    in_slew = slew[:, fanin].max(axis=(0, 2))
+                else:
+                    worst = np.full(len(insts), -np.inf)
+                    in_slew = np.zeros(len(insts))
+                if kind == _KIND_SCALAR:
+                    worst = worst + cell.delay
+                    in_slew = np.full(len(insts), self.input_slew)
+                arr[:, outs] = worst
+                slew[:, outs] = in_slew
+        return [arr[RISE].tolist(), arr[FALL].tolist()], [slew[RISE].tolist(), slew[FALL].tolist()]
+
+    # ------------------------------------------------------------ paths
+
+    def _backtrace(self, g: _Graph, arr, slew, net: int, tr: int) -> List[TimingPoint]:
+        points: List[TimingPoint] = []
+        while True:
+            inst = g.driver.get(net)
+            name = g.net_names[net]
+            if inst is None:
+                points.append(TimingPoint(name, None, None, _TRANSITIONS[tr], 0.0, arr[tr][net], slew[tr][net]))
+                break
+            kind = g.kinds[inst]
+            fanin = g.fanins[inst]
+            cell = g.cells[inst]
+            prev: Optional[Tuple[int, int]] = None
+            delay = 0.0
+            if kind == _KIND_CELL:
+                target = arr[tr][net]
+                best = _NEG_INF
+                for pin, arc in g.arcs[inst]:
+                    src = fanin[pin]
+                    for in_tr, out_tr in _SENSE_PAIRS.get(arc.sense, _NON_UNATE):
+                        if out_tr != tr or arr[in_tr][src] == _NEG_INF:
+                            continue
+                        d, _t = _arc_delay_slew(arc, out_tr, slew[in_tr][src], g.load[net],
+                                                cell.delay, self.input_slew)
+                        if arr[in_tr][src] + d > best:
+                            best, prev, delay = arr[in_tr][src] + d, (src, in_tr), d
+                if prev is not None and abs(best - target) > 1e-9 * max(1.0, abs(target)):
+                    logger.debug("STA backtrace mismatch at %s: %s vs %s", name, best, target)
+            elif kind == _KIND_WIRE:
+                prev = (fanin[0], tr)
+            else:
+                candidates = [(arr[t][s], s, t) for s in fanin for t in (RISE, FALL) if arr[t][s] != _NEG_INF]
+                if candidates:
+                    a, s, t = max(candidates)
+                    prev = (s, t)
+                    delay = arr[tr][net] - a
+            points.append(TimingPoint(name, g.names[inst], cell.name if cell is not None else None,
+                                      _TRANSITIONS[tr], delay, arr[tr][net], slew[tr][net]))
+            if prev is None:
+                break
+            net, tr = prev
+        points.reverse()
+        return points
+
+    # -------------------------------------------------------------- API
+
+    def analyze(self, netlist: Dict[str, Any], max_paths: int = 5) -> STAReport:
+        """Chạy STA trên ``netlist``; trả về ``STAReport`` với ``max_paths`` đường găng nhất."""
+        start = time.perf_counter()
+        g = self._build(netlist)
+        t_build = time.perf_counter()
+
+        np = None
+        use_numpy = self.use_numpy
+        if use_numpy or (use_numpy is None and len(g.names) >= NUMPY_MIN_INSTANCES):
+            try:
+                import numpy as np  # noqa: F811
+            except ImportError:
+                if use_numpy:
+                    raise
+                np = None
+        arr, slew = self._propagate_numpy(g, np) if np is not None else self._propagate_python(g)
+        t_prop = time.perf_counter()
+
+        endpoints_arrival: Dict[str, Tuple[float, int, int]] = {}
+        for name in netlist.get("outputs", []):
+            net = g.net_ids.get(name)
+            if net is None:
+                continue
+            tr = RISE if arr[RISE][net] >= arr[FALL][net] else FALL
+            endpoints_arrival[name] = (arr[tr][net], net, tr)
+        arrivals = [a for a, _n, _t in endpoints_arrival.values() if a != _NEG_INF]
+        constrained = self.clock_period is not None
+        required = self.clock_period if constrained else max(arrivals, default=0.0)
+        endpoints = {
+            name: (a if a != _NEG_INF else 0.0, required - a if a != _NEG_INF else float("inf"))
+            for name, (a, _n, _t) in endpoints_arrival.items()
+        }
+        ranked = sorted((item for item in endpoints_arrival.items() if item[1][0] != _NEG_INF),
+                        key=lambda item: -item[1][0])
+        paths = []
+        for name, (a, net, tr) in ranked[:max(0, max_paths)]:
+            paths.append(TimingPath(name, a, required, required - a, self._backtrace(g, arr, slew, net, tr)))
+
+        kinds = g.kinds
+        stats = {
+            "instances": len(g.names),
+            "nets": len(g.net_names),
+            "nldm_instances": kinds.count(_KIND_CELL),
+            "scalar_instances": kinds.count(_KIND_SCALAR),
+            "ideal_instances": kinds.count(_KIND_IDEAL) + kinds.count(_KIND_WIRE),
+            "input_slew": self.input_slew,
+            "output_load": self.output_load,
+            "engine": "numpy" if np is not None else "python",
+            "time_build": t_build - start,
+            "time_propagate": t_prop - t_build,
+            "time": time.perf_counter() - start,
+        }
+        return STAReport(endpoints, paths, required, constrained, stats)
+
+
+def _arc_delay_slew(arc, out_tr: int, in_slew: float, load: float,
+                    scalar_delay: float, default_slew: float) -> Tuple[float, float]:
+    """(delay, slew output) của cung ``arc`` cho cạnh output ``out_tr``."""
+    if out_tr == RISE:
+        delay_table = arc.cell_rise or arc.cell_fall
+        slew_table = arc.rise_transition or arc.fall_transition
+    else:
+        delay_table = arc.cell_fall or arc.cell_rise
+        slew_table = arc.fall_transition or arc.rise_transition
+    delay = delay_table.lookup(in_slew, load) if delay_table is not None else scalar_delay
+    out_slew = slew_table.lookup(in_slew, load) if slew_table is not None else default_slew
+    return delay, out_slew
+
+
+def _table_arrays(np, cache: Dict[int, Tuple[Any, Any, Any]], table):
+    """Trục/giá trị NumPy của bảng; trục một điểm được nhân đôi để dùng chung công thức."""
+    arrays = cache.get(id(table))
+    if arrays is None:
+        xs = list(table.slew_axis)
+        ys = list(table.load_axis)
+        values = [list(row) for row in table.values]
+        if len(xs) == 1:
+            xs = [xs[0], xs[0] + 1.0]
+            values = [values[0], values[0]]
+        if len(ys) == 1:
+            ys = [ys[0], ys[0] + 1.0]
+            values = [[row[0], row[0]] for row in values]
+        arrays = (np.asarray(xs, dtype=float), np.asarray(ys, dtype=float), np.asarray(values, dtype=float))
+        cache[id(table)] = arrays
+    return arrays
+
+
+def _lookup_np(np, cache, table, x, y):
+    """``NLDMTable.lookup`` vector hóa trên mảng ``x`` (slew), ``y`` (load)."""
+    xs, ys, v = _table_arrays(np, cache, table)
+    i = np.clip(np.searchsorted(xs, x, side="right") - 1, 0, len(xs) - 2)
+    j = np.clip(np.searchsorted(ys, y, side="right") - 1, 0, len(ys) - 2)
+    tx = (x - xs[i]) / (xs[i + 1] - xs[i])
+    ty = (y - ys[j]) / (ys[j + 1] - ys[j])
+    row0 = v[i, j] + (v[i, j + 1] - v[i, j]) * ty
+    row1 = v[i + 1, j] + (v[i + 1, j + 1] - v[i + 1, j]) * ty
+    return row0 + (row1 - row0) * tx
+
+
+def _arc_delay_slew_np(np, cache, arc, out_tr: int, in_slew, load, scalar_delay: float, default_slew: float):
+    if out_tr == RISE:
+        delay_table = arc.cell_rise or arc.cell_fall
+        slew_table = arc.rise_transition or arc.fall_transition
+    else:
+        delay_table = arc.cell_fall or arc.cell_rise
+        slew_table = arc.fall_transition or arc.rise_transition
+    delay = _lookup_np(np, cache, delay_table, in_slew, load) if delay_table is not None \
+        else np.full(len(load), scalar_delay)
+    out_slew = _lookup_np(np, cache, slew_table, in_slew, load) if slew_table is not None \
+        else np.full(len(load), default_slew)
+    return delay, out_slew
+
+
+def _level_groups(g: _Graph):
+    """
+    Nhóm instance theo (level, loại, cell, số input) theo thứ tự level tăng dần:
+    mỗi nhóm chỉ phụ thuộc các level trước nên lan truyền được như một khối.
+    """
+    level = [0] * len(g.names)
+    for inst in g.order:
+        lv = 0
+        for net in g.fanins[inst]:
+            src = g.driver.get(net)
+            if src is not None and level[src] + 1 > lv:
+                lv = level[src] + 1
+        level[inst] = lv
+    groups: Dict[Tuple[int, int, str, int, int], List[int]] = {}
+    for inst in g.order:
+        cell = g.cells[inst]
+        key = (level[inst], g.kinds[inst], cell.name if cell is not None else "",
+               id(g.arcs[inst]), len(g.fanins[inst]))
+        groups.setdefault(key, []).append(inst)
+    for key in sorted(groups, key=lambda k: k[0]):
+        insts = groups[key]
+        first = insts[0]
+        yield g.kinds[first], g.cells[first], g.arcs[first], insts
+
+
+def run_sta(netlist: Dict[str, Any], library, max_paths: int = 5, **kwargs) -> STAReport:
+    """Tiện ích: ``StaticTimingAnalyzer(library, **kwargs).analyze(netlist, max_paths)``."""
+    return StaticTimingAnalyzer(library, **kwargs).analyze(netlist, max_paths)
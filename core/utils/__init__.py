@@ -18,7 +18,13 @@ from .performance import (
     benchmark,
     time_function,
     get_metrics,
-    print_performance_summary
+    print_performance_summary,
+    Tracer,
+    start_tracing,
+    stop_tracing,
+    get_tracer,
+    trace_span,
+    traced
 )
 
 __all__ = [
@@ -34,6 +40,12 @@ __all__ = [
     'benchmark',
     'time_function',
     'get_metrics',
-    'print_performance_summary'
+    'print_performance_summary',
+    'Tracer',
+    'start_tracing',
+    'stop_tracing',
+    'get_tracer',
+    'trace_span',
+    'traced'
 ]
 
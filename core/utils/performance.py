@@ -1,10 +1,29 @@
 """
 Performance benchmarking and metrics utilities.
+
+Ngoài ``PerformanceMetrics`` (thống kê phẳng theo hàm), module có tracing phân
+cấp: ``start_tracing()`` bật một ``Tracer`` toàn cục; các bước của flow (parse,
+synthesis, từng pass optimization, techmap) mở span lồng nhau qua ``trace_span``.
+Mỗi span ghi wall time, CPU time, đỉnh bộ nhớ ``tracemalloc`` (nếu bật
+``trace_memory``) và các counter (số node...). Kết quả xuất ra Chrome trace-event
+JSON (mở bằng chrome://tracing hoặc Perfetto) hoặc bảng tóm tắt dạng text.
+Khi chưa bật tracing, ``trace_span`` trả về span rỗng dùng chung (gần như không tốn).
+
+Example:
+    >>> tracer = start_tracing(trace_memory=True)
+    >>> results = run_complete_flow(parse_verilog("design.v"))
+    >>> stop_tracing()
+    >>> tracer.write_chrome_trace("trace.json")
+    >>> print(tracer.summary())
 """
 
+import json
+import os
+import threading
 import time
 import functools
-from typing import Dict, Any, Callable, Optional
+import tracemalloc
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -128,3 +147,291 @@ def print_performance_summary():
     
     print("=" * 70)
 
+
+
+# ---------------------------------------------------------------------------
+# Hierarchical tracing
+# ---------------------------------------------------------------------------
+
+class Span:
+    """Một khoảng thời gian có tên trong cây trace."""
+
+    __slots__ = ('name', 'category', 'args', 'children', 'aggregates', 'start', 'end',
+                 'cpu_start', 'cpu_time', 'mem_start', 'mem_peak', 'tid')
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.children: List['Span'] = []
+        self.aggregates: Dict[str, List[float]] = {}  # tên → [tổng giây, số lần]
+        self.start = 0.0
+        self.end = 0.0
+        self.cpu_start = 0.0
+        self.cpu_time = 0.0
+        self.mem_start = 0
+        self.mem_peak = 0  # đỉnh tracemalloc tuyệt đối trong span (0: không đo)
+        self.tid = 0
+
+    @property
+    def wall_time(self) -> float:
+        return self.end - self.start
+
+    @property
+    def mem_peak_delta(self) -> int:
+        """Đỉnh bộ nhớ trong span so với lúc bắt đầu (byte)."""
+        return max(0, self.mem_peak - self.mem_start) if self.mem_peak else 0
+
+    def set(self, **counters: Any) -> None:
+        """Gắn counter (ví dụ ``nodes_after=...``) vào span."""
+        self.args.update(counters)
+
+
+class _NullSpan:
+    """Span rỗng khi tracing tắt: ``with trace_span(...) as span: span.set(...)`` không làm gì."""
+
+    def set(self, **counters: Any) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _SpanContext:
+    def __init__(self, tracer: 'Tracer', span: Span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.tracer._enter(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.span.args.setdefault('error', exc_type.__name__)
+        self.tracer._exit(self.span)
+        return False
+
+
+class Tracer:
+    """
+    Thu thập cây span (mỗi thread một stack riêng).
+
+    Args:
+        trace_memory: Đo đỉnh bộ nhớ mỗi span bằng ``tracemalloc`` (chậm hơn 2-4 lần;
+            tracemalloc được bật nếu chưa chạy và tắt lại ở ``close()``)
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = bool(trace_memory)
+        self.roots: List[Span] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._started_tracemalloc = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def close(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, category: str = 'mylogic', **args: Any) -> _SpanContext:
+        """Context manager mở span con của span hiện tại (hoặc span gốc)."""
+        return _SpanContext(self, Span(name, category, args))
+
+    def current(self) -> Optional[Span]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def accumulate(self, name: str, seconds: float, count: int = 1) -> None:
+        """
+        Cộng dồn thời gian vào mục gộp ``name`` của span hiện tại - cho công việc
+        lặp rất nhiều lần (ví dụ convert từng node theo loại) mà mở span riêng quá tốn.
+        """
+        span = self.current()
+        if span is None:
+            return
+        entry = span.aggregates.get(name)
+        if entry is None:
+            span.aggregates[name] = [seconds, count]
+        else:
+            entry[0] += seconds
+            entry[1] += count
+
+    def _enter(self, span: Span) -> None:
+        stack = self._stack()
+        span.tid = threading.get_ident()
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Đỉnh tới giờ thuộc về span cha; reset để đo riêng span con
+            if stack:
+                stack[-1].mem_peak = max(stack[-1].mem_peak, peak)
+            tracemalloc.reset_peak()
+            span.mem_start = current
+            span.mem_peak = current
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            with self._lock:
+                self.roots.append(span)
+        stack.append(span)
+        span.cpu_start = time.process_time()
+        span.start = time.perf_counter()
+
+    def _exit(self, span: Span) -> None:
+        span.end = time.perf_counter()
+        span.cpu_time = time.process_time() - span.cpu_start
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        if self.trace_memory and tracemalloc.is_tracing():
+            _current, peak = tracemalloc.get_traced_memory()
+            span.mem_peak = max(span.mem_peak, peak)
+            if stack:
+                stack[-1].mem_peak = max(stack[-1].mem_peak, span.mem_peak)
+
+    def iter_spans(self) -> List[Tuple[int, Span]]:
+        """Tất cả span (depth, span) theo thứ tự duyệt trước."""
+        out: List[Tuple[int, Span]] = []
+        pending = [(0, root) for root in reversed(self.roots)]
+        while pending:
+            depth, span = pending.pop()
+            out.append((depth, span))
+            pending.extend((depth + 1, child) for child in reversed(span.children))
+        return out
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Chrome trace-event JSON (``ph: "X"``, thời gian micro giây). Mục gộp
+        (``accumulate``) được xếp liên tiếp từ đầu span cha, đánh dấu ``aggregate``.
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        for _depth, span in self.iter_spans():
+            args = dict(span.args)
+            args['cpu_ms'] = round(span.cpu_time * 1e3, 3)
+            if span.mem_peak:
+                args['mem_peak_delta_kb'] = round(span.mem_peak_delta / 1024, 1)
+            ts = (span.start - self._origin) * 1e6
+            events.append({'name': span.name, 'cat': span.category, 'ph': 'X', 'ts': round(ts, 3),
+                           'dur': round(span.wall_time * 1e6, 3), 'pid': pid, 'tid': span.tid,
+                           'args': args})
+            for name, (seconds, count) in span.aggregates.items():
+                events.append({'name': name, 'cat': span.category, 'ph': 'X', 'ts': round(ts, 3),
+                               'dur': round(seconds * 1e6, 3), 'pid': pid, 'tid': span.tid,
+                               'args': {'count': count, 'aggregate': True}})
+                ts += seconds * 1e6
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str) -> str:
+        """Ghi Chrome trace JSON ra ``path``; trả về ``path``."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+    def summary(self, min_fraction: float = 0.0) -> str:
+        """
+        Bảng tóm tắt dạng cây: span cùng tên ở cùng đường dẫn được gộp (số lần, tổng
+        wall / CPU, đỉnh bộ nhớ lớn nhất, counter của lần cuối). Bỏ các dòng chiếm ít
+        hơn ``min_fraction`` tổng thời gian.
+        """
+        rows: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+        def add(path, wall, cpu, mem, args, count=1):
+            row = rows.get(path)
+            if row is None:
+                row = rows[path] = {'count': 0, 'wall': 0.0, 'cpu': 0.0, 'mem': 0, 'args': {}}
+            row['count'] += count
+            row['wall'] += wall
+            row['cpu'] += cpu
+            row['mem'] = max(row['mem'], mem)
+            row['args'] = args
+
+        pending = [((root.name,), root) for root in reversed(self.roots)]
+        while pending:
+            path, span = pending.pop()
+            counters = {k: v for k, v in span.args.items() if isinstance(v, (int, float, str))}
+            add(path, span.wall_time, span.cpu_time, span.mem_peak_delta, counters)
+            for name, (seconds, count) in span.aggregates.items():
+                add(path + (name,), seconds, 0.0, 0, {}, count)
+            pending.extend((path + (child.name,), child) for child in reversed(span.children))
+
+        total = sum(row['wall'] for path, row in rows.items() if len(path) == 1) or 1e-12
+        lines = [f"{'span':<44} {'count':>6} {'wall[s]':>9} {'cpu[s]':>9} {'%':>6} {'peak[MB]':>9}  counters"]
+        for path, row in rows.items():
+            if row['wall'] / total < min_fraction:
+                continue
+            label = "  " * (len(path) - 1) + path[-1]
+            mem = f"{row['mem'] / 1e6:9.2f}" if row['mem'] else f"{'-':>9}"
+            counters = " ".join(f"{k}={v}" for k, v in row['args'].items())
+            lines.append(f"{label[:44]:<44} {row['count']:>6} {row['wall']:>9.4f} {row['cpu']:>9.4f} "
+                         f"{row['wall'] / total * 100:>6.1f} {mem}  {counters}")
+        return "\n".join(lines)
+
+
+_active_tracer: Optional[Tracer] = None
+
+
+def start_tracing(trace_memory: bool = False) -> Tracer:
+    """Bật tracing toàn cục (thay tracer đang chạy nếu có); trả về tracer mới."""
+    global _active_tracer
+    if _active_tracer is not None:
+        _active_tracer.close()
+    _active_tracer = Tracer(trace_memory=trace_memory)
+    return _active_tracer
+
+
+def stop_tracing() -> Optional[Tracer]:
+    """Tắt tracing toàn cục; trả về tracer vừa dừng (giữ nguyên dữ liệu đã thu)."""
+    global _active_tracer
+    tracer, _active_tracer = _active_tracer, None
+    if tracer is not None:
+        tracer.close()
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Tracer đang bật, hoặc None."""
+    return _active_tracer
+
+
+def trace_span(name: str, category: str = 'mylogic', **args: Any):
+    """``with trace_span("optimize.fraig", nodes_before=n) as span: ...`` (no-op khi tracing tắt)."""
+    tracer = _active_tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, category, **args)
+
+
+def traced(name: Optional[str] = None, category: str = 'mylogic') -> Callable:
+    """Decorator mở span quanh mỗi lần gọi hàm (tên mặc định: ``module.function``)."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__.split('.')[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _active_tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Combinational Equivalence Checking (CEC)
+
+Kiểm tra tương đương tổ hợp giữa hai AIG (ví dụ AIG sau synthesis và sau
+optimize trong ``run_complete_flow``):
+
+1. Dựng miter: hai AIG được chép vào cùng một AIG có structural hashing, PI
+   ghép theo tên, PO ghép theo thứ tự; mỗi cặp PO sinh một output XOR.
+   NOT node (AND(!x, 1)) được thay bằng cạnh đảo nên hai cấu trúc giống nhau
+   được gộp hoàn toàn → nhiều cặp PO được chứng minh ngay (structural).
+2. Lọc bằng mô phỏng bit-parallel: output XOR khác 0 ở một pattern nào đó →
+   counterexample.
+3. Các cặp còn lại được chứng minh bằng SAT (incremental, một solver dùng
+   chung, mã hóa Tseitin theo cone). SAT → counterexample (được mô phỏng lại
+   để loại nhanh các output khác), UNSAT → tương đương.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.synthesis.aig import AIG
+from core.synthesis.aig_traversal import dfs_postorder
+from core.verification.sat import SatSolver, mk_lit
+from core.verification.simulation import AIGSimulator
+
+# Kết quả cho từng cặp output
+STATUS_EQUAL = 'equal'
+STATUS_DIFFERENT = 'different'
+STATUS_UNDECIDED = 'undecided'
+
+# Literal trong miter: (node, inverted)
+Lit = Tuple[Any, bool]
+
+
+def _lit_value(lit: Lit) -> Optional[bool]:
+    node, inv = lit
+    value = node.get_value()
+    return None if value is None else value ^ inv
+
+
+def _and_lit(miter: AIG, a: Lit, b: Lit) -> Lit:
+    """AND trên literal: fold hằng số, x&x, x&!x; không tạo NOT node."""
+    va = _lit_value(a)
+    vb = _lit_value(b)
+    if va is False or vb is False:
+        return (miter.const0, False)
+    if va is True:
+        return b
+    if vb is True:
+        return a
+    if a[0] is b[0]:
+        return a if a[1] == b[1] else (miter.const0, False)
+    return (miter.create_and(a[0], b[0], a[1], b[1]), False)
+
+
+def _xor_lit(miter: AIG, a: Lit, b: Lit) -> Lit:
+    t1 = _and_lit(miter, a, (b[0], not b[1]))
+    t2 = _and_lit(miter, (a[0], not a[1]), b)
+    node, inv = _and_lit(miter, (t1[0], not t1[1]), (t2[0], not t2[1]))
+    return (node, not inv)
+
+
+def _copy_into(miter: AIG, aig, pi_map: Dict[str, Any]) -> List[Lit]:
+    """Chép ``aig`` vào ``miter``; trả về literal của từng PO."""
+    lits: Dict[int, Lit] = {
+        aig.const0.node_id: (miter.const0, False),
+        aig.const1.node_id: (miter.const0, True),
+    }
+    for name, pi in aig.pis.items():
+        lits[pi.node_id] = (pi_map[name], False)
+    for node in dfs_postorder(aig):
+        if not node.is_and():
+            continue
+        ln, li = lits[node.left.node_id]
+        rn, ri = lits[node.right.node_id]
+        lits[node.node_id] = _and_lit(miter, (ln, li ^ node.left_inverted),
+                                      (rn, ri ^ node.right_inverted))
+    result: List[Lit] = []
+    for po, inv in aig.pos:
+        node, linv = lits[po.node_id]
+        result.append((node, linv ^ inv))
+    return result
+
+
+def build_miter(aig1, aig2) -> Tuple[AIG, List[str]]:
+    """
+    Dựng miter của hai AIG.
+
+    PI được ghép theo tên (PI chỉ có ở một phía trở thành input tự do của miter);
+    PO thứ ``i`` của miter là ``PO1[i] XOR PO2[i]``.
+
+    Returns:
+        (miter, danh sách tên PI chỉ có ở một phía)
+
+    Raises:
+        ValueError: hai AIG có số PO khác nhau
+    """
+    if len(aig1.pos) != len(aig2.pos):
+        raise ValueError(
+            f"Output count mismatch: {len(aig1.pos)} vs {len(aig2.pos)}"
+        )
+    miter = AIG()
+    pi_map: Dict[str, Any] = {}
+    for name in list(aig1.pis) + [n for n in aig2.pis if n not in aig1.pis]:
+        pi_map[name] = miter.create_pi(name)
+    unmatched = sorted(set(aig1.pis).symmetric_difference(aig2.pis))
+
+    outs1 = _copy_into(miter, aig1, pi_map)
+    outs2 = _copy_into(miter, aig2, pi_map)
+    for a, b in zip(outs1, outs2):
+        node, inv = _xor_lit(miter, a, b)
+        miter.add_po(node, inv)
+    return miter, unmatched
+
+
+class OutputCheck:
+    """Kết quả kiểm tra một cặp output."""
+
+    def __init__(self, index: int, status: str, method: str,
+                 counterexample: Optional[Dict[str, int]] = None):
+        self.index = index
+        self.status = status
+        self.method = method  # 'structural' | 'simulation' | 'sat'
+        self.counterexample = counterexample
+
+    def __repr__(self):
+        return f"OutputCheck({self.index}, {self.status}, {self.method})"
+
+
+class CECResult:
+    """Kết quả CEC tổng hợp."""
+
+    def __init__(self, outputs: List[OutputCheck], unmatched_inputs: List[str],
+                 stats: Dict[str, Any]):
+        self.outputs = outputs
+        self.unmatched_inputs = unmatched_inputs
+        self.stats = stats
+
+    @property
+    def equivalent(self) -> Optional[bool]:
+        """True: tương đương; False: có counterexample; None: chưa quyết định được."""
+        if any(o.status == STATUS_DIFFERENT for o in self.outputs):
+            return False
+        if any(o.status == STATUS_UNDECIDED for o in self.outputs):
+            return None
+        return True
+
+    @property
+    def counterexample(self) -> Optional[Dict[str, int]]:
+        """Counterexample đầu tiên (gán PI) nếu hai AIG khác nhau."""
+        for o in self.outputs:
+            if o.counterexample is not None:
+                return o.counterexample
+        return None
+
+    @property
+    def failing_outputs(self) -> List[int]:
+        return [o.index for o in self.outputs if o.status == STATUS_DIFFERENT]
+
+
+class AIGCnfEncoder:
+    """Mã hóa Tseitin tăng dần các cone của một AIG (miter, FRAIG) vào một SatSolver."""
+
+    def __init__(self, aig, solver: SatSolver):
+        self.aig = aig
+        self.solver = solver
+        self.var: Dict[int, int] = {}
+        self.visited: set = set()
+
+    def lit(self, node, inverted: bool = False) -> int:
+        """Literal SAT của ``node`` (mã hóa cone nếu chưa có)."""
+        if node.node_id not in self.var:
+            self._encode(node)
+        return mk_lit(self.var[node.node_id], inverted)
+
+    def _encode(self, root):
+        solver = self.solver
+        var = self.var
+        for node in dfs_postorder(self.aig, [root], self.visited):
+            if node.node_id in var:
+                continue
+            v = solver.new_var()
+            var[node.node_id] = v
+            if node.is_constant():
+                solver.add_clause([mk_lit(v, not node.get_value())])
+                continue
+            if not node.is_and():
+                continue  # PI: biến tự do
+            z = mk_lit(v)
+            a = mk_lit(var[node.left.node_id], node.left_inverted)
+            b = mk_lit(var[node.right.node_id], node.right_inverted)
+            solver.add_clause([z ^ 1, a])
+            solver.add_clause([z ^ 1, b])
+            solver.add_clause([z, a ^ 1, b ^ 1])
+
+
+def _counterexample_from_sim(result, names: List[str], pattern: int) -> Dict[str, int]:
+    return {name: (word >> pattern) & 1 for name, word in zip(names, result.pi_words)}
+
+
+def check_equivalence(aig1, aig2, num_patterns: int = 2048, seed: int = 1,
+                      conflict_limit: Optional[int] = None) -> CECResult:
+    """
+    Kiểm tra tương đương tổ hợp giữa ``aig1`` và ``aig2``.
+
+    Args:
+        aig1, aig2: AIG hoặc ArrayAIG (PI ghép theo tên, PO theo thứ tự)
+        num_patterns: số pattern ngẫu nhiên cho bước lọc bằng mô phỏng
+        seed: seed mô phỏng (kết quả tái lập được)
+        conflict_limit: conflict budget cho mỗi output (None = không giới hạn)
+
+    Returns:
+        CECResult
+
+    Raises:
+        ValueError: số PO khác nhau
+    """
+    start = time.perf_counter()
+    miter, unmatched = build_miter(aig1, aig2)
+    t_miter = time.perf_counter() - start
+    names = list(miter.pis.keys())
+    outputs: List[Optional[OutputCheck]] = [None] * len(miter.pos)
+    pending: List[int] = []
+
+    # 1. Structural: output XOR đã là hằng số
+    for i, (node, inv) in enumerate(miter.pos):
+        value = node.get_value()
+        if value is None:
+            pending.append(i)
+        elif value ^ inv:
+            outputs[i] = OutputCheck(i, STATUS_DIFFERENT, 'structural', {n: 0 for n in names})
+        else:
+            outputs[i] = OutputCheck(i, STATUS_EQUAL, 'structural')
+    num_structural = len(miter.pos) - len(pending)
+
+    # 2. Random simulation
+    sim = AIGSimulator(miter)
+    if pending and num_patterns > 0:
+        result = sim.simulate_random(num_patterns, seed)
+        po_words = result.po_values
+        remaining = []
+        for i in pending:
+            word = po_words[i]
+            if word:
+                pattern = (word & -word).bit_length() - 1
+                outputs[i] = OutputCheck(i, STATUS_DIFFERENT, 'simulation',
+                                         _counterexample_from_sim(result, names, pattern))
+            else:
+                remaining.append(i)
+        pending = remaining
+    t_sim = time.perf_counter() - start - t_miter
+
+    # 3. SAT
+    solver = SatSolver()
+    encoder = AIGCnfEncoder(miter, solver)
+    num_sat_calls = 0
+    for k, i in enumerate(pending):
+        if outputs[i] is not None:
+            continue
+        node, inv = miter.pos[i]
+        num_sat_calls += 1
+        status = solver.solve([encoder.lit(node, inv)], conflict_limit=conflict_limit)
+        if status is False:
+            outputs[i] = OutputCheck(i, STATUS_EQUAL, 'sat')
+        elif status is None:
+            outputs[i] = OutputCheck(i, STATUS_UNDECIDED, 'sat')
+        else:
+            cex = {n: int(solver.model_value(encoder.var[miter.pis[n].node_id]))
+                   if miter.pis[n].node_id in encoder.var else 0 for n in names}
+            outputs[i] = OutputCheck(i, STATUS_DIFFERENT, 'sat', cex)
+            # Mô phỏng lại counterexample: loại nhanh các output chưa xử lý
+            replay = sim.simulate([cex[n] for n in names], 1).po_values
+            for j in pending[k + 1:]:
+                if outputs[j] is None and (replay[j] & 1):
+                    outputs[j] = OutputCheck(j, STATUS_DIFFERENT, 'simulation', dict(cex))
+
+    stats = {
+        'outputs': len(miter.pos),
+        'miter_and_nodes': miter.count_and_nodes(),
+        'proved_structural': num_structural,
+        'sat_calls': num_sat_calls,
+        'sat_conflicts': solver.conflicts,
+        'time_miter': t_miter,
+        'time_simulation': t_sim,
+        'time_total': time.perf_counter() - start,
+    }
+    return CECResult(outputs, unmatched, stats)
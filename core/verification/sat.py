@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+SAT Solver (CDCL, in-process)
+
+Bộ giải SAT thuần Python theo kiến trúc MiniSat, đủ dùng cho các bài toán
+nhỏ/vừa sinh ra từ AIG (CEC, FRAIG):
+
+- 2-watched literals cho unit propagation
+- conflict analysis 1-UIP + tối giản mệnh đề học (local minimization)
+- VSIDS (heap lười với ``heapq``) + phase saving
+- restart theo dãy Luby, dọn mệnh đề học khi restart
+- incremental: thêm mệnh đề giữa các lần gọi, ``solve(assumptions)``
+- conflict budget: ``solve(..., conflict_limit=N)`` trả về ``None`` khi hết budget
+
+Literal được mã hóa ``2 * var + neg`` (var bắt đầu từ 0); dùng ``mk_lit`` /
+``lit_neg`` để tạo literal.
+"""
+
+import heapq
+from typing import Iterable, List, Optional
+
+
+def mk_lit(var: int, negated: bool = False) -> int:
+    """Literal của biến ``var`` (``negated`` → literal phủ định)."""
+    return (var << 1) | (1 if negated else 0)
+
+
+def lit_neg(lit: int) -> int:
+    """Phủ định một literal."""
+    return lit ^ 1
+
+
+def _luby(i: int) -> int:
+    """Phần tử thứ ``i`` (từ 0) của dãy Luby 1,1,2,1,1,2,4,..."""
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+    return 1 << seq
+
+
+# Giá trị literal trong ``_vals``
+_TRUE = 1
+_FALSE = 0
+_UNDEF = -1
+
+
+class SatSolver:
+    """
+    CDCL SAT solver.
+
+    Usage:
+        s = SatSolver()
+        a, b = s.new_var(), s.new_var()
+        s.add_clause([mk_lit(a), mk_lit(b)])
+        s.add_clause([mk_lit(a, True)])
+        if s.solve():
+            s.model_value(b)  # True
+    """
+
+    RESTART_BASE = 100
+    VAR_DECAY = 0.95
+
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses: List[List[int]] = []
+        self.learnt: List[bool] = []      # clause index -> learnt?
+        self.num_learnts = 0
+        self.max_learnts = 2000
+        self.watches: List[List[int]] = []  # literal -> clause indices
+        self._vals: List[int] = []          # literal -> _TRUE/_FALSE/_UNDEF
+        self.level: List[int] = []
+        self.reason: List[int] = []         # var -> clause index (-1: decision/unit)
+        self.activity: List[float] = []
+        self.polarity: List[int] = []       # saved phase (literal neg bit)
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.var_inc = 1.0
+        self._heap: List = []
+        self._seen: List[int] = []
+        self.ok = True
+        self.model: Optional[List[bool]] = None
+
+        # Statistics
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.solves = 0
+
+    # ------------------------------------------------------------------
+    # Problem construction
+    # ------------------------------------------------------------------
+
+    def new_var(self) -> int:
+        """Tạo biến mới, trả về chỉ số biến."""
+        v = self.num_vars
+        self.num_vars += 1
+        self.watches.append([])
+        self.watches.append([])
+        self._vals.append(_UNDEF)
+        self._vals.append(_UNDEF)
+        self.level.append(0)
+        self.reason.append(-1)
+        self.activity.append(0.0)
+        self.polarity.append(1)  # mặc định thử giá trị False trước
+        self._seen.append(0)
+        heapq.heappush(self._heap, (0.0, v))
+        return v
+
+    def add_clause(self, lits: Iterable[int]) -> bool:
+        """
+        Thêm mệnh đề (ở decision level 0).
+
+        Returns:
+            False nếu bài toán trở nên UNSAT hiển nhiên.
+        """
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        vals = self._vals
+        clause: List[int] = []
+        seen = set()
+        for lit in lits:
+            if lit in seen:
+                continue
+            if (lit ^ 1) in seen or vals[lit] == _TRUE:
+                return True  # tautology / đã thỏa ở level 0
+            if vals[lit] == _FALSE:
+                continue
+            seen.add(lit)
+            clause.append(lit)
+        if not clause:
+            self.ok = False
+            return False
+        if len(clause) == 1:
+            self._enqueue(clause[0], -1)
+            if self._propagate() >= 0:
+                self.ok = False
+            return self.ok
+        self._attach(clause, learnt=False)
+        return True
+
+    def _attach(self, clause: List[int], learnt: bool) -> int:
+        ci = len(self.clauses)
+        self.clauses.append(clause)
+        self.learnt.append(learnt)
+        if learnt:
+            self.num_learnts += 1
+        self.watches[clause[0]].append(ci)
+        self.watches[clause[1]].append(ci)
+        return ci
+
+    # ------------------------------------------------------------------
+    # Assignment / propagation
+    # ------------------------------------------------------------------
+
+    def _decision_level(self) -> int:
+        return len(self.trail_lim)
+
+    def _enqueue(self, lit: int, reason: int):
+        self._vals[lit] = _TRUE
+        self._vals[lit ^ 1] = _FALSE
+        v = lit >> 1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _cancel_until(self, level: int):
+        if len(self.trail_lim) <= level:
+            return
+        vals = self._vals
+        polarity = self.polarity
+        activity = self.activity
+        heap = self._heap
+        stop = self.trail_lim[level]
+        trail = self.trail
+        for k in range(len(trail) - 1, stop - 1, -1):
+            lit = trail[k]
+            v = lit >> 1
+            vals[lit] = _UNDEF
+            vals[lit ^ 1] = _UNDEF
+            polarity[v] = lit & 1
+            heapq.heappush(heap, (-activity[v], v))
+        del trail[stop:]
+        del self.trail_lim[level:]
+        self.qhead = len(trail)
+
+    def _propagate(self) -> int:
+        """Unit propagation; trả về chỉ số mệnh đề xung đột hoặc -1."""
+        vals = self._vals
+        clauses = self.clauses
+        watches = self.watches
+        trail = self.trail
+        level = self.level
+        reason = self.reason
+        dl = len(self.trail_lim)
+        qhead = self.qhead
+        while qhead < len(trail):
+            false_lit = trail[qhead] ^ 1
+            qhead += 1
+            ws = watches[false_lit]
+            i = j = 0
+            n = len(ws)
+            while i < n:
+                ci = ws[i]
+                i += 1
+                c = clauses[ci]
+                if c[0] == false_lit:
+                    c[0] = c[1]
+                    c[1] = false_lit
+                first = c[0]
+                if vals[first] == _TRUE:
+                    ws[j] = ci
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    lk = c[k]
+                    if vals[lk] != _FALSE:
+                        c[1] = lk
+                        c[k] = false_lit
+                        watches[lk].append(ci)
+                        break
+                else:
+                    ws[j] = ci
+                    j += 1
+                    if vals[first] == _FALSE:
+                        while i < n:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        self.propagations += qhead - self.qhead
+                        self.qhead = len(trail)
+                        return ci
+                    # enqueue(first, ci) inline
+                    vals[first] = _TRUE
+                    vals[first ^ 1] = _FALSE
+                    level[first >> 1] = dl
+                    reason[first >> 1] = ci
+                    trail.append(first)
+            del ws[j:]
+        self.propagations += qhead - self.qhead
+        self.qhead = qhead
+        return -1
+
+    # ------------------------------------------------------------------
+    # Conflict analysis
+    # ------------------------------------------------------------------
+
+    def _bump(self, v: int):
+        act = self.activity[v] + self.var_inc
+        self.activity[v] = act
+        if act > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self._heap = [(-self.activity[u], u) for u in range(self.num_vars)
+                          if self._vals[u << 1] == _UNDEF]
+            heapq.heapify(self._heap)
+        elif self._vals[v << 1] == _UNDEF:
+            heapq.heappush(self._heap, (-act, v))
+
+    def _analyze(self, confl: int):
+        """1-UIP; trả về (learnt clause, backtrack level)."""
+        seen = self._seen
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        clauses = self.clauses
+        dl = len(self.trail_lim)
+        learnt: List[int] = [0]
+        touched: List[int] = []
+        path = 0
+        p = -1
+        idx = len(trail) - 1
+        while True:
+            c = clauses[confl]
+            for q in (c if p < 0 else c[1:]):
+                v = q >> 1
+                if not seen[v] and level[v] > 0:
+                    seen[v] = 1
+                    touched.append(v)
+                    self._bump(v)
+                    if level[v] >= dl:
+                        path += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[idx] >> 1]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            confl = reason[p >> 1]
+            seen[p >> 1] = 0
+            path -= 1
+            if path <= 0:
+                break
+        learnt[0] = p ^ 1
+
+        # Local minimization: bỏ literal có reason bị "bao" bởi các literal khác
+        if len(learnt) > 2:
+            kept = [learnt[0]]
+            for q in learnt[1:]:
+                r = reason[q >> 1]
+                if r < 0:
+                    kept.append(q)
+                    continue
+                for x in clauses[r][1:]:
+                    if not seen[x >> 1] and level[x >> 1] > 0:
+                        kept.append(q)
+                        break
+            learnt = kept
+
+        for v in touched:
+            seen[v] = 0
+
+        if len(learnt) == 1:
+            return learnt, 0
+        best = 1
+        for k in range(2, len(learnt)):
+            if level[learnt[k] >> 1] > level[learnt[best] >> 1]:
+                best = k
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, level[learnt[1] >> 1]
+
+    # ------------------------------------------------------------------
+    # Learnt clause database
+    # ------------------------------------------------------------------
+
+    def _reduce_db(self):
+        """Bỏ một nửa mệnh đề học dài nhất (chỉ gọi ở decision level 0)."""
+        learnt_idx = [ci for ci, is_l in enumerate(self.learnt) if is_l]
+        learnt_idx.sort(key=lambda ci: len(self.clauses[ci]))
+        drop = set(learnt_idx[len(learnt_idx) // 2:])
+        remap = {}
+        new_clauses: List[List[int]] = []
+        new_learnt: List[bool] = []
+        for ci, c in enumerate(self.clauses):
+            if ci in drop:
+                continue
+            remap[ci] = len(new_clauses)
+            new_clauses.append(c)
+            new_learnt.append(self.learnt[ci])
+        self.clauses = new_clauses
+        self.learnt = new_learnt
+        self.num_learnts -= len(drop)
+        # Ở level 0 reason không còn được dùng trong analyze
+        for v in range(self.num_vars):
+            r = self.reason[v]
+            if r >= 0:
+                self.reason[v] = remap.get(r, -1)
+        watches: List[List[int]] = [[] for _ in range(2 * self.num_vars)]
+        for ci, c in enumerate(new_clauses):
+            watches[c[0]].append(ci)
+            watches[c[1]].append(ci)
+        self.watches = watches
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _pick_branch_lit(self) -> int:
+        heap = self._heap
+        vals = self._vals
+        activity = self.activity
+        while heap:
+            neg_act, v = heapq.heappop(heap)
+            if vals[v << 1] != _UNDEF or -neg_act != activity[v]:
+                continue
+            return (v << 1) | self.polarity[v]
+        # Heap rỗng (các entry bị bỏ qua): quét tuyến tính
+        for v in range(self.num_vars):
+            if vals[v << 1] == _UNDEF:
+                return (v << 1) | self.polarity[v]
+        return -1
+
+    def _search(self, max_conflicts: int, budget_end: int, assumptions: List[int]) -> Optional[bool]:
+        conflicts_here = 0
+        while True:
+            confl = self._propagate()
+            if confl >= 0:
+                self.conflicts += 1
+                conflicts_here += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, bt_level = self._analyze(confl)
+                self._cancel_until(bt_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], -1)
+                else:
+                    ci = self._attach(learnt, learnt=True)
+                    self._enqueue(learnt[0], ci)
+                self.var_inc /= self.VAR_DECAY
+                continue
+
+            if conflicts_here >= max_conflicts or self.conflicts >= budget_end:
+                self._cancel_until(0)
+                return None
+
+            next_lit = -1
+            while len(self.trail_lim) < len(assumptions):
+                p = assumptions[len(self.trail_lim)]
+                value = self._vals[p]
+                if value == _TRUE:
+                    self.trail_lim.append(len(self.trail))  # dummy level
+                elif value == _FALSE:
+                    self._cancel_until(0)
+                    return False  # UNSAT dưới assumptions
+                else:
+                    next_lit = p
+                    break
+            if next_lit < 0:
+                next_lit = self._pick_branch_lit()
+                if next_lit < 0:
+                    return True
+                self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(next_lit, -1)
+
+    def solve(self, assumptions: Optional[Iterable[int]] = None,
+              conflict_limit: Optional[int] = None) -> Optional[bool]:
+        """
+        Giải bài toán hiện tại.
+
+        Args:
+            assumptions: các literal giả định đúng cho lần gọi này
+            conflict_limit: số conflict tối đa (None = không giới hạn)
+
+        Returns:
+            True (SAT, xem ``model``), False (UNSAT), None (hết conflict budget)
+        """
+        self.solves += 1
+        self.model = None
+        if not self.ok:
+            return False
+        assumptions = list(assumptions or [])
+        self._cancel_until(0)
+        if self._propagate() >= 0:
+            self.ok = False
+            return False
+        budget_end = self.conflicts + conflict_limit if conflict_limit is not None else float('inf')
+        restart = 0
+        while True:
+            if self.num_learnts > self.max_learnts:
+                self._reduce_db()
+                self.max_learnts = int(self.max_learnts * 1.1)
+            status = self._search(_luby(restart) * self.RESTART_BASE, budget_end, assumptions)
+            restart += 1
+            if status is True:
+                vals = self._vals
+                self.model = [vals[v << 1] == _TRUE for v in range(self.num_vars)]
+                self._cancel_until(0)
+                return True
+            if status is False:
+                return False
+            if self.conflicts >= budget_end:
+                return None
+
+    def model_value(self, var: int) -> bool:
+        """Giá trị của ``var`` trong model của lần ``solve`` SAT gần nhất."""
+        if self.model is None:
+            raise ValueError("No model available (last solve was not SAT)")
+        return self.model[var]
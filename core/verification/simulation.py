@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Bit-parallel AIG Simulation
+
+Mô phỏng AIG song song theo bit: mỗi node giữ một Python big-int, bit thứ ``k``
+là giá trị của node ở pattern thứ ``k``. Một lần quét (sweep) qua AIG đánh giá
+đồng thời hàng nghìn pattern, mỗi AND node chỉ tốn một phép toán big-int.
+
+Chế độ:
+- random: ``random_patterns`` (có seed → tái lập được)
+- exhaustive: ``exhaustive_patterns`` (tối đa ``MAX_EXHAUSTIVE_PIS`` PI)
+- user vectors: ``vectors_to_patterns`` (chuỗi bit theo thứ tự PI hoặc dict)
+
+AIG được "biên dịch" một lần thành chương trình phẳng (list các bộ
+``(out, a, b, op)`` theo thứ tự topo) để có thể chạy nhiều vòng mô phỏng liên
+tiếp (CEC, FRAIG, ước lượng switching activity) mà không duyệt lại đồ thị.
+
+Hoạt động với cả ``AIG`` và ``ArrayAIG``.
+"""
+
+import random
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from core.synthesis.aig_traversal import and_program
+
+# Giới hạn số PI cho chế độ exhaustive (2^20 pattern ≈ 128KB mỗi node)
+MAX_EXHAUSTIVE_PIS = 20
+
+# Số pattern mặc định cho chế độ random
+DEFAULT_NUM_PATTERNS = 2048
+
+# Mã phép toán: bit 0 = fanin trái đảo, bit 1 = fanin phải đảo
+_OP_AND = 0
+_OP_NOT_LEFT = 1
+_OP_NOT_RIGHT = 2
+_OP_NOR = 3
+
+
+def random_patterns(num_pis: int, num_patterns: int = DEFAULT_NUM_PATTERNS,
+                    seed: Optional[int] = None) -> List[int]:
+    """Một word ngẫu nhiên ``num_patterns`` bit cho mỗi PI."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(num_patterns) for _ in range(num_pis)]
+
+
+def exhaustive_patterns(num_pis: int) -> Tuple[List[int], int]:
+    """
+    Toàn bộ ``2^num_pis`` tổ hợp đầu vào.
+
+    Pattern thứ ``k`` gán PI thứ ``i`` bằng bit ``i`` của ``k`` (PI đầu tiên là
+    bit thấp nhất).
+
+    Returns:
+        (words, num_patterns)
+
+    Raises:
+        ValueError: nếu ``num_pis > MAX_EXHAUSTIVE_PIS``
+    """
+    if num_pis > MAX_EXHAUSTIVE_PIS:
+        raise ValueError(
+            f"Exhaustive simulation supports at most {MAX_EXHAUSTIVE_PIS} inputs (got {num_pis})"
+        )
+    num_patterns = 1 << num_pis
+    words: List[int] = []
+    for i in range(num_pis):
+        half = 1 << i
+        # Khối cơ sở: 'half' bit 0 rồi 'half' bit 1; nhân đôi cho tới đủ độ dài
+        word = ((1 << half) - 1) << half
+        length = half << 1
+        while length < num_patterns:
+            word |= word << length
+            length <<= 1
+        words.append(word)
+    return words, num_patterns
+
+
+def vectors_to_patterns(vectors: Sequence[Union[str, Dict[str, Any]]],
+                        pi_names: Sequence[str]) -> Tuple[List[int], int]:
+    """
+    Đóng gói vector do người dùng cung cấp thành word theo PI.
+
+    Mỗi vector là:
+    - chuỗi bit (``"0110"``), ký tự thứ ``i`` là giá trị PI thứ ``i`` trong ``pi_names``
+    - hoặc dict ``{pi_name: 0/1}`` (PI không có trong dict nhận 0)
+
+    Returns:
+        (words, num_patterns)
+
+    Raises:
+        ValueError: vector sai độ dài / ký tự không hợp lệ / tên PI không tồn tại
+    """
+    index = {name: i for i, name in enumerate(pi_names)}
+    words = [0] * len(pi_names)
+    for k, vec in enumerate(vectors):
+        bit = 1 << k
+        if isinstance(vec, dict):
+            for name, value in vec.items():
+                if name not in index:
+                    raise ValueError(f"Vector {k}: unknown input '{name}'")
+                if int(value):
+                    words[index[name]] |= bit
+            continue
+        text = str(vec).replace('_', '').strip()
+        if len(text) != len(pi_names):
+            raise ValueError(
+                f"Vector {k}: expected {len(pi_names)} bits, got {len(text)} ('{vec}')"
+            )
+        for i, ch in enumerate(text):
+            if ch == '1':
+                words[i] |= bit
+            elif ch != '0':
+                raise ValueError(f"Vector {k}: invalid bit '{ch}'")
+    return words, len(vectors)
+
+
+class SimulationResult:
+    """
+    Kết quả một lần mô phỏng.
+
+    ``values[node_id]`` là word của node (bit ``k`` = giá trị ở pattern ``k``);
+    node không được mô phỏng có word 0.
+    """
+
+    def __init__(self, aig, values: List[int], num_patterns: int,
+                 pi_words: List[int]):
+        self.aig = aig
+        self.values = values
+        self.num_patterns = num_patterns
+        self.mask = (1 << num_patterns) - 1
+        self.pi_words = pi_words
+
+    def node_value(self, node, inverted: bool = False) -> int:
+        """Word của ``node`` (node handle hoặc node_id), có thể lấy phần bù."""
+        node_id = node if isinstance(node, int) else node.node_id
+        value = self.values[node_id]
+        return value ^ self.mask if inverted else value
+
+    @property
+    def po_values(self) -> List[int]:
+        """Word của từng PO (đã tính cờ inverted)."""
+        return [self.node_value(po, inv) for po, inv in self.aig.pos]
+
+    def output_bits(self, pattern: int) -> List[int]:
+        """Giá trị các PO ở pattern thứ ``pattern``."""
+        return [(word >> pattern) & 1 for word in self.po_values]
+
+    def input_bits(self, pattern: int) -> List[int]:
+        """Giá trị các PI (thứ tự ``aig.pis``) ở pattern thứ ``pattern``."""
+        return [(word >> pattern) & 1 for word in self.pi_words]
+
+    def ones_count(self) -> List[int]:
+        """Số pattern mà mỗi PO bằng 1 (xác suất tín hiệu = ones / num_patterns)."""
+        return [bin(word).count('1') for word in self.po_values]
+
+
+class AIGSimulator:
+    """
+    Bộ mô phỏng bit-parallel cho một AIG cố định.
+
+    Usage:
+        sim = AIGSimulator(aig)
+        result = sim.simulate_random(4096, seed=1)
+        result.po_values
+
+    Args:
+        aig: AIG hoặc ArrayAIG (không được sửa trong lúc dùng simulator)
+        all_nodes: True → mô phỏng mọi AND node (cần cho signature của FRAIG);
+            False → chỉ cone của các PO
+    """
+
+    def __init__(self, aig, all_nodes: bool = False):
+        self.aig = aig
+        self.pi_names: List[str] = list(aig.pis.keys())
+        self.pi_ids: List[int] = [aig.pis[name].node_id for name in self.pi_names]
+        self.size = aig.next_node_id
+        self.program = self._compile(aig, all_nodes)
+
+    @staticmethod
+    def _compile(aig, all_nodes: bool) -> List[Tuple[int, int, int, int]]:
+        """Chương trình phẳng ``(out, a, b, op)`` theo thứ tự topo."""
+        return and_program(aig, all_nodes)
+
+    @property
+    def num_and_nodes(self) -> int:
+        """Số AND node được đánh giá mỗi lần quét."""
+        return len(self.program)
+
+    def simulate(self, pi_words: Sequence[int], num_patterns: int) -> SimulationResult:
+        """
+        Mô phỏng với word cho từng PI (thứ tự ``self.pi_names``).
+
+        Raises:
+            ValueError: số word khác số PI
+        """
+        if len(pi_words) != len(self.pi_ids):
+            raise ValueError(f"Expected {len(self.pi_ids)} input words, got {len(pi_words)}")
+        mask = (1 << num_patterns) - 1
+        values = [0] * self.size
+        values[1] = mask  # CONST1
+        pi_words = [word & mask for word in pi_words]
+        for node_id, word in zip(self.pi_ids, pi_words):
+            values[node_id] = word
+
+        for out, a, b, op in self.program:
+            if op == 0:
+                values[out] = values[a] & values[b]
+            elif op == 1:
+                values[out] = values[b] & ~values[a]
+            elif op == 2:
+                values[out] = values[a] & ~values[b]
+            else:
+                values[out] = (values[a] | values[b]) ^ mask
+        return SimulationResult(self.aig, values, num_patterns, pi_words)
+
+    def simulate_random(self, num_patterns: int = DEFAULT_NUM_PATTERNS,
+                        seed: Optional[int] = None) -> SimulationResult:
+        """Mô phỏng ``num_patterns`` pattern ngẫu nhiên."""
+        return self.simulate(random_patterns(len(self.pi_ids), num_patterns, seed), num_patterns)
+
+    def simulate_exhaustive(self) -> SimulationResult:
+        """Mô phỏng toàn bộ tổ hợp đầu vào (≤ ``MAX_EXHAUSTIVE_PIS`` PI)."""
+        words, num_patterns = exhaustive_patterns(len(self.pi_ids))
+        return self.simulate(words, num_patterns)
+
+    def simulate_vectors(self, vectors: Sequence[Union[str, Dict[str, Any]]]) -> SimulationResult:
+        """Mô phỏng các vector do người dùng cung cấp (xem ``vectors_to_patterns``)."""
+        words, num_patterns = vectors_to_patterns(vectors, self.pi_names)
+        return self.simulate(words, num_patterns)
+
+
+def simulate(aig, mode: str = 'random', num_patterns: int = DEFAULT_NUM_PATTERNS,
+             seed: Optional[int] = None,
+             vectors: Optional[Iterable[Union[str, Dict[str, Any]]]] = None) -> SimulationResult:
+    """
+    Hàm tiện ích: mô phỏng ``aig`` theo ``mode`` ('random' | 'exhaustive' | 'vectors').
+
+    Raises:
+        ValueError: mode không hợp lệ, thiếu vectors, hoặc quá nhiều PI cho exhaustive
+    """
+    sim = AIGSimulator(aig)
+    if mode == 'random':
+        return sim.simulate_random(num_patterns, seed)
+    if mode == 'exhaustive':
+        return sim.simulate_exhaustive()
+    if mode == 'vectors':
+        if vectors is None:
+            raise ValueError("Mode 'vectors' requires a list of vectors")
+        return sim.simulate_vectors(list(vectors))
+    raise ValueError(f"Unknown simulation mode: {mode}")
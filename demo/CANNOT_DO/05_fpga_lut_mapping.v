@@ -1,25 +0,0 @@
-// ============================================================
-// CANNOT_DO Example 5: FPGA LUT Mapping
-// ============================================================
-// Đây là những gì MyLogic CHƯA làm được:
-// - FPGA LUT mapping (K-input LUTs)
-// - FPGA vendor-specific optimization
-// - LUT packing và optimization
-//
-// Status: ❌ NOT SUPPORTED
-// Current: Chỉ có basic ASIC technology mapping
-// Missing: FPGA LUT mapping algorithms
-// ============================================================
-
-module fpga_lut_mapping(
-    input a, b, c, d,
-    output out
-);
-
-    // Complex logic - CHƯA thể map vào FPGA LUTs
-    // MyLogic không thể map logic vào K-input LUT structures
-    // (ví dụ: 4-input LUT, 6-input LUT)
-    assign out = (a & b & c) | (b & c & d) | (a & d);
-
-endmodule
-
@@ -8,7 +8,7 @@
 // - Map logic sang library cells (AND2, OR2, NAND2, etc.)
 //
 // Status: ✅ SUPPORTED (Basic Implementation)
-// Note: Advanced mapping (cut enumeration, FPGA LUT) CHƯA có
+// Note: techmap --cut dùng cut enumeration; FPGA LUT xem Example 9 (lutmap)
 // ============================================================
 
 module technology_mapping(
@@ -0,0 +1,25 @@
+// ============================================================
+// CAN_DO Example 9: FPGA LUT Mapping
+// ============================================================
+// Đây là những gì MyLogic đã làm được:
+// - FPGA K-input LUT mapping (priority cuts, K cấu hình được)
+// - Pass depth-optimal, sau đó area-flow và exact-area recovery
+// - Xuất netlist với primitive LUT của vendor và INIT
+//   (xilinx LUT1..6, gowin, anlogic, ice40 SB_LUT4, lattice LUT4, intel)
+//
+// Status: ✅ SUPPORTED
+// Usage: read 09_fpga_lut_mapping.v; synthesis; lutmap -K 4 --family ice40 --verilog
+// ============================================================
+
+module fpga_lut_mapping(
+    input a,
+    input b,
+    input c,
+    input d,
+    output out
+);
+
+    // Hàm 4 input → một LUT4 (hoặc LUT6 với K=6)
+    assign out = (a & b & c) | (b & c & d) | (a & d);
+
+endmodule
@@ -4,6 +4,7 @@ Frontends Module - Verilog và các frontend parsers khác
 Module này chứa các parsers cho different input formats:
 - verilog: Verilog parser (refactored, modular)
 - pyverilog: Backward compatibility wrapper
+- blif / bench: BLIF và ISCAS .bench (benchmark MCNC/IWLS/ISCAS), qua gate_network
 
 Recommended import:
     from frontends.verilog import parse_verilog
@@ -14,6 +15,21 @@ Legacy import (deprecated):
 
 # Import chính từ verilog module
 from .verilog import parse_verilog
+from .bench import bench_to_aig, parse_bench
+from .blif import blif_to_aig, parse_blif
 
-__all__ = ['parse_verilog']
+__all__ = ['parse_verilog', 'parse_blif', 'blif_to_aig', 'parse_bench', 'bench_to_aig', 'load_aig', 'AIG_FORMATS']
+
+AIG_FORMATS = (".aig", ".aag", ".blif", ".bench")
+
+
+def load_aig(path, aig_class=None):
+    """Đọc AIG theo phần mở rộng (.blif, .bench, còn lại: AIGER) → ``AigerModel``."""
+    ext = str(path).lower().rsplit(".", 1)[-1]
+    if ext == "blif":
+        return blif_to_aig(path, aig_class=aig_class)
+    if ext == "bench":
+        return bench_to_aig(path, aig_class=aig_class)
+    from core.synthesis.aiger import read_aiger
+    return read_aiger(path, aig_class=aig_class)
 
@@ -0,0 +1,106 @@
+"""
+ISCAS ``.bench`` reader (ISCAS'85/'89, ITC'99 và ``write_bench`` của ABC).
+
+Cú pháp::
+
+    # comment
+    INPUT(G1)
+    OUTPUT(G22)
+    G10 = NAND(G1, G3)
+    G5  = DFF(G10)                 # ISCAS'89: flip-flop (init 0)
+    G7  = LUT 0x8 (G1, G2)         # ABC: LUT, bit i của truth table = giá trị khi input k là bit k của i
+
+Gate: AND, NAND, OR, NOR, XOR, XNOR, NOT, BUF/BUFF, DFF, LUT, vdd/gnd (hằng).
+Tên gate không phân biệt hoa thường.
+
+Example:
+    >>> netlist = parse_bench("c432.bench")
+    >>> model = bench_to_aig("s27.bench")     # DFF → PI + PO ``<q>_next``
+"""
+
+import os
+from typing import Dict, Optional
+
+from .gate_network import LUT, SIMPLE_GATES, GateNetwork, Latch
+
+_ALIASES = {"BUFF": "BUF", "INV": "NOT"}
+_CONSTANTS = {"VDD": "CONST1", "GND": "CONST0", "CONST1": "CONST1", "CONST0": "CONST0"}
+
+
+def read_bench_network(path: str, text: Optional[str] = None) -> GateNetwork:
+    """Đọc file ``.bench`` → ``GateNetwork``; ``text`` (nếu có) thay cho nội dung file."""
+    if text is None:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    network = GateNetwork(os.path.splitext(os.path.basename(path))[0] or "bench", "bench")
+    add_gate = network.add_gate
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        hash_pos = raw.find("#")
+        line = (raw[:hash_pos] if hash_pos >= 0 else raw).strip()
+        if not line:
+            continue
+        lhs, eq, rhs = line.partition("=")
+        if not eq:
+            keyword, _, arg = line.partition("(")
+            keyword = keyword.strip().upper()
+            name = arg.rstrip().rstrip(")").strip()
+            if keyword == "INPUT" and name:
+                network.inputs.append(name)
+            elif keyword == "OUTPUT" and name:
+                network.outputs.append(name)
+            else:
+                raise ValueError(f"{path}:{lineno}: cannot parse {line!r}")
+            continue
+
+        output = lhs.strip()
+        rhs = rhs.strip()
+        open_pos = rhs.find("(")
+        if open_pos < 0:
+            # "x = vdd" / "x = gnd"
+            kind = _CONSTANTS.get(rhs.upper())
+            if not output or kind is None:
+                raise ValueError(f"{path}:{lineno}: cannot parse {line!r}")
+            add_gate(output, kind)
+            continue
+        if not rhs.endswith(")"):
+            raise ValueError(f"{path}:{lineno}: missing ')' in {line!r}")
+        head = rhs[:open_pos].split()
+        args = [a.strip() for a in rhs[open_pos + 1:-1].split(",")]
+        args = [a for a in args if a]
+        if not output or not head:
+            raise ValueError(f"{path}:{lineno}: cannot parse {line!r}")
+        kind = head[0].upper()
+        kind = _ALIASES.get(kind, kind)
+        if kind in SIMPLE_GATES:
+            if not args or (kind in ("NOT", "BUF") and len(args) != 1):
+                raise ValueError(f"{path}:{lineno}: {kind} with {len(args)} inputs")
+            add_gate(output, kind, args)
+        elif kind == "DFF":
+            if len(args) != 1:
+                raise ValueError(f"{path}:{lineno}: DFF takes one input")
+            network.latches.append(Latch(args[0], output, 0))
+        elif kind == "LUT":
+            if len(head) != 2:
+                raise ValueError(f"{path}:{lineno}: LUT needs a hex truth table")
+            try:
+                truth = int(head[1], 16)
+            except ValueError:
+                raise ValueError(f"{path}:{lineno}: bad LUT truth table {head[1]!r}") from None
+            if truth >> (1 << len(args)):
+                raise ValueError(f"{path}:{lineno}: LUT truth table wider than {len(args)} inputs")
+            add_gate(output, LUT, args, truth)
+        elif kind in _CONSTANTS and not args:
+            add_gate(output, _CONSTANTS[kind])
+        else:
+            raise ValueError(f"{path}:{lineno}: unsupported gate {head[0]!r}")
+    return network
+
+
+def parse_bench(path: str) -> Dict:
+    """Đọc ``.bench`` → netlist dictionary (cùng schema với ``parse_verilog``)."""
+    return read_bench_network(path).to_netlist(path)
+
+
+def bench_to_aig(path: str, aig_class: Optional[type] = None):
+    """Đọc ``.bench`` → ``AigerModel`` (AIG dựng trực tiếp, DFF = PI + PO ``<q>_next``)."""
+    return read_bench_network(path).to_aig(aig_class)
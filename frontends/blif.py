@@ -0,0 +1,245 @@
+"""
+BLIF reader (Berkeley Logic Interchange Format — định dạng của SIS/ABC, MCNC/IWLS benchmarks).
+
+Hỗ trợ:
+    - ``.model`` / ``.inputs`` / ``.outputs`` / ``.end``, dòng nối ``\\``, comment ``#``;
+    - ``.names``: cover SOP (onset ``... 1`` hoặc offset ``... 0``);
+    - ``.latch input output [type control] [init]`` (init 2/3 → không xác định);
+    - ``.subckt`` / ``.gate`` tới model định nghĩa trong cùng file: flatten, tín hiệu
+      nội bộ của instance được đặt tên ``<model>_<k>/<signal>``;
+    - ``.exdc`` (bỏ qua tới ``.end``) và các directive khác (``.default_input_arrival``,
+      ``.area``, ``.clock``, ...): bỏ qua.
+
+``.gate`` tới cell thư viện (không có ``.model`` trong file, cần genlib) và
+``.blackbox`` được instance đều báo lỗi.
+
+Example:
+    >>> netlist = parse_blif("c17.blif")          # netlist dict như parse_verilog
+    >>> model = blif_to_aig("c17.blif")           # AigerModel (AIG + tên PO + latch)
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from .gate_network import SOP, GateNetwork, Latch
+
+_LATCH_TYPES = ("fe", "re", "ah", "al", "as")
+
+
+class _Model:
+    __slots__ = ("name", "inputs", "outputs", "names", "latches", "instances", "blackbox")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.inputs: List[str] = []
+        self.outputs: List[str] = []
+        self.names: List[Tuple[Tuple[str, ...], str, List[str], bool]] = []  # (inputs, output, cubes, onset)
+        self.latches: List[Latch] = []
+        self.instances: List[Tuple[str, List[Tuple[str, str]], int]] = []  # (model, [(formal, actual)], line)
+        self.blackbox = False
+
+
+def _logical_lines(text: str):
+    """(số dòng, token) sau khi bỏ comment và ghép dòng nối ``\\``."""
+    pending: List[str] = []
+    start = 0
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        hash_pos = raw.find("#")
+        if hash_pos >= 0:
+            raw = raw[:hash_pos]
+        line = raw.rstrip()
+        if line.endswith("\\"):
+            if not pending:
+                start = lineno
+            pending.append(line[:-1])
+            continue
+        if pending:
+            pending.append(line)
+            line = " ".join(pending)
+            pending = []
+        else:
+            start = lineno
+        tokens = line.split()
+        if tokens:
+            yield start, tokens
+    if pending:
+        tokens = " ".join(pending).split()
+        if tokens:
+            yield start, tokens
+
+
+def _parse_models(text: str, source: str) -> List[_Model]:
+    models: List[_Model] = []
+    model: Optional[_Model] = None
+    cover: Optional[List[str]] = None  # cube của .names đang đọc
+    cover_onset: List[Optional[bool]] = [None]
+    skip_exdc = False
+
+    def error(lineno: int, message: str) -> ValueError:
+        return ValueError(f"{source}:{lineno}: {message}")
+
+    def close_cover() -> None:
+        nonlocal cover
+        if cover is not None and model is not None and model.names:
+            inputs, output, _cubes, _onset = model.names[-1]
+            model.names[-1] = (inputs, output, cover, cover_onset[0] is not False)
+        cover = None
+
+    for lineno, tokens in _logical_lines(text):
+        head = tokens[0]
+        if not head.startswith("."):
+            if skip_exdc:
+                continue
+            if cover is None:
+                raise error(lineno, f"unexpected line {' '.join(tokens)!r} outside a .names cover")
+            n_inputs = len(model.names[-1][0])
+            if n_inputs == 0 and len(tokens) == 1:
+                cube, value = "", tokens[0]
+            elif len(tokens) == 2 and len(tokens[0]) == n_inputs:
+                cube, value = tokens
+            else:
+                raise error(lineno, f"malformed cover line {' '.join(tokens)!r} for {n_inputs} inputs")
+            if value not in ("0", "1") or cube.strip("01-"):
+                raise error(lineno, f"malformed cover line {' '.join(tokens)!r}")
+            onset = value == "1"
+            if cover_onset[0] is None:
+                cover_onset[0] = onset
+            elif cover_onset[0] != onset:
+                raise error(lineno, "a .names cover mixes onset and offset rows")
+            cover.append(cube)
+            continue
+
+        close_cover()
+        if head == ".end":
+            model = None
+            skip_exdc = False
+            continue
+        if skip_exdc:
+            continue
+        if head == ".model":
+            model = _Model(tokens[1] if len(tokens) > 1 else f"model{len(models)}")
+            models.append(model)
+            continue
+        if model is None:
+            if head in (".search",):
+                continue
+            # File không có .model: model ngầm định
+            model = _Model(f"model{len(models)}")
+            models.append(model)
+        if head == ".inputs":
+            model.inputs.extend(tokens[1:])
+        elif head == ".outputs":
+            model.outputs.extend(tokens[1:])
+        elif head == ".names":
+            if len(tokens) < 2:
+                raise error(lineno, ".names needs an output signal")
+            model.names.append((tuple(tokens[1:-1]), tokens[-1], [], True))
+            cover = []
+            cover_onset[0] = None
+        elif head == ".latch":
+            args = tokens[1:]
+            if len(args) < 2:
+                raise error(lineno, ".latch needs an input and an output")
+            init: Optional[int] = 3
+            latch_type = control = None
+            rest = args[2:]
+            if rest and rest[-1] in ("0", "1", "2", "3"):
+                init = int(rest.pop())
+            if len(rest) == 2 and rest[0] in _LATCH_TYPES:
+                latch_type, control = rest
+                if control == "NIL":
+                    control = None
+            elif rest:
+                raise error(lineno, f"malformed .latch {' '.join(tokens)!r}")
+            model.latches.append(Latch(args[0], args[1], init if init in (0, 1) else None, control, latch_type))
+        elif head in (".subckt", ".gate"):
+            if len(tokens) < 2:
+                raise error(lineno, f"{head} needs a model name")
+            bindings = []
+            for item in tokens[2:]:
+                formal, sep, actual = item.partition("=")
+                if not sep or not formal or not actual:
+                    raise error(lineno, f"malformed binding {item!r}")
+                bindings.append((formal, actual))
+            model.instances.append((tokens[1], bindings, lineno))
+        elif head == ".blackbox":
+            model.blackbox = True
+        elif head == ".exdc":
+            skip_exdc = True
+        # Các directive khác (timing, .clock, .area, ...) không ảnh hưởng chức năng
+    close_cover()
+    return models
+
+
+def read_blif_network(path: str, top: Optional[str] = None, text: Optional[str] = None) -> GateNetwork:
+    """
+    Đọc file BLIF → ``GateNetwork`` đã flatten.
+
+    Args:
+        path: đường dẫn file (dùng cho thông báo lỗi nếu ``text`` được truyền)
+        top: tên model top (mặc định: model đầu tiên)
+        text: nội dung BLIF (bỏ qua việc đọc file)
+    """
+    if text is None:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    models = _parse_models(text, path)
+    if not models:
+        raise ValueError(f"{path}: no .model found")
+    by_name: Dict[str, _Model] = {m.name: m for m in models}
+    top_model = by_name.get(top) if top else models[0]
+    if top_model is None:
+        raise ValueError(f"{path}: model {top!r} not found")
+
+    network = GateNetwork(top_model.name, "blif")
+    network.inputs = list(top_model.inputs)
+    network.outputs = list(top_model.outputs)
+    counters: Dict[str, int] = {}
+
+    # Flatten bằng stack tường minh: (model, prefix, ánh xạ port → tín hiệu cha, chuỗi model đang mở)
+    stack: List[Tuple[_Model, str, Dict[str, str], Tuple[str, ...]]] = [(top_model, "", {}, (top_model.name,))]
+    while stack:
+        model, prefix, ports, path_models = stack.pop()
+
+        def rename(signal: str) -> str:
+            mapped = ports.get(signal)
+            if mapped is not None:
+                return mapped
+            return prefix + signal if prefix else signal
+
+        for inputs, output, cubes, onset in model.names:
+            network.add_gate(rename(output), SOP, [rename(s) for s in inputs], (cubes, onset))
+        for latch in model.latches:
+            network.latches.append(latch._replace(
+                data_input=rename(latch.data_input),
+                output=rename(latch.output),
+                control=rename(latch.control) if latch.control else None,
+            ))
+        for sub_name, bindings, lineno in model.instances:
+            sub = by_name.get(sub_name)
+            if sub is None:
+                raise ValueError(f"{path}:{lineno}: unknown model {sub_name!r} "
+                                 "(library .gate cells need a genlib library and are not supported)")
+            if sub.blackbox:
+                raise ValueError(f"{path}:{lineno}: cannot flatten black box {sub_name!r}")
+            if sub_name in path_models:
+                raise ValueError(f"{path}:{lineno}: recursive instantiation of model {sub_name!r}")
+            ports_of = set(sub.inputs) | set(sub.outputs)
+            sub_ports = {}
+            for formal, actual in bindings:
+                if formal not in ports_of:
+                    raise ValueError(f"{path}:{lineno}: model {sub_name!r} has no port {formal!r}")
+                sub_ports[formal] = rename(actual)
+            k = counters.get(sub_name, 0)
+            counters[sub_name] = k + 1
+            stack.append((sub, f"{prefix}{sub_name}_{k}/", sub_ports, path_models + (sub_name,)))
+    return network
+
+
+def parse_blif(path: str, top: Optional[str] = None) -> Dict:
+    """Đọc BLIF → netlist dictionary (cùng schema với ``parse_verilog``)."""
+    return read_blif_network(path, top).to_netlist(path)
+
+
+def blif_to_aig(path: str, top: Optional[str] = None, aig_class: Optional[type] = None):
+    """Đọc BLIF → ``AigerModel`` (AIG dựng trực tiếp, latch = PI + PO ``<latch>_next``)."""
+    return read_blif_network(path, top).to_aig(aig_class)
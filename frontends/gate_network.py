@@ -0,0 +1,295 @@
+"""
+Gate network — biểu diễn trung gian chung của các reader netlist cấu trúc (BLIF, ISCAS .bench).
+
+Reader chỉ tách cú pháp thành ``GateNetwork`` (PI, PO, gate một output, latch);
+từ đó dựng:
+
+- ``to_netlist()``: netlist dictionary như ``parse_verilog`` (node AND/OR/NOT/
+  BUF/XOR/... với ``fanins`` ``[[signal, inverted], ...]``, latch → node ``DFF``),
+  dùng cho ``synthesis`` và các lệnh netlist của shell;
+- ``to_aig()``: AIG trực tiếp (không qua ``NetlistToAIGConverter``), latch được
+  mô hình hóa như AIGER: PI cho giá trị hiện tại + PO cho next-state (``AigerModel``).
+
+Gate được lưu theo thứ tự khai báo; cả hai builder tự sắp xếp topo (BLIF không
+bắt buộc khai báo trước khi dùng) và báo lỗi vòng tổ hợp.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Loại gate (cột ``kind`` của ``Gate``)
+SIMPLE_GATES = ("AND", "OR", "NAND", "NOR", "XOR", "XNOR", "NOT", "BUF")
+CONST_GATES = ("CONST0", "CONST1")
+SOP = "SOP"  # data = (cubes, onset): cube là chuỗi '0'/'1'/'-' theo thứ tự input
+LUT = "LUT"  # data = truth table (int, bit i = giá trị khi input k là bit k của i)
+
+
+class Gate(NamedTuple):
+    output: str
+    kind: str
+    inputs: Tuple[str, ...]
+    data: Any = None
+
+
+class Latch(NamedTuple):
+    data_input: str
+    output: str
+    init: Optional[int] = 0  # 0, 1 hoặc None (không xác định / don't care)
+    control: Optional[str] = None
+    latch_type: Optional[str] = None
+
+
+class GateNetwork:
+    """Mạng gate một output + latch, tên tín hiệu là chuỗi."""
+
+    def __init__(self, name: str = "top", source_format: str = ""):
+        self.name = name
+        self.source_format = source_format
+        self.inputs: List[str] = []
+        self.outputs: List[str] = []
+        self.gates: List[Gate] = []
+        self.latches: List[Latch] = []
+
+    def add_gate(self, output: str, kind: str, inputs: Sequence[str] = (), data: Any = None) -> None:
+        self.gates.append(Gate(output, kind, tuple(inputs), data))
+
+    def _drivers(self) -> Dict[str, Gate]:
+        drivers: Dict[str, Gate] = {}
+        sources = set(self.inputs)
+        sources.update(latch.output for latch in self.latches)
+        for gate in self.gates:
+            if gate.output in drivers or gate.output in sources:
+                raise ValueError(f"{self.source_format or 'netlist'}: signal {gate.output!r} has multiple drivers")
+            drivers[gate.output] = gate
+        return drivers
+
+    def topological_gates(self) -> List[Gate]:
+        """Gate theo thứ tự topo (fanin trước); lỗi nếu có vòng tổ hợp."""
+        drivers = self._drivers()
+        # Đường nhanh: file thường đã khai báo theo thứ tự topo (writer của ABC / ISCAS)
+        defined = set(self.inputs)
+        defined.update(latch.output for latch in self.latches)
+        in_order = True
+        for gate in self.gates:
+            for signal in gate.inputs:
+                if signal not in defined and signal in drivers:
+                    in_order = False
+                    break
+            if not in_order:
+                break
+            defined.add(gate.output)
+        if in_order:
+            return list(self.gates)
+
+        order: List[Gate] = []
+        state: Dict[str, int] = {}  # 1 = đang duyệt, 2 = xong
+        for gate in self.gates:
+            if gate.output in state:
+                continue
+            state[gate.output] = 1
+            stack = [(gate, 0)]
+            while stack:
+                current, index = stack[-1]
+                if index < len(current.inputs):
+                    stack[-1] = (current, index + 1)
+                    child = drivers.get(current.inputs[index])
+                    if child is None:
+                        continue
+                    mark = state.get(child.output)
+                    if mark == 1:
+                        raise ValueError(f"Combinational loop through signal {child.output!r}")
+                    if mark is None:
+                        state[child.output] = 1
+                        stack.append((child, 0))
+                    continue
+                stack.pop()
+                state[current.output] = 2
+                order.append(current)
+        return order
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "inputs": len(self.inputs),
+            "outputs": len(self.outputs),
+            "gates": len(self.gates),
+            "latches": len(self.latches),
+        }
+
+    # ------------------------------------------------------------ netlist dict
+
+    def to_netlist(self, source_file: str = "") -> Dict[str, Any]:
+        """Netlist dictionary (cùng schema với ``parse_verilog``)."""
+        nodes: List[Dict[str, Any]] = []
+        wires: List[Dict[str, Any]] = []
+        output_mapping: Dict[str, str] = {}
+        counter = [0]
+
+        def add(kind: str, fanins: List[List[Any]], output: str, **extra) -> str:
+            node_id = f"{kind.lower()}_{counter[0]}"
+            counter[0] += 1
+            node = {"id": node_id, "type": kind, "fanins": fanins, "output": output}
+            node.update(extra)
+            nodes.append(node)
+            for sig, _inv in fanins:
+                wires.append({"id": f"wire_{len(wires)}", "source": sig, "destination": node_id,
+                              "type": "connection"})
+            output_mapping[output] = node_id
+            return node_id
+
+        def temp() -> str:
+            return f"_{self.source_format or 'net'}_{counter[0]}"
+
+        for gate in self.topological_gates():
+            kind, out = gate.kind, gate.output
+            if kind in CONST_GATES:
+                add(kind, [], out)
+            elif kind in SIMPLE_GATES:
+                if kind in ("NOT", "BUF") or len(gate.inputs) >= 2:
+                    add(kind, [[s, False] for s in gate.inputs], out)
+                else:
+                    # Gate 1 input (AND(a), NOR(a), ...): BUF/NOT
+                    inverted = kind in ("NAND", "NOR", "XNOR")
+                    add("BUF", [[gate.inputs[0], inverted]], out)
+            else:
+                cubes, onset = _cover_of(gate)
+                self._add_cover(add, temp, out, gate.inputs, cubes, onset)
+
+        for latch in self.latches:
+            fanins = [[latch.data_input, False]]
+            if latch.control:
+                fanins.append([latch.control, False])
+            add("DFF", fanins, latch.output,
+                attrs={"init": latch.init, "latch_type": latch.latch_type, "data_input": latch.data_input})
+
+        attrs = {
+            "source_file": source_file,
+            "source_format": self.source_format,
+            "vector_widths": {},
+            "output_mapping": output_mapping,
+        }
+        return {
+            "name": self.name,
+            "inputs": list(self.inputs),
+            "outputs": list(self.outputs),
+            "wires": wires,
+            "nodes": nodes,
+            "attrs": attrs,
+        }
+
+    @staticmethod
+    def _add_cover(add, temp, out: str, inputs: Sequence[str], cubes: List[str], onset: bool) -> None:
+        """SOP → node AND (literal đảo qua ``fanins``) + OR; offset cover (``onset`` False) → NAND/NOR."""
+        if not cubes:
+            add("CONST0" if onset else "CONST1", [], out)
+            return
+        terms: List[List[Any]] = []
+        for cube in cubes:
+            lits = [[inputs[k], ch == "0"] for k, ch in enumerate(cube) if ch != "-"]
+            if not lits:
+                # Cube toàn '-': hàm hằng
+                add("CONST1" if onset else "CONST0", [], out)
+                return
+            terms.append(lits)
+        if len(terms) == 1:
+            lits = terms[0]
+            if len(lits) == 1:
+                add("BUF", [[lits[0][0], lits[0][1] != (not onset)]], out)
+            else:
+                add("AND" if onset else "NAND", lits, out)
+            return
+        fanins: List[List[Any]] = []
+        for lits in terms:
+            if len(lits) == 1:
+                fanins.append(lits[0])
+            else:
+                signal = temp()
+                add("AND", lits, signal)
+                fanins.append([signal, False])
+        add("OR" if onset else "NOR", fanins, out)
+
+    # ------------------------------------------------------------------ AIG
+
+    def to_aig(self, aig_class: Optional[type] = None):
+        """
+        Dựng AIG trực tiếp → ``AigerModel`` (``core/synthesis/aiger.py``): PI = input
+        + giá trị hiện tại của latch, PO = output + next-state của latch.
+        """
+        from core.synthesis.aig import AIG
+        from core.synthesis.aiger import AigerHeader, AigerLatch, AigerModel, aiger_literals
+
+        aig = (aig_class or AIG)()
+        signals: Dict[str, Any] = {}
+        for name in self.inputs:
+            signals[name] = aig.create_pi(name)
+        for latch in self.latches:
+            signals[latch.output] = aig.create_pi(latch.output)
+
+        def source(name: str):
+            node = signals.get(name)
+            if node is None:
+                raise ValueError(f"{self.source_format or 'netlist'}: signal {name!r} is never driven")
+            return node
+
+        create_and, create_or, create_xor, create_not = aig.create_and, aig.create_or, aig.create_xor, aig.create_not
+        for gate in self.topological_gates():
+            kind = gate.kind
+            fanins = [source(s) for s in gate.inputs]
+            if kind in CONST_GATES:
+                signals[gate.output] = aig.create_constant(kind == "CONST1")
+                continue
+            if kind in SIMPLE_GATES:
+                if not fanins:
+                    raise ValueError(f"Gate {gate.output!r} ({kind}) has no inputs")
+                node = fanins[0]
+                combine = create_or if kind in ("OR", "NOR") else create_xor if kind in ("XOR", "XNOR") else create_and
+                for fanin in fanins[1:]:
+                    node = combine(node, fanin)
+                if kind in ("NAND", "NOR", "XNOR", "NOT"):
+                    node = create_not(node)
+            else:
+                cubes, onset = _cover_of(gate)
+                node = _cover_to_aig(aig, fanins, cubes, onset)
+            signals[gate.output] = node
+
+        output_names = list(self.outputs)
+        for name in self.outputs:
+            aig.add_po(source(name))
+        latches = []
+        for latch in self.latches:
+            aig.add_po(source(latch.data_input))
+            latches.append(AigerLatch(latch.output, len(aig.pos) - 1, latch.init))
+            output_names.append(f"{latch.output}_next")
+        # Header như khi ghi AIGER: NOT / AND có fanin hằng không được đếm
+        _lit_of, ands = aiger_literals(aig, list(aig.pis.values()))
+        header = AigerHeader(len(aig.pis) + len(ands), len(self.inputs), len(self.latches),
+                             len(self.outputs), len(ands))
+        return AigerModel(aig, output_names, latches, [], header)
+
+
+def _cover_of(gate: Gate) -> Tuple[List[str], bool]:
+    """(cubes, onset) của gate SOP hoặc LUT (LUT → minterm cover của onset)."""
+    if gate.kind == SOP:
+        return gate.data
+    if gate.kind == LUT:
+        n = len(gate.inputs)
+        truth = gate.data
+        cubes = ["".join("1" if (row >> k) & 1 else "0" for k in range(n))
+                 for row in range(1 << n) if (truth >> row) & 1]
+        return cubes, True
+    raise ValueError(f"Unsupported gate kind {gate.kind!r}")
+
+
+def _cover_to_aig(aig, fanins, cubes: List[str], onset: bool):
+    result = None
+    for cube in cubes:
+        term = None
+        for k, ch in enumerate(cube):
+            if ch == "-":
+                continue
+            lit = fanins[k] if ch == "1" else aig.create_not(fanins[k])
+            term = lit if term is None else aig.create_and(term, lit)
+        if term is None:
+            term = aig.const1
+        result = term if result is None else aig.create_or(result, term)
+    if result is None:
+        result = aig.const0
+    return result if onset else aig.create_not(result)
@@ -10,6 +10,7 @@ Cấu trúc:
   - tokenizer.py: Tokenization và code cleaning
   - node_builder.py: Node creation và wire generation
   - parser.py: Main parsing logic
+  - hierarchy.py: Module library và elaboration phân cấp
   - expression_parser.py: Complex expression handling
 - operations/: Operation parsers (modular)
   - arithmetic.py, bitwise.py, logical.py, comparison.py, shift.py, special.py
@@ -23,8 +24,8 @@ Author: MyLogic Team
 Version: 2.0.0
 """
 
-from .core import parse_verilog
+from .core import parse_verilog, parse_verilog_hierarchy, ModuleLibrary
 from .ast import parse_verilog_ast
 
-__all__ = ['parse_verilog', 'parse_verilog_ast']
+__all__ = ['parse_verilog', 'parse_verilog_hierarchy', 'ModuleLibrary', 'parse_verilog_ast']
 
@@ -6,6 +6,7 @@ Module này chứa core implementation của Verilog parser:
 - tokenizer: Code cleaning và tokenization
 - node_builder: Node creation và wire generation
 - parser: Main parsing logic
+- hierarchy: Module library, elaboration theo (module, tham số)
 - expression_parser: Complex expression handling
 
 Usage:
@@ -18,6 +19,7 @@ Version: 2.0.0
 """
 
 from .parser import parse_verilog
+from .hierarchy import ModuleLibrary, parse_verilog_hierarchy
 
-__all__ = ['parse_verilog']
+__all__ = ['parse_verilog', 'parse_verilog_hierarchy', 'ModuleLibrary']
 
@@ -37,8 +37,9 @@ PORT_INPUT_SCALAR_PATTERN = re.compile(r'input\s+(?:wire\s+|reg\s+)?(?:signed\s+
 PORT_OUTPUT_SCALAR_PATTERN = re.compile(r'output\s+(?:wire\s+|reg\s+)?(?:signed\s+|unsigned\s+)?([^[,\n)]+)')
 
 # Wire declarations (hỗ trợ signed/unsigned và parameterized widths)
-WIRE_VECTOR_ASSIGN_PATTERN = re.compile(r'wire\s+(?:signed\s+|unsigned\s+)?\[([^\]]+):([^\]]+)\]\s+([^=]+)\s*=\s*([^;]+);')
-WIRE_SCALAR_ASSIGN_PATTERN = re.compile(r'wire\s+(?:signed\s+|unsigned\s+)?([^[=]+)\s*=\s*([^;]+);')
+# (tên wire không vượt qua ';' - tránh gộp 'wire a;' với 'assign b = ...' phía sau)
+WIRE_VECTOR_ASSIGN_PATTERN = re.compile(r'wire\s+(?:signed\s+|unsigned\s+)?\[([^\]]+):([^\]]+)\]\s+([^=;]+)\s*=\s*([^;]+);')
+WIRE_SCALAR_ASSIGN_PATTERN = re.compile(r'wire\s+(?:signed\s+|unsigned\s+)?([^[=;]+)\s*=\s*([^;]+);')
 WIRE_VECTOR_PATTERN = re.compile(r'wire\s+(?:signed\s+|unsigned\s+)?\[([^\]]+):([^\]]+)\]\s+([^;=]+);')
 WIRE_SCALAR_PATTERN = re.compile(r'wire\s+(?:signed\s+|unsigned\s+)?([^[;=]+);')
 
@@ -0,0 +1,224 @@
+"""
+Verilog Module Library - Parse nhiều module và elaborate phân cấp
+
+``parse_verilog`` trước đây chỉ parse module cuối cùng trong file; instance
+của module khác thành node MODULE mờ mà synthesis bỏ qua. Module này:
+
+- ``ModuleLibrary``: mọi module của một tập file (một lần lexer cho mỗi file),
+  tra theo tên.
+- ``ModuleLibrary.elaborate(name, params)``: parse module với parameter ghi
+  đè; kết quả cache theo khóa (module, tham số) nên N instance giống nhau chỉ
+  parse module con một lần. Chỉ module được instance tới mới được parse.
+- ``ModuleLibrary.elaborate_top(name)``: netlist của top kèm
+  ``attrs['hierarchy']`` = {module_key: netlist con} cho mọi module con đạt tới.
+
+Node MODULE của instance đã elaborate có ``module_key``, ``input_bits`` và
+``output_bits`` (xem ``parser._bind_instance_ports``); ``NetlistToAIGConverter``
+synthesize mỗi ``module_key`` một lần rồi chép AIG cho từng instance (AIG kết
+quả là design đã flatten).
+
+Usage:
+    from frontends.verilog.core.hierarchy import parse_verilog_hierarchy
+
+    netlist = parse_verilog_hierarchy(['adder.v', 'top.v'], top='top')
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .tokenizer import VerilogTokenizer
+from .constants import PARAMETER_PATTERN
+from .parser import _parse_module, _read_source, _eval_int, _parse_ordered_ports, _INSTANCE_TYPE_PATTERN
+from core.utils.error_handling import ParserError
+from core.utils.performance import trace_span
+
+_HEADER_PARAM_NAME_PATTERN = re.compile(
+    r'\s*(?:parameter\b)?\s*(?:(?:integer|real|signed|unsigned)\b\s*)*(?:\[[^\]]*\]\s*)?([A-Za-z_]\w*)\s*='
+)
+_PORT_NAME_PATTERN = re.compile(r'([A-Za-z_][\w$]*)\s*(?:\[[^\]]*\]\s*)*$')
+_SIZED_CONSTANT_PATTERN = re.compile(r"(?:\d+)?\s*'[sS]?([bBoOdDhH])\s*([0-9a-fA-F_]+)")
+_BASES = {'b': 2, 'o': 8, 'd': 10, 'h': 16}
+
+
+class ModuleLibrary:
+    """
+    Thư viện module Verilog: tên module → tokens (``VerilogTokenizer``) và file
+    nguồn; elaborate theo (module, tham số) với cache.
+    """
+
+    def __init__(self, strict: bool = False):
+        self.strict = strict
+        self.modules: Dict[str, Tuple[Dict, str]] = {}   # name -> (tokens, path)
+        self.netlists: Dict[str, Dict[str, Any]] = {}    # module_key -> netlist đã elaborate
+        self._active: Set[str] = set()                   # khóa đang elaborate (phát hiện đệ quy)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.modules
+
+    def add_source(self, source: str, path: str = "") -> List[str]:
+        """Thêm mọi module trong ``source``; trả về tên module theo thứ tự source."""
+        names = []
+        for tokens in VerilogTokenizer(source, path).tokenize_all():
+            # Module trùng tên: định nghĩa sau thay định nghĩa trước
+            self.modules[tokens['module_name']] = (tokens, path)
+            names.append(tokens['module_name'])
+        return names
+
+    def add_file(self, path: str) -> List[str]:
+        """Thêm mọi module trong file Verilog ``path``."""
+        return self.add_source(_read_source(path), path)
+
+    def top_modules(self) -> List[str]:
+        """Các module không bị module nào khác trong thư viện instance (thứ tự thêm vào)."""
+        used: Set[str] = set()
+        for name, (tokens, _path) in self.modules.items():
+            scan = tokens['scan']
+            for i in scan.instances:
+                m = _INSTANCE_TYPE_PATTERN.match(scan.item_text(i))
+                if m and m.group(1) != name:
+                    used.add(m.group(1))
+        return [name for name in self.modules if name not in used]
+
+    def default_top(self) -> str:
+        """Module top mặc định: module cuối cùng trong ``top_modules()`` (không có thì module cuối cùng)."""
+        candidates = self.top_modules() or list(self.modules)
+        if not candidates:
+            raise ParserError("No module found")
+        return candidates[-1]
+
+    def port_order(self, name: str) -> List[str]:
+        """Tên port theo thứ tự header (cho ordered port connections)."""
+        ports = []
+        for decl in _parse_ordered_ports(self.modules[name][0].get('port_list', '')):
+            m = _PORT_NAME_PATTERN.search(decl)
+            if m:
+                ports.append(m.group(1))
+        return ports
+
+    def parameter_names(self, name: str) -> List[str]:
+        """Parameter ghi đè được (header ``#(...)`` rồi body ``parameter``), theo thứ tự khai báo."""
+        tokens = self.modules[name][0]
+        names = []
+        for decl in _parse_ordered_ports(tokens.get('param_list', '')):
+            m = _HEADER_PARAM_NAME_PATTERN.match(decl)
+            if m and not decl.lstrip().startswith('localparam'):
+                names.append(m.group(1))
+        for m in PARAMETER_PATTERN.finditer(tokens['scan'].text_for('parameter')):
+            if m.group(1) not in names:
+                names.append(m.group(1))
+        return names
+
+    def name_ordered_ports(self, name: str, ordered_ports: Sequence[str]) -> Dict[str, str]:
+        """Ordered port connections → {tên port: biểu thức}."""
+        ports = self.port_order(name)
+        if len(ordered_ports) > len(ports):
+            raise ParserError(
+                f"Instance of module '{name}' has {len(ordered_ports)} ordered connections "
+                f"but the module has {len(ports)} ports"
+            )
+        return dict(zip(ports, ordered_ports))
+
+    def resolve_parameters(self, name: str, named: Optional[Dict[str, str]],
+                           ordered: Sequence[str], parent_params: Dict[str, int]) -> Dict[str, int]:
+        """
+        Eval parameter override của instance (``#(.W(8))`` hoặc ``#(8)``) theo
+        parameter của module cha. Giá trị không phải số nguyên (chuỗi, ...) bị bỏ qua.
+        """
+        names = self.parameter_names(name)
+        pairs = list(named.items()) if named else list(zip(names, ordered))
+        resolved: Dict[str, int] = {}
+        for param, expr in pairs:
+            if param not in names:
+                raise ParserError(f"Module '{name}' has no parameter '{param}'")
+            value = _eval_override(expr, parent_params)
+            if value is not None:
+                resolved[param] = value
+        return resolved
+
+    @staticmethod
+    def module_key(name: str, params: Optional[Dict[str, int]] = None) -> str:
+        """Khóa cache của (module, tham số): ``adder`` hoặc ``adder#(W=8)``."""
+        if not params:
+            return name
+        return f"{name}#({','.join(f'{k}={v}' for k, v in sorted(params.items()))})"
+
+    def elaborate(self, name: str, params: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Netlist của ``name`` với parameter ``params`` (parse một lần cho mỗi khóa)."""
+        key = self.module_key(name, params)
+        netlist = self.netlists.get(key)
+        if netlist is not None:
+            return netlist
+        if name not in self.modules:
+            raise ParserError(f"Module '{name}' is not defined")
+        if key in self._active:
+            raise ParserError(f"Recursive instantiation of module '{name}'")
+        tokens, path = self.modules[name]
+        self._active.add(key)
+        try:
+            with trace_span("parse.module", category="parse", module=key):
+                netlist = _parse_module(tokens, path, self.strict, params, self)
+        finally:
+            self._active.discard(key)
+        self.netlists[key] = netlist
+        return netlist
+
+    def hierarchy(self, netlist: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """{module_key: netlist} của mọi module con đạt tới từ ``netlist``."""
+        found: Dict[str, Dict[str, Any]] = {}
+        stack = [netlist]
+        while stack:
+            for node in stack.pop().get('nodes', []):
+                key = node.get('module_key') if node.get('type') == 'MODULE' else None
+                if key and key not in found:
+                    found[key] = self.netlists[key]
+                    stack.append(found[key])
+        return found
+
+    def elaborate_top(self, name: str, params: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Netlist của top ``name``, kèm ``attrs['hierarchy']`` nếu có instance đã elaborate."""
+        netlist = self.elaborate(name, params)
+        hierarchy = self.hierarchy(netlist)
+        if not hierarchy:
+            return netlist
+        # Bản sao nông: netlist trong cache có thể là module con của top khác
+        top = dict(netlist)
+        top['attrs'] = dict(netlist['attrs'], hierarchy=hierarchy)
+        return top
+
+
+def _eval_override(expr: str, params: Dict[str, int]) -> Optional[int]:
+    """Giá trị nguyên của một parameter override (None nếu không eval được)."""
+    expr = expr.strip()
+    try:
+        return _eval_int(expr, params)
+    except (ValueError, TypeError, SyntaxError, ZeroDivisionError):
+        pass
+    m = _SIZED_CONSTANT_PATTERN.fullmatch(expr)
+    if m:
+        return int(m.group(2).replace('_', ''), _BASES[m.group(1).lower()])
+    return None
+
+
+def parse_verilog_hierarchy(paths: Sequence[str], top: Optional[str] = None,
+                            strict: bool = False) -> Dict[str, Any]:
+    """
+    Parse một tập file Verilog thành netlist phân cấp của module top.
+
+    Args:
+        paths: File Verilog (một hoặc nhiều; module có thể nằm ở file bất kỳ)
+        top: Tên module top; mặc định module cuối cùng không bị module khác instance
+        strict: Như ``parse_verilog(strict=True)``, áp dụng cho mọi module
+
+    Returns:
+        Netlist của top (format của ``parse_verilog``) với
+        ``attrs['hierarchy']`` = {module_key: netlist module con}
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    with trace_span("parse", category="parse", files=len(paths)) as span:
+        library = ModuleLibrary(strict=strict)
+        for path in paths:
+            library.add_file(path)
+        netlist = library.elaborate_top(top or library.default_top())
+        span.set(nodes=len(netlist.get('nodes', []) or []), modules=len(library.netlists))
+    return netlist
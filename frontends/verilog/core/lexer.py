@@ -0,0 +1,521 @@
+"""
+Verilog Lexer - Token stream một lần duy nhất cho frontend regex
+
+Trước đây ``parse_verilog`` quét lại toàn bộ ``module_body`` bằng khoảng mười
+lăm regex riêng (bỏ comment, kiểm tra ngoặc, ``;;``, begin/end, ...), rồi mỗi
+bước parse statement lại chạy regex của nó trên toàn bộ body. Module này thay
+tất cả bằng một lần ``re.finditer`` trên source:
+
+- ``tokenize(source)``: sinh ``Token`` (kind, text, offset, line, col), bỏ qua
+  comment, attribute ``(* ... *)`` và khoảng trắng. Dòng/cột tính từ offset
+  qua ``LineIndex`` (bisect).
+- ``scan_modules(source)``: tiêu thụ token stream đúng một lần, trả về một
+  ``ModuleScan`` cho mỗi module trong file (``scan_module`` lấy module cuối
+  cùng, như ``MODULE_PATTERN`` cũ); tách body thành các item cấp module
+  (statement kết thúc bằng ``;`` hoặc khối always/initial/generate/function/
+  task/specify; tham số của directive như ```ifdef X`` bị bỏ qua), đánh chỉ
+  mục item theo keyword, và ghi lại các lỗi cú pháp
+  mà các validator cũ tìm (ngoặc, ``;;``, rác sau ``;``, ``end;``, begin/end,
+  generate thiếu endgenerate, thiếu ``assign``).
+
+Các parser statement trong ``parser.py`` vẫn dùng regex cũ nhưng chỉ trên
+``ModuleScan.text_for(...)`` - phần text của các item chứa keyword liên quan -
+nên tổng chi phí parse tuyến tính theo kích thước file.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Nhóm của TOKEN_PATTERN (m.lastindex); attribute ``(* ... *)`` được xếp chung nhóm comment
+_COMMENT, _IDENT, _NUMBER, _STRING, _DIRECTIVE, _SYSTEM, _ESCAPED, _OP, _UNKNOWN = range(1, 10)
+
+TOKEN_PATTERN = re.compile(
+    r'(//[^\n]*|/\*.*?\*/|\(\*(?!\s*\))(?:[^*]|\*(?!\)))*\*\))'
+    r'|([A-Za-z_][\w$]*)'
+    r"|((?:\d[\d_]*\s*)?'[sS]?[bBoOdDhH]\s*[\dA-Fa-fXxZz?_]+|\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+    r'|("(?:\\.|[^"\\\n])*")'
+    r'|(`\w+)'
+    r'|(\$[\w$]+)'
+    r'|(\\\S+)'
+    r'|(>>>=|<<<=|===|!==|<<<|>>>|<<=|>>=|==|!=|<=|>=|&&|\|\||<<|>>|~&|~\||~\^|\^~|\*\*|->'
+    r"|[()\[\]{};,.:?=+\-*/%&|^~!<>@#'])"
+    r'|(\S)',
+    re.DOTALL,
+)
+
+TOKEN_KINDS = {
+    _IDENT: 'ident', _NUMBER: 'number', _STRING: 'string', _DIRECTIVE: 'directive',
+    _SYSTEM: 'system', _ESCAPED: 'ident', _OP: 'op', _UNKNOWN: 'unknown',
+}
+
+# Từ khóa Verilog-2005 (tên module instance không được trùng các từ này)
+VERILOG_KEYWORDS = frozenset("""
+    always and assign automatic begin buf bufif0 bufif1 case casex casez cell cmos config
+    deassign default defparam design disable edge else end endcase endconfig endfunction
+    endgenerate endmodule endprimitive endspecify endtable endtask event for force forever
+    fork function generate genvar highz0 highz1 if ifnone incdir include initial inout input
+    instance integer join large liblist library localparam macromodule medium module nand
+    negedge nmos nor noshowcancelled not notif0 notif1 or output parameter pmos posedge
+    primitive pull0 pull1 pulldown pullup pulsestyle_onevent pulsestyle_ondetect rcmos real
+    realtime reg release repeat rnmos rpmos rtran rtranif0 rtranif1 scalared showcancelled
+    signed small specify specparam strong0 strong1 supply0 supply1 table task time tran
+    tranif0 tranif1 tri tri0 tri1 triand trior trireg unsigned use uwire vectored wait wand
+    weak0 weak1 while wire wor xnor xor
+    always_comb always_ff always_latch final
+""".split())
+
+# Keyword được đánh chỉ mục: item chứa token này có mặt trong ``text_for(keyword)``
+INDEXED_KEYWORDS = frozenset((
+    'input', 'output', 'inout', 'wire', 'reg', 'parameter', 'localparam', 'assign',
+    'always', 'case', 'casex', 'casez', 'generate', 'function', 'task',
+    'and', 'or', 'xor', 'xnor', 'nand', 'nor', 'not', 'buf',
+))
+
+# Item bắt đầu bằng các keyword này là statement thủ tục (kết thúc theo begin/end, if/else)
+_PROCEDURAL = frozenset((
+    'always', 'always_comb', 'always_ff', 'always_latch', 'initial', 'final',
+    'if', 'for', 'while', 'repeat', 'forever', 'case', 'casex', 'casez', 'begin', 'fork',
+))
+# Khối kết thúc bằng một keyword cố định
+_BLOCK_END = {
+    'generate': 'endgenerate', 'function': 'endfunction', 'task': 'endtask', 'specify': 'endspecify',
+}
+_OPENERS = frozenset(('begin', 'case', 'casex', 'casez', 'fork'))
+_CLOSERS = frozenset(('end', 'endcase', 'join'))
+
+# Item không cần kiểm tra "thiếu assign" (nội dung là code thủ tục / khai báo riêng)
+PROCEDURAL_ITEMS = frozenset(('always', 'always_comb', 'always_ff', 'always_latch', 'initial', 'final',
+                              'generate', 'function', 'task', 'specify'))
+# Statement đơn mở đầu bằng các từ này được phép chứa '=' (như _basic_statement_validation cũ)
+ASSIGN_PREFIXES = frozenset((
+    'assign', 'wire', 'reg', 'input', 'output', 'parameter', 'localparam', 'always', 'if',
+    'for', 'case', 'while', 'generate', 'end', 'module',
+))
+
+# Directive có tham số tới hết dòng (macro dùng trong biểu thức như `WIDTH thì không)
+_LINE_DIRECTIVES = frozenset((
+    '`define', '`undef', '`ifdef', '`ifndef', '`elsif', '`include', '`timescale',
+    '`default_nettype', '`line', '`pragma', '`begin_keywords',
+))
+
+_SIMPLE, _PROC, _BLOCK = 0, 1, 2
+SIMPLE_ITEM = _SIMPLE
+_PAIRS = {')': '(', ']': '[', '}': '{'}
+_STRIP_COMMENTS = re.compile(r'("(?:\\.|[^"\\\n])*")|//[^\n]*|/\*.*?\*/|\(\*(?!\s*\))(?:[^*]|\*(?!\)))*\*\)', re.DOTALL)
+
+
+def strip_comments(text: str) -> str:
+    """Bỏ comment ``//``, ``/* */`` và attribute ``(* *)`` (giữ nguyên string literal chứa ``//``)."""
+    return _STRIP_COMMENTS.sub(lambda m: m.group(1) or ' ', text)
+
+
+class LineIndex:
+    """Đổi offset trong source sang (dòng, cột) 1-based; bảng newline dựng lười."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self._newlines: Optional[List[int]] = None
+
+    def line_col(self, offset: int) -> Tuple[int, int]:
+        if self._newlines is None:
+            self._newlines = [m.start() for m in re.finditer('\n', self.source)]
+        line = bisect_right(self._newlines, offset - 1)
+        line_start = self._newlines[line - 1] + 1 if line else 0
+        return line + 1, offset - line_start + 1
+
+    def line(self, offset: int) -> int:
+        return self.line_col(offset)[0]
+
+
+class Token:
+    """Một token Verilog; ``kind`` là ident/number/string/directive/system/op/unknown."""
+
+    __slots__ = ('kind', 'text', 'offset', 'line', 'col')
+
+    def __init__(self, kind: str, text: str, offset: int, line: int, col: int):
+        self.kind = kind
+        self.text = text
+        self.offset = offset
+        self.line = line
+        self.col = col
+
+    def __repr__(self) -> str:
+        return f"Token({self.kind}, {self.text!r}, {self.line}:{self.col})"
+
+
+def tokenize(source: str, start: int = 0, end: Optional[int] = None,
+             lines: Optional[LineIndex] = None) -> Iterator[Token]:
+    """Sinh token của ``source[start:end]`` (bỏ comment và khoảng trắng) kèm dòng/cột."""
+    lines = lines or LineIndex(source)
+    line_col = lines.line_col
+    kinds = TOKEN_KINDS
+    end = len(source) if end is None else end
+    for m in TOKEN_PATTERN.finditer(source, start, end):
+        k = m.lastindex
+        if k == _COMMENT:
+            continue
+        offset = m.start()
+        line, col = line_col(offset)
+        yield Token(kinds[k], m.group(k), offset, line, col)
+
+
+class ModuleScan:
+    """
+    Kết quả quét một module (``scan_modules`` trả về một ``ModuleScan`` cho mỗi
+    module trong file; ``scan_module`` trả về module cuối cùng): các item trong
+    body và các lỗi cú pháp tìm thấy (chưa raise - ``parser.py`` quyết định thứ
+    tự và thông báo).
+
+    ``items`` là list tuple ``(keyword, start, end, has_comment, eq_offset, mode)``
+    theo thứ tự source; ``problems`` ánh xạ tên lỗi → offset xuất hiện đầu tiên.
+    """
+
+    def __init__(self, source: str, lines: Optional[LineIndex] = None):
+        self.source = source
+        self.lines = lines or LineIndex(source)
+        self.default_nettype = 'wire'
+        self.name = ''
+        self.param_list = ''
+        self.port_list = ''
+        self.header_start = -1
+        self.body_start = -1
+        self.body_end = -1
+        self.body_has_comment = False
+        self.items: List[Tuple[str, int, int, bool, int, int]] = []
+        self.index: Dict[str, List[int]] = {}
+        self.instances: List[int] = []
+        self.problems: Dict[str, int] = {}
+        self.begin_count = 0
+        self.end_count = 0
+        # Ngoặc không cân bằng trên toàn file: (offset, ký tự) đầu tiên
+        self.delimiter_error: Optional[Tuple[int, str]] = None
+
+    @property
+    def found(self) -> bool:
+        return bool(self.name)
+
+    @property
+    def closed(self) -> bool:
+        return self.body_end >= 0
+
+    def line(self, offset: int) -> int:
+        return self.lines.line(offset)
+
+    @property
+    def body_start_line(self) -> int:
+        return self.line(self.body_start) if self.body_start >= 0 else 1
+
+    def body_text(self) -> str:
+        """Body của module (không comment), từ sau header đến trước ``endmodule``."""
+        text = self.source[self.body_start:self.body_end]
+        return strip_comments(text) if self.body_has_comment else text
+
+    def item_text(self, i: int) -> str:
+        _kw, start, end, has_comment, _eq, _mode = self.items[i]
+        text = self.source[start:end]
+        return strip_comments(text) if has_comment else text
+
+    def item_indices(self, keywords: Sequence[str]) -> List[int]:
+        """Chỉ số các item chứa ít nhất một trong ``keywords`` (theo thứ tự source)."""
+        lists = [self.index[k] for k in keywords if k in self.index]
+        if not lists:
+            return []
+        if len(lists) == 1:
+            return lists[0]
+        return sorted(set().union(*lists))
+
+    def text_for(self, *keywords: str, exclude: Sequence[str] = ()) -> str:
+        """
+        Text (không comment) của các item chứa một trong ``keywords``, nối bằng newline.
+
+        ``exclude``: bỏ item có keyword đầu nằm trong danh sách (vd. assign trong generate).
+        """
+        items = self.items
+        return "\n".join(self.item_text(i) for i in self.item_indices(keywords) if items[i][0] not in exclude)
+
+    def instance_items(self) -> List[int]:
+        """
+        Chỉ số các statement bắt đầu bằng identifier không phải keyword (module
+        instance), cùng các khối generate (instance có thể nằm trong generate).
+        """
+        generate = [i for i in self.index.get('generate', ()) if self.items[i][0] == 'generate']
+        if generate:
+            return sorted(self.instances + generate)
+        return self.instances
+
+    def instance_text(self) -> str:
+        """Text của ``instance_items()``, nối bằng newline."""
+        return "\n".join(self.item_text(i) for i in self.instance_items())
+
+    def body_tokens(self) -> Iterator[Token]:
+        return tokenize(self.source, self.body_start, self.body_end, self.lines)
+
+
+def _directive_end(source: str, pos: int) -> int:
+    """Offset cuối dòng của directive (``\\`` cuối dòng nối tiếp thân `define)."""
+    while True:
+        nl = source.find('\n', pos)
+        if nl < 0:
+            return len(source)
+        if source[pos:nl].rstrip().endswith('\\'):
+            pos = nl + 1
+            continue
+        return nl
+
+
+def scan_module(source: str) -> ModuleScan:
+    """
+    Module cuối cùng của ``source`` (như ``MODULE_PATTERN`` cũ: header hợp lệ
+    cuối cùng ``module NAME [#(...)] (...);``, body tới ``endmodule`` đầu tiên
+    sau đó). ``found`` là False nếu file không có module nào.
+    """
+    modules = scan_modules(source)
+    return modules[-1] if modules else ModuleScan(source)
+
+
+def scan_modules(source: str) -> List[ModuleScan]:
+    """
+    Một lần duy nhất qua token stream của ``source``: mọi module theo thứ tự
+    source. Module thiếu ``endmodule`` (gặp header mới hoặc hết file) có
+    ``closed`` là False. Lỗi ngoặc và ```default_nettype`` tính trên toàn file.
+    """
+    lines = LineIndex(source)
+    modules: List[ModuleScan] = []
+    scan = ModuleScan(source, lines)
+    nettype = 'wire'
+    delimiter_error: Optional[Tuple[int, str]] = None
+    stack: List[Tuple[str, int]] = []
+    state = 0                   # 0: ngoài module, 1: header, 2: body
+    nettype_next = nettype_done = False
+    skip_until = 0              # bỏ qua token tới offset này (tham số directive)
+
+    # Header đang đọc
+    h_prev = h_step = 0
+    h_name = ''
+    h_start = h_depth = h_inner = h_name_end = 0
+    h_param = h_port = (0, 0)
+
+    # Module đang chọn (body)
+    items: list = []
+    index: Dict[str, List[int]] = {}
+    instances: List[int] = []
+    problems: Dict[str, int] = {}
+    begins = ends = 0
+    body_comment = False
+
+    # Item đang mở
+    it_start = -1
+    it_kw = ''
+    it_ident = False
+    it_mode = _SIMPLE
+    it_endkw = ''
+    it_comment = False
+    it_eq = -1
+    pdepth = bdepth = 0
+    pending = False
+
+    prev = ''                   # text token có nghĩa liền trước (trong body)
+    prev_end = 0
+    semi_end = -1               # end offset của ';' liền trước (kiểm tra rác sau ';')
+
+    indexed = INDEXED_KEYWORDS
+    keywords = VERILOG_KEYWORDS
+
+    def flush() -> None:
+        """Ghi trạng thái body đang quét vào ``scan`` hiện tại."""
+        scan.param_list = strip_comments(source[scan.param_list[0]:scan.param_list[1]]) if scan.param_list[1] else ''
+        scan.port_list = strip_comments(source[scan.port_list[0]:scan.port_list[1]])
+        scan.items, scan.index, scan.instances, scan.problems = items, index, instances, problems
+        scan.begin_count, scan.end_count = begins, ends
+        scan.body_has_comment = body_comment
+
+    def close_item(end_offset: int) -> None:
+        nonlocal it_start
+        idx = len(items)
+        items.append((it_kw, it_start, end_offset, it_comment, it_eq, it_mode))
+        if it_mode == _SIMPLE:
+            if (it_eq >= 0 and it_kw not in ASSIGN_PREFIXES and 'missing_assign' not in problems
+                    and problems.get('semicolon_garbage') != it_start - 1):
+                # (item mở đầu bằng rác dính sau ';' thì báo lỗi rác, không báo thiếu assign)
+                problems['missing_assign'] = it_eq
+            if it_ident and it_kw not in keywords:
+                instances.append(idx)
+        it_start = -1
+
+    for m in TOKEN_PATTERN.finditer(source):
+        k = m.lastindex
+        if k == _COMMENT:
+            if state == 2:
+                body_comment = True
+                if it_start >= 0:
+                    it_comment = True
+            continue
+        text = m.group(k)
+        start = m.start()
+        if start < skip_until:
+            # Tham số của directive (`ifdef X, `define ..., `timescale ...) không thuộc statement nào
+            if nettype_next and k == _IDENT:
+                nettype = text.lower()
+                nettype_next, nettype_done = False, True
+            continue
+
+        if k == _OP:
+            if text in '([{':
+                stack.append((text, start))
+            elif text in ')]}':
+                if not stack or stack[-1][0] != _PAIRS[text]:
+                    if delimiter_error is None:
+                        delimiter_error = (start, stack[-1][0] + text if stack else text)
+                else:
+                    stack.pop()
+        elif k == _DIRECTIVE:
+            if text in _LINE_DIRECTIVES:
+                skip_until = _directive_end(source, m.end())
+                nettype_next = text == '`default_nettype' and not nettype_done
+            continue
+
+        if k == _IDENT and text == 'module':
+            h_prev, state, h_step, h_start = state, 1, 0, start
+            continue
+
+        if state == 1:
+            # module NAME [#( ... )] ( ... ) ;  - cho phép ngoặc lồng nhau.
+            # h_step: 1 chờ '#'/'(', 2 chờ '(' của #(, 3 trong #(...), 4 chờ '(', 5 trong (...), 6 chờ ';'
+            if h_step == 0:
+                if k == _IDENT or k == _ESCAPED or k == _NUMBER:
+                    h_name, h_step, h_param, h_name_end = text, 1, (0, 0), m.end()
+                else:
+                    state = h_prev
+            elif h_step == 1 and k == _IDENT and start == h_name_end:
+                # Tên như 01_top bị lexer tách thành number + ident (\w+ trong MODULE_PATTERN cũ)
+                h_name, h_name_end = h_name + text, m.end()
+            elif h_step == 1 and text == '#':
+                h_step = 2
+            elif (h_step == 1 or h_step == 2 or h_step == 4) and text == '(':
+                h_step, h_depth, h_inner = (3 if h_step == 2 else 5), 1, m.end()
+            elif h_step == 3 or h_step == 5:
+                if text == '(':
+                    h_depth += 1
+                elif text == ')':
+                    h_depth -= 1
+                    if h_depth == 0:
+                        if h_step == 3:
+                            h_param, h_step = (h_inner, start), 4
+                        else:
+                            h_port, h_step = (h_inner, start), 6
+            elif h_step == 6 and text == ';':
+                # Header hợp lệ: bắt đầu module mới (module trước chưa đóng thì giữ nguyên, closed=False)
+                if h_prev == 2:
+                    if it_start >= 0:
+                        close_item(prev_end)
+                    flush()
+                state = 2
+                scan = ModuleScan(source, lines)
+                modules.append(scan)
+                scan.name = h_name
+                scan.header_start = h_start
+                scan.param_list = h_param
+                scan.port_list = h_port
+                scan.body_start = m.end()
+                scan.body_end = -1
+                items, index, instances, problems = [], {}, [], {}
+                begins = ends = 0
+                body_comment = False
+                it_start, pending, prev, semi_end = -1, False, '', -1
+            else:
+                state = h_prev
+            continue
+
+        if state != 2:
+            continue
+
+        # ---- Body ----
+        if k == _IDENT and text == 'endmodule':
+            if it_start >= 0:
+                if it_mode == _BLOCK and it_kw == 'generate':
+                    problems.setdefault('generate_unclosed', it_start)
+                close_item(prev_end)
+            scan.body_end = start
+            flush()
+            state = 0
+            continue
+
+        end = m.end()
+        if semi_end >= 0:
+            if start == semi_end and text != ';' and 'semicolon_garbage' not in problems:
+                problems['semicolon_garbage'] = start - 1
+            semi_end = -1
+
+        if pending:
+            if text == 'else':
+                pending = False
+            else:
+                close_item(prev_end)
+                pending = False
+
+        if it_start < 0:
+            it_start, it_kw, it_ident = start, text, k == _IDENT or k == _ESCAPED
+            it_comment, it_eq, pdepth, bdepth = False, -1, 0, 0
+            if text in _PROCEDURAL:
+                it_mode = _PROC
+            elif text in _BLOCK_END:
+                it_mode, it_endkw = _BLOCK, _BLOCK_END[text]
+            else:
+                it_mode = _SIMPLE
+
+        if k == _IDENT:
+            if text in indexed:
+                lst = index.get(text)
+                if lst is None:
+                    index[text] = [len(items)]
+                elif lst[-1] != len(items):
+                    lst.append(len(items))
+            if text == 'begin':
+                begins += 1
+            elif text == 'end':
+                ends += 1
+            if it_mode == _PROC:
+                if text in _OPENERS:
+                    bdepth += 1
+                elif text in _CLOSERS:
+                    if bdepth > 0:
+                        bdepth -= 1
+                    if bdepth == 0 and pdepth == 0:
+                        pending = True
+            elif it_mode == _BLOCK and text == it_endkw:
+                close_item(end)
+        elif k == _OP:
+            if text == ';':
+                if prev == ';' and 'double_semicolon' not in problems:
+                    problems['double_semicolon'] = start
+                elif prev == 'end' and 'end_semicolon' not in problems:
+                    problems['end_semicolon'] = prev_end - 3
+                semi_end = end
+                if pdepth == 0:
+                    if it_mode == _SIMPLE:
+                        prev, prev_end = text, end
+                        close_item(end)
+                        continue
+                    if it_mode == _PROC and bdepth == 0:
+                        pending = True
+            elif text == '=':
+                if it_eq < 0:
+                    it_eq = start
+            elif text in '([{':
+                pdepth += 1
+            elif text in ')]}':
+                if pdepth > 0:
+                    pdepth -= 1
+        prev, prev_end = text, end
+
+    if state == 2:
+        if it_start >= 0:
+            close_item(prev_end)
+        flush()
+    if stack and delimiter_error is None:
+        delimiter_error = (stack[-1][1], stack[-1][0])
+    for scan in modules:
+        scan.default_nettype = nettype
+        scan.delimiter_error = delimiter_error
+    return modules
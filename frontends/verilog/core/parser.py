@@ -2,12 +2,13 @@
 Verilog Parser - Main Parser Logic
 
 File này tổng hợp tất cả các modules lại:
+- lexer: Token stream một lần → các statement/khối của module body
 - tokenizer: Làm sạch và tokenize code
 - node_builder: Tạo nodes và connections
 - operations/*: Parse từng loại operation
 
 Flow:
-1. Tokenize source code
+1. Tokenize source code (một lần; validators và statement parsers dùng chung kết quả)
 2. Extract ports và wires
 3. Parse assign statements
 4. Parse gate/module instantiations
@@ -22,16 +23,23 @@ from typing import Dict, Any, List, Set
 import re
 
 from .tokenizer import (
-    VerilogTokenizer,
     split_signal_list,
     calculate_vector_width,
-    remove_inline_comments
 )
+from .lexer import ModuleScan, ASSIGN_PREFIXES, PROCEDURAL_ITEMS, SIMPLE_ITEM
 from .node_builder import NodeBuilder, WireGenerator
 from .constants import *
 from ..operations import *
+# (import một lần ở đây - _dispatch_assign_parser chạy cho mỗi assign)
+from ..operations.arithmetic import detect_arithmetic_operator
+from ..operations.bitwise import detect_bitwise_operator
+from ..operations.logical import detect_logical_operator
+from ..operations.comparison import detect_comparison_operator
+from ..operations.shift import detect_shift_operator
+from ..operations.special import is_replication, parse_replication
 from .expression_parser import parse_complex_expression
 from core.utils.error_handling import ParserError
+from core.utils.performance import trace_span
 
 
 def parse_verilog(path: str, strict: bool = False) -> Dict[str, Any]:
@@ -46,6 +54,10 @@ def parse_verilog(path: str, strict: bool = False) -> Dict[str, Any]:
     5. Generate connections
     6. Tính statistics
     
+    File nhiều module: top là module cuối cùng không bị module nào khác trong
+    file instance (không có thì module cuối cùng); xem ``parse_verilog_hierarchy``
+    cho nhiều file hoặc chọn top.
+    
     Args:
         path: Đường dẫn đến file Verilog
         
@@ -69,12 +81,36 @@ def parse_verilog(path: str, strict: bool = False) -> Dict[str, Any]:
         ValueError: Nếu path invalid
         FileNotFoundError: Nếu file không tồn tại
     """
+    with trace_span("parse", category="parse", file=str(path)) as span:
+        netlist = _parse_verilog(path, strict)
+        span.set(nodes=len(netlist.get('nodes', []) or []), wires=len(netlist.get('wires', []) or []))
+    return netlist
+
+
+def _parse_verilog(path: str, strict: bool) -> Dict[str, Any]:
+    """Thân của ``parse_verilog`` (các bước được trace thành span con của ``parse``)."""
     # Optional AST frontend (MyVerilog subset) via env var
     import os as _os
     if _os.environ.get("MYLOGIC_USE_AST", "").strip() in ("1", "true", "TRUE", "yes", "YES"):
         from frontends.verilog.ast import parse_verilog_ast
         return parse_verilog_ast(path, strict=True)
 
+    from .hierarchy import ModuleLibrary
+
+    source_code = _read_source(path)
+    
+    # Bước 1: Tokenize (mọi module trong file vào thư viện)
+    with trace_span("parse.tokenize", category="parse", chars=len(source_code)):
+        library = ModuleLibrary(strict=strict)
+        library.add_source(source_code, path)
+
+    # Top: module cuối cùng không bị module khác instance (file thường viết top trước);
+    # module con định nghĩa trong cùng file được elaborate theo (module, tham số)
+    return library.elaborate_top(library.default_top())
+
+
+def _read_source(path: str) -> str:
+    """Đọc file Verilog (error handling giống YosysHQ)."""
     # Validate input
     if not path or not isinstance(path, str):
         raise ValueError("Path phải là string không rỗng")
@@ -82,25 +118,32 @@ def parse_verilog(path: str, strict: bool = False) -> Dict[str, Any]:
     # Đọc file - nâng cấp error handling giống YosysHQ
     try:
         with open(path, 'r', encoding='utf-8', errors='replace') as f:
-            source_code = f.read()
+            return f.read()
     except FileNotFoundError:
         raise FileNotFoundError(f"Không tìm thấy file: {path}")
     except UnicodeDecodeError as e:
         # Thử với encoding khác nếu UTF-8 fail
         try:
             with open(path, 'r', encoding='latin-1') as f:
-                source_code = f.read()
+                return f.read()
         except Exception:
             raise ValueError(f"Không thể đọc file {path}: encoding error - {e}")
     except Exception as e:
         raise ValueError(f"Lỗi khi đọc file {path}: {e}")
-    
+
+
+def _parse_module(tokens: Dict, path: str, strict: bool,
+                  param_overrides: Dict[str, int] = None, library=None) -> Dict[str, Any]:
+    """
+    Parse một module (``tokens`` từ ``VerilogTokenizer``) thành netlist.
+
+    Args:
+        param_overrides: giá trị ``parameter`` ghi đè (``#(.P(v))`` của instance cha)
+        library: ``ModuleLibrary`` để elaborate instance của module đã biết
+    """
     # Khởi tạo netlist structure
     netlist = _initialize_netlist(path)
     
-    # Bước 1: Tokenize
-    tokenizer = VerilogTokenizer(source_code, path)
-    tokens = tokenizer.tokenize()
     # Yosys-like: `default_nettype none` forbids implicit nets
     if tokens.get('default_nettype', 'wire') == 'none':
         strict = True
@@ -110,72 +153,74 @@ def parse_verilog(path: str, strict: bool = False) -> Dict[str, Any]:
         netlist["attrs"]["strict_synthesis"] = True
 
     # Kiểm tra lỗi cú pháp cơ bản để trả về thông báo rõ ràng
+    scan = tokens['scan']
     if not tokens.get('module_name'):
         raise ValueError(f"Syntax error: không tìm thấy module declaration trong {path}")
-    if not tokens.get('module_body', '').strip():
+    if not scan.closed:
+        raise ValueError(f"Syntax error: thiếu 'endmodule' trong {path}")
+    if not scan.items:
         raise ValueError(f"Syntax error: thiếu 'endmodule' hoặc module body rỗng trong {path}")
-    _validate_delimiter_balance(tokens, path)
-    _validate_port_list_syntax(tokens.get('port_list', ''), path)
-    _basic_statement_validation(
-        tokens.get('module_body', ''),
-        path,
-        tokens.get('module_body_start_line', 1)
-    )
-    _validate_double_semicolon(tokens.get('module_body', ''), path, tokens.get('module_body_start_line', 1))
-    _validate_semicolon_garbage(tokens.get('module_body', ''), path, tokens.get('module_body_start_line', 1))
-    _validate_begin_end_balance(tokens.get('module_body', ''), path, tokens.get('module_body_start_line', 1))
-    _validate_end_semicolon(tokens.get('module_body', ''), path, tokens.get('module_body_start_line', 1))
-    _validate_generate_blocks(tokens.get('module_body', ''), path)
-    if strict:
-        _validate_unsupported_constructs(tokens.get('module_body', ''), path, tokens.get('module_body_start_line', 1))
+    with trace_span("parse.validate", category="parse", items=len(scan.items)):
+        _validate_delimiter_balance(scan, path)
+        _validate_port_list_syntax(tokens.get('port_list', ''), path)
+        _validate_statements(scan, path)
+        if strict:
+            _validate_unsupported_constructs(scan, path, library)
     
     # Bước 2: Extract module info
     netlist['name'] = tokens['module_name']
     
-    # Bước 3: Parse parameters và localparams trước (cần cho width calculation)
-    _parse_parameters(netlist, tokens['module_body'])
+    with trace_span("parse.declarations", category="parse"):
+        # Bước 3: Parse parameters và localparams trước (cần cho width calculation)
+        param_text = scan.text_for('parameter', 'localparam')
+        _parse_parameters(netlist, param_text)
     
-    # Validate module parameter list (#(...)) syntax to catch obvious typos early
-    _validate_param_list_syntax(tokens.get('param_list', ''), path)
+        # Validate module parameter list (#(...)) syntax to catch obvious typos early
+        _validate_param_list_syntax(tokens.get('param_list', ''), path)
 
-    # Thu thập parameter (từ header và body) để hỗ trợ width calculation và unroll for/if
-    params = _collect_parameters(tokens.get('param_list', ''), tokens['module_body'])
-    # Expose parameters for downstream validation / strict-mode checks
-    netlist.setdefault("attrs", {})
-    netlist["attrs"].setdefault("parameters", {})
-    if isinstance(params, dict):
-        netlist["attrs"]["parameters"].update(params)
+        # Thu thập parameter (từ header và body) để hỗ trợ width calculation và unroll for/if
+        params = _collect_parameters(tokens.get('param_list', ''), param_text, param_overrides)
+        # Expose parameters for downstream validation / strict-mode checks
+        netlist.setdefault("attrs", {})
+        netlist["attrs"].setdefault("parameters", {})
+        if isinstance(params, dict):
+            netlist["attrs"]["parameters"].update(params)
     
-    # Bước 3.5: Parse ports và wires (với params để tính parameterized widths)
-    _parse_port_declarations(netlist, tokens, params)
-    _parse_wire_declarations(netlist, tokens['module_body'], params)
+        # Bước 3.5: Parse ports và wires (với params để tính parameterized widths)
+        _parse_port_declarations(netlist, tokens, params)
+        _parse_wire_declarations(netlist, scan.text_for('wire', 'reg'), params)
 
     node_builder = NodeBuilder()
 
-    # Bước 3.75: Parse generate blocks (for/if) và lấy phần còn lại cho assign
-    assign_body = _parse_generate_blocks(tokens['module_body'], node_builder, params)
+    # Bước 3.75: Parse generate blocks (for/if); assign bên trong generate không parse lại ở bước assign
+    _parse_generate_blocks(scan.text_for('generate'), node_builder, params)
     
     # Bước 4: Parse functions và tasks trước (cần để parse calls)
-    _parse_functions(netlist, tokens['module_body'], params)
-    _parse_tasks(netlist, tokens['module_body'])
+    with trace_span("parse.functions", category="parse"):
+        _parse_functions(netlist, scan.text_for('function'), params)
+        _parse_tasks(netlist, scan.text_for('task'))
     
     # Bước 4.5: Parse assign statements, always blocks, case statements, và gates
-    _parse_always_blocks(netlist, tokens['module_body'], node_builder)
-    _parse_case_statements(netlist, tokens['module_body'], node_builder)
-    _parse_wire_initializers_to_nodes(netlist, node_builder)  # wire x = expr; -> nodes (trước assign)
-    _parse_assign_statements(netlist, assign_body, node_builder)
-    _parse_gate_instantiations(netlist, tokens['module_body'], node_builder)
-    _parse_module_instantiations(netlist, tokens['module_body'], node_builder)
+    with trace_span("parse.always", category="parse"):
+        _parse_always_blocks(netlist, scan.text_for('always'), node_builder)
+        _parse_case_statements(netlist, scan.text_for('case', 'casex', 'casez'), node_builder)
+        _parse_wire_initializers_to_nodes(netlist, node_builder)  # wire x = expr; -> nodes (trước assign)
+    with trace_span("parse.assign", category="parse"):
+        _parse_assign_statements(netlist, scan.text_for('assign', exclude=('generate',)), node_builder)
+    with trace_span("parse.instances", category="parse"):
+        _parse_gate_instantiations(netlist, scan.text_for(*STANDARD_GATES), node_builder)
+        _parse_module_instantiations(netlist, scan, node_builder, params, library)
     
     # Bước 5: Lấy nodes từ builder
     netlist['nodes'] = node_builder.get_nodes()
     netlist['attrs']['output_mapping'].update(node_builder.get_output_mapping())
     
     # Bước 6: Generate wire connections
-    if AUTO_GENERATE_WIRES:
-        wires = WireGenerator.generate_wires(netlist['nodes'])
-        netlist['wires'] = wires
-        WireGenerator.add_wire_statistics(netlist, wires)
+    with trace_span("parse.wires", category="parse"):
+        if AUTO_GENERATE_WIRES:
+            wires = WireGenerator.generate_wires(netlist['nodes'])
+            netlist['wires'] = wires
+            WireGenerator.add_wire_statistics(netlist, wires)
     
     # Bước 7: Compute statistics
     if COMPUTE_STATISTICS:
@@ -191,75 +236,91 @@ def parse_verilog(path: str, strict: bool = False) -> Dict[str, Any]:
     return netlist
 
 
-def _validate_unsupported_constructs(module_body: str, path: str, base_line: int) -> None:
+def _validate_unsupported_constructs(scan: ModuleScan, path: str, library=None) -> None:
     """
     When strict mode is enabled, enforce a MyLogic educational subset so that
     out-of-scope Verilog does not "half-parse" and later produce confusing synthesis warnings.
 
     This is intentionally conservative: we error early with a clear message.
-    """
-    text = remove_inline_comments(module_body or "")
-    text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
-
-    # Functions / tasks
-    if re.search(r"\bfunction\b", text, flags=re.IGNORECASE):
+    Facts are collected in one walk over the body token stream; the first
+    violated rule (in the order below) is reported.
+    """
+    found: Set[str] = set()
+    p3 = p2 = p1 = None          # 3 token liền trước (kind, text)
+    pending_binop = False
+    for tok in scan.body_tokens():
+        kind, text = tok.kind, tok.text
+        if pending_binop:
+            pending_binop = False
+            if kind in ('ident', 'number'):
+                found.add('muldiv')
+        if kind == 'ident':
+            if text in ('function', 'task', 'generate', 'genvar', 'techmap', 'signed', 'unsigned'):
+                found.add(text)
+            elif text in ('posedge', 'negedge') and p1 == ('op', '(') and p2 == ('op', '@'):
+                found.add('sequential')
+        elif kind == 'op':
+            if text == ']' and p3 is not None and p3[0] == 'ident' and p2 == ('op', '[') and p1[0] == 'ident':
+                found.add('array_index')
+            elif text == '{' and p2 == ('op', '{') and p1[0] in ('ident', 'number'):
+                found.add('replication')
+            elif text in ('<<', '>>', '>>>', '<<<', '<<=', '>>=', '<<<=', '>>>='):
+                found.add('shift')
+            elif text in ('*', '/', '%') and p1 is not None and p1[0] in ('ident', 'number'):
+                pending_binop = True
+        p3, p2, p1 = p2, p1, (kind, text)
+
+    if 'function' in found:
         raise ParserError(f"Unsupported in strict mode: function definitions in {path}")
-    if re.search(r"\btask\b", text, flags=re.IGNORECASE):
+    if 'task' in found:
         raise ParserError(f"Unsupported in strict mode: task definitions in {path}")
-
-    # Sequential logic: always @(posedge/negedge ...)
-    if re.search(r"@\s*\(\s*(?:posedge|negedge)\b", text, flags=re.IGNORECASE):
+    if 'sequential' in found:
         raise ParserError(f"Unsupported in strict mode: sequential always @(posedge/negedge) in {path}")
-
     # Generate / case statements are currently out-of-scope for the strict combinational subset
-    if re.search(r"\bgenerate\b", text, flags=re.IGNORECASE):
+    if 'generate' in found:
         raise ParserError(f"Unsupported in strict mode: generate blocks in {path}")
     # SystemVerilog-style generate can omit 'generate' keyword; catch common markers.
-    if re.search(r"\bgenvar\b", text, flags=re.IGNORECASE):
+    if 'genvar' in found:
         raise ParserError(f"Unsupported in strict mode: genvar/generate-for constructs in {path}")
-    # case statements are supported for combinational subset (always @(*) case ...)
-    # casex/casez are still out-of-scope (treated as unsupported below when parsed).
 
     # Memory arrays / multi-dimensional arrays like: reg [7:0] mem [0:15];
-    if re.search(r"\b(?:reg|wire)\b[^\n;]*\[[^\]]+\]\s*\w+\s*\[[^\]]+\]\s*;", text, flags=re.IGNORECASE):
+    if _MEMORY_DECL_PATTERN.search(scan.text_for('reg', 'wire')):
         raise ParserError(f"Unsupported in strict mode: memory/array declarations in {path}")
     # Array indexing usage like: mem[i] (variable index)
-    if re.search(r"\b[A-Za-z_]\w*\s*\[\s*[A-Za-z_]\w*\s*\]", text):
+    if 'array_index' in found:
         raise ParserError(f"Unsupported in strict mode: array indexing with variable index in {path}")
 
-    # Module instantiation (non-primitive): <mod> <inst>(...);
-    # We allow gate primitives handled elsewhere (and/or/xor/not/nand/nor/xnor/buf).
-    primitives = {"and", "or", "xor", "xnor", "nand", "nor", "not", "buf"}
-    for m in re.finditer(r"^\s*([A-Za-z_]\w*)\s+([A-Za-z_]\w*)\s*(?:#\s*\(|\()", text, flags=re.MULTILINE):
-        mod = m.group(1).lower()
-        if mod in primitives:
-            continue
-        if mod in {"module", "endmodule"}:
-            continue
-        raise ParserError(f"Unsupported in strict mode: module instantiation '{m.group(1)} {m.group(2)}(...)' in {path}")
+    # Module instantiation (non-primitive): <mod> <inst>(...); trừ module có trong library (được elaborate)
+    # Gate primitives (and/or/xor/...) là keyword nên không nằm trong scan.instances.
+    for i in scan.instances:
+        m = _INSTANCE_HEAD_PATTERN.match(scan.item_text(i))
+        if m and (library is None or m.group(1) not in library):
+            raise ParserError(f"Unsupported in strict mode: module instantiation '{m.group(1)} {m.group(2)}(...)' in {path}")
 
     # Technology mapping attributes / directives (out of scope)
-    if re.search(r"\btechmap\b", text, flags=re.IGNORECASE):
+    if 'techmap' in found:
         raise ParserError(f"Unsupported in strict mode: technology mapping constructs in {path}")
 
     # Replication operator {N{a}} or {4{a}} (out of scope unless explicitly implemented)
-    if re.search(r"\{\s*(?:\d+|[A-Za-z_]\w*)\s*\{", text):
+    if 'replication' in found:
         raise ParserError(f"Unsupported in strict mode: replication operator '{{N{{...}}}}' in {path}")
 
     # signed/unsigned (out of scope for now)
-    if re.search(r"\bsigned\b|\bunsigned\b", text, flags=re.IGNORECASE):
+    if 'signed' in found or 'unsigned' in found:
         raise ParserError(f"Unsupported in strict mode: signed/unsigned types in {path}")
 
     # Operators not supported in strict subset (avoid misleading outputs).
-    # Important: ignore "@(*)" (combinational sensitivity) when checking for '*'.
-    text_no_sens = re.sub(r"@\s*\(\s*\*\s*\)", "@()", text)
-    if re.search(r"<<|>>>|>>", text_no_sens):
+    if 'shift' in found:
         raise ParserError(f"Unsupported in strict mode: shift operators (<<, >>, >>>) in {path}")
-    # Multiplication/division/modulo only when used as a binary operator in an expression
-    if re.search(r"(?:\b[\w\]']+\b)\s*[%*/]\s*(?:\b[\w\[]+\b)", text_no_sens):
+    # Multiplication/division/modulo only when used as a binary operator (không tính @(*))
+    if 'muldiv' in found:
         raise ParserError(f"Unsupported in strict mode: mul/div/mod operators (*, /, %) in {path}")
 
 
+_MEMORY_DECL_PATTERN = re.compile(r"\b(?:reg|wire)\b[^\n;]*\[[^\]]+\]\s*\w+\s*\[[^\]]+\]\s*;")
+_INSTANCE_HEAD_PATTERN = re.compile(r"\s*([A-Za-z_]\w*)\s+([A-Za-z_]\w*)\s*(?:#\s*\(|\()")
+
+
 def _validate_param_list_syntax(param_list: str, path: str) -> None:
     """
     Bắt một số lỗi cú pháp phổ biến trong module parameter list (#(...)):
@@ -296,70 +357,83 @@ def _validate_port_list_syntax(port_list: str, path: str) -> None:
         raise ValueError(f"Syntax error: invalid port list (trailing comma) in {path}")
 
 
-def _validate_delimiter_balance(tokens: Dict[str, Any], path: str) -> None:
+def _validate_delimiter_balance(scan: ModuleScan, path: str) -> None:
     """
     Catch common "typo" syntax errors early:
-    - Unbalanced (), [], {}
-    We validate over module header pieces + body after removing comments.
+    - Unbalanced {} (() và [] đã được tokenizer báo trước khi tìm module)
+    The lexer tracks one delimiter stack over the whole token stream (comments excluded).
     """
-    parts = [
-        tokens.get('param_list', '') or '',
-        tokens.get('port_list', '') or '',
-        tokens.get('module_body', '') or '',
-    ]
-    text = "\n".join(parts)
-    text = remove_inline_comments(text)
-    # Remove block comments if any survived
-    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
-
-    stack = []
-    pairs = {')': '(', ']': '[', '}': '{'}
-    opens = set(pairs.values())
-    closes = set(pairs.keys())
-    for ch in text:
-        if ch in opens:
-            stack.append(ch)
-        elif ch in closes:
-            if not stack or stack[-1] != pairs[ch]:
-                raise ValueError(f"Syntax error: unbalanced delimiters in {path}")
-            stack.pop()
-    if stack:
+    if scan.delimiter_error:
         raise ValueError(f"Syntax error: unbalanced delimiters in {path}")
 
 
-def _validate_begin_end_balance(module_body: str, path: str, base_line: int) -> None:
+def _validate_statements(scan: ModuleScan, path: str) -> None:
     """
-    Educational check: catch missing 'end' / extra 'end' for 'begin...end'.
-    This is a lightweight heuristic; it won't try to parse full Verilog.
+    Báo các lỗi cú pháp mà lexer ghi nhận trong module body, theo thứ tự:
+    thiếu 'assign', ';;', rác sau ';', begin/end lệch, 'end;', thiếu 'endgenerate'.
     """
-    text = remove_inline_comments(module_body or "")
-    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
-    # Count 'begin' and 'end' as whole words; ignore 'endmodule', 'endcase', 'endgenerate'
-    begins = [m.start() for m in re.finditer(r'\bbegin\b', text)]
-    ends = [m.start() for m in re.finditer(r'\bend\b', text)]
-    # Filter out structured end keywords
-    ends_struct = [m.start() for m in re.finditer(r'\bend(case|generate|module)\b', text)]
-    # Remove structured ends from plain 'end' count (they were counted by \bend\b too)
-    ends_plain = [p for p in ends if p not in ends_struct]
-    if len(begins) != len(ends_plain):
+    problems = scan.problems
+
+    # Dòng có dấu '=' nhưng không phải assign/khai báo (ngoài always/generate/function/task)
+    missing = problems.get('missing_assign')
+    compound = _find_missing_assign_in_compound_items(scan)
+    if compound is not None and (missing is None or compound < scan.line(missing)):
+        line_no = compound
+    else:
+        line_no = scan.line(missing) if missing is not None else None
+    if line_no is not None:
+        raise ValueError(
+            f"Syntax error: thiếu 'assign' hoặc statement không hợp lệ tại dòng {line_no} của {path}"
+        )
+
+    # Gõ thừa ';' kiểu ';;' - tool giáo dục nên báo lỗi để người học sửa.
+    # Keep message ASCII-friendly for Windows cp1252 consoles
+    if 'double_semicolon' in problems:
+        line_no = scan.line(problems['double_semicolon'])
+        raise ValueError(f"Syntax error: extra ';' (found ';;') at line {line_no} in {path}")
+
+    # Rác dính ngay sau ';', vd. ';-' hoặc ';,' hoặc ';a'
+    if 'semicolon_garbage' in problems:
+        offset = problems['semicolon_garbage']
+        bad = scan.source[offset:offset + 8].replace('\n', '\\n')
+        raise ValueError(
+            f"Syntax error: invalid token after ';' near {bad!r} at line {scan.line(offset)} in {path}"
+        )
+
+    # Educational check: catch missing 'end' / extra 'end' for 'begin...end'
+    if scan.begin_count != scan.end_count:
         raise ValueError(
-            f"Syntax error: begin/end mismatch (begin={len(begins)} end={len(ends_plain)}) in {path}"
+            f"Syntax error: begin/end mismatch (begin={scan.begin_count} end={scan.end_count}) in {path}"
         )
 
+    # Viết `end;` thay vì `end` (endcase/endgenerate/endmodule là token khác nên không bị bắt)
+    if 'end_semicolon' in problems:
+        line_no = scan.line(problems['end_semicolon'])
+        raise ValueError(f"Syntax error: 'end;' is invalid (use 'end' without ';') at line {line_no} in {path}")
+
+    if 'generate_unclosed' in problems:
+        raise ValueError(f"Syntax error: thiếu 'endgenerate' trong {path}")
+
 
-def _validate_end_semicolon(module_body: str, path: str, base_line: int) -> None:
+def _find_missing_assign_in_compound_items(scan: ModuleScan):
     """
-    Catch typo: writing `end;` instead of `end` (common beginner mistake).
-    Do not flag structured keywords like endcase/endgenerate/endmodule.
+    Dòng đầu tiên có '=' nhưng không mở đầu bằng keyword hợp lệ, trong các khối
+    cấp module không phải code thủ tục (vd. for/if/begin của generate không có
+    từ khóa 'generate'). Statement đơn đã được lexer kiểm tra theo token.
     """
-    text = remove_inline_comments(module_body or "")
-    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
-    # Find occurrences of "end;" as a whole word followed by semicolon
-    for m in re.finditer(r'\bend\s*;', text):
-        # Check if this "end" is actually part of endcase/endgenerate/endmodule (it won't match due to word boundary)
-        prefix = text[:m.start()]
-        line_no = prefix.count('\n') + base_line + 1
-        raise ValueError(f"Syntax error: 'end;' is invalid (use 'end' without ';') at line {line_no} in {path}")
+    prefixes = tuple(ASSIGN_PREFIXES)
+    for i, (kw, start, _end, _comment, _eq, mode) in enumerate(scan.items):
+        if mode == SIMPLE_ITEM or kw in PROCEDURAL_ITEMS:
+            continue
+        text = scan.item_text(i)
+        for lineno, raw in enumerate(text.splitlines(), start=scan.line(start)):
+            line = raw.strip()
+            # Bỏ qua nonblocking (<=) vì thuộc procedural
+            if not line or '<=' in line:
+                continue
+            if '=' in line and not line.startswith(prefixes):
+                return lineno
+    return None
 
 
 def _strict_check_undeclared_signals(netlist: Dict[str, Any], path: str) -> None:
@@ -453,107 +527,6 @@ def _strict_check_undeclared_signals(netlist: Dict[str, Any], path: str) -> None
         )
 
 
-def _basic_statement_validation(module_body: str, path: str, base_line: int) -> None:
-    """
-    Kiểm tra nhanh một số lỗi cú pháp phổ biến:
-    - Dòng có dấu '=' nhưng không có 'assign' ở đầu và thiếu ';'
-    - Dòng có '=' nhưng thiếu ';'
-    """
-    suspicious_prefixes = (
-        "assign", "wire", "reg", "input", "output",
-        "parameter", "localparam", "always", "if",
-        "for", "case", "while", "generate", "end", "module"
-    )
-
-    # Bỏ qua các dòng nằm bên trong always block, generate block, function, và task để không false-positive
-    from .constants import ALWAYS_PATTERN, GENERATE_PATTERN, FUNCTION_PATTERN, TASK_PATTERN
-    skip_lines = set()
-
-    def _mark_skip(pattern):
-        for m in pattern.finditer(module_body):
-            start_idx, end_idx = m.span()
-            prefix = module_body[:start_idx]
-            start_line = prefix.count('\n') + base_line + 1
-            block_lines = module_body[start_idx:end_idx].count('\n') + 1
-            for lno in range(start_line, start_line + block_lines):
-                skip_lines.add(lno)
-
-    _mark_skip(ALWAYS_PATTERN)
-    _mark_skip(GENERATE_PATTERN)
-    _mark_skip(FUNCTION_PATTERN)
-    _mark_skip(TASK_PATTERN)
-
-    for lineno, raw in enumerate(module_body.splitlines(), start=base_line + 1):
-        if lineno in skip_lines:
-            continue
-        line = raw.strip()
-        if not line or line.startswith("//"):
-            continue
-        has_eq = "=" in line
-        has_semicolon = ";" in line
-        starts_with_kw = line.startswith(suspicious_prefixes)
-        has_nonblocking = "<=" in line
-
-        # Bỏ qua nonblocking (<=) vì thuộc procedural
-        if has_nonblocking:
-            continue
-
-        # Nếu có dấu '=' mà không bắt đầu bằng keyword hợp lệ → thiếu assign / statement không hợp lệ
-        if has_eq and not starts_with_kw:
-            raise ValueError(
-                f"Syntax error: thiếu 'assign' hoặc statement không hợp lệ tại dòng {lineno} của {path}"
-            )
-
-        # Thiếu assign hoặc thiếu ; trên dòng gán đơn giản
-        if has_eq and not starts_with_kw and not has_semicolon:
-            raise ValueError(
-                f"Syntax error: thiếu 'assign' hoặc ';' tại dòng {lineno} của {path}"
-            )
-
-
-def _validate_double_semicolon(module_body: str, path: str, base_line: int) -> None:
-    """
-    Bắt lỗi gõ thừa ';' kiểu ';;' (rất hay gặp khi học Verilog).
-    Dù Verilog có thể cho phép empty statement, tool giáo dục nên báo lỗi để người học sửa.
-    """
-    cleaned = remove_inline_comments(module_body or "")
-    m = re.search(r';\s*;', cleaned)
-    if not m:
-        return
-    prefix = cleaned[:m.start()]
-    line_no = prefix.count('\n') + base_line + 1
-    # Keep message ASCII-friendly for Windows cp1252 consoles
-    raise ValueError(f"Syntax error: extra ';' (found ';;') at line {line_no} in {path}")
-
-
-def _validate_semicolon_garbage(module_body: str, path: str, base_line: int) -> None:
-    """
-    Catch common typo: garbage right after semicolon, e.g. ';-' or ';,' or ';a'.
-    Educational: require statement terminator ';' to be followed by whitespace/newline/comment only.
-    """
-    cleaned = remove_inline_comments(module_body or "")
-    cleaned = re.sub(r'/\*.*?\*/', '', cleaned, flags=re.DOTALL)
-    m = re.search(r';[^\s;]', cleaned)
-    if not m:
-        return
-    prefix = cleaned[:m.start()]
-    line_no = prefix.count('\n') + base_line + 1
-    bad = cleaned[m.start():m.start() + 8].replace('\n', '\\n')
-    raise ValueError(f"Syntax error: invalid token after ';' near {bad!r} at line {line_no} in {path}")
-
-
-def _validate_generate_blocks(module_body: str, path: str) -> None:
-    """
-    Kiểm tra generate/endgenerate: nếu có từ khóa generate nhưng không khớp endgenerate -> báo lỗi.
-    """
-    from .constants import GENERATE_PATTERN
-    found = False
-    for _ in GENERATE_PATTERN.finditer(module_body):
-        found = True
-    if "generate" in module_body and not found:
-        raise ValueError(f"Syntax error: thiếu 'endgenerate' trong {path}")
-
-
 def _parse_generate_blocks(module_body: str, node_builder: NodeBuilder, params: Dict[str, int]) -> str:
     """
     Parse generate blocks (for/if) ở mức đơn giản:
@@ -580,7 +553,8 @@ def _parse_generate_blocks(module_body: str, node_builder: NodeBuilder, params:
     return cleaned
 
 
-def _collect_parameters(param_list: str, module_body: str) -> Dict[str, int]:
+def _collect_parameters(param_list: str, module_body: str,
+                        overrides: Dict[str, int] = None) -> Dict[str, int]:
     """
     Thu thập parameter/localparam, hỗ trợ biểu thức số học đơn giản.
     
@@ -589,8 +563,11 @@ def _collect_parameters(param_list: str, module_body: str) -> Dict[str, int]:
     - parameter WIDTH = 16, DEPTH = 32;
     - parameter SIZE = N * 2;
     - localparam MAX = WIDTH - 1;
+
+    ``overrides`` (``#(.N(4))`` của instance) thay giá trị mặc định; các
+    parameter phụ thuộc được tính lại từ giá trị ghi đè.
     """
-    params: Dict[str, int] = {}
+    params: Dict[str, int] = dict(overrides or {})
     import re
     from .constants import PARAMETER_PATTERN, LOCALPARAM_PATTERN
 
@@ -628,7 +605,7 @@ def _collect_parameters(param_list: str, module_body: str) -> Dict[str, int]:
     for m in HEADER_PARAM_PATTERN.finditer(header_text):
         name = (m.group(1) or "").strip()
         value_str = (m.group(2) or "").strip()
-        if not name:
+        if not name or name in params:
             continue
         try:
             params[name] = eval_param_value(value_str, params)
@@ -854,14 +831,14 @@ def _parse_port_declarations(netlist: Dict, tokens: Dict, params: Dict[str, int]
         params: Dictionary chứa parameter values (cho parameterized widths)
     """
     port_list = tokens['port_list']
-    module_body = tokens['module_body']
+    scan = tokens['scan']
     params = params or {}
     
     # Parse inputs
-    _parse_input_ports(netlist, port_list, module_body, params)
+    _parse_input_ports(netlist, port_list, scan.text_for('input'), params)
     
     # Parse outputs
-    _parse_output_ports(netlist, port_list, module_body, params)
+    _parse_output_ports(netlist, port_list, scan.text_for('output'), params)
 
 
 def _parse_input_ports(netlist: Dict, port_list: str, module_body: str, params: Dict[str, int] = None):
@@ -871,6 +848,8 @@ def _parse_input_ports(netlist: Dict, port_list: str, module_body: str, params:
     from .constants import SIGNED_KEYWORD, UNSIGNED_KEYWORD
     params = params or {}
     signed_signals = netlist['attrs'].setdefault('signed_signals', [])
+    signed_seen = set(signed_signals)
+    declared = set(netlist['inputs'])
     
     # Helper để parse một declaration line
     def parse_declaration(match, is_vector: bool, is_signed: bool = False):
@@ -889,11 +868,13 @@ def _parse_input_ports(netlist: Dict, port_list: str, module_body: str, params:
             signal = re.sub(r'^\s*(reg|wire)\b\s*', '', signal).strip()
             if not signal:
                 continue
-            if signal not in netlist['inputs']:
+            if signal not in declared:
+                declared.add(signal)
                 netlist['inputs'].append(signal)
             netlist['attrs']['vector_widths'][signal] = width
             if is_signed:
-                if signal not in signed_signals:
+                if signal not in signed_seen:
+                    signed_seen.add(signal)
                     signed_signals.append(signal)
     
     # 1. Vector inputs từ port list
@@ -928,6 +909,8 @@ def _parse_output_ports(netlist: Dict, port_list: str, module_body: str, params:
     from .constants import SIGNED_KEYWORD, UNSIGNED_KEYWORD
     params = params or {}
     signed_signals = netlist['attrs'].setdefault('signed_signals', [])
+    signed_seen = set(signed_signals)
+    declared = set(netlist['outputs'])
     
     # Helper để parse một declaration line
     def parse_declaration(match, is_vector: bool, is_signed: bool = False):
@@ -947,11 +930,13 @@ def _parse_output_ports(netlist: Dict, port_list: str, module_body: str, params:
             signal = re.sub(r'^\s*(reg|wire)\b\s*', '', signal).strip()
             if not signal:
                 continue
-            if signal not in netlist['outputs']:
+            if signal not in declared:
+                declared.add(signal)
                 netlist['outputs'].append(signal)
             netlist['attrs']['vector_widths'][signal] = width
             if is_signed:
-                if signal not in signed_signals:
+                if signal not in signed_seen:
+                    signed_seen.add(signal)
                     signed_signals.append(signal)
     
     # 1. Vector outputs từ port list
@@ -1040,10 +1025,26 @@ def _parse_wire_declarations(netlist: Dict, module_body: str, params: Dict[str,
     )
     params = params or {}
     signed_signals = netlist['attrs'].setdefault('signed_signals', [])
+    wires = netlist['wires']
+    # Set song song với list để kiểm tra trùng O(1) (netlist lớn có hàng trăm nghìn wire)
+    wire_set = set(wires)
+    signed_set = set(signed_signals)
     
     # Helper để xử lý signed
     def check_signed(decl_text: str) -> bool:
         return bool(SIGNED_KEYWORD.search(decl_text))
+
+    def add_wire(entry: str) -> bool:
+        if entry in wire_set:
+            return False
+        wire_set.add(entry)
+        wires.append(entry)
+        return True
+
+    def mark_signed(signal: str) -> None:
+        if signal not in signed_set:
+            signed_set.add(signal)
+            signed_signals.append(signal)
     
     # Pattern 1: wire [3:0] temp = assignment;
     for match in WIRE_VECTOR_ASSIGN_PATTERN.finditer(module_body):
@@ -1056,12 +1057,11 @@ def _parse_wire_declarations(netlist: Dict, module_body: str, params: Dict[str,
             signal = signal.strip()
             if signal:
                 wire_entry = f"{signal} = {assignment.strip()}"
-                if wire_entry not in netlist['wires']:
-                    netlist['wires'].append(wire_entry)
+                if add_wire(wire_entry):
                     netlist['attrs']['vector_widths'][wire_entry] = width
                     netlist['attrs']['vector_widths'][signal] = width
-                    if is_signed and signal not in signed_signals:
-                        signed_signals.append(signal)
+                    if is_signed:
+                        mark_signed(signal)
     
     # Pattern 2: wire temp = assignment; (scalar)
     for match in WIRE_SCALAR_ASSIGN_PATTERN.finditer(module_body):
@@ -1072,12 +1072,11 @@ def _parse_wire_declarations(netlist: Dict, module_body: str, params: Dict[str,
             signal = signal.strip()
             if signal:
                 wire_entry = f"{signal} = {assignment.strip()}"
-                if wire_entry not in netlist['wires']:
-                    netlist['wires'].append(wire_entry)
+                if add_wire(wire_entry):
                     netlist['attrs']['vector_widths'][wire_entry] = 1
                     netlist['attrs']['vector_widths'][signal] = 1
-                    if is_signed and signal not in signed_signals:
-                        signed_signals.append(signal)
+                    if is_signed:
+                        mark_signed(signal)
     
     # Pattern 3: wire [3:0] temp; (declaration only)
     for match in WIRE_VECTOR_PATTERN.finditer(module_body):
@@ -1088,11 +1087,10 @@ def _parse_wire_declarations(netlist: Dict, module_body: str, params: Dict[str,
         
         for signal in split_signal_list(signals_str):
             signal = signal.strip()
-            if signal and signal not in netlist['wires']:
-                netlist['wires'].append(signal)
+            if signal and add_wire(signal):
                 netlist['attrs']['vector_widths'][signal] = width
-                if is_signed and signal not in signed_signals:
-                    signed_signals.append(signal)
+                if is_signed:
+                    mark_signed(signal)
     
     # Pattern 4: wire temp; (scalar declaration)
     for match in WIRE_SCALAR_PATTERN.finditer(module_body):
@@ -1101,11 +1099,10 @@ def _parse_wire_declarations(netlist: Dict, module_body: str, params: Dict[str,
         is_signed = check_signed(decl_text)
         for signal in split_signal_list(signals_str):
             signal = signal.strip()
-            if signal and signal not in netlist['wires']:
-                netlist['wires'].append(signal)
+            if signal and add_wire(signal):
                 netlist['attrs']['vector_widths'][signal] = 1
-                if is_signed and signal not in signed_signals:
-                    signed_signals.append(signal)
+                if is_signed:
+                    mark_signed(signal)
     
     # Pattern 5: Memory declarations (reg [width-1:0] mem [depth-1:0];)
     from .constants import MEMORY_PATTERN
@@ -1133,12 +1130,11 @@ def _parse_wire_declarations(netlist: Dict, module_body: str, params: Dict[str,
         }
         
         # Memory cũng là một signal (có thể index)
-        if mem_name not in netlist['wires']:
-            netlist['wires'].append(mem_name)
+        add_wire(mem_name)
         netlist['attrs']['vector_widths'][mem_name] = width
         netlist['attrs'].setdefault('memory_signals', []).append(mem_name)
-        if is_signed and mem_name not in signed_signals:
-            signed_signals.append(mem_name)
+        if is_signed:
+            mark_signed(mem_name)
     
     # Pattern 6: reg declarations (giống wire, hỗ trợ signed/unsigned và parameterized widths)
     # Skip nếu đã match memory pattern
@@ -1163,12 +1159,11 @@ def _parse_wire_declarations(netlist: Dict, module_body: str, params: Dict[str,
             signal = signal.strip()
             if signal:
                 # Regs có thể không là wires, nhưng vẫn cần track
-                if signal not in netlist['wires']:
-                    netlist['wires'].append(signal)
+                add_wire(signal)
                 netlist['attrs']['vector_widths'][signal] = width
                 netlist['attrs'].setdefault('reg_signals', []).append(signal)
-                if is_signed and signal not in signed_signals:
-                    signed_signals.append(signal)
+                if is_signed:
+                    mark_signed(signal)
 
 
 # ============================================================================
@@ -1620,6 +1615,18 @@ def _parse_assign_statements(netlist: Dict, module_body: str, node_builder: Node
     - Special: cond ? a : b, {a, b}, a[3:0]
     - Simple: wire = signal
     """
+    # Lấy params từ netlist nếu có (một lần cho mọi assign)
+    params = netlist.get('attrs', {}).get('parameters', {})
+    # Convert string params to int nếu có thể
+    int_params = {}
+    for k, v in params.items():
+        if isinstance(v, int):
+            int_params[k] = v
+        elif isinstance(v, str):
+            try:
+                int_params[k] = _eval_int(v, {})
+            except:
+                pass
     
     for match in ASSIGN_PATTERN.finditer(module_body):
         lhs, rhs = match.groups()
@@ -1627,18 +1634,6 @@ def _parse_assign_statements(netlist: Dict, module_body: str, node_builder: Node
         rhs = rhs.strip()
         
         # Dispatch đến parser thích hợp dựa trên operators
-        # Lấy params từ netlist nếu có
-        params = netlist.get('attrs', {}).get('parameters', {})
-        # Convert string params to int nếu có thể
-        int_params = {}
-        for k, v in params.items():
-            if isinstance(v, int):
-                int_params[k] = v
-            elif isinstance(v, str):
-                try:
-                    int_params[k] = _eval_int(v, {})
-                except:
-                    pass
         _dispatch_assign_parser(lhs, rhs, node_builder, int_params)
 
 
@@ -1648,12 +1643,6 @@ def _dispatch_assign_parser(lhs: str, rhs: str, node_builder: NodeBuilder, param
     
     Kiểm tra operators theo thứ tự ưu tiên.
     """
-    from ..operations.arithmetic import detect_arithmetic_operator
-    from ..operations.bitwise import detect_bitwise_operator
-    from ..operations.logical import detect_logical_operator
-    from ..operations.comparison import detect_comparison_operator
-    from ..operations.shift import detect_shift_operator
-    
     # Normalize: strip one layer of outer parentheses to help operator detectors/parsers
     rhs = (rhs or "").strip()
     if rhs.startswith('(') and rhs.endswith(')'):
@@ -1672,8 +1661,6 @@ def _dispatch_assign_parser(lhs: str, rhs: str, node_builder: NodeBuilder, param
     
     # 1. Special operations (check trước vì phức tạp nhất)
     # Check replication trước concatenation (vì replication cũng dùng {})
-    from ..operations.special import is_replication, parse_replication
-    
     if is_replication(rhs):
         parse_replication(node_builder, lhs, rhs, params)
         return
@@ -1740,7 +1727,6 @@ def _dispatch_assign_parser(lhs: str, rhs: str, node_builder: NodeBuilder, param
                 inner = operand[1:-1].strip()
                 comp_op = detect_comparison_operator(inner)
                 if comp_op:
-                    from ..operations.comparison import parse_comparison_operation
                     tmp = f"{lhs}__cmp"
                     parse_comparison_operation(node_builder, comp_op, tmp, inner)
                     not_id = node_builder.create_operation_node("NOT", [tmp])
@@ -1787,14 +1773,12 @@ def _dispatch_assign_parser(lhs: str, rhs: str, node_builder: NodeBuilder, param
     # 5. Shift operations (check trước comparison vì >> có thể nhầm với >)
     shift_op = detect_shift_operator(rhs)
     if shift_op:
-        from ..operations.shift import parse_shift_operation
         parse_shift_operation(node_builder, shift_op, lhs, rhs)
         return
     
     # 6. Comparison operations
     comp_op = detect_comparison_operator(rhs)
     if comp_op:
-        from ..operations.comparison import parse_comparison_operation
         parse_comparison_operation(node_builder, comp_op, lhs, rhs)
         return
     
@@ -1833,7 +1817,6 @@ def _dispatch_assign_parser(lhs: str, rhs: str, node_builder: NodeBuilder, param
                 op_id = node_builder.create_operation_node(node_type, [left_tmp, right_tmp])
                 node_builder.create_buffer_node(op_id, lhs)
                 return
-        from ..operations.logical import parse_logical_operation
         parse_logical_operation(node_builder, logical_op, lhs, rhs)
         return
     
@@ -1868,14 +1851,12 @@ def _dispatch_assign_parser(lhs: str, rhs: str, node_builder: NodeBuilder, param
             return
         
         # Binary bitwise operations
-        from ..operations.bitwise import parse_bitwise_operation
         parse_bitwise_operation(node_builder, bitwise_op, lhs, rhs)
         return
     
     # 9. Arithmetic operations
     arith_op = detect_arithmetic_operator(rhs)
     if arith_op:
-        from ..operations.arithmetic import parse_arithmetic_operation
         parse_arithmetic_operation(node_builder, arith_op, lhs, rhs)
         return
     
@@ -1903,7 +1884,15 @@ def _parse_gate_instantiations(netlist: Dict, module_body: str, node_builder: No
             node_builder.create_gate_node(gate_type, inst_name, inputs, output)
 
 
-def _parse_module_instantiations(netlist: Dict, module_body: str, node_builder: NodeBuilder):
+_INSTANCE_TYPE_PATTERN = re.compile(r'\s*([A-Za-z_][\w$]*)\s*')
+_INSTANCE_NAME_PATTERN = re.compile(r'\s*(?:([A-Za-z_][\w$]*)\s*(\[[^\]]*\])?\s*)?\(')
+_NAMED_CONNECTION_PATTERN = re.compile(r'\.\s*([A-Za-z_][\w$]*)\s*(?:\((.*)\))?\s*$', re.DOTALL)
+_LVALUE_PATTERN = re.compile(r'([A-Za-z_]\w*)\s*(?:\[\s*([^\]:]+?)\s*(?::\s*([^\]]+?)\s*)?\])?')
+_CONSTANT_PATTERN = re.compile(r"(?:\d+\s*)?'[sS]?[bBoOdDhH]\s*[0-9a-fA-FxXzZ_?]+|\d+")
+
+
+def _parse_module_instantiations(netlist: Dict, scan: ModuleScan, node_builder: NodeBuilder,
+                                 params: Dict[str, int] = None, library=None):
     """
     Parse module instantiations với hỗ trợ đầy đủ như YosysHQ.
     
@@ -1911,55 +1900,234 @@ def _parse_module_instantiations(netlist: Dict, module_body: str, node_builder:
     - Ordered ports: module_inst inst1 (a, b, c);
     - Named ports: module_inst inst1 (.port1(a), .port2(b));
     - Mixed: module_inst inst1 (a, .port2(b), c);
+    - Parameter overrides: module_inst #(.W(8)) inst1 (...); module_inst #(8) inst1 (...);
+    - Nhiều instance một statement: module_inst u1 (...), u2 (...);
+    
+    Instance của module có trong ``library`` được elaborate (module con parse
+    một lần cho mỗi bộ tham số) và gắn ``module_key`` + port bindings vào node
+    MODULE để synthesis ghép AIG của module con; module lạ giữ node MODULE mờ.
     
     Args:
         netlist: Netlist dictionary
-        module_body: Module body content
+        scan: ``ModuleScan`` của module
         node_builder: NodeBuilder instance
+        params: Parameter của module (để eval range/override)
+        library: ``ModuleLibrary`` (optional)
     """
-    from .constants import (
-        MODULE_INST_PATTERN, NAMED_PORT_PATTERN, STANDARD_GATES
-    )
+    from .constants import MODULE_INST_PATTERN, STANDARD_GATES
     
-    for match in MODULE_INST_PATTERN.finditer(module_body):
-        module_type = match.group(1).strip()
-        inst_name = match.group(2).strip() if match.group(2) else None
-        port_list = match.group(3).strip() if match.group(3) else ""
-        
-        # Skip nếu là gate (đã được parse bởi _parse_gate_instantiations)
-        if module_type.lower() in STANDARD_GATES:
+    params = params or {}
+    statements = []
+    for i in scan.instance_items():
+        text = scan.item_text(i)
+        if scan.items[i][0] == 'generate':
+            # Instance trong generate: regex cũ (không unroll)
+            statements.extend(m.group(0) for m in MODULE_INST_PATTERN.finditer(text))
+        else:
+            statements.append(text)
+    
+    for statement in statements:
+        for module_type, param_text, inst_name, inst_range, port_list in _split_instance_statement(statement):
+            # Skip nếu là gate (đã được parse bởi _parse_gate_instantiations)
+            if module_type.lower() in STANDARD_GATES:
+                continue
+            
+            # Parse port connections - hỗ trợ named và ordered ports
+            connections, ordered_ports, has_named_ports = _parse_port_connections(port_list)
+            param_conns, param_ordered, param_named = _parse_port_connections(param_text or "")
+            
+            # Generate instance name nếu không có
+            if not inst_name:
+                instance_counter = len(netlist.get('attrs', {}).get('module_instantiations', {}))
+                inst_name = f"{module_type}_inst_{instance_counter}"
+            
+            child = None
+            elaboration_error = None
+            parameters = param_conns if param_named else param_ordered
+            if library is not None and module_type in library and not inst_range:
+                try:
+                    parameters = library.resolve_parameters(
+                        module_type, param_conns if param_named else None, param_ordered, params)
+                    if not has_named_ports:
+                        connections = library.name_ordered_ports(module_type, ordered_ports)
+                    child = library.elaborate(module_type, parameters)
+                except (ParserError, ValueError) as e:
+                    # Strict: lỗi của module con là lỗi của design; loose: giữ node MODULE mờ như trước
+                    if netlist['attrs'].get('strict_synthesis'):
+                        raise
+                    elaboration_error = str(e)
+            
+            # Create module instance node
+            module_id = node_builder.create_module_instance_node(
+                module_type=module_type,
+                inst_name=inst_name,
+                connections=connections
+            )
+            if child is not None:
+                node = node_builder.nodes[-1]
+                node['module_key'] = library.module_key(module_type, parameters)
+                _bind_instance_ports(netlist, node_builder, node, child, connections, params)
+            
+            # Store trong netlist attributes
+            if 'module_instantiations' not in netlist['attrs']:
+                netlist['attrs']['module_instantiations'] = {}
+            
+            netlist['attrs']['module_instantiations'][module_id] = {
+                "module_type": module_type,
+                "instance_name": inst_name,
+                "connections": connections,
+                "parameters": parameters,
+                "ordered_ports": ordered_ports if not has_named_ports else None,
+                "has_named_ports": has_named_ports is not None
+            }
+            if elaboration_error:
+                netlist['attrs']['module_instantiations'][module_id]["elaboration_error"] = elaboration_error
+
+
+def _matching_paren(text: str, open_pos: int) -> int:
+    """Vị trí ')' đóng ngoặc '(' tại ``open_pos`` (-1 nếu không cân bằng)."""
+    depth = 0
+    for i in range(open_pos, len(text)):
+        c = text[i]
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def _split_instance_statement(statement: str) -> List[tuple]:
+    """
+    Tách statement ``TYPE [#(params)] NAME [range] (conns) [, NAME2 (conns)]* ;``.
+    
+    Returns:
+        List tuple (module_type, param_text | None, inst_name | None, range, port_list);
+        rỗng nếu statement không phải module instance.
+    """
+    m = _INSTANCE_TYPE_PATTERN.match(statement)
+    if not m:
+        return []
+    module_type = m.group(1)
+    pos = m.end()
+    param_text = None
+    if statement.startswith('#', pos):
+        open_pos = statement.find('(', pos)
+        # '#5' (delay) không phải parameter override
+        if open_pos < 0 or statement[pos + 1:open_pos].strip():
+            return []
+        close = _matching_paren(statement, open_pos)
+        if close < 0:
+            return []
+        param_text = statement[open_pos + 1:close]
+        pos = close + 1
+    
+    result = []
+    while True:
+        m = _INSTANCE_NAME_PATTERN.match(statement, pos)
+        if not m:
+            break
+        close = _matching_paren(statement, m.end() - 1)
+        if close < 0:
+            break
+        result.append((module_type, param_text, m.group(1), m.group(2) or "", statement[m.end():close]))
+        pos = close + 1
+        while pos < len(statement) and statement[pos].isspace():
+            pos += 1
+        if not statement.startswith(',', pos):
+            break
+        pos += 1
+    return result
+
+
+def _bind_instance_ports(netlist: Dict, node_builder: NodeBuilder, node: Dict,
+                         child: Dict, connections: Dict[str, str], params: Dict[str, int]):
+    """
+    Gắn port bindings cho node MODULE của một instance đã elaborate.
+    
+    ``input_bits[port]`` / ``output_bits[port]``: list tín hiệu (LSB trước) nối
+    vào port - bit ``x[i]``, tín hiệu 1 bit, hằng số, hoặc tín hiệu phụ
+    ``<inst>__<port>`` (node assign tạo từ biểu thức phức tạp). Các bit output
+    được đăng ký trong output_mapping để node đọc chúng xếp topo sau instance.
+    """
+    module_id = node['id']
+    vector_widths = netlist['attrs'].setdefault('vector_widths', {})
+    child_widths = child.get('attrs', {}).get('vector_widths', {})
+    input_bits: Dict[str, List[str]] = {}
+    output_bits: Dict[str, List[str]] = {}
+    fanins = []
+    
+    for port in child.get('inputs', []):
+        expr = (connections.get(port) or "").strip()
+        if not expr:
             continue
-        
-        # Parse port connections
-        connections = {}
-        ordered_ports = []
-        
-        # Parse port connections - hỗ trợ named và ordered ports
-        connections, ordered_ports, has_named_ports = _parse_port_connections(port_list)
-        
-        # Generate instance name nếu không có
-        if not inst_name:
-            instance_counter = len([k for k in netlist.get('attrs', {}).get('module_instantiations', {})])
-            inst_name = f"{module_type}_inst_{instance_counter}"
-        
-        # Create module instance node
-        module_id = node_builder.create_module_instance_node(
-            module_type=module_type,
-            inst_name=inst_name,
-            connections=connections
-        )
-        
-        # Store trong netlist attributes
-        if 'module_instantiations' not in netlist['attrs']:
-            netlist['attrs']['module_instantiations'] = {}
-        
-        netlist['attrs']['module_instantiations'][module_id] = {
-            "module_type": module_type,
-            "instance_name": inst_name,
-            "connections": connections,
-            "ordered_ports": ordered_ports if not has_named_ports else None,
-            "has_named_ports": has_named_ports is not None
-        }
+        refs = _connection_bits(expr, vector_widths, params)
+        if refs is None:
+            # Biểu thức: tạo node gán cho tín hiệu phụ, instance đọc tín hiệu phụ
+            helper = f"{module_id}__{port}"
+            width = child_widths.get(port, 1)
+            if width > 1:
+                vector_widths[helper] = width
+            _dispatch_assign_parser(helper, expr, node_builder, params)
+            refs = [helper]
+        input_bits[port] = refs
+        fanins.extend([ref, False] for ref in refs if not _CONSTANT_PATTERN.fullmatch(ref))
+    
+    for port in child.get('outputs', []):
+        expr = (connections.get(port) or "").strip()
+        if not expr:
+            continue
+        refs = _connection_bits(expr, vector_widths, params)
+        if refs is None or any(_CONSTANT_PATTERN.fullmatch(ref) for ref in refs):
+            raise ParserError(
+                f"Output port '{port}' of instance '{module_id}' must connect to a net "
+                f"(identifier, bit/part-select or concatenation), got '{expr}'"
+            )
+        output_bits[port] = refs
+        # Driver theo bit (nhiều instance có thể lái các bit khác nhau của một vector)
+        for ref in refs:
+            node_builder.output_mapping[ref] = module_id
+        if expr in vector_widths:
+            node_builder.output_mapping[expr] = module_id
+    
+    node['fanins'] = fanins
+    node['input_bits'] = input_bits
+    node['output_bits'] = output_bits
+
+
+def _connection_bits(expr: str, vector_widths: Dict[str, int], params: Dict[str, int]):
+    """
+    Tách biểu thức nối port thành list tín hiệu 1 bit (LSB trước).
+    
+    Hỗ trợ identifier, ``x[i]``, ``x[m:l]``, concat ``{a, b}`` và hằng số (giữ
+    nguyên, độ rộng của hằng). Trả về None nếu là biểu thức khác.
+    """
+    expr = expr.strip()
+    if expr.startswith('{') and expr.endswith('}') and not is_replication(expr):
+        refs = []
+        for part in reversed(_parse_ordered_ports(expr[1:-1])):
+            sub = _connection_bits(part, vector_widths, params)
+            if sub is None:
+                return None
+            refs.extend(sub)
+        return refs
+    if _CONSTANT_PATTERN.fullmatch(expr):
+        return [expr.replace(' ', '')]
+    m = _LVALUE_PATTERN.fullmatch(expr)
+    if not m:
+        return None
+    name, msb, lsb = m.groups()
+    if msb is None:
+        width = vector_widths.get(name, 1)
+        return [f"{name}[{i}]" for i in range(width)] if width > 1 else [name]
+    try:
+        hi = _eval_int(msb, params)
+        lo = _eval_int(lsb, params) if lsb is not None else hi
+    except ValueError:
+        return None
+    step = 1 if hi >= lo else -1
+    return [f"{name}[{i}]" for i in range(lo, hi + step, step)]
 
 
 # ============================================================================
@@ -2062,7 +2230,7 @@ def _parse_port_connections(port_list: str) -> tuple:
     Parse port connections từ port list string.
     
     Hỗ trợ:
-    - Named ports: .port_name(signal), .port_name({a, b}), .port_name(a + b)
+    - Named ports: .port_name(signal), .port_name({a, b}), .port_name(f(a, b)), .port_name()
     - Ordered ports: signal1, signal2, {a, b}
     - Mixed: signal1, .port_name(signal2), signal3
     
@@ -2072,9 +2240,6 @@ def _parse_port_connections(port_list: str) -> tuple:
     Returns:
         Tuple (connections_dict, ordered_ports_list, has_named_ports_bool)
     """
-    from .constants import NAMED_PORT_PATTERN
-    import re
-    
     connections = {}
     ordered_ports = []
     has_named_ports = False
@@ -2082,31 +2247,19 @@ def _parse_port_connections(port_list: str) -> tuple:
     if not port_list or not port_list.strip():
         return connections, ordered_ports, has_named_ports
     
-    # Parse named ports trước (vì dễ nhận diện với .port_name(...))
-    named_port_matches = list(NAMED_PORT_PATTERN.finditer(port_list))
-    has_named_ports = len(named_port_matches) > 0
-    
-    if has_named_ports:
-        # Parse named ports
-        for port_match in named_port_matches:
-            port_name = port_match.group(1).strip()
-            # Port connection có thể là expression phức tạp
-            port_connection = port_match.group(2).strip()
-            connections[port_name] = port_connection
-        
-        # Parse ordered ports (nếu có - mixed mode)
-        # Loại bỏ named ports từ port_list
-        remaining = port_list
-        for port_match in reversed(named_port_matches):  # Reverse để giữ indices
-            remaining = remaining[:port_match.start()] + remaining[port_match.end():]
-        
-        # Parse ordered ports từ remaining
-        # Cần xử lý cẩn thận để không split bên trong parentheses/braces
-        ordered_ports = _parse_ordered_ports(remaining)
-    else:
-        # Chỉ có ordered ports
-        ordered_ports = _parse_ordered_ports(port_list)
-        # Create connections với index-based keys
+    # Tách theo dấu phẩy cấp ngoài cùng (không split trong (), {}, [])
+    for port in _parse_ordered_ports(port_list):
+        if port.startswith('.'):
+            match = _NAMED_CONNECTION_PATTERN.match(port)
+            if match:
+                # Port connection có thể là expression phức tạp; '.p()' = không nối
+                connections[match.group(1)] = (match.group(2) or "").strip()
+                has_named_ports = True
+            continue
+        ordered_ports.append(port)
+    
+    if not has_named_ports:
+        # Chỉ có ordered ports: connections với index-based keys
         for i, signal in enumerate(ordered_ports):
             connections[f'port_{i}'] = signal
     
@@ -2223,6 +2376,7 @@ def _compute_statistics(netlist: Dict):
 def _ensure_output_mapping(netlist: Dict):
     """Ensure mọi output đều có mapping."""
     out_map = netlist['attrs'].setdefault('output_mapping', {})
+    outputs = set(netlist.get('outputs', []))
     
     for node in netlist.get('nodes', []):
         node_id = node.get('id')
@@ -2230,7 +2384,6 @@ def _ensure_output_mapping(netlist: Dict):
             continue
         
         # Bind output name to node if matching
-        for out_name in netlist.get('outputs', []):
-            if out_name not in out_map and out_name == node_id:
-                out_map[out_name] = node_id
+        if node_id in outputs and node_id not in out_map:
+            out_map[node_id] = node_id
 
@@ -2,23 +2,18 @@
 Verilog Tokenizer - Xử lý làm sạch và tokenize Verilog code
 
 Module này chịu trách nhiệm:
-1. Loại bỏ comments
-2. Extract module name và ports
-3. Parse port declarations (inputs/outputs)
-4. Parse wire declarations
-5. Extract assign statements
+1. Chạy lexer một lần trên source (``lexer.scan_modules``): bỏ comments, kiểm tra
+   cân bằng ngoặc, tách body thành các statement/khối
+2. Extract module name, parameter list và port list
+3. Các helper cho declarations (split signal list, vector width)
 
-Tất cả regex đã được compiled trong constants.py để tối ưu performance.
+Các statement parser trong ``parser.py`` lấy text theo keyword từ ``ModuleScan``
+thay vì quét lại toàn bộ module body.
 """
 
 import re
 from typing import Dict, List, Tuple, Optional
-from .constants import (
-    SINGLE_LINE_COMMENT,
-    MULTI_LINE_COMMENT,
-    MODULE_PATTERN,
-    ENDMODULE_PATTERN,
-)
+from .lexer import ModuleScan, scan_modules
 
 
 class VerilogTokenizer:
@@ -28,8 +23,7 @@ class VerilogTokenizer:
     Chức năng:
     - Loại bỏ comments (// và /* */)
     - Extract module information
-    - Parse declarations
-    - Prepare code cho parsing
+    - Chuẩn bị các statement (``ModuleScan``) cho parsing
     """
     
     def __init__(self, source_code: str, source_file: str = ""):
@@ -42,10 +36,10 @@ class VerilogTokenizer:
         """
         self.original_source = source_code
         self.source_file = source_file
-        self.cleaned_source = ""
+        self.scan: Optional[ModuleScan] = None
         self.module_name = ""
         self.port_list = ""
-        self.module_body = ""
+        self.param_list = ""
         
     def tokenize(self) -> Dict:
         """
@@ -55,128 +49,55 @@ class VerilogTokenizer:
             Dict chứa thông tin đã tokenize:
             {
                 'module_name': str,
+                'param_list': str,
                 'port_list': str,
-                'module_body': str,
-                'cleaned_source': str,
+                'scan': ModuleScan,
+                'default_nettype': str,
                 'module_body_start_line': int
             }
         """
-        # Kiểm tra cân bằng ngoặc cơ bản trước khi parse sâu
-        self._validate_brackets(self.original_source)
-
-        # Bước 1: Loại bỏ comments
-        self.cleaned_source = self._remove_comments(self.original_source)
-
-        # Detect `default_nettype` directive (Yosys-like behavior)
-        self.default_nettype = self._extract_default_nettype(self.cleaned_source)
-        
-        # Bước 2: Extract module information
-        self._extract_module_info()
-        
-        return {
-            'module_name': self.module_name,
-            'param_list': getattr(self, 'param_list', ''),
-            'port_list': self.port_list,
-            'module_body': self.module_body,
-            'cleaned_source': self.cleaned_source,
-            'default_nettype': getattr(self, 'default_nettype', 'wire'),
-            'module_body_start_line': getattr(self, 'module_body_start_line', 1)
-        }
-
-    def _extract_default_nettype(self, source: str) -> str:
-        """
-        Extract `default_nettype` setting.
-        If `default_nettype none` then implicit nets are forbidden (educational strict).
-        """
-        m = re.search(r'`default_nettype\s+(\w+)', source)
-        if not m:
-            return 'wire'
-        v = (m.group(1) or '').strip().lower()
-        return v or 'wire'
-    
-    def _remove_comments(self, source: str) -> str:
-        """
-        Loại bỏ tất cả comments từ source code.
-        
-        Hỗ trợ:
-        - Single line comments: // comment
-        - Multi line comments: /* comment */
-        
-        Args:
-            source: Verilog source code
-            
-        Returns:
-            Source code không có comments
-        """
-        # Loại bỏ single line comments
-        source = SINGLE_LINE_COMMENT.sub('', source)
-        
-        # Loại bỏ multi line comments
-        source = MULTI_LINE_COMMENT.sub('', source)
-        
-        return source
-    
-    def _extract_module_info(self):
+        # Sử dụng module cuối cùng (thường là top module)
+        tokens = self.tokenize_all()[-1]
+        self.scan = tokens['scan']
+        self.module_name = tokens['module_name']
+        self.param_list = tokens['param_list']
+        self.port_list = tokens['port_list']
+        return tokens
+
+    def tokenize_all(self) -> List[Dict]:
         """
-        Extract module name, port list và module body.
-        
-        Tìm module declaration cuối cùng (thường là top module).
-        Parse ra:
-        - module_name: Tên của module
-        - port_list: Danh sách ports trong ()
-        - module_body: Nội dung bên trong module
+        Tokenize mọi module trong file (thứ tự source), mỗi module một dict
+        cùng format với ``tokenize()``. Lỗi cấp file (ngoặc, không có module,
+        module cuối thiếu ``endmodule``) raise ngay như ``tokenize()``.
         """
-        # Tìm tất cả module declarations
-        module_matches = list(MODULE_PATTERN.finditer(self.cleaned_source))
-        
-        if not module_matches:
-            # Không tìm thấy module declaration → báo lỗi rõ ràng
-            raise ValueError(f"Syntax error: không tìm thấy 'module ...' trong {self.source_file}")
+        scans = scan_modules(self.original_source)
+        scan = scans[-1] if scans else ModuleScan(self.original_source)
 
-        # Sử dụng module cuối cùng (thường là top module)
-        module_match = module_matches[-1]
-        self.module_name = module_match.group(1)
-        self.param_list = module_match.group(2) or ""
-        self.port_list = module_match.group(3) or ""
-        
-        # Extract module body (từ sau declaration đến endmodule)
-        module_end = module_match.end()
-        # Tính dòng bắt đầu của module_body so với file gốc (1-based)
-        module_decl = module_match.group(0)
-        idx_orig = self.original_source.find(module_decl)
-        if idx_orig >= 0:
-            self.module_body_start_line = self.original_source[:idx_orig + len(module_decl)].count('\n') + 1
-        else:
-            # Fallback: dùng cleaned_source
-            self.module_body_start_line = self.cleaned_source[:module_end].count('\n') + 1
+        # Kiểm tra cân bằng ngoặc tròn/vuông trước khi parse sâu ({} báo sau, như trước)
+        if scan.delimiter_error and '{' not in scan.delimiter_error[1] and '}' not in scan.delimiter_error[1]:
+            raise ValueError(f"Syntax error: ngoặc không cân bằng trong {self.source_file}")
 
-        endmodule_match = ENDMODULE_PATTERN.search(
-            self.cleaned_source[module_end:]
-        )
-        
-        if endmodule_match:
-            self.module_body = self.cleaned_source[
-                module_end:module_end + endmodule_match.start()
-            ]
-        else:
+        if not scan.found:
+            # Không tìm thấy module declaration → báo lỗi rõ ràng
+            raise ValueError(f"Syntax error: không tìm thấy 'module ...' trong {self.source_file}")
+        if not scan.closed:
             # Thiếu endmodule → báo lỗi thay vì nuốt lỗi
             raise ValueError(f"Syntax error: thiếu 'endmodule' trong {self.source_file}")
 
-    def _validate_brackets(self, source: str) -> None:
-        """
-        Kiểm tra cân bằng ngoặc tròn/vuông/cặp begin-end đơn giản.
-        Báo lỗi sớm nếu mất cân bằng để giúp người dùng dễ sửa.
-        """
-        pairs = {'(': ')', '[': ']'}
-        stack = []
-        for ch in source:
-            if ch in pairs:
-                stack.append(ch)
-            elif ch in pairs.values():
-                if not stack or pairs[stack.pop()] != ch:
-                    raise ValueError(f"Syntax error: ngoặc không cân bằng trong {self.source_file}")
-        if stack:
-            raise ValueError(f"Syntax error: ngoặc không cân bằng trong {self.source_file}")
+        return [module_tokens(s) for s in scans]
+
+
+def module_tokens(scan: ModuleScan) -> Dict:
+    """Dict tokens (format của ``VerilogTokenizer.tokenize``) cho một ``ModuleScan``."""
+    return {
+        'module_name': scan.name,
+        'param_list': scan.param_list,
+        'port_list': scan.port_list,
+        'scan': scan,
+        # Yosys-like: `default_nettype none` cấm implicit nets
+        'default_nettype': scan.default_nettype,
+        'module_body_start_line': scan.body_start_line,
+    }
 
 
 def remove_inline_comments(text: str) -> str:
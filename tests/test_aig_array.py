@@ -0,0 +1,129 @@
+import unittest
+
+
+def _build_sample(aig):
+    a = aig.create_pi("a")
+    b = aig.create_pi("b")
+    c = aig.create_pi("c")
+    ab = aig.create_and(a, b)
+    ab_dup = aig.create_and(b, a)
+    f = aig.create_or(ab, c)
+    g = aig.create_xor(ab_dup, aig.create_not(c))
+    aig.create_and(a, c)  # dangling
+    aig.add_po(f)
+    aig.add_po(g, True)
+    return aig
+
+
+SAMPLE_NETLIST = {
+    'name': 'array_aig_test',
+    'inputs': ['a', 'b', 'c'],
+    'outputs': ['o1', 'o2'],
+    'wires': ['t1', 't2'],
+    'nodes': [
+        {'id': 'n1', 'type': 'AND', 'inputs': ['a', 'b'], 'output': 't1'},
+        {'id': 'n2', 'type': 'AND', 'inputs': ['a', 'b'], 'output': 't2'},
+        {'id': 'n3', 'type': 'OR', 'inputs': ['t1', 'c'], 'output': 'o1'},
+        {'id': 'n4', 'type': 'XOR', 'inputs': ['t2', 'c'], 'output': 'o2'},
+    ],
+    'attrs': {'output_mapping': {'o1': 'n3', 'o2': 'n4'}},
+}
+
+
+class TestArrayAIG(unittest.TestCase):
+    def test_matches_object_aig(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+
+        for flags in ((True, True), (False, False)):
+            ref = _build_sample(AIG(*flags))
+            arr = _build_sample(ArrayAIG(*flags))
+            self.assertEqual(ref.count_nodes(), arr.count_nodes())
+            self.assertEqual(ref.count_and_nodes(), arr.count_and_nodes())
+            self.assertEqual(ref.max_level, arr.max_level)
+            self.assertEqual(ref.to_verilog("m"), arr.to_verilog("m"))
+
+    def test_const_simplify_and_handles(self):
+        from core.synthesis.aig_array import ArrayAIG
+
+        aig = ArrayAIG()
+        a = aig.create_pi("a")
+        self.assertEqual(aig.create_and(a, aig.const0), aig.const0)
+        self.assertEqual(aig.create_and(aig.const1, a), a)
+        self.assertEqual(aig.create_and(a, a, False, True), aig.const0)
+        not_a = aig.create_not(a)
+        self.assertTrue(not_a.is_and())
+        self.assertEqual(not_a.left, a)
+        self.assertTrue(not_a.left_inverted)
+        self.assertEqual(not_a.right, aig.const1)
+        self.assertEqual(aig.create_not(a), not_a)
+        self.assertIs(aig.pis["a"], a)
+        self.assertEqual(aig.nodes[a.node_id].var_name, "a")
+
+    def test_and_program_matches_create_and_lit(self):
+        import random
+
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+
+        rng = random.Random(3)
+        ops = []
+        for i in range(2000):
+            limit = 6 + i
+            refs = [rng.choice((0, 1)) if rng.random() < 0.05 else rng.randrange(2, limit) for _ in range(2)]
+            if rng.random() < 0.1:
+                refs[1] = refs[0]  # x AND x / x AND !x
+            ops.append(((refs[0] << 1) | rng.randint(0, 1), (refs[1] << 1) | rng.randint(0, 1)))
+
+        def run(aig, batch):
+            lits = [0, 2] + [aig.create_pi(f"p{i}").node_id << 1 for i in range(4)]
+            lits.append(aig.create_not(aig.pis["p0"]).node_id << 1)
+            if batch:
+                return aig.create_and_program(lits, ops)
+            for ref0, ref1 in ops:
+                lits.append(aig.create_and_lit(lits[ref0 >> 1] ^ (ref0 & 1), lits[ref1 >> 1] ^ (ref1 & 1)))
+            return lits
+
+        ref, arr = ArrayAIG(), ArrayAIG()
+        expected = run(ref, False)
+        self.assertEqual(run(arr, True), expected)
+        self.assertGreater(arr.count_and_nodes(), 500)
+        for column in ("_kind", "_fanin0", "_fanin1", "_level", "_ref"):
+            self.assertEqual(getattr(arr, column), getattr(ref, column))
+        self.assertEqual((arr.hash_table, arr.max_level), (ref.hash_table, ref.max_level))
+        self.assertEqual(run(AIG(), True), expected)
+
+        # Op lỗi giữa chừng: các cột được cắt về số node đã tạo
+        q, top = arr.create_pi("q").node_id << 1, max(expected)
+        count = arr.count_nodes()
+        with self.assertRaises(IndexError):
+            arr.create_and_program([0, 2, q, top], [(4, 6), (8, 99)])
+        self.assertEqual(len(arr._fanin0), count + 1)
+        self.assertEqual(arr.create_and_lit(q, top), count << 1)
+        raw = ArrayAIG(False, False)
+        self.assertEqual(run(raw, True), run(ArrayAIG(False, False), False))
+
+    def test_strash_removes_duplicates_and_dangling(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+
+        ref = _build_sample(AIG(False, False)).strash()
+        arr = _build_sample(ArrayAIG(False, False)).strash()
+        self.assertIsInstance(arr, ArrayAIG)
+        self.assertEqual(ref.count_and_nodes(), arr.count_and_nodes())
+        self.assertEqual(len(arr.pos), 2)
+
+    def test_synthesis_and_optimize_with_array_backend(self):
+        from core.synthesis.synthesis_flow import synthesize
+        from core.synthesis.aig_array import ArrayAIG
+        from core.optimization.optimization_flow import optimize
+
+        ref = optimize(synthesize(SAMPLE_NETLIST))
+        arr = optimize(synthesize(SAMPLE_NETLIST, aig_class=ArrayAIG))
+        self.assertIsInstance(arr, ArrayAIG)
+        self.assertEqual(ref.count_and_nodes(), arr.count_and_nodes())
+        self.assertEqual(len(ref.pos), len(arr.pos))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import itertools
+import unittest
+
+
+class TestCutEnumeration(unittest.TestCase):
+    def test_truth_tables_match_simulation(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.synthesis.aig_cuts import enumerate_cuts
+        from core.verification.simulation import AIGSimulator
+        from tests.test_fraig import _random_aig
+
+        for aig_class in (AIG, ArrayAIG):
+            for seed in range(3):
+                aig = _random_aig(aig_class, seed, num_pis=6, num_gates=120)
+                result = AIGSimulator(aig).simulate_exhaustive()
+                values = result.values
+                for k in (2, 4, 6):
+                    store = enumerate_cuts(aig, k=k, max_cuts=10)
+                    for out, _a, _b, _op in AIGSimulator(aig).program:
+                        cuts = store.cuts(out)
+                        self.assertEqual(cuts[0].leaves, (out,))
+                        self.assertLessEqual(len(cuts), 11)
+                        for cut in cuts[1:]:
+                            self.assertLessEqual(len(cut.leaves), k)
+                            self.assertEqual(list(cut.leaves), sorted(cut.leaves))
+                            for p in range(result.num_patterns):
+                                index = sum(((values[leaf] >> p) & 1) << i
+                                            for i, leaf in enumerate(cut.leaves))
+                                self.assertEqual((cut.truth >> index) & 1, (values[out] >> p) & 1)
+                        # Không cut nào có leaves là tập con thực sự của cut khác
+                        leaf_sets = [set(cut.leaves) for cut in cuts[1:]]
+                        for x, y in itertools.permutations(leaf_sets, 2):
+                            self.assertFalse(x < y)
+
+    def test_small_functions_and_limits(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_cuts import TT_VARS, CutEnumerator, tt_mask
+
+        aig = AIG()
+        a, b, c = aig.create_pi("a"), aig.create_pi("b"), aig.create_pi("c")
+        x = aig.create_xor(a, b)
+        f = aig.create_and(x, c)
+        aig.add_po(f)
+        store = CutEnumerator(k=3, max_cuts=4).enumerate(aig)
+        leaves = (a.node_id, b.node_id, c.node_id)
+        by_leaves = {cut.leaves: cut.truth for cut in store.cuts(f.node_id)}
+        self.assertIn(leaves, by_leaves)
+        expected = (TT_VARS[0] ^ TT_VARS[1]) & TT_VARS[2]
+        self.assertEqual(by_leaves[leaves] & tt_mask(3), expected & tt_mask(3))
+        self.assertEqual(by_leaves[leaves], expected)
+        self.assertEqual(store.cuts(aig.const0.node_id)[0].leaves, ())
+
+        limited = CutEnumerator(k=3, max_cuts=1).enumerate(aig)
+        self.assertEqual(limited.num_node_cuts(f.node_id), 2)
+        with self.assertRaises(ValueError):
+            CutEnumerator(k=7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import random
+import unittest
+
+
+def _random_raw_aig(aig_class, num_nodes=300, num_pis=8, seed=7):
+    rng = random.Random(seed)
+    aig = aig_class(enable_strash=False, enable_const_simplify=False)
+    pool = [aig.create_pi(f"pi{i}") for i in range(num_pis)]
+    for _ in range(num_nodes):
+        r = rng.random()
+        if r < 0.15 and len(pool) > num_pis:
+            src = pool[rng.randrange(num_pis, len(pool))]
+            node = aig.create_and(src.left, src.right, src.left_inverted, src.right_inverted)
+        elif r < 0.2:
+            node = aig.create_and(pool[rng.randrange(len(pool))], aig.const1, rng.random() < 0.5, False)
+        else:
+            node = aig.create_and(pool[rng.randrange(len(pool))], pool[rng.randrange(len(pool))],
+                                  rng.random() < 0.5, rng.random() < 0.5)
+        pool.append(node)
+    for node in pool[-12:]:
+        aig.add_po(node, rng.random() < 0.5)
+    return aig
+
+
+def _truth_tables(aig):
+    """Exhaustive simulation: one big-int truth table per PO."""
+    from core.synthesis.aig_traversal import dfs_postorder
+
+    names = sorted(aig.pis)
+    n = len(names)
+    mask = (1 << (1 << n)) - 1
+    val = {aig.const0.node_id: 0, aig.const1.node_id: mask}
+    for i, name in enumerate(names):
+        pattern = 0
+        for m in range(1 << n):
+            if (m >> i) & 1:
+                pattern |= 1 << m
+        val[aig.pis[name].node_id] = pattern
+    for node in dfs_postorder(aig):
+        if node.is_and():
+            a = val[node.left.node_id] ^ (mask if node.left_inverted else 0)
+            b = val[node.right.node_id] ^ (mask if node.right_inverted else 0)
+            val[node.node_id] = a & b
+    return [val[po.node_id] ^ (mask if inv else 0) for po, inv in aig.pos]
+
+
+def _check_ref_counts(test, aig):
+    expected = {nid: 0 for nid in aig.nodes}
+    for nid in aig.nodes:
+        node = aig.nodes[nid]
+        if node.is_and():
+            expected[node.left.node_id] += 1
+            expected[node.right.node_id] += 1
+    for po, _inv in aig.pos:
+        expected[po.node_id] += 1
+    for nid, count in expected.items():
+        test.assertEqual(aig.nodes[nid].ref_count, count, f"ref_count of node {nid}")
+
+
+class TestInPlaceOptimization(unittest.TestCase):
+    def test_in_place_matches_rebuild(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.optimization.optimization_flow import AIGOptimizationFlow
+
+        for cls in (AIG, ArrayAIG):
+            ref_aig = _random_raw_aig(cls)
+            aig = _random_raw_aig(cls)
+            expected = _truth_tables(aig)
+
+            rebuilt = AIGOptimizationFlow().optimize(ref_aig)
+            flow = AIGOptimizationFlow(in_place=True)
+            result = flow.optimize(aig)
+
+            self.assertIs(result, aig)
+            self.assertEqual(result.count_nodes(), rebuilt.count_nodes())
+            self.assertEqual(result.count_and_nodes(), rebuilt.count_and_nodes())
+            self.assertEqual(result.max_level, rebuilt.max_level)
+            self.assertEqual(_truth_tables(result), expected)
+            self.assertEqual(_truth_tables(rebuilt), expected)
+            _check_ref_counts(self, result)
+
+    def test_remove_dead_nodes_and_compact(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+
+        for cls in (AIG, ArrayAIG):
+            aig = cls()
+            a, b, c = aig.create_pi("a"), aig.create_pi("b"), aig.create_pi("c")
+            ab = aig.create_and(a, b)
+            dead = aig.create_and(aig.create_and(a, c), b, True, False)
+            aig.add_po(aig.create_or(ab, c))
+            total = aig.count_nodes()
+            expected = _truth_tables(aig)
+
+            self.assertEqual(dead.ref_count, 0)
+            self.assertEqual(aig.remove_dead_nodes(), 2)
+            self.assertEqual(aig.count_nodes(), total - 2)
+            self.assertNotIn(dead.node_id, aig.nodes)
+            _check_ref_counts(self, aig)
+
+            self.assertFalse(aig.maybe_compact(threshold=0.9))
+            self.assertTrue(aig.maybe_compact(threshold=0.0))
+            self.assertEqual(aig.next_node_id, aig.count_nodes())
+            self.assertEqual(sorted(aig.nodes), list(range(aig.count_nodes())))
+            self.assertEqual(_truth_tables(aig), expected)
+            _check_ref_counts(self, aig)
+            # Strash table is consistent after renumbering (existing AND is found again)
+            before = aig.count_nodes()
+            aig.create_and(aig.pis["a"], aig.pis["b"])
+            self.assertEqual(aig.count_nodes(), before)
+
+if __name__ == "__main__":
+    unittest.main()
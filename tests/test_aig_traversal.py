@@ -0,0 +1,85 @@
+import sys
+import unittest
+
+
+def _deep_chain(aig_class, depth):
+    aig = aig_class()
+    pis = [aig.create_pi(f"in{i}") for i in range(4)]
+    node = pis[0]
+    for i in range(depth):
+        node = aig.create_and(node, pis[(i + 1) % 4], False, bool(i & 1))
+    aig.add_po(node)
+    aig.add_po(node, True)
+    return aig
+
+
+class TestAIGTraversal(unittest.TestCase):
+    def test_postorder_children_first(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.synthesis.aig_traversal import dfs_postorder, topological_order
+
+        for cls in (AIG, ArrayAIG):
+            aig = cls()
+            a, b, c = aig.create_pi("a"), aig.create_pi("b"), aig.create_pi("c")
+            f = aig.create_xor(aig.create_and(a, b), c)
+            aig.create_and(a, c, True, False)  # dangling, not reachable from PO
+            aig.add_po(f)
+
+            order = dfs_postorder(aig)
+            position = {n.node_id: i for i, n in enumerate(order)}
+            self.assertEqual(len(position), len(order))
+            for n in order:
+                if n.is_and():
+                    self.assertLess(position[n.left.node_id], position[n.node_id])
+                    self.assertLess(position[n.right.node_id], position[n.node_id])
+            self.assertEqual(order[-1].node_id, f.node_id)
+
+            cached = topological_order(aig)
+            self.assertIs(cached, topological_order(aig))
+            aig.add_po(a)
+            self.assertIsNot(cached, topological_order(aig))
+
+    def test_run_recursive_matches_recursion(self):
+        from core.synthesis.aig_traversal import run_recursive
+
+        trace = []
+
+        def walk(n):
+            trace.append(n)
+            if n > 0:
+                left = yield (n - 1,)
+                trace.append(("back", n, left))
+            return n
+
+        self.assertEqual(run_recursive(walk, 3), 3)
+        self.assertEqual(trace[:4], [3, 2, 1, 0])
+        self.assertEqual(trace[4], ("back", 1, 0))
+
+    def test_deep_chain_beyond_recursion_limit(self):
+        from core.synthesis.aig import AIG, aig_to_netlist
+        from core.synthesis.aig_array import ArrayAIG
+        from core.optimization.optimization_flow import AIGOptimizationFlow
+        from core.technology_mapping.technology_mapping import aig_to_logic_nodes
+
+        depth = sys.getrecursionlimit() * 3
+        for cls in (AIG, ArrayAIG):
+            aig = _deep_chain(cls, depth)
+            flow = AIGOptimizationFlow(enable_fraig=False, enable_balance=False)
+            opt = flow.optimize(aig)
+            self.assertEqual(opt.count_and_nodes(), aig.count_and_nodes() + 1)
+            self.assertEqual(flow.optimization_stats['dce']['nodes_after'],
+                             flow.optimization_stats['dce']['nodes_before'])
+            self.assertEqual(len(aig_to_logic_nodes(opt)), opt.count_and_nodes())
+            netlist = aig_to_netlist(opt)
+            self.assertGreaterEqual(len(netlist['nodes']), depth)
+            # Chain chứa cả x và !x của cùng một input: FRAIG rút về hằng số;
+            # balance gom cả chain thành một supergate nên cũng rút về hằng số
+            fraiged = AIGOptimizationFlow(enable_balance=False).optimize(aig)
+            self.assertEqual(fraiged.count_and_nodes(), 0)
+            balanced = AIGOptimizationFlow(enable_fraig=False).optimize(aig)
+            self.assertEqual(balanced.count_and_nodes(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
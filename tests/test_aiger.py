@@ -0,0 +1,84 @@
+import io
+import os
+import tempfile
+import unittest
+
+# Ví dụ trong tài liệu AIGER: toggle flip-flop có enable, reset về 1
+_TOGGLE_AAG = b"aag 3 1 1 2 1\n2\n4 6 1\n6\n4\n6 5 3\ni0 en\nl0 q\no0 y\n"
+
+
+class TestAiger(unittest.TestCase):
+    def test_binary_and_ascii_round_trip(self):
+        from core.synthesis.aig_array import ArrayAIG
+        from core.synthesis.aiger import read_aiger, write_aiger
+        from core.verification.cec import check_equivalence
+        from tools.benchmarks.bench_cec import ripple_adder
+
+        aig = ripple_adder(6)
+        names = [f"sum{i}" for i in range(6)] + ["cout"]
+        sizes = {}
+        for binary in (True, False):
+            buf = io.BytesIO()
+            header = write_aiger(aig, buf, binary=binary, output_names=names, comments=["adder"])
+            sizes[binary] = len(buf.getvalue())
+            self.assertEqual((header.inputs, header.latches, header.outputs), (12, 0, 7))
+            for aig_class in (None, ArrayAIG):
+                model = read_aiger(buf.getvalue(), aig_class=aig_class)
+                self.assertEqual(model.header, header)
+                self.assertEqual(list(model.aig.pis), list(aig.pis))
+                self.assertEqual(model.output_names, names)
+                self.assertEqual(model.comments, ["adder"])
+                self.assertTrue(check_equivalence(aig, model.aig).equivalent)
+        self.assertLess(sizes[True], sizes[False])
+
+        # Ghi lại AIG đã đọc: cùng số AND (NOT/hằng không tạo biến)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "adder.aig")
+            first = write_aiger(aig, path)
+            second = write_aiger(read_aiger(path).aig, os.path.join(tmp, "again.aag"))
+        self.assertEqual(first, second)
+
+    def test_latches_and_unordered_ascii(self):
+        from core.synthesis.aiger import AigerLatch, read_aiger, write_aiger
+
+        model = read_aiger(_TOGGLE_AAG)
+        self.assertEqual(list(model.aig.pis), ["en", "q"])
+        self.assertEqual(model.latches, [AigerLatch("q", 2, 1)])
+        self.assertEqual(model.output_names, ["y", "o1", "q_next"])
+        for binary in (False, True):
+            buf = io.BytesIO()
+            write_aiger(model.aig, buf, binary=binary, output_names=model.output_names, latches=model.latches)
+            again = read_aiger(buf.getvalue())
+            self.assertEqual((again.latches, again.output_names), (model.latches, model.output_names))
+            self.assertEqual(again.header, model.header)
+
+        # AND định nghĩa sau khi được dùng (hợp lệ với .aag)
+        unordered = read_aiger(b"aag 4 2 0 1 2\n2\n4\n8\n8 6 2\n6 2 5\n")
+        self.assertEqual(unordered.aig.count_and_nodes(), 2)
+        for bad in (b"aag 2 1 0 1 1\n2\n4\n4 2 6\n", b"aig 3 1 0 1 1\n2\n", b"aag 1 1 0 0 0 0 0 1\n2\n", b"hello"):
+            with self.assertRaises(ValueError):
+                read_aiger(bad)
+
+    def test_shell_checkpoint(self):
+        import contextlib
+
+        from cli.mylogic_shell import MyLogicShell
+        from core.synthesis.aiger import read_aiger, write_aiger
+        from core.verification.cec import check_equivalence
+        from tools.benchmarks.bench_cec import ripple_adder
+
+        with tempfile.TemporaryDirectory() as tmp:
+            src, ckpt = os.path.join(tmp, "in.aig"), os.path.join(tmp, "ckpt.aag")
+            write_aiger(ripple_adder(4), src, output_names=["s0", "s1", "s2", "s3", "cout"])
+            shell = MyLogicShell()
+            with contextlib.redirect_stdout(io.StringIO()):
+                shell.commands["read_aig"](["read_aig", src])
+                shell.commands["write_aig"](["write_aig", ckpt])
+            model = read_aiger(ckpt)
+        self.assertEqual(model.output_names, ["s0", "s1", "s2", "s3", "cout"])
+        self.assertEqual(shell.current_netlist["outputs"], model.output_names)
+        self.assertTrue(check_equivalence(shell.current_aig, model.aig).equivalent)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+
+class TestAIGBalance(unittest.TestCase):
+    def test_chain_becomes_logarithmic(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.synthesis.aig_traversal import aig_depth
+        from core.optimization.balance import AIGBalanceOptimizer
+        from core.verification.cec import check_equivalence
+
+        for aig_class in (AIG, ArrayAIG):
+            aig = aig_class()
+            pis = [aig.create_pi(f"x{i}") for i in range(16)]
+            node = pis[0]
+            for i, pi in enumerate(pis[1:]):
+                node = aig.create_and(node, pi, False, bool(i % 3 == 0))
+            aig.add_po(node)
+            # Node giữa chain có fanout thứ hai: là biên supergate
+            aig.add_po(aig.create_or(pis[0], aig.nodes[node.node_id - 8]))
+            reference = aig.strash()
+
+            balancer = AIGBalanceOptimizer()
+            result = balancer.optimize(aig)
+            self.assertEqual(balancer.stats["depth_before"], 15)
+            self.assertEqual(balancer.stats["depth_after"], aig_depth(result))
+            self.assertLessEqual(balancer.stats["depth_after"], 5)
+            self.assertLessEqual(result.count_nodes(), reference.count_nodes())
+            self.assertEqual(result.max_level, balancer.stats["depth_after"])
+            self.assertIs(check_equivalence(reference, result).equivalent, True)
+
+    def test_random_aigs_in_place_and_rebuild(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.optimization.balance import AIGBalanceOptimizer
+        from core.verification.cec import check_equivalence
+        from tests.test_fraig import _random_aig
+
+        for aig_class in (AIG, ArrayAIG):
+            for seed in range(6):
+                reference = _random_aig(aig_class, seed).strash()
+                balancer = AIGBalanceOptimizer()
+                rebuilt = balancer.optimize(reference)
+                self.assertLessEqual(balancer.stats["depth_after"], balancer.stats["depth_before"])
+                self.assertIs(check_equivalence(reference, rebuilt).equivalent, True)
+
+                aig = _random_aig(aig_class, seed)
+                result = AIGBalanceOptimizer().optimize(aig, in_place=True)
+                self.assertIs(result, aig)
+                self.assertEqual(result.count_nodes(), rebuilt.count_nodes())
+                self.assertIs(check_equivalence(reference, result).equivalent, True)
+
+
+if __name__ == "__main__":
+    unittest.main()
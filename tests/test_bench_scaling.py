@@ -0,0 +1,60 @@
+import contextlib
+import copy
+import io
+import os
+import tempfile
+import unittest
+
+
+def _synthesize(path, source):
+    from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+    from frontends.verilog.core.parser import parse_verilog
+
+    with open(path, "w") as f:
+        f.write(source)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return NetlistToAIGConverter().convert(parse_verilog(path))
+
+
+class TestBenchScaling(unittest.TestCase):
+    def test_prefix_adders_match_ripple(self):
+        from core.verification.cec import check_equivalence
+        from tools.benchmarks.designs import PREFIX_KINDS, prefix_adder, ripple_adder
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for width in (1, 6, 8):
+                reference = _synthesize(os.path.join(tmp, "ripple.v"), ripple_adder(width))
+                for kind in PREFIX_KINDS:
+                    aig = _synthesize(os.path.join(tmp, f"{kind}.v"), prefix_adder(width, kind))
+                    self.assertIs(check_equivalence(reference, aig).equivalent, True, (kind, width))
+        with self.assertRaises(ValueError):
+            prefix_adder(4, "brent_kung")
+
+    def test_run_and_gate(self):
+        from core.technology_mapping.technology_mapping import create_standard_library
+        from tools.benchmarks.bench_scaling import STAGES, compare, fit_exponents, run_design
+
+        library = create_standard_library()
+        with tempfile.TemporaryDirectory() as tmp:
+            rows = [run_design("xor_chain", n, tmp, library, calibration=0.1) for n in (8, 16)]
+        self.assertEqual(set(rows[0]["time"]), set(STAGES))
+        self.assertGreater(rows[1]["ands"], rows[0]["ands"])
+        self.assertGreater(rows[1]["mem"]["synthesis"], 0)
+        report = {"results": rows, "exponents": fit_exponents(rows)}
+        self.assertEqual(compare(report, copy.deepcopy(report)), [])
+
+        slower = copy.deepcopy(report)
+        for row in slower["results"]:
+            row["norm"]["optimize"] *= 3
+        slower["exponents"]["xor_chain"]["optimize"] += 1.0
+        slower["results"][1]["ands_opt"] += 5
+        regressions = compare(slower, report, min_time=0.0)
+        self.assertTrue(any("optimize: time x3.00" in r for r in regressions))
+        self.assertTrue(any("optimize: scaling" in r for r in regressions))
+        self.assertTrue(any(r.startswith("xor_chain[16] ands_opt") for r in regressions))
+        # dưới ngưỡng nhiễu: chỉ còn QoR
+        self.assertEqual(len(compare(slower, report, min_time=1e9)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
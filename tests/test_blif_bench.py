@@ -0,0 +1,158 @@
+import io
+import os
+import tempfile
+import unittest
+
+_C17_BENCH = """# c17
+INPUT(G1)
+INPUT(G2)
+INPUT(G3)
+INPUT(G6)
+INPUT(G7)
+OUTPUT(G22)
+OUTPUT(G23)
+G10 = NAND(G1, G3)
+G11 = NAND(G3, G6)
+G16 = NAND(G2, G11)
+G19 = NAND(G11, G7)
+G22 = NAND(G10, G16)
+G23 = NAND(G16, G19)
+"""
+
+# Phân cấp (.subckt), dòng nối, offset cover, latch và .names khai báo sau khi dùng
+_HIER_BLIF = r"""# full adder + thanh ghi
+.model top
+.inputs a b \
+  cin
+.outputs s cout q
+.subckt fa x=a y=b ci=cin sum=s co=cout
+.latch nq q re clk 1
+.names s q nq
+11 0
+.end
+
+.model fa
+.inputs x y ci
+.outputs sum co
+.names x y ci sum
+100 1
+010 1
+001 1
+111 1
+.names x y ci co
+11- 1
+1-1 1
+-11 1
+.end
+"""
+
+
+class TestBlifBench(unittest.TestCase):
+    def test_bench_reader_netlist_and_aig_agree(self):
+        from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+        from core.verification.cec import check_equivalence
+        from frontends.bench import read_bench_network
+
+        network = read_bench_network("c17.bench", text=_C17_BENCH)
+        model = network.to_aig()
+        self.assertEqual((model.header.inputs, model.header.outputs, model.header.ands), (5, 2, 6))
+        self.assertEqual(model.output_names, ["G22", "G23"])
+        netlist = network.to_netlist("c17.bench")
+        self.assertEqual(len(netlist["nodes"]), 6)
+        self.assertTrue(check_equivalence(model.aig, NetlistToAIGConverter().convert(netlist)).equivalent)
+
+        for bad in ("G1 = FOO(G2)\n", "INPUT(a)\nx = AND(a, y)\ny = AND(a, x)\nOUTPUT(x)\n"):
+            with self.assertRaises(ValueError):
+                read_bench_network("bad.bench", text=bad).to_aig()
+
+    def test_blif_hierarchy_latch_and_writers_round_trip(self):
+        from core.export.bench_writer import aig_to_bench
+        from core.export.blif_writer import aig_to_blif, netlist_to_blif
+        from core.synthesis.aiger import AigerLatch
+        from core.verification.cec import check_equivalence
+        from frontends.bench import read_bench_network
+        from frontends.blif import read_blif_network
+
+        network = read_blif_network("top.blif", text=_HIER_BLIF)
+        self.assertEqual(network.stats(), {"inputs": 3, "outputs": 3, "gates": 3, "latches": 1})
+        model = network.to_aig()
+        self.assertEqual(model.latches, [AigerLatch("q", 3, 1)])
+        self.assertEqual(model.output_names, ["s", "cout", "q", "q_next"])
+
+        buf = io.StringIO()
+        aig_to_blif(model.aig, buf, output_names=model.output_names, latches=model.latches)
+        again = read_blif_network("again.blif", text=buf.getvalue()).to_aig()
+        self.assertEqual((again.latches, again.output_names), (model.latches, model.output_names))
+        self.assertTrue(check_equivalence(model.aig, again.aig).equivalent)
+
+        # Netlist dictionary (DFF, OR/NAND của cover) → BLIF → AIG
+        buf = io.StringIO()
+        stats = netlist_to_blif(network.to_netlist("top.blif"), buf)
+        self.assertEqual(stats["latches"], 1)
+        self.assertTrue(check_equivalence(model.aig, read_blif_network("n.blif", text=buf.getvalue()).to_aig().aig)
+                        .equivalent)
+
+        combinational = read_bench_network("c17.bench", text=_C17_BENCH).to_aig()
+        buf = io.StringIO()
+        aig_to_bench(combinational.aig, buf, output_names=combinational.output_names)
+        self.assertTrue(check_equivalence(
+            combinational.aig, read_bench_network("c17.bench", text=buf.getvalue()).to_aig().aig).equivalent)
+        with self.assertRaises(ValueError):
+            aig_to_bench(model.aig, io.StringIO(), latches=model.latches)  # init 1 không biểu diễn được
+
+    def test_constant_names_and_constant_outputs(self):
+        from core.export.blif_writer import aig_to_blif
+        from core.synthesis.aig import AIG
+        from core.verification.cec import check_equivalence
+        from frontends.blif import read_blif_network
+
+        # .names không input: "1" → hằng 1, không cube → hằng 0
+        text = ".model k\n.inputs a\n.outputs y z w\n.names k0\n.names k1\n1\n" \
+               ".names a k1 y\n11 1\n.names k0 z\n0 1\n.names k0 w\n1 1\n.end\n"
+        model = read_blif_network("k.blif", text=text).to_aig()
+        aig = model.aig
+        a = aig.pis["a"]
+        self.assertEqual([(po.node_id, bool(inv)) for po, inv in aig.pos],
+                         [(a.node_id, False), (aig.const1.node_id, False), (aig.const0.node_id, False)])
+
+        # aig_to_blif → blif_to_aig với PO hằng (cả đảo)
+        aig = AIG()
+        a = aig.create_pi("a")
+        aig.add_po(aig.const1)
+        aig.add_po(aig.const0)
+        aig.add_po(aig.const0, True)
+        aig.add_po(a, True)
+        buf = io.StringIO()
+        aig_to_blif(aig, buf, output_names=["one", "zero", "nzero", "na"])
+        again = read_blif_network("again.blif", text=buf.getvalue()).to_aig()
+        self.assertEqual(again.output_names, ["one", "zero", "nzero", "na"])
+        self.assertTrue(check_equivalence(aig, again.aig).equivalent)
+
+    def test_shell_read_and_write(self):
+        import contextlib
+
+        from cli.mylogic_shell import MyLogicShell
+        from core.verification.cec import check_equivalence
+        from frontends import load_aig
+
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "c17.bench")
+            with open(src, "w") as f:
+                f.write(_C17_BENCH)
+            out_blif, out_bench = os.path.join(tmp, "c17.blif"), os.path.join(tmp, "c17_out.bench")
+            shell = MyLogicShell()
+            shell.auto_export_json = False
+            with contextlib.redirect_stdout(io.StringIO()):
+                shell.commands["read"](["read", src])
+                self.assertEqual(len(shell.current_netlist["nodes"]), 6)
+                shell.commands["read_aig"](["read_aig", src])
+                shell.commands["write_blif"](["write_blif", out_blif])
+                shell.commands["write_bench"](["write_bench", out_bench])
+            for path in (out_blif, out_bench):
+                model = load_aig(path)
+                self.assertEqual(model.output_names, ["G22", "G23"])
+                self.assertTrue(check_equivalence(shell.current_aig, model.aig).equivalent)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import itertools
+import random
+import unittest
+
+
+def _brute_force_sat(num_vars, clauses):
+    for bits in itertools.product((0, 1), repeat=num_vars):
+        if all(any(bits[lit >> 1] ^ (lit & 1) for lit in c) for c in clauses):
+            return True
+    return False
+
+
+class TestSatSolver(unittest.TestCase):
+    def test_random_cnf_against_brute_force(self):
+        from core.verification.sat import SatSolver, mk_lit
+
+        rng = random.Random(3)
+        for _ in range(300):
+            n = rng.randint(1, 8)
+            clauses = [[mk_lit(rng.randrange(n), rng.random() < 0.5) for _ in range(rng.randint(1, 3))]
+                       for _ in range(rng.randint(1, 30))]
+            solver = SatSolver()
+            for _ in range(n):
+                solver.new_var()
+            for c in clauses:
+                solver.add_clause(c)
+            expected = _brute_force_sat(n, clauses)
+            self.assertEqual(solver.solve(), expected)
+            if expected:
+                for c in clauses:
+                    self.assertTrue(any(solver.model[lit >> 1] ^ (lit & 1) for lit in c))
+            assumption = mk_lit(rng.randrange(n), rng.random() < 0.5)
+            self.assertEqual(solver.solve([assumption]), _brute_force_sat(n, clauses + [[assumption]]))
+
+    def test_conflict_limit(self):
+        from core.verification.sat import SatSolver, mk_lit
+
+        # Pigeonhole 8 -> 7: UNSAT, cần nhiều conflict
+        solver = SatSolver()
+        x = [[solver.new_var() for _ in range(7)] for _ in range(8)]
+        for row in x:
+            solver.add_clause([mk_lit(v) for v in row])
+        for j in range(7):
+            for i, k in itertools.combinations(range(8), 2):
+                solver.add_clause([mk_lit(x[i][j], True), mk_lit(x[k][j], True)])
+        self.assertIsNone(solver.solve(conflict_limit=10))
+
+
+class TestCEC(unittest.TestCase):
+    def test_equivalent_structures(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.verification.cec import check_equivalence
+
+        # a & b & c & d: chain vs balanced, plus XOR via OR/AND vs create_xor
+        chain = AIG()
+        p = [chain.create_pi(n) for n in "abcd"]
+        chain.add_po(chain.create_and(chain.create_and(chain.create_and(p[0], p[1]), p[2]), p[3]))
+        nab = chain.create_not(chain.create_and(p[0], p[1]))
+        chain.add_po(chain.create_and(chain.create_or(p[0], p[1]), nab))
+
+        tree = ArrayAIG()
+        q = [tree.create_pi(n) for n in "dcba"]
+        tree.add_po(tree.create_and(tree.create_and(q[3], q[2]), tree.create_and(q[1], q[0])))
+        tree.add_po(tree.create_xor(q[3], q[2]))
+
+        result = check_equivalence(chain, tree)
+        self.assertIs(result.equivalent, True)
+        self.assertEqual(result.unmatched_inputs, [])
+
+    def test_counterexample(self):
+        from core.synthesis.aig import AIG
+        from core.verification.cec import check_equivalence
+        from core.verification.simulation import AIGSimulator
+
+        # f1 = AND của 16 input, f2 = 0: mô phỏng ngẫu nhiên gần như không thấy khác biệt
+        aig1, aig2 = AIG(), AIG()
+        pis = [aig1.create_pi(f"x{i}") for i in range(16)]
+        for i in range(16):
+            aig2.create_pi(f"x{i}")
+        acc = pis[0]
+        for pi in pis[1:]:
+            acc = aig1.create_and(acc, pi)
+        aig1.add_po(acc)
+        aig1.add_po(pis[0])
+        aig2.add_po(aig2.const0)
+        aig2.add_po(aig2.pis["x0"])
+
+        result = check_equivalence(aig1, aig2, num_patterns=64)
+        self.assertIs(result.equivalent, False)
+        self.assertEqual(result.failing_outputs, [0])
+        cex = result.counterexample
+        sim1 = AIGSimulator(aig1).simulate_vectors([cex])
+        sim2 = AIGSimulator(aig2).simulate_vectors([cex])
+        self.assertNotEqual(sim1.output_bits(0)[0], sim2.output_bits(0)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import random
+import unittest
+
+
+def _simulate_mapped(netlist, library, values):
+    """Mô phỏng netlist sau techmap: mỗi cell tính theo hàm trong thư viện."""
+    from core.technology_mapping.cell_function import cell_truth_table
+
+    signals = dict(values)
+    signals["CONST0"], signals["CONST1"] = 0, 1
+    pending = list(netlist["nodes"])
+    while pending:
+        remaining = []
+        for node in pending:
+            if not all(i in signals for i in node["inputs"]):
+                remaining.append(node)
+                continue
+            kind = node["type"]
+            if kind in ("CONST0", "CONST1"):
+                signals[node["output"]] = int(kind == "CONST1")
+            elif kind == "BUF":
+                signals[node["output"]] = signals[node["inputs"][0]]
+            else:
+                truth, _n = cell_truth_table(library.cells[kind])
+                # Truth table 16-bit: bit ``row`` là output khi pin i = bit i của row
+                row = sum(signals[s] << i for i, s in enumerate(node["inputs"]))
+                signals[node["output"]] = (truth >> row) & 1
+        assert len(remaining) < len(pending), "combinational loop in mapped netlist"
+        pending = remaining
+    return [signals[o] for o in netlist["outputs"]]
+
+
+def _simulate_aig(aig, values):
+    from core.synthesis.aig_traversal import and_program
+
+    v = {aig.const0.node_id: 0, aig.const1.node_id: 1}
+    for name, pi in aig.pis.items():
+        v[pi.node_id] = values[name]
+    for out, a, b, op in and_program(aig):
+        v[out] = (v[a] ^ (op & 1)) & (v[b] ^ ((op >> 1) & 1))
+    return [v[po.node_id] ^ int(bool(inv)) for po, inv in aig.pos]
+
+
+def _check_mapping(test, aig, results, seed=0):
+    from core.technology_mapping.technology_mapping import convert_mapped_logic_network_to_netlist
+
+    mapper = results["_mapper"]
+    outputs = [f"y{i}" for i in range(len(aig.pos))]
+    netlist = convert_mapped_logic_network_to_netlist(
+        mapper, aig, {"inputs": list(aig.pis), "outputs": outputs}
+    )
+    rng = random.Random(seed)
+    for _ in range(64):
+        values = {name: rng.randint(0, 1) for name in aig.pis}
+        test.assertEqual(_simulate_mapped(netlist, mapper.library, values), _simulate_aig(aig, values))
+    return netlist
+
+
+class TestCutMapper(unittest.TestCase):
+    def test_liberty_complex_cells_are_matched(self):
+        from core.synthesis.aig import AIG
+        from core.technology_mapping.technology_mapping import LibraryCell, TechnologyLibrary, techmap
+
+        library = TechnologyLibrary("liberty_style")
+        for name, function, area, delay, pins in (
+            ("inv", "!A", 1.0, 0.1, ["A"]),
+            ("nand2", "!(A&B)", 1.5, 0.12, ["A", "B"]),
+            ("a21oi", "(!A1&!B1) | (!A2&!B1)", 2.0, 0.15, ["A1", "A2", "B1"]),
+            ("mux2", "(A0&!S) | (A1&S)", 3.0, 0.2, ["A0", "A1", "S"]),
+        ):
+            library.add_cell(LibraryCell(name, function, area, delay, pins, ["Y"]))
+
+        aig = AIG()
+        a, b, c, s = (aig.create_pi(n) for n in ("a", "b", "c", "s"))
+        aig.add_po(aig.create_or(aig.create_and(a, aig.create_not(s)), aig.create_and(b, s)))
+        aig.add_po(aig.create_not(aig.create_or(aig.create_and(a, b), c)))
+        aig.add_po(aig.create_and(a, b), True)
+
+        results = techmap(aig, library, "cut", merge_standard_library=False)
+        used = {node.mapped_cell.name for node in results["_mapper"].logic_network.values()}
+        self.assertIn("mux2", used)
+        self.assertIn("a21oi", used)
+        self.assertEqual(results["strategy"], "cut")
+        netlist = _check_mapping(self, aig, results)
+        # PO đảo được map bằng cell (nand2), không sinh NOT chưa map
+        self.assertTrue(all(n["type"] != "NOT" for n in netlist["nodes"]))
+
+    def test_random_aigs_match_and_beat_per_node_mapping(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.technology_mapping.cut_mapper import critical_path_delay
+        from core.technology_mapping.technology_mapping import create_standard_library, techmap
+        from tests.test_fraig import _random_aig
+
+        for aig_class in (AIG, ArrayAIG):
+            for seed in range(4):
+                aig = _random_aig(aig_class, seed).strash()
+                results = techmap(aig, create_standard_library(), "cut")
+                mapper = results["_mapper"]
+                _check_mapping(self, aig, results, seed)
+
+                stats = mapper.stats
+                self.assertAlmostEqual(results["total_delay"], critical_path_delay(mapper))
+                self.assertAlmostEqual(results["total_delay"], stats["delay_optimal"])
+                self.assertLessEqual(stats["area_after_exact"], stats["area_delay_mapping"] + 1e-9)
+
+                baseline = techmap(aig, create_standard_library(), "area_optimal")
+                self.assertLess(results["total_area"], baseline["total_area"])
+                self.assertLess(results["total_delay"], critical_path_delay(baseline["_mapper"]))
+
+    def test_delay_relax_trades_delay_for_area(self):
+        from core.technology_mapping.technology_mapping import create_standard_library, techmap
+        from tools.benchmarks.bench_cec import ripple_adder
+
+        aig = ripple_adder(8)
+        tight = techmap(aig, create_standard_library(), "cut")
+        relaxed = techmap(aig, create_standard_library(), "cut", cut_options={"delay_relax": 0.5})
+        self.assertLessEqual(relaxed["total_area"], tight["total_area"] + 1e-9)
+        self.assertLessEqual(relaxed["total_delay"], tight["total_delay"] * 1.5 + 1e-9)
+        _check_mapping(self, aig, relaxed)
+
+
+if __name__ == "__main__":
+    unittest.main()
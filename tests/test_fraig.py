@@ -0,0 +1,72 @@
+import random
+import unittest
+
+
+def _random_aig(aig_class, seed, num_pis=8, num_gates=200):
+    rng = random.Random(seed)
+    aig = aig_class()
+    nodes = [aig.create_pi(f"p{i}") for i in range(num_pis)]
+    for _ in range(num_gates):
+        x, y = rng.choice(nodes), rng.choice(nodes)
+        r = rng.random()
+        if r < 0.2:
+            z = aig.create_xor(x, y)
+        elif r < 0.4:
+            z = aig.create_or(x, y)
+        elif r < 0.5:
+            z = aig.create_not(x)
+        else:
+            z = aig.create_and(x, y)
+        nodes.append(z)
+    for z in nodes[-6:]:
+        aig.add_po(z)
+    return aig
+
+
+class TestFraig(unittest.TestCase):
+    def test_merges_functionally_equivalent_structures(self):
+        from core.synthesis.aig import AIG
+        from core.optimization.fraig import FraigOptimizer
+        from core.verification.cec import check_equivalence
+
+        # XOR hai cách (strash không gộp được) + MUX và !MUX dạng khác
+        aig = AIG()
+        a, b, s = aig.create_pi("a"), aig.create_pi("b"), aig.create_pi("s")
+        aig.add_po(aig.create_xor(a, b))
+        aig.add_po(aig.create_and(aig.create_or(a, b), aig.create_not(aig.create_and(a, b))))
+        mux = aig.create_or(aig.create_and(s, a), aig.create_and(aig.create_not(s), b))
+        nmux = aig.create_or(aig.create_and(s, aig.create_not(a)),
+                             aig.create_and(aig.create_not(s), aig.create_not(b)))
+        aig.add_po(mux)
+        aig.add_po(nmux)
+        reference = aig.strash()
+
+        optimizer = FraigOptimizer()
+        result = optimizer.optimize(aig)
+        self.assertGreater(optimizer.stats["merged_sat"], 0)
+        self.assertLess(result.count_and_nodes(), reference.count_and_nodes())
+        self.assertIs(check_equivalence(reference, result).equivalent, True)
+        self.assertEqual(result.pos[0], result.pos[1])
+        # MUX = NOT(!MUX): một node NOT (AND(!x, CONST1)) trên node của !MUX
+        self.assertIs(result.pos[2][0].left, result.pos[3][0])
+
+    def test_random_aigs_in_place_and_rebuild(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.optimization.fraig import FraigOptimizer
+        from core.verification.cec import check_equivalence
+
+        for aig_class in (AIG, ArrayAIG):
+            for seed in range(8):
+                reference = _random_aig(aig_class, seed)
+                rebuilt = FraigOptimizer(num_patterns=64).optimize(_random_aig(aig_class, seed))
+                original = _random_aig(aig_class, seed)
+                in_place = FraigOptimizer(num_patterns=64).optimize(original, in_place=True)
+                self.assertIs(in_place, original)
+                self.assertEqual(rebuilt.count_and_nodes(), in_place.count_and_nodes())
+                self.assertIs(check_equivalence(reference, rebuilt).equivalent, True)
+                self.assertIs(check_equivalence(reference, in_place).equivalent, True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import io
+import os
+import tempfile
+import unittest
+
+_TRICKY_LIB = r"""
+/* header comment with { braces } and "quotes" */
+library ("tricky") {
+  date : "Mon { not a group }";
+  lu_table_template ("tmpl") {
+    variable_1 : input_net_transition;
+    variable_2 : total_output_net_capacitance;
+    index_1 ("0.1, 0.5");
+    index_2 ("0.01, 0.05");
+  }
+  operating_conditions ("tt") { process : 1.0; voltage : 1.8; }
+  cell ("lib__nand2_1") {
+    area : 3.75;
+    leakage_power () { value : 0.001; // skipped }
+      when : "!A&!B"; /* } */ related_pg_pin : "{VPWR}"; }
+    pin ("A") { direction : "input"; capacitance : 0.0023; }
+    pin ("B") { direction : input; capacitance : 0.0024;
+      internal_power () { rise_power ("tmpl") { values ("1, 2", "3, 4"); } }
+    }
+    pin ("Y") {
+      direction : "output";
+      function : "!(A&B)";
+      timing () {
+        related_pin : "A";
+        timing_sense : "negative_unate";
+        cell_rise ("tmpl") { values ("0.10, 0.30", \
+                                     "0.20, 0.40"); }
+        cell_fall ("tmpl") { values ("0.05, 0.15", "0.10, 0.20"); }
+      }
+    }
+  }
+  cell (plain_inv) {
+    area : 1.25; // trailing comment }
+    pin (A) { direction : input; }
+    pin (Y) { direction : output; function : "!A"; }
+  }
+}
+"""
+
+
+def _dump(group, depth=0):
+    rows = [(depth, group.name, tuple(group.args), tuple(sorted(group.attributes.items())),
+             tuple(sorted((k, tuple(v)) for k, v in group.complex_attributes.items())))]
+    for child in group.groups:
+        rows.extend(_dump(child, depth + 1))
+    return rows
+
+
+class TestLibertyParser(unittest.TestCase):
+    def test_tree_is_independent_of_chunk_boundaries(self):
+        from core.timing.liberty_parser import parse_liberty
+
+        reference = _dump(parse_liberty(io.StringIO(_TRICKY_LIB)))
+        for chunk_size in (1, 2, 3, 5, 8, 13, 64):
+            self.assertEqual(_dump(parse_liberty(io.StringIO(_TRICKY_LIB), chunk_size=chunk_size)), reference)
+
+        library = parse_liberty(io.StringIO(_TRICKY_LIB)).groups[0]
+        self.assertEqual((library.name, library.args), ("library", ["tricky"]))
+        self.assertEqual(library.attributes["date"], "Mon { not a group }")
+        nand = library.find("cell")[0]
+        rise = nand.find("pin")[2].find("timing")[0].find("cell_rise")[0]
+        self.assertEqual(rise.complex_attributes["values"], ["0.10, 0.30", "0.20, 0.40"])
+
+    def test_streaming_skips_unrequested_groups(self):
+        from core.timing.liberty_parser import iter_liberty_groups
+
+        groups = list(iter_liberty_groups(io.StringIO(_TRICKY_LIB), emit=("cell", "library"),
+                                          keep=("pin",), chunk_size=7))
+        self.assertEqual([g.name for g in groups], ["cell", "cell", "library"])
+        nand = groups[0]
+        self.assertEqual(nand.args, ["lib__nand2_1"])
+        self.assertEqual(nand.attributes["area"], "3.75")
+        self.assertEqual([g.name for g in nand.groups], ["pin", "pin", "pin"])
+        # internal_power / timing không nằm trong keep: bỏ qua hoàn toàn
+        self.assertTrue(all(not pin.groups for pin in nand.groups))
+        self.assertEqual(nand.find("pin")[1].attributes["capacitance"], "0.0024")
+        # Group đã emit không được gắn vào cha; group không yêu cầu cũng không
+        self.assertEqual(groups[2].groups, [])
+        self.assertEqual(groups[2].attributes["date"], "Mon { not a group }")
+
+    def test_load_liberty_library_with_quoted_cell_names(self):
+        from core.technology_mapping.library_loader import load_liberty_library
+
+        with tempfile.NamedTemporaryFile("w", suffix=".lib", delete=False, encoding="utf-8") as f:
+            f.write(_TRICKY_LIB)
+            path = f.name
+        try:
+            library = load_liberty_library(path)
+        finally:
+            os.unlink(path)
+        self.assertEqual(library.name, "tricky")
+        self.assertEqual(sorted(library.cells), ["lib__nand2_1", "plain_inv"])
+        nand = library.cells["lib__nand2_1"]
+        self.assertEqual(nand.function, "NAND(A,B)")
+        self.assertEqual((nand.input_pins, nand.output_pins), (["A", "B"], ["Y"]))
+        self.assertAlmostEqual(nand.area, 3.75)
+        self.assertAlmostEqual(nand.delay, 0.1875)  # trung bình cell_rise + cell_fall
+        self.assertAlmostEqual(nand.input_load, 0.00235)
+        self.assertEqual([arc.related_pin for arc in nand.timing.arcs], ["A"])
+        self.assertAlmostEqual(nand.timing.arcs[0].cell_rise.lookup(0.3, 0.03), 0.25)
+        inv = library.cells["plain_inv"]
+        self.assertEqual((inv.function, inv.timing, inv.delay), ("NOT(A)", None, 0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
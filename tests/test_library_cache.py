@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+
+class TestLibraryCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self._tmp.name, "cache")
+        self.lib_path = os.path.join(self._tmp.name, "bench.lib")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_snapshot_hit_stale_and_clear(self):
+        from core.technology_mapping.library_cache import (
+            cached_library, clear_library_cache, is_stale, list_cached_libraries,
+        )
+        from core.technology_mapping.library_loader import load_liberty_library
+        from tools.benchmarks.bench_liberty import synthetic_liberty
+
+        synthetic_liberty(self.lib_path, 12)
+        builds = []
+
+        def build():
+            builds.append(1)
+            return load_liberty_library(self.lib_path)
+
+        cold = cached_library("file", [self.lib_path], build, directory=self.cache)
+        warm = cached_library("file", [self.lib_path], build, directory=self.cache)
+        self.assertEqual(len(builds), 1)
+        self.assertIsNot(warm, cold)
+        self.assertEqual(sorted(warm.cells), sorted(cold.cells))
+        self.assertEqual(warm.function_map, cold.function_map)
+        # Index NPN và bản gộp standard library nằm sẵn trong snapshot
+        self.assertIsNotNone(warm._npn_index)
+        self.assertIsNotNone(warm._merged_standard)
+        name = sorted(cold.cells)[2]
+        self.assertEqual(warm.cells[name].timing.arcs[0].cell_rise.values,
+                         cold.cells[name].timing.arcs[0].cell_rise.values)
+
+        # Chỉ đổi mtime, nội dung giữ nguyên: vẫn dùng snapshot
+        st = os.stat(self.lib_path)
+        os.utime(self.lib_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        cached_library("file", [self.lib_path], build, directory=self.cache)
+        self.assertEqual(len(builds), 1)
+
+        # Nội dung đổi: snapshot hết hạn, nạp lại từ nguồn
+        synthetic_liberty(self.lib_path, 13)
+        entries = list_cached_libraries(self.cache)
+        self.assertEqual(len(entries), 1)
+        self.assertTrue(is_stale(entries[0]))
+        rebuilt = cached_library("file", [self.lib_path], build, directory=self.cache)
+        self.assertEqual((len(builds), len(rebuilt.cells)), (2, 13))
+        self.assertFalse(is_stale(list_cached_libraries(self.cache)[0]))
+
+        self.assertEqual(clear_library_cache(self.cache, stale_only=True), 0)
+        self.assertEqual(clear_library_cache(self.cache), 1)
+        self.assertEqual(list_cached_libraries(self.cache), [])
+
+    def test_load_library_from_file_uses_cache_and_techmap_matches(self):
+        from unittest import mock
+
+        from core.technology_mapping.technology_mapping import load_library_from_file, techmap
+        from tools.benchmarks.bench_cec import ripple_adder
+        from tools.benchmarks.bench_liberty import synthetic_liberty
+
+        synthetic_liberty(self.lib_path, 20)
+        aig = ripple_adder(4).strash()
+        with mock.patch.dict(os.environ, {"MYLOGIC_CACHE_DIR": self.cache, "MYLOGIC_LIBRARY_CACHE": "1"}):
+            cold = techmap(aig, load_library_from_file(self.lib_path), "cut")
+            self.assertEqual(len(os.listdir(self.cache)), 1)
+            warm = techmap(aig, load_library_from_file(self.lib_path), "cut")
+        uncached = techmap(aig, load_library_from_file(self.lib_path, use_cache=False), "cut")
+        for results in (warm, uncached):
+            self.assertAlmostEqual(results["total_area"], cold["total_area"])
+            self.assertAlmostEqual(results["total_delay"], cold["total_delay"])
+
+    def test_merged_standard_library_is_reused_until_cells_change(self):
+        from core.technology_mapping.technology_mapping import (
+            LibraryCell, TechnologyLibrary, merged_with_standard_library,
+        )
+
+        library = TechnologyLibrary("small")
+        library.add_cell(LibraryCell("inv", "!A", 1.0, 0.1, ["A"], ["Y"]))
+        merged = merged_with_standard_library(library)
+        self.assertIs(merged_with_standard_library(library), merged)
+        self.assertIn("inv", merged.cells)
+        library.add_cell(LibraryCell("nand2", "!(A&B)", 1.5, 0.12, ["A", "B"], ["Y"]))
+        remerged = merged_with_standard_library(library)
+        self.assertIsNot(remerged, merged)
+        self.assertIn("nand2", remerged.cells)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import random
+import unittest
+
+
+def _simulate_luts(netlist, values):
+    """Mô phỏng netlist LUT: output = bit ``row`` của INIT, pin i = bit i của row."""
+    signals = dict(values)
+    signals.update({"CONST0": 0, "CONST1": 1, "1'b0": 0, "1'b1": 1})
+    pending = list(netlist["nodes"])
+    while pending:
+        remaining = []
+        for node in pending:
+            if not all(i in signals for i in node["inputs"]):
+                remaining.append(node)
+                continue
+            kind = node["type"]
+            if kind in ("CONST0", "CONST1"):
+                signals[node["output"]] = int(kind == "CONST1")
+            elif kind == "BUF":
+                signals[node["output"]] = signals[node["inputs"][0]]
+            else:
+                row = sum(signals[s] << i for i, s in enumerate(node["inputs"]))
+                signals[node["output"]] = (node["init"] >> row) & 1
+        assert len(remaining) < len(pending), "combinational loop in LUT netlist"
+        pending = remaining
+    return [signals[o] for o in netlist["outputs"]]
+
+
+def _check_luts(test, aig, mapper, family, seed=0):
+    from core.technology_mapping.lut_mapper import lut_mapping_to_netlist
+    from tests.test_cut_mapper import _simulate_aig
+
+    netlist = lut_mapping_to_netlist(mapper, aig, family)
+    rng = random.Random(seed)
+    for _ in range(64):
+        values = {name: rng.randint(0, 1) for name in aig.pis}
+        test.assertEqual(_simulate_luts(netlist, values), _simulate_aig(aig, values))
+    return netlist
+
+
+class TestLUTMapper(unittest.TestCase):
+    def test_random_aigs_match_for_all_families(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.technology_mapping.lut_mapper import lut_map
+        from tests.test_fraig import _random_aig
+
+        for aig_class in (AIG, ArrayAIG):
+            for seed, (k, family) in enumerate(((6, "xilinx"), (4, "ice40"), (4, "intel"), (3, "gowin"))):
+                aig = _random_aig(aig_class, seed).strash()
+                mapper = lut_map(aig, k)
+                netlist = _check_luts(self, aig, mapper, family, seed)
+                stats = mapper.stats
+                self.assertLessEqual(stats["depth"], stats["depth_optimal"])
+                self.assertLessEqual(stats["luts_after_exact"], stats["luts_depth_mapping"])
+                self.assertTrue(all(len(leaves) <= k for _root, leaves, _t in mapper.luts))
+                self.assertEqual(stats["lut_count"], sum(1 for n in netlist["nodes"] if n.get("mapped")))
+
+    def test_adder_depth_and_inverted_outputs(self):
+        from core.synthesis.aig import AIG
+        from core.technology_mapping.lut_mapper import lut_map
+        from tools.benchmarks.bench_cec import ripple_adder
+
+        aig = ripple_adder(8).strash()
+        mapper = lut_map(aig, 6)
+        _check_luts(self, aig, mapper, "xilinx")
+        self.assertLess(mapper.stats["depth"], 8)
+        self.assertLess(mapper.stats["luts"], aig.count_and_nodes() // 2)
+
+        # PO đảo của PI, hằng và LUT dùng chung với PO không đảo
+        aig = AIG()
+        a, b, c = (aig.create_pi(n) for n in ("a", "b", "c"))
+        g = aig.create_or(aig.create_and(a, b), c)
+        aig.add_po(g)
+        aig.add_po(g, True)
+        aig.add_po(aig.create_and(a, c), True)
+        aig.add_po(a, True)
+        aig.add_po(aig.const0, True)
+        _check_luts(self, aig, lut_map(aig, 4), "lattice")
+
+    def test_bus_outputs_are_expanded_per_bit(self):
+        import os
+        import tempfile
+
+        from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+        from core.technology_mapping.lut_mapper import lut_map, lut_mapping_to_netlist
+        from frontends.verilog import parse_verilog
+        from tests.test_cut_mapper import _simulate_aig
+
+        source = ("module bus(\n  input [3:0] a,\n  input [3:0] b,\n  output s0,\n"
+                  "  output [3:0] d,\n  output co\n);\n  wire [4:0] t;\n  assign t = a + b;\n  assign s0 = t[0];\n  assign co = t[4];\n"
+                  "  assign d = a - b;\nendmodule\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bus.v")
+            with open(path, "w") as f:
+                f.write(source)
+            original = parse_verilog(path, strict=False)
+        aig = NetlistToAIGConverter().convert(original).strash()
+        netlist = lut_mapping_to_netlist(lut_map(aig, 6), aig, "xilinx", original)
+        self.assertEqual(netlist["outputs"], original["outputs"])
+        self.assertEqual(netlist["attrs"]["vector_widths"], {"a": 4, "b": 4, "d": 4})
+        bits = []
+        for name in netlist["outputs"]:
+            bits.extend([f"d[{i}]" for i in range(4)] if name == "d" else [name])
+        self.assertEqual(len(bits), len(aig.pos))
+        rng = random.Random(1)
+        for _ in range(64):
+            values = {name: rng.randint(0, 1) for name in aig.pis}
+            self.assertEqual(_simulate_luts(dict(netlist, outputs=bits), values), _simulate_aig(aig, values))
+
+        original["outputs"] = ["s0", "co"]
+        with self.assertRaises(ValueError):
+            lut_mapping_to_netlist(lut_map(aig, 6), aig, "xilinx", original)
+
+    def test_verilog_export_uses_vendor_primitives(self):
+        from core.export.verilog_writer import netlist_to_verilog
+        from core.technology_mapping.lut_mapper import get_lut_family, lut_map, lut_mapping_to_netlist
+        from tools.benchmarks.bench_cec import ripple_adder
+
+        aig = ripple_adder(4).strash()
+        netlist = lut_mapping_to_netlist(lut_map(aig, 6), aig, "xilinx")
+        text = netlist_to_verilog(netlist)
+        self.assertRegex(text, r"LUT[1-6] #\(\.INIT\([0-9]+'h[0-9A-F]+\)\)")
+        self.assertIn(".O(", text)
+
+        with self.assertRaises(ValueError):
+            lut_mapping_to_netlist(lut_map(aig, 6), aig, "ice40")
+        with self.assertRaises(ValueError):
+            get_lut_family("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import contextlib
+import io
+import unittest
+
+# Hai bản sao của (a & b) | c — bản thứ hai dùng tên assign khác nhau; out3 là dead code
+_DUP_BENCH = """INPUT(a)
+INPUT(b)
+INPUT(c)
+INPUT(d)
+OUTPUT(y1)
+OUTPUT(y2)
+t1 = AND(a, b)
+t2 = AND(b, a)
+y1 = OR(t1, c)
+y2 = OR(c, t2)
+dead = AND(t1, d)
+"""
+
+
+class TestNetlistDB(unittest.TestCase):
+    def test_indexes_follow_edits(self):
+        from core.synthesis.netlist_db import NetlistDB
+        from frontends.bench import read_bench_network
+
+        netlist = read_bench_network("dup.bench", text=_DUP_BENCH).to_netlist()
+        db = NetlistDB(netlist)
+        t1, t2 = db.driver_of("t1"), db.driver_of("t2")
+        y2 = db.driver_of("y2")
+        self.assertIsNone(db.driver_of("a"))
+        self.assertEqual(db.fanout_count("t1"), 2)
+        self.assertEqual(db.fanouts("a"), [t1, t2])
+        self.assertEqual(db.topological_order().index(t2) < db.topological_order().index(y2), True)
+
+        self.assertTrue(db.substitute(t2, "t1"))
+        self.assertEqual(db.driver_of("t2"), t1)
+        self.assertEqual(db.fanouts("t1"), [db.driver_of("y1"), db.driver_of("dead"), y2])
+        self.assertEqual(db.nodes[y2]["fanins"], [["c", False], ["t1", False]])
+        self.assertFalse(db.substitute(t1, "t2"))  # cùng net
+
+        db.remove_node(db.driver_of("dead"))
+        self.assertEqual(db.fanout_count("t1"), 2)
+        new_id = db.add_node({"type": "NOT", "fanins": [["y1", False]], "output": "n"})
+        self.assertEqual(db.driver_of("n"), new_id)
+        self.assertEqual(db.fanouts("y1"), [new_id])
+
+        out = db.to_netlist()
+        self.assertEqual(len(out["nodes"]), 4)
+        self.assertEqual(len(netlist["nodes"]), 5)  # netlist gốc không bị sửa
+        self.assertFalse(any(w["destination"] == t2 for w in out["wires"]))
+
+    def test_passes_preserve_function(self):
+        from core.optimization.balance import BalanceOptimizer
+        from core.optimization.constprop import ConstPropOptimizer
+        from core.optimization.cse import CSEOptimizer
+        from core.optimization.dce import DCEOptimizer
+        from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+        from core.synthesis.strash import StrashOptimizer
+        from core.verification.cec import check_equivalence
+        from frontends.bench import read_bench_network
+
+        text = _DUP_BENCH + "k = gnd\nz = NOR(y1, y2, d, a, k)\nOUTPUT(z)\n"
+        netlist = read_bench_network("dup.bench", text=text).to_netlist()
+        reference = NetlistToAIGConverter().convert(netlist)
+        passes = [
+            (lambda n: DCEOptimizer().optimize(n, "aggressive"), 4),
+            (lambda n: CSEOptimizer().optimize(n), 5),
+            (lambda n: StrashOptimizer().optimize(n), 5),
+            (lambda n: ConstPropOptimizer().optimize(n), 7),
+            (lambda n: BalanceOptimizer().optimize(n), 10),
+        ]
+        for optimize, expected_nodes in passes:
+            with contextlib.redirect_stdout(io.StringIO()):
+                optimized = optimize(netlist)
+            self.assertEqual(len(optimized["nodes"]), expected_nodes)
+            got = NetlistToAIGConverter().convert(optimized)
+            self.assertTrue(check_equivalence(reference, got).equivalent)
+
+
+if __name__ == "__main__":
+    unittest.main()
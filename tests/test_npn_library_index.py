@@ -0,0 +1,90 @@
+import random
+import unittest
+
+
+class TestNPNLibraryIndex(unittest.TestCase):
+    def test_equivalent_forms_match_same_cells(self):
+        from core.technology_mapping.technology_mapping import create_standard_library
+
+        library = create_standard_library()
+        names = lambda f: sorted(c.name for c in library.get_cells_for_function(f))
+
+        self.assertEqual(names("AND(x,y)"), ["AND2"])
+        # De Morgan / thứ tự đối số / cú pháp Liberty
+        self.assertEqual(names("NOT(OR(NOT(p),NOT(q)))"), ["AND2"])
+        self.assertEqual(names("!(a | b)"), ["NOR2"])
+        self.assertEqual(names("OR(AND(c,d),AND(a,b))'"), ["AOI22"])
+        self.assertEqual(names("NOT(OR(z,AND(x,y)))"), ["AOI21"])
+        # !a & b không có cell nào khớp chỉ bằng hoán vị pin (chuỗi cũ ra AND2 sai)
+        self.assertEqual(names("AND(NOT(a),b)"), [])
+        matches = library.match_function("AND(NOT(a),b)")
+        and2 = [m for m in matches if m.cell.name == "AND2"][0]
+        self.assertEqual((and2.input_phase >> and2.sources.index(0)) & 1, 1)
+        self.assertEqual(and2.output_phase, 0)
+        self.assertEqual(library.get_inverter().name, "INV")
+
+    def test_pin_binding_follows_cell_pins(self):
+        from core.technology_mapping.technology_mapping import LibraryCell, TechnologyLibrary
+
+        library = TechnologyLibrary("liberty_style")
+        library.add_cell(LibraryCell("and2b", "!A_N & B", 1.2, 0.1, ["A_N", "B"], ["X"]))
+        library.add_cell(LibraryCell("mux2", "(A0&!S) | (A1&S)", 3.0, 0.2, ["A0", "A1", "S"], ["X"]))
+
+        truth, names = library.function_truth("AND(b,NOT(a))")
+        self.assertEqual(names, ("b", "a"))
+        match = library.match_truth(truth)[0]
+        self.assertTrue(match.exact)
+        self.assertEqual([names[i] for i in match.sources], ["a", "b"])
+
+        truth, names = library.function_truth("OR(AND(sel,d1),AND(NOT(sel),d0))")
+        match = library.match_truth(truth)[0]
+        self.assertEqual(match.cell.name, "mux2")
+        self.assertTrue(match.exact)
+        self.assertEqual([names[i] for i in match.sources], ["d0", "d1", "sel"])
+
+        library.add_cell(LibraryCell("nand2", "!(A&B)", 1.0, 0.1, ["A", "B"], ["Y"]))
+        self.assertEqual(sorted(m.cell.name for m in library.match_function("x | y")), ["and2b", "nand2"])
+
+    def test_per_node_mapping_inserts_inverters_and_simulates(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.technology_mapping.technology_mapping import (
+            LibraryCell,
+            convert_mapped_logic_network_to_netlist,
+            create_standard_library,
+            techmap,
+        )
+        from tests.test_cut_mapper import _simulate_aig, _simulate_mapped
+        from tools.benchmarks.bench_inplace_optimize import build_raw
+
+        andn = create_standard_library()
+        andn.add_cell(LibraryCell("ANDN2", "AND(NOT(A),B)", 1.3, 0.15, ["A", "B"], ["Y"]))
+        for aig_class in (AIG, ArrayAIG):
+            aig = build_raw(aig_class, 600).strash()
+            aig.add_po(next(iter(aig.pis.values())), True)
+            for library, strategy in ((create_standard_library(), "area_optimal"),
+                                      (create_standard_library(), "delay_optimal"),
+                                      (andn, "balanced")):
+                results = techmap(aig, library, strategy, merge_standard_library=False)
+                mapper = results["_mapper"]
+                self.assertEqual(results["mapping_success_rate"], 1.0)
+                outputs = [f"y{i}" for i in range(len(aig.pos))]
+                netlist = convert_mapped_logic_network_to_netlist(
+                    mapper, aig, {"inputs": list(aig.pis), "outputs": outputs}
+                )
+                for node in netlist["nodes"]:
+                    if node["type"] == "NOT":
+                        node["type"] = "INV"
+                rng = random.Random(strategy)
+                for _ in range(32):
+                    values = {name: rng.randint(0, 1) for name in aig.pis}
+                    self.assertEqual(_simulate_mapped(netlist, library, values), _simulate_aig(aig, values))
+                if library is andn:
+                    self.assertIn("ANDN2", {n.mapped_cell.name for n in mapper.logic_network.values()})
+                    self.assertEqual(results["inverters_added"], 0)
+                else:
+                    self.assertGreater(results["inverters_added"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+
+class TestPassManager(unittest.TestCase):
+    def test_parse_script(self):
+        from core.optimization.pass_manager import PassCall, Repeat, ScriptError, parse_script
+
+        steps = parse_script("strash; dce; repeat(rewrite; balance) until gain<1%")
+        self.assertEqual([s.label for s in steps[:2]], ["strash", "dce"])
+        self.assertIsInstance(steps[2], Repeat)
+        self.assertEqual(steps[2].min_gain, 1.0)
+        self.assertEqual([s.label for s in steps[2].body], ["rewrite", "balance"])
+
+        steps = parse_script("# comment\nst\nrepeat 3 (rwz -T 2.5\n b)\n")
+        self.assertEqual(steps[1].max_iterations, 3)
+        call = steps[1].body[0]
+        self.assertIsInstance(call, PassCall)
+        self.assertEqual((call.label, call.timeout), ("rewrite -z", 2.5))
+
+        for bad in ("", "foo", "repeat(b", "rw -x", "repeat(b) until gain", "repeat 0 (b)", "b)"):
+            with self.assertRaises(ScriptError):
+                parse_script(bad)
+
+    def test_scripts_preserve_function_and_report(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.optimization.optimization_flow import optimize
+        from core.optimization.pass_manager import PassManager
+        from core.verification.cec import check_equivalence
+        from tests.test_fraig import _random_aig
+
+        for aig_class in (AIG, ArrayAIG):
+            for in_place in (False, True):
+                reference = _random_aig(aig_class, 3)
+                manager = PassManager("strash; dce; repeat(rw; b) until gain<1%; fraig; b",
+                                      in_place=in_place)
+                result = manager.run(_random_aig(aig_class, 3))
+                self.assertIs(check_equivalence(reference, result).equivalent, True)
+                self.assertLess(result.count_nodes(), reference.count_nodes())
+                stats = manager.stats
+                self.assertEqual(stats["nodes_after"], result.count_nodes())
+                first = stats["passes"][0]
+                self.assertEqual(first["pass"], "strash")
+                self.assertEqual(first["nodes_before"], reference.count_nodes())
+                self.assertIn("balance", manager.format_report())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fast.script")
+            with open(path, "w") as f:
+                f.write("strash\ndce  # rẻ cho design lớn\n")
+            result = optimize(_random_aig(AIG, 5), script=path)
+            self.assertIs(check_equivalence(_random_aig(AIG, 5), result).equivalent, True)
+
+    def test_early_exit_and_timeout(self):
+        from core.synthesis.aig import AIG
+        from core.optimization.pass_manager import PASS_REGISTRY, PassManager, register_pass
+        from tests.test_fraig import _random_aig
+
+        manager = PassManager("strash; strash; repeat 5 (strash; dce)")
+        manager.run(_random_aig(AIG, 1))
+        passes = manager.stats["passes"]
+        # strash lần 2 không đổi gì → strash/dce trong repeat bị bỏ, repeat dừng sau vòng 1
+        self.assertFalse(passes[1]["changed"])
+        self.assertEqual(len(passes), 4)
+        self.assertTrue(passes[2]["skipped"])
+
+        import time as _time
+
+        @register_pass("_sleep", "test only")
+        def _sleep(flow, aig, options):
+            _time.sleep(0.5)
+            return flow._run_dce(aig)
+
+        try:
+            aig = _random_aig(AIG, 2)
+            manager = PassManager("_sleep -T 0.05; dce")
+            result = manager.run(aig)
+            self.assertTrue(manager.stats["passes"][0]["timed_out"])
+            self.assertEqual(manager.stats["timeouts"], 1)
+            self.assertLess(manager.stats["passes"][0]["time"], 0.5)
+            self.assertEqual(result.count_nodes(), manager.stats["passes"][1]["nodes_after"])
+        finally:
+            del PASS_REGISTRY["_sleep"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+
+class TestRewrite(unittest.TestCase):
+    def test_library_covers_all_npn_classes(self):
+        from core.synthesis.npn import TT4_FULL, TT4_VARS, npn_apply, npn_canonical, npn_classes
+        from core.optimization.rewrite_library import REWRITE_LIBRARY
+
+        classes = npn_classes()
+        self.assertEqual(len(classes), 222)
+        self.assertEqual(sorted(REWRITE_LIBRARY), classes)
+        for rep, (nodes, out) in REWRITE_LIBRARY.items():
+            values = [0] + list(TT4_VARS)
+            for a, b in nodes:
+                va = values[a >> 1] ^ (TT4_FULL if a & 1 else 0)
+                vb = values[b >> 1] ^ (TT4_FULL if b & 1 else 0)
+                values.append(va & vb)
+            self.assertEqual(values[out >> 1] ^ (TT4_FULL if out & 1 else 0), rep)
+        for truth in (0x0000, 0x8000, 0x6996, 0xCAFE, 0x1234, 0xFFFF):
+            rep, transform = npn_canonical(truth)
+            self.assertEqual(npn_apply(rep, transform), truth)
+
+    def test_rewrite_reduces_redundant_logic(self):
+        from core.synthesis.aig import AIG
+        from core.optimization.rewrite import RewriteOptimizer
+        from core.verification.cec import check_equivalence
+
+        # (a & b) | (a & c) | (a & !b & !c) = a: strash không thấy, rewrite thấy
+        aig = AIG()
+        a, b, c = aig.create_pi("a"), aig.create_pi("b"), aig.create_pi("c")
+        nbc = aig.create_and(aig.create_not(b), aig.create_not(c))
+        f = aig.create_or(aig.create_or(aig.create_and(a, b), aig.create_and(a, c)), aig.create_and(a, nbc))
+        aig.add_po(f)
+        aig.add_po(aig.create_xor(aig.create_xor(a, b), c))
+        reference = aig.strash()
+
+        optimizer = RewriteOptimizer()
+        result = optimizer.optimize(aig)
+        self.assertGreater(optimizer.stats["rewrites"], 0)
+        self.assertLess(result.count_nodes(), reference.count_nodes())
+        self.assertIs(result.pos[0][0], result.pis["a"])
+        self.assertIs(check_equivalence(reference, result).equivalent, True)
+
+    def test_random_aigs_equivalent_in_both_modes(self):
+        from core.synthesis.aig import AIG
+        from core.synthesis.aig_array import ArrayAIG
+        from core.optimization.optimization_flow import AIGOptimizationFlow
+        from core.optimization.rewrite import RewriteOptimizer
+        from core.verification.cec import check_equivalence
+        from tests.test_fraig import _random_aig
+
+        for aig_class in (AIG, ArrayAIG):
+            for seed in range(4):
+                for zero_cost in (False, True):
+                    reference = _random_aig(aig_class, seed).strash()
+                    rebuilt = RewriteOptimizer(zero_cost=zero_cost).optimize(reference)
+                    self.assertLessEqual(rebuilt.count_nodes(), reference.count_nodes())
+                    self.assertIs(check_equivalence(reference, rebuilt).equivalent, True)
+
+                    aig = _random_aig(aig_class, seed)
+                    result = RewriteOptimizer(zero_cost=zero_cost).optimize(aig, in_place=True)
+                    self.assertIs(result, aig)
+                    self.assertEqual(result.count_nodes(), rebuilt.count_nodes())
+                    self.assertIs(check_equivalence(reference, result).equivalent, True)
+
+            flow = AIGOptimizationFlow(enable_rewrite=True, enable_fraig=False)
+            result = flow.optimize(_random_aig(aig_class, 7))
+            self.assertGreater(flow.optimization_stats["rewrite"]["removed"], 0)
+            self.assertIs(check_equivalence(_random_aig(aig_class, 7), result).equivalent, True)
+
+
+if __name__ == "__main__":
+    unittest.main()
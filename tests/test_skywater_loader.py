@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+
+def _signature(library):
+    return [
+        (name, cell.function, cell.area, cell.delay, cell.input_pins, cell.input_load,
+         [arc.cell_rise.values for arc in cell.timing.arcs])
+        for name, cell in library.cells.items()
+    ]
+
+
+class TestSkywaterLoader(unittest.TestCase):
+    def setUp(self):
+        from tools.benchmarks.bench_skywater_loader import synthetic_skywater_tree
+
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, "libraries")
+        self.corners = ["tt_025C_1v80", "ss_100C_1v60"]
+        synthetic_skywater_tree(self.root, 24, self.corners)
+        # File hỏng và file ccsnoise: bỏ qua
+        cell_dir = os.path.join(self.root, "sky130_fd_sc_hd", "latest", "cells", "bench0_0")
+        with open(os.path.join(cell_dir, "sky130_fd_sc_hd__broken_1__tt_025C_1v80.lib.json"), "w") as f:
+            f.write("{ not json")
+        with open(os.path.join(cell_dir, "sky130_fd_sc_hd__bench0_0_1__tt_025C_1v80_ccsnoise.lib.json"), "w") as f:
+            f.write("{}")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_parallel_executors_match_serial(self):
+        from core.technology_mapping.library_loader import load_skywater_sc_library
+
+        serial = load_skywater_sc_library(self.root, corner="tt_025C_1v80", use_cache=False, executor="serial")
+        self.assertEqual(serial.name, "sky130_fd_sc_hd__tt_025C_1v80")
+        self.assertEqual(len(serial.cells), 24)
+        for executor in ("thread", "process"):
+            library = load_skywater_sc_library(self.root, corner="tt_025C_1v80", use_cache=False,
+                                               workers=3, executor=executor)
+            self.assertEqual(_signature(library), _signature(serial), executor)
+        with self.assertRaises(ValueError):
+            load_skywater_sc_library(self.root, use_cache=False, workers=3, executor="gpu")
+
+    def test_multi_corner_library_and_cache(self):
+        from unittest import mock
+
+        from core.technology_mapping.library_loader import load_skywater_sc_corners, load_skywater_sc_library
+        from core.technology_mapping.technology_mapping import MultiCornerLibrary
+
+        multi = load_skywater_sc_corners(self.root, corners=self.corners, use_cache=False, workers=2)
+        self.assertIsInstance(multi, MultiCornerLibrary)
+        self.assertEqual((multi.corners, multi.default_corner), (self.corners, "tt_025C_1v80"))
+        self.assertEqual(len(multi.common_cells()), 24)
+        name = multi.common_cells()[0]
+        tt, ss = multi["tt_025C_1v80"].cells[name], multi["ss_100C_1v60"].cells[name]
+        self.assertEqual(tt.function, ss.function)
+        self.assertGreater(ss.delay, tt.delay)
+
+        cache = os.path.join(self._tmp.name, "cache")
+        with mock.patch.dict(os.environ, {"MYLOGIC_CACHE_DIR": cache, "MYLOGIC_LIBRARY_CACHE": "1"}):
+            single = load_skywater_sc_library(self.root, corner="ss_100C_1v60", workers=2)
+            self.assertEqual(len(os.listdir(cache)), 1)
+            # Góc ss lấy từ snapshot, góc tt được parse rồi ghi snapshot
+            cached = load_skywater_sc_corners(self.root, corners=self.corners, workers=2)
+            self.assertEqual(len(os.listdir(cache)), 2)
+        self.assertEqual(_signature(cached["ss_100C_1v60"]), _signature(single))
+        self.assertEqual(_signature(cached.default), _signature(multi.default))
+
+
+if __name__ == "__main__":
+    unittest.main()
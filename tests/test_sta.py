@@ -0,0 +1,182 @@
+import os
+import tempfile
+import unittest
+
+_MINI_LIB = r"""
+library (mini) {
+  time_unit : "1ns";
+  capacitive_load_unit (1, pf);
+  lu_table_template (delay_2x2) {
+    variable_1 : input_net_transition;
+    variable_2 : total_output_net_capacitance;
+    index_1 ("0.1, 0.5");
+    index_2 ("0.01, 0.05");
+  }
+  lu_table_template (load_first) {
+    variable_1 : total_output_net_capacitance;
+    variable_2 : input_net_transition;
+    index_1 ("0.01, 0.05");
+    index_2 ("0.1, 0.5");
+  }
+  cell (INVX1) {
+    area : 1.0;
+    pin (A) { direction : input; capacitance : 0.01; }
+    pin (Y) {
+      direction : output;
+      function : "!A";
+      timing () {
+        related_pin : "A";
+        timing_sense : negative_unate;
+        cell_rise (delay_2x2) { values ("0.10, 0.30", \
+                                        "0.20, 0.40"); }
+        cell_fall (delay_2x2) { values ("0.05, 0.15", "0.10, 0.20"); }
+        rise_transition (delay_2x2) { values ("0.10, 0.30", "0.20, 0.40"); }
+        fall_transition (delay_2x2) { values ("0.10, 0.30", "0.20, 0.40"); }
+      }
+    }
+  }
+  cell (NAND2X1) {
+    area : 1.5;
+    pin (A) { direction : input; capacitance : 0.02; }
+    pin (B) { direction : input; capacitance : 0.02; }
+    pin (Y) {
+      direction : output;
+      function : "!(A&B)";
+      timing () {
+        related_pin : "A B";
+        timing_sense : negative_unate;
+        cell_rise (load_first) { values ("0.2, 0.3", "0.4, 0.5"); }
+        cell_fall (scalar) { values ("0.25"); }
+        rise_transition (delay_2x2) { values ("0.1, 0.2", "0.3, 0.4"); }
+        fall_transition (delay_2x2) { values ("0.1, 0.2", "0.3, 0.4"); }
+      }
+    }
+  }
+}
+"""
+
+
+def _mini_library():
+    from core.technology_mapping.library_loader import load_liberty_library
+
+    with tempfile.NamedTemporaryFile("w", suffix=".lib", delete=False, encoding="utf-8") as f:
+        f.write(_MINI_LIB)
+        path = f.name
+    try:
+        return load_liberty_library(path)
+    finally:
+        os.unlink(path)
+
+
+def _mapped_adder(library, strategy="cut", bits=4):
+    from core.technology_mapping.technology_mapping import convert_mapped_logic_network_to_netlist, techmap
+    from tools.benchmarks.bench_cec import ripple_adder
+
+    aig = ripple_adder(bits).strash()
+    results = techmap(aig, library, strategy, merge_standard_library=False)
+    outputs = [f"y{i}" for i in range(len(aig.pos))]
+    return convert_mapped_logic_network_to_netlist(
+        results["_mapper"], aig, {"inputs": list(aig.pis), "outputs": outputs}
+    ), results["_mapper"].library
+
+
+class TestStaticTiming(unittest.TestCase):
+    def test_liberty_tables_and_inverter_chain(self):
+        from core.timing.sta import run_sta
+
+        library = _mini_library()
+        inv, nand = library.cells["INVX1"], library.cells["NAND2X1"]
+        self.assertEqual(inv.timing.pin_capacitance, {"A": 0.01})
+        self.assertAlmostEqual(nand.input_load, 0.02)
+        self.assertEqual([arc.related_pin for arc in nand.timing.arcs], ["A", "B"])
+        # Template load_first (variable_1 = load) được hoán vị về (slew, load)
+        rise = nand.timing.arcs[0].cell_rise
+        self.assertAlmostEqual(rise.lookup(0.1, 0.05), 0.4)
+        self.assertAlmostEqual(rise.lookup(0.3, 0.03), 0.35)
+        self.assertAlmostEqual(rise.lookup(0.9, 0.09), 0.8)  # ngoại suy
+        self.assertAlmostEqual(nand.timing.arcs[0].cell_fall.lookup(0.4, 0.04), 0.25)
+
+        netlist = {"inputs": ["a"], "outputs": ["y"], "nodes": [
+            {"id": "u1", "type": "INVX1", "inputs": ["a"], "output": "n1", "mapped": True},
+            {"id": "u2", "type": "INVX1", "inputs": ["n1"], "output": "n2", "mapped": True},
+            {"id": "po", "type": "BUF", "inputs": ["n2"], "output": "y", "mapped": False},
+        ]}
+        report = run_sta(netlist, library)
+        # Slew PI = 0.1; tải u1 = 0.01 (pin u2), tải u2 = output_load = 0.05/3
+        self.assertAlmostEqual(report.stats["input_slew"], 0.1)
+        self.assertAlmostEqual(report.stats["output_load"], 0.05 / 3)
+        # a rise -> n1 fall (0.05) -> n2 rise (0.10 + 0.2 * 1/6)
+        self.assertAlmostEqual(report.critical_delay, 0.05 + 0.1 + 0.2 / 6)
+        path = report.paths[0]
+        self.assertEqual([p.signal for p in path.points], ["a", "n1", "n2", "y"])
+        self.assertEqual([p.transition for p in path.points], ["rise", "fall", "rise", "rise"])
+        self.assertEqual(report.wns, 0.0)
+
+    def test_mapped_adder_paths_and_slack(self):
+        from core.timing.sta import run_sta
+
+        library = _mini_library()
+        for strategy in ("area_optimal", "cut"):
+            netlist, mapped_library = _mapped_adder(library, strategy)
+            report = run_sta(netlist, mapped_library, max_paths=3, clock_period=1.0)
+            self.assertEqual(report.stats["scalar_instances"], 0)
+            self.assertGreater(report.stats["nldm_instances"], 0)
+            self.assertEqual(len(report.paths), 3)
+            self.assertAlmostEqual(report.paths[0].arrival, report.critical_delay)
+            for path in report.paths:
+                # Tổng delay từng điểm = arrival ở endpoint
+                self.assertAlmostEqual(sum(p.delay for p in path.points), path.arrival)
+                self.assertIsNone(path.points[0].instance)
+                self.assertEqual(path.points[-1].signal, path.endpoint)
+            negative = [s for _a, s in report.endpoints.values() if s < 0]
+            self.assertAlmostEqual(report.wns, min(negative))
+            self.assertAlmostEqual(report.tns, sum(negative))
+            self.assertEqual(report.violations, len(negative))
+            relaxed = run_sta(netlist, mapped_library, clock_period=report.critical_delay + 1.0)
+            self.assertEqual((relaxed.wns, relaxed.tns, relaxed.violations), (0.0, 0, 0))
+
+    def test_scalar_library_in_complete_flow(self):
+        from core.complete_flow import run_complete_flow
+        from frontends.verilog import parse_verilog
+
+        verilog = """
+        module chain(input a, input b, input c, output y);
+          assign y = (a & b) | c;
+        endmodule
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".v", delete=False, encoding="utf-8") as f:
+            f.write(verilog)
+            path = f.name
+        try:
+            netlist = parse_verilog(path)
+        finally:
+            os.unlink(path)
+        results = run_complete_flow(netlist, write_verilog=False, run_timing_analysis=True,
+                                    sta_options={"clock_period": 0.01, "max_paths": 1})
+        timing = results["timing"]
+        report = timing["report"]
+        # Thư viện chuẩn không có bảng NLDM: delay scalar của cell
+        self.assertEqual(report.stats["nldm_instances"], 0)
+        self.assertGreater(timing["critical_delay"], 0.0)
+        self.assertLess(timing["wns"], 0.0)
+        self.assertEqual(len(report.paths), 1)
+
+    def test_numpy_engine_matches_python(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("numpy not installed")
+        from core.timing.sta import run_sta
+
+        netlist, library = _mapped_adder(_mini_library(), "cut", bits=16)
+        reference = run_sta(netlist, library, clock_period=2.0, use_numpy=False)
+        vectorized = run_sta(netlist, library, clock_period=2.0, use_numpy=True)
+        self.assertEqual(vectorized.stats["engine"], "numpy")
+        for name, (arrival, slack) in reference.endpoints.items():
+            self.assertAlmostEqual(vectorized.endpoints[name][0], arrival)
+            self.assertAlmostEqual(vectorized.endpoints[name][1], slack)
+        self.assertAlmostEqual(vectorized.tns, reference.tns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+_VERILOG = """module t(input a, input b, input c, output y, output z);
+  assign y = (a & b) | (a & c);
+  assign z = a ^ b ^ c;
+endmodule
+"""
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self):
+        from core.utils.performance import stop_tracing
+        stop_tracing()
+
+    def test_nested_spans_and_exports(self):
+        from core.utils.performance import Tracer
+
+        tracer = Tracer(trace_memory=True)
+        try:
+            with tracer.span("outer", category="test", n=1) as outer:
+                with tracer.span("inner"):
+                    data = [0] * 200000
+                    tracer.accumulate("item", 0.25, count=3)
+                    tracer.accumulate("item", 0.25)
+                del data
+                outer.set(nodes=7)
+            with self.assertRaises(ValueError):
+                with tracer.span("failing"):
+                    raise ValueError("boom")
+        finally:
+            tracer.close()
+
+        self.assertEqual([s.name for s in tracer.roots], ["outer", "failing"])
+        outer = tracer.roots[0]
+        inner = outer.children[0]
+        self.assertEqual(outer.args, {"n": 1, "nodes": 7})
+        self.assertEqual(inner.aggregates["item"], [0.5, 4])
+        self.assertGreater(inner.mem_peak_delta, 1_000_000)
+        self.assertGreaterEqual(outer.mem_peak_delta, inner.mem_peak_delta)
+        self.assertLessEqual(inner.start, inner.end)
+        self.assertGreaterEqual(outer.wall_time, inner.wall_time)
+        self.assertEqual(tracer.roots[1].args["error"], "ValueError")
+
+        events = tracer.to_chrome_trace()["traceEvents"]
+        self.assertEqual([e["name"] for e in events], ["outer", "inner", "item", "failing"])
+        self.assertTrue(all(e["ph"] == "X" for e in events))
+        self.assertEqual(events[2]["args"], {"count": 4, "aggregate": True})
+        self.assertEqual(events[2]["dur"], 500000.0)
+        summary = tracer.summary()
+        self.assertIn("    item", summary)
+        self.assertIn("nodes=7", summary)
+
+    def test_flow_is_instrumented(self):
+        from core.complete_flow import run_complete_flow
+        from core.utils.performance import start_tracing, stop_tracing, trace_span
+        from frontends.verilog.core.parser import parse_verilog
+
+        self.assertIsNone(trace_span("noop").__enter__().set(x=1))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "t.v")
+            with open(path, "w") as f:
+                f.write(_VERILOG)
+            tracer = start_tracing()
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_complete_flow(parse_verilog(path), output_dir=tmp, write_verilog=False)
+            self.assertIs(stop_tracing(), tracer)
+            trace_path = tracer.write_chrome_trace(os.path.join(tmp, "trace", "flow.json"))
+            with open(trace_path) as f:
+                names = {e["name"] for e in json.load(f)["traceEvents"]}
+
+        self.assertEqual([s.name for s in tracer.roots], ["parse", "synthesis", "optimize", "techmap"])
+        for name in ("parse.tokenize", "parse.validate", "parse.assign", "synthesis.AND",
+                     "optimize.fraig", "optimize.balance", "techmap.convert", "techmap.select"):
+            self.assertIn(name, names)
+        self.assertEqual(tracer.roots[1].args["aig_nodes"], tracer.roots[2].args["nodes_before"])
+
+
+if __name__ == "__main__":
+    unittest.main()
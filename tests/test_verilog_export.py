@@ -21,6 +21,78 @@ class TestVerilogExport(unittest.TestCase):
         self.assertIn("endmodule", v)
         self.assertIn("assign", v)
 
+    def test_streaming_writer_matches_string_export(self):
+        import io
+
+        from core.export import netlist_to_verilog, write_verilog
+
+        netlist = {
+            "name": "mix",
+            "inputs": ["a", "b", "c"],
+            "outputs": ["y", "z"],
+            "nodes": [
+                {"id": "and_0", "type": "AND", "fanins": [["a", False], ["b", True], ["c", False]], "output": "t"},
+                {"id": "u0", "type": "sky130_fd_sc_hd__nand2_1", "inputs": ["t", "c"], "output": "y[0]",
+                 "input_pins": ["A", "B"], "output_pins": ["Y"]},
+                {"id": "not_0", "type": "NOT", "inputs": ["t"], "output": "y[1]"},
+                {"id": "buf_0", "type": "BUF", "inputs": ["const_True"], "output": "z"},
+            ],
+            "attrs": {"vector_widths": {"y": 2}},
+        }
+        buf = io.StringIO()
+        stats = write_verilog(netlist, buf, module_name="mix")
+        text = buf.getvalue()
+        self.assertEqual(text, netlist_to_verilog(netlist, "mix"))
+        self.assertEqual((stats["assigns"], stats["instances"], stats["wires"]), (3, 1, 1))
+        self.assertIn("output wire [1:0] y", text)
+        self.assertIn("assign t = a & ~b & c;", text)
+        self.assertIn("sky130_fd_sc_hd__nand2_1 u_u0 (.A(t), .B(c), .Y(y[0]));", text)
+
+    def test_nodes_without_statement_declare_no_wires(self):
+        import io
+
+        from core.export import write_verilog
+
+        netlist = {
+            "name": "skip",
+            "inputs": ["a", "b"],
+            "outputs": ["y"],
+            "nodes": [
+                {"id": "slice_1", "type": "SLICE", "fanins": [["v", False], ["4", False]], "output": "s"},
+                {"id": "and_0", "type": "AND", "fanins": [["a", False]], "output": "dead"},
+                {"id": "buf_0", "type": "BUF", "inputs": ["m"], "output": "m"},
+                {"id": "and_1", "type": "AND", "inputs": ["a", "b"], "output": "bus.x[1]"},
+                {"id": "buf_1", "type": "BUF", "inputs": ["bus.x[1]"], "output": "y"},
+            ],
+        }
+        buf = io.StringIO()
+        stats = write_verilog(netlist, buf)
+        text = buf.getvalue()
+        self.assertEqual((stats["assigns"], stats["instances"], stats["wires"]), (2, 0, 1))
+        self.assertEqual([l.strip() for l in text.splitlines() if l.strip().startswith("wire")],
+                         ["wire \\bus.x[1] ;"])
+
+    def test_aig_direct_writer_round_trips(self):
+        import io
+
+        from core.export import write_aig_verilog
+        from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+        from core.verification.cec import check_equivalence
+        from frontends.verilog import parse_verilog
+        from tools.benchmarks.bench_cec import ripple_adder
+
+        aig = ripple_adder(4)
+        names = [f"s{i}" for i in range(len(aig.pos) - 1)] + ["cout"]
+        buf = io.StringIO()
+        write_aig_verilog(aig, buf, module_name="adder4", output_names=names)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "adder4.v")
+            with open(path, "w") as f:
+                f.write(buf.getvalue())
+            again = NetlistToAIGConverter().convert(parse_verilog(path, strict=False))
+        self.assertEqual(sorted(again.pis), sorted(aig.pis))
+        self.assertTrue(check_equivalence(aig, again).equivalent)
+
 
 if __name__ == "__main__":
     unittest.main()
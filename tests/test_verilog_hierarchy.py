@@ -0,0 +1,199 @@
+import os
+import tempfile
+import unittest
+
+_FA = """module fa(input a, input b, input cin, output s, output cout);
+  assign s = a ^ b ^ cin;
+  assign cout = (a & b) | (cin & (a ^ b));
+endmodule
+"""
+
+_ADD = """module add #(parameter W = 2) (
+  input [W-1:0] x,
+  input [W-1:0] y,
+  output [W-1:0] s,
+  output co
+);
+  wire [W:0] c;
+  assign c[0] = 1'b0;
+  fa f0 (.a(x[0]), .b(y[0]), .cin(c[0]), .s(s[0]), .cout(c[1]));
+  fa f1 (x[1], y[1], c[1], s[1], c[2]);
+  fa f2 (.a(x[2]), .b(y[2]), .cin(c[2]), .s(s[2]), .cout(c[3])), f3 (.a(x[3]), .b(y[3]), .cin(c[3]), .s(s[3]), .cout(co));
+endmodule
+"""
+
+_TOP = """module top(
+  input [3:0] p,
+  input [3:0] q,
+  output [3:0] r,
+  output k
+);
+  add #(.W(4)) u (.x(p), .y(q), .s(r), .co(k));
+endmodule
+"""
+
+_INV = """module inv4(
+  input [3:0] i,
+  output [3:0] o
+);
+  assign o = ~i;
+endmodule
+"""
+
+_INVN = """module invn #(parameter N = 2) (
+  input [N-1:0] i,
+  output [N-1:0] o
+);
+  assign o = ~i;
+endmodule
+"""
+
+
+class TestVerilogHierarchy(unittest.TestCase):
+    def _write(self, tmp: str, name: str, source: str) -> str:
+        path = os.path.join(tmp, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+        return path
+
+    def _parse(self, source: str, strict: bool = False):
+        from frontends.verilog import parse_verilog
+        with tempfile.TemporaryDirectory() as tmp:
+            return parse_verilog(self._write(tmp, "t.v", source), strict=strict)
+
+    def _check_adder(self, netlist):
+        from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+        from core.verification.simulation import AIGSimulator
+
+        converter = NetlistToAIGConverter()
+        aig = converter.convert(netlist)
+        self.assertEqual(sorted(converter._templates), ["add#(W=4)", "fa"])
+        sim = AIGSimulator(aig)
+        result = sim.simulate_exhaustive()
+        for t in range(result.num_patterns):
+            bits = {name: (word >> t) & 1 for name, word in zip(sim.pi_names, result.pi_words)}
+            p = sum(bits[f"p[{i}]"] << i for i in range(4))
+            q = sum(bits[f"q[{i}]"] << i for i in range(4))
+            got = sum(((word >> t) & 1) << i for i, word in enumerate(result.po_values))
+            self.assertEqual(got, p + q)
+
+    def _check_inverter(self, netlist):
+        from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+        from core.verification.simulation import AIGSimulator
+
+        aig = NetlistToAIGConverter().convert(netlist)
+        self.assertEqual(len(aig.pos), 4)
+        sim = AIGSimulator(aig)
+        self.assertFalse([name for name in sim.pi_names if name.startswith("u1.")])
+        result = sim.simulate_exhaustive()
+        for t in range(result.num_patterns):
+            bits = {name: (word >> t) & 1 for name, word in zip(sim.pi_names, result.pi_words)}
+            a = sum(bits[f"a[{i}]"] << i for i in range(4))
+            got = sum(((word >> t) & 1) << i for i, word in enumerate(result.po_values))
+            self.assertEqual(got, ~a & 0xF)
+
+    def test_instances_are_elaborated_with_parameters(self):
+        netlist = self._parse(_FA + _ADD + _TOP)
+        self.assertEqual(netlist["name"], "top")
+        self.assertEqual(sorted(netlist["attrs"]["hierarchy"]), ["add#(W=4)", "fa"])
+        node = [n for n in netlist["nodes"] if n["type"] == "MODULE"][0]
+        self.assertEqual(node["module_key"], "add#(W=4)")
+        self.assertEqual(node["output_bits"]["s"], ["r[0]", "r[1]", "r[2]", "r[3]"])
+        child = netlist["attrs"]["hierarchy"]["add#(W=4)"]
+        # Ordered ports (f1) và nhiều instance một statement (f2, f3)
+        insts = child["attrs"]["module_instantiations"].values()
+        self.assertEqual(sorted(i["instance_name"] for i in insts), ["f0", "f1", "f2", "f3"])
+        f1 = [i for i in insts if i["instance_name"] == "f1"][0]
+        self.assertEqual(f1["connections"]["cout"], "c[2]")
+
+    def test_stitched_aig_matches_addition(self):
+        self._check_adder(self._parse(_FA + _ADD + _TOP))
+
+    def test_strict_mode_accepts_library_modules(self):
+        self._check_adder(self._parse(_FA + _ADD + _TOP, strict=True))
+
+    def test_whole_vector_port_connections(self):
+        top = "module top(\n  input [3:0] a,\n  output [3:0] y\n);\n  inv4 u1 (.i(a), .o(y));\nendmodule\n"
+        self._check_inverter(self._parse(_INV + top))
+        self._check_inverter(self._parse(_INV + top, strict=True))
+
+    def test_parameterised_vector_ports(self):
+        top = "module top(\n  input [3:0] a,\n  output [3:0] y\n);\n  invn #(.N(4)) u1 (.i(a), .o(y));\nendmodule\n"
+        netlist = self._parse(_INVN + top)
+        self.assertEqual(list(netlist["attrs"]["hierarchy"]), ["invn#(N=4)"])
+        self._check_inverter(netlist)
+
+    def test_top_defined_first(self):
+        netlist = self._parse(_TOP + _ADD + _FA)
+        self.assertEqual(netlist["name"], "top")
+        self._check_adder(netlist)
+
+    def test_multi_file_hierarchy(self):
+        from frontends.verilog import parse_verilog_hierarchy
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [self._write(tmp, "top.v", _TOP), self._write(tmp, "add.v", _ADD),
+                     self._write(tmp, "fa.v", _FA)]
+            netlist = parse_verilog_hierarchy(paths)
+        self.assertEqual(netlist["name"], "top")
+        self._check_adder(netlist)
+
+    def test_shell_read_and_flow_take_several_files(self):
+        import contextlib
+        import io
+
+        from cli.mylogic_shell import MyLogicShell
+        from core.complete_flow import run_complete_flow
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [self._write(tmp, "fa.v", _FA), self._write(tmp, "add.v", _ADD),
+                     self._write(tmp, "top.v", _TOP)]
+            shell = MyLogicShell()
+            shell.auto_export_json = False
+            with contextlib.redirect_stdout(io.StringIO()):
+                shell.commands["read"](["read"] + paths + ["--top", "add"])
+            self.assertEqual(shell.current_netlist["name"], "add")
+            self.assertEqual(list(shell.current_netlist["attrs"]["hierarchy"]), ["fa"])
+            with contextlib.redirect_stdout(io.StringIO()):
+                shell.commands["read"](["read"] + paths)
+            self.assertEqual(shell.current_netlist["name"], "top")
+
+            results = run_complete_flow(paths, enable_optimization=False, enable_techmap=False,
+                                        write_verilog=False)
+            self.assertEqual(results["synthesis"]["stats"]["primary_outputs"], 5)
+
+    def test_identical_instances_synthesize_once(self):
+        from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+        from tools.benchmarks.designs import adder_array
+
+        hier = self._parse(adder_array(50, 4))
+        flat = self._parse(adder_array(50, 4, hierarchical=False))
+        self.assertEqual(list(hier["attrs"]["hierarchy"]), ["ripple_adder_4"])
+        converter = NetlistToAIGConverter()
+        aig = converter.convert(hier)
+        self.assertEqual(list(converter._templates), ["ripple_adder_4"])
+        self.assertEqual(len(aig.pos), 50 * 5)
+        self.assertEqual(aig.count_and_nodes(), NetlistToAIGConverter().convert(flat).count_and_nodes())
+
+    def test_unknown_parameter(self):
+        from core.utils.error_handling import ParserError
+
+        source = _FA + _ADD + _TOP.replace(".W(4)", ".Z(4)")
+        netlist = self._parse(source)
+        info = list(netlist["attrs"]["module_instantiations"].values())[0]
+        self.assertIn("no parameter 'Z'", info["elaboration_error"])
+        self.assertNotIn("hierarchy", netlist["attrs"])
+        with self.assertRaises(ParserError):
+            self._parse(source, strict=True)
+
+    def test_recursive_instantiation_raises(self):
+        from core.utils.error_handling import ParserError
+
+        source = "module r(input a, output y);\n  r u (.a(a), .y(y));\nendmodule\n"
+        with self.assertRaises(ParserError) as ctx:
+            self._parse(source, strict=True)
+        self.assertIn("Recursive", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
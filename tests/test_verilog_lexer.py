@@ -0,0 +1,108 @@
+import os
+import tempfile
+import time
+import unittest
+
+_MODULE = """`default_nettype none
+// comment với ; và begin
+module t #(parameter W = (2)) (input a, input b, output y, output z);
+  (* keep *) wire w;
+  /* ;; end; */
+  assign w = a & b;  // ;;
+  assign y = w;
+  always @(*) begin
+    if (a) z = b; else z = w;
+  end
+endmodule
+"""
+
+
+class TestVerilogLexer(unittest.TestCase):
+    def _parse(self, source: str):
+        from frontends.verilog import parse_verilog
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "t.v")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+            return parse_verilog(path)
+
+    def test_tokens_have_line_and_column(self):
+        from frontends.verilog.core.lexer import tokenize
+
+        tokens = list(tokenize("module m;\n  // x\n  assign y = 8'hFF; (* a *) \"s;\"\n"))
+        self.assertEqual([t.text for t in tokens],
+                         ["module", "m", ";", "assign", "y", "=", "8'hFF", ";", '"s;"'])
+        self.assertEqual([t.kind for t in tokens[-3:]], ["number", "op", "string"])
+        self.assertEqual((tokens[3].line, tokens[3].col), (3, 3))
+        self.assertEqual((tokens[6].line, tokens[6].col), (3, 14))
+
+    def test_scan_items_and_keyword_index(self):
+        from frontends.verilog.core.lexer import scan_module
+
+        scan = scan_module(_MODULE)
+        self.assertEqual(scan.name, "t")
+        self.assertEqual(scan.default_nettype, "none")
+        self.assertEqual(scan.param_list.strip(), "parameter W = (2)")
+        self.assertEqual([item[0] for item in scan.items], ["wire", "assign", "assign", "always"])
+        self.assertEqual(scan.item_indices(("assign",)), [1, 2])
+        self.assertEqual(scan.text_for("assign").split(), ["assign", "w", "=", "a", "&", "b;",
+                                                           "assign", "y", "=", "w;"])
+        self.assertFalse(scan.problems)
+        self.assertEqual(scan.begin_count, scan.end_count)
+
+    def test_last_module_and_digit_leading_name(self):
+        from frontends.verilog.core.lexer import scan_module
+
+        scan = scan_module("module a(x); input x; endmodule\nmodule 01_top(y); output y; endmodule\n")
+        self.assertEqual(scan.name, "01_top")
+        self.assertEqual(scan.line(scan.body_start), 2)
+
+    def test_parse_ignores_comments_strings_and_attributes(self):
+        netlist = self._parse(_MODULE)
+        self.assertEqual(netlist["name"], "t")
+        self.assertEqual(sorted(netlist["outputs"]), ["y", "z"])
+
+    def test_error_lines(self):
+        cases = {
+            "extra ';' (found ';;') at line 4": "module t(a, y);\n input a;\n output y;\n assign y = a;;\nendmodule\n",
+            "'end;' is invalid (use 'end' without ';') at line 5":
+                "module t(a, y);\n input a;\n output reg y;\n always @(*) begin\n  y = a; end;\nendmodule\n",
+            "begin/end mismatch (begin=1 end=0)":
+                "module t(a, y);\n input a;\n output reg y;\n always @(*) begin\n  y = a;\nendmodule\n",
+            "thiếu 'assign' hoặc statement không hợp lệ tại dòng 5":
+                "module t(a, y);\n input a;\n output y;\n\n y = a;\nendmodule\n",
+            "invalid token after ';' near ';x":
+                "module t(a, y);\n input a;\n output y;\n assign y = a;x\nendmodule\n",
+            "unbalanced delimiters": "module t(a, y);\n input a;\n output y;\n assign y = {a;\nendmodule\n",
+            "thiếu 'endmodule'": "module t(a, y);\n input a;\n output y;\n assign y = a;\n",
+        }
+        for message, source in cases.items():
+            with self.subTest(message=message):
+                with self.assertRaises(Exception) as ctx:
+                    self._parse(source)
+                self.assertIn(message, str(ctx.exception))
+
+    def test_wire_declaration_does_not_swallow_next_assign(self):
+        netlist = self._parse("module t(a, b, x, y);\n input a, b;\n output x, y;\n wire n;\n"
+                              " assign n = ~a;\n assign x = n;\n assign y = ~b;\nendmodule\n")
+        types = [node["type"] for node in netlist["nodes"]]
+        self.assertEqual(types.count("NOT"), 2)
+
+    def test_parse_time_scales_linearly(self):
+        from tools.benchmarks.designs import random_dag
+
+        def timed(gates):
+            source = random_dag(gates)
+            start = time.perf_counter()
+            netlist = self._parse(source)
+            self.assertEqual(len(netlist["outputs"]), 16)
+            return time.perf_counter() - start
+
+        timed(500)
+        small, large = timed(2000), timed(8000)
+        # 4x kích thước → ~4x thời gian; bản quét lại body theo từng statement cũ là ~16x
+        self.assertLess(large, small * 8 + 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
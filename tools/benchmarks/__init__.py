@@ -0,0 +1,58 @@
+"""
+MyLogic EDA Tool - Benchmarks Module
+====================================
+
+Standalone performance benchmarks for core data structures and passes.
+
+Available benchmarks:
+    - bench_aig_array: AIG vs ArrayAIG memory / construction time
+    - bench_deep_chain: 100k-level chain through strash/optimize/techmap
+    - bench_inplace_optimize: optimize() rebuild vs in-place (time / peak memory)
+    - bench_simulation: bit-parallel AIG simulation throughput (node-patterns/s)
+    - bench_cec: equivalence checking (structural / SAT-proved / buggy adders)
+    - bench_fraig: FRAIG functional reduction (adder miter / raw random AIG)
+    - bench_cuts: k-feasible cut enumeration with truth tables (time / memory)
+    - bench_rewrite: DAG-aware rewriting (rw / rwz / rw; rwz; rw on adders and raw AIG)
+    - bench_balance: supergate balancing (depth before/after on chains, adders, raw AIG)
+    - bench_techmap: per-node techmap strategies vs cut mapper (area / critical path / time)
+    - bench_lutmap: priority-cut FPGA k-LUT mapping (LUT count / depth / time, 100k-AND AIG)
+    - bench_sta: NLDM static timing analysis on a 500k-instance netlist (Python vs NumPy engine)
+    - bench_liberty: streaming Liberty parser on a Sky130-sized library (time / peak memory)
+    - bench_library_cache: compiled-library snapshot cache (cold vs warm techmap startup)
+    - bench_skywater_loader: parallel SkyWater .lib.json loader (serial / thread / process pool, multi-corner)
+    - bench_aiger: AIGER .aig/.aag read/write on a 1.4M-node AIG (time / size vs JSON export)
+    - bench_suite: benchmark-suite runner for .bench/.blif/.aig files (read / strash / optimize scaling)
+    - bench_verilog_writer: streaming Verilog writer on a 1M-instance mapped netlist and AIG-direct export
+    - bench_netlist_passes: NetlistDB-backed dce/cse/constprop/balance/strash on 5k-130k node netlists (scaling)
+    - bench_scaling: parametric designs (adders, comparators, muxes, random DAGs, XOR chains) through
+      parse/synthesis/optimize/techmap - time / memory / QoR, scaling exponents, baseline regression gate
+    - designs: Verilog generators used by bench_scaling and bench_hierarchy
+    - bench_verilog_parser: single-pass lexer + parse_verilog on flat assign / mapped netlists (MB/s scaling)
+    - bench_hierarchy: 1000 adder instances parsed/synthesized once per (module, params) vs flattened source
+"""
+
+__all__ = [
+    'bench_aig_array',
+    'bench_deep_chain',
+    'bench_inplace_optimize',
+    'bench_simulation',
+    'bench_cec',
+    'bench_fraig',
+    'bench_cuts',
+    'bench_rewrite',
+    'bench_balance',
+    'bench_techmap',
+    'bench_lutmap',
+    'bench_sta',
+    'bench_liberty',
+    'bench_library_cache',
+    'bench_skywater_loader',
+    'bench_aiger',
+    'bench_suite',
+    'bench_verilog_writer',
+    'bench_netlist_passes',
+    'bench_scaling',
+    'designs',
+    'bench_verilog_parser',
+    'bench_hierarchy',
+]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AIG (object-based) vs ArrayAIG (array-backed)
+
+Đo bộ nhớ (tracemalloc: bộ nhớ AIG giữ lại sau khi build, và peak) và thời gian xây dựng một AIG ngẫu nhiên
+có N AND node với cả hai backend, dùng cùng chuỗi lệnh create_pi/create_and.
+"ArrayAIG/lit" dùng API literal (create_and_lit), không giữ handle cho mỗi node;
+"ArrayAIG/batch" chạy cả chuỗi một lần qua ``create_and_program`` (vòng inline,
+bảng strash và các cột được cấp trước theo số op); chuỗi op literal được dựng sẵn
+ngoài vùng đo, như script của các backend khác. Thời gian là min của ``--repeat`` lần.
+
+Mục tiêu của yêu cầu ban đầu: bộ nhớ giảm ≥5x, xây dựng nhanh ≥3x; dòng
+"target" cho biết từng backend đạt hay chưa. Exit code 1 nếu không backend nào
+đạt cả hai mục tiêu.
+
+Usage:
+    python tools/benchmarks/bench_aig_array.py [--nodes 1000000] [--pis 64] [--seed 1] [--repeat 3]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.aig import AIG
+from core.synthesis.aig_array import ArrayAIG
+
+
+def _make_script(num_nodes: int, num_pis: int, seed: int):
+    """Pre-generate fanin choices so both backends replay identical work."""
+    rng = random.Random(seed)
+    script = []
+    for i in range(num_nodes):
+        limit = num_pis + i
+        script.append((rng.randrange(limit), rng.randrange(limit),
+                       rng.random() < 0.5, rng.random() < 0.5))
+    return script
+
+
+def build(aig_class, script, num_pis: int):
+    """Build a random AIG replaying ``script``; returns the AIG."""
+    aig = aig_class()
+    pool = [aig.create_pi(f"pi{i}") for i in range(num_pis)]
+    create_and = aig.create_and
+    append = pool.append
+    for a, b, inv_a, inv_b in script:
+        append(create_and(pool[a], pool[b], inv_a, inv_b))
+    for node in pool[-min(len(pool), 32):]:
+        aig.add_po(node)
+    return aig
+
+
+def build_literal(aig_class, script, num_pis: int):
+    """Same as ``build`` but through the ArrayAIG literal API (no node handles)."""
+    aig = aig_class()
+    pool = [aig.create_pi(f"pi{i}").node_id << 1 for i in range(num_pis)]
+    create_and_lit = aig.create_and_lit
+    append = pool.append
+    for a, b, inv_a, inv_b in script:
+        append(create_and_lit(pool[a] | inv_a, pool[b] | inv_b))
+    for lit in pool[-min(len(pool), 32):]:
+        aig.add_po(aig.node(lit >> 1))
+    return aig
+
+
+def _script_ops(script):
+    """Script → op ``(ref0, ref1)`` của ``create_and_program`` (``index * 2 + inverted``)."""
+    return [((a << 1) | inv_a, (b << 1) | inv_b) for a, b, inv_a, inv_b in script]
+
+
+def build_program(aig_class, ops, num_pis: int):
+    """Same as ``build_literal`` but one ``create_and_program`` call for the whole script (``_script_ops``)."""
+    aig = aig_class()
+    lits = [aig.create_pi(f"pi{i}").node_id << 1 for i in range(num_pis)]
+    aig.create_and_program(lits, ops)
+    for lit in lits[-min(len(lits), 32):]:
+        aig.add_po(aig.node(lit >> 1))
+    return aig
+
+
+def measure(builder, aig_class, script, num_pis: int, repeat: int = 1):
+    """Return (best seconds of ``repeat`` runs, retained_bytes, peak_bytes, and_nodes) for one backend."""
+    elapsed = float("inf")
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        aig = builder(aig_class, script, num_pis)
+        elapsed = min(elapsed, time.perf_counter() - start)
+        and_nodes = aig.count_and_nodes()
+        del aig
+        gc.collect()
+
+    # Memory is measured in a separate run so tracing overhead does not skew timing
+    tracemalloc.start()
+    aig = builder(aig_class, script, num_pis)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del aig
+    gc.collect()
+    return elapsed, retained, peak, and_nodes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AIG vs ArrayAIG benchmark")
+    parser.add_argument("--nodes", type=int, default=1_000_000, help="number of AND nodes")
+    parser.add_argument("--pis", type=int, default=64, help="number of primary inputs")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per backend (best is reported)")
+    parser.add_argument("--speedup-target", type=float, default=3.0)
+    parser.add_argument("--memory-target", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    script = _make_script(args.nodes, args.pis, args.seed)
+
+    print(f"AIG construction benchmark: {args.nodes} AND nodes, {args.pis} PIs")
+    results = {}
+    ops = _script_ops(script)
+    runs = (
+        ("AIG", build, AIG, script),
+        ("ArrayAIG", build, ArrayAIG, script),
+        ("ArrayAIG/lit", build_literal, ArrayAIG, script),
+        ("ArrayAIG/batch", build_program, ArrayAIG, ops),
+    )
+    for name, builder, cls, workload in runs:
+        elapsed, retained, peak, and_nodes = measure(builder, cls, workload, args.pis, args.repeat)
+        results[name] = (elapsed, retained)
+        print(f"  {name:<15} time={elapsed:8.3f}s  aig_mem={retained / 1e6:8.1f} MB  "
+              f"peak_mem={peak / 1e6:8.1f} MB  and_nodes={and_nodes}")
+
+    t_old, m_old = results["AIG"]
+    met_both = False
+    for name, _builder, _cls, _workload in runs[1:]:
+        t_new, m_new = results[name]
+        speedup = t_old / max(t_new, 1e-9)
+        reduction = m_old / max(m_new, 1)
+        fast, small = speedup >= args.speedup_target, reduction >= args.memory_target
+        met_both = met_both or (fast and small)
+        print(f"  {name:<15} speedup={speedup:.2f}x  memory_reduction={reduction:.2f}x  "
+              f"target: speedup {'met' if fast else 'NOT met'} "
+              f"({args.speedup_target:g}x), memory "
+              f"{'met' if small else 'NOT met'} ({args.memory_target:g}x)")
+    return 0 if met_both else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AIGER reader/writer
+
+1. Ghi/đọc binary ``.aig`` và ASCII ``.aag`` cho ripple adder lớn (mặc định
+   60k bit ≈ 1.4M node ``AIG``, 540k AND sau khi bỏ NOT) — thời gian và kích thước.
+2. So sánh với JSON export (``aig_to_netlist`` + ``json.dump``, như ``export --aig``)
+   trên adder nhỏ hơn (``--json-width``), vì JSON của 1M node mất nhiều phút/GB.
+
+Usage:
+    python tools/benchmarks/bench_aiger.py [--width 60000] [--json-width 10000] [--array]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.aig import aig_to_netlist
+from core.synthesis.aig_array import ArrayAIG
+from core.synthesis.aiger import read_aiger, write_aiger
+from tools.benchmarks.bench_cec import ripple_adder
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AIGER read/write benchmark")
+    parser.add_argument("--width", type=int, default=60000, help="ripple adder width (AIGER runs)")
+    parser.add_argument("--json-width", type=int, default=10000, help="adder width for the JSON comparison (0: skip)")
+    parser.add_argument("--array", action="store_true", help="read into ArrayAIG")
+    args = parser.parse_args(argv)
+    aig_class = ArrayAIG if args.array else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        aig, elapsed = _timed(lambda: ripple_adder(args.width))
+        print(f"AIGER: ripple_adder({args.width}) = {aig.count_nodes()} nodes "
+              f"({aig.count_and_nodes()} AND incl. NOT), built in {elapsed:.2f}s")
+        for ext in ("aig", "aag"):
+            path = os.path.join(tmp, f"adder.{ext}")
+            header, t_write = _timed(lambda: write_aiger(aig, path))
+            model, t_read = _timed(lambda: read_aiger(path, aig_class=aig_class))
+            ok = "OK" if model.header == header and len(model.aig.pos) == len(aig.pos) else "MISMATCH"
+            print(f"  .{ext}  write {t_write:6.2f}s  read {t_read:6.2f}s  "
+                  f"{os.path.getsize(path) / 1e6:8.2f} MB  ({header.ands} ANDs) [{ok}]")
+
+        if args.json_width:
+            small = ripple_adder(args.json_width)
+            json_path = os.path.join(tmp, "adder.json")
+            aig_path = os.path.join(tmp, "small.aig")
+
+            def export_json():
+                netlist = aig_to_netlist(small, None, simplify_and_with_const1=False)
+                with open(json_path, "w", encoding="utf-8") as f:
+                    json.dump({"netlist": netlist}, f, indent=2, ensure_ascii=False)
+
+            _, t_json = _timed(export_json)
+            _, t_aig = _timed(lambda: write_aiger(small, aig_path))
+            json_size, aig_size = os.path.getsize(json_path), os.path.getsize(aig_path)
+            print(f"JSON export vs .aig on ripple_adder({args.json_width}) ({small.count_nodes()} nodes):")
+            print(f"  json  {t_json:6.2f}s  {json_size / 1e6:8.2f} MB")
+            print(f"  .aig  {t_aig:6.2f}s  {aig_size / 1e6:8.2f} MB  ({json_size / aig_size:.0f}x smaller)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AIG balancing (supergate + cây Huffman theo level)
+
+Báo độ sâu / số node trước và sau ``AIGBalanceOptimizer`` cho:
+1. Chain AND dài (comparator kiểu a0 & a1 & ... viết tuần tự) - trường hợp
+   balance giảm độ sâu từ N xuống log2(N).
+2. Adder ripple-carry (bench_cec): độ sâu bị chặn bởi chuỗi XOR/OR, gần như
+   không đổi.
+3. AIG ngẫu nhiên "raw" (bench_inplace_optimize.build_raw) sau strash.
+
+Usage:
+    python tools/benchmarks/bench_balance.py [--nodes 100000] [--chain 4096] [--array]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.aig import AIG
+from core.synthesis.aig_array import ArrayAIG
+from core.optimization.balance import AIGBalanceOptimizer
+from tools.benchmarks.bench_cec import ripple_adder
+from tools.benchmarks.bench_inplace_optimize import build_raw
+
+
+def and_chain(aig_class, length: int):
+    aig = aig_class()
+    pis = [aig.create_pi(f"a{i}") for i in range(length)]
+    node = pis[0]
+    for i, pi in enumerate(pis[1:]):
+        node = aig.create_and(node, pi, False, bool(i & 1))
+    aig.add_po(node)
+    return aig
+
+
+def _report(label: str, aig):
+    for in_place in (False, True):
+        balancer = AIGBalanceOptimizer()
+        start = time.perf_counter()
+        balancer.optimize(aig.strash(), in_place=in_place)
+        elapsed = time.perf_counter() - start
+        stats = balancer.stats
+        print(f"  {label:<26} {'in-place' if in_place else 'rebuild':<9} "
+              f"depth {stats['depth_before']:>6} -> {stats['depth_after']:<6} "
+              f"nodes {stats['nodes_before']:>7} -> {stats['nodes_after']:<7} "
+              f"supergates={stats['supergates']:<7} time={elapsed:6.2f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AIG balancing benchmark")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--chain", type=int, default=4096)
+    parser.add_argument("--array", action="store_true", help="use ArrayAIG backend")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    aig_class = ArrayAIG if args.array else AIG
+    print(f"AIGBalanceOptimizer.optimize() (backend={aig_class.__name__}):")
+    _report(f"AND chain ({args.chain})", and_chain(aig_class, args.chain))
+    _report("ripple adder (64-bit)", ripple_adder(64))
+    _report(f"raw ({args.nodes} nodes)", build_raw(aig_class, args.nodes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark: AIG rất sâu (chain 100k level)
+
+Xây một chuỗi AND/XOR có độ sâu N rồi chạy các bước strash, optimize,
+techmap (aig_to_logic_nodes) và aig_to_netlist. Trước khi có traversal không
+đệ quy (core/synthesis/aig_traversal.py) các bước này dừng với RecursionError.
+
+Usage:
+    python tools/benchmarks/bench_deep_chain.py [--depth 100000] [--xor] [--array]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.aig import AIG, aig_to_netlist
+from core.synthesis.aig_array import ArrayAIG
+
+
+def build_chain(aig_class, depth: int, use_xor: bool = False):
+    """Chain x_{i+1} = x_i op pi_(i mod 8) với độ sâu ``depth``."""
+    aig = aig_class()
+    pis = [aig.create_pi(f"in{i}") for i in range(8)]
+    node = pis[0]
+    for i in range(depth):
+        pi = pis[(i + 1) % len(pis)]
+        if use_xor:
+            node = aig.create_xor(node, pi)
+        else:
+            node = aig.create_and(node, pi, False, bool(i & 1))
+    aig.add_po(node)
+    return aig
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deep AIG chain stress benchmark")
+    parser.add_argument("--depth", type=int, default=100_000)
+    parser.add_argument("--xor", action="store_true", help="XOR chain instead of AND chain")
+    parser.add_argument("--array", action="store_true", help="use ArrayAIG backend")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    from core.optimization.optimization_flow import optimize
+    from core.technology_mapping.technology_mapping import techmap, create_standard_library
+
+    aig_class = ArrayAIG if args.array else AIG
+    print(f"Deep chain stress: depth={args.depth} xor={args.xor} backend={aig_class.__name__} "
+          f"(recursion limit {sys.getrecursionlimit()})")
+
+    stages = [
+        ("build", lambda _: build_chain(aig_class, args.depth, args.xor)),
+        ("strash", lambda aig: aig.strash()),
+        ("optimize", lambda aig: optimize(aig)),
+        ("techmap", lambda aig: (techmap(aig, create_standard_library()), aig)[1]),
+        ("aig_to_netlist", lambda aig: (aig_to_netlist(aig), aig)[1]),
+    ]
+    aig = None
+    for name, fn in stages:
+        start = time.perf_counter()
+        try:
+            aig = fn(aig)
+        except RecursionError as e:
+            print(f"  {name:<15} FAILED: RecursionError ({e})")
+            return 1
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<15} {elapsed:8.3f}s  nodes={aig.count_nodes()}  max_level={aig.max_level}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parse + synthesis phân cấp với cache theo (module, tham số)
+
+``adder_array(count)`` instance ``ripple_adder_<n>`` ``count`` lần; bản phân cấp
+parse module con một lần (``ModuleLibrary``) và synthesize một template AIG rồi
+chép cho từng instance. So với cùng design đã flatten thành assign: thời gian
+parse / synthesis, số template, số AND (phải bằng nhau).
+
+Usage:
+    python tools/benchmarks/bench_hierarchy.py [--instances 100 1000] [--bits 8]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+from frontends.verilog.core.parser import parse_verilog
+from tools.benchmarks.designs import adder_array
+
+
+def _bench(label: str, path: str) -> int:
+    start = time.perf_counter()
+    netlist = parse_verilog(path)
+    t_parse = time.perf_counter() - start
+    converter = NetlistToAIGConverter()
+    start = time.perf_counter()
+    aig = converter.convert(netlist)
+    t_synth = time.perf_counter() - start
+    ands = aig.count_and_nodes()
+    print(f"  {label:<14} parse {t_parse:6.2f}s  synth {t_synth:6.2f}s  "
+          f"{len(netlist['nodes']):7d} nodes  {len(converter._templates):3d} templates  {ands:8d} ANDs")
+    return ands
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hierarchical parse/synthesis benchmark")
+    parser.add_argument("--instances", type=int, nargs="+", default=[100, 1000],
+                        help="number of adder instances")
+    parser.add_argument("--bits", type=int, default=8, help="adder width")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.instances:
+            print(f"{count} x ripple_adder_{args.bits}:")
+            ands = []
+            for hierarchical in (True, False):
+                label = "hierarchical" if hierarchical else "flat"
+                path = os.path.join(tmp, f"adder_array_{count}_{label}.v")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(adder_array(count, args.bits, hierarchical))
+                ands.append(_bench(label, path))
+            if ands[0] != ands[1]:
+                print(f"  MISMATCH: {ands[0]} vs {ands[1]} ANDs")
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AIGOptimizationFlow rebuild (mặc định) vs in-place
+
+Xây một AIG "raw" giống output của synthesis (không strash, không fold hằng số,
+có node trùng và fanin hằng số), rồi đo thời gian và peak memory (tracemalloc)
+của ``optimize(aig)`` và ``optimize(aig, in_place=True)``.
+
+Usage:
+    python tools/benchmarks/bench_inplace_optimize.py [--nodes 200000] [--array]
+"""
+
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.aig import AIG
+from core.synthesis.aig_array import ArrayAIG
+from core.optimization.optimization_flow import AIGOptimizationFlow
+
+
+def build_raw(aig_class, num_nodes: int, num_pis: int = 64, seed: int = 1):
+    """Random raw AIG: ~10% duplicate nodes, ~2% constant fanins; mọi node không có fanout là PO."""
+    rng = random.Random(seed)
+    aig = aig_class(enable_strash=False, enable_const_simplify=False)
+    pool = [aig.create_pi(f"pi{i}") for i in range(num_pis)]
+    for _ in range(num_nodes):
+        r = rng.random()
+        if r < 0.1 and len(pool) > num_pis:
+            src = pool[rng.randrange(num_pis, len(pool))]
+            node = aig.create_and(src.left, src.right, src.left_inverted, src.right_inverted)
+        elif r < 0.12:
+            node = aig.create_and(pool[rng.randrange(len(pool))], aig.const1, rng.random() < 0.5, False)
+        else:
+            node = aig.create_and(pool[rng.randrange(len(pool))], pool[rng.randrange(len(pool))],
+                                  rng.random() < 0.5, rng.random() < 0.5)
+        pool.append(node)
+    used = set()
+    for node in pool[num_pis:]:
+        used.add(node.left.node_id)
+        used.add(node.right.node_id)
+    for node in pool[num_pis:]:
+        if node.node_id not in used:
+            aig.add_po(node, rng.random() < 0.5)
+    return aig
+
+
+def _optimize(aig_class, num_nodes: int, in_place: bool, trace: bool):
+    aig = build_raw(aig_class, num_nodes)
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0] if trace else 0
+    start = time.perf_counter()
+    flow = AIGOptimizationFlow(in_place=in_place)
+    result = flow.optimize(aig)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+    stats = (result.count_nodes(), flow.compactions)
+    del aig, result, flow
+    gc.collect()
+    return elapsed, peak, stats
+
+
+def run(aig_class, num_nodes: int, in_place: bool):
+    """Return (seconds, extra_peak_bytes, (nodes_after, compactions))."""
+    # Timing and memory are measured in separate runs (tracemalloc slows allocation)
+    elapsed, _peak, stats = _optimize(aig_class, num_nodes, in_place, trace=False)
+    _elapsed, peak, _stats = _optimize(aig_class, num_nodes, in_place, trace=True)
+    return elapsed, peak, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild vs in-place AIG optimization")
+    parser.add_argument("--nodes", type=int, default=200_000)
+    parser.add_argument("--array", action="store_true", help="use ArrayAIG backend")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    aig_class = ArrayAIG if args.array else AIG
+    print(f"optimize() on raw AIG: {args.nodes} AND nodes, backend={aig_class.__name__}")
+    results = {}
+    for mode, in_place in (("rebuild", False), ("in-place", True)):
+        elapsed, peak, (nodes, compactions) = run(aig_class, args.nodes, in_place)
+        results[mode] = (elapsed, peak)
+        print(f"  {mode:<9} time={elapsed:8.3f}s  extra_peak_mem={peak / 1e6:8.1f} MB  "
+              f"nodes_after={nodes}  compactions={compactions}")
+    t_old, m_old = results["rebuild"]
+    t_new, m_new = results["in-place"]
+    print(f"  speedup={t_old / max(t_new, 1e-9):.2f}x  peak_memory_reduction={m_old / max(m_new, 1):.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming Liberty parser
+
+Sinh file .lib kiểu Sky130 HD (tên cell trong ngoặc kép, bảng NLDM 7x7 cho
+timing và internal_power, nhiều leakage_power, dòng nối bằng ``\\``) với số cell
+tùy chọn, rồi đo thời gian và peak memory (tracemalloc) của:
+1. ``load_liberty_library`` (streaming, chỉ dựng cell / pin / timing).
+2. ``parse_liberty`` dựng cây đầy đủ (mọi group) — để so sánh.
+
+Mặc định ~430 cell ≈ kích thước thư viện sky130_fd_sc_hd tt (~13 MB); có thể
+truyền file .lib thật bằng ``--lib``.
+
+Usage:
+    python tools/benchmarks/bench_liberty.py [--cells 430] [--scale 1] [--lib path/to/file.lib]
+"""
+
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.technology_mapping.library_loader import load_liberty_library
+from core.timing.liberty_parser import parse_liberty
+
+_INDEX_SLEW = "0.01, 0.023, 0.053, 0.12, 0.28, 0.65, 1.5"
+_INDEX_LOAD = "0.0005, 0.0013, 0.0035, 0.0094, 0.025, 0.067, 0.18"
+_FUNCTIONS = (
+    (["A"], "!A"), (["A"], "A"), (["A", "B"], "!(A&B)"), (["A", "B"], "(A&B)"),
+    (["A", "B"], "!(A|B)"), (["A", "B"], "(A^B)"), (["A1", "A2", "B1"], "(!A1&!B1) | (!A2&!B1)"),
+    (["A0", "A1", "S"], "(A0&!S) | (A1&S)"), (["A", "B", "C"], "(A&B&C)"), (["A", "B", "C", "D"], "!(A|B|C|D)"),
+)
+
+
+def _table(kind: str, template: str, rng: random.Random) -> str:
+    rows = ", \\\n".join(
+        '"' + ", ".join(f"{rng.uniform(0.01, 2.0):.7f}" for _ in range(7)) + '"' for _ in range(7)
+    )
+    return f"                {kind} (\"{template}\") {{\n                    values ({rows});\n                }}\n"
+
+
+def synthetic_liberty(path: str, cells: int, seed: int = 1) -> int:
+    """Ghi file .lib tổng hợp ``cells`` cell; trả về kích thước file (byte)."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('library ("sky130_fd_sc_hd__bench") {\n')
+        f.write('    /* synthetic Sky130-style library */\n    time_unit : "1ns";\n')
+        f.write('    capacitive_load_unit (1.0000000000, "pf");\n')
+        for template, var_1, var_2, idx_1, idx_2 in (
+            ("del_1_7_7", "input_net_transition", "total_output_net_capacitance", _INDEX_SLEW, _INDEX_LOAD),
+            ("power_inputs_1", "input_transition_time", "total_output_net_capacitance", _INDEX_SLEW, _INDEX_LOAD),
+        ):
+            f.write(f'    lu_table_template ("{template}") {{\n        variable_1 : "{var_1}";\n'
+                    f'        variable_2 : "{var_2}";\n        index_1 ("{idx_1}");\n        index_2 ("{idx_2}");\n    }}\n')
+        for i in range(cells):
+            pins, function = _FUNCTIONS[i % len(_FUNCTIONS)]
+            f.write(f'    cell ("sky130_fd_sc_hd__bench{i}_{i % 4 + 1}") {{\n        area : {rng.uniform(3, 30):.4f};\n')
+            for when in range(16):
+                f.write(f'        leakage_power () {{\n            value : {rng.uniform(0, 0.01):.7f};\n'
+                        f'            when : "!A&B&{when}";\n        }}\n')
+            for pin in pins:
+                f.write(f'        pin ("{pin}") {{\n            capacitance : {rng.uniform(0.001, 0.005):.7f};\n'
+                        f'            direction : "input";\n')
+                f.write('            internal_power () {\n')
+                f.write(_table("rise_power", "power_inputs_1", rng))
+                f.write(_table("fall_power", "power_inputs_1", rng))
+                f.write("            }\n        }\n")
+            f.write(f'        pin ("X") {{\n            direction : "output";\n            function : "{function}";\n')
+            for pin in pins:
+                f.write('            internal_power () {\n')
+                f.write(_table("rise_power", "power_inputs_1", rng))
+                f.write(_table("fall_power", "power_inputs_1", rng))
+                f.write(f'                related_pin : "{pin}";\n            }}\n')
+            for pin in pins:
+                f.write(f'            timing () {{\n                related_pin : "{pin}";\n'
+                        f'                timing_sense : "non_unate";\n                timing_type : "combinational";\n')
+                for kind in ("cell_rise", "cell_fall", "rise_transition", "fall_transition"):
+                    f.write(_table(kind, "del_1_7_7", rng))
+                f.write("            }\n")
+            f.write("        }\n    }\n")
+        f.write("}\n")
+    return os.path.getsize(path)
+
+
+def _measure(fn, trace: bool):
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming Liberty parser runtime / memory benchmark")
+    parser.add_argument("--cells", type=int, default=430)
+    parser.add_argument("--scale", type=int, default=1, help="multiply the cell count (large vendor libraries)")
+    parser.add_argument("--lib", default=None, help="benchmark an existing .lib file instead")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    path = args.lib
+    tmp_dir = None
+    if path is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp_dir.name, "bench.lib")
+        synthetic_liberty(path, args.cells * args.scale)
+    size_mb = os.path.getsize(path) / 1e6
+    print(f"liberty: {path} ({size_mb:.1f} MB)")
+    try:
+        for label, fn in (
+            ("load_liberty_library (streaming)", lambda: load_liberty_library(path)),
+            ("parse_liberty (full tree)", lambda: parse_liberty(path)),
+        ):
+            # Thời gian và bộ nhớ đo ở hai lần chạy riêng (tracemalloc làm chậm cấp phát)
+            elapsed, _peak, result = _measure(fn, trace=False)
+            _elapsed, peak, _result = _measure(fn, trace=True)
+            extra = f" cells={len(result.cells)}" if hasattr(result, "cells") else ""
+            print(f"  {label:<34} time={elapsed:6.2f}s ({size_mb / elapsed:5.1f} MB/s) "
+                  f"peak={peak / 1e6:7.1f} MB{extra}")
+            del result, _result
+    finally:
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled-library cache — thời gian khởi động techmap cold vs warm
+
+Mỗi lần đo chạy một process Python mới (như mỗi lần gọi shell ``techmap`` /
+``run_complete_flow``): import, nạp thư viện qua ``load_library_from_file``
+rồi ``techmap`` một adder nhỏ (gộp standard library). Đo:
+1. cold: cache trống (nạp .lib, chuẩn hóa hàm, index NPN, bảng NPN, ghi snapshot);
+2. warm: snapshot đã có;
+3. no-cache: ``MYLOGIC_LIBRARY_CACHE=0``.
+
+Thư viện mặc định: file .lib kiểu Sky130 HD tổng hợp (bench_liberty); có thể
+truyền file thật bằng ``--lib``.
+
+Usage:
+    python tools/benchmarks/bench_library_cache.py [--cells 430] [--lib path] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from core.technology_mapping.library_cache import clear_library_cache
+from tools.benchmarks.bench_liberty import synthetic_liberty
+
+_CHILD = r"""
+import json, logging, sys, time
+start = time.perf_counter()
+logging.disable(logging.INFO)
+from core.technology_mapping.technology_mapping import load_library_from_file, techmap
+from tools.benchmarks.bench_cec import ripple_adder
+t_import = time.perf_counter()
+library = load_library_from_file(sys.argv[1])
+t_load = time.perf_counter()
+results = techmap(ripple_adder(8).strash(), library, "area_optimal")
+t_map = time.perf_counter()
+print(json.dumps({"import": t_import - start, "load": t_load - t_import, "techmap": t_map - t_load,
+                  "total": t_map - start, "cells": len(library.cells), "area": results["total_area"]}))
+"""
+
+
+def _run(lib_path: str, env: dict) -> dict:
+    out = subprocess.run([sys.executable, "-c", _CHILD, lib_path], cwd=ROOT, env=env,
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compiled-library cache cold/warm techmap startup benchmark")
+    parser.add_argument("--cells", type=int, default=430)
+    parser.add_argument("--lib", default=None, help="benchmark an existing library file instead")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lib_path = args.lib or os.path.join(tmp, "bench.lib")
+        if args.lib is None:
+            synthetic_liberty(lib_path, args.cells)
+        cache = os.path.join(tmp, "cache")
+        env = dict(os.environ, MYLOGIC_CACHE_DIR=cache, MYLOGIC_LIBRARY_CACHE="1",
+                   PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+        print(f"library cache: {lib_path} ({os.path.getsize(lib_path) / 1e6:.1f} MB), {args.runs} runs each")
+        modes = (
+            ("cold", env, True),
+            ("warm", env, False),
+            ("no-cache", dict(env, MYLOGIC_LIBRARY_CACHE="0"), False),
+        )
+        for label, mode_env, clear in modes:
+            runs = []
+            for _ in range(args.runs):
+                if clear:
+                    clear_library_cache(cache)
+                runs.append(_run(lib_path, mode_env))
+            best = min(runs, key=lambda r: r["total"])
+            print(f"  {label:<9} total={best['total']:6.3f}s (import {best['import']:.3f}s, "
+                  f"load {best['load']:.3f}s, techmap {best['techmap']:.3f}s) "
+                  f"cells={best['cells']} area={best['area']:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FPGA k-LUT mapping (priority cuts)
+
+Với mỗi mạch và mỗi K báo số LUT / LUT depth sau từng pass (depth-optimal,
+area-flow, exact-area) và thời gian:
+1. Adder ripple-carry và Kogge-Stone (bench_cec).
+2. AIG ngẫu nhiên "raw" 100k AND (bench_inplace_optimize.build_raw) sau strash —
+   mục tiêu < 30s cho K=6.
+
+Usage:
+    python tools/benchmarks/bench_lutmap.py [--nodes 100000] [--width 64] [-K 4 6] [--array]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.aig import AIG
+from core.synthesis.aig_array import ArrayAIG
+from core.technology_mapping.lut_mapper import lut_map, lut_mapping_to_netlist
+from tools.benchmarks.bench_cec import kogge_stone_adder, ripple_adder
+from tools.benchmarks.bench_inplace_optimize import build_raw
+
+
+def _report(label: str, aig, ks):
+    aig = aig.strash()
+    print(f"  {label} ({aig.count_and_nodes()} AND nodes)")
+    for k in ks:
+        mapper = lut_map(aig, k)
+        lut_mapping_to_netlist(mapper, aig, "xilinx")
+        s = mapper.stats
+        print(f"    K={k} luts={s['lut_count']:>7} depth={s['lut_depth']:>3} "
+              f"(depth pass {s['luts_depth_mapping']}, flow {s['luts_after_flow']}, "
+              f"exact {s['luts_after_exact']}) "
+              f"time={s['time']:6.2f}s (depth {s['time_depth']:.2f}s, flow {s['time_flow']:.2f}s, "
+              f"exact {s['time_exact']:.2f}s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FPGA LUT mapping QoR / runtime benchmark")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--width", type=int, default=64)
+    parser.add_argument("-K", type=int, nargs="+", default=[4, 6])
+    parser.add_argument("--array", action="store_true", help="use ArrayAIG backend for the raw AIG")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    aig_class = ArrayAIG if args.array else AIG
+    print("lutmap: priority-cut k-LUT mapping")
+    _report(f"ripple adder ({args.width}-bit)", ripple_adder(args.width), args.K)
+    _report(f"Kogge-Stone adder ({args.width}-bit)", kogge_stone_adder(args.width), args.K)
+    _report(f"raw ({args.nodes} nodes, {aig_class.__name__})", build_raw(aig_class, args.nodes), args.K)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
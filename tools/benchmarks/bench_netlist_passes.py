@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: các pass trên netlist dictionary qua ``NetlistDB``
+
+Đo thời gian ``strash`` / ``cse`` / ``constprop`` / ``balance`` / ``dce`` (netlist,
+không phải AIG) trên Kogge-Stone adder nhiều kích thước (``aig_to_bench`` →
+``read_bench_network().to_netlist()``, node dạng ``fanins`` có tên ``output``)
+và số mũ scaling theo số node (~1.0 = tuyến tính; trước ``NetlistDB`` các pass
+này tìm driver bằng quét tuyến tính nên bậc hai trên netlist 10k node).
+
+Usage:
+    python tools/benchmarks/bench_netlist_passes.py [--sizes 128,512,2048]
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.export.bench_writer import aig_to_bench
+from core.optimization.balance import BalanceOptimizer
+from core.optimization.constprop import ConstPropOptimizer
+from core.optimization.cse import CSEOptimizer
+from core.optimization.dce import DCEOptimizer
+from core.synthesis.netlist_db import NetlistDB
+from core.synthesis.strash import StrashOptimizer
+from frontends.bench import read_bench_network
+from tools.benchmarks.bench_cec import kogge_stone_adder
+from tools.benchmarks.bench_suite import scaling_exponent
+
+PASSES = (
+    ("index", lambda netlist: NetlistDB(netlist)),
+    ("strash", lambda netlist: StrashOptimizer().optimize(netlist)),
+    ("cse", lambda netlist: CSEOptimizer().optimize(netlist)),
+    ("constprop", lambda netlist: ConstPropOptimizer().optimize(netlist)),
+    ("balance", lambda netlist: BalanceOptimizer().optimize(netlist)),
+    ("dce", lambda netlist: DCEOptimizer().optimize(netlist, "aggressive")),
+)
+
+
+def adder_netlist(width: int):
+    buf = io.StringIO()
+    aig_to_bench(kogge_stone_adder(width), buf)
+    return read_bench_network(f"ks{width}.bench", text=buf.getvalue()).to_netlist()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Netlist pass scaling benchmark (NetlistDB)")
+    parser.add_argument("--sizes", default="128,512,2048", help="Kogge-Stone adder widths")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    timings = {name: [] for name, _fn in PASSES}
+    print(f"{'width':>7} {'nodes':>9} " + " ".join(f"{name + '[s]':>12}" for name, _fn in PASSES))
+    for width in sizes:
+        netlist = adder_netlist(width)
+        n_nodes = len(netlist["nodes"])
+        row = []
+        for name, fn in PASSES:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):  # strash in từng node bị loại
+                fn(netlist)
+            elapsed = time.perf_counter() - start
+            timings[name].append((n_nodes, elapsed))
+            row.append(f"{elapsed:12.3f}")
+        print(f"{width:>7} {n_nodes:>9} " + " ".join(row))
+
+    parts = []
+    for name, points in timings.items():
+        exponent = scaling_exponent(points)
+        if exponent is not None:
+            parts.append(f"{name} ~ n^{exponent:.2f}")
+    if parts:
+        print("  scaling " + ", ".join(parts))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Benchmark scaling trên design tham số + chặn regression theo baseline
+
+Sinh các design trong ``tools/benchmarks/designs.py`` (ripple / Kogge-Stone /
+Sklansky / Han-Carlson adder, cây so sánh, mux rộng, DAG ngẫu nhiên, chuỗi XOR)
+ở nhiều kích thước, chạy đủ bốn bước parse → synthesis → optimize → techmap và
+ghi cho từng (design, kích thước):
+
+- thời gian mỗi bước (span gốc của tracer, lấy min qua ``--repeat`` lần), cả
+  dạng tuyệt đối lẫn chuẩn hóa theo một workload hiệu chuẩn cố định (để so
+  baseline giữa các máy);
+- đỉnh bộ nhớ mỗi bước (một lần chạy riêng với tracemalloc, bỏ bằng ``--no-memory``);
+- QoR: số AND sau synthesis / optimize, độ sâu, số cell và diện tích sau techmap.
+
+Số mũ scaling (hệ số góc log-log của thời gian theo số AND sau synthesis) được
+khớp cho từng design và bước. Với ``--baseline``, lệnh thoát mã 1 khi tổng thời
+gian chuẩn hóa của một bước (trên mọi kích thước) chậm hơn baseline quá
+``--threshold``, số mũ vượt baseline quá ``--exponent-tolerance`` (chỉ với bước mà
+mọi điểm baseline từ ``--min-time / 2`` trở lên), hoặc QoR xấu đi quá ``--qor-threshold``.
+Chạy offline, không cần file ngoài; ``--update-baseline`` ghi lại baseline.
+
+Usage:
+    python tools/benchmarks/bench_scaling.py [--full] [--designs ripple_adder,xor_chain]
+        [--repeat 3] [--script "strash; dce; b"] [--no-memory] [--json results.json]
+        [--baseline tools/benchmarks/baselines/scaling_quick.json] [--update-baseline]
+        [--threshold 1.0] [--exponent-tolerance 0.5] [--qor-threshold 0.02] [--min-time 0.05]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.optimization.optimization_flow import optimize
+from core.synthesis.aig_traversal import aig_depth
+from core.synthesis.netlist_to_aig import NetlistToAIGConverter
+from core.technology_mapping.technology_mapping import create_standard_library, techmap
+from core.utils.performance import start_tracing, stop_tracing
+from frontends.verilog.core.parser import parse_verilog
+from tools.benchmarks.bench_suite import scaling_exponent
+from tools.benchmarks.designs import DESIGNS, xor_chain
+
+STAGES = ("parse", "synthesis", "optimize", "techmap")
+QOR_FIELDS = ("ands_opt", "depth", "cells", "area")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "scaling_quick.json")
+
+
+def calibrate(repeat: int = 3) -> float:
+    """Thời gian (min) của một workload Python thuần cố định - đơn vị chuẩn hóa giữa các máy."""
+    best = math.inf
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        table: Dict[int, int] = {}
+        for i in range(200000):
+            table[(i * 7919) % 65521] = table.get(i % 4093, 0) + i
+        sorted(table.items())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _run_flow(path: str, library, script: Optional[str]) -> Dict[str, Any]:
+    netlist = parse_verilog(path)
+    aig = NetlistToAIGConverter().convert(netlist)
+    ands = aig.count_and_nodes()
+    if script:
+        from core.optimization.pass_manager import run_script
+
+        optimized, _manager = run_script(aig, script)
+    else:
+        optimized = optimize(aig)
+    mapped = techmap(optimized, library, "area_optimal")
+    return {
+        "netlist_nodes": len(netlist.get("nodes", ())),
+        "pis": len(optimized.pis),
+        "pos": len(optimized.pos),
+        "ands": ands,
+        "ands_opt": optimized.count_and_nodes(),
+        "depth": aig_depth(optimized),
+        "cells": mapped.get("mapped_nodes", 0),
+        "area": round(mapped.get("total_area", 0.0), 3),
+    }
+
+
+def _traced_run(path: str, library, script: Optional[str], trace_memory: bool):
+    """(QoR, {bước: span gốc}) của một lần chạy flow dưới tracer riêng (tắt GC như ``timeit``)."""
+    gc.collect()
+    gc.disable()
+    tracer = start_tracing(trace_memory=trace_memory)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            qor = _run_flow(path, library, script)
+    finally:
+        stop_tracing()
+        tracer.close()
+        gc.enable()
+    spans = {}
+    for span in tracer.roots:
+        if span.name in STAGES and span.name not in spans:
+            spans[span.name] = span
+    return qor, spans
+
+
+def run_design(name: str, size: int, root: str, library, calibration: float, repeat: int = 1,
+               script: Optional[str] = None, memory: bool = True) -> Dict[str, Any]:
+    generator = DESIGNS[name][0]
+    path = os.path.join(root, f"{name}_{size}.v")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(generator(size))
+    times = {stage: math.inf for stage in STAGES}
+    qor: Dict[str, Any] = {}
+    for _ in range(max(1, repeat)):
+        qor, spans = _traced_run(path, library, script, trace_memory=False)
+        for stage, span in spans.items():
+            times[stage] = min(times[stage], span.wall_time)
+    mem = {}
+    if memory:
+        _qor, spans = _traced_run(path, library, script, trace_memory=True)
+        mem = {stage: span.mem_peak_delta for stage, span in spans.items()}
+    times = {stage: t for stage, t in times.items() if t != math.inf}
+    return {
+        "design": name,
+        "size": size,
+        **qor,
+        "time": {stage: round(t, 6) for stage, t in times.items()},
+        "norm": {stage: round(t / calibration, 4) for stage, t in times.items()},
+        "mem": mem,
+    }
+
+
+def fit_exponents(results: Sequence[Dict[str, Any]]) -> Dict[str, Dict[str, Optional[float]]]:
+    """{design: {bước: số mũ}} - hệ số góc log-log của thời gian theo số AND sau synthesis."""
+    by_design: Dict[str, List[Dict[str, Any]]] = {}
+    for r in results:
+        by_design.setdefault(r["design"], []).append(r)
+    exponents = {}
+    for name, rows in by_design.items():
+        exponents[name] = {}
+        for stage in STAGES:
+            exponent = scaling_exponent([(r["ands"], r["time"].get(stage)) for r in rows])
+            exponents[name][stage] = round(exponent, 3) if exponent is not None else None
+    return exponents
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 1.0,
+            exponent_tolerance: float = 0.5, qor_threshold: float = 0.02,
+            min_time: float = 0.05) -> List[str]:
+    """
+    So kết quả ``current`` với ``baseline`` (cùng định dạng JSON của ``main``).
+
+    Thời gian so theo tổng giá trị chuẩn hóa của mỗi (design, bước) trên các
+    kích thước có ở cả hai bên - ổn định hơn nhiều so với từng điểm đo vài ms.
+    (design, bước) có tổng thời gian baseline dưới ``min_time`` giây bị bỏ qua
+    vì nhiễu đo chiếm phần lớn; số mũ chỉ bị chặn khi mọi điểm baseline của
+    bước đó từ ``min_time / 2`` trở lên. QoR (tất định) so theo từng kích thước.
+
+    Returns:
+        Danh sách mô tả regression (rỗng = đạt)
+    """
+    regressions = []
+    base_rows = {(r["design"], r["size"]): r for r in baseline.get("results", ())}
+    totals: Dict[Tuple[str, str], List[float]] = {}
+    for row in current.get("results", ()):
+        base = base_rows.get((row["design"], row["size"]))
+        if base is None:
+            continue
+        for stage in STAGES:
+            if stage in row["norm"] and stage in base["norm"]:
+                total = totals.setdefault((row["design"], stage), [0.0, 0.0, 0.0, math.inf])
+                total[0] += row["norm"][stage]
+                total[1] += base["norm"][stage]
+                total[2] += base["time"].get(stage, 0.0)
+                total[3] = min(total[3], base["time"].get(stage, 0.0))
+        key = f"{row['design']}[{row['size']}]"
+        for field in QOR_FIELDS:
+            now, before = row.get(field), base.get(field)
+            if now is None or before is None:
+                continue
+            if now > before * (1 + qor_threshold) and now > before:
+                regressions.append(f"{key} {field}: {before} -> {now}")
+    for (name, stage), (now, before, seconds, shortest) in totals.items():
+        if seconds < min_time or before <= 0:
+            continue
+        if now > before * (1 + threshold):
+            regressions.append(f"{name} {stage}: time x{now / before:.2f} vs baseline "
+                               f"(limit x{1 + threshold:.2f})")
+        if shortest < min_time / 2:
+            continue  # số mũ khớp trên điểm vài ms chỉ để báo cáo
+        exponent = current.get("exponents", {}).get(name, {}).get(stage)
+        base_exponent = baseline.get("exponents", {}).get(name, {}).get(stage)
+        if exponent is not None and base_exponent is not None and exponent > base_exponent + exponent_tolerance:
+            regressions.append(f"{name} {stage}: scaling n^{exponent:.2f} vs baseline "
+                               f"n^{base_exponent:.2f} (tolerance {exponent_tolerance})")
+    return regressions
+
+
+def _print_table(results: Sequence[Dict[str, Any]]) -> None:
+    print(f"{'design':<14} {'size':>6} {'AND':>8} {'AND opt':>8} {'depth':>6} {'cells':>7} "
+          + " ".join(f"{stage + '[s]':>13}" for stage in STAGES) + f" {'peak MB':>8}")
+    for r in results:
+        peak = max(r["mem"].values(), default=0) / 1e6 if r["mem"] else float("nan")
+        print(f"{r['design']:<14} {r['size']:>6} {r['ands']:>8} {r['ands_opt']:>8} {r['depth']:>6} "
+              f"{r['cells']:>7} " + " ".join(f"{r['time'].get(stage, float('nan')):13.4f}" for stage in STAGES)
+              + f" {peak:8.1f}")
+
+
+def _print_exponents(exponents: Dict[str, Dict[str, Optional[float]]]) -> None:
+    for name, stages in exponents.items():
+        parts = [f"{stage} ~ n^{e:.2f}" for stage, e in stages.items() if e is not None]
+        if parts:
+            print(f"  scaling {name:<14} " + ", ".join(parts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parametric design scaling benchmark with regression gating")
+    parser.add_argument("--full", action="store_true", help="use the large size sweep (default: quick sizes)")
+    parser.add_argument("--designs", help=f"comma-separated subset of {','.join(DESIGNS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per design/size (min time)")
+    parser.add_argument("--script", help="optimization script for the pass manager (default: optimize())")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--json", help="write results as JSON")
+    parser.add_argument("--baseline", help="baseline JSON to gate against (exit 1 on regression)")
+    parser.add_argument("--update-baseline", action="store_true", help="write results to --baseline instead")
+    parser.add_argument("--threshold", type=float, default=1.0, help="allowed normalized slowdown (1.0 = 2x)")
+    parser.add_argument("--exponent-tolerance", type=float, default=0.5, help="allowed scaling exponent increase")
+    parser.add_argument("--qor-threshold", type=float, default=0.02, help="allowed QoR increase (AND/depth/cells/area)")
+    parser.add_argument("--min-time", type=float, default=0.05, help="ignore design stages whose baseline total is below this [s]")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    names = [n.strip() for n in args.designs.split(",")] if args.designs else list(DESIGNS)
+    unknown = [n for n in names if n not in DESIGNS]
+    if unknown:
+        print(f"Unknown design(s): {', '.join(unknown)} (available: {', '.join(DESIGNS)})")
+        return 2
+    if args.update_baseline and not args.baseline:
+        args.baseline = DEFAULT_BASELINE
+
+    library = create_standard_library()
+    calibration = calibrate()
+    print(f"Calibration workload: {calibration * 1e3:.1f} ms ({'full' if args.full else 'quick'} sizes)")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Warm-up: bảng NPN và import lười không được tính vào lần đo đầu tiên
+        warm = os.path.join(tmp, "warmup.v")
+        with open(warm, "w", encoding="utf-8") as f:
+            f.write(xor_chain(4))
+        _traced_run(warm, library, args.script, trace_memory=False)
+        for name in names:
+            _generator, quick, full = DESIGNS[name]
+            for size in (full if args.full else quick):
+                results.append(run_design(name, size, tmp, library, calibration, args.repeat,
+                                          args.script, memory=not args.no_memory))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "calibration_s": round(calibration, 6),
+            "sizes": "full" if args.full else "quick",
+            "repeat": args.repeat,
+            "script": args.script,
+        },
+        "results": results,
+        "exponents": fit_exponents(results),
+    }
+    _print_table(results)
+    _print_exponents(report["exponents"])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline and args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written: {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.exponent_tolerance,
+                              args.qor_threshold, args.min_time)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) vs {args.baseline}:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\nNo regressions vs {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bit-parallel AIG simulation throughput
+
+Đo số node-pattern mỗi giây (AND node x pattern) của ``AIGSimulator`` trên
+AIG ngẫu nhiên, với nhiều độ rộng word (số pattern mỗi lần quét).
+Mục tiêu: >= 10M node-patterns/s trên một core.
+
+Usage:
+    python tools/benchmarks/bench_simulation.py [--nodes 100000] [--array]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.aig import AIG
+from core.synthesis.aig_array import ArrayAIG
+from core.verification.simulation import AIGSimulator
+from tools.benchmarks.bench_inplace_optimize import build_raw
+
+TARGET_NODE_PATTERNS_PER_SEC = 10_000_000
+
+
+def run(aig, num_patterns: int, rounds: int = 3):
+    """Return (best_seconds_per_sweep, node_patterns_per_sec)."""
+    sim = AIGSimulator(aig)
+    best = float("inf")
+    for seed in range(rounds):
+        start = time.perf_counter()
+        sim.simulate_random(num_patterns, seed=seed)
+        best = min(best, time.perf_counter() - start)
+    return best, sim.num_and_nodes * num_patterns / max(best, 1e-9)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bit-parallel AIG simulation throughput")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--array", action="store_true", help="use ArrayAIG backend")
+    parser.add_argument("--patterns", type=int, nargs="+", default=[64, 256, 1024, 4096])
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    aig_class = ArrayAIG if args.array else AIG
+    aig = build_raw(aig_class, args.nodes)
+    print(f"simulate_random(): {args.nodes} AND nodes, backend={aig_class.__name__}")
+    ok = True
+    for num_patterns in args.patterns:
+        seconds, rate = run(aig, num_patterns)
+        ok = ok and rate >= TARGET_NODE_PATTERNS_PER_SEC
+        print(f"  patterns={num_patterns:<6} sweep={seconds * 1e3:8.1f} ms  "
+              f"throughput={rate / 1e6:10.1f} M node-patterns/s")
+    print(f"  target {TARGET_NODE_PATTERNS_PER_SEC / 1e6:.0f}M node-patterns/s: {'PASS' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SkyWater PDK loader song song
+
+Sinh cây ``libraries/<sc_library>/latest/cells/<cell>/*__<corner>.lib.json`` kiểu
+sky130_fd_sc_hd (khóa ``pin,<tên>``, bảng NLDM 7x7 cho timing, internal_power 7x7,
+nhiều leakage_power) rồi đo ``load_skywater_sc_library`` (không cache) với:
+1. ``executor="serial"`` (như loader cũ: ``json.load`` từng file);
+2. thread pool;
+3. process pool (mặc định);
+và ``load_skywater_sc_corners`` nạp nhiều góc trong một pool.
+
+Mặc định 430 cell ≈ số biến thể của sky130_fd_sc_hd; có thể trỏ vào PDK thật
+bằng ``--root path/to/skywater-pdk/libraries``.
+
+Usage:
+    python tools/benchmarks/bench_skywater_loader.py [--cells 430] [--workers N] [--root path] [--corners 3]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.technology_mapping.library_loader import (
+    _default_workers,
+    load_skywater_sc_corners,
+    load_skywater_sc_library,
+)
+
+_INDEX_SLEW = [0.01, 0.023, 0.053, 0.12, 0.28, 0.65, 1.5]
+_INDEX_LOAD = [0.0005, 0.0013, 0.0035, 0.0094, 0.025, 0.067, 0.18]
+_FUNCTIONS = (
+    (["A"], "!A"), (["A"], "A"), (["A", "B"], "!(A&B)"), (["A", "B"], "(A&B)"),
+    (["A", "B"], "!(A|B)"), (["A", "B"], "(A^B)"), (["A1", "A2", "B1"], "(!A1&!B1) | (!A2&!B1)"),
+    (["A0", "A1", "S"], "(A0&!S) | (A1&S)"), (["A", "B", "C"], "(A&B&C)"), (["A", "B", "C", "D"], "!(A|B|C|D)"),
+)
+DEFAULT_CORNERS = ("tt_025C_1v80", "ss_100C_1v60", "ff_n40C_1v95")
+
+
+def _table(rng: random.Random, scale: float = 1.0) -> dict:
+    return {
+        "index_1": list(_INDEX_SLEW),
+        "index_2": list(_INDEX_LOAD),
+        "values": [[round(rng.uniform(0.01, 2.0) * scale, 7) for _ in range(7)] for _ in range(7)],
+    }
+
+
+def _cell_dict(inputs, function: str, rng: random.Random, scale: float) -> dict:
+    data = {
+        "area": round(rng.uniform(2.5, 20.0), 4),
+        "cell_footprint": "sky130_fd_sc_hd__bench",
+        "leakage_power": [
+            {"value": rng.uniform(0.0001, 0.01), "when": f"!{pin}", "related_pg_pin": "VPWR"}
+            for pin in inputs for _ in range(4)
+        ],
+    }
+    for pin in inputs:
+        data[f"pin,{pin}"] = {
+            "direction": "input",
+            "capacitance": round(rng.uniform(0.0015, 0.0045), 6),
+            "internal_power": [
+                {"rise_power,power_inputs_1": _table(rng), "fall_power,power_inputs_1": _table(rng)}
+            ],
+        }
+    data["pin,Y"] = {
+        "direction": "output",
+        "function": function,
+        "timing": [
+            {
+                "related_pin": pin,
+                "timing_sense": "non_unate",
+                "timing_type": "combinational",
+                "cell_rise,del_1_7_7": _table(rng, scale),
+                "cell_fall,del_1_7_7": _table(rng, scale),
+                "rise_transition,del_1_7_7": _table(rng, scale),
+                "fall_transition,del_1_7_7": _table(rng, scale),
+            }
+            for pin in inputs
+        ],
+        "internal_power": [
+            {"related_pin": pin, "rise_power,power_outputs_1": _table(rng), "fall_power,power_outputs_1": _table(rng)}
+            for pin in inputs
+        ],
+    }
+    return data
+
+
+def synthetic_skywater_tree(libraries_root: str, cells: int, corners=DEFAULT_CORNERS[:1],
+                            sc_library: str = "sky130_fd_sc_hd", seed: int = 1) -> int:
+    """Ghi ``cells`` biến thể cell cho mỗi góc dưới ``libraries_root``; trả về tổng kích thước (byte)."""
+    total = 0
+    for c, corner in enumerate(corners):
+        rng = random.Random(seed)
+        for i in range(cells):
+            inputs, function = _FUNCTIONS[i % len(_FUNCTIONS)]
+            cell = f"bench{i // len(_FUNCTIONS)}_{i % len(_FUNCTIONS)}"
+            directory = os.path.join(libraries_root, sc_library, "latest", "cells", cell)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{sc_library}__{cell}_1__{corner}.lib.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(_cell_dict(inputs, function, rng, 1.0 + 0.25 * c), f, indent=4)
+            total += os.path.getsize(path)
+    return total
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel SkyWater .lib.json loader benchmark")
+    parser.add_argument("--cells", type=int, default=430)
+    parser.add_argument("--corners", type=int, default=3, help="corners for the multi-corner run")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--root", default=None, help="existing skywater-pdk/libraries directory")
+    parser.add_argument("--sc-library", default="sky130_fd_sc_hd")
+    parser.add_argument("--corner", default="tt_025C_1v80")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.root
+        corners = list(DEFAULT_CORNERS[:max(1, args.corners)])
+        if root is None:
+            root = tmp
+            size = synthetic_skywater_tree(root, args.cells, corners, args.sc_library)
+            print(f"SkyWater loader: synthetic {args.cells} cells x {len(corners)} corners "
+                  f"({size / 1e6:.1f} MB), workers={args.workers or _default_workers()}")
+        else:
+            corners = [args.corner]
+            print(f"SkyWater loader: {root} ({args.sc_library}, {args.corner})")
+
+        reference = None
+        for executor in ("serial", "thread", "process"):
+            library, elapsed = _timed(lambda: load_skywater_sc_library(
+                root, args.sc_library, corners[0], use_cache=False, workers=args.workers, executor=executor))
+            signature = [(n, c.function, c.area, c.delay) for n, c in sorted(library.cells.items())]
+            reference = reference or signature
+            status = "OK" if signature == reference else "MISMATCH"
+            print(f"  {executor:<8} {elapsed:7.3f}s  cells={len(library.cells)}  [{status}]")
+
+        if len(corners) > 1:
+            multi, elapsed = _timed(lambda: load_skywater_sc_corners(
+                root, args.sc_library, corners, use_cache=False, workers=args.workers))
+            print(f"  {len(corners)} corners (process) {elapsed:7.3f}s  "
+                  f"cells/corner={[len(multi[c].cells) for c in multi]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Static timing analysis (NLDM)
+
+Netlist mapped tổng hợp (INV / NAND2 / NOR2 với bảng NLDM 7x7 kiểu Liberty),
+fanin chọn ngẫu nhiên trong cửa sổ các net gần nhất để có độ sâu logic lớn.
+Báo thời gian build graph / lan truyền arrival-slew và WNS/TNS cho từng engine
+(Python thuần; NumPy nếu có cài) — mục tiêu 500k instance < 60s.
+
+Usage:
+    python tools/benchmarks/bench_sta.py [--instances 500000] [--window 2000] [--engine auto python numpy]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.technology_mapping.technology_mapping import LibraryCell, TechnologyLibrary
+from core.timing.liberty_timing import CellTiming, NLDMTable, TimingArc
+from core.timing.sta import run_sta
+
+_SLEWS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0]
+_LOADS = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1]
+
+
+def _table(intrinsic: float, k_slew: float, k_load: float) -> NLDMTable:
+    return NLDMTable(_SLEWS, _LOADS, [[intrinsic + k_slew * s + k_load * c for c in _LOADS] for s in _SLEWS])
+
+
+def synthetic_library() -> TechnologyLibrary:
+    """Thư viện INV/NAND2/NOR2 với bảng NLDM tuyến tính theo (slew, load)."""
+    library = TechnologyLibrary("sta_bench")
+    for name, function, pins, drive in (
+        ("INVX1", "!A", ["A"], 1.0),
+        ("NAND2X1", "!(A&B)", ["A", "B"], 1.4),
+        ("NOR2X1", "!(A|B)", ["A", "B"], 1.8),
+    ):
+        arcs = [
+            TimingArc(pin, "Y", "negative_unate",
+                      _table(0.02 * drive, 0.3, 4.0 * drive), _table(0.015 * drive, 0.25, 3.0 * drive),
+                      _table(0.01, 0.5, 6.0 * drive), _table(0.01, 0.4, 5.0 * drive))
+            for pin in pins
+        ]
+        timing = CellTiming({pin: 0.002 * drive for pin in pins}, arcs)
+        library.add_cell(LibraryCell(name, function, area=drive, delay=0.05 * drive,
+                                     input_pins=pins, output_pins=["Y"], input_load=0.002 * drive,
+                                     timing=timing))
+    return library
+
+
+def synthetic_netlist(instances: int, window: int, seed: int = 1, n_inputs: int = 256):
+    """Netlist ``instances`` cell; 1/64 số net cuối cùng là PO."""
+    rng = random.Random(seed)
+    nets = [f"pi{i}" for i in range(n_inputs)]
+    nodes = []
+    for i in range(instances):
+        kind = rng.choice(("INVX1", "NAND2X1", "NOR2X1"))
+        lo = max(0, len(nets) - window)
+        fanins = [nets[rng.randrange(lo, len(nets))] for _ in range(1 if kind == "INVX1" else 2)]
+        out = f"n{i}"
+        nodes.append({"id": f"u{i}", "type": kind, "inputs": fanins, "output": out, "mapped": True})
+        nets.append(out)
+    outputs = nets[-max(1, instances // 64):]
+    return {"name": "sta_bench", "inputs": nets[:n_inputs], "outputs": outputs, "nodes": nodes}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NLDM static timing analysis runtime benchmark")
+    parser.add_argument("--instances", type=int, default=500_000)
+    parser.add_argument("--window", type=int, default=2000, help="fanin window (smaller = deeper logic)")
+    parser.add_argument("--engine", nargs="+", default=["python", "numpy"], choices=["auto", "python", "numpy"])
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    library = synthetic_library()
+    netlist = synthetic_netlist(args.instances, args.window)
+    print(f"sta: {args.instances} instances, {len(netlist['outputs'])} endpoints")
+    for engine in args.engine:
+        use_numpy = {"auto": None, "python": False, "numpy": True}[engine]
+        try:
+            report = run_sta(netlist, library, max_paths=5, clock_period=1.0, use_numpy=use_numpy)
+        except ImportError:
+            print(f"  {engine:<6} skipped (numpy not installed)")
+            continue
+        s = report.stats
+        print(f"  {s['engine']:<6} critical={report.critical_delay:8.4f} WNS={report.wns:8.4f} "
+              f"TNS={report.tns:12.4f} depth={len(report.paths[0].points) - 1 if report.paths else 0:>5} "
+              f"time={s['time']:6.2f}s (build {s['time_build']:.2f}s, propagate {s['time_propagate']:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
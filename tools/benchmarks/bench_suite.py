@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner cho bộ benchmark chuẩn (ISCAS .bench, MCNC/IWLS BLIF, EPFL/HWMCC AIGER)
+
+Với mỗi file (hoặc mọi file .bench/.blif/.aig/.aag trong thư mục): đọc thẳng
+thành AIG, ``strash``, ``optimize`` (tùy chọn) — ghi thời gian, số AND trước/sau
+(đếm như AIGER, không tính NOT), độ sâu. Không có đường dẫn: sinh bộ tổng hợp
+(Kogge-Stone adder nhiều kích thước, ghi ra cả ba định dạng) để theo dõi độ tăng
+thời gian theo kích thước; số mũ scaling (hệ số góc log-log của thời gian theo
+số AND) được in cho từng bước.
+
+Usage:
+    python tools/benchmarks/bench_suite.py [paths...] [--optimize] [--array]
+        [--sizes 256,1024,4096,16384] [--formats bench,blif,aig] [--repeat 1]
+        [--json results.json] [--csv results.csv]
+"""
+
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.export.bench_writer import aig_to_bench
+from core.export.blif_writer import aig_to_blif
+from core.synthesis.aig_array import ArrayAIG
+from core.synthesis.aig_traversal import aig_depth
+from core.synthesis.aiger import aiger_literals, write_aiger
+from frontends import AIG_FORMATS, load_aig
+from tools.benchmarks.bench_cec import kogge_stone_adder
+
+STEPS = ("read", "strash", "optimize")
+
+
+class SuiteResult(NamedTuple):
+    name: str
+    format: str
+    inputs: int
+    outputs: int
+    latches: int
+    ands: int
+    ands_after: int
+    depth: int
+    read_s: float
+    strash_s: float
+    optimize_s: Optional[float]
+
+
+def discover(paths: Sequence[str]) -> List[str]:
+    """File benchmark trong ``paths`` (thư mục được duyệt đệ quy, sắp xếp theo tên)."""
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in names if n.lower().endswith(AIG_FORMATS))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def synthetic_suite(root: str, sizes: Sequence[int], formats: Sequence[str]) -> List[str]:
+    """Ghi Kogge-Stone adder ``ks<width>`` cho mỗi kích thước và định dạng; trả về danh sách file."""
+    files = []
+    for width in sizes:
+        aig = kogge_stone_adder(width)
+        names = [f"s{i}" for i in range(width)] + ["cout"]
+        for fmt in formats:
+            path = os.path.join(root, f"ks{width}.{fmt}")
+            if fmt == "bench":
+                aig_to_bench(aig, path, output_names=names)
+            elif fmt == "blif":
+                aig_to_blif(aig, path, model_name=f"ks{width}", output_names=names)
+            elif fmt in ("aig", "aag"):
+                write_aiger(aig, path, output_names=names)
+            else:
+                raise ValueError(f"Unknown format {fmt!r}")
+            files.append(path)
+    return files
+
+
+def _timed(fn, repeat: int = 1):
+    """(kết quả lần chạy cuối, thời gian nhỏ nhất trong ``repeat`` lần)."""
+    best = math.inf
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def run_file(path: str, aig_class=None, run_optimize: bool = False, fraig: bool = False,
+             repeat: int = 1) -> SuiteResult:
+    model, t_read = _timed(lambda: load_aig(path, aig_class=aig_class), repeat)
+    aig = model.aig
+    strashed, t_strash = _timed(aig.strash, repeat)
+    t_opt = None
+    result = strashed
+    if run_optimize:
+        from core.optimization.optimization_flow import optimize
+
+        # optimize in-place: mỗi lần lặp chạy trên bản strash mới
+        result, t_opt = _timed(lambda: optimize(aig.strash(), in_place=True, fraig=fraig), 1)
+    base = os.path.basename(path)
+    name, ext = os.path.splitext(base)
+    return SuiteResult(
+        name=name,
+        format=ext.lstrip(".").lower(),
+        inputs=model.header.inputs,
+        outputs=model.header.outputs,
+        latches=model.header.latches,
+        ands=model.header.ands,
+        ands_after=len(aiger_literals(result, list(result.pis.values()))[1]),
+        depth=aig_depth(result),
+        read_s=t_read,
+        strash_s=t_strash,
+        optimize_s=t_opt,
+    )
+
+
+def scaling_exponent(points: Sequence[Tuple[float, float]]) -> Optional[float]:
+    """Hệ số góc bình phương tối thiểu của log(thời gian) theo log(kích thước); ~1.0 = tuyến tính."""
+    pts = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y and y > 0]
+    if len(pts) < 2:
+        return None
+    mx = sum(x for x, _ in pts) / len(pts)
+    my = sum(y for _, y in pts) / len(pts)
+    sxx = sum((x - mx) ** 2 for x, _ in pts)
+    if sxx == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in pts) / sxx
+
+
+def _print_table(results: Sequence[SuiteResult]) -> None:
+    print(f"{'benchmark':<22} {'fmt':<5} {'PI':>7} {'PO':>7} {'latch':>6} {'AND':>9} {'AND opt':>9} "
+          f"{'depth':>6} {'read[s]':>9} {'strash[s]':>10} {'opt[s]':>9}")
+    for r in results:
+        opt = f"{r.optimize_s:9.3f}" if r.optimize_s is not None else f"{'-':>9}"
+        print(f"{r.name:<22} {r.format:<5} {r.inputs:>7} {r.outputs:>7} {r.latches:>6} {r.ands:>9} "
+              f"{r.ands_after:>9} {r.depth:>6} {r.read_s:9.3f} {r.strash_s:10.3f} {opt}")
+
+
+def _print_scaling(results: Sequence[SuiteResult]) -> None:
+    by_format = {}
+    for r in results:
+        by_format.setdefault(r.format, []).append(r)
+    for fmt, rows in sorted(by_format.items()):
+        parts = []
+        for step in STEPS:
+            exponent = scaling_exponent([(r.ands, getattr(r, f"{step}_s")) for r in rows])
+            if exponent is not None:
+                parts.append(f"{step} ~ n^{exponent:.2f}")
+        if parts:
+            print(f"  scaling .{fmt:<5} " + ", ".join(parts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite runner (read / strash / optimize scaling)")
+    parser.add_argument("paths", nargs="*", help="benchmark files or directories (default: synthetic suite)")
+    parser.add_argument("--sizes", default="256,1024,4096,16384", help="synthetic adder widths")
+    parser.add_argument("--formats", default="bench,blif,aig", help="synthetic suite formats")
+    parser.add_argument("--optimize", action="store_true", help="also time optimize() (strash/dce/cse/...)")
+    parser.add_argument("--fraig", action="store_true", help="include FRAIG in optimize()")
+    parser.add_argument("--array", action="store_true", help="read into ArrayAIG")
+    parser.add_argument("--repeat", type=int, default=1, help="repetitions for read/strash (min time)")
+    parser.add_argument("--json", help="write results as JSON")
+    parser.add_argument("--csv", help="write results as CSV")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+    aig_class = ArrayAIG if args.array else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.paths:
+            files = discover(args.paths)
+        else:
+            sizes = [int(s) for s in args.sizes.split(",") if s]
+            formats = [f.strip().lstrip(".") for f in args.formats.split(",") if f.strip()]
+            print(f"Synthetic suite: Kogge-Stone adders {sizes} as {formats}")
+            files = synthetic_suite(tmp, sizes, formats)
+        if not files:
+            print("No benchmark files found")
+            return 1
+        results = []
+        for path in files:
+            try:
+                results.append(run_file(path, aig_class, args.optimize, args.fraig, args.repeat))
+            except (OSError, ValueError) as e:
+                print(f"  [skip] {path}: {e}")
+
+    _print_table(results)
+    _print_scaling(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([r._asdict() for r in results], f, indent=2)
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(SuiteResult._fields)
+            writer.writerows(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: technology mapping — strategy cũ (mỗi AND → một cell) vs cut mapper
+
+Với mỗi mạch báo area, critical-path delay (max arrival, cùng mô hình delay
+hằng ``cell.delay`` cho mọi strategy — ``total_delay`` của strategy cũ là tổng
+nên không dùng để so sánh), số cell, tỉ lệ node map được và thời gian:
+1. Adder ripple-carry và Kogge-Stone (bench_cec).
+2. AIG ngẫu nhiên "raw" (bench_inplace_optimize.build_raw) sau strash.
+
+Usage:
+    python tools/benchmarks/bench_techmap.py [--nodes 20000] [--width 64] [--array]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.synthesis.aig import AIG
+from core.synthesis.aig_array import ArrayAIG
+from core.technology_mapping.cut_mapper import critical_path_delay
+from core.technology_mapping.technology_mapping import create_standard_library, techmap
+from tools.benchmarks.bench_cec import kogge_stone_adder, ripple_adder
+from tools.benchmarks.bench_inplace_optimize import build_raw
+
+STRATEGIES = ("area_optimal", "delay_optimal", "balanced", "cut")
+
+
+def _report(label: str, aig):
+    aig = aig.strash()
+    print(f"  {label} ({aig.count_and_nodes()} AND nodes)")
+    for strategy in STRATEGIES:
+        start = time.perf_counter()
+        results = techmap(aig, create_standard_library(), strategy)
+        elapsed = time.perf_counter() - start
+        mapper = results["_mapper"]
+        cells = sum(1 for node in mapper.logic_network.values() if node.mapped_cell)
+        area = sum(node.mapped_cell.area for node in mapper.logic_network.values() if node.mapped_cell)
+        print(f"    {strategy:<14} area={area:>10.1f} delay={critical_path_delay(mapper):>7.2f} "
+              f"cells={cells:>7} mapped={results['mapping_success_rate'] * 100:5.1f}% "
+              f"time={elapsed:6.2f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Technology mapping QoR / runtime benchmark")
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--width", type=int, default=64)
+    parser.add_argument("--array", action="store_true", help="use ArrayAIG backend for the raw AIG")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    aig_class = ArrayAIG if args.array else AIG
+    print("techmap(): per-node strategies vs cut mapper (standard_cells library)")
+    _report(f"ripple adder ({args.width}-bit)", ripple_adder(args.width))
+    _report(f"Kogge-Stone adder ({args.width}-bit)", kogge_stone_adder(args.width))
+    _report(f"raw ({args.nodes} nodes, {aig_class.__name__})", build_raw(aig_class, args.nodes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
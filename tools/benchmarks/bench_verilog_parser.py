@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lexer một lần của frontend Verilog
+
+Với từng kích thước (netlist phẳng ``random_dag`` dạng assign và lưới cell đã
+map từ ``bench_verilog_writer``), đo riêng ``scan_module`` (token stream +
+validator) và toàn bộ ``parse_verilog``, in MB/s để thấy chi phí tuyến tính
+theo kích thước file.
+
+Usage:
+    python tools/benchmarks/bench_verilog_parser.py [--gates 10000 40000 160000] [--cells 20000 80000 320000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.export.verilog_writer import write_verilog
+from frontends.verilog.core.lexer import scan_module
+from frontends.verilog.core.parser import parse_verilog
+from tools.benchmarks.bench_verilog_writer import mapped_netlist
+from tools.benchmarks.designs import random_dag
+
+
+def _bench_file(label: str, path: str) -> None:
+    size = os.path.getsize(path) / 1e6
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    start = time.perf_counter()
+    scan = scan_module(source)
+    t_scan = time.perf_counter() - start
+    start = time.perf_counter()
+    netlist = parse_verilog(path)
+    t_parse = time.perf_counter() - start
+    print(f"  {label:<22} {size:7.2f} MB  {len(scan.items):8d} items  "
+          f"scan {t_scan:6.2f}s ({size / t_scan:5.1f} MB/s)  "
+          f"parse {t_parse:6.2f}s ({size / t_parse:5.1f} MB/s)  {len(netlist['nodes'])} nodes")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Single-pass Verilog lexer benchmark")
+    parser.add_argument("--gates", type=int, nargs="+", default=[10000, 40000, 160000],
+                        help="random_dag gate counts (flat assign netlists)")
+    parser.add_argument("--cells", type=int, nargs="+", default=[20000, 80000, 320000],
+                        help="mapped-netlist instance counts")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("Flat assign netlists (random_dag):")
+        for gates in args.gates:
+            path = os.path.join(tmp, f"random_dag_{gates}.v")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(random_dag(gates))
+            _bench_file(f"random_dag({gates})", path)
+        print("Mapped cell netlists:")
+        for cells in args.cells:
+            path = os.path.join(tmp, f"grid_{cells}.v")
+            write_verilog(mapped_netlist(cells), path)
+            _bench_file(f"grid({cells})", path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming Verilog writer
+
+1. Netlist đã map tổng hợp (mặc định 1M instance ``NAND2``/``INV`` có bus
+   input/output): ``write_verilog`` stream ra file so với ``netlist_to_verilog``
+   dựng chuỗi — thời gian và peak memory (tracemalloc) của riêng bước ghi.
+2. AIG (ripple adder): ``write_aig_verilog`` trực tiếp so với
+   ``aig_to_netlist`` + ``netlist_to_verilog``.
+
+Usage:
+    python tools/benchmarks/bench_verilog_writer.py [--cells 1000000] [--width 60000] [--skip-string]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.export.verilog_writer import netlist_to_verilog, write_aig_verilog, write_verilog
+from core.synthesis.aig import aig_to_netlist
+from tools.benchmarks.bench_cec import ripple_adder
+
+
+def mapped_netlist(cells: int, bus_width: int = 64):
+    """Lưới NAND2 + INV (mỗi 8 cell có một INV) đọc bus ``a``/``b``, ghi bus ``y``."""
+    inputs = [f"a[{i}]" for i in range(bus_width)] + [f"b[{i}]" for i in range(bus_width)]
+    nodes = []
+    prev = inputs
+    for k in range(cells):
+        out = f"n{k}"
+        if k % 8 == 7:
+            nodes.append({"id": f"inv_{k}", "type": "sky130_fd_sc_hd__inv_1", "cell_name": "sky130_fd_sc_hd__inv_1",
+                          "inputs": [prev[k % len(prev)]], "output": out,
+                          "input_pins": ["A"], "output_pins": ["Y"], "mapped": True})
+        else:
+            nodes.append({"id": f"nand_{k}", "type": "sky130_fd_sc_hd__nand2_1",
+                          "cell_name": "sky130_fd_sc_hd__nand2_1",
+                          "inputs": [prev[k % len(prev)], prev[(k * 7 + 3) % len(prev)]], "output": out,
+                          "input_pins": ["A", "B"], "output_pins": ["Y"], "mapped": True})
+        if k % 1024 == 1023:
+            prev = [f"n{j}" for j in range(k - 1023, k + 1)]
+    outputs = [f"y[{i}]" for i in range(bus_width)]
+    for i, name in enumerate(outputs):
+        nodes.append({"id": f"buf_{i}", "type": "BUF", "inputs": [f"n{cells - 1 - i}"], "output": name})
+    return {
+        "name": "grid",
+        "inputs": ["a", "b"],
+        "outputs": ["y"],
+        "nodes": nodes,
+        "wires": [],
+        "attrs": {"vector_widths": {"a": bus_width, "b": bus_width, "y": bus_width}},
+    }
+
+
+def _measure(fn, *args, **kwargs):
+    """(kết quả, thời gian, peak MB) của ``fn(*args, **kwargs)``; peak đo ở lần chạy thứ hai (tracemalloc làm chậm)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(*args, **kwargs)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming Verilog writer benchmark")
+    parser.add_argument("--cells", type=int, default=1_000_000, help="mapped-netlist instance count")
+    parser.add_argument("--width", type=int, default=60000, help="ripple adder width (AIG direct)")
+    parser.add_argument("--skip-string", action="store_true", help="skip the in-memory string baselines")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        netlist = mapped_netlist(args.cells)
+        path = os.path.join(tmp, "mapped.v")
+        stats, t, peak = _measure(write_verilog, netlist, path)
+        print(f"Mapped netlist ({args.cells} cells):")
+        print(f"  write_verilog       {t:7.2f}s  peak {peak:8.1f} MB  "
+              f"{os.path.getsize(path) / 1e6:8.1f} MB file  ({stats['instances']} instances)")
+        if not args.skip_string:
+            text, t, peak = _measure(netlist_to_verilog, netlist, "grid")
+            print(f"  netlist_to_verilog  {t:7.2f}s  peak {peak:8.1f} MB  (string, {len(text) / 1e6:.1f} MB)")
+            del text
+        del netlist
+
+        aig = ripple_adder(args.width)
+        path = os.path.join(tmp, "adder.v")
+        stats, t, peak = _measure(write_aig_verilog, aig, path, module_name="adder")
+        print(f"AIG ripple_adder({args.width}) ({aig.count_nodes()} nodes):")
+        print(f"  write_aig_verilog   {t:7.2f}s  peak {peak:8.1f} MB  "
+              f"{os.path.getsize(path) / 1e6:8.1f} MB file  ({stats['assigns']} assigns)")
+        if not args.skip_string:
+            _size, t, peak = _measure(lambda: len(netlist_to_verilog(aig_to_netlist(aig, None), "adder")))
+            print(f"  aig_to_netlist + netlist_to_verilog {t:7.2f}s  peak {peak:8.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
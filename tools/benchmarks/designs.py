@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Design tham số cho benchmark scaling (Verilog cổng, một bit mỗi tín hiệu)
+
+Mỗi generator trả về mã nguồn Verilog (``assign`` trên tín hiệu 1 bit, đọc được
+bằng ``parse_verilog``) để đo đủ cả bốn bước parse / synthesis / optimize /
+techmap:
+
+- ``ripple_adder(n)``: cộng n bit ripple-carry.
+- ``prefix_adder(n, kind)``: cộng n bit với mạng prefix ``kogge_stone`` /
+  ``sklansky`` / ``han_carlson`` - cùng cấu trúc $lcu trong
+  techlibs/fpga/common/choices (CI = 0). Mọi adder cùng n có cùng PI/PO
+  (``a<i>``, ``b<i>`` → ``s<i>``, ``cout``) nên kiểm tra tương đương được với nhau.
+- ``comparator_tree(n)``: ``lt = a < b`` (không dấu) bằng cây (gt, eq) cân bằng.
+- ``wide_mux(k)``: mux 2^k : 1 bằng cây mux 2:1 (toán tử ``?:``).
+- ``random_dag(m, seed)``: m cổng AND/OR/XOR/NAND/NOR/NOT ngẫu nhiên trên các tín hiệu trước đó.
+- ``xor_chain(n)``: chuỗi XOR sâu n tầng.
+- ``adder_array(count, n)``: ``count`` instance của ``ripple_adder_<n>`` (hoặc bản
+  đã flatten) - cho benchmark phân cấp ``bench_hierarchy``.
+
+``DESIGNS`` ánh xạ tên → (generator một tham số, kích thước quick, kích thước full).
+"""
+
+import random
+from typing import Callable, Dict, List, Sequence, Tuple
+
+PREFIX_KINDS = ("kogge_stone", "sklansky", "han_carlson")
+
+
+class _Module:
+    """Gom port / wire / assign rồi in thành một module Verilog."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.inputs: List[str] = []
+        self.outputs: List[str] = []
+        self.wires: List[str] = []
+        self.assigns: List[Tuple[str, str]] = []
+        self._counter = 0
+
+    def input(self, name: str) -> str:
+        self.inputs.append(name)
+        return name
+
+    def output(self, name: str, expr: str) -> str:
+        self.outputs.append(name)
+        self.assigns.append((name, expr))
+        return name
+
+    def wire(self, expr: str, prefix: str = "w") -> str:
+        name = f"{prefix}{self._counter}"
+        self._counter += 1
+        self.wires.append(name)
+        self.assigns.append((name, expr))
+        return name
+
+    def verilog(self) -> str:
+        lines = [f"module {self.name}({', '.join(self.inputs + self.outputs)});"]
+        lines.extend(f"  input {name};" for name in self.inputs)
+        lines.extend(f"  output {name};" for name in self.outputs)
+        lines.extend(f"  wire {name};" for name in self.wires)
+        lines.extend(f"  assign {lhs} = {rhs};" for lhs, rhs in self.assigns)
+        lines.append("endmodule")
+        return "\n".join(lines) + "\n"
+
+
+def _adder_ports(m: _Module, n: int) -> Tuple[List[str], List[str]]:
+    return [m.input(f"a{i}") for i in range(n)], [m.input(f"b{i}") for i in range(n)]
+
+
+def _ripple(m: _Module, a: List[str], b: List[str]) -> Tuple[List[str], str]:
+    sums = []
+    carry = None
+    for i in range(len(a)):
+        p = m.wire(f"{a[i]} ^ {b[i]}", "p")
+        if carry is None:
+            sums.append(p)
+            carry = m.wire(f"{a[i]} & {b[i]}", "c")
+        else:
+            sums.append(m.wire(f"{p} ^ {carry}", "x"))
+            carry = m.wire(f"({a[i]} & {b[i]}) | ({p} & {carry})", "c")
+    return sums, carry
+
+
+def ripple_adder(n: int) -> str:
+    m = _Module(f"ripple_adder_{n}")
+    a, b = _adder_ports(m, n)
+    sums, carry = _ripple(m, a, b)
+    for i, s in enumerate(sums):
+        m.output(f"s{i}", s)
+    m.output("cout", carry)
+    return m.verilog()
+
+
+def adder_array(count: int, n: int = 8, hierarchical: bool = True) -> str:
+    """
+    ``count`` adder n bit độc lập (``x<k>_<i>`` + ``y<k>_<i>`` → ``z<k>_<i>``, ``co<k>``).
+
+    hierarchical=True: module ``ripple_adder_<n>`` + top ``adder_array`` instance nó
+    ``count`` lần (named ports); False: cùng logic đã flatten thành assign.
+    """
+    top = _Module("adder_array")
+    if not hierarchical:
+        for k in range(count):
+            a = [top.input(f"x{k}_{i}") for i in range(n)]
+            b = [top.input(f"y{k}_{i}") for i in range(n)]
+            sums, carry = _ripple(top, a, b)
+            for i, s in enumerate(sums):
+                top.output(f"z{k}_{i}", s)
+            top.output(f"co{k}", carry)
+        return top.verilog()
+    instances = []
+    for k in range(count):
+        conns = [f".a{i}(x{k}_{i}), .b{i}(y{k}_{i}), .s{i}(z{k}_{i})" for i in range(n)]
+        for i in range(n):
+            top.input(f"x{k}_{i}")
+            top.input(f"y{k}_{i}")
+        top.outputs.extend(f"z{k}_{i}" for i in range(n))
+        top.outputs.append(f"co{k}")
+        instances.append(f"  ripple_adder_{n} u{k} ({', '.join(conns)}, .cout(co{k}));")
+    body = top.verilog().replace("endmodule\n", "\n".join(instances) + "\nendmodule\n")
+    return ripple_adder(n) + "\n" + body
+
+
+def _prefix_layers(n: int, kind: str) -> List[List[Tuple[int, int]]]:
+    """Các tầng (j, k) của mạng prefix: ``g[j] |= p[j] & g[k]; p[j] &= p[k]`` (dùng giá trị tầng trước)."""
+    levels = max(1, (n - 1).bit_length())
+    layers: List[List[Tuple[int, int]]] = []
+    if kind == "kogge_stone":
+        for i in range(levels):
+            layers.append([(j, j - 2 ** i) for j in range(n - 1, 2 ** i - 1, -1)])
+    elif kind == "sklansky":
+        for i in range(levels):
+            layers.append([(j, (j & ~(2 ** i - 1)) - 1) for j in range(n - 1, -1, -1) if j & 2 ** i])
+    elif kind == "han_carlson":
+        layers.append([(j, j - 1) for j in range(n - 1, -1, -1) if j % 2 == 1])
+        for i in range(1, levels):
+            layers.append([(j, j - 2 ** i) for j in range(n - 1, 2 ** i - 1, -1) if j % 2 == 1])
+        layers.append([(j, j - 1) for j in range(n - 1, 0, -1) if j % 2 == 0])
+    else:
+        raise ValueError(f"Unknown prefix network {kind!r} (expected one of {PREFIX_KINDS})")
+    return layers
+
+
+def prefix_adder(n: int, kind: str = "kogge_stone") -> str:
+    m = _Module(f"{kind}_adder_{n}")
+    a, b = _adder_ports(m, n)
+    prop = [m.wire(f"{a[i]} ^ {b[i]}", "p") for i in range(n)]
+    p = list(prop)
+    g = [m.wire(f"{a[i]} & {b[i]}", "g") for i in range(n)]
+    for layer in _prefix_layers(n, kind):
+        new_g, new_p = list(g), list(p)
+        for j, k in layer:
+            new_g[j] = m.wire(f"{g[j]} | ({p[j]} & {g[k]})", "g")
+            new_p[j] = m.wire(f"{p[j]} & {p[k]}", "q")
+        g, p = new_g, new_p
+    m.output("s0", prop[0])
+    for i in range(1, n):
+        m.output(f"s{i}", f"{prop[i]} ^ {g[i - 1]}")
+    m.output("cout", g[n - 1])
+    return m.verilog()
+
+
+def comparator_tree(n: int) -> str:
+    m = _Module(f"comparator_{n}")
+    a = [m.input(f"a{i}") for i in range(n)]
+    b = [m.input(f"b{i}") for i in range(n)]
+    # (lt, eq) của từng bit, gộp từng cặp: (lt_hi | eq_hi & lt_lo, eq_hi & eq_lo).
+    # Parser chưa nhận ``~a & b`` nên phủ định tách ra wire riêng.
+    pairs = [(m.wire(f"{m.wire(f'~{a[i]}', 'na')} & {b[i]}", "lt"), m.wire(f"~({a[i]} ^ {b[i]})", "eq"))
+             for i in range(n)]
+    while len(pairs) > 1:
+        merged = []
+        for i in range(0, len(pairs) - 1, 2):
+            (lt_lo, eq_lo), (lt_hi, eq_hi) = pairs[i], pairs[i + 1]
+            merged.append((m.wire(f"{lt_hi} | ({eq_hi} & {lt_lo})", "lt"),
+                           m.wire(f"{eq_hi} & {eq_lo}", "eq")))
+        if len(pairs) % 2:
+            merged.append(pairs[-1])
+        pairs = merged
+    m.output("lt", pairs[0][0])
+    m.output("eq", pairs[0][1])
+    return m.verilog()
+
+
+def wide_mux(k: int) -> str:
+    m = _Module(f"mux_{2 ** k}")
+    data = [m.input(f"d{i}") for i in range(2 ** k)]
+    sel = [m.input(f"s{i}") for i in range(k)]
+    for level in range(k):
+        data = [m.wire(f"{sel[level]} ? {data[i + 1]} : {data[i]}", "m") for i in range(0, len(data), 2)]
+    m.output("y", data[0])
+    return m.verilog()
+
+
+def random_dag(gates: int, seed: int = 1, num_inputs: int = 32, num_outputs: int = 16) -> str:
+    rng = random.Random(seed)
+    m = _Module(f"random_dag_{gates}")
+    signals = [m.input(f"i{i}") for i in range(num_inputs)]
+    for _ in range(gates):
+        # Ưu tiên tín hiệu gần đây để DAG sâu dần thay vì chỉ phẳng trên PI
+        x = signals[-1 - min(int(rng.expovariate(1 / 24)), len(signals) - 1)]
+        y = rng.choice(signals)
+        op = rng.choice(("&", "|", "^", "nand", "nor", "~"))
+        if op == "~":
+            expr = f"~{x}"
+        elif op == "nand":
+            expr = f"~({x} & {y})"
+        elif op == "nor":
+            expr = f"~({x} | {y})"
+        else:
+            expr = f"{x} {op} {y}"
+        signals.append(m.wire(expr, "n"))
+    for i, s in enumerate(signals[-num_outputs:]):
+        m.output(f"o{i}", s)
+    return m.verilog()
+
+
+def xor_chain(n: int) -> str:
+    m = _Module(f"xor_chain_{n}")
+    ins = [m.input(f"i{i}") for i in range(n)]
+    acc = ins[0]
+    for i in range(1, n):
+        acc = m.wire(f"{acc} ^ {ins[i]}", "x")
+    m.output("y", acc)
+    return m.verilog()
+
+
+DESIGNS: Dict[str, Tuple[Callable[[int], str], Sequence[int], Sequence[int]]] = {
+    "ripple_adder": (ripple_adder, (32, 64, 128), (64, 256, 1024, 4096)),
+    "kogge_stone": (lambda n: prefix_adder(n, "kogge_stone"), (16, 32, 64), (32, 128, 512, 1024)),
+    "sklansky": (lambda n: prefix_adder(n, "sklansky"), (16, 32, 64), (32, 128, 512, 1024)),
+    "han_carlson": (lambda n: prefix_adder(n, "han_carlson"), (16, 32, 64), (32, 128, 512, 1024)),
+    "comparator": (comparator_tree, (32, 64, 128), (64, 256, 1024, 4096)),
+    "wide_mux": (wide_mux, (5, 6, 7), (6, 8, 10, 12)),
+    "random_dag": (random_dag, (250, 500, 1000), (1000, 4000, 16000, 32000)),
+    "xor_chain": (xor_chain, (128, 256, 512), (256, 1024, 4096, 16384)),
+}
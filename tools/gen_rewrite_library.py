@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Sinh core/optimization/rewrite_library.py: một AIG nhỏ cho mỗi lớp NPN 4 input.
+
+1. Quy hoạch động theo chi phí (số AND) trên cả 65536 hàm 4 input (đồng nhất
+   f và !f vì inverter miễn phí): hàm chi phí c = AND của hai hàm chi phí
+   c1 + c2 = c - 1 (mọi phase). Kết quả là cấu trúc cây tối ưu.
+2. Dựng lại cấu trúc cho đại diện của 222 lớp NPN (core/synthesis/npn.py),
+   gộp các hàm con trùng nhau (chia sẻ node), kiểm tra bằng mô phỏng.
+
+Chạy một lần (vài phút), file sinh ra được commit cùng repo:
+    python tools/gen_rewrite_library.py [--output core/optimization/rewrite_library.py]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.synthesis.npn import TT4_FULL, TT4_VARS, npn_classes
+
+M = TT4_FULL
+
+
+def _key(f: int) -> int:
+    return f if f <= f ^ M else f ^ M
+
+
+def compute_splits():
+    """split[key] = (g_key, g_neg, h_key, h_neg, out_neg); cost[key] = số AND (cây)."""
+    cost = {}
+    split = {}
+    base = [_key(0)] + [_key(v) for v in TT4_VARS]
+    for f in base:
+        cost[f] = 0
+    buckets = [sorted(set(base))]
+    c = 0
+    while len(cost) < 32768:
+        c += 1
+        new = {}
+        for c1 in range((c - 1) // 2 + 1):
+            c2 = c - 1 - c1
+            b1, b2 = buckets[c1], buckets[c2]
+            for i, g in enumerate(b1):
+                for h in (b2[i:] if c1 == c2 else b2):
+                    for gn in (0, 1):
+                        gv = g ^ (M if gn else 0)
+                        for hn in (0, 1):
+                            f = gv & (h ^ (M if hn else 0))
+                            k = _key(f)
+                            if k not in cost and k not in new:
+                                new[k] = (g, gn, h, hn, 1 if k != f else 0)
+        for k, s in new.items():
+            cost[k] = c
+            split[k] = s
+        buckets.append(sorted(new))
+        print(f"  cost {c:2d}: {len(new):5d} functions ({len(cost)}/32768)", flush=True)
+    return cost, split
+
+
+def build_structure(rep: int, split):
+    """
+    Trả về (nodes, out_lit): nodes là list cặp literal (lit0, lit1); literal
+    = 2 * index + complement, index 0 = CONST0, 1..4 = x0..x3, 5 + i = node i.
+    """
+    nodes = []
+    node_index = {}
+    built = {_key(0): 0}
+    for i, v in enumerate(TT4_VARS):
+        built[_key(v)] = ((i + 1) << 1) | (1 if _key(v) != v else 0)
+
+    def lit_of(key: int) -> int:
+        stack = [key]
+        while stack:
+            k = stack[-1]
+            if k in built:
+                stack.pop()
+                continue
+            g, gn, h, hn, on = split[k]
+            missing = [x for x in (g, h) if x not in built]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            a = built[g] ^ gn
+            b = built[h] ^ hn
+            if a > b:
+                a, b = b, a
+            index = node_index.get((a, b))
+            if index is None:
+                index = len(nodes) + 5
+                node_index[(a, b)] = index
+                nodes.append((a, b))
+            built[k] = (index << 1) | on
+        return built[key]
+
+    key = _key(rep)
+    out = lit_of(key) ^ (1 if key != rep else 0)
+    # Giữ lại node reachable từ output (theo thứ tự), đánh lại index
+    used = set()
+    stack = [out >> 1]
+    while stack:
+        index = stack.pop()
+        if index >= 5 and index not in used:
+            used.add(index)
+            a, b = nodes[index - 5]
+            stack.extend((a >> 1, b >> 1))
+    remap = {i: i for i in range(5)}
+    kept = []
+    for i, (a, b) in enumerate(nodes):
+        if i + 5 in used:
+            remap[i + 5] = len(kept) + 5
+            kept.append(((remap[a >> 1] << 1) | (a & 1), (remap[b >> 1] << 1) | (b & 1)))
+    return kept, (remap[out >> 1] << 1) | (out & 1)
+
+
+def evaluate(nodes, out_lit) -> int:
+    values = [0] + list(TT4_VARS)
+    for a, b in nodes:
+        va = values[a >> 1] ^ (M if a & 1 else 0)
+        vb = values[b >> 1] ^ (M if b & 1 else 0)
+        values.append(va & vb)
+    return values[out_lit >> 1] ^ (M if out_lit & 1 else 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the 4-input NPN rewriting library")
+    parser.add_argument("--output", default=os.path.join(ROOT, "core", "optimization", "rewrite_library.py"))
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    _cost, split = compute_splits()
+    entries = []
+    for rep in npn_classes():
+        nodes, out = build_structure(rep, split)
+        if evaluate(nodes, out) != rep:
+            raise RuntimeError(f"Structure for 0x{rep:04X} does not match")
+        entries.append((rep, nodes, out))
+
+    lines = [
+        '"""',
+        'Thư viện rewriting: một AIG nhỏ cho đại diện của mỗi lớp NPN 4 input.',
+        '',
+        'File được sinh bởi tools/gen_rewrite_library.py - không sửa tay.',
+        '',
+        'REWRITE_LIBRARY[rep] = (nodes, out_lit); literal = 2 * index + complement,',
+        'index 0 = CONST0, 1..4 = input x0..x3, 5 + i = AND node ``nodes[i]``.',
+        '"""',
+        '',
+        'REWRITE_LIBRARY = {',
+    ]
+    for rep, nodes, out in entries:
+        lines.append(f"    0x{rep:04X}: ({tuple(nodes)!r}, {out}),")
+    lines.append('}')
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    sizes = [len(nodes) for _rep, nodes, _out in entries]
+    print(f"Wrote {len(entries)} classes to {args.output} "
+          f"(max {max(sizes)} AND, total {sum(sizes)}) in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())